@@ -0,0 +1,17 @@
+"""
+SarvanOM Micro-Benchmarks
+
+Benchmarks for the pure-CPU hot paths, with stored baselines and a
+regression gate:
+
+    python -m benchmarks run                     # run and print every benchmark
+    python -m benchmarks run -k 'fusion.*' --output results.json
+    python -m benchmarks compare --threshold 15  # run, compare to the baseline, exit 1 on regression
+    python -m benchmarks compare --current results.json
+    python -m benchmarks save-baseline           # run and overwrite the stored baseline
+
+Baselines live in benchmarks/baselines/ (default.json unless --baseline is
+given). Each run records a calibration loop and compare scales the baseline
+by it, so small host speed differences cancel out; a different Python
+version or CPU architecture still deserves its own baseline (--baseline).
+"""
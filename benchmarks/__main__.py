@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Run the micro-benchmarks, compare against a baseline, or record one.
+
+Usage:
+    python -m benchmarks run [-k PATTERN] [--sizes 100,1000] [--output results.json] [--json]
+    python -m benchmarks compare [--baseline benchmarks/baselines/default.json] [--current results.json] [--threshold 20]
+    python -m benchmarks save-baseline [--baseline PATH] [--repeat 3]
+
+compare exits 1 when any benchmark's per-call minimum is slower than the
+baseline by more than the threshold, after re-measuring apparent
+regressions (--retries) so one noisy round does not fail the gate, or when
+a selected baseline benchmark was not measured (unavailable or removed).
+A baseline recorded in another environment is compared relative to a
+calibration loop run alongside each round. A baseline may carry per-benchmark
+overrides under "thresholds" (benchmark name -> percent); save-baseline
+keeps them, and records each benchmark's median over --repeat suite runs.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks.harness import (
+    compare,
+    ensure_repo_on_path,
+    environment_mismatch,
+    format_seconds,
+    load_results,
+    median_run,
+    remeasure,
+    run_suite,
+    save_results,
+    select,
+)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "default.json"
+
+
+def _load_benchmarks() -> None:
+    ensure_repo_on_path()
+    import benchmarks.bench_retrieval  # noqa: F401  (registers benchmarks)
+
+
+def _run(args) -> dict:
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+    benchmarks = select(args.k)
+    if not benchmarks:
+        raise SystemExit(f"No benchmarks match {args.k}")
+
+    def progress(key, result):
+        if not args.json:
+            print(f"  {key:<48}{format_seconds(result['min_s']):>10}{format_seconds(result['median_s']):>10}", file=sys.stderr)
+
+    if not args.json:
+        print(f"  {'benchmark':<48}{'min':>10}{'median':>10}", file=sys.stderr)
+    return run_suite(benchmarks, sizes=sizes, rounds=args.rounds, min_round_s=args.min_round_s, progress=progress)
+
+
+def _print_unavailable(results: dict) -> None:
+    for name, reason in sorted(results.get("unavailable", {}).items()):
+        print(f"  {name}: unavailable ({reason[:120]})")
+
+
+def cmd_run(args) -> int:
+    results = _run(args)
+    if args.output:
+        save_results(results, Path(args.output))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_unavailable(results)
+    return 0
+
+
+def cmd_save_baseline(args) -> int:
+    path = Path(args.baseline)
+    results = median_run([_run(args) for _ in range(max(args.repeat, 1))])
+    if path.exists():
+        results["thresholds"] = load_results(path).get("thresholds", {})
+    save_results(results, path)
+    print(f"Baseline written to {path} ({len(results['results'])} measurements)")
+    _print_unavailable(results)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    path = Path(args.baseline)
+    if not path.exists():
+        print(f"No baseline at {path}; record one with: python -m benchmarks save-baseline", file=sys.stderr)
+        return 2
+    baseline = load_results(path)
+    current = load_results(Path(args.current)) if args.current else _run(args)
+    if args.k or args.sizes:
+        # Only the selected benchmarks are expected; one that could not run still counts as missing
+        names = {bench.name for bench in select(args.k)}
+        sizes = {s for s in args.sizes.split(",")} if args.sizes else None
+        baseline = dict(baseline, results={
+            key: value for key, value in baseline["results"].items()
+            if key.split("[")[0] in names and (sizes is None or key.split("[")[1].rstrip("]") in sizes)
+        })
+    rows = compare(baseline, current, args.threshold, baseline.get("thresholds"))
+    regressed = [row for row in rows if row["status"] == "regressed"]
+    # A live run re-measures apparent regressions; only ones that reproduce fail the gate
+    for _ in range(0 if args.current else args.retries):
+        if not regressed:
+            break
+        remeasure(current, [row["benchmark"] for row in regressed], rounds=args.rounds, min_round_s=args.min_round_s)
+        rows = compare(baseline, current, args.threshold, baseline.get("thresholds"))
+        regressed = [row for row in rows if row["status"] == "regressed"]
+
+    missing = [row for row in rows if row["status"] == "missing"]
+
+    if args.json:
+        print(json.dumps({"rows": rows, "regressed": len(regressed), "missing": len(missing)}, indent=2))
+    else:
+        mismatches = environment_mismatch(baseline, current)
+        for mismatch in mismatches:
+            print(f"note: environment differs from baseline ({mismatch})")
+        absolute = [row["benchmark"] for row in rows if row["change_pct"] is not None and not row["relative"]]
+        if mismatches and absolute:
+            print(f"warning: {len(absolute)} benchmark(s) lack calibration in one run; comparing absolute timings")
+        print(f"{'benchmark':<48}{'baseline':>10}{'current':>10}{'change':>10}  status")
+        for row in rows:
+            change = "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+            print(
+                f"{row['benchmark']:<48}{format_seconds(row['baseline_s']):>10}"
+                f"{format_seconds(row['current_s']):>10}{change:>10}  {row['status']}"
+            )
+        _print_unavailable(current)
+        if regressed:
+            print(f"\n{len(regressed)} benchmark(s) regressed by more than their threshold")
+        if missing:
+            print(f"\nerror: {len(missing)} baseline benchmark(s) were not measured; fix them or re-record the baseline")
+    return 1 if regressed or missing else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, handler in (("run", cmd_run), ("compare", cmd_compare), ("save-baseline", cmd_save_baseline)):
+        command = sub.add_parser(name)
+        command.set_defaults(handler=handler)
+        command.add_argument("-k", action="append", help="Only benchmarks matching this glob (repeatable)")
+        command.add_argument("--sizes", help="Comma-separated corpus sizes to run (default: each benchmark's own)")
+        command.add_argument("--rounds", type=int, default=7, help="Timed rounds per measurement")
+        command.add_argument("--min-round-s", type=float, default=0.05, help="Minimum duration of one round (s)")
+        command.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+        if name == "run":
+            command.add_argument("--output", help="Write results JSON here")
+        else:
+            command.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results JSON")
+        if name == "compare":
+            command.add_argument("--current", help="Compare this results JSON instead of running now")
+            command.add_argument("--threshold", type=float, default=20.0, help="Allowed slowdown (%%)")
+            command.add_argument("--retries", type=int, default=2, help="Re-measure apparent regressions this many times")
+        if name == "save-baseline":
+            command.add_argument("--repeat", type=int, default=3, help="Suite runs to take each benchmark's median over")
+    args = parser.parse_args()
+
+    _load_benchmarks()
+    # Hot paths log per call; keep logging out of the timings
+    logging.disable(logging.INFO)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Retrieval Hot-Path Benchmarks
+
+Pure-CPU code that runs on every query: result deduplication, rank fusion,
+sentence extraction for citations, query classification, the local
+embedder and the in-memory fallback vector search. Each benchmark builds
+its input from benchmarks/corpora.py at several sizes.
+"""
+
+from types import SimpleNamespace
+
+from benchmarks import corpora
+from benchmarks.harness import benchmark, stub_modules
+
+
+# Import-time dependencies the measured helpers never read: the orchestrator
+# imports its config through a ``sarvanom.`` package path and builds a global
+# instance, and the provider config refuses to load without API keys
+def _provider_config():
+    return SimpleNamespace(KEYLESS_FALLBACKS_ENABLED=True, get_provider_value=lambda key: None)
+
+
+CONFIG_STUBS = {
+    "sarvanom.services.retrieval.config": {"get_config": SimpleNamespace},
+    "sarvanom.shared.core.config.provider_config": {"get_provider_config": _provider_config},
+    "shared.core.config.provider_config": {"provider_config": _provider_config(), "get_provider_config": _provider_config},
+}
+
+
+@benchmark("orchestrator.deduplicate_results", sizes=(50, 200, 800))
+def orchestrator_deduplicate_results(size):
+    """RetrievalOrchestrator._deduplicate_results over URL/title near-duplicates"""
+    with stub_modules(CONFIG_STUBS):
+        from services.retrieval.orchestrator import RetrievalOrchestrator
+
+    # Only the pure helper is measured; skip provider/lane setup in __init__
+    orchestrator = RetrievalOrchestrator.__new__(RetrievalOrchestrator)
+    results = corpora.search_results(size)
+    return lambda: orchestrator._deduplicate_results(results)
+
+
+@benchmark("fusion.rrf_fuse_results", sizes=(100, 1000, 5000))
+def rrf_fuse_results(size):
+    """ReciprocalRankFusion.fuse_results over four overlapping lanes"""
+    from services.retrieval.fusion import ReciprocalRankFusion
+
+    fusion = ReciprocalRankFusion()
+    lanes = [
+        SimpleNamespace(lane=f"lane{i}", status="success", results=ranked)
+        for i, ranked in enumerate(corpora.lane_rankings(size // 4 or 1))
+    ]
+    return lambda: fusion.fuse_results(lanes)
+
+
+@benchmark("index_fabric.reciprocal_rank_fusion", sizes=(100, 1000, 5000))
+def index_fabric_reciprocal_rank_fusion(size):
+    """IndexFabricService._reciprocal_rank_fusion over four overlapping lanes"""
+    from shared.core.services.index_fabric_service import IndexFabricService, IndexLaneResult
+
+    service = IndexFabricService()
+    lanes = {
+        f"lane{i}": IndexLaneResult(lane_name=f"lane{i}", results=ranked, processing_time_ms=1.0, success=True)
+        for i, ranked in enumerate(corpora.lane_rankings(size // 4 or 1))
+    }
+    return lambda: service._reciprocal_rank_fusion(lanes, max_results=20)
+
+
+@benchmark("citations.extract_sentences", sizes=(10, 100, 1000))
+def citations_extract_sentences(size):
+    """CitationsManager._extract_sentences over an answer of ``size`` sentences"""
+    with stub_modules(CONFIG_STUBS):
+        from services.gateway.citations import CitationsManager
+
+    # No similarity model is needed to split sentences
+    manager = CitationsManager.__new__(CitationsManager)
+    text = corpora.answer_text(size)
+    return lambda: manager._extract_sentences(text)
+
+
+@benchmark("query_classifier.classify_query", sizes=(10, 100, 1000))
+def query_classifier_classify_query(size):
+    """QueryClassifier.classify_query over ``size`` queries"""
+    from shared.core.query_classifier import QueryClassifier
+
+    classifier = QueryClassifier()
+    queries = corpora.queries(size)
+
+    def run():
+        for query in queries:
+            classifier.classify_query(query)
+    return run
+
+
+@benchmark("embeddings.embed_texts", sizes=(10, 100, 1000))
+def embeddings_embed_texts(size):
+    """embed_texts on ``size`` passages with a cold embedding cache"""
+    from shared.embeddings import local_embedder
+
+    texts = corpora.passages(size)
+
+    def run():
+        local_embedder._embedding_cache.clear()
+        local_embedder.embed_texts(texts)
+    return run
+
+
+@benchmark("vector.fallback_search", sizes=(100, 1000, 5000))
+def vector_fallback_search(size):
+    """FallbackVectorDB.search (top 10) over ``size`` 384-d vectors"""
+    from shared.vectorstores.fallback_vector_db import FallbackVectorDB
+
+    db = FallbackVectorDB("benchmark")
+    passages = corpora.passages(size, words=12)
+    db.add_documents([{"text": text, "metadata": {"n": i}} for i, text in enumerate(passages)], corpora.vectors(size))
+    query = corpora.vectors(1)[0]
+    return lambda: db.search(query, top_k=10, score_threshold=0.0)
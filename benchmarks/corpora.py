@@ -0,0 +1,121 @@
+"""
+Synthetic Benchmark Corpora
+
+Deterministic (seeded) inputs shaped like what the retrieval hot paths see
+in production, generated at any size:
+- search results with URL/title/domain metadata and a share of near
+  duplicates (same page under another query string, retitled copies)
+- per-lane ranked lists that overlap, for rank fusion
+- multi-sentence answer text, user queries, passages to embed and
+  embedding vectors
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+import numpy as np
+
+WORDS = (
+    "retrieval augmented generation vector index latency cache transformer embedding query ranking "
+    "fusion citation source model token context window search engine graph knowledge document passage "
+    "benchmark throughput memory cluster shard replica consistency semantic keyword hybrid score"
+).split()
+
+DOMAINS = [f"site{i}.example.com" for i in range(40)] + ["en.wikipedia.org", "arxiv.org", "github.com", "news.example.org"]
+
+QUERY_TEMPLATES = (
+    "what is {a} {b}",
+    "compare {a} and {b} for {c}",
+    "analyze the impact of {a} on {b} {c}",
+    "how to implement {a} {b} in python step by step",
+    "latest news about {a} {b}",
+    "research {a} across multiple {b} and {c} studies",
+    "explain {a}",
+)
+
+
+def _rng(size: int, salt: int) -> random.Random:
+    return random.Random(size * 1_000_003 + salt)
+
+
+def _phrase(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def search_results(size: int, duplicate_ratio: float = 0.3) -> List[Dict[str, Any]]:
+    """``size`` search results, about ``duplicate_ratio`` of them near-duplicates of earlier ones"""
+    rng = _rng(size, 1)
+    now = datetime(2025, 6, 1)
+    results: List[Dict[str, Any]] = []
+    for i in range(size):
+        if results and rng.random() < duplicate_ratio:
+            original = rng.choice(results)
+            url = f"{original['url']}?ref=lane{rng.randint(1, 4)}"
+            title = original["title"] if rng.random() < 0.5 else original["title"].upper()
+            domain = original["domain"]
+        else:
+            domain = rng.choice(DOMAINS)
+            title = f"{_phrase(rng, 6)} {i}"
+            url = f"https://{domain}/{'-'.join(title.split()[:4])}/{i}"
+        results.append({
+            "id": f"doc-{i}",
+            "title": title,
+            "url": url,
+            "domain": domain,
+            "content": _phrase(rng, 40),
+            "score": round(rng.random(), 4),
+            "published_at": (now - timedelta(days=rng.randint(0, 900))).isoformat(),
+            "metadata": {"url": url, "title": title, "domain": domain},
+        })
+    return results
+
+
+def lane_rankings(size: int, lanes: int = 4, overlap: float = 0.5) -> List[List[Dict[str, Any]]]:
+    """``lanes`` ranked lists of ``size`` results each; about ``overlap`` of ids appear in other lanes too"""
+    rng = _rng(size, 2)
+    shared = search_results(size)
+    rankings = []
+    for lane in range(lanes):
+        ranked = []
+        for i in range(size):
+            if rng.random() < overlap:
+                ranked.append(dict(shared[rng.randrange(size)]))
+            else:
+                doc = dict(shared[i])
+                doc["id"] = f"lane{lane}-doc-{i}"
+                ranked.append(doc)
+        rankings.append(ranked)
+    return rankings
+
+
+def answer_text(sentences: int) -> str:
+    """An answer of ``sentences`` sentences with mixed terminators and citation markers"""
+    rng = _rng(sentences, 3)
+    parts = []
+    for i in range(sentences):
+        sentence = _phrase(rng, rng.randint(8, 24)).capitalize()
+        if rng.random() < 0.3:
+            sentence += f" [{rng.randint(1, 9)}]"
+        parts.append(sentence + rng.choice((".", ".", ".", "!", "?", "...")))
+    return " ".join(parts)
+
+
+def queries(size: int) -> List[str]:
+    """``size`` user queries across the query templates"""
+    rng = _rng(size, 4)
+    return [
+        rng.choice(QUERY_TEMPLATES).format(a=rng.choice(WORDS), b=rng.choice(WORDS), c=rng.choice(WORDS))
+        for _ in range(size)
+    ]
+
+
+def passages(size: int, words: int = 60) -> List[str]:
+    """``size`` distinct passages of about ``words`` words"""
+    rng = _rng(size, 5)
+    return [f"{i}: {_phrase(rng, words)}" for i in range(size)]
+
+
+def vectors(size: int, dim: int = 384) -> List[List[float]]:
+    """``size`` random embedding vectors as Python lists (how callers hand them over)"""
+    return np.random.default_rng(size).standard_normal((size, dim)).astype(np.float32).tolist()
@@ -0,0 +1,337 @@
+"""
+Benchmark Harness
+
+A small asv-style runner for CPU hot-path micro-benchmarks:
+- Benchmarks register with @benchmark(name, sizes=...); the decorated
+  function does the untimed setup for one corpus size (imports, synthetic
+  data, instances) and returns the zero-argument callable to time
+- Each callable is run in auto-sized loops (like timeit.autorange) for
+  several rounds with the GC disabled; the per-call minimum is the number
+  compared across runs, the median and spread are kept for context
+- Benchmarks whose module cannot be imported in this environment are
+  reported as unavailable instead of failing the suite; stub_modules()
+  stands in for import-time dependencies (config, provider keys) that the
+  measured helpers never touch
+- Each round is paired with a round of a fixed pure-Python calibration
+  loop timed right before it; ``relative`` is the per-call minimum over the
+  calibration loop's minimum. compare() gates on the per-call minimum when
+  both runs come from the same environment and on ``relative`` when they
+  do not, so a baseline recorded on one host still holds on a faster or
+  slower one
+- save-baseline keeps each benchmark's median over several suite runs
+  (median_run()) so the baseline is not one unusually quiet moment
+- compare() checks a run against a stored baseline and flags every
+  benchmark that got slower by more than the threshold; remeasure() lets
+  the caller re-run flagged benchmarks so a noisy round alone does not
+  fail the gate
+
+Following MAANG/OpenAI/Perplexity standards for performance regression testing.
+"""
+
+import fnmatch
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import types
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class Benchmark:
+    """One registered hot path, measured at each corpus size"""
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    sizes: Sequence[int]
+    description: str = ""
+
+    def key(self, size: int) -> str:
+        return f"{self.name}[{size}]"
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, sizes: Sequence[int]):
+    """Register ``setup(size) -> callable`` as benchmark ``name``"""
+    def decorator(setup: Callable[[int], Callable[[], Any]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark: {name}")
+        description = (setup.__doc__ or "").strip().splitlines()[0] if setup.__doc__ else ""
+        BENCHMARKS[name] = Benchmark(name, setup, tuple(sizes), description)
+        return setup
+    return decorator
+
+
+def _autorange(func: Callable[[], Any], min_round_s: float) -> int:
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= min_round_s or loops >= 1_000_000:
+            return loops
+        loops *= 10 if elapsed < min_round_s / 10 else 2
+
+
+def measure(
+    func: Callable[[], Any],
+    rounds: int = 7,
+    min_round_s: float = 0.05,
+    calibrated: bool = False,
+) -> Dict[str, Any]:
+    """Time ``func``: per-call seconds over ``rounds`` rounds of auto-sized loops
+
+    With ``calibrated``, each round is preceded by a round of the calibration
+    loop, and ``relative`` is the best per-call time over the best calibration
+    time. Both are minimums taken independently, so a noisy calibration round
+    does not skew the benchmark round it happened to precede.
+    """
+    loops = _autorange(func, min_round_s)
+    calibration_loops = _autorange(_calibration_workload, min_round_s / 4) if calibrated else 0
+    samples: List[float] = []
+    units: List[float] = []
+    for _ in range(rounds):
+        if calibrated:
+            units.append(_time_loops(_calibration_workload, calibration_loops) / calibration_loops)
+        samples.append(_time_loops(func, loops) / loops)
+    timing = {
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "loops": loops,
+        "rounds": len(samples),
+    }
+    if calibrated:
+        timing["calibration_s"] = min(units)
+        timing["relative"] = min(samples) / min(units)
+    return timing
+
+
+def _time_loops(func: Callable[[], Any], loops: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _calibration_workload() -> int:
+    """Fixed interpreter-bound work (dict, string and list operations) to gauge host speed"""
+    counts: Dict[str, int] = {}
+    for i in range(2000):
+        word = f"token{i % 97}"
+        counts[word] = counts.get(word, 0) + len(word)
+    return sum(sorted(counts.values())[:10])
+
+
+_UNIMPORTABLE: Set[str] = set()
+
+
+@contextmanager
+def stub_modules(stubs: Dict[str, Dict[str, Any]]) -> Iterator[None]:
+    """Stand-in modules for imports that fail here (missing package, provider keys required at import)
+
+    Each module in ``stubs`` is imported for real first (once per process);
+    only when that fails is a module with the given attributes placed in sys.modules. Stubs are
+    removed on exit; modules imported meanwhile keep their references.
+    """
+    installed = []
+    for name, attributes in stubs.items():
+        if name not in _UNIMPORTABLE:
+            try:
+                importlib.import_module(name)
+                continue
+            except Exception:
+                _UNIMPORTABLE.add(name)
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__dict__.update(attributes)
+            sys.modules[name] = module
+            installed.append(name)
+    try:
+        yield
+    finally:
+        for name in installed:
+            sys.modules.pop(name, None)
+
+
+def environment_info() -> Dict[str, Any]:
+    """Where a run happened; timings only compare within the same environment"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=REPO_ROOT, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def select(patterns: Optional[Iterable[str]] = None) -> List[Benchmark]:
+    """Registered benchmarks matching any of the glob ``patterns`` (all when empty)"""
+    patterns = [p for p in (patterns or []) if p]
+    return [
+        bench for name, bench in sorted(BENCHMARKS.items())
+        if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)
+    ]
+
+
+def run_suite(
+    benchmarks: Sequence[Benchmark],
+    sizes: Optional[Sequence[int]] = None,
+    rounds: int = 7,
+    min_round_s: float = 0.05,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Run ``benchmarks`` (optionally only at ``sizes``) and return a results document"""
+    results: Dict[str, Dict[str, Any]] = {}
+    unavailable: Dict[str, str] = {}
+    for bench in benchmarks:
+        for size in bench.sizes:
+            if sizes and size not in sizes:
+                continue
+            key = bench.key(size)
+            try:
+                func = bench.setup(size)
+            except Exception as e:
+                unavailable[bench.name] = f"{type(e).__name__}: {e}"
+                break
+            results[key] = measure(func, rounds=rounds, min_round_s=min_round_s, calibrated=True)
+            if progress:
+                progress(key, results[key])
+    return {"environment": environment_info(), "results": results, "unavailable": unavailable}
+
+
+def median_run(runs: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine repeated suite runs, keeping each benchmark's median-by-``min_s`` measurement
+
+    A baseline taken from a single run inherits that run's luck; a later run on
+    the same host then has to beat its quietest moment to pass the gate.
+    """
+    combined = dict(runs[-1], results={}, unavailable={})
+    for run in runs:
+        combined["unavailable"].update(run.get("unavailable", {}))
+    for key in sorted({key for run in runs for key in run["results"]}):
+        entries = sorted((run["results"][key] for run in runs if key in run["results"]), key=lambda e: e["min_s"])
+        combined["results"][key] = entries[(len(entries) - 1) // 2]
+    return combined
+
+
+def remeasure(
+    results: Dict[str, Any],
+    keys: Iterable[str],
+    rounds: int = 7,
+    min_round_s: float = 0.05,
+) -> None:
+    """Measure ``keys`` again, keeping each one's best per-call and calibration-relative time"""
+    for key in keys:
+        name, _, size = key.partition("[")
+        bench = BENCHMARKS[name]
+        previous = results["results"][key]
+        calibrated = "relative" in previous
+        measured = measure(
+            bench.setup(int(size.rstrip("]"))), rounds=rounds, min_round_s=min_round_s, calibrated=calibrated
+        )
+        best = dict(measured if measured["min_s"] < previous["min_s"] else previous)
+        if calibrated:
+            best["relative"] = min(measured["relative"], previous["relative"])
+        best["attempts"] = previous.get("attempts", 1) + 1
+        results["results"][key] = best
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold_pct: float,
+    thresholds: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """Per-benchmark change against ``baseline``
+
+    The change is measured on the per-call minimum when both runs come from
+    the same environment, else on the calibration-relative time when both
+    recorded one (``relative`` in the row).
+    Status is ``regressed`` when slower by more than the threshold (a
+    per-benchmark override in ``thresholds`` wins), ``improved`` when faster
+    by more than it, else ``ok``; ``new``/``missing`` when only one side has it.
+    """
+    thresholds = thresholds or {}
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+    across_hosts = bool(environment_mismatch(baseline, current))
+    rows = []
+    for key in sorted(set(base_results) | set(current_results)):
+        base_entry, current_entry = base_results.get(key, {}), current_results.get(key, {})
+        before, after = base_entry.get("min_s"), current_entry.get("min_s")
+        limit = thresholds.get(key.split("[")[0], threshold_pct)
+        relative = across_hosts and "relative" in base_entry and "relative" in current_entry
+        row = {
+            "benchmark": key, "baseline_s": before, "current_s": after,
+            "change_pct": None, "threshold_pct": limit, "relative": relative,
+        }
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "missing"
+        else:
+            if relative:
+                before, after = base_entry["relative"], current_entry["relative"]
+            change = (after - before) / before * 100 if before > 0 else 0.0
+            row["change_pct"] = round(change, 1)
+            row["status"] = "regressed" if change > limit else "improved" if change < -limit else "ok"
+        rows.append(row)
+    return rows
+
+
+def environment_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Environment fields that differ between the two runs"""
+    fields = ("python", "implementation", "machine", "cpu_count")
+    before, after = baseline.get("environment", {}), current.get("environment", {})
+    return [f"{f}: {before.get(f)} -> {after.get(f)}" for f in fields if before.get(f) != after.get(f)]
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def ensure_repo_on_path() -> None:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
@@ -0,0 +1,152 @@
+"""
+HDR Histogram for Load Test Latencies
+
+A pure-Python High Dynamic Range histogram (the HdrHistogram bucket layout)
+so latency percentiles come from every recorded sample with bounded memory
+and a fixed relative error, instead of sorting a list of every response time:
+- Values are integers (the load generator records microseconds) between
+  ``lowest`` and ``highest``; anything above ``highest`` is clamped
+- ``significant_figures`` sets the precision: 3 keeps every value within
+  0.1% of what was recorded, from 1us up to an hour
+- Histograms from several runs or endpoints can be merged
+
+Following MAANG/OpenAI/Perplexity standards for performance measurement.
+"""
+
+import math
+from typing import Dict, Iterable, List, Tuple
+
+
+class HdrHistogram:
+    """Fixed-precision latency histogram with logarithmic buckets"""
+
+    def __init__(self, lowest: int = 1, highest: int = 3_600_000_000, significant_figures: int = 3):
+        if lowest < 1 or highest < 2 * lowest:
+            raise ValueError("HdrHistogram needs 1 <= lowest and highest >= 2 * lowest")
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.lowest = lowest
+        self.highest = highest
+        self.significant_figures = significant_figures
+
+        largest_single_unit_value = 2 * 10 ** significant_figures
+        self._unit_magnitude = int(math.floor(math.log2(lowest)))
+        sub_bucket_count_magnitude = int(math.ceil(math.log2(largest_single_unit_value)))
+        self._sub_bucket_half_count_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self._sub_bucket_count = 1 << (self._sub_bucket_half_count_magnitude + 1)
+        self._sub_bucket_half_count = self._sub_bucket_count // 2
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        smallest_untrackable = self._sub_bucket_count << self._unit_magnitude
+        bucket_count = 1
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self._counts: List[int] = [0] * ((bucket_count + 1) * self._sub_bucket_half_count)
+
+        self.total_count = 0
+        self.clamped_count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+    # -- index math --------------------------------------------------------
+
+    def _indexes(self, value: int) -> Tuple[int, int]:
+        bucket_index = (value | self._sub_bucket_mask).bit_length() - self._unit_magnitude - (
+            self._sub_bucket_half_count_magnitude + 1
+        )
+        return bucket_index, value >> (bucket_index + self._unit_magnitude)
+
+    def _counts_index(self, value: int) -> int:
+        bucket_index, sub_bucket_index = self._indexes(value)
+        return ((bucket_index + 1) << self._sub_bucket_half_count_magnitude) + sub_bucket_index - self._sub_bucket_half_count
+
+    def _value_at_index(self, index: int) -> int:
+        bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << (bucket_index + self._unit_magnitude)
+
+    def _equivalent_range(self, value: int) -> int:
+        bucket_index, sub_bucket_index = self._indexes(value)
+        if sub_bucket_index >= self._sub_bucket_count:
+            bucket_index += 1
+        return 1 << (self._unit_magnitude + bucket_index)
+
+    def lowest_equivalent_value(self, value: int) -> int:
+        bucket_index, sub_bucket_index = self._indexes(value)
+        return sub_bucket_index << (bucket_index + self._unit_magnitude)
+
+    def highest_equivalent_value(self, value: int) -> int:
+        """Largest value that shares ``value``'s bucket (what percentiles report)"""
+        return self.lowest_equivalent_value(value) + self._equivalent_range(value) - 1
+
+    # -- recording ---------------------------------------------------------
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record ``count`` occurrences of ``value`` (clamped to [0, highest])"""
+        value = int(value)
+        if value < 0:
+            value = 0
+        elif value > self.highest:
+            value = self.highest
+            self.clamped_count += count
+        self._counts[self._counts_index(value)] += count
+        if self.total_count == 0 or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        self.total_count += count
+        self._total += value * count
+
+    def merge(self, other: "HdrHistogram") -> None:
+        """Add every value recorded in ``other``; both must share one layout"""
+        if len(other._counts) != len(self._counts) or other._unit_magnitude != self._unit_magnitude:
+            raise ValueError("Cannot merge histograms with different ranges or precision")
+        if other.total_count == 0:
+            return
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+        self._min = other._min if self.total_count == 0 else min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self.total_count += other.total_count
+        self.clamped_count += other.clamped_count
+        self._total += other._total
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.total_count = self.clamped_count = self._total = self._min = self._max = 0
+
+    # -- queries -----------------------------------------------------------
+
+    @property
+    def min(self) -> int:
+        return self._min
+
+    @property
+    def max(self) -> int:
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        return self._total / self.total_count if self.total_count else 0.0
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Smallest recorded value (to histogram precision) at or above ``percentile``"""
+        if self.total_count == 0:
+            return 0
+        percentile = min(max(percentile, 0.0), 100.0)
+        target = max(1, int(percentile / 100.0 * self.total_count + 0.5))
+        running = 0
+        for index, count in enumerate(self._counts):
+            running += count
+            if running >= target:
+                return min(self.highest_equivalent_value(self._value_at_index(index)), self._max)
+        return self._max
+
+    def percentiles(self, percentiles: Iterable[float] = (50, 90, 99, 99.9)) -> Dict[float, int]:
+        return {p: self.value_at_percentile(p) for p in percentiles}
@@ -6,7 +6,9 @@ in the SarvanOM platform. It includes concurrent request testing, performance
 benchmarking, and stress testing scenarios.
 
 Features:
-- Concurrent user simulation
+- Open-loop load generation (see open_loop.py): requests follow a fixed
+  arrival schedule and latency is measured from the intended send time, so
+  service stalls are not hidden by coordinated omission
 - Service-specific load tests
 - Performance metrics collection
 - Stress testing scenarios
@@ -17,12 +19,18 @@ import asyncio
 import aiohttp
 import time
 import json
-import statistics
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
 import logging
+import sys
 from datetime import datetime
+from pathlib import Path
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from load_testing.open_loop import RequestSpec, aiohttp_sender, constant_schedule, poisson_schedule, run_open_loop
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -56,6 +64,9 @@ class LoadTestConfig:
     concurrent_users: int = 10
     duration_seconds: int = 60
     ramp_up_seconds: int = 10
+    # Open-loop arrival rate; defaults to 10 requests/s per concurrent user
+    arrival_rate: Optional[float] = None
+    schedule: str = "poisson"
 
 class LoadTestFramework:
     """Main load testing framework"""
@@ -123,60 +134,34 @@ class LoadTestFramework:
     async def run_load_test(self, config: LoadTestConfig) -> LoadTestResult:
         """Run a load test for a specific service and endpoint"""
         logger.info(f"Starting load test for {config.service_url}{config.endpoint}")
-        logger.info(f"Concurrent users: {config.concurrent_users}, Duration: {config.duration_seconds}s")
-        
-        start_time = time.time()
-        end_time = start_time + config.duration_seconds
-        ramp_up_end = start_time + config.ramp_up_seconds
-        
-        # Track results
-        response_times = []
-        successful_requests = 0
-        failed_requests = 0
-        errors = []
-        
-        # Create tasks for concurrent users
-        tasks = []
-        for user_id in range(config.concurrent_users):
-            task = asyncio.create_task(
-                self._user_simulation(config, start_time, end_time, ramp_up_end, user_id)
-            )
-            tasks.append(task)
-        
-        # Wait for all tasks to complete
-        user_results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Aggregate results
-        for user_result in user_results:
-            if isinstance(user_result, Exception):
-                errors.append(f"User simulation error: {str(user_result)}")
-                continue
-                
-            for result in user_result:
-                response_times.append(result["response_time"])
-                if result["success"]:
-                    successful_requests += 1
-                else:
-                    failed_requests += 1
-                    if result["error"]:
-                        errors.append(result["error"])
-        
-        total_requests = successful_requests + failed_requests
-        actual_duration = time.time() - start_time
-        
-        # Calculate statistics
-        if response_times:
-            avg_response_time = statistics.mean(response_times)
-            min_response_time = min(response_times)
-            max_response_time = max(response_times)
-            p95_response_time = self._percentile(response_times, 95)
-            p99_response_time = self._percentile(response_times, 99)
+        rate = config.arrival_rate or config.concurrent_users * 10.0
+        logger.info(f"Arrival rate: {rate:g} req/s ({config.schedule}), Duration: {config.duration_seconds}s")
+
+        request = RequestSpec(config.method.upper(), config.endpoint, config.payload, config.headers or {})
+        if config.schedule == "constant":
+            schedule = constant_schedule(request, rate, config.duration_seconds, config.ramp_up_seconds)
         else:
-            avg_response_time = min_response_time = max_response_time = 0
-            p95_response_time = p99_response_time = 0
-        
-        requests_per_second = total_requests / actual_duration if actual_duration > 0 else 0
-        
+            schedule = poisson_schedule(request, rate, config.duration_seconds, config.ramp_up_seconds)
+
+        run = await run_open_loop(schedule, aiohttp_sender(self.session, config.service_url), timeout_s=30)
+
+        errors = [f"{error} ({count}x)" for error, count in run.errors.most_common()]
+        errors += [f"HTTP {status} ({count}x)" for status, count in run.status_counts.items() if status >= 400]
+        successful_requests = sum(count for status, count in run.status_counts.items() if status < 400)
+        total_requests = run.completed
+        failed_requests = total_requests - successful_requests
+        requests_per_second = total_requests / run.duration_s if run.duration_s > 0 else 0
+
+        # Response times in seconds, measured from the intended send time
+        latency = run.latency
+        avg_response_time = latency.mean / 1e6
+        min_response_time = latency.min / 1e6
+        max_response_time = latency.max / 1e6
+        p95_response_time = latency.value_at_percentile(95) / 1e6
+        p99_response_time = latency.value_at_percentile(99) / 1e6
+        if run.dropped:
+            errors.append(f"{run.dropped} arrivals dropped (too many requests in flight)")
+
         result = LoadTestResult(
             service_name=config.service_url.split("//")[1].split(":")[0],
             endpoint=config.endpoint,
@@ -199,42 +184,6 @@ class LoadTestFramework:
         
         return result
     
-    async def _user_simulation(self, config: LoadTestConfig, start_time: float, 
-                             end_time: float, ramp_up_end: float, user_id: int) -> List[Dict]:
-        """Simulate a single user making requests"""
-        results = []
-        current_time = time.time()
-        
-        while current_time < end_time:
-            # Ramp up phase - gradually increase request rate
-            if current_time < ramp_up_end:
-                ramp_up_progress = (current_time - start_time) / (ramp_up_end - start_time)
-                # Start with 1 request per second, ramp up to full rate
-                base_interval = 1.0 / (1 + ramp_up_progress * 9)  # 1s to 0.1s
-            else:
-                base_interval = 0.1  # 10 requests per second
-            
-            # Add some jitter
-            interval = base_interval + (time.time() % 0.1) * 0.1
-            
-            # Make request
-            result = await self.make_request(config)
-            results.append(result)
-            
-            # Wait before next request
-            await asyncio.sleep(interval)
-            current_time = time.time()
-        
-        return results
-    
-    def _percentile(self, data: List[float], percentile: int) -> float:
-        """Calculate percentile of data"""
-        if not data:
-            return 0
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
-    
     def generate_report(self) -> str:
         """Generate a comprehensive load test report"""
         if not self.results:
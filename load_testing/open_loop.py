@@ -0,0 +1,347 @@
+"""
+Open-Loop Load Generator
+
+The closed-loop user simulation in load_test_framework.py waits for each
+response before sending the next request, so when the service stalls the
+generator stops sending and the stall never shows up in the percentiles
+(coordinated omission). This generator is open-loop:
+- Requests are sent on a schedule fixed up front (constant arrival rate,
+  Poisson arrivals, or a replayed JSONL traffic trace), whether or not
+  earlier requests have completed
+- Latency is measured from each request's intended send time, so time a
+  request spent queued behind a stall counts against it; service time
+  (from the actual send) is recorded separately
+- Latencies go into HDR histograms (overall and per endpoint)
+
+Trace format (one JSON object per line):
+    {"t": 0.25, "method": "POST", "path": "/search", "body": {"query": "..."}}
+``t`` is seconds from the start of the trace (or ``ts``, an absolute epoch
+timestamp); ``headers`` and ``name`` are optional.
+
+Usage:
+    python -m load_testing.open_loop --url http://localhost:8000 --rate 50 --duration 60 --path /health
+    python -m load_testing.open_loop --url http://localhost:8000 --trace traffic.jsonl --speed 2
+
+Following MAANG/OpenAI/Perplexity standards for load testing.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import math
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+if __package__ in (None, ""):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from load_testing.hdr_histogram import HdrHistogram
+
+logger = logging.getLogger(__name__)
+
+US_PER_S = 1_000_000
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+@dataclass
+class RequestSpec:
+    """One request to send"""
+    method: str = "GET"
+    path: str = "/"
+    body: Optional[Any] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    name: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{self.method.upper()} {self.path.split('?')[0]}"
+
+
+@dataclass
+class Arrival:
+    """A request and the offset (seconds from the run start) it is due"""
+    offset_s: float
+    request: RequestSpec
+
+
+Sender = Callable[[RequestSpec], Awaitable[int]]
+
+
+def _request_cycle(requests: Union[RequestSpec, Sequence[RequestSpec]]) -> Iterator[RequestSpec]:
+    if isinstance(requests, RequestSpec):
+        return itertools.repeat(requests)
+    return itertools.cycle(requests)
+
+
+def constant_schedule(
+    requests: Union[RequestSpec, Sequence[RequestSpec]],
+    rate: float,
+    duration_s: float,
+    ramp_up_s: float = 0.0,
+) -> Iterator[Arrival]:
+    """Evenly spaced arrivals at ``rate`` per second, ramping linearly from zero over ``ramp_up_s``"""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    cycle = _request_cycle(requests)
+    ramp_arrivals = rate * ramp_up_s / 2
+    for k in itertools.count():
+        if k < ramp_arrivals:
+            offset = math.sqrt(2 * ramp_up_s * k / rate)
+        else:
+            offset = ramp_up_s + (k - ramp_arrivals) / rate
+        if offset >= duration_s:
+            return
+        yield Arrival(offset, next(cycle))
+
+
+def poisson_schedule(
+    requests: Union[RequestSpec, Sequence[RequestSpec]],
+    rate: float,
+    duration_s: float,
+    ramp_up_s: float = 0.0,
+    seed: Optional[int] = None,
+) -> Iterator[Arrival]:
+    """Poisson arrivals (exponential gaps) averaging ``rate`` per second, thinned during the ramp"""
+    if rate <= 0:
+        raise ValueError("rate must be positive")
+    rng = random.Random(seed)
+    cycle = _request_cycle(requests)
+    offset = 0.0
+    while True:
+        offset += rng.expovariate(rate)
+        if offset >= duration_s:
+            return
+        if offset < ramp_up_s and rng.random() >= offset / ramp_up_s:
+            continue
+        yield Arrival(offset, next(cycle))
+
+
+def load_trace(path: Union[str, Path], speed: float = 1.0) -> List[Arrival]:
+    """Read a JSONL traffic trace; ``speed`` > 1 replays it faster"""
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    raw = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+                at = float(entry["t"] if "t" in entry else entry["ts"])
+            except (ValueError, KeyError) as e:
+                raise ValueError(f"{path}:{line_number}: invalid trace entry ({e})") from e
+            request = RequestSpec(
+                method=entry.get("method", "GET"),
+                path=entry.get("path", "/"),
+                body=entry.get("body"),
+                headers=entry.get("headers") or {},
+                name=entry.get("name"),
+            )
+            raw.append((at, request))
+    if not raw:
+        return []
+    raw.sort(key=lambda item: item[0])
+    start = raw[0][0]
+    return [Arrival((at - start) / speed, request) for at, request in raw]
+
+
+class OpenLoopResult:
+    """Latency histograms and counters from one open-loop run"""
+
+    def __init__(self):
+        self.latency = HdrHistogram()
+        self.service_time = HdrHistogram()
+        self.endpoints: Dict[str, HdrHistogram] = {}
+        self.status_counts: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.scheduled = 0
+        self.completed = 0
+        self.dropped = 0
+        self.max_send_lag_s = 0.0
+        self.duration_s = 0.0
+
+    def record(self, label: str, latency_s: float, service_s: float, status: Optional[int], error: Optional[str]) -> None:
+        latency_us = latency_s * US_PER_S
+        self.latency.record(latency_us)
+        self.service_time.record(service_s * US_PER_S)
+        if label not in self.endpoints:
+            self.endpoints[label] = HdrHistogram()
+        self.endpoints[label].record(latency_us)
+        self.completed += 1
+        if status is not None:
+            self.status_counts[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+    @staticmethod
+    def _ms(histogram: HdrHistogram) -> Dict[str, float]:
+        row = {f"p{p:g}": round(histogram.value_at_percentile(p) / 1000, 3) for p in REPORT_PERCENTILES}
+        row["max"] = round(histogram.max / 1000, 3)
+        row["mean"] = round(histogram.mean / 1000, 3)
+        return row
+
+    def summary(self) -> Dict[str, Any]:
+        ok = sum(count for status, count in self.status_counts.items() if status < 400)
+        return {
+            "scheduled": self.scheduled,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "successful": ok,
+            "duration_s": round(self.duration_s, 3),
+            "throughput_rps": round(self.completed / self.duration_s, 2) if self.duration_s else 0.0,
+            "max_send_lag_ms": round(self.max_send_lag_s * 1000, 3),
+            "latency_ms": self._ms(self.latency),
+            "service_time_ms": self._ms(self.service_time),
+            "endpoints": {label: self._ms(histogram) for label, histogram in sorted(self.endpoints.items())},
+            "status_counts": {str(status): count for status, count in sorted(self.status_counts.items())},
+            "errors": dict(self.errors.most_common(10)),
+        }
+
+
+async def _fire(arrival: Arrival, intended: float, send: Sender, result: OpenLoopResult, timeout_s: float) -> None:
+    loop = asyncio.get_running_loop()
+    sent = loop.time()
+    status: Optional[int] = None
+    error: Optional[str] = None
+    try:
+        status = await asyncio.wait_for(send(arrival.request), timeout=timeout_s)
+    except asyncio.TimeoutError:
+        error = "timeout"
+    except Exception as e:
+        error = type(e).__name__
+    done = loop.time()
+    result.record(arrival.request.label, done - intended, done - sent, status, error)
+
+
+async def run_open_loop(
+    schedule: Iterable[Arrival],
+    send: Sender,
+    max_in_flight: int = 10_000,
+    timeout_s: float = 30.0,
+) -> OpenLoopResult:
+    """Send every arrival at its scheduled time without waiting for earlier responses
+
+    Requests beyond ``max_in_flight`` outstanding are counted as dropped rather
+    than delayed, so the schedule is never bent to fit the service.
+    """
+    result = OpenLoopResult()
+    loop = asyncio.get_running_loop()
+    in_flight = set()
+    start = loop.time()
+    for arrival in schedule:
+        result.scheduled += 1
+        intended = start + arrival.offset_s
+        delay = intended - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        result.max_send_lag_s = max(result.max_send_lag_s, loop.time() - intended)
+        if len(in_flight) >= max_in_flight:
+            result.dropped += 1
+            continue
+        task = loop.create_task(_fire(arrival, intended, send, result, timeout_s))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+    if in_flight:
+        await asyncio.gather(*in_flight)
+    result.duration_s = loop.time() - start
+    if result.max_send_lag_s > 0.01:
+        logger.warning(f"Load generator fell {result.max_send_lag_s * 1000:.1f}ms behind schedule; it may be saturated")
+    return result
+
+
+def _body_kwargs(body: Any, json_key: str, data_key: str) -> Dict[str, Any]:
+    if body is None:
+        return {}
+    if isinstance(body, (str, bytes)):
+        return {data_key: body}
+    return {json_key: body}
+
+
+def httpx_sender(client) -> Sender:
+    """Sender over an ``httpx.AsyncClient`` (with ``base_url`` set, or ASGITransport in-process)"""
+    async def send(request: RequestSpec) -> int:
+        response = await client.request(
+            request.method, request.path, headers=request.headers, **_body_kwargs(request.body, "json", "content")
+        )
+        return response.status_code
+    return send
+
+
+def aiohttp_sender(session, base_url: str) -> Sender:
+    """Sender over an ``aiohttp.ClientSession``"""
+    base_url = base_url.rstrip("/")
+
+    async def send(request: RequestSpec) -> int:
+        async with session.request(
+            request.method, f"{base_url}{request.path}", headers=request.headers,
+            **_body_kwargs(request.body, "json", "data"),
+        ) as response:
+            await response.read()
+            return response.status
+    return send
+
+
+async def _run_cli(args) -> Dict[str, Any]:
+    import httpx
+
+    if args.trace:
+        schedule: Iterable[Arrival] = load_trace(args.trace, speed=args.speed)
+    else:
+        request = RequestSpec(args.method, args.path, json.loads(args.body) if args.body else None)
+        make = poisson_schedule if args.schedule == "poisson" else constant_schedule
+        extra = {"seed": args.seed} if args.schedule == "poisson" else {}
+        schedule = make(request, args.rate, args.duration, ramp_up_s=args.ramp_up, **extra)
+
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        result = await run_open_loop(schedule, httpx_sender(client), args.max_in_flight, args.timeout)
+    return result.summary()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="Base URL of the service under test")
+    parser.add_argument("--rate", type=float, default=10.0, help="Target arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Run length (s)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Linear ramp to the target rate (s)")
+    parser.add_argument("--schedule", choices=("poisson", "constant"), default="poisson")
+    parser.add_argument("--seed", type=int, help="Seed for Poisson arrivals")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--body", help="JSON request body")
+    parser.add_argument("--trace", help="JSONL traffic trace to replay instead of a synthetic schedule")
+    parser.add_argument("--speed", type=float, default=1.0, help="Trace replay speed multiplier")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Outstanding requests before arrivals are dropped")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    summary = asyncio.run(_run_cli(args))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+
+    print(
+        f"{summary['completed']}/{summary['scheduled']} requests in {summary['duration_s']}s "
+        f"({summary['throughput_rps']} req/s), {summary['dropped']} dropped, "
+        f"max send lag {summary['max_send_lag_ms']}ms"
+    )
+    columns = ["p50", "p90", "p99", "p99.9", "max"]
+    print(f"{'latency (ms)':<32}" + "".join(f"{c:>10}" for c in columns))
+    rows = [("all (from intended send)", summary["latency_ms"]), ("service time", summary["service_time_ms"])]
+    rows += list(summary["endpoints"].items())
+    for label, row in rows:
+        print(f"{label[:31]:<32}" + "".join(f"{row[c]:>10}" for c in columns))
+    print(f"status: {summary['status_counts']}  errors: {summary['errors']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+"""
+Local Provider Stubs
+
+One FastAPI app that answers like the external providers the gateway
+calls, so load tests measure SarvanOM rather than third-party APIs and
+network weather:
+- Brave Search:  GET /res/v1/web/search
+- Wikipedia:     GET /w/api.php (action=query&list=search),
+                 GET /api/rest_v1/page/summary/{title}
+- Ollama:        GET /api/tags, POST /api/generate, POST /api/chat
+                 (NDJSON streaming unless "stream": false)
+- Qdrant:        GET /collections, GET /collections/{name},
+                 POST /collections/{name}/points/search and /points/query
+- GET /_stub/stats: requests, injected errors and simulated latency per provider
+
+Each provider has its own latency distribution and error rate. Point the
+gateway at the stubs with OLLAMA_BASE_URL / QDRANT_URL and, for providers
+with fixed URLs, HTTP_UPSTREAM_OVERRIDES (see shared/core/http_client_registry.py):
+
+    HTTP_UPSTREAM_OVERRIDES=api.search.brave.com=http://127.0.0.1:8999,en.wikipedia.org=http://127.0.0.1:8999
+    OLLAMA_BASE_URL=http://127.0.0.1:8999
+    QDRANT_URL=http://127.0.0.1:8999
+
+Latency specs (milliseconds): fixed:50, uniform:20,80, normal:100,15,
+lognormal:120,0.5 (median, sigma), exponential:40 (mean).
+
+Usage:
+    python -m load_testing.stub_server --port 8999 --latency brave=lognormal:150,0.4 --error-rate ollama=0.01
+
+Following MAANG/OpenAI/Perplexity standards for load testing.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("brave", "wikipedia", "ollama", "qdrant")
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """A latency distribution in milliseconds"""
+    kind: str
+    params: tuple
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """Parse ``kind:param[,param]``, e.g. ``lognormal:120,0.5``"""
+        kind, _, params = spec.strip().partition(":")
+        kind = kind.lower()
+        if kind not in cls.KINDS:
+            raise ValueError(f"Unknown latency distribution {kind!r}; expected one of {sorted(cls.KINDS)}")
+        try:
+            values = tuple(float(p) for p in params.split(",") if p.strip())
+        except ValueError:
+            raise ValueError(f"Invalid latency parameters in {spec!r}") from None
+        if len(values) != cls.KINDS[kind]:
+            raise ValueError(f"{kind} latency takes {cls.KINDS[kind]} parameter(s), got {spec!r}")
+        return cls(kind, values)
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency in seconds (never negative)"""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(*self.params)
+        elif self.kind == "normal":
+            ms = rng.gauss(*self.params)
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            ms = rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        else:
+            ms = rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        return max(ms, 0.0) / 1000
+
+
+DEFAULT_LATENCY = {
+    "brave": "lognormal:150,0.4",
+    "wikipedia": "lognormal:80,0.5",
+    "ollama": "lognormal:400,0.3",
+    "qdrant": "lognormal:8,0.5",
+}
+
+
+def _parse_provider_map(value: str) -> Dict[str, str]:
+    """``provider=value;provider=value`` (semicolons, since latency specs contain commas)"""
+    result = {}
+    for item in value.split(";"):
+        provider, sep, setting = item.partition("=")
+        if not sep:
+            continue
+        provider = provider.strip().lower()
+        if provider not in PROVIDERS:
+            raise ValueError(f"Unknown provider {provider!r}; expected one of {PROVIDERS}")
+        result[provider] = setting.strip()
+    return result
+
+
+@dataclass
+class StubConfig:
+    """Provider stub configuration"""
+    latency: Dict[str, LatencyDistribution] = field(
+        default_factory=lambda: {p: LatencyDistribution.parse(s) for p, s in DEFAULT_LATENCY.items()}
+    )
+    error_rate: Dict[str, float] = field(default_factory=dict)
+    token_delay_ms: float = 5.0
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_environment(cls) -> "StubConfig":
+        """Load configuration from environment variables"""
+        config = cls(token_delay_ms=float(os.getenv("STUB_TOKEN_DELAY_MS", "5")))
+        seed = os.getenv("STUB_SEED")
+        config.seed = int(seed) if seed else None
+        config.update(
+            latency=_parse_provider_map(os.getenv("STUB_LATENCY", "")),
+            error_rate=_parse_provider_map(os.getenv("STUB_ERROR_RATE", "")),
+        )
+        return config
+
+    def update(self, latency: Dict[str, str], error_rate: Dict[str, str]) -> None:
+        for provider, spec in latency.items():
+            self.latency[provider] = LatencyDistribution.parse(spec)
+        for provider, rate in error_rate.items():
+            self.error_rate[provider] = float(rate)
+
+
+class ProviderStubs:
+    """Simulated latency, error injection and per-provider counters"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats: Dict[str, Dict[str, float]] = defaultdict(lambda: {"requests": 0, "errors": 0, "latency_s": 0.0})
+
+    async def respond(self, provider: str, body: Any, status_code: int = 200) -> JSONResponse:
+        """Wait out the provider's latency, then answer ``body`` or an injected error"""
+        failed = await self.delay(provider)
+        if failed:
+            return JSONResponse({"error": f"{provider} stub injected failure"}, status_code=503)
+        return JSONResponse(body, status_code=status_code)
+
+    async def delay(self, provider: str) -> bool:
+        """Sleep for one latency sample; True if this request should fail"""
+        latency_s = self.config.latency[provider].sample(self.rng) if provider in self.config.latency else 0.0
+        failed = self.rng.random() < self.config.error_rate.get(provider, 0.0)
+        stats = self.stats[provider]
+        stats["requests"] += 1
+        stats["latency_s"] += latency_s
+        if failed:
+            stats["errors"] += 1
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        return failed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            provider: {
+                "requests": int(s["requests"]),
+                "errors": int(s["errors"]),
+                "mean_latency_ms": round(s["latency_s"] / s["requests"] * 1000, 3) if s["requests"] else 0.0,
+            }
+            for provider, s in sorted(self.stats.items())
+        }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _words(query: str) -> list:
+    return [w for w in query.split() if w] or ["result"]
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> FastAPI:
+    """Build the provider stub app"""
+    stubs = ProviderStubs(config or StubConfig.from_environment())
+    app = FastAPI(title="SarvanOM Provider Stubs")
+    app.state.stubs = stubs
+
+    # -- Brave Search ------------------------------------------------------
+
+    @app.get("/res/v1/web/search")
+    async def brave_search(q: str = "", count: int = 10):
+        results = [
+            {
+                "title": f"{q} - result {i + 1}",
+                "url": f"https://example.com/{'-'.join(_words(q))}/{i + 1}",
+                "description": f"Stub search result {i + 1} about {q}.",
+                "age": "1 day ago",
+            }
+            for i in range(max(0, min(count, 20)))
+        ]
+        return await stubs.respond("brave", {"type": "search", "query": {"original": q}, "web": {"type": "search", "results": results}})
+
+    # -- Wikipedia ---------------------------------------------------------
+
+    @app.get("/w/api.php")
+    async def wikipedia_api(srsearch: str = "", srlimit: int = 10):
+        search = [
+            {
+                "ns": 0,
+                "title": f"{srsearch.title()} {i + 1}" if i else srsearch.title(),
+                "pageid": 1000 + i,
+                "size": 20000,
+                "wordcount": 3000,
+                "snippet": f"<span class=\"searchmatch\">{srsearch}</span> is covered by this stub article.",
+                "timestamp": _now(),
+            }
+            for i in range(max(0, min(srlimit, 50)))
+        ]
+        return await stubs.respond("wikipedia", {"batchcomplete": "", "query": {"searchinfo": {"totalhits": len(search)}, "search": search}})
+
+    @app.get("/api/rest_v1/page/summary/{title}")
+    async def wikipedia_summary(title: str):
+        name = title.replace("_", " ")
+        return await stubs.respond("wikipedia", {
+            "type": "standard",
+            "title": name,
+            "extract": f"{name} is the subject of this stub Wikipedia summary.",
+            "content_urls": {"desktop": {"page": f"https://en.wikipedia.org/wiki/{title}"}},
+        })
+
+    # -- Ollama ------------------------------------------------------------
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return await stubs.respond("ollama", {"models": [
+            {"name": name, "model": name, "modified_at": _now(), "size": 2_000_000_000, "details": {"family": "llama"}}
+            for name in ("llama3.2:3b", "llama3:8b")
+        ]})
+
+    async def ollama_completion(request: Request, chat: bool):
+        payload = await request.json()
+        model = payload.get("model", "llama3.2:3b")
+        prompt = payload["messages"][-1]["content"] if chat and payload.get("messages") else payload.get("prompt", "")
+        tokens = [f"{w} " for w in ("This stub answer covers:", *_words(prompt)[:30])]
+
+        def chunk(text: str, done: bool) -> Dict[str, Any]:
+            body: Dict[str, Any] = {"model": model, "created_at": _now(), "done": done}
+            if chat:
+                body["message"] = {"role": "assistant", "content": text}
+            else:
+                body["response"] = text
+            if done:
+                body.update(done_reason="stop", eval_count=len(tokens), prompt_eval_count=len(_words(prompt)))
+            return body
+
+        if payload.get("stream", True) is False:
+            return await stubs.respond("ollama", chunk("".join(tokens), True))
+
+        # Time to first token is the sampled latency; tokens then follow at a fixed pace
+        if await stubs.delay("ollama"):
+            return JSONResponse({"error": "ollama stub injected failure"}, status_code=503)
+
+        async def stream():
+            for token in tokens:
+                yield json.dumps(chunk(token, False)) + "\n"
+                await asyncio.sleep(stubs.config.token_delay_ms / 1000)
+            yield json.dumps(chunk("", True)) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        return await ollama_completion(request, chat=False)
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        return await ollama_completion(request, chat=True)
+
+    # -- Qdrant ------------------------------------------------------------
+
+    def qdrant(result: Any) -> Dict[str, Any]:
+        return {"result": result, "status": "ok", "time": 0.0}
+
+    def qdrant_points(collection: str, limit: int, with_payload: bool) -> list:
+        return [
+            {
+                "id": i + 1,
+                "version": 0,
+                "score": round(1.0 - i * 0.05, 4),
+                "payload": {"text": f"Stub passage {i + 1} from {collection}", "source": "stub"} if with_payload else None,
+                "vector": None,
+            }
+            for i in range(max(0, min(limit, 100)))
+        ]
+
+    @app.get("/")
+    async def qdrant_root():
+        return {"title": "qdrant - vector search engine", "version": "1.9.0"}
+
+    @app.get("/collections")
+    async def qdrant_collections():
+        return await stubs.respond("qdrant", qdrant({"collections": [{"name": "sarvanom_embeddings"}]}))
+
+    @app.get("/collections/{collection}")
+    async def qdrant_collection(collection: str):
+        return await stubs.respond("qdrant", qdrant({
+            "status": "green",
+            "optimizer_status": "ok",
+            "vectors_count": 1000,
+            "indexed_vectors_count": 1000,
+            "points_count": 1000,
+            "segments_count": 1,
+            "config": {"params": {"vectors": {"size": 384, "distance": "Cosine"}}},
+            "payload_schema": {},
+        }))
+
+    @app.post("/collections/{collection}/points/search")
+    async def qdrant_search(collection: str, request: Request):
+        payload = await request.json()
+        points = qdrant_points(collection, int(payload.get("limit", 10)), bool(payload.get("with_payload", True)))
+        return await stubs.respond("qdrant", qdrant(points))
+
+    @app.post("/collections/{collection}/points/query")
+    async def qdrant_query(collection: str, request: Request):
+        payload = await request.json()
+        points = qdrant_points(collection, int(payload.get("limit", 10)), bool(payload.get("with_payload", True)))
+        return await stubs.respond("qdrant", qdrant({"points": points}))
+
+    # -- Stats -------------------------------------------------------------
+
+    @app.get("/_stub/stats")
+    async def stub_stats():
+        return {"providers": stubs.get_stats(), "config": {
+            "latency": {p: f"{d.kind}:{','.join(f'{v:g}' for v in d.params)}" for p, d in stubs.config.latency.items()},
+            "error_rate": stubs.config.error_rate,
+        }}
+
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--latency", action="append", default=[], help="provider=spec, e.g. brave=lognormal:150,0.4")
+    parser.add_argument("--error-rate", action="append", default=[], help="provider=rate, e.g. ollama=0.01")
+    parser.add_argument("--token-delay-ms", type=float, help="Delay between streamed Ollama tokens")
+    parser.add_argument("--seed", type=int, help="Seed latency and error sampling")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = StubConfig.from_environment()
+    config.update(_parse_provider_map(";".join(args.latency)), _parse_provider_map(";".join(args.error_rate)))
+    if args.token_delay_ms is not None:
+        config.token_delay_ms = args.token_delay_ms
+    if args.seed is not None:
+        config.seed = args.seed
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(create_stub_app(config), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Audit Store Benchmark
+=====================
+
+Loads N audit trails (each with --events-per-trail events, so millions of
+events at the defaults) and times the three /audit query shapes, newest 100
+/ one user's newest 100 / the last 10 minutes, against:
+- indexed: AuditTrailStore (ring + user and time-bucket indexes)
+- dict_scan: the previous dict of trails, copied, filtered and sorted per call
+
+It also reports end-to-end ingest through AuditService with the batched
+JSON-lines writer enabled (events/s, including the final flush).
+
+Usage:
+    python scripts/benchmark_audit_store.py [--trails 100000] [--events-per-trail 10]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.services.audit_service import AuditService, AuditTrail
+from shared.core.services.audit_store import AuditStoreConfig, AuditTrailStore
+
+USERS = 1000
+
+
+def dict_scan_query(trails: Dict[str, AuditTrail], user_id=None, start_time=None, end_time=None, limit=100):
+    """The previous AuditService.get_audit_trails"""
+    result = list(trails.values())
+    if user_id:
+        result = [t for t in result if t.user_id == user_id]
+    if start_time:
+        result = [t for t in result if t.start_time >= start_time]
+    if end_time:
+        result = [t for t in result if t.start_time <= end_time]
+    result.sort(key=lambda t: t.start_time, reverse=True)
+    return result[:limit]
+
+
+def time_query(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+
+def run_queries(args) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    store = AuditTrailStore(max_trails=args.trails)
+    trails: Dict[str, AuditTrail] = {}
+    events = [object()] * args.events_per_trail
+    for i in range(args.trails):
+        trail = AuditTrail(
+            trace_id=f"t{i}", request_id=f"r{i}", user_id=f"u{i % USERS}", session_id=None,
+            start_time=now - timedelta(seconds=(args.trails - i) * 0.5), events=list(events),
+        )
+        store.add(trail)
+        trails[trail.trace_id] = trail
+
+    recent = now - timedelta(minutes=10)
+    shapes = {
+        "newest_100": ({}, {}),
+        "user_newest_100": ({"user_id": "u7"}, {"user_id": "u7"}),
+        "last_10_min": ({"start_time": recent}, {"start_time": recent}),
+    }
+    report = {}
+    for name, (store_kwargs, scan_kwargs) in shapes.items():
+        report[name] = {
+            "indexed_ms": time_query(lambda: store.query(limit=100, **store_kwargs), args.repeat),
+            "dict_scan_ms": time_query(lambda: dict_scan_query(trails, limit=100, **scan_kwargs), args.repeat),
+        }
+    return report
+
+
+async def run_ingest(args) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as log_dir:
+        service = AuditService(AuditStoreConfig(max_trails=args.trails, log_dir=log_dir))
+        await service.initialize()
+        start = time.perf_counter()
+        for i in range(args.ingest_trails):
+            trace_id = f"trace{i}"
+            service.start_audit_trail(trace_id, f"req{i}", user_id=f"u{i % USERS}")
+            for _ in range(args.events_per_trail - 2):
+                service.log_service_call(trace_id, "retrieval", "search")
+            service.end_audit_trail(trace_id, 200)
+            if i % 100 == 0:
+                await asyncio.sleep(0)  # let the writer run, as it would between requests
+        await service.close()
+        elapsed = time.perf_counter() - start
+        events = args.ingest_trails * args.events_per_trail
+        log_bytes = sum(p.stat().st_size for p in Path(log_dir).glob("*.jsonl"))
+    return {"events": events, "events_per_s": round(events / elapsed), "log_mb": round(log_bytes / 1e6, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trails", type=int, default=100000, help="Trails loaded for the query benchmark")
+    parser.add_argument("--events-per-trail", type=int, default=10, help="Events per trail")
+    parser.add_argument("--ingest-trails", type=int, default=20000, help="Trails for the ingest benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query shape")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = {
+        "trails": args.trails,
+        "events": args.trails * args.events_per_trail,
+        "queries": run_queries(args),
+        "ingest": asyncio.run(run_ingest(args)),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{report['trails']} trails / {report['events']} events, median query latency (ms)")
+    print(f"{'query':<18}{'indexed':>10}{'dict_scan':>12}")
+    for name, row in report["queries"].items():
+        print(f"{name:<18}{row['indexed_ms']:>10}{row['dict_scan_ms']:>12}")
+    ingest = report["ingest"]
+    print(f"ingest with persistence: {ingest['events_per_s']} events/s ({ingest['events']} events, {ingest['log_mb']} MB log)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Gateway Cold-Start Report
+=========================
+
+Two views of cold start:
+- imports: imports each module in a fresh interpreter and reports the
+  import time and which heavy libraries (torch, transformers,
+  sentence_transformers, PyPDF2) it pulled in; with lazy imports none of
+  them should load until a model is first used
+- warmup: with --url, fetches /startup from a running gateway and prints
+  the warmup task timeline (start/end offsets, status), the critical path
+  and the concurrent vs sequential warmup time
+
+Usage:
+    python scripts/benchmark_cold_start.py [--modules a.b,c.d] [--url http://localhost:8000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ("torch", "transformers", "sentence_transformers", "PyPDF2")
+
+DEFAULT_MODULES = (
+    "shared.core.lazy_imports",
+    "shared.embeddings.backends",
+    "shared.embeddings.model_cache",
+    "shared.core.services.vector_singleton_service",
+    "services.gateway.citations",
+    "services.gateway.huggingface_integration",
+    "services.gateway.main",
+)
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+error = None
+try:
+    __import__({module!r})
+except BaseException as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps({{
+    "import_ms": round((time.perf_counter() - start) * 1000, 1),
+    "heavy_loaded": [m for m in {heavy!r} if m in sys.modules],
+    "modules_loaded": len(sys.modules),
+    "error": error,
+}}))
+"""
+
+
+def probe_import(module: str, timeout: float) -> Dict[str, Any]:
+    code = PROBE.format(root=str(REPO_ROOT), module=module, heavy=HEAVY_MODULES)
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, timeout=timeout, cwd=REPO_ROOT
+        )
+    except subprocess.TimeoutExpired:
+        return {"import_ms": None, "heavy_loaded": [], "modules_loaded": None, "error": f"timed out after {timeout}s"}
+    lines = completed.stdout.strip().splitlines()
+    if not lines:
+        return {"import_ms": None, "heavy_loaded": [], "modules_loaded": None, "error": completed.stderr.strip()[-200:]}
+    return json.loads(lines[-1])
+
+
+def fetch_startup_report(url: str) -> Optional[Dict[str, Any]]:
+    import httpx
+
+    response = httpx.get(f"{url.rstrip('/')}/startup", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="Comma-separated modules to import")
+    parser.add_argument("--url", help="Base URL of a running gateway to fetch the warmup report from")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-module import timeout (s)")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "imports": {module: probe_import(module, args.timeout) for module in args.modules.split(",") if module},
+        "warmup": fetch_startup_report(args.url) if args.url else None,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print("import cost in a fresh interpreter")
+    print(f"{'module':<48}{'ms':>9}{'modules':>9}  heavy / error")
+    for module, row in report["imports"].items():
+        ms = "-" if row["import_ms"] is None else row["import_ms"]
+        loaded = "-" if row["modules_loaded"] is None else row["modules_loaded"]
+        note = row["error"] or (", ".join(row["heavy_loaded"]) or "none")
+        print(f"{module:<48}{ms:>9}{loaded:>9}  {note}")
+
+    warmup = report["warmup"]
+    if warmup:
+        print()
+        print(f"boot (process start -> warmup start): {warmup['boot_s']}s")
+        print(f"warmup: {warmup['warmup_s']}s concurrent vs {warmup['sequential_s']}s sequential")
+        print(f"critical path ({warmup['critical_path_s']}s): {' -> '.join(warmup['critical_path'])}")
+        print(f"{'task':<22}{'status':>9}{'start_s':>9}{'end_s':>9}  provides")
+        for name, task in sorted(warmup["tasks"].items(), key=lambda item: item[1]["start_s"] or 0):
+            print(f"{name:<22}{task['status']:>9}{str(task['start_s']):>9}{str(task['end_s']):>9}  {', '.join(task['provides'])}")
+        if warmup["lazy_imports_s"]:
+            print(f"lazy imports: {warmup['lazy_imports_s']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark
+===========================
+
+Runs the startup backend selector for a sentence-transformers model and
+reports throughput and cosine agreement with fp32 for every available
+backend (torch-fp32, torch-int8, onnx-fp32, onnx-int8). ONNX artifacts are
+exported into --cache-dir on the first run and reused afterwards.
+
+Requires sentence-transformers and torch; ONNX backends also need
+onnxruntime.
+
+Usage:
+    python scripts/benchmark_embedding_backends.py [--model sentence-transformers/all-MiniLM-L6-v2]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.embeddings.backends import (
+    BENCHMARK_TEXTS,
+    EmbeddingBackendConfig,
+    backend_factories,
+    select_backend,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2", help="Model to benchmark")
+    parser.add_argument("--cache-dir", default="./models_cache/backends", help="Exported artifact directory")
+    parser.add_argument("--texts", type=int, default=64, help="Sample texts per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per backend")
+    parser.add_argument("--batch-size", type=int, default=16, help="Encode batch size")
+    parser.add_argument("--min-agreement", type=float, default=0.99, help="Minimum cosine agreement with fp32")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("sentence-transformers is not installed", file=sys.stderr)
+        return 1
+
+    model = SentenceTransformer(args.model, device="cpu")
+    texts = [BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)] + f" ({i})" for i in range(args.texts)]
+    config = EmbeddingBackendConfig(
+        min_agreement=args.min_agreement, benchmark_rounds=args.rounds, batch_size=args.batch_size
+    )
+    artifact_dir = Path(args.cache_dir) / args.model.replace("/", "_")
+    report = select_backend(backend_factories(model, artifact_dir), config, texts).report()
+    report["model"] = args.model
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Embedding backends for {args.model} ({args.texts} texts x {args.rounds} rounds)")
+    print(f"{'backend':<12}{'texts/s':>10}{'speedup':>9}{'mean cos':>10}{'min cos':>10}  status")
+    for row in report["backends"]:
+        status = "error: " + row["error"] if row["error"] else ("ok" if row["eligible"] else "below threshold")
+        print(
+            f"{row['name']:<12}{row['texts_per_second']:>10}{row['speedup']:>8}x"
+            f"{row['mean_agreement']:>10.5f}{row['min_agreement']:>10.5f}  {status}"
+        )
+    print(f"\nselected: {report['selected']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
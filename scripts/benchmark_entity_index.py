@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+KG Entity Index Benchmark
+=========================
+
+Loads a synthetic entity set into the in-process entity index and measures
+lookup latency (p50/p95/p99) and hit@k for the mention shapes the KG lane
+sees: an exact name inside a question, a single name word, a misspelled
+word and a typed-so-far prefix.
+
+Names are built from a shared syllable vocabulary, so single-word, typo and
+prefix queries are genuinely ambiguous; hit@k for those shapes measures how
+often the intended entity survives among equally plausible ones.
+
+Usage:
+    python scripts/benchmark_entity_index.py [--entities 200000] [--queries 2000]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.kg_index import EntityIndex, EntityIndexConfig
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "to", "sha", "vi", "dor", "nel", "quo", "ber", "zan", "tel", "mar", "fi", "gus"]
+COMMON_WORDS = ["university", "of", "the", "company", "river", "national", "party", "institute"]
+TYPES = ["person", "organization", "place"]
+
+
+def generate_entities(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    vocabulary = [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(max(count * 3 // 10, 100))
+    ]
+    entities = []
+    for i in range(count):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.3:
+            words.insert(0, rng.choice(COMMON_WORDS))
+        name = " ".join(words).title()
+        aliases = ["".join(w[0] for w in words).upper()] if len(words) > 1 else []
+        entities.append({"_key": str(i), "name": name, "type": rng.choice(TYPES), "aliases": aliases})
+    return entities
+
+
+def generate_queries(entities: List[Dict[str, Any]], count: int, rng: random.Random) -> List[Tuple[str, str, str]]:
+    """(shape, query, expected key) triples."""
+    queries = []
+    for _ in range(count):
+        entity = rng.choice(entities)
+        last_word = entity["name"].split()[-1].lower()
+        roll = rng.random()
+        if roll < 0.4:
+            queries.append(("sentence", f"what is {entity['name']} known for", entity["_key"]))
+        elif roll < 0.6:
+            queries.append(("word", last_word, entity["_key"]))
+        elif roll < 0.8:
+            cut = rng.randrange(len(last_word))
+            queries.append(("typo", f"tell me about {last_word[:cut] + last_word[cut + 1:]}", entity["_key"]))
+        else:
+            queries.append(("prefix", entity["name"][:5], entity["_key"]))
+    return queries
+
+
+def percentile(values: List[float], q: int) -> float:
+    return round(statistics.quantiles(values, n=100)[q - 1], 3)
+
+
+def run(num_entities: int, num_queries: int, k: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    entities = generate_entities(num_entities, rng)
+    queries = generate_queries(entities, num_queries, rng)
+
+    index = EntityIndex(EntityIndexConfig())
+    start = time.perf_counter()
+    index.replace_all(entities)
+    load_s = time.perf_counter() - start
+
+    latencies = []
+    hits: Dict[str, List[bool]] = defaultdict(list)
+    for shape, query, expected in queries:
+        start = time.perf_counter()
+        matches = index.lookup(query, k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits[shape].append(any(m.key == expected for m in matches))
+
+    return {
+        "entities": num_entities,
+        "queries": num_queries,
+        "load_s": round(load_s, 2),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "hit_at_k": {shape: round(sum(v) / len(v), 3) for shape, v in sorted(hits.items())},
+        "stats": index.get_stats(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=200000, help="Number of entities")
+    parser.add_argument("--queries", type=int, default=2000, help="Number of lookups")
+    parser.add_argument("--k", type=int, default=10, help="Matches per lookup")
+    parser.add_argument("--seed", type=int, default=3, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = run(args.entities, args.queries, args.k, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Entity index: {report['entities']} entities loaded in {report['load_s']}s, "
+          f"{report['stats']['surfaces']} surfaces, {report['stats']['vocabulary']} words")
+    print(f"Lookup latency over {report['queries']} queries: p50 {report['p50_ms']} ms, "
+          f"p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms")
+    print(f"\n{'query shape':<14}{f'hit@{args.k}':>10}")
+    for shape, rate in report["hit_at_k"].items():
+        print(f"{shape:<14}{rate:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Full-Text Engine Benchmark - KeywordLane index
+==============================================
+
+Builds the embedded BM25F index over a synthetic Zipf-distributed corpus and
+measures:
+- Indexing throughput (docs/sec) and on-disk size
+- Query latency p50/p95/p99 with MaxScore pruning vs exhaustive scoring
+- Postings scored per query, and that pruned top-k equals exhaustive top-k
+
+Usage:
+    python scripts/benchmark_fulltext.py [--docs 100000] [--queries 300]
+    python scripts/benchmark_fulltext.py --docs 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.fulltext import FullTextConfig, FullTextIndex
+
+CONSONANTS = "bcdfghklmnprstvz"
+VOWELS = "aeiou"
+
+
+def build_vocabulary(size: int, seed: int) -> List[str]:
+    """Pronounceable pseudo-words, so the stemmer sees realistic input."""
+    rng = np.random.default_rng(seed)
+    words = set()
+    while len(words) < size:
+        syllables = rng.integers(2, 5)
+        words.add("".join(
+            CONSONANTS[rng.integers(len(CONSONANTS))] + VOWELS[rng.integers(len(VOWELS))]
+            for _ in range(syllables)
+        ))
+    return sorted(words)
+
+
+def generate_corpus(num_docs: int, vocab: List[str], title_words: int, body_words: int, seed: int):
+    """Yield documents whose word frequencies follow a Zipf distribution."""
+    rng = np.random.default_rng(seed)
+    ranks = np.arange(1, len(vocab) + 1)
+    probs = 1.0 / ranks
+    probs /= probs.sum()
+    vocab_arr = np.array(vocab)
+    batch = 10000
+    for start in range(0, num_docs, batch):
+        n = min(batch, num_docs - start)
+        titles = vocab_arr[rng.choice(len(vocab), size=(n, title_words), p=probs)]
+        bodies = vocab_arr[rng.choice(len(vocab), size=(n, body_words), p=probs)]
+        for i in range(n):
+            doc_id = start + i
+            yield {
+                "id": f"doc-{doc_id}",
+                "title": " ".join(titles[i]),
+                "content": " ".join(bodies[i]),
+                "url": f"https://corpus.example/{doc_id}",
+                "domain": "corpus.example",
+            }
+
+
+def generate_queries(num_queries: int, vocab: List[str], seed: int) -> List[str]:
+    """1-4 term queries mixing frequent and rarer terms, like real search logs."""
+    rng = np.random.default_rng(seed + 1)
+    head = min(len(vocab), 5000)
+    probs = 1.0 / np.arange(1, head + 1) ** 0.7
+    probs /= probs.sum()
+    return [
+        " ".join(vocab[i] for i in rng.choice(head, size=rng.integers(1, 5), p=probs))
+        for _ in range(num_queries)
+    ]
+
+
+def percentile(values: List[float], p: int) -> float:
+    return statistics.quantiles(values, n=100)[p - 1] if len(values) > 1 else values[0]
+
+
+def run(num_docs: int, num_queries: int, vocab_size: int, k: int, index_dir: str) -> Dict[str, Any]:
+    vocab = build_vocabulary(vocab_size, seed=7)
+    index = FullTextIndex(FullTextConfig(index_dir=index_dir, flush_docs=50000, max_segments=8))
+
+    start = time.perf_counter()
+    index.add_documents(generate_corpus(num_docs, vocab, title_words=8, body_words=40, seed=7))
+    index.commit()
+    index.wait_for_merges()
+    build_s = time.perf_counter() - start
+    size_bytes = sum(f.stat().st_size for f in Path(index_dir).glob("*.seg"))
+
+    queries = generate_queries(num_queries, vocab, seed=7)
+    report: Dict[str, Any] = {
+        "docs": num_docs,
+        "segments": index.get_stats()["segments"],
+        "build_s": round(build_s, 1),
+        "index_docs_per_s": round(num_docs / build_s),
+        "index_mb": round(size_bytes / 1e6, 1),
+    }
+    results = {}
+    for mode, exhaustive in (("maxscore", False), ("exhaustive", True)):
+        index.stats["postings_scored"] = 0
+        latencies = []
+        results[mode] = []
+        for query in queries:
+            t0 = time.perf_counter()
+            hits = index.search(query, k, exhaustive=exhaustive)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            results[mode].append([round(h.score, 6) for h in hits])
+        report[mode] = {
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "postings_per_query": round(index.stats["postings_scored"] / len(queries)),
+        }
+    report["topk_agreement"] = sum(a == b for a, b in zip(results["maxscore"], results["exhaustive"])) / len(queries)
+    index.close()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=300, help="Queries per mode")
+    parser.add_argument("--vocab", type=int, default=50000, help="Vocabulary size")
+    parser.add_argument("--k", type=int, default=10, help="Hits per query")
+    parser.add_argument("--index-dir", help="Keep the index here instead of a temp dir")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    if args.index_dir:
+        os.makedirs(args.index_dir, exist_ok=True)
+        report = run(args.docs, args.queries, args.vocab, args.k, args.index_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(args.docs, args.queries, args.vocab, args.k, tmp)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Full-text index: {report['docs']} docs, {report['segments']} segments, {report['index_mb']} MB")
+    print(f"Indexing: {report['build_s']}s ({report['index_docs_per_s']} docs/s)")
+    print(f"{'mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'postings/query':>16}")
+    for mode in ("maxscore", "exhaustive"):
+        row = report[mode]
+        print(f"{mode:<12}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['postings_per_query']:>16}")
+    print(f"Pruned top-{args.k} identical to exhaustive on {report['topk_agreement']:.0%} of queries")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Gateway Middleware Overhead Benchmark
+=====================================
+
+Drives a minimal FastAPI app in-process through raw ASGI calls and reports
+the per-request time added by the gateway middleware, relative to the same
+app with no middleware, for:
+- legacy: the previous ObservabilityMiddleware / SecurityMiddleware /
+  InputValidationMiddleware stack of three BaseHTTPMiddleware layers, with
+  request.json() in validation and uncompiled re.sub sanitizer loops
+- pipeline: GatewayPipelineMiddleware (one pure-ASGI layer, one body parse)
+
+Request shapes: a small GET, a POST with a JSON query body bound to a
+pydantic model, and a 20-event SSE stream.
+
+Usage:
+    python scripts/benchmark_gateway_middleware.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import logging
+import re
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from services.gateway.middleware.observability import TraceContext, metrics_collector
+from services.gateway.middleware.pipeline import GatewayPipelineMiddleware, ParsedBodyRoute
+from services.gateway.middleware.security import (
+    DANGEROUS_PATTERNS,
+    SQL_INJECTION_PATTERNS,
+    RateLimitConfig,
+    RateLimiter,
+    SecurityConfig,
+    SecurityMiddleware,
+)
+
+LEGACY_DANGEROUS = [p.pattern for p in DANGEROUS_PATTERNS]
+LEGACY_SQL = [p.pattern for p in SQL_INJECTION_PATTERNS]
+
+
+def legacy_sanitize(value: str, patterns) -> str:
+    value = html.escape(value.replace("\x00", ""))
+    for pattern in patterns:
+        value = re.sub(pattern, "", value, flags=re.IGNORECASE | re.DOTALL)
+    return value.strip()
+
+
+class LegacyObservability(BaseHTTPMiddleware):
+    """The previous ObservabilityMiddleware"""
+
+    async def dispatch(self, request, call_next):
+        trace_id = request.headers.get("X-Trace-ID") or request.query_params.get("trace_id") or f"trace_{uuid.uuid4().hex[:16]}"
+        request.state.trace_context = TraceContext(trace_id=trace_id, span_id=str(uuid.uuid4()))
+        start = time.time()
+        metrics_collector.increment_trace_requests(trace_id)
+        response = await call_next(request)
+        latency_ms = (time.time() - start) * 1000
+        metrics_collector.increment_request_counter(request.method, request.url.path, response.status_code)
+        metrics_collector.record_request_latency(request.method, request.url.path, latency_ms)
+        metrics_collector.record_trace_duration(trace_id, latency_ms)
+        response.headers["X-Trace-ID"] = trace_id
+        return response
+
+
+class LegacySecurity(BaseHTTPMiddleware):
+    """The previous SecurityMiddleware: checks, discarded query sanitization, headers"""
+
+    def __init__(self, app, config: SecurityConfig):
+        super().__init__(app)
+        self.checks = SecurityMiddleware(app, config)
+        self.rate_limiter = RateLimiter(config.rate_limit)
+
+    async def dispatch(self, request, call_next):
+        client_host = request.client.host if request.client else "unknown"
+        if self.rate_limiter.is_rate_limited(request.url.path, request.headers, client_host):
+            raise RuntimeError("rate limited")
+        self.checks._is_trusted_host(request.headers)
+        self.checks._validate_request_size(request.scope, request.headers)
+        for key, value in request.query_params.items():
+            legacy_sanitize(key, LEGACY_DANGEROUS + LEGACY_SQL)
+            legacy_sanitize(value, LEGACY_DANGEROUS + LEGACY_SQL)
+        response = await call_next(request)
+        for name, value in self.checks._security_headers:
+            response.headers[name.decode()] = value.decode()
+        return response
+
+
+class LegacyInputValidation(BaseHTTPMiddleware):
+    """The previous InputValidationMiddleware: request.json() before the route parses again"""
+
+    async def dispatch(self, request, call_next):
+        if request.method in ["POST", "PUT", "PATCH"] and "application/json" in request.headers.get("content-type", ""):
+            body = await request.json()
+            if "query" in body:
+                body["query"] = legacy_sanitize(body["query"], LEGACY_DANGEROUS)
+        for param in request.query_params.keys():
+            assert not any(s in param.lower() for s in ("script", "javascript", "vbscript", "data", "onload"))
+        return await call_next(request)
+
+
+class SearchBody(BaseModel):
+    query: str
+    max_results: int = 10
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+    if stack == "pipeline":
+        app.router.route_class = ParsedBodyRoute
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.post("/search")
+    async def search(body: SearchBody):
+        return {"query": body.query, "results": []}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(20):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    config = SecurityConfig(rate_limit=RateLimitConfig(requests_per_minute=10**9, burst_limit=10**9))
+    if stack == "legacy":
+        app.add_middleware(LegacyObservability)
+        app.add_middleware(LegacySecurity, config=config)
+        app.add_middleware(LegacyInputValidation)
+    elif stack == "pipeline":
+        app.add_middleware(GatewayPipelineMiddleware, config=config)
+    return app
+
+
+SEARCH_BODY = json.dumps({"query": "what is retrieval augmented generation " * 4, "max_results": 5}).encode()
+
+SHAPES = {
+    "get": ("GET", "/health", b""),
+    "post_json": ("POST", "/search", SEARCH_BODY),
+    "sse_stream": ("GET", "/stream", b""),
+}
+
+
+async def call(app, method: str, path: str, body: bytes) -> int:
+    headers = [(b"host", b"testserver"), (b"user-agent", b"bench")]
+    if body:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http", "method": method, "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": headers, "http_version": "1.1", "scheme": "http", "root_path": "",
+        "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+    }
+    sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return status
+
+
+async def measure(app, shape: str, requests: int) -> float:
+    """Median per-request latency in microseconds"""
+    method, path, body = SHAPES[shape]
+    for _ in range(200):
+        assert await call(app, method, path, body) == 200
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call(app, method, path, body)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+async def run(args) -> Dict[str, Any]:
+    apps = {stack: build_app(stack) for stack in ("bare", "legacy", "pipeline")}
+    report = {}
+    for shape in SHAPES:
+        latency = {stack: await measure(app, shape, args.requests) for stack, app in apps.items()}
+        report[shape] = {
+            "bare_us": round(latency["bare"], 1),
+            "legacy_overhead_us": round(latency["legacy"] - latency["bare"], 1),
+            "pipeline_overhead_us": round(latency["pipeline"] - latency["bare"], 1),
+        }
+    return {"requests": args.requests, "shapes": report}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests per shape and stack")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    # Request logging goes to handlers in production; keep it out of the measurement
+    logging.disable(logging.INFO)
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"median per-request middleware overhead (us) over {report['requests']} requests")
+    print(f"{'shape':<12}{'bare':>10}{'legacy':>10}{'pipeline':>10}")
+    for shape, row in report["shapes"].items():
+        print(f"{shape:<12}{row['bare_us']:>10}{row['legacy_overhead_us']:>10}{row['pipeline_overhead_us']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Hybrid Retrieval Benchmark - VectorLane index
+=============================================
+
+Compares one-call hybrid search (BM25F + dense over the same documents, fused
+top-k) against running the keyword and dense lanes separately and fusing
+their top-k lists afterwards with RRF, the way the retrieval service fuses
+lanes. Reports recall@10 and latency p50/p95, with and without a filter.
+
+The corpus is synthetic with known relevance: every document belongs to a
+subtopic of a topic. Embeddings are the topic centroid plus a weaker subtopic
+offset plus noise, so dense search finds the right topic but blurs
+subtopics. Subtopic keywords appear in only some of the subtopic's documents,
+so keyword search is precise but incomplete. A query targets one subtopic;
+its relevant documents are that subtopic's documents.
+
+Usage:
+    python scripts/benchmark_hybrid.py [--docs 100000] [--queries 300]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.fulltext import FullTextConfig, FullTextIndex
+
+SUBTOPICS_PER_TOPIC = 10
+DOCS_PER_SUBTOPIC = 20
+DOMAINS = 4
+
+
+def generate_corpus(num_docs: int, dim: int, seed: int):
+    """Documents, their subtopic, and each subtopic's query text and vector."""
+    rng = np.random.default_rng(seed)
+    num_subtopics = max(num_docs // DOCS_PER_SUBTOPIC, SUBTOPICS_PER_TOPIC)
+    num_topics = max(num_subtopics // SUBTOPICS_PER_TOPIC, 1)
+    topic_centroids = rng.normal(size=(num_topics, dim))
+    sub_offsets = rng.normal(size=(num_subtopics, dim)) * 0.5
+    # Two marker words per subtopic, a shared word per topic, Zipf background words
+    sub_words = [(f"kw{s}a", f"kw{s}b") for s in range(num_subtopics)]
+    background = np.array([f"bg{i}" for i in range(20000)])
+    probs = 1.0 / np.arange(1, len(background) + 1)
+    probs /= probs.sum()
+
+    subtopic_of = rng.integers(0, num_subtopics, num_docs)
+    vectors = (
+        topic_centroids[subtopic_of // SUBTOPICS_PER_TOPIC]
+        + sub_offsets[subtopic_of]
+        + rng.normal(size=(num_docs, dim)) * 1.2
+    ).astype(np.float32)
+    noise_words = background[rng.choice(len(background), size=(num_docs, 30), p=probs)]
+    docs = []
+    for i in range(num_docs):
+        s = int(subtopic_of[i])
+        words = list(noise_words[i]) + [f"topic{s // SUBTOPICS_PER_TOPIC}"]
+        # Each marker word is present in only ~30% of the subtopic's documents,
+        # and half the documents also mention a sibling subtopic's marker
+        words += [w for w in sub_words[s] if rng.random() < 0.3]
+        if rng.random() < 0.5:
+            sibling = s - s % SUBTOPICS_PER_TOPIC + int(rng.integers(SUBTOPICS_PER_TOPIC))
+            words.append(sub_words[min(sibling, num_subtopics - 1)][int(rng.integers(2))])
+        rng.shuffle(words)
+        docs.append({
+            "id": str(i),
+            "title": " ".join(words[:6]),
+            "content": " ".join(words[6:]),
+            "domain": f"d{i % DOMAINS}.example",
+            "vector": vectors[i],
+        })
+
+    queries = []
+    for s in rng.choice(num_subtopics, size=min(num_subtopics, 2000), replace=False):
+        query_vector = topic_centroids[s // SUBTOPICS_PER_TOPIC] + sub_offsets[s] + rng.normal(size=dim) * 0.3
+        queries.append({
+            "text": " ".join(sub_words[s]),
+            "vector": query_vector.astype(np.float32),
+            "relevant": set(np.flatnonzero(subtopic_of == s).astype(str).tolist()),
+        })
+    return docs, queries
+
+
+def rrf(lists: List[List[str]], k: int, rrf_k: int = 60) -> List[str]:
+    scores: Dict[str, float] = {}
+    for ids in lists:
+        for rank, doc_id in enumerate(ids, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores, key=lambda d: -scores[d])[:k]
+
+
+def percentile(values: List[float], p: int) -> float:
+    return statistics.quantiles(values, n=100)[p - 1] if len(values) > 1 else values[0]
+
+
+def measure(queries: List[Dict[str, Any]], strategy: Callable[[Dict[str, Any]], List[str]], k: int,
+            allowed: Callable[[str], bool] = lambda _: True) -> Dict[str, float]:
+    latencies, recalls = [], []
+    for query in queries:
+        t0 = time.perf_counter()
+        ids = strategy(query)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        relevant: Set[str] = {d for d in query["relevant"] if allowed(d)}
+        if relevant:
+            recalls.append(len(set(ids[:k]) & relevant) / min(k, len(relevant)))
+    return {
+        "recall_at_k": round(statistics.mean(recalls), 4),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+    }
+
+
+def run(num_docs: int, num_queries: int, dim: int, k: int, index_dir: str) -> Dict[str, Any]:
+    docs, queries = generate_corpus(num_docs, dim, seed=11)
+    queries = queries[:num_queries]
+    index = FullTextIndex(FullTextConfig(index_dir=index_dir, flush_docs=50000, max_segments=8))
+    start = time.perf_counter()
+    index.add_documents(docs)
+    index.commit()
+    index.wait_for_merges()
+    build_s = time.perf_counter() - start
+
+    def ids(hits):
+        return [h.doc_id for h in hits]
+
+    def separate(query, filters=None):
+        # Two independent lanes, each returning its own top-k, fused afterwards;
+        # the keyword lane has no filter support, so its results are post-filtered
+        keyword = ids(index.search(query["text"], k))
+        if filters:
+            keyword = [d for d in keyword if int(d) % DOMAINS == 0]
+        dense = ids(index.dense_search(query["vector"], k, filters=filters))
+        return rrf([keyword, dense], k)
+
+    strategies = {
+        "keyword_only": lambda q: ids(index.search(q["text"], k)),
+        "dense_only": lambda q: ids(index.dense_search(q["vector"], k)),
+        "separate_lanes_rrf": separate,
+        "hybrid_rrf": lambda q: ids(index.hybrid_search(q["text"], q["vector"], k, fusion="rrf")),
+        "hybrid_convex": lambda q: ids(index.hybrid_search(q["text"], q["vector"], k, fusion="convex")),
+    }
+    filters = {"domain": "d0.example"}
+    filtered = {
+        "separate_lanes_rrf": lambda q: separate(q, filters),
+        "hybrid_rrf": lambda q: ids(index.hybrid_search(q["text"], q["vector"], k, filters=filters)),
+    }
+
+    def in_domain(doc_id):
+        return int(doc_id) % DOMAINS == 0
+
+    report = {
+        "docs": num_docs,
+        "queries": len(queries),
+        "dim": dim,
+        "segments": index.get_stats()["segments"],
+        "build_s": round(build_s, 1),
+        "unfiltered": {name: measure(queries, fn, k) for name, fn in strategies.items()},
+        "filtered": {name: measure(queries, fn, k, in_domain) for name, fn in filtered.items()},
+    }
+    index.close()
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000, help="Corpus size")
+    parser.add_argument("--queries", type=int, default=300, help="Queries per strategy")
+    parser.add_argument("--dim", type=int, default=64, help="Embedding dimensions")
+    parser.add_argument("--k", type=int, default=10, help="Hits per query")
+    parser.add_argument("--index-dir", help="Keep the index here instead of a temp dir")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    if args.index_dir:
+        os.makedirs(args.index_dir, exist_ok=True)
+        report = run(args.docs, args.queries, args.dim, args.k, args.index_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run(args.docs, args.queries, args.dim, args.k, tmp)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Hybrid index: {report['docs']} docs, dim {report['dim']}, {report['segments']} segments, "
+          f"built in {report['build_s']}s; {report['queries']} queries")
+    for section in ("unfiltered", "filtered"):
+        print(f"\n{section}")
+        print(f"{'strategy':<22}{f'recall@{args.k}':>12}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, row in report[section].items():
+            print(f"{name:<22}{row['recall_at_k']:>12}{row['p50_ms']:>10}{row['p95_ms']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
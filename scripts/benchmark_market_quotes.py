@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Market Quote Coalescing Benchmark
+=================================
+
+Runs 50 concurrent market queries drawn from a small shared ticker set
+through YahooFinanceProvider against a simulated Yahoo multi-quote endpoint
+(fixed round trip plus a small per-symbol cost), and reports upstream
+requests, wall time and per-query latency for:
+- per_symbol: one request per symbol per query (the previous behaviour)
+- coalesced: concurrent symbols batched into shared multi-quote requests
+- warm: a second wave of the same queries served from the quote cache
+
+Usage:
+    python scripts/benchmark_market_quotes.py [--queries 50] [--rtt-ms 80]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.feeds.providers.markets_providers import YahooFinanceProvider
+from services.feeds.quote_service import QuoteServiceConfig
+
+TICKERS = ["AAPL", "GOOGL", "MSFT", "AMZN", "TSLA", "META", "NVDA", "NFLX", "AMD", "INTC"]
+
+
+class SimulatedYahoo:
+    def __init__(self, rtt_s: float, per_symbol_s: float):
+        self.rtt_s = rtt_s
+        self.per_symbol_s = per_symbol_s
+        self.requests = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        symbols = request.url.params["symbols"].split(",")
+        await asyncio.sleep(self.rtt_s + self.per_symbol_s * len(symbols))
+        return httpx.Response(200, json={"quoteResponse": {"result": [
+            {"symbol": s, "regularMarketPrice": 100.0, "regularMarketChange": 1.0, "regularMarketChangePercent": 1.0}
+            for s in symbols
+        ]}})
+
+
+def make_queries(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [" vs ".join(rng.sample(TICKERS, rng.randint(1, 4))) for _ in range(count)]
+
+
+async def run_wave(provider: YahooFinanceProvider, queries: List[str]) -> Dict[str, Any]:
+    async def timed(query: str) -> float:
+        start = time.perf_counter()
+        await provider.fetch_markets(query)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(timed(q) for q in queries)))
+    return {
+        "wall_ms": round((time.perf_counter() - start) * 1000, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1),
+    }
+
+
+async def run_strategy(queries: List[str], args, coalesce: bool) -> Dict[str, Any]:
+    upstream = SimulatedYahoo(args.rtt_ms / 1000, args.per_symbol_ms / 1000)
+    provider = YahooFinanceProvider(None)
+    provider.http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    provider.quotes.config = QuoteServiceConfig(enabled=coalesce, window_ms=args.window_ms, ttl_s=5.0)
+    result = await run_wave(provider, queries)
+    result["upstream_requests"] = upstream.requests
+    if coalesce:
+        before = upstream.requests
+        result["warm"] = await run_wave(provider, queries)
+        result["warm"]["upstream_requests"] = upstream.requests - before
+    return result
+
+
+async def run(args) -> Dict[str, Any]:
+    queries = make_queries(args.queries, args.seed)
+    return {
+        "queries": args.queries,
+        "symbol_requests": sum(len(q.split(" vs ")) for q in queries),
+        "per_symbol": await run_strategy(queries, args, coalesce=False),
+        "coalesced": await run_strategy(queries, args, coalesce=True),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=50, help="Concurrent market queries")
+    parser.add_argument("--rtt-ms", type=float, default=80.0, help="Simulated upstream round trip")
+    parser.add_argument("--per-symbol-ms", type=float, default=1.0, help="Simulated upstream cost per symbol")
+    parser.add_argument("--window-ms", type=float, default=10.0, help="Coalescing window")
+    parser.add_argument("--seed", type=int, default=7, help="Query mix seed")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{report['queries']} concurrent queries, {report['symbol_requests']} symbol lookups over {len(TICKERS)} tickers")
+    print(f"{'strategy':<12}{'upstream':>10}{'wall ms':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    rows = [("per_symbol", report["per_symbol"]), ("coalesced", report["coalesced"]), ("warm", report["coalesced"]["warm"])]
+    for name, row in rows:
+        print(f"{name:<12}{row['upstream_requests']:>10}{row['wall_ms']:>10}{row['p50_ms']:>9}{row['p95_ms']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Medium-Term Memory Benchmark
+============================
+
+Compares the log-structured MediumTermMemory with the previous
+one-JSON-file-per-key layout on N session records (half of them short-lived):
+- writes/s: concurrent store() calls, --concurrency at a time
+- reads/s: concurrent retrieve() calls for every long-lived session
+- cleanup: time for cleanup_expired() once the short-lived half has expired
+
+Both run in fresh temporary directories on the same disk.
+
+Usage:
+    python scripts/benchmark_medium_term_memory.py [--sessions 100000] [--legacy-sessions 100000]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.log_store import LogStoreConfig
+from shared.core.memory_manager import MediumTermMemory
+
+SHORT_TTL_S = 2
+
+
+class LegacyFileMemory:
+    """The previous MediumTermMemory: one JSON file per key, blocking I/O on the loop"""
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = Path(storage_dir)
+
+    async def store(self, key: str, value: Any, ttl_seconds: int = 86400) -> bool:
+        data = {
+            "value": value,
+            "created_at": datetime.now().isoformat(),
+            "accessed_at": datetime.now().isoformat(),
+            "access_count": 0,
+            "ttl_seconds": ttl_seconds,
+        }
+        with open(self.storage_dir / f"{key}.json", "w") as f:
+            json.dump(data, f)
+        return True
+
+    async def retrieve(self, key: str) -> Optional[Any]:
+        file_path = self.storage_dir / f"{key}.json"
+        if not file_path.exists():
+            return None
+        with open(file_path, "r") as f:
+            data = json.load(f)
+        if datetime.now() - datetime.fromisoformat(data["created_at"]) > timedelta(seconds=data["ttl_seconds"]):
+            file_path.unlink()
+            return None
+        data["accessed_at"] = datetime.now().isoformat()
+        data["access_count"] += 1
+        with open(file_path, "w") as f:
+            json.dump(data, f)
+        return data["value"]
+
+    async def cleanup_expired(self) -> int:
+        cleaned = 0
+        for file_path in self.storage_dir.glob("*.json"):
+            with open(file_path, "r") as f:
+                data = json.load(f)
+            if datetime.now() - datetime.fromisoformat(data["created_at"]) > timedelta(seconds=data["ttl_seconds"]):
+                file_path.unlink()
+                cleaned += 1
+        return cleaned
+
+    async def close(self) -> None:
+        pass
+
+
+def session(i: int) -> Dict[str, Any]:
+    return {
+        "session_id": f"s{i}",
+        "user_id": f"u{i % 997}",
+        "turns": [{"query": f"question {i}", "answer_len": 512}],
+        "preferences": {"lang": "en", "depth": "standard"},
+    }
+
+
+async def timed_batches(calls, concurrency: int) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(calls), concurrency):
+        await asyncio.gather(*(call() for call in calls[offset:offset + concurrency]))
+    return time.perf_counter() - start
+
+
+async def run_backend(memory, sessions: int, concurrency: int) -> Dict[str, Any]:
+    writes = [
+        (lambda i=i: memory.store(f"s{i}", session(i), SHORT_TTL_S if i % 2 else 86400))
+        for i in range(sessions)
+    ]
+    write_s = await timed_batches(writes, concurrency)
+    written_at = time.monotonic()
+    read_s = await timed_batches([(lambda i=i: memory.retrieve(f"s{i}")) for i in range(0, sessions, 2)], concurrency)
+
+    await asyncio.sleep(max(0.0, written_at + SHORT_TTL_S + 0.1 - time.monotonic()))
+    start = time.perf_counter()
+    cleaned = await memory.cleanup_expired()
+    cleanup_s = time.perf_counter() - start
+    await memory.close()
+    return {
+        "sessions": sessions,
+        "writes_per_s": round(sessions / write_s),
+        "reads_per_s": round((sessions + 1) // 2 / read_s),
+        "cleanup_ms": round(cleanup_s * 1000, 1),
+        "cleaned": cleaned,
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    report = {}
+    with tempfile.TemporaryDirectory() as log_dir:
+        config = LogStoreConfig(directory=log_dir)
+        report["log_structured"] = await run_backend(MediumTermMemory(config=config), args.sessions, args.concurrency)
+    if args.legacy_sessions:
+        with tempfile.TemporaryDirectory() as legacy_dir:
+            report["legacy_files"] = await run_backend(LegacyFileMemory(legacy_dir), args.legacy_sessions, args.concurrency)
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100000, help="Sessions for the log-structured store")
+    parser.add_argument("--legacy-sessions", type=int, default=100000, help="Sessions for the file-per-key layout (0 to skip)")
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent calls per batch")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'backend':<16}{'sessions':>10}{'writes/s':>11}{'reads/s':>10}{'cleanup ms':>12}{'cleaned':>9}")
+    for name, row in report.items():
+        print(
+            f"{name:<16}{row['sessions']:>10}{row['writes_per_s']:>11}{row['reads_per_s']:>10}"
+            f"{row['cleanup_ms']:>12}{row['cleaned']:>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
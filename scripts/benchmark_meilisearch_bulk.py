@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Meilisearch Bulk Indexing Benchmark
+===================================
+
+Measures documents/second for the previous one-batch-at-a-time indexing
+(enqueue a fixed 1000-document batch, wait for its task, repeat) against the
+pipelined indexer, with fixed 1000-document batches and with adaptive batch
+sizes.
+
+Without ``--url`` the target is an in-process stub that behaves like a local
+Meilisearch: each request costs a round trip, and one engine worker indexes
+enqueued tasks in order, auto-batching consecutive document additions, with
+a fixed cost per engine batch plus a cost per document.
+
+Usage:
+    python scripts/benchmark_meilisearch_bulk.py [--docs 50000]
+    python scripts/benchmark_meilisearch_bulk.py --url http://localhost:7700 --api-key KEY
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from shared.core.services.meilisearch_bulk_indexer import BulkIndexerConfig, MeilisearchBulkIndexer
+
+
+class SimulatedMeilisearch:
+    """Async stub of the documents and tasks endpoints with a single indexing worker."""
+
+    def __init__(self, rtt_s: float, batch_overhead_s: float, per_document_s: float, max_autobatch: int = 16):
+        self.rtt_s = rtt_s
+        self.batch_overhead_s = batch_overhead_s
+        self.per_document_s = per_document_s
+        self.max_autobatch = max_autobatch
+        self.tasks: Dict[int, Dict[str, Any]] = {}
+        self.queue: List[int] = []
+        self.work = asyncio.Event()
+        self.indexed = 0
+        self.worker: Optional[asyncio.Task] = None
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        if self.worker is None:
+            self.worker = asyncio.create_task(self._engine())
+        await asyncio.sleep(self.rtt_s)
+        if request.method == "POST":
+            body = await request.aread()
+            uid = len(self.tasks)
+            self.tasks[uid] = {"uid": uid, "status": "enqueued", "count": body.count(b"\n") + 1}
+            self.queue.append(uid)
+            self.work.set()
+            return httpx.Response(202, json={"taskUid": uid, "status": "enqueued"})
+        uids = [int(u) for u in request.url.params["uids"].split(",")]
+        return httpx.Response(200, json={"results": [self._view(self.tasks[u]) for u in uids]})
+
+    def _view(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        view = {"uid": task["uid"], "status": task["status"], "details": {"receivedDocuments": task["count"]}}
+        if task["status"] == "succeeded":
+            view.update(batchUid=task["batch"], duration=f"PT{task['duration']:.6f}S")
+        return view
+
+    async def _engine(self) -> None:
+        batch_uid = 0
+        while True:
+            await self.work.wait()
+            self.work.clear()
+            while self.queue:
+                uids, self.queue = self.queue[:self.max_autobatch], self.queue[self.max_autobatch:]
+                documents = sum(self.tasks[u]["count"] for u in uids)
+                duration = self.batch_overhead_s + documents * self.per_document_s
+                for uid in uids:
+                    self.tasks[uid]["status"] = "processing"
+                await asyncio.sleep(duration)
+                for uid in uids:
+                    self.tasks[uid].update(status="succeeded", batch=batch_uid, duration=duration)
+                self.indexed += documents
+                batch_uid += 1
+
+    async def close(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+
+
+def generate_documents(count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {
+            "id": i,
+            "title": f"Document {i}",
+            "content": f"Body text for document {i} about topic {i % 97} and subtopic {i % 13}. " * 4,
+            "category": f"cat-{i % 11}",
+        }
+
+
+SEQUENTIAL = BulkIndexerConfig(max_in_flight=1, initial_batch_size=1000, min_batch_size=1000, max_batch_size=1000)
+PIPELINED_FIXED = BulkIndexerConfig(max_in_flight=4, initial_batch_size=1000, min_batch_size=1000, max_batch_size=1000)
+PIPELINED = BulkIndexerConfig(max_in_flight=4, initial_batch_size=1000)
+
+
+async def run_strategy(name: str, config: BulkIndexerConfig, docs: int, args) -> Dict[str, Any]:
+    config.poll_interval_s = args.poll_interval
+    stub = None
+    if args.url:
+        headers = {"Authorization": f"Bearer {args.api_key}"} if args.api_key else {}
+        client = httpx.AsyncClient(base_url=args.url, headers=headers, timeout=60.0)
+        index_uid = f"{args.index}_{name}"
+    else:
+        stub = SimulatedMeilisearch(args.rtt_ms / 1000, args.batch_overhead_ms / 1000, args.per_doc_us / 1e6)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(stub.handler), base_url="http://meilisearch")
+        index_uid = args.index
+    try:
+        result = await MeilisearchBulkIndexer(client, config).index_documents(
+            generate_documents(docs), index_uid, primary_key="id"
+        )
+    finally:
+        await client.aclose()
+        if stub is not None:
+            await stub.close()
+    return {
+        "docs_per_second": round(result.docs_per_second),
+        "elapsed_s": round(result.elapsed_s, 2),
+        "batches": result.batches,
+        "final_batch_size": result.final_batch_size,
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    return {
+        "docs": args.docs,
+        "target": args.url or "simulated",
+        "sequential": await run_strategy("sequential", SEQUENTIAL, args.docs, args),
+        "pipelined_fixed": await run_strategy("pipelined_fixed", PIPELINED_FIXED, args.docs, args),
+        "pipelined": await run_strategy("pipelined", PIPELINED, args.docs, args),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50000, help="Documents to index per strategy")
+    parser.add_argument("--url", help="Real Meilisearch URL (default: simulated)")
+    parser.add_argument("--api-key", help="Meilisearch API key")
+    parser.add_argument("--index", default="bulk_benchmark", help="Index uid prefix")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Task poll interval (s)")
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="Simulated request round trip")
+    parser.add_argument("--batch-overhead-ms", type=float, default=40.0, help="Simulated cost per engine batch")
+    parser.add_argument("--per-doc-us", type=float, default=30.0, help="Simulated indexing cost per document")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"Bulk indexing {report['docs']} documents into {report['target']}")
+    print(f"{'strategy':<16}{'docs/s':>10}{'elapsed s':>11}{'batches':>9}{'batch size':>12}")
+    for name in ("sequential", "pipelined_fixed", "pipelined"):
+        row = report[name]
+        print(f"{name:<16}{row['docs_per_second']:>10}{row['elapsed_s']:>11}{row['batches']:>9}{row['final_batch_size']:>12}")
+    speedup = report["pipelined"]["docs_per_second"] / max(report["sequential"]["docs_per_second"], 1)
+    print(f"\npipelined speedup: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
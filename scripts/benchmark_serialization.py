@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Serialization CPU Benchmark - Gateway /search payloads
+======================================================
+
+Measures serialization CPU time per request for a typical /search response:
+- Response body: stdlib JSONResponse vs FastJSONResponse
+- SSE frames: str + json.dumps formatting vs pre-encoded byte frames
+- LLM prompt context: json.dumps(indent=2) vs compact formatting (CPU and size)
+
+Usage:
+    python scripts/benchmark_serialization.py [--results 10] [--iterations 2000]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+
+from services.gateway.serialization import (
+    ORJSON_AVAILABLE,
+    FastJSONResponse,
+    encode_sse_event,
+    format_prompt_context,
+)
+
+
+def build_search_payload(num_results: int) -> Dict[str, Any]:
+    """Shape of a typical /search response."""
+    results = [
+        {
+            "title": f"Result {i}: Understanding retrieval augmented generation",
+            "url": f"https://example{i % 4}.org/articles/rag-{i}",
+            "snippet": "Retrieval augmented generation combines a retriever with a generator so "
+                       "answers are grounded in sources. " * 3,
+            "domain": f"example{i % 4}.org",
+            "provider": "wikipedia" if i % 2 else "duckduckgo",
+            "score": 0.95 - i * 0.03,
+            "published_at": "2025-09-14T11:40:13Z",
+        }
+        for i in range(num_results)
+    ]
+    return {
+        "query": "what is retrieval augmented generation",
+        "results": results,
+        "total_results": num_results,
+        "providers_used": ["wikipedia", "duckduckgo"],
+        "cache_hit": False,
+        "trace_id": "trace_0123456789abcdef",
+        "timing": {"retrieval_ms": 812.4, "fusion_ms": 3.1, "total_ms": 840.9},
+        "metadata": {"intent": "technical", "budget_ms": 7000, "lanes": {"web": "ok", "vector": "timeout"}},
+    }
+
+
+def legacy_sse_frame(event_name: str, data: Dict[str, Any], event_id: str, timestamp: str) -> bytes:
+    """Previous StreamingManager formatting; Starlette then encodes the str."""
+    lines = [
+        f"event: {event_name}",
+        f"data: {json.dumps(data, ensure_ascii=False)}",
+        f"id: {event_id}",
+        f"timestamp: {timestamp}",
+        "",
+    ]
+    return "\n".join(lines).encode("utf-8")
+
+
+def cpu_us_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Process CPU time per call in microseconds."""
+    for _ in range(min(100, iterations)):
+        fn()
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def run(num_results: int, iterations: int) -> List[Dict[str, Any]]:
+    payload = build_search_payload(num_results)
+    sources = [{k: r[k] for k in ("title", "url", "snippet", "domain", "provider")} for r in payload["results"]]
+    timestamp = datetime.now(timezone.utc).isoformat()
+    stdlib_response = JSONResponse(content=None)
+    fast_response = FastJSONResponse(content=None)
+
+    # A streamed /search emits context, citations, ~40 content chunks and a complete frame
+    chunk = {"type": "content", "text": "Retrieval augmented generation ", "chunk_index": 7}
+    frames = [("content_chunk", {"type": "context", "sources": sources})] + \
+             [("content_chunk", chunk)] * 40 + [("complete", {"total_chunks": 42})]
+
+    rows = [
+        {
+            "case": "response_body",
+            "baseline_us": cpu_us_per_call(lambda: stdlib_response.render(payload), iterations),
+            "fast_us": cpu_us_per_call(lambda: fast_response.render(payload), iterations),
+        },
+        {
+            "case": "sse_frames_per_stream",
+            "baseline_us": cpu_us_per_call(
+                lambda: [legacy_sse_frame(n, d, "trace", timestamp) for n, d in frames], max(1, iterations // 10)),
+            "fast_us": cpu_us_per_call(
+                lambda: [encode_sse_event(n, d, "trace", timestamp) for n, d in frames], max(1, iterations // 10)),
+        },
+        {
+            "case": "prompt_context",
+            "baseline_us": cpu_us_per_call(lambda: json.dumps(sources, indent=2), iterations),
+            "fast_us": cpu_us_per_call(lambda: format_prompt_context(sources), iterations),
+            "baseline_chars": len(json.dumps(sources, indent=2)),
+            "fast_chars": len(format_prompt_context(sources)),
+        },
+    ]
+    for row in rows:
+        row["speedup"] = row["baseline_us"] / row["fast_us"] if row["fast_us"] else float("inf")
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=10, help="Results per /search payload")
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations per case")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    rows = run(args.results, args.iterations)
+    if args.json:
+        print(json.dumps({"orjson": ORJSON_AVAILABLE, "results": rows}, indent=2))
+        return 0
+
+    print(f"Serialization CPU per request ({args.results} results, orjson={'yes' if ORJSON_AVAILABLE else 'no'})")
+    print(f"{'case':<24}{'baseline us':>14}{'fast us':>12}{'speedup':>10}")
+    for row in rows:
+        print(f"{row['case']:<24}{row['baseline_us']:>14.1f}{row['fast_us']:>12.1f}{row['speedup']:>9.1f}x")
+        if "baseline_chars" in row:
+            print(f"{'  prompt chars':<24}{row['baseline_chars']:>14}{row['fast_chars']:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Session Memory Per-Turn Latency Benchmark
+=========================================
+
+Measures one conversation turn (get_context for the last 5 interactions,
+then add_to_memory) as a conversation grows, for:
+- rows: MemoryManagerPostgres, one row per interaction
+- json_array: the previous layout, one row per session holding the whole
+  history as a JSON array that is loaded, sorted, appended to and rewritten
+
+Runs on a local SQLite file by default; pass --url for an async PostgreSQL
+URL (postgresql+asyncpg://...) to measure against a real server.
+
+Usage:
+    python scripts/benchmark_session_memory.py [--turns 2000] [--checkpoints 10,100,1000,2000]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import Column, MetaData, String, Table, Text, insert, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from shared.core.memory_manager_postgres import MemoryManagerPostgres, SessionMemoryConfig
+from shared.models.session_memory import SessionInteraction
+
+ANSWER = "An answer of typical length. " * 20
+
+legacy_metadata = MetaData()
+legacy_table = Table(
+    "session_memory_legacy",
+    legacy_metadata,
+    Column("session_id", String(255), primary_key=True),
+    Column("history", Text, nullable=False),
+)
+
+
+class JsonArrayMemory:
+    """The previous one-row-per-session layout"""
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def get_context(self, session_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        async with self.session_factory() as session:
+            result = await session.execute(select(legacy_table.c.history).where(legacy_table.c.session_id == session_id))
+            raw = result.scalar_one_or_none()
+        history = json.loads(raw) if raw else []
+        return sorted(history, key=lambda x: x.get("timestamp", ""), reverse=True)[:limit]
+
+    async def add_to_memory(self, session_id: str, query: str, answer: str) -> bool:
+        async with self.session_factory() as session:
+            result = await session.execute(select(legacy_table.c.history).where(legacy_table.c.session_id == session_id))
+            raw = result.scalar_one_or_none()
+            history = json.loads(raw) if raw else []
+            history.append({"query": query, "answer": answer, "timestamp": datetime.now(timezone.utc).isoformat()})
+            if raw is None:
+                await session.execute(insert(legacy_table).values(session_id=session_id, history=json.dumps(history)))
+            else:
+                await session.execute(
+                    update(legacy_table).where(legacy_table.c.session_id == session_id).values(history=json.dumps(history))
+                )
+            await session.commit()
+        return True
+
+
+async def measure(memory, turns: int, checkpoints: List[int], window: int = 20) -> Dict[int, float]:
+    """Median per-turn latency (ms) over the ``window`` turns ending at each checkpoint"""
+    latencies = []
+    for turn in range(1, turns + 1):
+        start = time.perf_counter()
+        await memory.get_context("bench", limit=5)
+        await memory.add_to_memory("bench", f"question {turn}", ANSWER)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {c: round(statistics.median(latencies[max(0, c - window):c]), 2) for c in checkpoints if c <= turns}
+
+
+async def run(args) -> Dict[str, Any]:
+    checkpoints = [int(c) for c in args.checkpoints.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(SessionInteraction.__table__.create, checkfirst=True)
+            await conn.run_sync(legacy_metadata.create_all)
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            rows = MemoryManagerPostgres(session_factory=factory, config=SessionMemoryConfig(flush_window_ms=0))
+            report = {
+                "rows": await measure(rows, args.turns, checkpoints),
+                "json_array": await measure(JsonArrayMemory(factory), args.turns, checkpoints),
+            }
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(SessionInteraction.__table__.drop)
+                await conn.run_sync(legacy_metadata.drop_all)
+            await engine.dispose()
+    return {"turns": args.turns, "per_turn_ms": report}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=2000, help="Conversation length")
+    parser.add_argument("--checkpoints", default="10,100,1000,2000", help="Turn counts to report")
+    parser.add_argument("--url", help="Async database URL (default: temporary SQLite file)")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    per_turn = report["per_turn_ms"]
+    checkpoints = list(per_turn["rows"])
+    print("median per-turn latency (ms) at conversation length")
+    print(f"{'layout':<12}" + "".join(f"{c:>10}" for c in checkpoints))
+    for name, row in per_turn.items():
+        print(f"{name:<12}" + "".join(f"{row[c]:>10}" for c in checkpoints))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Shared Model Weights Benchmark
+==============================
+
+Starts N worker processes that each load a sentence-transformers model, the
+way N uvicorn workers do, once with private copies and once with weights
+memory-mapped from the shared store. While all workers are alive it reports
+each worker's model startup time, RSS and PSS (proportional set size, which
+splits shared pages between the processes mapping them), plus the total PSS,
+which is the workers' real combined footprint.
+
+The first shared-mode worker starts alone so it can publish the store; the
+rest start together as warm workers. Requires sentence-transformers and torch
+on Linux (/proc/<pid>/smaps_rollup).
+
+Usage:
+    python scripts/benchmark_shared_weights.py [--workers 4] [--model all-MiniLM-L6-v2]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+WORKER = """
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+import torch, sentence_transformers
+start = time.perf_counter()
+if {shared!r}:
+    from shared.embeddings.shared_weights import SharedWeightsConfig, get_shared_sentence_transformer
+    model = get_shared_sentence_transformer({model!r}, config=SharedWeightsConfig(store_dir={store!r}))
+else:
+    model = sentence_transformers.SentenceTransformer({model!r}, device="cpu")
+model.encode(["warm up"])
+print(json.dumps({{"pid": os.getpid(), "startup_s": time.perf_counter() - start}}), flush=True)
+sys.stdin.read()
+"""
+
+
+def memory_mb(pid: int) -> Dict[str, float]:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1].lower() + "_mb"] = int(parts[1]) / 1024
+    return values
+
+
+def start_workers(count: int, code: str) -> List[subprocess.Popen]:
+    return [
+        subprocess.Popen([sys.executable, "-c", code], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(count)
+    ]
+
+
+def run_mode(args, shared: bool, store: str) -> Dict[str, Any]:
+    code = WORKER.format(root=str(REPO_ROOT), shared=shared, model=args.model, store=store)
+    first = start_workers(1, code)
+    first_report = json.loads(first[0].stdout.readline())
+    rest = start_workers(args.workers - 1, code)
+    reports = [first_report] + [json.loads(p.stdout.readline()) for p in rest]
+    workers = [dict(report, **memory_mb(report["pid"])) for report in reports]
+    for process in first + rest:
+        process.stdin.close()
+        process.wait()
+    return {
+        "workers": [{k: round(v, 2) if isinstance(v, float) else v for k, v in w.items()} for w in workers],
+        "first_startup_s": round(workers[0]["startup_s"], 2),
+        "warm_startup_s": round(max(w["startup_s"] for w in workers[1:]), 2) if len(workers) > 1 else None,
+        "total_rss_mb": round(sum(w["rss_mb"] for w in workers), 1),
+        "total_pss_mb": round(sum(w["pss_mb"] for w in workers), 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes per mode")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2", help="Model to load")
+    parser.add_argument("--store-dir", help="Shared weight store (default: a fresh temp dir)")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = args.store_dir or tmp
+        report = {
+            "model": args.model,
+            "workers": args.workers,
+            "private": run_mode(args, shared=False, store=store),
+            "shared": run_mode(args, shared=True, store=store),
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{args.workers} workers loading {args.model}")
+    print(f"{'mode':<9}{'first s':>9}{'warm s':>9}{'total RSS MB':>14}{'total PSS MB':>14}")
+    for mode in ("private", "shared"):
+        row = report[mode]
+        print(f"{mode:<9}{row['first_startup_s']:>9}{row['warm_startup_s']:>9}{row['total_rss_mb']:>14}{row['total_pss_mb']:>14}")
+    saved = report["private"]["total_pss_mb"] - report["shared"]["total_pss_mb"]
+    print(f"\nshared weights save {saved:.0f} MB of PSS across {args.workers} workers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
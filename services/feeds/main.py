@@ -99,6 +99,7 @@ class FeedResult:
 
 # Import providers and managers
 from .providers.news_providers import NewsAPIProvider, RSSProvider, RedditProvider
+from .rss_ingestion import get_rss_poller
 from .providers.markets_providers import AlphaVantageProvider, YahooFinanceProvider, CoinGeckoProvider
 from .providers.guardian_provider import GuardianProvider
 from .providers.gdelt_provider import GDELTProvider
@@ -441,11 +442,16 @@ async def init_dependencies():
     # Initialize External Feeds Service
     app.state.feeds_service = ExternalFeedsService(app.state.redis_client)
     logger.info("External Feeds Service initialized successfully")
+    
+    # Start background RSS ingestion; news queries read its index
+    get_rss_poller().start()
 
 async def cleanup_dependencies():
     """Cleanup shared clients and dependencies"""
     logger.info("Cleaning up External Feeds dependencies...")
     
+    await get_rss_poller().stop()
+    
     if hasattr(app.state, 'redis_client'):
         try:
             app.state.redis_client.close()
@@ -11,6 +11,7 @@ import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import httpx
+from shared.core.http_client_registry import http_client_registry
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -50,7 +51,7 @@ class GDELTProvider:
                     params["lang"] = constraints["language"]
             
             # Make API request
-            async with httpx.AsyncClient(timeout=self.timeout / 1000) as client:
+            async with http_client_registry.client(timeout=self.timeout / 1000) as client:
                 response = await client.get(f"{self.base_url}/doc/doc", params=params)
                 response.raise_for_status()
                 
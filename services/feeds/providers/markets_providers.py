@@ -14,9 +14,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 
-import httpx
+from shared.core.http_client_registry import http_client_registry
 import redis
 
+from services.feeds.quote_service import FETCH_FAILED, QuoteBatcher
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -53,7 +55,9 @@ class AlphaVantageProvider:
         self.redis = redis_client
         self.base_url = "https://www.alphavantage.co/query"
         self.rate_limit = 5  # requests per minute
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
+        # GLOBAL_QUOTE is single-symbol; the batcher still coalesces and caches
+        self.quotes = QuoteBatcher("alphavantage", self._fetch_quotes, redis_client, max_batch=3)
     
     async def fetch_markets(self, query: str, constraints: Dict[str, Any] = None) -> FeedResult:
         """Fetch market data from Alpha Vantage"""
@@ -85,12 +89,13 @@ class AlphaVantageProvider:
             
             # Fetch data for each ticker
             all_items = []
-            for ticker in tickers[:3]:  # Limit to 3 tickers to respect rate limits
+            tickers = tickers[:3]  # Limit to 3 tickers to respect rate limits
+            quotes = await self.quotes.get(tickers)
+            for ticker in tickers:
                 try:
                     # Get quote data
-                    quote_data = await self._get_quote(ticker)
-                    if quote_data:
-                        all_items.append(quote_data)
+                    if quotes[ticker]:
+                        all_items.append(self._quote_item(ticker, quotes[ticker]))
                     
                     # Get news sentiment
                     news_data = await self._get_news_sentiment(ticker)
@@ -141,63 +146,81 @@ class AlphaVantageProvider:
     
     async def _get_quote(self, symbol: str) -> Optional[NormalizedFeedItem]:
         """Get quote data for a symbol"""
-        try:
+        quote = (await self.quotes.get([symbol]))[symbol]
+        return self._quote_item(symbol, quote) if quote else None
+    
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Any]:
+        """Fetch GLOBAL_QUOTE for each symbol concurrently
+        
+        Unknown symbols are left out; symbols whose request failed or was
+        rate limited map to FETCH_FAILED. Raises when every request failed.
+        """
+        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
             params = {
                 "function": "GLOBAL_QUOTE",
                 "symbol": symbol,
                 "apikey": self.api_key
             }
-            
             response = await self.http_client.get(self.base_url, params=params, timeout=0.8)
-            
-            if response.status_code == 200:
-                data = response.json()
-                quote = data.get("Global Quote", {})
-                
-                if quote:
-                    price = quote.get("05. price", "N/A")
-                    change = quote.get("09. change", "N/A")
-                    change_percent = quote.get("10. change percent", "N/A")
-                    
-                    return NormalizedFeedItem(
-                        id=f"quote_{symbol}_{int(time.time())}",
-                        title=f"{symbol} Stock Quote",
-                        content=f"Price: ${price}, Change: {change} ({change_percent})",
-                        url=f"https://www.alphavantage.co/quote/{symbol}",
-                        source="Alpha Vantage",
-                        author=None,
-                        published_at=datetime.now(),
-                        category="markets",
-                        tags=["stock", "quote", symbol.lower()],
-                        language="en",
-                        provider="alphavantage",
-                        attribution={
-                            "source": {
-                                "name": "Alpha Vantage",
-                                "url": "https://www.alphavantage.co"
-                            },
-                            "data": {
-                                "symbol": symbol,
-                                "price": price,
-                                "change": change,
-                                "change_percent": change_percent
-                            },
-                            "license": {
-                                "type": "api_terms",
-                                "terms": "Data provided by Alpha Vantage API"
-                            }
-                        },
-                        metadata={
-                            "provider": "alphavantage",
-                            "symbol": symbol,
-                            "data_type": "quote",
-                            "raw_data": quote
-                        }
-                    )
-        except Exception as e:
-            logger.error(f"Error getting quote for {symbol}: {e}")
+            response.raise_for_status()
+            data = response.json()
+            # Rate limiting and key problems come back as 200 with a Note/Information message
+            notice = data.get("Note") or data.get("Information")
+            if notice and not data.get("Global Quote"):
+                raise RuntimeError(f"Alpha Vantage: {notice}")
+            return data.get("Global Quote") or None
         
-        return None
+        quotes = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        errors = [q for q in quotes if isinstance(q, Exception)]
+        if errors and len(errors) == len(quotes):
+            raise errors[0]
+        return {
+            s: FETCH_FAILED if isinstance(q, Exception) else q
+            for s, q in zip(symbols, quotes)
+            if q is not None
+        }
+    
+    def _quote_item(self, symbol: str, quote: Dict[str, Any]) -> NormalizedFeedItem:
+        """Normalize an Alpha Vantage GLOBAL_QUOTE"""
+        price = quote.get("05. price", "N/A")
+        change = quote.get("09. change", "N/A")
+        change_percent = quote.get("10. change percent", "N/A")
+        
+        return NormalizedFeedItem(
+            id=f"quote_{symbol}_{int(time.time())}",
+            title=f"{symbol} Stock Quote",
+            content=f"Price: ${price}, Change: {change} ({change_percent})",
+            url=f"https://www.alphavantage.co/quote/{symbol}",
+            source="Alpha Vantage",
+            author=None,
+            published_at=datetime.now(),
+            category="markets",
+            tags=["stock", "quote", symbol.lower()],
+            language="en",
+            provider="alphavantage",
+            attribution={
+                "source": {
+                    "name": "Alpha Vantage",
+                    "url": "https://www.alphavantage.co"
+                },
+                "data": {
+                    "symbol": symbol,
+                    "price": price,
+                    "change": change,
+                    "change_percent": change_percent
+                },
+                "license": {
+                    "type": "api_terms",
+                    "terms": "Data provided by Alpha Vantage API"
+                }
+            },
+            metadata={
+                "provider": "alphavantage",
+                "symbol": symbol,
+                "data_type": "quote",
+                "raw_data": quote
+            }
+        )
     
     async def _get_news_sentiment(self, symbol: str) -> List[NormalizedFeedItem]:
         """Get news sentiment for a symbol"""
@@ -297,25 +320,14 @@ class YahooFinanceProvider:
     def __init__(self, redis_client: redis.Redis):
         self.redis = redis_client
         self.base_url = "https://query1.finance.yahoo.com"
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
+        self.quotes = QuoteBatcher("yahoo", self._fetch_quotes, redis_client, max_batch=50)
     
     async def fetch_markets(self, query: str, constraints: Dict[str, Any] = None) -> FeedResult:
         """Fetch market data from Yahoo Finance"""
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"yahoo:{hashlib.md5(query.encode()).hexdigest()}"
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result:
-                return FeedResult(
-                    provider="yahoo",
-                    status="healthy",
-                    items=cached_result,
-                    latency_ms=(time.time() - start_time) * 1000,
-                    cache_hit=True
-                )
-            
             # Extract ticker symbols
             tickers = self._extract_tickers(query, constraints)
             if not tickers:
@@ -327,19 +339,9 @@ class YahooFinanceProvider:
                     error="No ticker symbols found"
                 )
             
-            # Fetch data for each ticker
-            all_items = []
-            for ticker in tickers[:5]:  # Limit to 5 tickers
-                try:
-                    quote_data = await self._get_quote(ticker)
-                    if quote_data:
-                        all_items.append(quote_data)
-                except Exception as e:
-                    logger.error(f"Error fetching data for {ticker}: {e}")
-                    continue
-            
-            # Cache results
-            await self._set_cache(cache_key, all_items, ttl=300)
+            # Fetch quotes for all tickers in one coalesced multi-quote call
+            quotes = await self.quotes.get(tickers[:5])  # Limit to 5 tickers
+            all_items = [self._quote_item(ticker, quote) for ticker, quote in quotes.items() if quote]
             
             return FeedResult(
                 provider="yahoo",
@@ -377,86 +379,76 @@ class YahooFinanceProvider:
     
     async def _get_quote(self, symbol: str) -> Optional[NormalizedFeedItem]:
         """Get quote data for a symbol"""
-        try:
-            params = {
-                "symbols": symbol,
-                "fields": "regularMarketPrice,regularMarketChange,regularMarketChangePercent,regularMarketTime"
-            }
-            
-            response = await self.http_client.get(
-                f"{self.base_url}/v1/finance/quote",
-                params=params,
-                timeout=0.8
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                result = data.get("result", [])
-                
-                if result:
-                    quote = result[0]
-                    price = quote.get("regularMarketPrice", "N/A")
-                    change = quote.get("regularMarketChange", "N/A")
-                    change_percent = quote.get("regularMarketChangePercent", "N/A")
-                    
-                    return NormalizedFeedItem(
-                        id=f"yahoo_quote_{symbol}_{int(time.time())}",
-                        title=f"{symbol} Stock Quote (Yahoo Finance)",
-                        content=f"Price: ${price}, Change: {change} ({change_percent}%)",
-                        url=f"https://finance.yahoo.com/quote/{symbol}",
-                        source="Yahoo Finance",
-                        author=None,
-                        published_at=datetime.now(),
-                        category="markets",
-                        tags=["stock", "quote", symbol.lower()],
-                        language="en",
-                        provider="yahoo",
-                        attribution={
-                            "source": {
-                                "name": "Yahoo Finance",
-                                "url": "https://finance.yahoo.com"
-                            },
-                            "data": {
-                                "symbol": symbol,
-                                "price": price,
-                                "change": change,
-                                "change_percent": change_percent
-                            },
-                            "license": {
-                                "type": "public_api",
-                                "terms": "Data provided by Yahoo Finance public API"
-                            }
-                        },
-                        metadata={
-                            "provider": "yahoo",
-                            "symbol": symbol,
-                            "data_type": "quote",
-                            "raw_data": quote
-                        }
-                    )
-        except Exception as e:
-            logger.error(f"Error getting Yahoo quote for {symbol}: {e}")
-        
-        return None
+        quote = (await self.quotes.get([symbol]))[symbol]
+        return self._quote_item(symbol, quote) if quote else None
     
-    async def _get_from_cache(self, key: str) -> Optional[List[NormalizedFeedItem]]:
-        """Get result from cache"""
-        try:
-            cached = self.redis.get(key)
-            if cached:
-                data = json.loads(cached)
-                return [NormalizedFeedItem(**item) for item in data]
-        except Exception as e:
-            logger.error(f"Cache get error: {e}")
-        return None
+    async def _fetch_quotes(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch quotes for several symbols in one multi-quote request"""
+        params = {
+            "symbols": ",".join(symbols),
+            "fields": "regularMarketPrice,regularMarketChange,regularMarketChangePercent,regularMarketTime"
+        }
+        
+        response = await self.http_client.get(
+            f"{self.base_url}/v1/finance/quote",
+            params=params,
+            timeout=0.8
+        )
+        response.raise_for_status()
+        data = response.json()
+        result = data.get("quoteResponse", data).get("result") or []
+        return {quote["symbol"]: quote for quote in result if quote.get("symbol")}
     
-    async def _set_cache(self, key: str, value: List[NormalizedFeedItem], ttl: int = 300):
-        """Set result in cache"""
-        try:
-            data = [asdict(item) for item in value]
-            self.redis.setex(key, ttl, json.dumps(data, default=str))
-        except Exception as e:
-            logger.error(f"Cache set error: {e}")
+    def _quote_item(self, symbol: str, quote: Dict[str, Any]) -> NormalizedFeedItem:
+        """Normalize a Yahoo Finance quote"""
+        price = quote.get("regularMarketPrice", "N/A")
+        change = quote.get("regularMarketChange", "N/A")
+        change_percent = quote.get("regularMarketChangePercent", "N/A")
+        
+        return NormalizedFeedItem(
+            id=f"yahoo_quote_{symbol}_{int(time.time())}",
+            title=f"{symbol} Stock Quote (Yahoo Finance)",
+            content=f"Price: ${price}, Change: {change} ({change_percent}%)",
+            url=f"https://finance.yahoo.com/quote/{symbol}",
+            source="Yahoo Finance",
+            author=None,
+            published_at=datetime.now(),
+            category="markets",
+            tags=["stock", "quote", symbol.lower()],
+            language="en",
+            provider="yahoo",
+            attribution={
+                "source": {
+                    "name": "Yahoo Finance",
+                    "url": "https://finance.yahoo.com"
+                },
+                "data": {
+                    "symbol": symbol,
+                    "price": price,
+                    "change": change,
+                    "change_percent": change_percent
+                },
+                "license": {
+                    "type": "public_api",
+                    "terms": "Data provided by Yahoo Finance public API"
+                }
+            },
+            metadata={
+                "provider": "yahoo",
+                "symbol": symbol,
+                "data_type": "quote",
+                "raw_data": quote
+            }
+        )
+
+# Ticker-style names mapped to CoinGecko coin ids
+COINGECKO_IDS = {
+    "btc": "bitcoin",
+    "eth": "ethereum",
+    "ada": "cardano",
+    "sol": "solana",
+    "dot": "polkadot"
+}
 
 class CoinGeckoProvider:
     """CoinGecko provider for cryptocurrency data"""
@@ -466,25 +458,14 @@ class CoinGeckoProvider:
         self.redis = redis_client
         self.base_url = "https://api.coingecko.com/api/v3"
         self.rate_limit = 50  # requests per minute
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
+        self.prices = QuoteBatcher("coingecko", self._fetch_prices, redis_client, max_batch=50)
     
     async def fetch_markets(self, query: str, constraints: Dict[str, Any] = None) -> FeedResult:
         """Fetch cryptocurrency data from CoinGecko"""
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"coingecko:{hashlib.md5(query.encode()).hexdigest()}"
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result:
-                return FeedResult(
-                    provider="coingecko",
-                    status="healthy",
-                    items=cached_result,
-                    latency_ms=(time.time() - start_time) * 1000,
-                    cache_hit=True
-                )
-            
             # Extract cryptocurrency symbols
             crypto_symbols = self._extract_crypto_symbols(query, constraints)
             if not crypto_symbols:
@@ -496,19 +477,10 @@ class CoinGeckoProvider:
                     error="No cryptocurrency symbols found"
                 )
             
-            # Fetch data for each cryptocurrency
-            all_items = []
-            for symbol in crypto_symbols[:3]:  # Limit to 3 symbols
-                try:
-                    crypto_data = await self._get_crypto_data(symbol)
-                    if crypto_data:
-                        all_items.append(crypto_data)
-                except Exception as e:
-                    logger.error(f"Error fetching data for {symbol}: {e}")
-                    continue
-            
-            # Cache results
-            await self._set_cache(cache_key, all_items, ttl=300)
+            # Fetch prices for all coins in one coalesced ids= call
+            coin_ids = list(dict.fromkeys(COINGECKO_IDS.get(s.lower(), s.lower()) for s in crypto_symbols))
+            prices = await self.prices.get(coin_ids[:3])  # Limit to 3 symbols
+            all_items = [self._price_item(coin_id, price) for coin_id, price in prices.items() if price]
             
             return FeedResult(
                 provider="coingecko",
@@ -546,84 +518,65 @@ class CoinGeckoProvider:
     
     async def _get_crypto_data(self, symbol: str) -> Optional[NormalizedFeedItem]:
         """Get cryptocurrency data"""
-        try:
-            params = {
-                "ids": symbol,
-                "vs_currencies": "usd",
-                "include_24hr_change": "true"
-            }
-            
-            if self.api_key:
-                params["x_cg_demo_api_key"] = self.api_key
-            
-            response = await self.http_client.get(
-                f"{self.base_url}/simple/price",
-                params=params,
-                timeout=0.8
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if symbol in data:
-                    crypto_data = data[symbol]
-                    price = crypto_data.get("usd", "N/A")
-                    change_24h = crypto_data.get("usd_24h_change", "N/A")
-                    
-                    return NormalizedFeedItem(
-                        id=f"coingecko_{symbol}_{int(time.time())}",
-                        title=f"{symbol.upper()} Cryptocurrency Price",
-                        content=f"Price: ${price}, 24h Change: {change_24h}%",
-                        url=f"https://www.coingecko.com/en/coins/{symbol}",
-                        source="CoinGecko",
-                        author=None,
-                        published_at=datetime.now(),
-                        category="cryptocurrency",
-                        tags=["crypto", "price", symbol.lower()],
-                        language="en",
-                        provider="coingecko",
-                        attribution={
-                            "source": {
-                                "name": "CoinGecko",
-                                "url": "https://www.coingecko.com"
-                            },
-                            "data": {
-                                "symbol": symbol,
-                                "price": price,
-                                "change_24h": change_24h
-                            },
-                            "license": {
-                                "type": "api_terms",
-                                "terms": "Data provided by CoinGecko API"
-                            }
-                        },
-                        metadata={
-                            "provider": "coingecko",
-                            "symbol": symbol,
-                            "data_type": "crypto_price",
-                            "raw_data": crypto_data
-                        }
-                    )
-        except Exception as e:
-            logger.error(f"Error getting CoinGecko data for {symbol}: {e}")
-        
-        return None
+        coin_id = COINGECKO_IDS.get(symbol.lower(), symbol.lower())
+        crypto_data = (await self.prices.get([coin_id]))[coin_id]
+        return self._price_item(coin_id, crypto_data) if crypto_data else None
     
-    async def _get_from_cache(self, key: str) -> Optional[List[NormalizedFeedItem]]:
-        """Get result from cache"""
-        try:
-            cached = self.redis.get(key)
-            if cached:
-                data = json.loads(cached)
-                return [NormalizedFeedItem(**item) for item in data]
-        except Exception as e:
-            logger.error(f"Cache get error: {e}")
-        return None
+    async def _fetch_prices(self, coin_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch prices for several coins in one simple/price request"""
+        params = {
+            "ids": ",".join(coin_ids),
+            "vs_currencies": "usd",
+            "include_24hr_change": "true"
+        }
+        
+        if self.api_key:
+            params["x_cg_demo_api_key"] = self.api_key
+        
+        response = await self.http_client.get(
+            f"{self.base_url}/simple/price",
+            params=params,
+            timeout=0.8
+        )
+        response.raise_for_status()
+        return response.json()
     
-    async def _set_cache(self, key: str, value: List[NormalizedFeedItem], ttl: int = 300):
-        """Set result in cache"""
-        try:
-            data = [asdict(item) for item in value]
-            self.redis.setex(key, ttl, json.dumps(data, default=str))
-        except Exception as e:
-            logger.error(f"Cache set error: {e}")
+    def _price_item(self, symbol: str, crypto_data: Dict[str, Any]) -> NormalizedFeedItem:
+        """Normalize a CoinGecko simple price"""
+        price = crypto_data.get("usd", "N/A")
+        change_24h = crypto_data.get("usd_24h_change", "N/A")
+        
+        return NormalizedFeedItem(
+            id=f"coingecko_{symbol}_{int(time.time())}",
+            title=f"{symbol.upper()} Cryptocurrency Price",
+            content=f"Price: ${price}, 24h Change: {change_24h}%",
+            url=f"https://www.coingecko.com/en/coins/{symbol}",
+            source="CoinGecko",
+            author=None,
+            published_at=datetime.now(),
+            category="cryptocurrency",
+            tags=["crypto", "price", symbol.lower()],
+            language="en",
+            provider="coingecko",
+            attribution={
+                "source": {
+                    "name": "CoinGecko",
+                    "url": "https://www.coingecko.com"
+                },
+                "data": {
+                    "symbol": symbol,
+                    "price": price,
+                    "change_24h": change_24h
+                },
+                "license": {
+                    "type": "api_terms",
+                    "terms": "Data provided by CoinGecko API"
+                }
+            },
+            metadata={
+                "provider": "coingecko",
+                "symbol": symbol,
+                "data_type": "crypto_price",
+                "raw_data": crypto_data
+            }
+        )
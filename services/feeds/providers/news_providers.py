@@ -10,14 +10,16 @@ import json
 import logging
 import time
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
-import xml.etree.ElementTree as ET
 
 import httpx
+from shared.core.http_client_registry import http_client_registry
 import redis
 
+from services.feeds.rss_ingestion import FeedEntry, RSSFeedPoller, get_rss_poller
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -55,7 +57,7 @@ class NewsAPIProvider:
         self.base_url = "https://newsapi.org/v2"
         self.rate_limit = 1000  # requests per day
         self.requests_per_minute = 1
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
     
     async def fetch_news(self, query: str, constraints: Dict[str, Any] = None) -> FeedResult:
         """Fetch news from NewsAPI"""
@@ -214,68 +216,30 @@ class NewsAPIProvider:
             logger.error(f"Cache set error: {e}")
 
 class RSSProvider:
-    """RSS feeds provider for news articles"""
+    """RSS feeds provider for news articles, served from the background ingestion index"""
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: redis.Redis, poller: Optional[RSSFeedPoller] = None):
         self.redis = redis_client
-        self.http_client = httpx.AsyncClient()
-        self.feeds = {
-            "bbc": "http://feeds.bbci.co.uk/news/rss.xml",
-            "reuters": "https://feeds.reuters.com/reuters/topNews",
-            "ap": "https://feeds.apnews.com/rss/ap/topnews",
-            "techcrunch": "https://techcrunch.com/feed/",
-            "wired": "https://www.wired.com/feed/rss"
-        }
+        self.poller = poller or get_rss_poller()
+        self.feeds = {name: state.url for name, state in self.poller.states.items()}
     
     async def fetch_news(self, query: str, constraints: Dict[str, Any] = None) -> FeedResult:
-        """Fetch news from RSS feeds"""
+        """Fetch news from the ingested RSS index (no network I/O)"""
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"rss:{hashlib.md5(query.encode()).hexdigest()}"
-            cached_result = await self._get_from_cache(cache_key)
-            if cached_result:
-                return FeedResult(
-                    provider="rss",
-                    status="healthy",
-                    items=cached_result,
-                    latency_ms=(time.time() - start_time) * 1000,
-                    cache_hit=True
-                )
-            
-            # Fetch from multiple RSS feeds in parallel
-            tasks = []
-            for feed_name, feed_url in self.feeds.items():
-                task = asyncio.create_task(self._fetch_rss_feed(feed_name, feed_url))
-                tasks.append(task)
-            
-            # Wait for all feeds to complete
-            feed_results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine results
-            all_items = []
-            for result in feed_results:
-                if isinstance(result, list):
-                    all_items.extend(result)
-            
-            # Filter by query if provided
-            if query:
-                filtered_items = []
-                query_lower = query.lower()
-                for item in all_items:
-                    if (query_lower in item.title.lower() or 
-                        query_lower in item.content.lower()):
-                        filtered_items.append(item)
-                all_items = filtered_items
-            
-            # Cache results
-            await self._set_cache(cache_key, all_items, ttl=600)  # 10 minutes cache
+            # Polling runs in the background; this only schedules it once
+            self.poller.start()
+            constraints = constraints or {}
+            limit = min(int(constraints.get("max_items") or self.poller.config.max_results), self.poller.config.max_results)
+            feeds = [name for name in constraints.get("sources") or [] if name in self.feeds]
+            entries = self.poller.index.search(query or "", limit=limit, feeds=feeds or None)
             
+            # Served from the ingestion index, not a query cache
             return FeedResult(
                 provider="rss",
                 status="healthy",
-                items=all_items,
+                items=[self._normalize_entry(entry) for entry in entries],
                 latency_ms=(time.time() - start_time) * 1000
             )
             
@@ -288,113 +252,43 @@ class RSSProvider:
                 error=str(e)
             )
     
-    async def _fetch_rss_feed(self, feed_name: str, feed_url: str) -> List[NormalizedFeedItem]:
-        """Fetch individual RSS feed"""
-        try:
-            response = await self.http_client.get(feed_url, timeout=0.8)
-            if response.status_code == 200:
-                return self._parse_rss_feed(response.text, feed_name)
-            else:
-                logger.error(f"Failed to fetch RSS feed {feed_name}: {response.status_code}")
-                return []
-        except Exception as e:
-            logger.error(f"Error fetching RSS feed {feed_name}: {e}")
-            return []
-    
-    def _parse_rss_feed(self, xml_content: str, feed_name: str) -> List[NormalizedFeedItem]:
-        """Parse RSS XML content"""
-        try:
-            root = ET.fromstring(xml_content)
-            items = []
-            
-            # Handle different RSS formats
-            for item in root.findall(".//item"):
-                try:
-                    title = item.find("title")
-                    title_text = title.text if title is not None else ""
-                    
-                    description = item.find("description")
-                    description_text = description.text if description is not None else ""
-                    
-                    link = item.find("link")
-                    link_text = link.text if link is not None else ""
-                    
-                    pub_date = item.find("pubDate")
-                    published_at = None
-                    if pub_date is not None and pub_date.text:
-                        try:
-                            published_at = datetime.strptime(pub_date.text, "%a, %d %b %Y %H:%M:%S %Z")
-                        except:
-                            try:
-                                published_at = datetime.strptime(pub_date.text, "%a, %d %b %Y %H:%M:%S %z")
-                            except:
-                                pass
-                    
-                    author = item.find("author")
-                    author_text = author.text if author is not None else None
-                    
-                    if title_text and link_text:
-                        normalized_item = NormalizedFeedItem(
-                            id=hashlib.md5(link_text.encode()).hexdigest(),
-                            title=title_text,
-                            content=description_text,
-                            url=link_text,
-                            source=feed_name.upper(),
-                            author=author_text,
-                            published_at=published_at,
-                            category=None,
-                            tags=[],
-                            language="en",
-                            provider="rss",
-                            attribution={
-                                "source": {
-                                    "name": feed_name.upper(),
-                                    "url": link_text
-                                },
-                                "article": {
-                                    "title": title_text,
-                                    "url": link_text,
-                                    "author": author_text,
-                                    "published_at": pub_date.text if pub_date is not None else None
-                                },
-                                "license": {
-                                    "type": "fair_use",
-                                    "terms": "Used under fair use for news aggregation"
-                                }
-                            },
-                            metadata={
-                                "provider": "rss",
-                                "feed_name": feed_name
-                            }
-                        )
-                        items.append(normalized_item)
-                except Exception as e:
-                    logger.error(f"Error parsing RSS item: {e}")
-                    continue
-            
-            return items
-        except Exception as e:
-            logger.error(f"Error parsing RSS feed: {e}")
-            return []
-    
-    async def _get_from_cache(self, key: str) -> Optional[List[NormalizedFeedItem]]:
-        """Get result from cache"""
-        try:
-            cached = self.redis.get(key)
-            if cached:
-                data = json.loads(cached)
-                return [NormalizedFeedItem(**item) for item in data]
-        except Exception as e:
-            logger.error(f"Cache get error: {e}")
-        return None
-    
-    async def _set_cache(self, key: str, value: List[NormalizedFeedItem], ttl: int = 600):
-        """Set result in cache"""
-        try:
-            data = [asdict(item) for item in value]
-            self.redis.setex(key, ttl, json.dumps(data, default=str))
-        except Exception as e:
-            logger.error(f"Cache set error: {e}")
+    def _normalize_entry(self, entry: FeedEntry) -> NormalizedFeedItem:
+        """Convert an ingested feed entry to the common schema"""
+        source = entry.feed.upper()
+        published_at = datetime.fromtimestamp(entry.published_ts, timezone.utc) if entry.published_ts is not None else None
+        return NormalizedFeedItem(
+            id=entry.id,
+            title=entry.title,
+            content=entry.summary,
+            url=entry.url,
+            source=source,
+            author=entry.author,
+            published_at=published_at,
+            category=None,
+            tags=[],
+            language="en",
+            provider="rss",
+            attribution={
+                "source": {
+                    "name": source,
+                    "url": entry.url
+                },
+                "article": {
+                    "title": entry.title,
+                    "url": entry.url,
+                    "author": entry.author,
+                    "published_at": entry.published_raw
+                },
+                "license": {
+                    "type": "fair_use",
+                    "terms": "Used under fair use for news aggregation"
+                }
+            },
+            metadata={
+                "provider": "rss",
+                "feed_name": entry.feed
+            }
+        )
 
 class RedditProvider:
     """Reddit API provider for social news"""
@@ -405,7 +299,7 @@ class RedditProvider:
         self.redis = redis_client
         self.base_url = "https://oauth.reddit.com"
         self.auth_url = "https://www.reddit.com/api/v1/access_token"
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
         self.access_token = None
         self.token_expires = None
     
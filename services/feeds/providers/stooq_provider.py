@@ -10,7 +10,7 @@ import asyncio
 import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
-import httpx
+from shared.core.http_client_registry import http_client_registry
 import csv
 import io
 import structlog
@@ -100,7 +100,7 @@ class StooqProvider:
             # Stooq CSV endpoint
             url = f"{self.base_url}/?s={ticker}&f=sd2t2ohlcv&h&e=csv"
             
-            async with httpx.AsyncClient(timeout=self.timeout / 1000) as client:
+            async with http_client_registry.client(timeout=self.timeout / 1000) as client:
                 response = await client.get(url)
                 response.raise_for_status()
                 
@@ -0,0 +1,234 @@
+"""
+Quote Service - SarvanOM v2 External Feeds
+
+Coalesced, cached market quote fetching shared by the markets providers:
+- Symbols requested by concurrent queries within a short window are fetched
+  together in one upstream call where the provider supports it (Yahoo
+  multi-quote, CoinGecko ``ids=``); concurrent requests for a symbol already
+  in flight wait on the same future
+- A seconds-TTL in-process quote cache answers repeat symbols without any
+  I/O; misses go to Redis in one MGET before going upstream
+- Unknown symbols are cached too, so they don't hammer upstream; symbols
+  the provider failed to fetch are not
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Quote = Optional[Dict[str, Any]]
+BatchFetcher = Callable[[List[str]], Awaitable[Dict[str, Any]]]
+
+# Returned by a fetcher for symbols it could not fetch (timeouts, errors,
+# rate limiting), as opposed to leaving out symbols the provider doesn't know
+FETCH_FAILED = object()
+
+
+@dataclass
+class QuoteServiceConfig:
+    """Quote coalescing and caching configuration"""
+    enabled: bool = True
+    window_ms: float = 10.0
+    ttl_s: float = 5.0
+    redis_ttl_s: int = 30
+    max_cache_entries: int = 10000
+
+    @classmethod
+    def from_environment(cls) -> "QuoteServiceConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            enabled=os.getenv("QUOTE_COALESCING_ENABLED", "true").lower() == "true",
+            window_ms=float(os.getenv("QUOTE_COALESCE_WINDOW_MS", "10")),
+            ttl_s=float(os.getenv("QUOTE_CACHE_TTL_S", "5")),
+            redis_ttl_s=int(os.getenv("QUOTE_REDIS_TTL_S", "30")),
+            max_cache_entries=int(os.getenv("QUOTE_CACHE_MAX_ENTRIES", "10000")),
+        )
+
+
+class QuoteBatcher:
+    """
+    Coalescing quote fetcher for one provider.
+
+    ``fetch_batch(symbols)`` returns quotes keyed by symbol for up to
+    ``max_batch`` symbols; symbols absent from the result are treated as
+    unknown and cached, symbols mapped to ``FETCH_FAILED`` as failed and not
+    cached. A fetcher that raises fails its whole batch.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        fetch_batch: BatchFetcher,
+        redis_client: Any = None,
+        max_batch: int = 50,
+        config: Optional[QuoteServiceConfig] = None
+    ):
+        self.provider = provider
+        self.fetch_batch = fetch_batch
+        self.redis = redis_client
+        self.max_batch = max_batch
+        self.config = config or QuoteServiceConfig.from_environment()
+        self._cache: Dict[str, Tuple[float, Quote]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.requests = 0
+        self.local_hits = 0
+        self.coalesced = 0
+        self.redis_hits = 0
+        self.upstream_calls = 0
+        self.upstream_symbols = 0
+
+    async def get(self, symbols: Iterable[str]) -> Dict[str, Quote]:
+        """Quotes for ``symbols`` (None for unknown symbols or failed fetches)"""
+        symbols = list(dict.fromkeys(symbols))
+        self.requests += len(symbols)
+        if not self.config.enabled:
+            return await self._fetch_direct(symbols)
+
+        now = time.monotonic()
+        results: Dict[str, Quote] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        for symbol in symbols:
+            cached = self._cache.get(symbol)
+            if cached is not None and cached[0] > now:
+                self.local_hits += 1
+                results[symbol] = cached[1]
+            elif symbol in self._inflight:
+                self.coalesced += 1
+                waiting[symbol] = self._inflight[symbol]
+            else:
+                waiting[symbol] = self._enqueue(symbol)
+
+        for symbol, future in waiting.items():
+            try:
+                results[symbol] = await asyncio.shield(future)
+            except Exception as e:
+                logger.error(f"{self.provider} quote fetch failed for {symbol}: {e}")
+                results[symbol] = None
+        return {symbol: results[symbol] for symbol in symbols}
+
+    def _enqueue(self, symbol: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[symbol] = future
+        self._pending.append(symbol)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.window_ms / 1000, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        symbols, self._pending = self._pending, []
+        if symbols:
+            asyncio.get_running_loop().create_task(self._resolve(symbols))
+
+    async def _resolve(self, symbols: List[str]) -> None:
+        try:
+            quotes = self._redis_get(symbols)
+            missing = [s for s in symbols if s not in quotes]
+            if missing:
+                fetched = await self._fetch_upstream(missing)
+                self._redis_set(fetched)
+                quotes.update(fetched)
+            self._store(quotes)
+            # Symbols missing here failed upstream: answered as None, cached nowhere
+            for symbol in symbols:
+                self._settle(symbol, result=quotes.get(symbol))
+        except Exception as e:
+            for symbol in symbols:
+                self._settle(symbol, error=e)
+
+    def _settle(self, symbol: str, result: Quote = None, error: Optional[BaseException] = None) -> None:
+        future = self._inflight.pop(symbol, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def _fetch_upstream(self, symbols: List[str]) -> Dict[str, Quote]:
+        chunks = [symbols[i:i + self.max_batch] for i in range(0, len(symbols), self.max_batch)]
+        self.upstream_calls += len(chunks)
+        self.upstream_symbols += len(symbols)
+        responses = await asyncio.gather(*(self.fetch_batch(chunk) for chunk in chunks))
+        quotes: Dict[str, Quote] = {symbol: None for symbol in symbols}
+        for response in responses:
+            quotes.update({s: q for s, q in response.items() if s in quotes})
+        failed = [s for s, q in quotes.items() if q is FETCH_FAILED]
+        if failed:
+            logger.warning(f"{self.provider} quote fetch failed for {', '.join(failed)}")
+        return {s: q for s, q in quotes.items() if q is not FETCH_FAILED}
+
+    async def _fetch_direct(self, symbols: List[str]) -> Dict[str, Quote]:
+        """One upstream call per symbol, no coalescing or caching"""
+        async def one(symbol: str) -> Quote:
+            self.upstream_calls += 1
+            self.upstream_symbols += 1
+            try:
+                quote = (await self.fetch_batch([symbol])).get(symbol)
+                return None if quote is FETCH_FAILED else quote
+            except Exception as e:
+                logger.error(f"{self.provider} quote fetch failed for {symbol}: {e}")
+                return None
+
+        quotes = await asyncio.gather(*(one(symbol) for symbol in symbols))
+        return dict(zip(symbols, quotes))
+
+    # Caches -------------------------------------------------------------
+
+    def _store(self, quotes: Dict[str, Quote]) -> None:
+        expires = time.monotonic() + self.config.ttl_s
+        for symbol, quote in quotes.items():
+            self._cache[symbol] = (expires, quote)
+        if len(self._cache) > self.config.max_cache_entries:
+            now = time.monotonic()
+            self._cache = {s: e for s, e in self._cache.items() if e[0] > now}
+
+    def _redis_key(self, symbol: str) -> str:
+        return f"quote:{self.provider}:{symbol}"
+
+    def _redis_get(self, symbols: List[str]) -> Dict[str, Quote]:
+        if self.redis is None:
+            return {}
+        try:
+            values = self.redis.mget([self._redis_key(s) for s in symbols])
+        except Exception as e:
+            logger.error(f"Quote cache get error: {e}")
+            return {}
+        found = {s: json.loads(v) for s, v in zip(symbols, values) if v is not None}
+        self.redis_hits += len(found)
+        return found
+
+    def _redis_set(self, quotes: Dict[str, Quote]) -> None:
+        if self.redis is None or not quotes:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for symbol, quote in quotes.items():
+                pipe.setex(self._redis_key(symbol), self.config.redis_ttl_s, json.dumps(quote, default=str))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Quote cache set error: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "local_hits": self.local_hits,
+            "coalesced": self.coalesced,
+            "redis_hits": self.redis_hits,
+            "upstream_calls": self.upstream_calls,
+            "upstream_symbols": self.upstream_symbols,
+            "cached_symbols": len(self._cache),
+        }
@@ -0,0 +1,438 @@
+"""
+RSS Ingestion - SarvanOM v2 External Feeds
+
+Background RSS/Atom ingestion so news queries never touch the network:
+- Periodic polling with conditional GET (ETag / If-Modified-Since), with
+  per-feed exponential backoff on errors
+- Streaming XML parsing (``XMLPullParser``, the incremental form of
+  ``iterparse``) fed straight from the response body; each item element is
+  cleared as soon as it is read
+- A fast RFC-822 date parser, with ISO-8601 for Atom
+- Dedupe by URL hash
+- An in-memory, time-ordered item index the query path reads from
+"""
+
+import asyncio
+import bisect
+import calendar
+import hashlib
+import logging
+import os
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from shared.core.http_client_registry import http_client_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEEDS: Dict[str, str] = {
+    "bbc": "http://feeds.bbci.co.uk/news/rss.xml",
+    "reuters": "https://feeds.reuters.com/reuters/topNews",
+    "ap": "https://feeds.apnews.com/rss/ap/topnews",
+    "techcrunch": "https://techcrunch.com/feed/",
+    "wired": "https://www.wired.com/feed/rss"
+}
+
+
+@dataclass
+class RSSIngestionConfig:
+    """RSS ingestion configuration"""
+    enabled: bool = True
+    poll_interval_s: float = 300.0
+    max_backoff_s: float = 3600.0
+    request_timeout_s: float = 10.0
+    max_concurrency: int = 4
+    max_items: int = 5000
+    max_item_age_s: float = 7 * 24 * 3600.0
+    max_results: int = 50
+
+    @classmethod
+    def from_environment(cls) -> "RSSIngestionConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            enabled=os.getenv("RSS_INGESTION_ENABLED", "true").lower() == "true",
+            poll_interval_s=float(os.getenv("RSS_POLL_INTERVAL_S", "300")),
+            max_backoff_s=float(os.getenv("RSS_MAX_BACKOFF_S", "3600")),
+            request_timeout_s=float(os.getenv("RSS_REQUEST_TIMEOUT_S", "10")),
+            max_concurrency=int(os.getenv("RSS_MAX_CONCURRENCY", "4")),
+            max_items=int(os.getenv("RSS_INDEX_MAX_ITEMS", "5000")),
+            max_item_age_s=float(os.getenv("RSS_MAX_ITEM_AGE_S", str(7 * 24 * 3600))),
+            max_results=int(os.getenv("RSS_MAX_RESULTS", "50")),
+        )
+
+
+# Date parsing ---------------------------------------------------------------
+
+_MONTHS = {m: i for i, m in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1
+)}
+_ZONES = {
+    "gmt": 0, "ut": 0, "utc": 0, "z": 0,
+    "est": -5 * 3600, "edt": -4 * 3600, "cst": -6 * 3600, "cdt": -5 * 3600,
+    "mst": -7 * 3600, "mdt": -6 * 3600, "pst": -8 * 3600, "pdt": -7 * 3600,
+}
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an RFC-822 (RSS) or ISO-8601 (Atom) date to epoch seconds.
+
+    Handles optional weekdays, 2-digit years, missing seconds, numeric and
+    named zones; unknown zones are taken as UTC. Returns None if unparseable.
+    """
+    if not value:
+        return None
+    text = value.strip()
+    if text[:4].isdigit() and "-" in text[:8]:
+        try:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return parsed.timestamp() if parsed.tzinfo else float(calendar.timegm(parsed.timetuple()))
+
+    parts = text.replace(",", " ").split()
+    if parts and parts[0][:1].isalpha():
+        parts = parts[1:]
+    if len(parts) < 4:
+        return None
+    try:
+        day = int(parts[0])
+        month = _MONTHS[parts[1][:3].lower()]
+        year = int(parts[2])
+        if year < 100:
+            year += 2000 if year < 50 else 1900
+        clock = parts[3].split(":")
+        hour, minute = int(clock[0]), int(clock[1])
+        second = int(clock[2]) if len(clock) > 2 else 0
+    except (KeyError, ValueError, IndexError):
+        return None
+
+    offset = 0
+    if len(parts) > 4:
+        zone = parts[4]
+        if zone[:1] in "+-" and zone[1:5].isdigit():
+            offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[0] == "-" else 1)
+        else:
+            offset = _ZONES.get(zone.lower(), 0)
+    return float(calendar.timegm((year, month, day, hour, minute, second, 0, 0, 0)) - offset)
+
+
+# Parsing --------------------------------------------------------------------
+
+@dataclass
+class FeedEntry:
+    """One ingested feed item"""
+    id: str
+    title: str
+    summary: str
+    url: str
+    feed: str
+    author: Optional[str] = None
+    published_ts: Optional[float] = None
+    published_raw: Optional[str] = None
+    ingested_ts: float = 0.0
+    search_text: str = field(default="", repr=False)
+
+    @property
+    def sort_ts(self) -> float:
+        return self.published_ts if self.published_ts is not None else self.ingested_ts
+
+
+def url_hash(url: str) -> str:
+    """Stable id for an item URL (scheme-, case- and trailing-slash-insensitive)"""
+    normalized = url.strip().lower().split("://", 1)[-1].rstrip("/")
+    return hashlib.md5(normalized.encode()).hexdigest()
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+_TITLE = {"title"}
+_SUMMARY = {"description", "summary", "content", "encoded"}
+_DATE = {"pubDate", "published", "updated", "date"}
+_AUTHOR = {"author", "creator"}
+
+
+def _entry_from_element(element: ET.Element, feed: str, now: float) -> Optional[FeedEntry]:
+    title = summary = link = author = date = None
+    for child in element:
+        name = _local(child.tag)
+        if name in _TITLE:
+            title = (child.text or "").strip()
+        elif name == "link":
+            href = child.get("href")
+            if href is None:
+                link = link or (child.text or "").strip()
+            elif child.get("rel", "alternate") == "alternate":
+                link = href.strip()
+        elif name in _SUMMARY:
+            # Prefer the short description over full content when both exist
+            if summary is None or name in ("description", "summary"):
+                summary = (child.text or "").strip()
+        elif name in _DATE:
+            if date is None or name in ("pubDate", "published"):
+                date = (child.text or "").strip()
+        elif name in _AUTHOR:
+            nested = child.find("{http://www.w3.org/2005/Atom}name")
+            author = ((nested.text if nested is not None else child.text) or "").strip() or None
+    if not title or not link:
+        return None
+    summary = summary or ""
+    return FeedEntry(
+        id=url_hash(link),
+        title=title,
+        summary=summary,
+        url=link,
+        feed=feed,
+        author=author,
+        published_ts=parse_feed_date(date),
+        published_raw=date,
+        ingested_ts=now,
+        search_text=f"{title}\n{summary}".lower(),
+    )
+
+
+class FeedParser:
+    """Incremental RSS/Atom parser: feed bytes, collect finished entries"""
+
+    def __init__(self, feed: str):
+        self.feed = feed
+        self._parser = ET.XMLPullParser(events=("end",))
+        self._now = time.time()
+
+    def feed_bytes(self, data: bytes) -> List[FeedEntry]:
+        self._parser.feed(data)
+        return list(self._drain())
+
+    def close(self) -> List[FeedEntry]:
+        self._parser.close()
+        return list(self._drain())
+
+    def _drain(self) -> Iterator[FeedEntry]:
+        for _, element in self._parser.read_events():
+            if _local(element.tag) in ("item", "entry"):
+                entry = _entry_from_element(element, self.feed, self._now)
+                element.clear()
+                if entry is not None:
+                    yield entry
+
+
+def parse_feed(chunks: Iterable[bytes], feed: str) -> List[FeedEntry]:
+    """Parse a whole feed from byte chunks"""
+    parser = FeedParser(feed)
+    entries: List[FeedEntry] = []
+    for chunk in chunks:
+        entries.extend(parser.feed_bytes(chunk))
+    entries.extend(parser.close())
+    return entries
+
+
+# Index ----------------------------------------------------------------------
+
+class FeedItemIndex:
+    """Newest-first index of feed entries, deduplicated by URL hash"""
+
+    def __init__(self, max_items: int = 5000):
+        self.max_items = max_items
+        self._entries: Dict[str, FeedEntry] = {}
+        self._order: List[Tuple[float, str]] = []  # (-sort_ts, id), ascending = newest first
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, entries: Iterable[FeedEntry]) -> int:
+        """Insert new entries; returns how many were not already indexed"""
+        added = 0
+        for entry in entries:
+            if entry.id in self._entries:
+                continue
+            # When full, don't re-admit items older than everything kept
+            if len(self._order) >= self.max_items and -entry.sort_ts >= self._order[-1][0]:
+                continue
+            self._entries[entry.id] = entry
+            bisect.insort(self._order, (-entry.sort_ts, entry.id))
+            added += 1
+        while len(self._order) > self.max_items:
+            _, entry_id = self._order.pop()
+            del self._entries[entry_id]
+        return added
+
+    def prune(self, older_than_ts: float) -> int:
+        """Drop entries dated before ``older_than_ts``"""
+        cut = bisect.bisect_right(self._order, (-older_than_ts, "\uffff"))
+        dropped = self._order[cut:]
+        del self._order[cut:]
+        for _, entry_id in dropped:
+            del self._entries[entry_id]
+        return len(dropped)
+
+    def search(self, query: str = "", limit: Optional[int] = None, feeds: Optional[Iterable[str]] = None) -> List[FeedEntry]:
+        """Newest-first entries whose title or summary contains every term of ``query``"""
+        terms = query.lower().split()
+        feed_filter = set(feeds) if feeds else None
+        results: List[FeedEntry] = []
+        for _, entry_id in self._order:
+            entry = self._entries[entry_id]
+            if feed_filter is not None and entry.feed not in feed_filter:
+                continue
+            if not all(term in entry.search_text for term in terms):
+                continue
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+
+# Poller ---------------------------------------------------------------------
+
+@dataclass
+class FeedState:
+    """Conditional-GET and health state for one feed"""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    next_poll_ts: float = 0.0
+    last_success_ts: Optional[float] = None
+    consecutive_errors: int = 0
+    polls: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    items_added: int = 0
+    last_error: Optional[str] = None
+
+
+class RSSFeedPoller:
+    """Polls feeds in the background and keeps a FeedItemIndex current"""
+
+    def __init__(
+        self,
+        feeds: Optional[Dict[str, str]] = None,
+        config: Optional[RSSIngestionConfig] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.config = config or RSSIngestionConfig.from_environment()
+        self.index = FeedItemIndex(self.config.max_items)
+        self.states: Dict[str, FeedState] = {name: FeedState(url) for name, url in (feeds or DEFAULT_FEEDS).items()}
+        self._client = client
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = http_client_registry.client(timeout=self.config.request_timeout_s, follow_redirects=True)
+        return self._client
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start background polling on the running loop (idempotent, no I/O)"""
+        if self.config.enabled and not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info(f"RSS ingestion started for {len(self.states)} feeds")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.poll_due()
+            now = time.time()
+            next_due = min((s.next_poll_ts for s in self.states.values()), default=now + self.config.poll_interval_s)
+            await asyncio.sleep(max(1.0, next_due - now))
+
+    async def poll_due(self) -> None:
+        """Poll every feed whose next poll time has passed"""
+        now = time.time()
+        due = [name for name, state in self.states.items() if state.next_poll_ts <= now]
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def bounded(name: str) -> None:
+            async with semaphore:
+                await self.poll_feed(name)
+
+        await asyncio.gather(*(bounded(name) for name in due))
+        self.index.prune(time.time() - self.config.max_item_age_s)
+
+    async def poll_feed(self, name: str) -> None:
+        """Fetch one feed with a conditional GET and index its new items"""
+        state = self.states[name]
+        state.polls += 1
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        try:
+            async with self.client.stream("GET", state.url, headers=headers) as response:
+                if response.status_code == 304:
+                    state.not_modified += 1
+                elif response.status_code == 200:
+                    entries = await self._parse_stream(response.aiter_bytes(), name)
+                    state.items_added += self.index.add(entries)
+                    state.etag = response.headers.get("etag")
+                    state.last_modified = response.headers.get("last-modified")
+                else:
+                    raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+            state.consecutive_errors = 0
+            state.last_success_ts = time.time()
+            state.next_poll_ts = time.time() + self.config.poll_interval_s
+        except Exception as e:
+            state.errors += 1
+            state.consecutive_errors += 1
+            state.last_error = str(e)
+            backoff = min(self.config.poll_interval_s * 2 ** state.consecutive_errors, self.config.max_backoff_s)
+            state.next_poll_ts = time.time() + backoff
+            logger.warning(f"RSS feed {name} poll failed, retrying in {backoff:.0f}s: {e}")
+
+    @staticmethod
+    async def _parse_stream(chunks: AsyncIterator[bytes], feed: str) -> List[FeedEntry]:
+        parser = FeedParser(feed)
+        entries: List[FeedEntry] = []
+        async for chunk in chunks:
+            entries.extend(parser.feed_bytes(chunk))
+        entries.extend(parser.close())
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "running": self.running,
+            "items": len(self.index),
+            "feeds": {
+                name: {
+                    "polls": s.polls,
+                    "not_modified": s.not_modified,
+                    "errors": s.errors,
+                    "items_added": s.items_added,
+                    "staleness_s": round(now - s.last_success_ts, 1) if s.last_success_ts else None,
+                    "last_error": s.last_error,
+                }
+                for name, s in self.states.items()
+            },
+        }
+
+
+# Global poller instance
+_rss_poller: Optional[RSSFeedPoller] = None
+
+
+def get_rss_poller() -> RSSFeedPoller:
+    """Get the process-wide RSS poller"""
+    global _rss_poller
+    if _rss_poller is None:
+        _rss_poller = RSSFeedPoller()
+    return _rss_poller
@@ -21,16 +21,16 @@ from enum import Enum
 import asyncio
 
 from services.retrieval.free_tier import SearchResult, SearchProvider
+from shared.embeddings.shared_weights import get_shared_sentence_transformer
+from shared.core.lazy_imports import module_available
+from shared.core.executor_registry import ExecutorSaturated, get_executor_registry
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Import sentence transformers for similarity calculation
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# Sentence transformers for similarity calculation; imported when the model loads
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logger.warning("sentence-transformers not available, using fallback similarity")
 
 
@@ -75,7 +75,7 @@ class CitationsManager:
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
                 # Use a lightweight model for speed
-                self.similarity_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.similarity_model = get_shared_sentence_transformer('all-MiniLM-L6-v2')
                 logger.info("✅ Sentence similarity model initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize similarity model: {e}")
@@ -100,13 +100,18 @@ class CitationsManager:
         """Calculate similarity between sentence and source text."""
         if self.similarity_model:
             try:
-                # Encode both texts
-                embeddings = self.similarity_model.encode([sentence, source_text])
+                # Encode both texts off the event loop
+                embeddings = await get_executor_registry().run_cpu(
+                    self.similarity_model.encode, [sentence, source_text], site="citations.similarity"
+                )
                 # Calculate cosine similarity
                 similarity = np.dot(embeddings[0], embeddings[1]) / (
                     np.linalg.norm(embeddings[0]) * np.linalg.norm(embeddings[1])
                 )
                 return float(similarity)
+            except ExecutorSaturated:
+                # Under CPU pressure word overlap is good enough for citation matching
+                return self._calculate_similarity_fallback(sentence, source_text)
             except Exception as e:
                 logger.warning(f"Similarity calculation failed: {e}")
                 return self._calculate_similarity_fallback(sentence, source_text)
@@ -33,23 +33,21 @@ import re
 from dotenv import load_dotenv
 load_dotenv()
 
-# HuggingFace imports
-from transformers import (
-    AutoTokenizer, AutoModel, AutoModelForSequenceClassification,
-    AutoModelForQuestionAnswering, AutoModelForSeq2SeqLM,
-    AutoModelForTokenClassification, AutoModelForCausalLM,
-    pipeline, Pipeline
-)
-from sentence_transformers import SentenceTransformer
-from datasets import load_dataset, Dataset
-import torch
+# HuggingFace imports; torch and sentence_transformers are imported on first
+# model load rather than at gateway startup (models run in the inference pool)
 import numpy as np
 from huggingface_hub import InferenceClient, HfApi
+from shared.core.lazy_imports import lazy_module, module_available
+
+torch = lazy_module("torch")
+sentence_transformers = lazy_module("sentence_transformers")
 
 # Local imports
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from config.huggingface_config import huggingface_config
+from shared.core.inference_pool import get_inference_pool
+from shared.core.executor_registry import get_executor_registry
 
 logger = logging.getLogger(__name__)
 
@@ -110,13 +108,12 @@ class HuggingFaceIntegration:
         # Use configuration
         self.config = huggingface_config
         self.cache_dir = cache_dir or self.config.cache_dir
-        self.device = self.config.device
-        if self.device == "auto":
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._device = self.config.device
         
+        # Handles of models loaded in the inference worker pool, keyed by "<model>_<task>"
         self.models: Dict[str, Any] = {}
-        self.pipelines: Dict[str, Pipeline] = {}
-        self.embedding_model: Optional[SentenceTransformer] = None
+        self.pipelines: Dict[str, Any] = {}
+        self.embedding_model: Optional[Any] = None
         
         # Initialize clients with authentication
         if self.config.is_authenticated():
@@ -177,7 +174,14 @@ class HuggingFaceIntegration:
             logger.warning(f"HuggingFace configuration issues: {config_issues}")
         
         auth_status = "authenticated" if self.config.is_authenticated() else "unauthenticated"
-        logger.info(f"Initialized HuggingFace Integration on device: {self.device}, auth: {auth_status}")
+        logger.info(f"Initialized HuggingFace Integration on device: {self.config.device}, auth: {auth_status}")
+    
+    @property
+    def device(self) -> str:
+        """Resolved device; "auto" imports torch on first use to probe for CUDA"""
+        if self._device == "auto":
+            self._device = "cuda" if module_available("torch") and torch.cuda.is_available() else "cpu"
+        return self._device
     
     async def initialize(self):
         """Initialize the HuggingFace integration with latest stable models"""
@@ -211,55 +215,22 @@ class HuggingFaceIntegration:
                 logger.error(f"❌ Fallback also failed: {fallback_error}")
     
     async def load_model(self, model_name: str, task_type: TaskType) -> bool:
-        """Load a HuggingFace model for a specific task"""
+        """Load a HuggingFace model for a specific task in the inference worker pool"""
         try:
             model_key = f"{model_name}_{task_type.value}"
             
-            if model_key in self.models:
+            if model_key in self.models or model_key in self.pipelines:
                 return True
             
             logger.info(f"Loading model: {model_name} for task: {task_type.value}")
             
-            # Load model based on task type
+            # Models live in the pool's worker processes; only the handle is kept here
+            await get_inference_pool().load(task_type.value, model_name, self._model_options(task_type))
+            handle = {"task": task_type.value, "model_name": model_name}
             if task_type == TaskType.TEXT_GENERATION:
-                # Use authentication token if available
-                token = self.config.get_token_for_operation("read")
-                model_kwargs = {
-                    "cache_dir": self.cache_dir,
-                    "torch_dtype": torch.float16 if self.device == "cuda" else torch.float32
-                }
-                tokenizer_kwargs = {}  # Remove cache_dir from tokenizer
-                
-                if token:
-                    model_kwargs["token"] = token
-                    tokenizer_kwargs["token"] = token
-                
-                model = AutoModelForCausalLM.from_pretrained(model_name, **model_kwargs)
-                tokenizer = AutoTokenizer.from_pretrained(model_name, **tokenizer_kwargs)
-                if tokenizer.pad_token is None:
-                    tokenizer.pad_token = tokenizer.eos_token
-                
-                self.models[model_key] = {"model": model, "tokenizer": tokenizer}
-                
-            elif task_type == TaskType.SENTIMENT_ANALYSIS:
-                pipeline = self._create_pipeline(model_name, task_type.value)
-                self.pipelines[model_key] = pipeline
-                
-            elif task_type == TaskType.SUMMARIZATION:
-                pipeline = self._create_pipeline(model_name, task_type.value)
-                self.pipelines[model_key] = pipeline
-                
-            elif task_type == TaskType.TRANSLATION:
-                pipeline = self._create_pipeline(model_name, task_type.value)
-                self.pipelines[model_key] = pipeline
-                
-            elif task_type == TaskType.NAMED_ENTITY_RECOGNITION:
-                pipeline = self._create_pipeline(model_name, task_type.value)
-                self.pipelines[model_key] = pipeline
-                
-            elif task_type == TaskType.QUESTION_ANSWERING:
-                pipeline = self._create_pipeline(model_name, task_type.value)
-                self.pipelines[model_key] = pipeline
+                self.models[model_key] = handle
+            else:
+                self.pipelines[model_key] = handle
                 
             logger.info(f"✅ Model {model_name} loaded successfully for {task_type.value}")
             return True
@@ -268,20 +239,33 @@ class HuggingFaceIntegration:
             logger.error(f"❌ Failed to load model {model_name}: {e}")
             return False
     
-    def _create_pipeline(self, model_name: str, task: str) -> Pipeline:
-        """Create a HuggingFace pipeline"""
+    def _model_options(self, task_type: TaskType) -> Dict[str, Any]:
+        """Load options for a pooled model (must be picklable)"""
         # Use authentication token if available
         token = self.config.get_token_for_operation("read")
-        pipeline_kwargs = {
-            "task": task,
-            "model": model_name,
-            "device": self.device
-        }
+        if task_type == TaskType.TEXT_GENERATION:
+            options = {
+                "cache_dir": self.cache_dir,
+                "torch_dtype": "float16" if self.device == "cuda" else "float32"
+            }
+        else:
+            options = {"device": self.device}
         
         if token:
-            pipeline_kwargs["token"] = token
+            options["token"] = token
         
-        return pipeline(**pipeline_kwargs)
+        return options
+    
+    async def _infer(self, task_type: TaskType, model_name: str, inputs: Any, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Run one input through a pooled model, loading it on first use"""
+        model_key = f"{model_name}_{task_type.value}"
+        if model_key not in self.models and model_key not in self.pipelines:
+            await self.load_model(model_name, task_type)
+        if model_key not in self.models and model_key not in self.pipelines:
+            raise Exception(f"Model {model_name} not loaded for {task_type.value}")
+        return await get_inference_pool().submit(
+            task_type.value, model_name, inputs, params=params, options=self._model_options(task_type)
+        )
     
     async def load_embedding_model(self, model_name: str) -> bool:
         """Load a sentence transformer model for embeddings"""
@@ -295,7 +279,11 @@ class HuggingFaceIntegration:
             if token:
                 model_kwargs["token"] = token
             
-            self.embedding_model = SentenceTransformer(model_name, **model_kwargs)
+            # Import and weight loading are blocking; keep them off the event loop
+            self.embedding_model = await get_executor_registry().run_io(
+                lambda: sentence_transformers.SentenceTransformer(model_name, **model_kwargs),
+                site="huggingface.load_embedding_model",
+            )
             logger.info(f"✅ Embedding model {model_name} loaded successfully")
             return True
         except Exception as e:
@@ -307,51 +295,29 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.TEXT_GENERATION.value}"
+            # Generate text in the inference pool, batched with concurrent prompts
+            generated_text = await self._infer(
+                TaskType.TEXT_GENERATION,
+                model_name,
+                prompt,
+                params={"max_length": max_length, "temperature": temperature}
+            )
             
-            if model_key not in self.models:
-                await self.load_model(model_name, TaskType.TEXT_GENERATION)
+            processing_time = time.time() - start_time
             
-            if model_key in self.models:
-                model_data = self.models[model_key]
-                model = model_data["model"]
-                tokenizer = model_data["tokenizer"]
-                
-                # Tokenize input
-                inputs = tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=512)
-                
-                # Generate text
-                with torch.no_grad():
-                    outputs = model.generate(
-                        inputs,
-                        max_length=max_length,
-                        temperature=temperature,
-                        do_sample=True,
-                        pad_token_id=tokenizer.eos_token_id,
-                        eos_token_id=tokenizer.eos_token_id,
-                        attention_mask=torch.ones_like(inputs)
-                    )
-                
-                # Decode output
-                generated_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.TEXT_GENERATION,
-                    model_name=model_name,
-                    result=generated_text,
-                    processing_time=processing_time,
-                    metadata={
-                        "input_length": len(prompt),
-                        "output_length": len(generated_text),
-                        "temperature": temperature,
-                        "max_length": max_length
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.TEXT_GENERATION,
+                model_name=model_name,
+                result=generated_text,
+                processing_time=processing_time,
+                metadata={
+                    "input_length": len(prompt),
+                    "output_length": len(generated_text),
+                    "temperature": temperature,
+                    "max_length": max_length
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"❌ Text generation failed with {model_name}: {e}")
@@ -372,7 +338,9 @@ class HuggingFaceIntegration:
             
             if self.embedding_model:
                 # Get embeddings
-                embeddings = self.embedding_model.encode(texts, convert_to_tensor=True)
+                embeddings = await get_executor_registry().run_cpu(
+                    self.embedding_model.encode, texts, convert_to_tensor=True, site="huggingface.embeddings"
+                )
                 
                 # Convert to numpy for easier handling
                 embeddings_np = embeddings.cpu().numpy()
@@ -403,32 +371,22 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.SENTIMENT_ANALYSIS.value}"
+            # Analyze sentiment in the inference pool
+            result = await self._infer(TaskType.SENTIMENT_ANALYSIS, model_name, text)
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.SENTIMENT_ANALYSIS)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                
-                # Analyze sentiment
-                result = pipeline(text)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.SENTIMENT_ANALYSIS,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "text_length": len(text),
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Sentiment analysis model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.SENTIMENT_ANALYSIS,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "text_length": len(text),
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Sentiment analysis failed: {e}")
@@ -439,33 +397,23 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.QUESTION_ANSWERING.value}"
+            # Answer question
+            result = await self._infer(TaskType.QUESTION_ANSWERING, model_name, {"question": question, "context": context})
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.QUESTION_ANSWERING)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                
-                # Answer question
-                result = pipeline(question=question, context=context)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.QUESTION_ANSWERING,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "question_length": len(question),
-                        "context_length": len(context),
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Question answering model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.QUESTION_ANSWERING,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "question_length": len(question),
+                    "context_length": len(context),
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Question answering failed: {e}")
@@ -476,34 +424,24 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.SUMMARIZATION.value}"
+            # Generate summary
+            result = await self._infer(TaskType.SUMMARIZATION, model_name, text, params={"max_length": max_length, "min_length": min_length, "do_sample": False})
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.SUMMARIZATION)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                
-                # Generate summary
-                result = pipeline(text, max_length=max_length, min_length=min_length, do_sample=False)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.SUMMARIZATION,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "input_length": len(text),
-                        "output_length": len(result[0]['summary_text']) if result and len(result) > 0 else 0,
-                        "max_length": max_length,
-                        "min_length": min_length
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Summarization model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.SUMMARIZATION,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "input_length": len(text),
+                    "output_length": len(result[0]['summary_text']) if result and len(result) > 0 else 0,
+                    "max_length": max_length,
+                    "min_length": min_length
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Text summarization failed: {e}")
@@ -514,33 +452,23 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.ZERO_SHOT_CLASSIFICATION.value}"
+            # Perform zero-shot classification
+            result = await self._infer(TaskType.ZERO_SHOT_CLASSIFICATION, model_name, text, params={"candidate_labels": candidate_labels})
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.ZERO_SHOT_CLASSIFICATION)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                
-                # Perform zero-shot classification
-                result = pipeline(text, candidate_labels=candidate_labels)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.ZERO_SHOT_CLASSIFICATION,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "text_length": len(text),
-                        "num_labels": len(candidate_labels),
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Zero-shot classification model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.ZERO_SHOT_CLASSIFICATION,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "text_length": len(text),
+                    "num_labels": len(candidate_labels),
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Zero-shot classification failed: {e}")
@@ -551,31 +479,22 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.TRANSLATION.value}"
+            result = await self._infer(TaskType.TRANSLATION, model_name, text)
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.TRANSLATION)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                result = pipeline(text)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.TRANSLATION,
-                    model_name=model_name,
-                    result=result[0]["translation_text"],
-                    processing_time=processing_time,
-                    metadata={
-                        "source_length": len(text),
-                        "target_language": target_language,
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Translation model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.TRANSLATION,
+                model_name=model_name,
+                result=result[0]["translation_text"],
+                processing_time=processing_time,
+                metadata={
+                    "source_length": len(text),
+                    "target_language": target_language,
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Text translation failed: {e}")
@@ -586,31 +505,22 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.NAMED_ENTITY_RECOGNITION.value}"
+            result = await self._infer(TaskType.NAMED_ENTITY_RECOGNITION, model_name, text)
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.NAMED_ENTITY_RECOGNITION)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                result = pipeline(text)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.NAMED_ENTITY_RECOGNITION,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "text_length": len(text),
-                        "num_entities": len(result),
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"NER model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.NAMED_ENTITY_RECOGNITION,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "text_length": len(text),
+                    "num_entities": len(result),
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Entity extraction failed: {e}")
@@ -621,33 +531,23 @@ class HuggingFaceIntegration:
         start_time = time.time()
         
         try:
-            model_key = f"{model_name}_{TaskType.QUESTION_ANSWERING.value}"
+            # Answer question
+            result = await self._infer(TaskType.QUESTION_ANSWERING, model_name, {"question": question, "context": context})
             
-            if model_key not in self.pipelines:
-                await self.load_model(model_name, TaskType.QUESTION_ANSWERING)
+            processing_time = time.time() - start_time
             
-            if model_key in self.pipelines:
-                pipeline = self.pipelines[model_key]
-                
-                # Answer question
-                result = pipeline(question=question, context=context)
-                
-                processing_time = time.time() - start_time
-                
-                return HuggingFaceResponse(
-                    task_type=TaskType.QUESTION_ANSWERING,
-                    model_name=model_name,
-                    result=result,
-                    processing_time=processing_time,
-                    metadata={
-                        "question_length": len(question),
-                        "context_length": len(context),
-                        "model_name": model_name
-                    },
-                    timestamp=datetime.now().isoformat()
-                )
-            else:
-                raise Exception(f"Question answering model {model_name} not loaded")
+            return HuggingFaceResponse(
+                task_type=TaskType.QUESTION_ANSWERING,
+                model_name=model_name,
+                result=result,
+                processing_time=processing_time,
+                metadata={
+                    "question_length": len(question),
+                    "context_length": len(context),
+                    "model_name": model_name
+                },
+                timestamp=datetime.now().isoformat()
+            )
                 
         except Exception as e:
             logger.error(f"Question answering failed: {e}")
@@ -663,7 +563,9 @@ class HuggingFaceIntegration:
             
             if self.embedding_model:
                 # Get embeddings for both texts
-                embeddings = self.embedding_model.encode([text1, text2], convert_to_tensor=True)
+                embeddings = await get_executor_registry().run_cpu(
+                    self.embedding_model.encode, [text1, text2], convert_to_tensor=True, site="huggingface.similarity"
+                )
                 
                 # Calculate cosine similarity
                 similarity = torch.cosine_similarity(embeddings[0:1], embeddings[1:2]).item()
@@ -767,9 +669,10 @@ class HuggingFaceIntegration:
             self.models.clear()
             self.pipelines.clear()
             self.embedding_model = None
+            await get_inference_pool().stop()
             
             # Clear CUDA cache if available
-            if torch.cuda.is_available():
+            if torch.loaded and torch.cuda.is_available():
                 torch.cuda.empty_cache()
             
             logger.info("✅ HuggingFace Integration closed successfully")
@@ -27,10 +27,9 @@ except ImportError:
 # Import central configuration
 from shared.core.config.central_config import get_central_config
 
-from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, File, UploadFile, Query
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, File, UploadFile, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, field_validator
 from typing import Dict, Any, Optional, List
 import logging
@@ -71,7 +70,6 @@ config = get_central_config()
 
 # Import observability middleware
 from services.gateway.middleware.observability import (
-    ObservabilityMiddleware,
     log_stream_event,
     log_error,
     monitor_performance,
@@ -82,11 +80,10 @@ from services.gateway.middleware.observability import (
 
 # Import security middleware
 from services.gateway.middleware.security import (
-    SecurityMiddleware,
-    InputValidationMiddleware,
     SecurityConfig,
     RateLimitConfig
 )
+from services.gateway.middleware.pipeline import GatewayPipelineMiddleware, ParsedBodyRoute
 
 # Import enhanced security hardening
 from services.gateway.middleware.security_hardening import (
@@ -101,6 +98,21 @@ from services.gateway.resilience.circuit_breaker import (
     CircuitBreakerError
 )
 
+from services.gateway.resilience.adaptive_concurrency import (
+    AdaptiveConcurrencyMiddleware,
+    adaptive_concurrency_manager
+)
+from shared.core.deadline_middleware import DeadlineMiddleware
+from shared.core.startup_orchestrator import (
+    CapabilityDisabled, StartupOrchestrator, get_startup_orchestrator, require_capability,
+)
+from shared.core.sampling_profiler import create_profile_router, get_sampling_profiler, profile_endpoints_enabled
+from shared.core.executor_registry import get_executor_registry
+from shared.core.loop_monitor import get_loop_blocking_detector
+from shared.core.speculative_prefetch import get_speculative_prefetch_cache, search_with_prefetch
+from services.gateway.serialization import FastJSONResponse
+from shared.core.sla_budget_enforcer import ComplexityTier, budget_enforcer
+
 from services.gateway.resilience.graceful_degradation import (
     degradation_manager,
     error_boundary,
@@ -144,7 +156,6 @@ from services.gateway.routers.health_router import router as health_router
 from services.gateway.model_router import get_model_router
 from services.gateway.metrics_router import metrics_router
 from services.gateway.scoring_router import get_scoring_router, select_model_with_scoring
-from services.gateway.middleware.observability import ObservabilityMiddleware
 from services.gateway.metrics_endpoint import metrics_router as prometheus_metrics_router
 
 # Import advanced features router
@@ -247,93 +258,97 @@ import os
 import subprocess
 from contextlib import asynccontextmanager
 
-# Initialize advanced features
-async def initialize_advanced_features():
-    """Initialize all advanced features"""
-    try:
-        # Initialize cache manager
-        await cache_manager.initialize()
-        logger.info("✅ Cache manager initialized")
-        
-        # Initialize stream manager
-        await stream_manager.initialize()
-        logger.info("✅ Stream manager initialized")
-        
-        # Initialize background processor
-        await background_processor.initialize()
-        logger.info("✅ Background processor initialized")
-        
-        # Initialize prompt optimizer
-        await prompt_optimizer.initialize()
-        logger.info("✅ Prompt optimizer initialized")
-        
-        # Initialize HuggingFace integration
-        await huggingface_integration.initialize()
-        logger.info("✅ HuggingFace integration initialized")
-        
-        # Initialize audit service
-        from shared.core.services.audit_service import get_audit_service
-        audit_service = get_audit_service()
-        await audit_service.initialize()
-        logger.info("✅ Audit service initialized")
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to initialize advanced features: {e}")
+# Warmup tasks, run as a dependency graph by the startup orchestrator
+async def warmup_arangodb_task():
+    """Phase I1: ArangoDB warmup with real env variables"""
+    from shared.core.services.arangodb_service import warmup_arangodb
+    warmup_result = await warmup_arangodb()
+    if warmup_result.get('status') == 'disabled':
+        raise CapabilityDisabled("ArangoDB warmup disabled by configuration")
+    if warmup_result.get('status') != 'completed':
+        raise RuntimeError(f"ArangoDB warmup {warmup_result.get('status')}: {warmup_result.get('error')}")
+    logger.info(
+        "✅ ArangoDB warmup completed successfully",
+        duration_seconds=warmup_result.get('duration_seconds'),
+        tasks_completed=warmup_result.get('tasks_completed')
+    )
+
+
+async def warmup_vector_task():
+    """Phase I2: Vector service warmup (embedding model load) with real env variables"""
+    from shared.core.services.vector_singleton_service import warmup_vector_singleton
+    vector_warmup_result = await warmup_vector_singleton()
+    if vector_warmup_result.get('status') != 'completed':
+        raise RuntimeError(f"Vector service warmup {vector_warmup_result.get('status')}")
+    logger.info(
+        "✅ Vector service warmup completed successfully",
+        warmup_time_ms=vector_warmup_result.get('health', {}).get('embedding', {}).get('metrics', {}).get('tts_ms', 0),
+        embedding_loaded=vector_warmup_result.get('health', {}).get('embedding', {}).get('model_loaded', False),
+        vector_connected=vector_warmup_result.get('health', {}).get('vector_store', {}).get('connected', False)
+    )
+
+
+async def warmup_http_pools_task():
+    """Open keep-alive connections to cold provider hosts before the first request"""
+    from shared.core.http_client_registry import http_client_registry
+    warmup_hosts = await http_client_registry.warmup()
+    logger.info(
+        "✅ HTTP connection pool warmup completed",
+        hosts_ready=sum(warmup_hosts.values()),
+        hosts_total=len(warmup_hosts)
+    )
+
+
+async def initialize_audit_service():
+    from shared.core.services.audit_service import get_audit_service
+    await get_audit_service().initialize()
+
+
+def register_startup_tasks(startup: StartupOrchestrator) -> None:
+    """Declare the gateway warmup graph"""
+    startup.add_task("arangodb", warmup_arangodb_task, provides=("knowledge_graph",))
+    startup.add_task("vector", warmup_vector_task, provides=("vector_search",))
+    startup.add_task("http_pools", warmup_http_pools_task, provides=("providers",))
+    startup.add_task("cache", cache_manager.initialize, provides=("cache",))
+    startup.add_task("prefetch_cache", get_speculative_prefetch_cache().initialize, provides=("speculative_prefetch",))
+    startup.add_task("streaming", stream_manager.initialize, provides=("streaming",))
+    startup.add_task("background_processor", background_processor.initialize, provides=("background_tasks",))
+    startup.add_task("prompt_optimizer", prompt_optimizer.initialize, provides=("prompt_optimization",))
+    # Loaded after the vector model so the two model loads don't peak memory together;
+    # ordering only, HuggingFace still initializes if the vector warmup fails
+    startup.add_task("huggingface", huggingface_integration.initialize, after=("vector",), provides=("huggingface",))
+    startup.add_task("audit", initialize_audit_service, provides=("audit",))
+
 
 # Initialize features on startup using modern lifespan
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    logger.info("🚀 Starting application with Phase I1 ArangoDB warmup")
-    
-    # Phase I1: Initialize ArangoDB warmup with real env variables
-    try:
-        from shared.core.services.arangodb_service import warmup_arangodb
-        warmup_result = await warmup_arangodb()
-        
-        if warmup_result.get('status') == 'completed':
-            logger.info(
-                "✅ ArangoDB warmup completed successfully",
-                duration_seconds=warmup_result.get('duration_seconds'),
-                tasks_completed=warmup_result.get('tasks_completed')
-            )
-        else:
-            logger.warning(
-                "⚠️ ArangoDB warmup failed or disabled",
-                status=warmup_result.get('status'),
-                error=warmup_result.get('error')
-            )
-    except Exception as e:
-        logger.error("❌ ArangoDB warmup initialization failed", error=str(e))
-    
-    # Phase I2: Initialize Vector Service warmup with real env variables
-    try:
-        from shared.core.services.vector_singleton_service import warmup_vector_singleton
-        vector_warmup_result = await warmup_vector_singleton()
-        
-        if vector_warmup_result.get('status') == 'completed':
-            logger.info(
-                "✅ Vector service warmup completed successfully",
-                warmup_time_ms=vector_warmup_result.get('health', {}).get('embedding', {}).get('metrics', {}).get('tts_ms', 0),
-                embedding_loaded=vector_warmup_result.get('health', {}).get('embedding', {}).get('model_loaded', False),
-                vector_connected=vector_warmup_result.get('health', {}).get('vector_store', {}).get('connected', False)
-            )
-        else:
-            logger.warning(
-                "⚠️ Vector service warmup failed",
-                status=vector_warmup_result.get('status'),
-                warmup_completed=vector_warmup_result.get('warmup_completed', False)
-            )
-    except Exception as e:
-        logger.error("❌ Vector service warmup initialization failed", error=str(e))
-    
-
-    await initialize_advanced_features()
+    # Startup: warmups run concurrently in the background; requests are served
+    # as soon as the capabilities in STARTUP_WAIT_FOR (default: none) are ready
+    # Blocking work (and asyncio.to_thread) runs on the shared bounded pools
+    get_executor_registry().install_default_executor()
+    loop_monitor = get_loop_blocking_detector()
+    if loop_monitor.config.enabled:
+        loop_monitor.start()
+    startup = get_startup_orchestrator()
+    if not startup.tasks:
+        register_startup_tasks(startup)
+    logger.info("🚀 Starting application warmup", tasks=len(startup.tasks))
+    startup.start()
+    profiler = get_sampling_profiler()
+    if profiler.config.enabled:
+        profiler.start()
+    if startup.config.wait_for:
+        await startup.wait_for(startup.config.wait_for, timeout=startup.config.wait_timeout_s)
     yield
     # Shutdown
+    profiler.stop()
+    loop_monitor.stop()
+    await startup.stop()
     await cache_manager.close()
+    await get_speculative_prefetch_cache().close()
     await stream_manager.close()
     await huggingface_integration.close()
     await background_processor.close()
@@ -343,6 +358,9 @@ async def lifespan(app: FastAPI):
     from shared.core.services.audit_service import get_audit_service
     audit_service = get_audit_service()
     await audit_service.close()
+    
+    from shared.core.http_client_registry import http_client_registry
+    await http_client_registry.close()
 
 
 
@@ -351,8 +369,11 @@ app = FastAPI(
     title="Universal Knowledge Platform API Gateway",
     description="Advanced API Gateway with caching, streaming, background processing, and prompt optimization",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
+# Gateway routes reuse the JSON body parsed once by GatewayPipelineMiddleware
+app.router.route_class = ParsedBodyRoute
 
 # Add exception handlers for enhanced error handling
 app.add_exception_handler(SarvanOMError, sarvanom_exception_handler)
@@ -438,18 +459,27 @@ security_config = SecurityConfig(
 # Setup FastAPI logging integration
 setup_fastapi_logging(app, service_name="sarvanom-gateway-service")
 
-# Add observability middleware (first - to capture all requests)
-app.add_middleware(ObservabilityMiddleware)
-
 # Add enhanced security hardening middleware
 # Temporarily disabled due to 503 errors
 # app.add_middleware(SecurityHardeningMiddleware, config=security_hardening_config)
 
-# Add legacy security middleware (for backward compatibility)
-app.add_middleware(SecurityMiddleware, config=security_config)
+# Add observability, security and input validation as one pure-ASGI layer
+# (single body parse, streaming responses passed through untouched)
+app.add_middleware(GatewayPipelineMiddleware, config=security_config)
 
-# Add input validation middleware
-app.add_middleware(InputValidationMiddleware)
+# Add adaptive concurrency limiting (outside validation so overload is shed before any body parsing)
+app.add_middleware(AdaptiveConcurrencyMiddleware, manager=adaptive_concurrency_manager)
+
+# Add request deadline (outside concurrency so queueing time is charged to the request budget)
+app.add_middleware(
+    DeadlineMiddleware,
+    default_budget_ms=budget_enforcer.get_budget_config(ComplexityTier.RESEARCH).response_time_limit * 1000,
+    path_budgets_ms={
+        "/search": budget_enforcer.get_budget_config(ComplexityTier.SIMPLE).response_time_limit * 1000,
+        "/query": budget_enforcer.get_budget_config(ComplexityTier.RESEARCH).response_time_limit * 1000,
+        "/stream/search": budget_enforcer.get_budget_config(ComplexityTier.RESEARCH).response_time_limit * 1000,
+    }
+)
 
 # Add trusted host middleware with permissive configuration for testing
 app.add_middleware(
@@ -475,6 +505,9 @@ app.include_router(analytics_router, prefix="/analytics")
 # Include new centralized components
 app.include_router(metrics_router)
 app.include_router(prometheus_metrics_router)
+# On-demand profiles: /_debug/profile and /_debug/profile/stalls (only with PROFILER_ENABLED and a debug token)
+if profile_endpoints_enabled():
+    app.include_router(create_profile_router())
 
 # Resilience endpoints
 @app.get("/health/resilience")
@@ -489,6 +522,7 @@ async def get_resilience_health():
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "circuit_breakers": circuit_breaker_status,
             "degradation": degradation_status,
+            "adaptive_concurrency": adaptive_concurrency_manager.get_all_status(),
             "request_id": get_request_id()
         }
     except Exception as e:
@@ -541,7 +575,7 @@ app.include_router(synthesis_router, prefix="/synthesis")
 app.include_router(tests_router)  # tests_router already has /tests prefix
 # Temporarily disabled auth_router to test direct auth implementation
 # app.include_router(auth_router, prefix="/auth")
-app.include_router(vector_router, prefix="/vector")
+app.include_router(vector_router, prefix="/vector", dependencies=[Depends(require_capability("vector_search"))])
 
 # Include additional service routers (only if successfully imported)
 # Temporarily disabled auth service router to test direct implementation
@@ -578,6 +612,7 @@ if advanced_features_router:
 class SearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=1000)
     user_id: Optional[str] = None
+    session_id: Optional[str] = None  # claims retrieval prefetched while the query was typed
     filters: Optional[Dict[str, Any]] = None
     max_results: Optional[int] = Field(default=10, ge=1, le=100)
     
@@ -993,6 +1028,7 @@ class ReadinessResponse(BaseModel):
     uptime_s: float = Field(..., description="Service uptime in seconds")
     dependencies: List[DependencyStatus] = Field(..., description="List of dependency statuses")
     error_count: int = Field(..., description="Number of unhealthy dependencies")
+    capabilities: Dict[str, str] = Field(default_factory=dict, description="Startup readiness per capability: ready, pending, failed or disabled")
 
 class VersionResponse(BaseModel):
     """Version information response model"""
@@ -1264,7 +1300,7 @@ async def detailed_health_check():
         
     except Exception as e:
         logger.error(f"Detailed health check failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=503,
             content={
             "status": "error",
@@ -1314,11 +1350,7 @@ async def router_metrics():
             "timestamp": time.time()
         }
         
-        # Ensure proper JSON serialization
-        import json
-        json_response = json.dumps(response_data, default=str)
-        
-        return JSONResponse(
+        return FastJSONResponse(
             content=response_data,
             headers={"Content-Type": "application/json"}
         )
@@ -1329,7 +1361,7 @@ async def router_metrics():
             "error": str(e),
             "timestamp": time.time()
         }
-        return JSONResponse(
+        return FastJSONResponse(
             content=error_response,
             status_code=500,
             headers={"Content-Type": "application/json"}
@@ -1418,7 +1450,7 @@ async def performance_metrics():
         
         summary = get_performance_summary()
         
-        return JSONResponse(
+        return FastJSONResponse(
             content={
             "status": "available",
             "performance_summary": summary,
@@ -1435,7 +1467,7 @@ async def performance_metrics():
         )
     except Exception as e:
         logger.error(f"Performance metrics failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
             "status": "error",
             "error": str(e),
@@ -1452,7 +1484,7 @@ async def enhanced_health_check():
     """Enhanced health check endpoint with comprehensive monitoring."""
     try:
         # Simple health check without complex dependencies
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "healthy",
                 "timestamp": time.time(),
@@ -1464,7 +1496,7 @@ async def enhanced_health_check():
         )
     except Exception as e:
         logger.error(f"Enhanced health check failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "unhealthy",
                 "error": str(e),
@@ -1486,7 +1518,7 @@ async def datastores_metrics():
         status = await optimizer.get_comprehensive_status()
         recommendations = await optimizer.get_optimization_recommendations()
         
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "available",
                 "datastores_status": status,
@@ -1497,7 +1529,7 @@ async def datastores_metrics():
         )
     except Exception as e:
         logger.error(f"Datastores metrics failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "error",
                 "error": str(e),
@@ -1517,13 +1549,13 @@ async def datastores_status():
         optimizer = await get_datastores_optimizer()
         status = await optimizer.get_comprehensive_status()
         
-        return JSONResponse(
+        return FastJSONResponse(
             content=status,
             headers={"Content-Type": "application/json"}
         )
     except Exception as e:
         logger.error(f"Datastores status failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "error": str(e),
                 "timestamp": time.time()
@@ -1548,7 +1580,7 @@ async def optimize_datastores():
             status = await optimizer.get_comprehensive_status()
             recommendations = await optimizer.get_optimization_recommendations()
             
-            return JSONResponse(
+            return FastJSONResponse(
                 content={
                     "status": "optimization_complete",
                     "success": True,
@@ -1559,7 +1591,7 @@ async def optimize_datastores():
                 headers={"Content-Type": "application/json"}
             )
         else:
-            return JSONResponse(
+            return FastJSONResponse(
                 content={
                     "status": "optimization_failed",
                     "success": False,
@@ -1572,7 +1604,7 @@ async def optimize_datastores():
             
     except Exception as e:
         logger.error(f"Datastores optimization failed: {e}")
-        return JSONResponse(
+        return FastJSONResponse(
             content={
                 "status": "optimization_failed",
                 "success": False,
@@ -1995,6 +2027,8 @@ async def get_audit_trail(trace_id: str):
 async def list_audit_trails(
     user_id: Optional[str] = None,
     service_name: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
     limit: int = 100,
     offset: int = 0
 ):
@@ -2002,15 +2036,27 @@ async def list_audit_trails(
     try:
         from shared.core.services.audit_service import get_audit_service
         
+        # Naive timestamps are taken as UTC
+        if start_time and start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        if end_time and end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=timezone.utc)
+        
         audit_service = get_audit_service()
-        audit_trails = audit_service.get_audit_trails(
+        paginated_trails = audit_service.get_audit_trails(
             user_id=user_id,
             service_name=service_name,
-            limit=limit + offset
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            offset=offset
+        )
+        total = audit_service.count_audit_trails(
+            user_id=user_id,
+            service_name=service_name,
+            start_time=start_time,
+            end_time=end_time
         )
-        
-        # Apply pagination
-        paginated_trails = audit_trails[offset:offset + limit]
         
         # Convert to summary format
         trail_summaries = []
@@ -2039,12 +2085,14 @@ async def list_audit_trails(
             "pagination": {
                 "limit": limit,
                 "offset": offset,
-                "total": len(audit_trails),
+                "total": total,
                 "returned": len(trail_summaries)
             },
             "filters": {
                 "user_id": user_id,
-                "service_name": service_name
+                "service_name": service_name,
+                "start_time": start_time.isoformat() if start_time else None,
+                "end_time": end_time.isoformat() if end_time else None
             },
             "service": "audit_provenance"
         }
@@ -2382,11 +2430,19 @@ async def search_post(request: SearchRequest):
         # Run zero-budget retrieval and LLM processing in parallel for better performance
         logger.info(f"Starting parallel search processing for query: {request.query}")
         
-        # Create tasks for parallel execution
+        # Create tasks for parallel execution; providers prefetched while the
+        # query was being refined are skipped and their results merged in
+        retrieval_k = min(request.max_results or 10, 10)
+        prefetch_hit = await get_speculative_prefetch_cache().claim(request.session_id, request.query)
         retrieval_task = asyncio.create_task(
-            combined_search(
-                query=request.query,
-                k=min(request.max_results or 10, 10)
+            search_with_prefetch(
+                prefetch_hit,
+                lambda skip_providers: combined_search(
+                    query=request.query,
+                    k=retrieval_k,
+                    skip_providers=skip_providers
+                ),
+                k=retrieval_k
             )
         )
         
@@ -2660,7 +2716,8 @@ async def stream_search_endpoint(
     query: str,
     max_tokens: int = 1000,
     temperature: float = 0.2,
-    user_id: Optional[str] = None
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
 ):
     """
     SSE streaming search endpoint with comprehensive lifecycle management.
@@ -2670,6 +2727,7 @@ async def stream_search_endpoint(
         max_tokens: Maximum tokens to generate
         temperature: Generation temperature
         user_id: Optional user ID for tracking
+        session_id: Optional guided-prompt session whose prefetched retrieval can be claimed
         
     Returns:
         StreamingResponse with SSE events
@@ -2695,12 +2753,16 @@ async def stream_search_endpoint(
         # Generate trace ID for request tracking
         trace_id = str(uuid.uuid4())
         
+        # Providers prefetched while the query was typed are skipped by the stream's retrieval
+        prefetch_hit = await get_speculative_prefetch_cache().claim(session_id, query)
+        
         # Create SSE response with trace ID
         response = await create_sse_response(
             query=query,
             max_tokens=max_tokens,
             temperature=temperature,
-            trace_id=trace_id
+            trace_id=trace_id,
+            prefetch_hit=prefetch_hit
         )
         
         return response
@@ -2962,7 +3024,7 @@ async def crawl_endpoint(request: CrawlRequest):
     }
 
 # Vector database service endpoint
-@app.post("/vector/search")
+@app.post("/vector/search", dependencies=[Depends(require_capability("vector_search"))])
 async def vector_search_endpoint(request: VectorSearchRequest):
     """Placeholder for vector database service."""
     return {
@@ -3230,6 +3292,7 @@ async def root():
         ],
         "health": "/health",
         "ready": "/ready",
+        "startup": "/startup",
         "version_info": "/version"
     }
 
@@ -3248,8 +3311,7 @@ async def health_check():
     )
     
     # Add trace_id to response headers
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
+    return FastJSONResponse(
         content=response.model_dump(),
         headers={"X-Trace-ID": trace_id}
     )
@@ -3286,23 +3348,35 @@ async def readiness_check():
             if dep.status != "healthy":
                 error_count += 1
     
-    # Determine overall status
-    overall_status = "ready" if error_count == 0 else "not_ready"
+    # Determine overall status; healthy dependencies with capabilities still
+    # warming (or failed) report partial readiness
+    startup_readiness = get_startup_orchestrator().readiness()
+    if error_count:
+        overall_status = "not_ready"
+    elif startup_readiness["status"] == "ready":
+        overall_status = "ready"
+    else:
+        overall_status = "partial"
     
     response = ReadinessResponse(
         status=overall_status,
         uptime_s=time.time() - startup_time,
         dependencies=processed_dependencies,
-        error_count=error_count
+        error_count=error_count,
+        capabilities=startup_readiness["capabilities"]
     )
     
     # Add trace_id to response headers
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
+    return FastJSONResponse(
         content=response.model_dump(),
         headers={"X-Trace-ID": trace_id}
     )
 
+@app.get("/startup")
+async def startup_report():
+    """Cold-start timing report: boot time, warmup task timeline, critical path and lazy imports"""
+    return get_startup_orchestrator().get_report()
+
 @app.get("/version", response_model=VersionResponse)
 async def version_info():
     """Get version information including git SHA and build time"""
@@ -3316,8 +3390,7 @@ async def version_info():
     )
     
     # Add trace_id to response headers
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
+    return FastJSONResponse(
         content=response.dict(),
         headers={"X-Trace-ID": trace_id}
     )
@@ -3423,7 +3496,7 @@ else:
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=404,
         content={
             "error": "Endpoint not found", 
@@ -3435,7 +3508,7 @@ async def not_found_handler(request, exc):
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error", 
@@ -3693,7 +3766,7 @@ async def system_status():
         raise HTTPException(status_code=500, detail=str(e))
 
 # HuggingFace Integration Endpoints
-@app.post("/huggingface/generate")
+@app.post("/huggingface/generate", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_text_generation(
     prompt: str,
     model_name: str = "distilgpt2",
@@ -3719,7 +3792,7 @@ async def huggingface_text_generation(
         logger.error(f"HuggingFace text generation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/embeddings")
+@app.post("/huggingface/embeddings", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_embeddings(
     texts: List[str],
     model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
@@ -3741,7 +3814,7 @@ async def huggingface_embeddings(
         logger.error(f"HuggingFace embeddings error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/sentiment")
+@app.post("/huggingface/sentiment", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_sentiment_analysis(
     text: str,
     model_name: str = "distilbert-base-uncased-finetuned-sst-2-english"
@@ -3763,7 +3836,7 @@ async def huggingface_sentiment_analysis(
         logger.error(f"HuggingFace sentiment analysis error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/summarize")
+@app.post("/huggingface/summarize", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_summarization(
     text: str,
     model_name: str = "facebook/bart-large-cnn",
@@ -3787,7 +3860,7 @@ async def huggingface_summarization(
         logger.error(f"HuggingFace summarization error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/translate")
+@app.post("/huggingface/translate", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_translation(
     text: str,
     target_language: str = "es",
@@ -3810,7 +3883,7 @@ async def huggingface_translation(
         logger.error(f"HuggingFace translation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/entities")
+@app.post("/huggingface/entities", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_entity_extraction(
     text: str,
     model_name: str = "dbmdz/bert-large-cased-finetuned-conll03-english"
@@ -3832,7 +3905,7 @@ async def huggingface_entity_extraction(
         logger.error(f"HuggingFace entity extraction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/qa")
+@app.post("/huggingface/qa", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_question_answering(
     question: str,
     context: str,
@@ -3856,7 +3929,7 @@ async def huggingface_question_answering(
         logger.error(f"HuggingFace question answering error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/similarity")
+@app.post("/huggingface/similarity", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_text_similarity(
     text1: str,
     text2: str,
@@ -3880,7 +3953,7 @@ async def huggingface_text_similarity(
         logger.error(f"HuggingFace similarity calculation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/huggingface/zero-shot")
+@app.post("/huggingface/zero-shot", dependencies=[Depends(require_capability("huggingface"))])
 async def huggingface_zero_shot_classification(
     text: str,
     candidate_labels: List[str],
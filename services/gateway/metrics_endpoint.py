@@ -22,6 +22,17 @@ from fastapi import APIRouter, Response
 from fastapi.responses import PlainTextResponse
 
 from services.gateway.middleware.observability import get_metrics_collector
+from services.gateway.resilience.adaptive_concurrency import adaptive_concurrency_manager
+from shared.core.http_client_registry import http_client_registry
+from services.retrieval.provider_scheduler import provider_scheduler
+from shared.core.kg_index import get_entity_index_sync, get_neighbourhood_cache
+from shared.core.inference_pool import get_inference_pool
+from shared.core.services.audit_service import get_audit_service
+from shared.core.startup_orchestrator import get_startup_orchestrator
+from shared.core.sampling_profiler import get_sampling_profiler
+from shared.core.loop_monitor import get_loop_blocking_detector
+from shared.core.executor_registry import get_executor_registry
+from shared.core.speculative_prefetch import get_speculative_prefetch_cache
 
 # Create metrics router
 metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
@@ -292,6 +303,378 @@ async def get_metrics():
         
         lines.append("")
         
+        # Adaptive concurrency metrics
+        lines.append("# Adaptive Concurrency Metrics")
+        for endpoint, status in adaptive_concurrency_manager.get_all_status().items():
+            labels = {"endpoint": endpoint}
+            lines.append(format_prometheus_metric(
+                "adaptive_concurrency_limit",
+                status["limit"],
+                labels,
+                "Current adaptive concurrency limit"
+            ))
+            lines.append(format_prometheus_metric(
+                "adaptive_concurrency_in_flight",
+                status["in_flight"],
+                labels,
+                "Requests currently holding a concurrency slot"
+            ))
+            lines.append(format_prometheus_metric(
+                "adaptive_concurrency_queue_depth",
+                status["queue_depth"],
+                labels,
+                "Requests waiting for a concurrency slot"
+            ))
+            lines.append(format_prometheus_counter(
+                "adaptive_concurrency_limit_increases_total",
+                status["limit_increases"],
+                labels,
+                "Total number of concurrency limit increases"
+            ))
+            lines.append(format_prometheus_counter(
+                "adaptive_concurrency_limit_decreases_total",
+                status["limit_decreases"],
+                labels,
+                "Total number of concurrency limit decreases"
+            ))
+            for reason, count in status["shed_total"].items():
+                lines.append(format_prometheus_counter(
+                    "adaptive_concurrency_shed_total",
+                    count,
+                    {**labels, "reason": reason},
+                    "Total number of requests shed by the adaptive concurrency limiter"
+                ))
+        
+        lines.append("")
+        
+        # Outbound HTTP connection pool metrics
+        lines.append("# HTTP Connection Pool Metrics")
+        pool_stats = http_client_registry.get_pool_stats()
+        lines.append(format_prometheus_metric(
+            "http_pool_connections_in_use",
+            pool_stats["in_use"],
+            help_text="Outbound HTTP connections currently serving a request"
+        ))
+        lines.append(format_prometheus_metric(
+            "http_pool_requests_waiting",
+            pool_stats["waiting"],
+            help_text="Outbound HTTP requests waiting for a pooled connection"
+        ))
+        lines.append(format_prometheus_counter(
+            "http_pool_dns_cache_hits_total",
+            pool_stats["dns_cache"]["hits"],
+            help_text="Total DNS cache hits for outbound HTTP connections"
+        ))
+        for host, host_stats in pool_stats["hosts"].items():
+            labels = {"host": host}
+            lines.append(format_prometheus_counter(
+                "http_pool_connections_opened_total",
+                host_stats["connections_opened"],
+                labels,
+                "Total new outbound connections opened"
+            ))
+            lines.append(format_prometheus_metric(
+                "http_pool_connect_latency_p95_ms",
+                host_stats["connect_latency_p95_ms"],
+                labels,
+                "95th percentile TCP connect latency in milliseconds"
+            ))
+            lines.append(format_prometheus_metric(
+                "http_pool_tls_latency_avg_ms",
+                host_stats["tls_latency_avg_ms"],
+                labels,
+                "Average TLS handshake latency in milliseconds"
+            ))
+        
+        lines.append("")
+        
+        # Free-tier provider scheduler metrics
+        lines.append("# Provider Scheduler Metrics")
+        for provider, stats in provider_scheduler.get_stats().items():
+            labels = {"provider": provider}
+            lines.append(format_prometheus_counter(
+                "provider_scheduler_calls_total",
+                stats["calls"],
+                labels,
+                "Total provider calls made by the retrieval scheduler"
+            ))
+            lines.append(format_prometheus_counter(
+                "provider_scheduler_skips_total",
+                stats["skipped"],
+                labels,
+                "Total provider calls skipped by the retrieval scheduler"
+            ))
+            lines.append(format_prometheus_metric(
+                "provider_scheduler_skip_rate",
+                stats["skip_rate"],
+                labels,
+                "Share of queries on which the provider was skipped"
+            ))
+            lines.append(format_prometheus_metric(
+                "provider_scheduler_contribution_rate",
+                stats["contribution_rate"],
+                labels,
+                "Share of provider calls with a result in the final top-k"
+            ))
+        
+        lines.append("")
+        
+        # KG entity index metrics
+        lines.append("# KG Entity Index Metrics")
+        entity_index_stats = get_entity_index_sync().get_stats()
+        lines.append(format_prometheus_metric(
+            "kg_entity_index_entities",
+            entity_index_stats["entities"],
+            help_text="Entities held in the in-process KG entity index"
+        ))
+        lines.append(format_prometheus_counter(
+            "kg_entity_index_lookups_total",
+            entity_index_stats["lookups"],
+            help_text="Total entity lookups served by the KG entity index"
+        ))
+        lines.append(format_prometheus_metric(
+            "kg_entity_index_lookup_avg_ms",
+            entity_index_stats["avg_lookup_ms"],
+            help_text="Average KG entity index lookup time in milliseconds"
+        ))
+        lines.append(format_prometheus_counter(
+            "kg_entity_index_changes_applied_total",
+            entity_index_stats["changes_applied"],
+            help_text="Total entity changes applied from the ArangoDB change feed"
+        ))
+        if entity_index_stats["sync_lag_seconds"] is not None:
+            lines.append(format_prometheus_metric(
+                "kg_entity_index_sync_lag_seconds",
+                entity_index_stats["sync_lag_seconds"],
+                help_text="Seconds since the KG entity index last synced with ArangoDB"
+            ))
+        neighbourhood_stats = get_neighbourhood_cache().get_stats()
+        lines.append(format_prometheus_metric(
+            "kg_neighbourhood_cache_entries",
+            neighbourhood_stats["entries"],
+            help_text="Entity neighbourhoods held in the KG neighbourhood cache"
+        ))
+        lines.append(format_prometheus_metric(
+            "kg_neighbourhood_cache_hit_rate",
+            neighbourhood_stats["hit_rate"],
+            help_text="KG neighbourhood cache hit rate"
+        ))
+        lines.append(format_prometheus_counter(
+            "kg_neighbourhood_cache_invalidations_total",
+            neighbourhood_stats["invalidations"],
+            help_text="Total neighbourhoods invalidated by relationship writes"
+        ))
+        
+        lines.append("")
+        
+        # Local inference pool metrics
+        lines.append("# Inference Pool Metrics")
+        inference_stats = get_inference_pool().get_stats()
+        lines.append(format_prometheus_metric(
+            "inference_pool_workers_alive",
+            inference_stats["workers_alive"],
+            help_text="Live local inference worker processes"
+        ))
+        lines.append(format_prometheus_counter(
+            "inference_pool_worker_restarts_total",
+            inference_stats["restarts"],
+            help_text="Total inference workers restarted after exiting"
+        ))
+        for model_name, stats in inference_stats["models"].items():
+            labels = {"model": model_name}
+            lines.append(format_prometheus_metric(
+                "inference_pool_queue_depth",
+                stats["queue_depth"],
+                labels,
+                "Requests waiting to be batched for the model"
+            ))
+            lines.append(format_prometheus_counter(
+                "inference_pool_requests_total",
+                stats["requests"],
+                labels,
+                "Total inference requests submitted for the model"
+            ))
+            lines.append(format_prometheus_counter(
+                "inference_pool_rejected_total",
+                stats["rejected"],
+                labels,
+                "Total inference requests rejected because the model queue was full"
+            ))
+            lines.append(format_prometheus_metric(
+                "inference_pool_avg_batch_size",
+                stats["avg_batch_size"],
+                labels,
+                "Average requests per inference batch"
+            ))
+            lines.append(format_prometheus_metric(
+                "inference_pool_latency_p95_ms",
+                stats["latency_p95_ms"],
+                labels,
+                "95th percentile inference request latency in milliseconds"
+            ))
+        
+        lines.append("")
+        
+        # Audit store metrics
+        lines.append("# Audit Store Metrics")
+        audit_stats = get_audit_service().get_stats()
+        lines.append(format_prometheus_metric(
+            "audit_trails_stored",
+            audit_stats["store"]["trails"],
+            help_text="Audit trails held in the in-memory ring"
+        ))
+        lines.append(format_prometheus_counter(
+            "audit_trails_evicted_total",
+            audit_stats["store"]["evicted"],
+            help_text="Total audit trails evicted from the ring (capacity or retention)"
+        ))
+        if audit_stats["writer"]:
+            lines.append(format_prometheus_metric(
+                "audit_events_pending",
+                audit_stats["writer"]["pending"],
+                help_text="Audit events queued for the next persisted batch"
+            ))
+            lines.append(format_prometheus_counter(
+                "audit_events_persisted_total",
+                audit_stats["writer"]["written"],
+                help_text="Total audit events appended to the audit log"
+            ))
+            lines.append(format_prometheus_counter(
+                "audit_events_dropped_total",
+                audit_stats["writer"]["dropped"],
+                help_text="Total audit events dropped because the persist queue was full"
+            ))
+        
+        lines.append("")
+        
+        # Startup metrics
+        lines.append("# Startup Metrics")
+        startup_report = get_startup_orchestrator().get_report()
+        for capability, status in startup_report["readiness"]["capabilities"].items():
+            lines.append(format_prometheus_metric(
+                "startup_capability_ready",
+                1 if status == "ready" else 0,
+                {"capability": capability},
+                "Whether the capability finished warmup (1) or is pending/failed (0)"
+            ))
+        for task_name, task in startup_report["tasks"].items():
+            if task["duration_s"] is not None:
+                lines.append(format_prometheus_metric(
+                    "startup_task_duration_seconds",
+                    task["duration_s"],
+                    {"task": task_name},
+                    "Warmup task duration at startup"
+                ))
+        lines.append(format_prometheus_metric(
+            "startup_warmup_seconds",
+            startup_report["warmup_s"],
+            help_text="Wall time from warmup start to the last warmup task finishing"
+        ))
+        
+        lines.append("")
+        
+        # Profiler metrics
+        lines.append("# Profiler Metrics")
+        profiler_stats = get_sampling_profiler().get_stats()
+        lines.append(format_prometheus_metric(
+            "profiler_running",
+            1 if profiler_stats["running"] else 0,
+            help_text="Whether the sampling profiler is running"
+        ))
+        lines.append(format_prometheus_counter(
+            "profiler_samples_total",
+            profiler_stats["samples_total"],
+            help_text="Stack samples taken by the sampling profiler"
+        ))
+        lines.append(format_prometheus_counter(
+            "profiler_loop_stalls_total",
+            profiler_stats["stalls_total"],
+            help_text="Event-loop stalls longer than PROFILER_STALL_THRESHOLD_MS"
+        ))
+        lines.append(format_prometheus_metric(
+            "profiler_max_loop_stall_ms",
+            profiler_stats["max_stall_ms"],
+            help_text="Longest recent event-loop stall in milliseconds"
+        ))
+        lines.append(format_prometheus_metric(
+            "profiler_overhead_ratio",
+            profiler_stats["overhead_ratio"],
+            help_text="Fraction of wall time spent taking samples"
+        ))
+        
+        lines.append("")
+        
+        # Event loop blocking metrics
+        lines.append("# Event Loop Blocking Metrics")
+        loop_monitor = get_loop_blocking_detector()
+        loop_stats = loop_monitor.get_stats()
+        lines.append(format_prometheus_counter(
+            "event_loop_blocks_total",
+            loop_stats["blocks_total"],
+            help_text="Event-loop blocks longer than LOOP_BLOCK_THRESHOLD_MS"
+        ))
+        lines.append(format_prometheus_counter(
+            "event_loop_blocked_seconds_total",
+            loop_stats["blocked_seconds_total"],
+            help_text="Total time the event loop was blocked"
+        ))
+        lines.append(format_prometheus_metric(
+            "event_loop_max_block_ms",
+            loop_stats["max_block_ms"],
+            help_text="Longest event-loop block in milliseconds"
+        ))
+        for site in loop_monitor.get_sites():
+            lines.append(format_prometheus_counter(
+                "event_loop_blocks_by_site_total",
+                site["count"],
+                {"site": site["site"]},
+                "Event-loop blocks attributed to the blocking call site"
+            ))
+            lines.append(format_prometheus_metric(
+                "event_loop_blocked_ms_by_site",
+                site["total_ms"],
+                {"site": site["site"]},
+                "Total event-loop blocked time attributed to the call site"
+            ))
+        
+        lines.append("")
+        
+        # Executor metrics
+        lines.append("# Executor Metrics")
+        for pool_name, pool in get_executor_registry().get_stats().items():
+            labels = {"pool": pool_name}
+            lines.append(format_prometheus_metric("executor_workers", pool["workers"], labels, "Threads in the offload pool"))
+            lines.append(format_prometheus_metric("executor_active", pool["active"], labels, "Offloaded calls running"))
+            lines.append(format_prometheus_metric("executor_queued", pool["queued"], labels, "Offloaded calls waiting for a thread"))
+            lines.append(format_prometheus_counter("executor_calls_total", pool["completed_total"], labels, "Offloaded calls completed"))
+            lines.append(format_prometheus_counter("executor_rejected_total", pool["rejected_total"], labels, "Offloaded calls rejected because the pool was saturated"))
+            lines.append(format_prometheus_metric("executor_avg_wait_ms", pool["avg_wait_ms"], labels, "Average queue wait before an offloaded call started"))
+            lines.append(format_prometheus_counter("executor_run_seconds_total", pool["run_s_total"], labels, "Time spent running offloaded calls"))
+        
+        lines.append("")
+        
+        # Speculative prefetch metrics
+        lines.append("# Speculative Prefetch Metrics")
+        prefetch_stats = await get_speculative_prefetch_cache().get_stats()
+        for outcome in ("started", "stored", "cancelled", "failed", "hits", "misses", "unused"):
+            lines.append(format_prometheus_counter(
+                f"speculative_prefetch_{outcome}_total",
+                prefetch_stats[outcome],
+                help_text=f"Speculative retrieval prefetches {outcome}"
+            ))
+        lines.append(format_prometheus_metric(
+            "speculative_prefetch_waste_ratio",
+            prefetch_stats["waste_ratio"],
+            help_text="Share of started prefetches that never served a search"
+        ))
+        lines.append(format_prometheus_counter(
+            "speculative_prefetch_ttft_saved_ms_total",
+            prefetch_stats["ttft_saved_ms_total"],
+            help_text="Retrieval time skipped before the first token by prefetches used in a response"
+        ))
+        
+        lines.append("")
+        
         # Trace metrics
         lines.append("# Trace Metrics")
         lines.append(format_prometheus_counter(
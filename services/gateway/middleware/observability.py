@@ -25,8 +25,8 @@ from collections import defaultdict, Counter
 import asyncio
 import json
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -203,129 +203,145 @@ class TraceContext:
     tags: Dict[str, str] = field(default_factory=dict)
     baggage: Dict[str, str] = field(default_factory=dict)
 
-class ObservabilityMiddleware(BaseHTTPMiddleware):
-    """MAANG-grade observability middleware."""
-    
-    def __init__(self, app):
-        super().__init__(app)
+class RequestObservation:
+    """Per-request observability state carried from request start to response"""
+
+    __slots__ = ("trace_context", "method", "path", "start_time")
+
+    def __init__(self, trace_context: TraceContext, method: str, path: str):
+        self.trace_context = trace_context
+        self.method = method
+        self.path = path
+        self.start_time = time.time()
+
+
+class ObservabilityMiddleware:
+    """
+    MAANG-grade observability middleware (pure ASGI).
+
+    Opens a trace context per HTTP request, stamps ``X-Trace-ID`` on the
+    response start message and records request metrics. Body messages are
+    forwarded untouched, so streaming responses are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
         self.logger = logging.getLogger(__name__)
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """Process request with observability."""
-        # Generate or extract trace ID
-        trace_id = self._get_or_generate_trace_id(request)
-        
-        # Create trace context
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        observation = self.begin(scope, Headers(scope=scope))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.on_response_start(observation, message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            self.on_error(observation, e)
+            raise
+
+    def begin(self, scope: Scope, headers: Headers) -> RequestObservation:
+        """Create the trace context and publish it on the request state"""
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        remote_addr = client[0] if client else "unknown"
+        user_agent = headers.get("user-agent", "unknown")
+        trace_id = self._get_or_generate_trace_id(scope, headers)
+
         trace_context = TraceContext(
             trace_id=trace_id,
             span_id=str(uuid.uuid4()),
             tags={
-                "method": request.method,
-                "path": request.url.path,
-                "user_agent": request.headers.get("user-agent", "unknown"),
-                "remote_addr": request.client.host if request.client else "unknown"
+                "method": method,
+                "path": path,
+                "user_agent": user_agent,
+                "remote_addr": remote_addr
             }
         )
-        
-        # Add trace context to request state
-        request.state.trace_context = trace_context
-        
-        # Record request start
-        start_time = time.time()
+        scope.setdefault("state", {})["trace_context"] = trace_context
+
         self.logger.info(
-            f"Request started: {request.method} {request.url.path}",
+            f"Request started: {method} {path}",
             extra={
                 "trace_id": trace_id,
                 "span_id": trace_context.span_id,
-                "method": request.method,
-                "path": request.url.path,
-                "user_agent": request.headers.get("user-agent", "unknown"),
-                "remote_addr": request.client.host if request.client else "unknown"
+                "method": method,
+                "path": path,
+                "user_agent": user_agent,
+                "remote_addr": remote_addr
             }
         )
-        
-        # Increment request counter
         metrics_collector.increment_trace_requests(trace_id)
-        
-        try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate latency
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Record metrics
-            metrics_collector.increment_request_counter(
-                request.method, 
-                request.url.path, 
-                response.status_code
-            )
-            metrics_collector.record_request_latency(
-                request.method, 
-                request.url.path, 
-                latency_ms
-            )
-            metrics_collector.record_trace_duration(trace_id, latency_ms)
-            
-            # Add trace ID to response headers
-            response.headers["X-Trace-ID"] = trace_id
-            
-            # Log request completion
-            self.logger.info(
-                f"Request completed: {request.method} {request.url.path} - {response.status_code}",
-                extra={
-                    "trace_id": trace_id,
-                    "span_id": trace_context.span_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "latency_ms": latency_ms,
-                    "response_size": response.headers.get("content-length", 0)
-                }
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Calculate latency for failed requests
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Record error metrics
-            metrics_collector.increment_request_errors(
-                request.method, 
-                request.url.path, 
-                type(e).__name__
-            )
-            metrics_collector.record_trace_duration(trace_id, latency_ms)
-            
-            # Log error
-            self.logger.error(
-                f"Request failed: {request.method} {request.url.path} - {type(e).__name__}",
-                extra={
-                    "trace_id": trace_id,
-                    "span_id": trace_context.span_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "latency_ms": latency_ms
-                }
-            )
-            
-            raise
-            
-    def _get_or_generate_trace_id(self, request: Request) -> str:
+        return RequestObservation(trace_context, method, path)
+
+    def on_response_start(self, observation: RequestObservation, message: Message) -> None:
+        """Record metrics and add the trace header when the response starts"""
+        trace_id = observation.trace_context.trace_id
+        status_code = message["status"]
+        latency_ms = (time.time() - observation.start_time) * 1000
+
+        metrics_collector.increment_request_counter(observation.method, observation.path, status_code)
+        metrics_collector.record_request_latency(observation.method, observation.path, latency_ms)
+        metrics_collector.record_trace_duration(trace_id, latency_ms)
+
+        headers = MutableHeaders(scope=message)
+        headers["X-Trace-ID"] = trace_id
+
+        self.logger.info(
+            f"Request completed: {observation.method} {observation.path} - {status_code}",
+            extra={
+                "trace_id": trace_id,
+                "span_id": observation.trace_context.span_id,
+                "method": observation.method,
+                "path": observation.path,
+                "status_code": status_code,
+                "latency_ms": latency_ms,
+                "response_size": headers.get("content-length", 0)
+            }
+        )
+
+    def on_error(self, observation: RequestObservation, error: Exception) -> None:
+        """Record a request that failed with an unhandled exception"""
+        trace_id = observation.trace_context.trace_id
+        latency_ms = (time.time() - observation.start_time) * 1000
+
+        metrics_collector.increment_request_errors(observation.method, observation.path, type(error).__name__)
+        metrics_collector.record_trace_duration(trace_id, latency_ms)
+
+        self.logger.error(
+            f"Request failed: {observation.method} {observation.path} - {type(error).__name__}",
+            extra={
+                "trace_id": trace_id,
+                "span_id": observation.trace_context.span_id,
+                "method": observation.method,
+                "path": observation.path,
+                "error_type": type(error).__name__,
+                "error_message": str(error),
+                "latency_ms": latency_ms
+            }
+        )
+
+    def _get_or_generate_trace_id(self, scope: Scope, headers: Headers) -> str:
         """Get trace ID from headers or generate new one."""
         # Check for existing trace ID in headers
-        trace_id = request.headers.get("X-Trace-ID")
+        trace_id = headers.get("X-Trace-ID")
         if trace_id:
             return trace_id
-        
+
         # Check for trace ID in query parameters
-        trace_id = request.query_params.get("trace_id")
-        if trace_id:
-            return trace_id
-        
+        query_string = scope.get("query_string", b"")
+        if b"trace_id=" in query_string:
+            trace_id = QueryParams(query_string).get("trace_id")
+            if trace_id:
+                return trace_id
+
         # Generate new trace ID
         return f"trace_{uuid.uuid4().hex[:16]}"
 
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Gateway Middleware Pipeline
+
+Runs observability, security and input validation as a single pure-ASGI
+layer instead of three stacked BaseHTTPMiddleware layers:
+- One send wrapper per request: the trace header and security headers are
+  added to the response start message, body messages pass through
+  untouched, so streaming (SSE) responses are never buffered or re-chunked
+- No per-layer task, memory stream or Request/Response re-wrapping
+- JSON bodies are read and parsed once; the parsed value is shared through
+  scope state and reused by routes built with ``ParsedBodyRoute``
+- While the sampling profiler runs, the request's samples are attributed
+  to its endpoint and trace id
+
+Following MAANG/OpenAI/Perplexity standards for enterprise gateways.
+"""
+
+from typing import Any, Callable, Coroutine, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.core.sampling_profiler import SamplingProfiler, get_sampling_profiler
+
+from .observability import ObservabilityMiddleware
+from .security import (
+    JSON_BODY_STATE_KEY,
+    InputValidationMiddleware,
+    SecurityConfig,
+    SecurityMiddleware,
+)
+
+
+class GatewayPipelineMiddleware:
+    """Observability, security and input validation in one ASGI layer"""
+
+    def __init__(self, app: ASGIApp, config: Optional[SecurityConfig] = None, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.profiler = profiler or get_sampling_profiler()
+        self.observability = ObservabilityMiddleware(app)
+        self.security = SecurityMiddleware(app, config)
+        self.validation = InputValidationMiddleware(app, max_body_size=self.security.config.max_request_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        observation = self.observability.begin(scope, headers)
+        profiled_task = self.profiler.tag_request(f"{observation.method} {observation.path}", observation.trace_context.trace_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.observability.on_response_start(observation, message)
+                self.security.add_security_headers(message)
+            await send(message)
+
+        try:
+            rejection = self.security.check(scope, headers) or self.validation.check(scope, headers)
+            if rejection is None:
+                receive, rejection = await self.validation.read_body(scope, receive, headers)
+            if rejection is not None:
+                await rejection(scope, receive, send_wrapper)
+                return
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            self.observability.on_error(observation, e)
+            raise
+        finally:
+            self.profiler.untag(profiled_task)
+
+
+class ParsedBodyRequest(Request):
+    """Request whose ``json()`` returns the body already parsed by the pipeline"""
+
+    async def json(self) -> Any:
+        state = self.scope.get("state")
+        if state is not None and JSON_BODY_STATE_KEY in state:
+            return state[JSON_BODY_STATE_KEY]
+        return await super().json()
+
+
+class ParsedBodyRoute(APIRoute):
+    """APIRoute that hands handlers a ParsedBodyRequest, so body models skip a second JSON decode"""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ParsedBodyRequest(request.scope, request.receive))
+
+        return route_handler
@@ -15,21 +15,22 @@ Following enterprise security standards and OWASP guidelines.
 """
 
 import asyncio
+import json
 import re
 import time
 import hashlib
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 import os
 
-from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import html
 
-from .observability import log_error, get_request_id, get_user_id
+from .observability import log_error
 
 
 @dataclass
@@ -92,43 +93,127 @@ class SecurityConfig:
     hsts_preload: bool = False
 
 
+# Sanitizer patterns, compiled once at import rather than per field per request
+DANGEROUS_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in (
+        r'<script[^>]*>.*?</script>',  # Script tags
+        r'javascript:',  # JavaScript protocol
+        r'vbscript:',  # VBScript protocol
+        r'data:',  # Data URLs
+        r'<iframe[^>]*>.*?</iframe>',  # Iframe tags
+        r'<object[^>]*>.*?</object>',  # Object tags
+        r'<embed[^>]*>',  # Embed tags
+        r'<form[^>]*>.*?</form>',  # Form tags
+        r'on\w+\s*=',  # Event handlers
+        r'expression\s*\(',  # CSS expressions
+        r'url\s*\(',  # CSS url functions
+    )
+)
+
+SQL_INJECTION_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(\b(union|select|insert|update|delete|drop|create|alter|exec|execute)\b)',
+        r'(\b(and|or)\b\s+\d+\s*=\s*\d+)',
+        r'(\b(and|or)\b\s+\'\w+\'\s*=\s*\'\w+\')',
+        r'(\b(and|or)\b\s+\w+\s*=\s*\w+)',
+        r'(\b(and|or)\b\s+\w+\s*like\s*\w+)',
+        r'(\b(and|or)\b\s+\w+\s*in\s*\([^)]*\))',
+    )
+)
+
+CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+SUSPICIOUS_PARAMS = ("script", "javascript", "vbscript", "data", "onload")
+
+SUSPICIOUS_HEADERS = frozenset({
+    b"x-forwarded-host",
+    b"x-forwarded-proto",
+    b"x-forwarded-for",
+    b"x-real-ip",
+    b"x-original-url",
+    b"x-rewrite-url"
+})
+
+# Key under scope["state"] (request.state) holding the JSON body parsed at ingress
+JSON_BODY_STATE_KEY = "json_body"
+
+
+def sanitize_string(value: str, strip_sql: bool = False) -> str:
+    """Sanitize string input to prevent XSS (and optionally SQL) injection."""
+    if not isinstance(value, str):
+        return str(value)
+
+    # Remove null bytes and control characters
+    value = CONTROL_CHARS_PATTERN.sub('', value)
+
+    # HTML escape to prevent XSS
+    value = html.escape(value)
+
+    for pattern in DANGEROUS_PATTERNS:
+        value = pattern.sub('', value)
+
+    if strip_sql:
+        for pattern in SQL_INJECTION_PATTERNS:
+            value = pattern.sub('', value)
+
+    return value.strip()
+
+
+def error_response(status_code: int, detail: str) -> JSONResponse:
+    """Error response in the same shape FastAPI uses for HTTPException"""
+    return JSONResponse(status_code=status_code, content={"detail": detail})
+
+
+def _trace_id(scope: Scope) -> Optional[str]:
+    trace_context = scope.get("state", {}).get("trace_context")
+    return trace_context.trace_id if trace_context is not None else None
+
+
 class RateLimiter:
     """Rate limiter with sliding window and burst handling."""
-    
+
+    # Monitoring and system endpoints are never rate limited
+    BYPASS_PATHS = (
+        '/health', '/metrics', '/system/status', '/graph/context',
+        '/docs', '/openapi.json', '/redoc', '/favicon.ico'
+    )
+
     def __init__(self, config: RateLimitConfig):
         self.config = config
         self.requests: Dict[str, List[float]] = defaultdict(list)
         self.blocked_ips: Dict[str, float] = {}
         self._cleanup_task: Optional[asyncio.Task] = None
-    
-    def _get_client_key(self, request: Request) -> str:
+
+    def start(self) -> None:
+        """Start the periodic cleanup task on the running loop"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.get_running_loop().create_task(self.cleanup_old_data())
+
+    def _get_client_key(self, headers: Headers, client_host: str) -> str:
         """Get unique key for rate limiting."""
         # Use X-Forwarded-For if available, otherwise client IP
-        forwarded_for = request.headers.get("X-Forwarded-For")
+        forwarded_for = headers.get("X-Forwarded-For")
         if forwarded_for:
             client_ip = forwarded_for.split(",")[0].strip()
         else:
-            client_ip = request.client.host if request.client else "unknown"
-        
+            client_ip = client_host
+
         # Add user agent hash for additional uniqueness
-        user_agent = request.headers.get("user-agent", "")
+        user_agent = headers.get("user-agent", "")
         user_agent_hash = hashlib.md5(user_agent.encode()).hexdigest()[:8]
-        
+
         return f"{client_ip}:{user_agent_hash}"
-    
-    def is_rate_limited(self, request: Request) -> bool:
+
+    def is_rate_limited(self, path: str, headers: Headers, client_host: str = "unknown") -> bool:
         """Check if request should be rate limited."""
-        # Bypass rate limiting for monitoring and system endpoints
-        bypass_paths = [
-            '/health', '/metrics', '/system/status', '/graph/context',
-            '/docs', '/openapi.json', '/redoc', '/favicon.ico'
-        ]
-        if any(request.url.path.startswith(path) for path in bypass_paths):
+        if path.startswith(self.BYPASS_PATHS):
             return False
-            
-        client_key = self._get_client_key(request)
+
+        client_key = self._get_client_key(headers, client_host)
         current_time = time.time()
-        
+
         # Check if IP is blocked
         if client_key in self.blocked_ips:
             if current_time < self.blocked_ips[client_key]:
@@ -136,180 +221,162 @@ class RateLimiter:
             else:
                 # Unblock expired IP
                 del self.blocked_ips[client_key]
-        
+
         # Clean old requests outside the window
         window_start = current_time - self.config.window_size
         self.requests[client_key] = [
             req_time for req_time in self.requests[client_key]
             if req_time > window_start
         ]
-        
+
         # Check rate limit
         request_count = len(self.requests[client_key])
-        
+
         if request_count >= self.config.requests_per_minute:
             # Block IP for block_duration
             self.blocked_ips[client_key] = current_time + self.config.block_duration
             return True
-        
+
         # Check burst limit
         recent_requests = [
             req_time for req_time in self.requests[client_key]
             if req_time > current_time - 1  # Last second
         ]
-        
+
         if len(recent_requests) >= self.config.burst_limit:
             return True
-        
+
         # Add current request
         self.requests[client_key].append(current_time)
         return False
-    
+
     async def cleanup_old_data(self):
         """Clean up old rate limiting data."""
         while True:
             try:
                 current_time = time.time()
                 window_start = current_time - self.config.window_size
-                
+
                 # Clean old requests
                 for client_key in list(self.requests.keys()):
                     self.requests[client_key] = [
                         req_time for req_time in self.requests[client_key]
                         if req_time > window_start
                     ]
-                    
+
                     # Remove empty entries
                     if not self.requests[client_key]:
                         del self.requests[client_key]
-                
+
                 # Clean old blocked IPs
                 for client_key in list(self.blocked_ips.keys()):
                     if current_time >= self.blocked_ips[client_key]:
                         del self.blocked_ips[client_key]
-                
+
                 await asyncio.sleep(60)  # Clean up every minute
-                
+
             except Exception as e:
                 log_error("rate_limiter_cleanup", str(e))
                 await asyncio.sleep(60)
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
-    """Middleware for comprehensive security features."""
-    
+class SecurityMiddleware:
+    """
+    Pure-ASGI middleware for rate limiting, host and size checks and
+    security headers.
+
+    Rejections are answered directly with a JSON error response; accepted
+    requests get the security headers added to their response start
+    message while the body is forwarded untouched.
+    """
+
     def __init__(self, app: ASGIApp, config: Optional[SecurityConfig] = None):
-        super().__init__(app)
+        self.app = app
         self.config = config or SecurityConfig()
         self.rate_limiter = RateLimiter(self.config.rate_limit)
-        self.rate_limiter._cleanup_task = asyncio.create_task(
-            self.rate_limiter.cleanup_old_data()
-        )
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        try:
-            # 1. Rate limiting
-            if self.rate_limiter.is_rate_limited(request):
-                log_error(
-                    "rate_limit_exceeded",
-                    f"Rate limit exceeded for {request.client.host}",
-                    {"request_id": get_request_id(), "user_id": get_user_id()}
-                )
-                raise HTTPException(
-                    status_code=429,
-                    detail="Rate limit exceeded. Please try again later."
-                )
-            
-            # 2. Trusted host validation
-            if not self._is_trusted_host(request):
-                log_error(
-                    "untrusted_host",
-                    f"Request from untrusted host: {request.headers.get('host', 'unknown')}",
-                    {"request_id": get_request_id(), "user_id": get_user_id()}
-                )
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid host header"
-                )
-            
-            # 3. Request size validation
-            if not self._validate_request_size(request):
-                log_error(
-                    "request_too_large",
-                    "Request size exceeds limit",
-                    {"request_id": get_request_id(), "user_id": get_user_id()}
-                )
-                raise HTTPException(
-                    status_code=413,
-                    detail="Request too large"
-                )
-            
-            # 4. Input sanitization
-            sanitized_request = await self._sanitize_request(request)
-            
-            # 5. Process request
-            response = await call_next(sanitized_request)
-            
-            # 6. Add security headers
-            self._add_security_headers(response)
-            
-            return response
-            
-        except HTTPException as http_exc:
-            # Preserve original HTTPException details
-            log_error(
-                "http_exception",
-                f"HTTP {http_exc.status_code}: {http_exc.detail}",
-                {"request_id": get_request_id(), "user_id": get_user_id(), "status_code": http_exc.status_code}
-            )
-            raise
-        except Exception as e:
+        self._security_headers = self._build_security_headers()
+        self._security_header_names = frozenset(name for name, _ in self._security_headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rejection = self.check(scope, Headers(scope=scope))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self.add_security_headers(message)
+            await send(message)
+
+        if rejection is not None:
+            await rejection(scope, receive, send_wrapper)
+            return
+        await self.app(scope, receive, send_wrapper)
+
+    def check(self, scope: Scope, headers: Headers) -> Optional[Response]:
+        """Return an error response if the request must be rejected"""
+        self.rate_limiter.start()
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
+
+        # 1. Rate limiting
+        if self.rate_limiter.is_rate_limited(scope["path"], headers, client_host):
+            log_error("rate_limit_exceeded", f"Rate limit exceeded for {client_host}", _trace_id(scope))
+            return error_response(429, "Rate limit exceeded. Please try again later.")
+
+        # 2. Trusted host validation
+        if not self._is_trusted_host(headers):
             log_error(
-                "security_middleware_error",
-                str(e),
-                {"request_id": get_request_id(), "user_id": get_user_id()}
+                "untrusted_host",
+                f"Request from untrusted host: {headers.get('host', 'unknown')}",
+                _trace_id(scope)
             )
-            raise HTTPException(
-                status_code=500,
-                detail=f"Internal server error: {str(e)}"
-            )
-    
-    def _is_trusted_host(self, request: Request) -> bool:
+            return error_response(400, "Invalid host header")
+
+        # 3. Request size validation
+        if not self._validate_request_size(scope, headers):
+            log_error("request_too_large", "Request size exceeds limit", _trace_id(scope))
+            return error_response(413, "Request too large")
+
+        return None
+
+    def _is_trusted_host(self, headers: Headers) -> bool:
         """Validate if the request is from a trusted host."""
         # Allow all hosts during testing or development
         if os.getenv("TESTING", "false").lower() == "true" or os.getenv("ENVIRONMENT", "development") == "development":
             return True
-            
-        host = request.headers.get("host", "")
+
+        host = headers.get("host", "")
         if not host:
             return False
-        
+
         # Always allow localhost and Docker internal hosts
         if any(allowed in host.lower() for allowed in ["localhost", "127.0.0.1", "host.docker.internal", "::1"]):
             return True
-        
+
         # Check exact matches first (including with port)
         if host in self.config.trusted_hosts:
             return True
-        
+
         # Remove port if present and check again
         host_without_port = host.split(":")[0]
         if host_without_port in self.config.trusted_hosts:
             return True
-        
+
         # Check wildcard matches
         for trusted_host in self.config.trusted_hosts:
             if trusted_host.startswith("*."):
                 domain = trusted_host[2:]  # Remove "*. "
                 if host_without_port.endswith(domain):
                     return True
-        
+
         return False
-    
-    def _validate_request_size(self, request: Request) -> bool:
+
+    def _validate_request_size(self, scope: Scope, headers: Headers) -> bool:
         """Validate request size limits."""
         # Check content length
-        content_length = request.headers.get("content-length")
+        content_length = headers.get("content-length")
         if content_length:
             try:
                 size = int(content_length)
@@ -317,87 +384,33 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                     return False
             except ValueError:
                 return False
-        
+
         # Check query string length
-        if len(str(request.url.query)) > self.config.max_query_length:
+        if len(scope.get("query_string", b"")) > self.config.max_query_length:
             return False
-        
+
         # Check headers size
         headers_size = sum(
             len(name) + len(value) + 2  # +2 for ": " separator
-            for name, value in request.headers.items()
+            for name, value in scope["headers"]
         )
         if headers_size > self.config.max_headers_size:
             return False
-        
+
         return True
-    
-    async def _sanitize_request(self, request: Request) -> Request:
-        """Sanitize request input to prevent injection attacks."""
-        # Sanitize query parameters
-        sanitized_query_params = {}
-        for key, value in request.query_params.items():
-            sanitized_key = self._sanitize_string(key)
-            sanitized_value = self._sanitize_string(value)
-            sanitized_query_params[sanitized_key] = sanitized_value
-        
-        # Create new request with sanitized parameters
-        # Note: This is a simplified approach. In a real implementation,
-        # you might need to create a custom request class or use middleware
-        # that can modify the request object.
-        
-        return request
-    
+
     def _sanitize_string(self, value: str) -> str:
         """Sanitize string input to prevent XSS and injection attacks."""
-        if not isinstance(value, str):
-            return str(value)
-        
-        # Remove null bytes
-        value = value.replace('\x00', '')
-        
-        # HTML escape to prevent XSS
-        value = html.escape(value)
-        
-        # Remove potentially dangerous patterns
-        dangerous_patterns = [
-            r'<script[^>]*>.*?</script>',  # Script tags
-            r'javascript:',  # JavaScript protocol
-            r'vbscript:',  # VBScript protocol
-            r'data:',  # Data URLs
-            r'<iframe[^>]*>.*?</iframe>',  # Iframe tags
-            r'<object[^>]*>.*?</object>',  # Object tags
-            r'<embed[^>]*>',  # Embed tags
-            r'<form[^>]*>.*?</form>',  # Form tags
-            r'on\w+\s*=',  # Event handlers
-            r'expression\s*\(',  # CSS expressions
-            r'url\s*\(',  # CSS url functions
-        ]
-        
-        for pattern in dangerous_patterns:
-            value = re.sub(pattern, '', value, flags=re.IGNORECASE | re.DOTALL)
-        
-        # Remove SQL injection patterns
-        sql_patterns = [
-            r'(\b(union|select|insert|update|delete|drop|create|alter|exec|execute)\b)',
-            r'(\b(and|or)\b\s+\d+\s*=\s*\d+)',
-            r'(\b(and|or)\b\s+\'\w+\'\s*=\s*\'\w+\')',
-            r'(\b(and|or)\b\s+\w+\s*=\s*\w+)',
-            r'(\b(and|or)\b\s+\w+\s*like\s*\w+)',
-            r'(\b(and|or)\b\s+\w+\s*in\s*\([^)]*\))',
-        ]
-        
-        for pattern in sql_patterns:
-            value = re.sub(pattern, '', value, flags=re.IGNORECASE)
-        
-        return value.strip()
-    
-    def _add_security_headers(self, response: Response):
-        """Add security headers to response."""
+        return sanitize_string(value, strip_sql=True)
+
+    def _build_security_headers(self) -> List[Tuple[bytes, bytes]]:
+        """Encode the configured security headers once"""
+        security_headers: Dict[str, str] = {}
+
         # Content Security Policy
         if self.config.enable_csp:
-            response.headers["Content-Security-Policy"] = self.config.csp_policy
-        
+            security_headers["content-security-policy"] = self.config.csp_policy
+
         # HTTP Strict Transport Security
         if self.config.enable_hsts:
             hsts_value = f"max-age={self.config.hsts_max_age}"
@@ -405,176 +418,169 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 hsts_value += "; includeSubDomains"
             if self.config.hsts_preload:
                 hsts_value += "; preload"
-            response.headers["Strict-Transport-Security"] = hsts_value
-        
+            security_headers["strict-transport-security"] = hsts_value
+
         # X-Frame-Options
         if self.config.enable_x_frame_options:
-            response.headers["X-Frame-Options"] = "DENY"
-        
+            security_headers["x-frame-options"] = "DENY"
+
         # X-Content-Type-Options
         if self.config.enable_x_content_type_options:
-            response.headers["X-Content-Type-Options"] = "nosniff"
-        
+            security_headers["x-content-type-options"] = "nosniff"
+
         # Referrer Policy
         if self.config.enable_referrer_policy:
-            response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        
+            security_headers["referrer-policy"] = "strict-origin-when-cross-origin"
+
         # Additional security headers
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
-        response.headers["Permissions-Policy"] = (
+        security_headers["x-xss-protection"] = "1; mode=block"
+        security_headers["x-permitted-cross-domain-policies"] = "none"
+        security_headers["permissions-policy"] = (
             "geolocation=(), microphone=(), camera=(), "
             "payment=(), usb=(), magnetometer=(), gyroscope=()"
         )
+        return [(name.encode("latin-1"), value.encode("latin-1")) for name, value in security_headers.items()]
 
+    def add_security_headers(self, message: Message) -> None:
+        """Set the security headers on a response start message, replacing any set by the route"""
+        message["headers"] = [
+            header for header in message.get("headers", ())
+            if header[0].lower() not in self._security_header_names
+        ] + self._security_headers
 
-class InputValidationMiddleware(BaseHTTPMiddleware):
-    """Middleware for input validation and sanitization."""
-    
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-    
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        try:
-            # Validate and sanitize request body
-            if request.method in ["POST", "PUT", "PATCH"]:
-                await self._validate_request_body(request)
-            
-            # Validate URL parameters
-            self._validate_url_params(request)
-            
-            # Validate headers
-            self._validate_headers(request)
-            
-            response = await call_next(request)
-            return response
-            
-        except HTTPException as http_exc:
-            # Preserve original HTTPException details
-            log_error(
-                "input_validation_http_exception",
-                f"HTTP {http_exc.status_code}: {http_exc.detail}",
-                {"request_id": get_request_id(), "user_id": get_user_id(), "status_code": http_exc.status_code}
-            )
-            raise
-        except Exception as e:
-            log_error(
-                "input_validation_error",
-                str(e),
-                {"request_id": get_request_id(), "user_id": get_user_id()}
-            )
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid input: {str(e)}"
-            )
-    
-    async def _validate_request_body(self, request: Request):
-        """Validate and sanitize request body."""
-        content_type = request.headers.get("content-type", "")
-        
-        # Skip validation for auth endpoints
-        if request.url.path.startswith("/auth/"):
+
+class InputValidationMiddleware:
+    """
+    Pure-ASGI middleware for input validation and sanitization.
+
+    JSON request bodies are read and parsed here exactly once. The parsed
+    body is published on ``request.state.json_body`` and the raw bytes are
+    replayed to the app, so routes using ``ParsedBodyRoute`` reuse the
+    parsed value instead of decoding the body a second time. Other bodies
+    (uploads, form posts) are streamed through without being read.
+    """
+
+    BODY_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+    def __init__(self, app: ASGIApp, max_body_size: int = SecurityConfig.max_request_size):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
             return
-        
-        if "application/json" in content_type:
-            try:
-                body = await request.json()
-                if not isinstance(body, dict):
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Request body must be a JSON object"
-                    )
-                
-                # Validate required fields for non-auth endpoints
-                if "query" in body:
-                    query = body["query"]
-                    if not isinstance(query, str):
-                        raise HTTPException(
-                            status_code=400,
-                            detail="Query must be a string"
-                        )
-                    
-                    if len(query) > 1000:
-                        raise HTTPException(
-                            status_code=400,
-                            detail="Query too long (max 1000 characters)"
-                        )
-                    
-                    # Sanitize query
-                    body["query"] = self._sanitize_string(query)
-                
-            except ValueError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Invalid JSON in request body"
-                )
-    
-    def _validate_url_params(self, request: Request):
+
+        headers = Headers(scope=scope)
+        rejection = self.check(scope, headers)
+        if rejection is None:
+            receive, rejection = await self.read_body(scope, receive, headers)
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def check(self, scope: Scope, headers: Headers) -> Optional[Response]:
+        """Validate URL parameters and headers"""
+        if not self._validate_url_params(scope):
+            return error_response(400, "Invalid parameter name")
+        self._validate_headers(scope)
+        return None
+
+    async def read_body(self, scope: Scope, receive: Receive, headers: Headers) -> Tuple[Receive, Optional[Response]]:
+        """
+        Read, parse and validate a JSON body once.
+
+        Returns the receive callable the app should use (replaying the body
+        if it was consumed) and an error response if validation failed.
+        """
+        if scope["method"] not in self.BODY_METHODS or "application/json" not in headers.get("content-type", ""):
+            return receive, None
+
+        # Skip validation for auth endpoints
+        if scope["path"].startswith("/auth/"):
+            return receive, None
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client went away; let the app observe the disconnect
+                return receive, None
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                log_error("request_too_large", "Request body exceeds limit", _trace_id(scope))
+                return receive, error_response(413, "Request too large")
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replay = replay_receive(body, receive)
+
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            return replay, error_response(400, "Invalid JSON in request body")
+
+        if not isinstance(parsed, dict):
+            return replay, error_response(400, "Request body must be a JSON object")
+
+        # Validate required fields for non-auth endpoints
+        state = scope.setdefault("state", {})
+        if "query" in parsed:
+            query = parsed["query"]
+            if not isinstance(query, str):
+                return replay, error_response(400, "Query must be a string")
+            if len(query) > 1000:
+                return replay, error_response(400, "Query too long (max 1000 characters)")
+            state["sanitized_query"] = self._sanitize_string(query)
+
+        state[JSON_BODY_STATE_KEY] = parsed
+        return replay, None
+
+    def _validate_url_params(self, scope: Scope) -> bool:
         """Validate URL parameters."""
+        query_string = scope.get("query_string", b"")
+        if not query_string:
+            return True
+
         # Check for suspicious parameters
-        suspicious_params = ["script", "javascript", "vbscript", "data", "onload"]
-        
-        for param in request.query_params.keys():
+        for param in QueryParams(query_string).keys():
             param_lower = param.lower()
-            for suspicious in suspicious_params:
-                if suspicious in param_lower:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Invalid parameter name"
-                    )
-    
-    def _validate_headers(self, request: Request):
+            if any(suspicious in param_lower for suspicious in SUSPICIOUS_PARAMS):
+                return False
+        return True
+
+    def _validate_headers(self, scope: Scope):
         """Validate request headers."""
-        # Check for suspicious headers
-        suspicious_headers = [
-            "x-forwarded-host",
-            "x-forwarded-proto",
-            "x-forwarded-for",
-            "x-real-ip",
-            "x-original-url",
-            "x-rewrite-url"
-        ]
-        
-        for header_name in request.headers.keys():
-            header_lower = header_name.lower()
-            if header_lower in suspicious_headers:
+        for name, _ in scope["headers"]:
+            if name in SUSPICIOUS_HEADERS:
                 # Log suspicious header but don't block
                 log_error(
                     "suspicious_header",
-                    f"Suspicious header detected: {header_name}",
-                    {"request_id": get_request_id(), "user_id": get_user_id()}
+                    f"Suspicious header detected: {name.decode('latin-1')}",
+                    _trace_id(scope)
                 )
-    
+
     def _sanitize_string(self, value: str) -> str:
         """Sanitize string input."""
-        if not isinstance(value, str):
-            return str(value)
-        
-        # Remove null bytes and control characters
-        value = ''.join(char for char in value if ord(char) >= 32 or char in '\n\r\t')
-        
-        # HTML escape
-        value = html.escape(value)
-        
-        # Remove dangerous patterns
-        dangerous_patterns = [
-            r'<script[^>]*>.*?</script>',
-            r'javascript:',
-            r'vbscript:',
-            r'data:',
-            r'<iframe[^>]*>.*?</iframe>',
-            r'<object[^>]*>.*?</object>',
-            r'<embed[^>]*>',
-            r'<form[^>]*>.*?</form>',
-            r'on\w+\s*=',
-            r'expression\s*\(',
-            r'url\s*\(',
-        ]
-        
-        for pattern in dangerous_patterns:
-            value = re.sub(pattern, '', value, flags=re.IGNORECASE | re.DOTALL)
-        
-        return value.strip()
+        return sanitize_string(value)
+
+
+def replay_receive(body: bytes, receive: Receive) -> Receive:
+    """Receive callable that replays an already-read body, then defers to ``receive``"""
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
 
 
 # Utility functions for security
@@ -35,6 +35,8 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 
+from shared.core.request_deadline import effective_timeout, remaining_seconds
+
 # Import observability functions
 try:
     from services.gateway.middleware.observability import (
@@ -390,10 +392,13 @@ class RealLLMProcessor:
         for attempt in range(1, config.max_retries + 2):  # +2 because we start from 1 and want to include max_retries
             try:
                 # Calculate timeout with exponential backoff
-                timeout = min(
+                timeout = effective_timeout(min(
                     config.timeout_s * (LLM_EXPONENTIAL_BACKOFF_BASE ** (attempt - 1)),
                     LLM_EXPONENTIAL_BACKOFF_MAX
-                )
+                ))
+                if timeout <= 0:
+                    # Request deadline spent - do not start another attempt
+                    return self._create_error_response(provider, "Request deadline exceeded", trace_id)
                 
                 # Log attempt
                 logger.info(f"LLM attempt {attempt}/{config.max_retries + 1} for provider {provider.value}", extra={
@@ -478,6 +483,10 @@ class RealLLMProcessor:
                         LLM_EXPONENTIAL_BACKOFF_BASE ** (attempt - 1),
                         LLM_EXPONENTIAL_BACKOFF_MAX
                     )
+                    remaining = remaining_seconds()
+                    if remaining is not None and remaining <= wait_time:
+                        # Backing off would outlive the request deadline
+                        return self._create_error_response(provider, "Request deadline exceeded", trace_id)
                     await asyncio.sleep(wait_time)
         
         # Should never reach here, but just in case
@@ -863,12 +872,26 @@ If the problem persists, please contact support."""
         - Timeout handling (15s per call)
         - Automatic fallback to stub response
         """
+        # Never give the provider more time than the request has left
+        timeout = effective_timeout(LLM_TIMEOUT_SECONDS)
+        if timeout <= 0:
+            return LLMResponse(
+                content="",
+                provider=None,
+                model=None,
+                latency_ms=0,
+                success=False,
+                error_message="Request deadline exceeded",
+                attempt=0,
+                retries=0
+            )
+        
         # Use GPU orchestrator for free GPU orchestration
         gpu_request = GPURequest(
             prompt=prompt,
             max_tokens=max_tokens,
             temperature=temperature,
-            timeout=LLM_TIMEOUT_SECONDS
+            timeout=timeout
         )
         
         try:
@@ -951,6 +974,12 @@ If the problem persists, please contact support."""
         
         # Try providers in order until one succeeds
         for i, provider in enumerate(provider_order):
+            if effective_timeout(LLM_TIMEOUT_SECONDS) <= 0:
+                logger.warning("Request deadline exceeded - not trying further LLM providers", extra={
+                    "attempt": i+1,
+                    "trace_id": trace_id
+                })
+                break
             try:
                 logger.info(f"Trying provider {provider.value} (attempt {i+1}/{len(provider_order)})", extra={
                     "provider": provider.value,
@@ -0,0 +1,375 @@
+"""
+Adaptive Concurrency Limiting and Load Shedding
+
+Protects the gateway when downstream lanes slow down. Each protected endpoint
+gets an AIMD concurrency limit that grows while observed latency stays inside
+the SLA budget from ``shared/core/sla_budget_enforcer.py`` and backs off
+multiplicatively when the budget is overrun. Requests beyond the limit wait in
+a small priority queue; when the queue is full or the wait would exceed the
+budget, the lowest-priority request is shed early with 503 + Retry-After
+instead of piling up inside the retrieval/LLM layers until it times out.
+"""
+
+import asyncio
+import heapq
+import hmac
+import itertools
+import math
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from shared.core.sla_budget_enforcer import ComplexityTier, budget_enforcer
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Request priority; lower value is served first and shed last."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class LoadShedError(Exception):
+    """Raised when a request is rejected by the adaptive concurrency limiter."""
+
+    def __init__(self, name: str, reason: str, retry_after: int):
+        super().__init__(f"Load shed on '{name}': {reason}")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdaptiveConcurrencyConfig:
+    """Adaptive concurrency limiter configuration."""
+    complexity_tier: ComplexityTier = ComplexityTier.SIMPLE
+    use_ttfb_budget: bool = False      # Streaming endpoints are judged on time-to-first-byte
+    initial_limit: int = 20
+    min_limit: int = 2
+    max_limit: int = 200
+    additive_increase: float = 1.0     # Added to the limit per limit-worth of good completions
+    backoff_ratio: float = 0.75        # Multiplier applied when the budget is overrun
+    max_queue_size: int = 50
+    max_queue_wait: Optional[float] = None  # Defaults to a quarter of the latency budget
+    default_priority: RequestPriority = RequestPriority.NORMAL
+    name: str = "adaptive_concurrency"
+
+    def latency_target(self) -> float:
+        """Latency budget in seconds taken from the SLA budget enforcer."""
+        budget = budget_enforcer.get_budget_config(self.complexity_tier)
+        limit = budget.ttfb_limit if self.use_ttfb_budget else budget.response_time_limit
+        return limit + budget.tolerance
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    future: asyncio.Future = field(compare=False)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter with a priority wait queue.
+
+    The limit is increased by ``additive_increase / limit`` for each completion
+    that finishes inside the latency target while the limiter is at least half
+    utilised, so it grows by roughly ``additive_increase`` per round-trip. A
+    completion that overruns the target (or fails) multiplies the limit by
+    ``backoff_ratio``, at most once per latency-target window so a single slow
+    burst does not collapse it to the floor.
+    """
+
+    def __init__(self, config: AdaptiveConcurrencyConfig):
+        self.config = config
+        self.name = config.name
+        self.latency_target = config.latency_target()
+        self.max_queue_wait = (
+            config.max_queue_wait if config.max_queue_wait is not None else self.latency_target / 4
+        )
+
+        self._limit = float(config.initial_limit)
+        self._in_flight = 0
+        self._waiters: List[_Waiter] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+        self._latency_ewma: Optional[float] = None
+
+        # Exported counters
+        self.accepted_total = 0
+        self.queued_total = 0
+        self.shed_total: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0, "evicted": 0}
+        self.limit_increases = 0
+        self.limit_decreases = 0
+
+        logger.info(
+            f"Adaptive concurrency '{self.name}' initialized: limit={config.initial_limit}, "
+            f"target={self.latency_target:.2f}s, queue={config.max_queue_size}"
+        )
+
+    @property
+    def limit(self) -> int:
+        """Current integer concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.future.done())
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a queued slot frees up."""
+        latency = self._latency_ewma or self.latency_target
+        backlog = self.queue_depth + 1
+        return max(1, math.ceil(backlog * latency / max(1, self.limit)))
+
+    async def acquire(self, priority: Optional[RequestPriority] = None) -> None:
+        """
+        Acquire a concurrency slot, waiting in the priority queue if needed.
+
+        Raises:
+            LoadShedError: If the request is shed instead of admitted
+        """
+        priority = self.config.default_priority if priority is None else priority
+
+        self._prune_waiters()
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self.accepted_total += 1
+            return
+
+        if len(self._waiters) >= self.config.max_queue_size:
+            lowest = max(self._waiters) if self._waiters else None
+            if lowest is None or lowest.priority <= priority:
+                self.shed_total["queue_full"] += 1
+                raise LoadShedError(self.name, "queue_full", self.retry_after())
+            # Evict the lowest-priority waiter to make room for this request
+            self._waiters.remove(lowest)
+            heapq.heapify(self._waiters)
+            self.shed_total["evicted"] += 1
+            lowest.future.set_exception(LoadShedError(self.name, "evicted", self.retry_after()))
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, _Waiter(int(priority), next(self._sequence), future))
+        self.queued_total += 1
+
+        try:
+            await asyncio.wait_for(future, timeout=self.max_queue_wait)
+        except asyncio.TimeoutError:
+            self.shed_total["queue_timeout"] += 1
+            raise LoadShedError(self.name, "queue_timeout", self.retry_after())
+        except asyncio.CancelledError:
+            # A slot may have been handed over just before the caller went away
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._in_flight = max(0, self._in_flight - 1)
+                self._wake_waiters()
+            raise
+        self.accepted_total += 1
+
+    def release(self, latency: float, success: bool = True) -> None:
+        """Release a slot and feed the observed latency into the AIMD controller."""
+        self._in_flight = max(0, self._in_flight - 1)
+        self._observe(latency, success)
+        self._wake_waiters()
+
+    def _observe(self, latency: float, success: bool) -> None:
+        self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+        previous = self.limit
+
+        if not success or latency > self.latency_target:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self._limit = max(float(self.config.min_limit), self._limit * self.config.backoff_ratio)
+                self._last_decrease = now
+        elif self._in_flight + 1 >= self._limit / 2:
+            self._limit = min(float(self.config.max_limit), self._limit + self.config.additive_increase / self._limit)
+
+        if self.limit > previous:
+            self.limit_increases += 1
+        elif self.limit < previous:
+            self.limit_decreases += 1
+            logger.warning(
+                f"Adaptive concurrency '{self.name}' limit decreased {previous} -> {self.limit} "
+                f"(latency={latency:.2f}s, target={self.latency_target:.2f}s, success={success})"
+            )
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            self._in_flight += 1
+            waiter.future.set_result(True)
+
+    def _prune_waiters(self) -> None:
+        if any(waiter.future.done() for waiter in self._waiters):
+            self._waiters = [waiter for waiter in self._waiters if not waiter.future.done()]
+            heapq.heapify(self._waiters)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get current limiter status."""
+        return {
+            "name": self.name,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "latency_target_s": self.latency_target,
+            "latency_ewma_s": self._latency_ewma,
+            "accepted_total": self.accepted_total,
+            "queued_total": self.queued_total,
+            "shed_total": dict(self.shed_total),
+            "limit_increases": self.limit_increases,
+            "limit_decreases": self.limit_decreases,
+        }
+
+
+class AdaptiveConcurrencyManager:
+    """Registry of per-endpoint adaptive concurrency limiters."""
+
+    def __init__(self):
+        self.limiters: Dict[Tuple[str, str], AdaptiveConcurrencyLimiter] = {}
+
+    def register(self, method: str, path: str, config: AdaptiveConcurrencyConfig) -> AdaptiveConcurrencyLimiter:
+        """Register a limiter for an endpoint."""
+        limiter = AdaptiveConcurrencyLimiter(config)
+        self.limiters[(method.upper(), path)] = limiter
+        return limiter
+
+    def get_limiter(self, method: str, path: str) -> Optional[AdaptiveConcurrencyLimiter]:
+        """Get the limiter protecting an endpoint, if any."""
+        return self.limiters.get((method.upper(), path))
+
+    def get_all_status(self) -> Dict[str, Dict[str, Any]]:
+        """Get status of all limiters."""
+        return {
+            f"{method} {path}": limiter.get_status()
+            for (method, path), limiter in self.limiters.items()
+        }
+
+
+def _default_manager() -> AdaptiveConcurrencyManager:
+    manager = AdaptiveConcurrencyManager()
+    manager.register("GET", "/search", AdaptiveConcurrencyConfig(
+        complexity_tier=ComplexityTier.SIMPLE, name="get_search"))
+    manager.register("POST", "/search", AdaptiveConcurrencyConfig(
+        complexity_tier=ComplexityTier.SIMPLE, name="post_search"))
+    manager.register("POST", "/query", AdaptiveConcurrencyConfig(
+        complexity_tier=ComplexityTier.RESEARCH, initial_limit=10, name="post_query"))
+    manager.register("GET", "/stream/search", AdaptiveConcurrencyConfig(
+        complexity_tier=ComplexityTier.TECHNICAL, use_ttfb_budget=True, initial_limit=10, name="stream_search"))
+    return manager
+
+
+# Global adaptive concurrency manager
+adaptive_concurrency_manager = _default_manager()
+
+
+class AdaptiveConcurrencyMiddleware(BaseHTTPMiddleware):
+    """
+    Admits requests through the endpoint's adaptive limiter.
+
+    Priority is taken from the ``X-Request-Priority`` header (high/normal/low).
+    Any caller may lower its own priority; raising it above the endpoint
+    default requires the ``X-Priority-Token`` header to match
+    GATEWAY_PRIORITY_TOKEN, so only internal callers can jump the queue.
+    Streaming responses hold their slot until the body finishes (or the
+    client goes away), but the limiter is fed the time-to-first-byte since
+    that is what their budget is measured against.
+    """
+
+    PRIORITY_HEADER = "X-Request-Priority"
+    PRIORITY_TOKEN_HEADER = "X-Priority-Token"
+
+    def __init__(
+        self,
+        app,
+        manager: Optional[AdaptiveConcurrencyManager] = None,
+        priority_token: Optional[str] = None,
+    ):
+        super().__init__(app)
+        self.manager = manager or adaptive_concurrency_manager
+        self.priority_token = priority_token or os.getenv("GATEWAY_PRIORITY_TOKEN") or None
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        limiter = self.manager.get_limiter(request.method, request.url.path)
+        if limiter is None:
+            return await call_next(request)
+
+        try:
+            await limiter.acquire(self._get_priority(request, limiter))
+        except LoadShedError as e:
+            logger.warning(f"Request shed: {request.method} {request.url.path} ({e.reason})")
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Service overloaded",
+                    "reason": e.reason,
+                    "retry_after": e.retry_after,
+                },
+                headers={"Retry-After": str(e.retry_after)},
+            )
+
+        start_time = time.monotonic()
+        try:
+            response = await call_next(request)
+        except Exception:
+            limiter.release(time.monotonic() - start_time, success=False)
+            raise
+
+        latency = time.monotonic() - start_time
+        success = response.status_code < 500
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            return _ReleaseWhenSent(response, lambda: limiter.release(latency, success))
+        limiter.release(latency, success)
+        return response
+
+    def _get_priority(self, request: Request, limiter: AdaptiveConcurrencyLimiter) -> RequestPriority:
+        default = limiter.config.default_priority
+        value = request.headers.get(self.PRIORITY_HEADER, "").strip().upper()
+        try:
+            priority = RequestPriority[value]
+        except KeyError:
+            return default
+        if priority < default and not self._is_trusted(request):
+            return default
+        return priority
+
+    def _is_trusted(self, request: Request) -> bool:
+        token = request.headers.get(self.PRIORITY_TOKEN_HEADER)
+        return bool(self.priority_token and token and hmac.compare_digest(token, self.priority_token))
+
+
+class _ReleaseWhenSent:
+    """
+    Wraps a streaming response so its limiter slot is released exactly once
+    when sending ends, including when the client disconnects before the body
+    iterator is ever started.
+    """
+
+    def __init__(self, response: Response, release):
+        self.response = response
+        self._release = release
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.response, name)
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Fast Serialization Layer for the Gateway
+
+Single place where gateway responses, SSE frames and LLM prompt context are
+serialized:
+- orjson-backed JSON encoding straight to bytes, with a stdlib fallback
+- FastJSONResponse, a drop-in JSONResponse that skips the str round-trip
+- Pre-encoded static SSE fragments (event names and field prefixes)
+- Compact prompt context formatting for retrieval results
+
+orjson is optional; when it is not installed every function degrades to
+compact stdlib ``json`` output with the same semantics.
+"""
+
+import dataclasses
+import json
+import math
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+    _ORJSON_OPTIONS = 0
+
+
+def _default(obj: Any) -> Any:
+    """Encode types neither encoder handles natively (pydantic models, sets, Decimal, paths)."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "dict") and callable(obj.dict):
+        return obj.dict()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (PurePath, UUID)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    """stdlib fallback for the types orjson encodes natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _finite(dataclasses.asdict(obj))
+    return _finite(_default(obj))
+
+
+def _finite(obj: Any) -> Any:
+    """Replace NaN and infinities with None, as orjson encodes them as null."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        _finite(obj),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_stdlib_default,
+    ).encode("utf-8")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize ``obj`` to compact UTF-8 JSON bytes.
+
+    Uses orjson when available. Values orjson rejects (e.g. integers wider
+    than 64 bits) are retried with the stdlib encoder rather than failing.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize ``obj`` to a compact JSON string."""
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from ``bytes`` or ``str``."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse that renders directly to bytes through the fast encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
+
+
+# ---------------------------------------------------------------------------
+# Server-Sent Events
+# ---------------------------------------------------------------------------
+
+SSE_DATA_PREFIX = b"data: "
+SSE_ID_PREFIX = b"\nid: "
+SSE_TIMESTAMP_PREFIX = b"\ntimestamp: "
+SSE_FRAME_END = b"\n\n"
+
+_sse_event_prefixes: Dict[str, bytes] = {}
+
+
+def sse_event_prefix(event_name: str) -> bytes:
+    """Pre-encoded ``event: <name>\\n`` line, built once per event name."""
+    prefix = _sse_event_prefixes.get(event_name)
+    if prefix is None:
+        prefix = f"event: {event_name}\n".encode("utf-8")
+        _sse_event_prefixes[event_name] = prefix
+    return prefix
+
+
+def encode_sse_event(
+    event_name: str,
+    data: Any,
+    event_id: Optional[str] = None,
+    timestamp: Optional[str] = None
+) -> bytes:
+    """
+    Encode a single SSE frame as bytes.
+
+    Static fragments are pre-encoded; only the payload, id and timestamp are
+    encoded per frame and the pieces are joined once.
+    """
+    parts = [sse_event_prefix(event_name), SSE_DATA_PREFIX, dumps_bytes(data)]
+    if event_id is not None:
+        parts.append(SSE_ID_PREFIX)
+        parts.append(event_id.encode("utf-8"))
+    if timestamp is not None:
+        parts.append(SSE_TIMESTAMP_PREFIX)
+        parts.append(timestamp.encode("utf-8"))
+    parts.append(SSE_FRAME_END)
+    return b"".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# LLM prompt context
+# ---------------------------------------------------------------------------
+
+def format_prompt_context(
+    sources: Iterable[Mapping[str, Any]],
+    fields: Sequence[str] = ("title", "domain", "url", "snippet"),
+    max_snippet_chars: Optional[int] = 500
+) -> str:
+    """
+    Format retrieval results as compact numbered lines for an LLM prompt.
+
+    Replaces pretty-printed JSON, which spends most of its tokens on
+    indentation, quotes and repeated keys::
+
+        [1] Title | example.com | https://example.com/page
+        Snippet text...
+    """
+    header_fields = [f for f in fields if f != "snippet"]
+    include_snippet = "snippet" in fields
+    blocks = []
+    for index, source in enumerate(sources, start=1):
+        header = " | ".join(str(source[f]) for f in header_fields if source.get(f))
+        block = f"[{index}] {header}"
+        if include_snippet:
+            snippet = " ".join(str(source.get("snippet") or "").split())
+            if max_snippet_chars is not None and len(snippet) > max_snippet_chars:
+                snippet = snippet[:max_snippet_chars].rstrip() + "..."
+            if snippet:
+                block = f"{block}\n{snippet}"
+        blocks.append(block)
+    return "\n\n".join(blocks)
@@ -13,7 +13,6 @@ Following MAANG/OpenAI/Perplexity standards for enterprise-grade streaming.
 """
 
 import asyncio
-import json
 import logging
 import time
 import uuid
@@ -27,6 +26,8 @@ from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 
 # Import observability functions
+from services.gateway.serialization import encode_sse_event, format_prompt_context, sse_event_prefix
+from shared.core.request_deadline import RequestDeadline, deadline_scope, get_current_deadline
 from services.gateway.middleware.observability import (
     log_stream_event,
     log_error,
@@ -64,6 +65,11 @@ class StreamEventType(str, Enum):
     ERROR = "error"
 
 
+# Pre-encode the static "event: <name>" lines once at import
+for _event_type in StreamEventType:
+    sse_event_prefix(_event_type.value)
+
+
 @dataclass
 class StreamEvent:
     """SSE event structure."""
@@ -181,16 +187,14 @@ class StreamingManager:
         within_budget = elapsed_ms <= budget_ms
         return within_budget, elapsed_ms
     
-    def _format_sse_event(self, event: StreamEvent) -> str:
-        """Format event as SSE message."""
-        lines = [
-            f"event: {event.event_type.value}",
-            f"data: {json.dumps(event.data, ensure_ascii=False)}",
-            f"id: {event.trace_id or 'unknown'}",
-            f"timestamp: {event.timestamp.isoformat()}",
-            "",  # Empty line to end event
-        ]
-        return "\n".join(lines)
+    def _format_sse_event(self, event: StreamEvent) -> bytes:
+        """Format event as an encoded SSE message, ready to be written as-is."""
+        return encode_sse_event(
+            event.event_type.value,
+            event.data,
+            event_id=event.trace_id or "unknown",
+            timestamp=event.timestamp.isoformat()
+        )
     
     async def _heartbeat_monitor(self):
         """Monitor and send heartbeats to active streams with duration caps."""
@@ -394,8 +398,9 @@ class StreamingManager:
         query: str, 
         max_tokens: int = 1000,
         temperature: float = 0.2,
-        trace_id: Optional[str] = None
-    ) -> AsyncGenerator[str, None]:
+        trace_id: Optional[str] = None,
+        prefetch_hit: Optional[Any] = None
+    ) -> AsyncGenerator[bytes, None]:
         """
         Create a streaming search response with comprehensive lifecycle management.
         
@@ -403,6 +408,7 @@ class StreamingManager:
             query: Search query
             max_tokens: Maximum tokens to generate
             temperature: Generation temperature
+            prefetch_hit: Claimed speculative prefetch; its providers are skipped and its results merged
             
         Yields:
             SSE formatted events
@@ -416,6 +422,13 @@ class StreamingManager:
         intent_classification = self._classify_query_intent(query)
         budget_ms = self._get_stream_budget_ms(query)
         
+        # The stream budget can only shorten the request deadline set at ingress
+        request_deadline = RequestDeadline.after(budget_ms)
+        ingress_deadline = get_current_deadline()
+        if ingress_deadline is not None:
+            request_deadline = ingress_deadline.narrow(budget_ms)
+            budget_ms = int(request_deadline.remaining_ms)
+        
         # Create stream context with budget tracking
         context = StreamContext(
             stream_id=stream_id,
@@ -467,8 +480,14 @@ class StreamingManager:
             from services.retrieval.free_tier import get_zero_budget_retrieval
             retrieval_system = get_zero_budget_retrieval()
             
-            # Get search results
-            retrieval_response = await retrieval_system.search(query, k=10)
+            # Get search results (deadline scope must not span a yield)
+            from shared.core.speculative_prefetch import search_with_prefetch
+            with deadline_scope(deadline=request_deadline):
+                retrieval_response = await search_with_prefetch(
+                    prefetch_hit,
+                    lambda skip_providers: retrieval_system.search(query, k=10, skip_providers=skip_providers),
+                    k=10
+                )
             
             # Convert to context for LLM
             retrieval_context = []
@@ -507,11 +526,12 @@ class StreamingManager:
             from services.gateway.real_llm_integration import RealLLMProcessor
             llm_processor = RealLLMProcessor()
             
-            llm_response = await llm_processor.call_llm_with_provider_gating(
-                prompt=f"Based on the following search results, provide a comprehensive answer to: {query}\n\nSearch Results:\n{json.dumps(retrieval_context, indent=2)}",
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
+            with deadline_scope(deadline=request_deadline):
+                llm_response = await llm_processor.call_llm_with_provider_gating(
+                    prompt=f"Based on the following search results, provide a comprehensive answer to: {query}\n\nSearch Results:\n{format_prompt_context(retrieval_context)}",
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
             
             if llm_response.success:
                 # Get the generated content
@@ -767,7 +787,8 @@ async def create_sse_response(
     query: str,
     max_tokens: int = 1000,
     temperature: float = 0.2,
-    trace_id: Optional[str] = None
+    trace_id: Optional[str] = None,
+    prefetch_hit: Optional[Any] = None
 ) -> StreamingResponse:
     """
     Create SSE streaming response for search with enhanced trace ID propagation.
@@ -777,6 +798,7 @@ async def create_sse_response(
         max_tokens: Maximum tokens to generate
         temperature: Generation temperature
         trace_id: Optional trace ID for request tracking
+        prefetch_hit: Claimed speculative prefetch, if any
         
     Returns:
         StreamingResponse with SSE headers and trace ID
@@ -790,7 +812,8 @@ async def create_sse_response(
             query=query,
             max_tokens=max_tokens,
             temperature=temperature,
-            trace_id=trace_id
+            trace_id=trace_id,
+            prefetch_hit=prefetch_hit
         ):
             yield event
     
@@ -28,6 +28,7 @@ from prometheus_client import Counter, Histogram, Gauge, start_http_server
 
 # Import central configuration
 from shared.core.config.central_config import get_central_config
+from shared.core.speculative_prefetch import SpeculativePrefetcher, get_speculative_prefetch_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -500,6 +501,9 @@ class GuidedPromptService:
         # Storage for user settings and session data
         self.user_settings = {}
         self.session_data = {}
+        
+        # Retrieval for the draft starts while the user is still refining it
+        self.prefetcher = SpeculativePrefetcher(get_speculative_prefetch_cache())
     
     async def process_query(self, query: str, context: Dict[str, Any]) -> RefinementResult:
         """Process query for guided prompt confirmation"""
@@ -521,6 +525,12 @@ class GuidedPromptService:
             intent_confidence=context.get("intent_confidence", 0.5)
         )
         
+        # Speculatively prefetch the draft; only for real sessions the gateway can claim from
+        prefetch_session = context.get("session_id")
+        prefetch_allowed = self._prefetch_allowed(query, prefetch_session)
+        if prefetch_allowed:
+            self.prefetcher.schedule(prefetch_session, query)
+        
         # Get user settings
         user_settings = await self._get_user_settings(refinement_context.user_id)
         
@@ -543,11 +553,24 @@ class GuidedPromptService:
         # Generate refinements
         result = await self.refinement_generator.generate_refinements(refinement_context)
         
+        # A confident suggestion is likely to be what gets submitted
+        if prefetch_allowed and result.suggestions:
+            top = max(result.suggestions, key=lambda suggestion: suggestion.confidence)
+            if top.confidence >= self.prefetcher.config.min_suggestion_confidence:
+                self.prefetcher.schedule(prefetch_session, top.refined_query, slot="suggestion")
+        
         # Record metrics
         self._record_metrics(result, refinement_context)
         
         return result
     
+    def _prefetch_allowed(self, query: str, session_id: Optional[str]) -> bool:
+        """Drafts containing PII never leave this service for speculative retrieval"""
+        if not self.prefetcher.config.enabled or not session_id:
+            return False
+        _, redacted_items = self.refinement_generator.pii_redactor.redact_pii(query)
+        return not redacted_items
+    
     async def _get_user_settings(self, user_id: str) -> Dict[str, Any]:
         """Get user settings for guided prompt"""
         # In real implementation, this would fetch from database
@@ -616,6 +639,7 @@ async def init_dependencies():
         raise
     
     # Initialize Guided Prompt Service
+    await get_speculative_prefetch_cache().initialize()
     app.state.guided_prompt_service = GuidedPromptService(app.state.redis_client)
     logger.info("Guided Prompt Service initialized successfully")
 
@@ -623,6 +647,10 @@ async def cleanup_dependencies():
     """Cleanup shared clients and dependencies"""
     logger.info("Cleaning up Guided Prompt dependencies...")
     
+    if hasattr(app.state, 'guided_prompt_service'):
+        await app.state.guided_prompt_service.prefetcher.close()
+    await get_speculative_prefetch_cache().close()
+    
     if hasattr(app.state, 'redis_client'):
         try:
             app.state.redis_client.close()
@@ -66,8 +66,13 @@ class KGService:
     async def add_relationship(self, relationship_data: Dict[str, Any]) -> bool:
         """Add a relationship to the knowledge graph."""
         try:
-            # This would integrate with the actual KG service
-            return True
+            relationship = await self.kg_service.add_relationship(
+                relationship_data["from_entity"],
+                relationship_data["to_entity"],
+                relationship_data.get("relationship_type", "related_to"),
+                relationship_data.get("properties")
+            )
+            return relationship is not None
         except Exception:
             return False
 
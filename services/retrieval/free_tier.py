@@ -22,7 +22,7 @@ import re
 import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Collection, Dict, List, Optional, Any, Tuple
 from urllib.parse import urlparse, quote_plus
 from dataclasses import dataclass, field
 from enum import Enum
@@ -32,6 +32,10 @@ import requests
 from bs4 import BeautifulSoup
 import redis.asyncio as redis
 
+from shared.core.http_client_registry import http_client_registry
+from shared.core.request_deadline import effective_timeout
+from services.retrieval.provider_scheduler import get_provider_scheduler
+
 # Add circuit breaker imports and configuration
 import asyncio
 import hashlib
@@ -98,7 +102,11 @@ class ProviderHealth:
         """Record a provider failure."""
         self.failure_count += 1
         self.last_failure = time.time()
-        self.status = ProviderStatus.FAILING if self.failure_count >= CIRCUIT_BREAKER_FAILURE_THRESHOLD else ProviderStatus.DEGRADED
+        if self.failure_count >= CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+            # Open the circuit; should_attempt_request half-opens it after the cooldown
+            self.status = ProviderStatus.CIRCUIT_OPEN
+        else:
+            self.status = ProviderStatus.DEGRADED
     
     def record_success(self, response_time: float):
         """Record a provider success."""
@@ -220,6 +228,9 @@ class ZeroBudgetRetrieval:
         # Don't initialize async components here
         # They will be initialized when first needed
         
+        # Per-query provider selection
+        self.scheduler = get_provider_scheduler()
+        
         # Initialize provider health tracking
         self.provider_health = {
             'wiki': ProviderHealth('wiki'),
@@ -259,7 +270,7 @@ class ZeroBudgetRetrieval:
         if self.session is not None:
             return  # Already initialized
             
-        self.session = aiohttp.ClientSession(
+        self.session = http_client_registry.aiohttp_session(
             headers={
                 "User-Agent": USER_AGENT,
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -1022,7 +1033,15 @@ class ZeroBudgetRetrieval:
         
         return intersection / union if union > 0 else 0.0
     
-    async def search(self, query: str, k: int = 5, use_wiki: bool = True, use_web: bool = True) -> SearchResponse:
+    async def search(
+        self,
+        query: str,
+        k: int = 5,
+        use_wiki: bool = True,
+        use_web: bool = True,
+        providers: Optional[Collection[str]] = None,
+        skip_providers: Collection[str] = ()
+    ) -> SearchResponse:
         """
         Main search method with caching and result merging.
         
@@ -1031,6 +1050,8 @@ class ZeroBudgetRetrieval:
             k: Number of results to return
             use_wiki: Whether to include Wikipedia search
             use_web: Whether to include web search
+            providers: Only run these providers (None: all)
+            skip_providers: Providers not to run, e.g. ones a speculative prefetch already covered
         
         Returns:
             SearchResponse with results and metadata
@@ -1052,8 +1073,11 @@ class ZeroBudgetRetrieval:
         
         # Create a wrapper function for the entire search operation
         async def perform_search():
-            # Check cache first
-            cache_key = self._generate_cache_key(query, "combined", k)
+            # Check cache first; a provider subset is cached apart from the full search
+            selection = "combined"
+            if providers is not None or skip_providers:
+                selection = f"combined:{','.join(sorted(providers or ()))}:-{','.join(sorted(skip_providers))}"
+            cache_key = self._generate_cache_key(query, selection, k)
             cached_results = await self._cache_get(cache_key)
             
             if cached_results:
@@ -1096,49 +1120,55 @@ class ZeroBudgetRetrieval:
             all_results = []
             providers_used = []
             
-            # Create tasks for parallel execution
+            # Provider calls are created lazily so skipped providers never start
             tasks = []
             
             # Wikipedia search
             if use_wiki:
-                tasks.append(("wiki", self.wiki_search(query, k=min(k, 3))))
+                tasks.append(("wiki", lambda: self.wiki_search(query, k=min(k, 3))))
             
             # StackExchange search
-            tasks.append(("stackexchange", self.stackexchange_search(query, k=min(k, 2))))
+            tasks.append(("stackexchange", lambda: self.stackexchange_search(query, k=min(k, 2))))
             
             # MDN search
-            tasks.append(("mdn", self.mdn_search(query, k=min(k, 2))))
+            tasks.append(("mdn", lambda: self.mdn_search(query, k=min(k, 2))))
             
             # GitHub search
-            tasks.append(("github", self.github_search(query, k=min(k, 2))))
+            tasks.append(("github", lambda: self.github_search(query, k=min(k, 2))))
             
             # OpenAlex search
-            tasks.append(("openalex", self.openalex_search(query, k=min(k, 2))))
+            tasks.append(("openalex", lambda: self.openalex_search(query, k=min(k, 2))))
             
             # arXiv search
-            tasks.append(("arxiv", self.arxiv_search(query, k=min(k, 2))))
+            tasks.append(("arxiv", lambda: self.arxiv_search(query, k=min(k, 2))))
             
             # YouTube search
-            tasks.append(("youtube", self.youtube_search(query, k=min(k, 2))))
+            tasks.append(("youtube", lambda: self.youtube_search(query, k=min(k, 2))))
             
-            # Web search (fallback) - always include DuckDuckGo for reliability
+            # Web search (fallback)
             if use_web:
-                tasks.append(("web", self.free_web_search(query, k=min(k, 3))))
+                tasks.append(("web", lambda: self.free_web_search(query, k=min(k, 3))))
+            
+            # DuckDuckGo as backup source for reliability
+            tasks.append(("duckduckgo", lambda: self._duckduckgo_search(query, k=min(k, 2))))
             
-            # Always add DuckDuckGo as backup source for reliability
-            tasks.append(("duckduckgo", self._duckduckgo_search(query, k=min(k, 2))))
+            tasks = [
+                (task_name, task_factory) for task_name, task_factory in tasks
+                if (providers is None or task_name in providers) and task_name not in skip_providers
+            ]
             
             # Filter out unhealthy providers
             healthy_tasks = []
-            for task_name, task_func in tasks:
+            for task_name, task_factory in tasks:
                 if self._check_provider_health(task_name):
-                    healthy_tasks.append((task_name, task_func))
+                    healthy_tasks.append((task_name, task_factory))
                 else:
                     logger.info(f"Skipping {task_name} due to circuit breaker")
             
             if not healthy_tasks:
                 logger.warning("All providers are unhealthy, returning empty results")
                 return SearchResponse(
+                    query=query,
                     results=[],
                     total_results=0,
                     cache_hit=False,
@@ -1148,31 +1178,58 @@ class ZeroBudgetRetrieval:
                     error_message="All providers are unhealthy"
                 )
             
+            # Pick providers by intent, latency and past top-k contribution
+            decision = self.scheduler.select(
+                query,
+                [name for name, _ in healthy_tasks],
+                {name: effective_timeout(self._get_provider_timeout(name)) for name, _ in healthy_tasks}
+            )
+            intent = decision.intent
+            healthy_tasks = [(name, factory) for name, factory in healthy_tasks if name in decision.selected]
+            
             # Execute all tasks in parallel with strict timeout
-            logger.info(f"Executing {len(healthy_tasks)} healthy search tasks in parallel")
+            logger.info(f"Executing {len(healthy_tasks)} scheduled search tasks in parallel")
             
             # Execute tasks in parallel with individual timeouts
-            async def execute_with_timeout(task_name, task_func):
+            async def execute_with_timeout(task_name, task_factory):
+                scheduled_timeout = self.scheduler.timeout_for(task_name, intent, self._get_provider_timeout(task_name))
+                timeout = effective_timeout(scheduled_timeout)
+                if timeout <= 0:
+                    # Request deadline already spent - never start the provider call
+                    logger.info(f"Skipping {task_name}: request deadline exhausted")
+                    return []
+                # The request deadline, not the provider, ends calls that outlive a clamped timeout
+                cut_by_deadline = timeout < scheduled_timeout
+                call_start = time.time()
+                result = []
+                timed_out = False
                 try:
-                    provider_timeout = self._get_provider_timeout(task_name)
-                    logger.info(f"Executing {task_name} with {provider_timeout*1000:.0f}ms timeout")
+                    logger.info(f"Executing {task_name} with {timeout*1000:.0f}ms timeout")
                     
-                    result = await asyncio.wait_for(task_func, timeout=provider_timeout)
+                    result = await asyncio.wait_for(task_factory(), timeout=timeout)
                     return result
                     
                 except asyncio.TimeoutError:
-                    logger.warning(f"{task_name} timed out after {provider_timeout*1000:.0f}ms")
-                    self._record_provider_failure(task_name)
+                    timed_out = True
+                    logger.warning(f"{task_name} timed out after {timeout*1000:.0f}ms")
+                    if not cut_by_deadline:
+                        self._record_provider_failure(task_name)
                     return []
                 except Exception as e:
                     logger.error(f"{task_name} failed: {e}")
                     self._record_provider_failure(task_name)
                     return []
+                finally:
+                    # A truncated sample would teach the latency model the deadline, not the provider
+                    if not (timed_out and cut_by_deadline):
+                        self.scheduler.record_call(
+                            task_name, intent, (time.time() - call_start) * 1000, len(result or [])
+                        )
             
             # Execute all tasks in parallel
             tasks_with_timeouts = [
-                execute_with_timeout(task_name, task_func) 
-                for task_name, task_func in healthy_tasks
+                execute_with_timeout(task_name, task_factory) 
+                for task_name, task_factory in healthy_tasks
             ]
             
             results = await asyncio.gather(*tasks_with_timeouts, return_exceptions=True)
@@ -1185,6 +1242,7 @@ class ZeroBudgetRetrieval:
             
             # Process results
             process_start = time.time()
+            result_sources: Dict[int, str] = {}
             for i, (provider_name, result) in enumerate(zip([task[0] for task in healthy_tasks], results)):
                 if isinstance(result, Exception):
                     logger.error(f"{provider_name} search failed: {result}")
@@ -1192,6 +1250,7 @@ class ZeroBudgetRetrieval:
                 
                 if result:
                     all_results.extend(result)
+                    result_sources.update((id(r), provider_name) for r in result)
                     if provider_name == "wiki":
                         providers_used.append(SearchProvider.MEDIAWIKI)
                     elif provider_name == "stackexchange":
@@ -1230,6 +1289,11 @@ class ZeroBudgetRetrieval:
             
             # Take top k results
             final_results = sorted_results[:k]
+            self.scheduler.record_contribution(
+                intent,
+                [task[0] for task in healthy_tasks],
+                [result_sources.get(id(r)) for r in final_results]
+            )
             
             # Cache results (non-blocking)
             cache_start = time.time()
@@ -1290,7 +1354,7 @@ class ZeroBudgetRetrieval:
         # Execute the search with global timeout
         try:
             # Convert milliseconds to seconds for asyncio.wait_for
-            global_timeout = GLOBAL_SEARCH_TIMEOUT_MS / 1000
+            global_timeout = effective_timeout(GLOBAL_SEARCH_TIMEOUT_MS / 1000)
             logger.info(f"Enforcing global timeout of {global_timeout:.2f}s")
             
             return await asyncio.wait_for(perform_search(), timeout=global_timeout)
@@ -1338,6 +1402,7 @@ class ZeroBudgetRetrieval:
                 'health_percentage': (healthy_providers / total_providers * 100) if total_providers > 0 else 0
             },
             'provider_details': health_status,
+            'scheduler': self.scheduler.get_stats(),
             'performance_metrics': {
                 'avg_response_times': avg_response_times,
                 'total_requests': sum(h['total_requests'] for h in health_status.values())
@@ -1360,14 +1425,20 @@ def get_zero_budget_retrieval():
 zero_budget_retrieval = None  # Will be set when first accessed
 
 
-async def search_with_cache_headers(query: str, k: int = 5, use_wiki: bool = True, use_web: bool = True) -> Tuple[SearchResponse, Dict[str, str]]:
+async def search_with_cache_headers(
+    query: str,
+    k: int = 5,
+    use_wiki: bool = True,
+    use_web: bool = True,
+    providers: Optional[Collection[str]] = None
+) -> Tuple[SearchResponse, Dict[str, str]]:
     """
     Search with cache headers for HTTP responses.
     
     Returns:
         Tuple of (SearchResponse, headers_dict)
     """
-    response = await get_zero_budget_retrieval().search(query, k, use_wiki, use_web)
+    response = await get_zero_budget_retrieval().search(query, k, use_wiki, use_web, providers=providers)
     
     headers = {
         "X-Cache": "HIT" if response.cache_hit else "MISS",
@@ -1391,9 +1462,9 @@ async def free_web_search(query: str, k: int = 5) -> List[SearchResult]:
     return await get_zero_budget_retrieval().free_web_search(query, k)
 
 
-async def combined_search(query: str, k: int = 5) -> SearchResponse:
+async def combined_search(query: str, k: int = 5, skip_providers: Collection[str] = ()) -> SearchResponse:
     """Combined search with caching."""
-    return await get_zero_budget_retrieval().search(query, k, use_wiki=True, use_web=True)
+    return await get_zero_budget_retrieval().search(query, k, use_wiki=True, use_web=True, skip_providers=skip_providers)
 
 
 if __name__ == "__main__":
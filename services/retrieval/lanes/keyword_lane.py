@@ -1,17 +1,21 @@
 """
 Keyword Lane - SarvanOM v2 Retrieval Service
 
-Full-text search using Meilisearch.
+Full-text search over the embedded BM25F index (shared.core.fulltext), which
+the web lane feeds with provider results. While that index is still empty
+the lane queries Meilisearch instead.
 Budget: 0.5s (simple), 0.75s (technical), 1s (research/multimedia).
 """
 
 import asyncio
 import logging
 import time
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from shared.core.fulltext import FullTextIndex, get_fulltext_index
+from shared.core.request_deadline import effective_timeout
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -23,10 +27,11 @@ class RetrievalResult:
     error: Optional[str] = None
 
 class KeywordLane:
-    """Keyword search lane using Meilisearch"""
+    """Keyword search lane backed by the in-process full-text index"""
     
-    def __init__(self, meilisearch_url: str = "http://localhost:7700"):
-        self.meilisearch_url = meilisearch_url
+    def __init__(self, index: Optional[FullTextIndex] = None, max_results: int = 10):
+        self._index = index
+        self.max_results = max_results
         self.budgets = {
             "simple": 500,  # 0.5s
             "technical": 750,  # 0.75s
@@ -34,17 +39,26 @@ class KeywordLane:
             "multimedia": 1000  # 1s
         }
     
+    @property
+    def index(self) -> FullTextIndex:
+        if self._index is None:
+            self._index = get_fulltext_index()
+        return self._index
+    
     async def retrieve(self, query: str, complexity: str, constraints: List[Dict[str, Any]] = None) -> RetrievalResult:
-        """Retrieve keyword results from Meilisearch"""
+        """Retrieve keyword results from the full-text index"""
         start_time = time.time()
         budget_ms = self.budgets.get(complexity, 750)
         
         try:
-            # Simulate Meilisearch search (in real implementation, use actual Meilisearch client)
-            await asyncio.sleep(min(0.02, budget_ms / 25000))  # Simulate fast keyword search
-            
-            # Generate mock keyword results
-            results = self._generate_mock_keyword_results(query, constraints)
+            timeout = effective_timeout(budget_ms / 1000)
+            if self.index.doc_count == 0:
+                results = await asyncio.wait_for(self._search_meilisearch(query), timeout=timeout)
+            else:
+                # Scoring is CPU-bound numpy work; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                hits = await asyncio.wait_for(loop.run_in_executor(None, self._search, query), timeout=timeout)
+                results = self._format_hits(query, hits)
             
             return RetrievalResult(
                 lane="keyword",
@@ -70,23 +84,63 @@ class KeywordLane:
                 error=str(e)
             )
     
-    def _generate_mock_keyword_results(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Generate mock keyword results"""
+    def _search(self, query: str):
+        return self.index.search(query, self.max_results)
+    
+    async def _search_meilisearch(self, query: str) -> List[Dict[str, Any]]:
+        """Keyword results from Meilisearch; empty when it is not installed or reachable"""
+        from shared.core.services.meilisearch_service import MEILISEARCH_AVAILABLE, get_meilisearch_service
+        if not MEILISEARCH_AVAILABLE:
+            return []
+        service = get_meilisearch_service()
+        try:
+            response = await service.search(
+                query, service.config.docs_index, {"limit": self.max_results, "attributesToHighlight": []}
+            )
+        except Exception as e:
+            logger.debug(f"Meilisearch keyword fallback unavailable: {e}")
+            return []
+        hits = response.get("hits", [])
+        terms = set(query.lower().split())
+        results = []
+        for rank, hit in enumerate(hits):
+            content = hit.get("content") or hit.get("body") or ""
+            title = hit.get("title", "")
+            results.append({
+                "id": str(hit.get("id", rank)),
+                "title": title,
+                "content": content,
+                "url": hit.get("url", ""),
+                "domain": hit.get("domain", ""),
+                "relevance_score": round(1 - rank / len(hits), 4),
+                "keyword_matches": sorted(terms & set(f"{title} {content}".lower().split())),
+                "category": "keyword",
+                "backend": "meilisearch"
+            })
+        return results
+    
+    def _format_hits(self, query: str, hits) -> List[Dict[str, Any]]:
+        """Shape index hits like the other lanes' results"""
+        if not hits:
+            return []
+        top_score = hits[0].score or 1.0
+        terms = set(self.index.analyzer.analyze(query))
         results = []
-        for i in range(6):
+        for hit in hits:
+            fields = dict(hit.fields)
+            content = fields.pop("content", "")
+            title = fields.pop("title", "")
+            fields.pop("id", None)
             results.append({
-                "id": f"keyword_{i}",
-                "title": f"Keyword result {i} for '{query}'",
-                "content": f"This is keyword content {i} with exact matches for {query}.",
-                "url": f"https://keyword-example.com/result-{i}",
-                "domain": "keyword-example.com",
-                "published_at": datetime.now().isoformat(),
-                "relevance_score": 0.85 - (i * 0.05),
-                "authority_score": 0.75,
-                "word_count": 250 + (i * 30),
+                "id": hit.doc_id,
+                "title": title,
+                "content": content,
+                "url": fields.pop("url", ""),
+                "domain": fields.pop("domain", ""),
+                "relevance_score": round(hit.score / top_score, 4),
+                "bm25_score": round(hit.score, 4),
+                "keyword_matches": sorted(terms & set(self.index.analyzer.analyze(f"{title} {content}"))),
                 "category": "keyword",
-                "tags": ["keyword", "exact"],
-                "keyword_matches": query.split(),
-                "created_at": datetime.now().isoformat()
+                **fields
             })
         return results
@@ -16,7 +16,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
-import httpx
+from shared.core.http_client_registry import http_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +136,7 @@ class NewsLane:
         if not self.guardian_api_key:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://content.guardianapis.com/search",
@@ -167,7 +167,7 @@ class NewsLane:
         if not self.newsapi_key:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://newsapi.org/v2/everything",
@@ -195,7 +195,7 @@ class NewsLane:
     
     async def _search_gdelt(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using GDELT 2.1 API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://api.gdeltproject.org/api/v2/doc/doc",
@@ -223,7 +223,7 @@ class NewsLane:
     
     async def _search_hackernews(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using Hacker News Algolia API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://hn.algolia.com/api/v1/search",
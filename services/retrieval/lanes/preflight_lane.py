@@ -11,7 +11,7 @@ import time
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
-import httpx
+from shared.core.http_client_registry import http_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +29,7 @@ class PreflightLane:
     def __init__(self, guided_prompt_url: str = "http://localhost:8003"):
         self.guided_prompt_url = guided_prompt_url
         self.budget_ms = 500  # Fixed 500ms budget for all modes
-        self.http_client = httpx.AsyncClient()
+        self.http_client = http_client_registry.client()
     
     async def retrieve(self, query: str, complexity: str, constraints: List[Dict[str, Any]] = None, 
                       user_id: str = "anonymous", session_id: str = "default", 
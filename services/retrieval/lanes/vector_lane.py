@@ -1,19 +1,30 @@
 """
 Vector Lane - SarvanOM v2 Retrieval Service
 
-Semantic similarity search using Qdrant.
+Hybrid search over the embedded full-text index (shared.core.fulltext): one
+call scores dense embedding similarity and BM25F over the same documents,
+applies source filters to both sides and returns a single fused top-k.
+The external vector store is always searched too and rank-fused with the
+local hits; the local index only joins once it holds embedded documents
+(web results embedded by shared.core.fulltext.ingest), since without
+vectors it would just repeat the keyword lane. Falls back to lexical-only
+local ranking when no query embedding is available.
 Budget: 1s (simple), 1.5s (technical), 2s (research/multimedia).
 """
 
 import asyncio
 import logging
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from shared.core.fulltext import FullTextIndex, fuse_ranked, get_fulltext_index
+from shared.core.request_deadline import effective_timeout
+
 logger = logging.getLogger(__name__)
 
+Embedder = Callable[[str], Awaitable[Optional[List[float]]]]
+
 @dataclass
 class RetrievalResult:
     lane: str
@@ -23,36 +34,72 @@ class RetrievalResult:
     error: Optional[str] = None
 
 class VectorLane:
-    """Vector search lane using Qdrant"""
-    
-    def __init__(self, qdrant_url: str = "http://localhost:6333"):
-        self.qdrant_url = qdrant_url
+    """Hybrid lexical + dense search lane backed by the in-process full-text index"""
+
+    def __init__(
+        self,
+        index: Optional[FullTextIndex] = None,
+        embedder: Optional[Embedder] = None,
+        max_results: int = 10,
+        fusion: Optional[str] = None,
+        vector_store: Optional[Any] = None
+    ):
+        self._index = index
+        self._embedder = embedder
+        self._vector_store = vector_store
+        self.max_results = max_results
+        self.fusion = fusion
         self.budgets = {
             "simple": 1000,  # 1s
             "technical": 1500,  # 1.5s
             "research": 2000,  # 2s
             "multimedia": 2000  # 2s
         }
-    
+
+    @property
+    def index(self) -> FullTextIndex:
+        if self._index is None:
+            self._index = get_fulltext_index()
+        return self._index
+
     async def retrieve(self, query: str, complexity: str, constraints: List[Dict[str, Any]] = None) -> RetrievalResult:
-        """Retrieve vector results from Qdrant"""
+        """Retrieve one fused lexical + dense result list"""
         start_time = time.time()
         budget_ms = self.budgets.get(complexity, 1500)
-        
+
         try:
-            # Simulate Qdrant search (in real implementation, use actual Qdrant client)
-            await asyncio.sleep(min(0.05, budget_ms / 20000))  # Simulate vector search
-            
-            # Generate mock vector results
-            results = self._generate_mock_vector_results(query, constraints)
-            
+            timeout = effective_timeout(budget_ms / 1000)
+            if self.index.vector_count == 0:
+                results = await asyncio.wait_for(self._semantic_search(query), timeout=timeout)
+            else:
+                local, external = await asyncio.wait_for(
+                    asyncio.gather(
+                        self._hybrid(query, self._filters(constraints)),
+                        self._semantic_search(query),
+                        return_exceptions=True
+                    ),
+                    timeout=timeout
+                )
+                if isinstance(local, BaseException) and isinstance(external, BaseException):
+                    raise local
+                ranked = []
+                if isinstance(local, BaseException):
+                    logger.warning(f"Local hybrid search failed, using the vector store only: {local}")
+                else:
+                    ranked.append(self._format_hits(local))
+                if isinstance(external, BaseException):
+                    logger.warning(f"Vector store search failed, using the local index only: {external}")
+                else:
+                    ranked.append(external)
+                results = fuse_ranked(ranked, self.max_results)
+
             return RetrievalResult(
                 lane="vector",
                 status="success",
                 results=results,
                 latency_ms=(time.time() - start_time) * 1000
             )
-            
+
         except asyncio.TimeoutError:
             return RetrievalResult(
                 lane="vector",
@@ -69,24 +116,67 @@ class VectorLane:
                 latency_ms=(time.time() - start_time) * 1000,
                 error=str(e)
             )
-    
-    def _generate_mock_vector_results(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Generate mock vector results"""
+
+    async def _hybrid(self, query: str, filters: Dict[str, List[str]]):
+        query_vector = await self._embed(query)
+        # Scoring is CPU-bound numpy work; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.index.hybrid_search(
+                query, query_vector, self.max_results, filters=filters or None, fusion=self.fusion
+            )
+        )
+
+    async def _semantic_search(self, query: str) -> List[Dict[str, Any]]:
+        """Search the external vector store"""
+        if self._vector_store is None:
+            from shared.core.services.vector_singleton_service import get_vector_singleton_service
+            self._vector_store = get_vector_singleton_service()
+        results = await self._vector_store.semantic_search(query, self.max_results)
+        for result in results:
+            result.setdefault("category", "vector")
+            result.setdefault("metadata", {})["retrieval_method"] = "vector_similarity"
+        return results[:self.max_results]
+
+    async def _embed(self, query: str) -> Optional[List[float]]:
+        """Query embedding, or None to rank lexically only"""
+        try:
+            if self._embedder is None:
+                from shared.core.services.vector_singleton_service import get_vector_singleton_service
+                self._embedder = get_vector_singleton_service().get_embedding
+            return await self._embedder(query)
+        except Exception as e:
+            logger.debug(f"Query embedding unavailable, using lexical ranking only: {e}")
+            return None
+
+    def _filters(self, constraints: Optional[List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+        """Push bound source constraints down as index filters"""
+        domains = []
+        for constraint in constraints or []:
+            domains.extend(constraint.get("domains") or [])
+        return {"domain": domains} if domains else {}
+
+    def _format_hits(self, hits) -> List[Dict[str, Any]]:
+        """Shape index hits like the other lanes' results"""
+        if not hits:
+            return []
+        top_score = hits[0].score or 1.0
         results = []
-        for i in range(8):
+        for hit in hits:
+            fields = dict(hit.fields)
+            fields.pop("id", None)
             results.append({
-                "id": f"vector_{i}",
-                "title": f"Vector result {i} for '{query}'",
-                "content": f"This is vector content {i} semantically related to {query}.",
-                "url": f"https://vector-example.com/result-{i}",
-                "domain": "vector-example.com",
-                "published_at": datetime.now().isoformat(),
-                "relevance_score": 0.95 - (i * 0.05),
-                "authority_score": 0.85,
-                "word_count": 300 + (i * 40),
+                "id": hit.doc_id,
+                "title": fields.pop("title", ""),
+                "content": fields.pop("content", ""),
+                "url": fields.pop("url", ""),
+                "domain": fields.pop("domain", ""),
+                "relevance_score": round(hit.score / top_score, 4),
+                "hybrid_score": round(hit.score, 6),
+                "bm25_score": round(hit.components.get("lexical", 0.0), 4),
+                "similarity_score": round(hit.components["dense"], 4) if "dense" in hit.components else None,
                 "category": "vector",
-                "tags": ["vector", "semantic"],
-                "similarity_score": 0.9 - (i * 0.05),
-                "created_at": datetime.now().isoformat()
+                **fields
             })
         return results
@@ -18,7 +18,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
 import redis
-import httpx
+from shared.core.fulltext import get_fulltext_ingester, web_result_document
+from shared.core.http_client_registry import http_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -120,6 +121,10 @@ class WebLane:
                     logger.warning(f"Provider {provider_name} failed: {e}")
                     continue
             
+            # Real provider results feed the keyword and vector lanes' index
+            if all_results:
+                get_fulltext_ingester().submit(web_result_document(result) for result in all_results)
+            
             # If no results from any provider, generate mock results
             if not all_results:
                 all_results = self._generate_mock_web_results(query, constraints)
@@ -157,7 +162,7 @@ class WebLane:
         if not self.brave_api_key:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://api.search.brave.com/res/v1/web/search",
@@ -189,7 +194,7 @@ class WebLane:
         if not self.serpapi_key:
             return []
         
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://serpapi.com/search",
@@ -217,7 +222,7 @@ class WebLane:
     
     async def _search_duckduckgo(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using DuckDuckGo Instant Answer API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://api.duckduckgo.com/",
@@ -245,7 +250,7 @@ class WebLane:
     
     async def _search_wikipedia(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using Wikipedia API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 # Search for pages
                 search_response = await client.get(
@@ -270,7 +275,7 @@ class WebLane:
     
     async def _search_stackexchange(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using StackExchange API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://api.stackexchange.com/2.3/search/advanced",
@@ -298,7 +303,7 @@ class WebLane:
     
     async def _search_mdn(self, query: str, constraints: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Search using MDN API (keyless)"""
-        async with httpx.AsyncClient() as client:
+        async with http_client_registry.client() as client:
             try:
                 response = await client.get(
                     "https://developer.mozilla.org/api/v1/search",
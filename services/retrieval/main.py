@@ -28,6 +28,13 @@ from prometheus_client import Counter, Histogram, Gauge, start_http_server
 
 # Import central configuration
 from shared.core.config.central_config import get_central_config
+from shared.core.http_client_registry import http_client_registry
+from shared.core.deadline_middleware import DeadlineMiddleware
+from shared.core.fulltext import get_fulltext_ingester
+from shared.core.request_deadline import effective_timeout
+from shared.core.sampling_profiler import ProfilerMiddleware, create_profile_router, get_sampling_profiler, profile_endpoints_enabled
+from shared.core.executor_registry import get_executor_registry
+from shared.core.loop_monitor import get_loop_blocking_detector
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -81,6 +88,7 @@ class RetrievalRequest:
     session_id: str
     trace_id: str
     budget_remaining: float = 1.0
+    lanes: Optional[List[str]] = None  # None: every lane
 
 @dataclass
 class FusedResult:
@@ -219,11 +227,18 @@ class RetrievalService:
         # Bind constraints
         bound_request = self.constraint_binder.bind_constraints(request.query, request.constraints)
         
-        # Execute all lanes in parallel
+        # Lanes see each chip together with its bound values (e.g. source domains)
+        bound = bound_request['constraints']
+        constraint_dicts = [
+            {**constraint.__dict__, **bound.get(constraint.id, {})} for constraint in request.constraints
+        ]
+        
+        # Execute the selected lanes in parallel
+        lanes = self._select_lanes(request.lanes)
         lane_tasks = []
-        for lane_name, lane in self.lanes.items():
+        for lane_name, lane in lanes.items():
             task = asyncio.create_task(
-                self._execute_lane_with_timeout(lane, request)
+                self._execute_lane_with_timeout(lane, request, constraint_dicts)
             )
             lane_tasks.append(task)
         
@@ -232,11 +247,11 @@ class RetrievalService:
         
         # Process results
         valid_results = []
-        for i, result in enumerate(lane_results):
+        for lane_name, result in zip(lanes, lane_results):
             if isinstance(result, Exception):
-                logger.error(f"Lane {list(self.lanes.keys())[i]} failed: {result}")
+                logger.error(f"Lane {lane_name} failed: {result}")
                 valid_results.append(RetrievalResult(
-                    lane=list(self.lanes.keys())[i],
+                    lane=lane_name,
                     status=LaneStatus.ERROR,
                     results=[],
                     latency_ms=0.0,
@@ -254,21 +269,42 @@ class RetrievalService:
         
         return fused_result
     
-    async def _execute_lane_with_timeout(self, lane, request: RetrievalRequest) -> RetrievalResult:
-        """Execute lane with timeout"""
-        try:
-            return await asyncio.wait_for(
-                lane.retrieve(
-                    request.query, 
-                    request.complexity.value,
-                    [constraint.__dict__ for constraint in request.constraints],
-                    request.user_id,
-                    request.session_id,
-                    request.trace_id,
-                    request.budget_remaining
-                ),
-                timeout=request.budget_remaining
+    def _select_lanes(self, names: Optional[List[str]]) -> Dict[str, Any]:
+        """Lanes to run for a request; unknown names are ignored"""
+        if not names:
+            return self.lanes
+        return {name: self.lanes[name] for name in names if name in self.lanes}
+    
+    async def _execute_lane_with_timeout(
+        self,
+        lane,
+        request: RetrievalRequest,
+        constraints: List[Dict[str, Any]]
+    ) -> RetrievalResult:
+        """Execute lane with timeout, clamped to the propagated request deadline"""
+        budget = effective_timeout(request.budget_remaining)
+        if budget <= 0:
+            return RetrievalResult(
+                lane=lane.__class__.__name__.lower().replace('lane', ''),
+                status=LaneStatus.TIMEOUT,
+                results=[],
+                latency_ms=0.0,
+                error="Request deadline exhausted before lane start"
+            )
+        if isinstance(lane, PreflightLane):
+            call = lane.retrieve(
+                request.query,
+                request.complexity.value,
+                constraints,
+                request.user_id,
+                request.session_id,
+                request.trace_id,
+                budget
             )
+        else:
+            call = lane.retrieve(request.query, request.complexity.value, constraints)
+        try:
+            return await asyncio.wait_for(call, timeout=budget)
         except asyncio.TimeoutError:
             return RetrievalResult(
                 lane=lane.__class__.__name__.lower().replace('lane', ''),
@@ -314,6 +350,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Honour the caller's X-Request-Deadline-Ms so lanes never outlive the gateway request
+app.add_middleware(DeadlineMiddleware)
+
+# Attribute profiler samples to the endpoint and X-Trace-ID of each request
+app.add_middleware(ProfilerMiddleware)
+if profile_endpoints_enabled():
+    app.include_router(create_profile_router())
+
 # App state / DI container
 async def init_dependencies():
     """Initialize shared clients and dependencies"""
@@ -341,6 +385,10 @@ async def init_dependencies():
     # Initialize Retrieval Service
     app.state.retrieval_service = RetrievalService(app.state.redis_client)
     logger.info("Retrieval Service initialized successfully")
+    
+    # Pre-open provider connections so the first lanes skip DNS/TCP/TLS setup
+    warmup_hosts = await http_client_registry.warmup()
+    logger.info(f"HTTP pool warmup: {sum(warmup_hosts.values())}/{len(warmup_hosts)} provider hosts ready")
 
 async def cleanup_dependencies():
     """Cleanup shared clients and dependencies"""
@@ -352,16 +400,29 @@ async def cleanup_dependencies():
             logger.info("Redis client closed successfully")
         except Exception as e:
             logger.error(f"Error closing Redis client: {e}")
+    
+    # Commit web results still queued for the full-text index
+    await get_fulltext_ingester().close()
+    await http_client_registry.close()
 
 # Startup/Shutdown events
 @app.on_event("startup")
 async def startup_event():
     """Application startup event"""
+    get_executor_registry().install_default_executor()
+    loop_monitor = get_loop_blocking_detector()
+    if loop_monitor.config.enabled:
+        loop_monitor.start()
+    profiler = get_sampling_profiler()
+    if profiler.config.enabled:
+        profiler.start()
     await init_dependencies()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
+    get_sampling_profiler().stop()
+    get_loop_blocking_detector().stop()
     await cleanup_dependencies()
 
 # Pydantic models for API
@@ -380,6 +441,7 @@ class RetrievalRequestModel(BaseModel):
     session_id: str
     trace_id: str
     budget_remaining: float = 1.0
+    lanes: Optional[List[str]] = None
 
 class RetrievalResultResponse(BaseModel):
     results: List[Dict[str, Any]]
@@ -452,7 +514,8 @@ async def retrieve_documents(request: RetrievalRequestModel):
             user_id=request.user_id,
             session_id=request.session_id,
             trace_id=request.trace_id,
-            budget_remaining=request.budget_remaining
+            budget_remaining=request.budget_remaining,
+            lanes=request.lanes
         )
         
         # Execute retrieval
@@ -469,6 +532,7 @@ async def get_lane_status():
     """Get status of all retrieval lanes"""
     return {
         "lanes": list(app.state.retrieval_service.lanes.keys()),
+        "optional_lanes": list(app.state.retrieval_service.optional_lanes.keys()),
         "status": "healthy",
         "budget_allocations": app.state.retrieval_service.budget_allocations
     }
@@ -24,6 +24,8 @@ from enum import Enum
 import logging
 
 from shared.core.logging import get_logger
+from shared.core.request_deadline import deadline_scope, effective_timeout
+from shared.core.executor_registry import get_executor_registry
 from shared.contracts.query import RetrievalSearchRequest, RetrievalSearchResponse
 from sarvanom.services.retrieval.config import get_config
 from sarvanom.shared.core.config.provider_config import get_provider_config
@@ -246,6 +248,16 @@ class RetrievalOrchestrator:
         This is the main entry point for retrieval operations, providing
         a single source of truth for all retrieval needs.
         """
+        # The total retrieval budget can only shorten the request deadline
+        with deadline_scope(budget_ms=self.config.latency_budget.total_budget_ms):
+            return await self._orchestrate_retrieval(request, user_id)
+    
+    async def _orchestrate_retrieval(
+        self,
+        request: RetrievalSearchRequest,
+        user_id: Optional[str]
+    ) -> RetrievalSearchResponse:
+        """Run orchestrated retrieval under the active request deadline."""
         start_time = time.time()
         
         try:
@@ -418,10 +430,21 @@ class RetrievalOrchestrator:
     ) -> LaneResult:
         """Execute retrieval for a single lane with strict timeout enforcement."""
         start_time = time.time()
+        budget_ms = self._get_lane_budget(lane)
         
         try:
-            # Get lane-specific budget (CRITICAL: These are strict performance requirements)
-            budget_ms = self._get_lane_budget(lane)
+            # Get lane-specific budget (CRITICAL: These are strict performance requirements),
+            # clamped to what is left of the request deadline
+            budget_ms = effective_timeout(budget_ms / 1000.0) * 1000.0
+            if budget_ms <= 0:
+                # Never start a lane that cannot finish before the deadline
+                return LaneResult(
+                    lane=lane,
+                    status=LaneStatus.TIMEOUT,
+                    results=[],
+                    latency_ms=0.0,
+                    error="Request deadline exhausted before lane start"
+                )
             
             # Execute with strict timeout - this is critical for performance
             # Vector: ≤ 2.0s, KG: ≤ 1.5s, Web: ≤ 1.0s
@@ -560,10 +583,16 @@ class RetrievalOrchestrator:
             logger.warning(f"Web search lane failed: {e}")
             return []
     
-    def _fast_web_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
-        """Fast web search implementation with minimal HTTP requests."""
+    async def _fast_web_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Fast web search; the synchronous requests run on the shared io executor."""
+        return await get_executor_registry().run_io(
+            self._fast_web_search_sync, query, top_k, site="retrieval.fast_web_search"
+        )
+    
+    def _fast_web_search_sync(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """Fast web search implementation with minimal HTTP requests (blocking)."""
         import os
-        import requests
+        from shared.core.http_client_registry import http_client_registry
         import time
         
         results = []
@@ -574,7 +603,7 @@ class RetrievalOrchestrator:
             if brave_key:
                 headers = {"X-Subscription-Token": brave_key}
                 params = {"q": query, "count": min(top_k, 3)}  # Limit to 3 results for speed
-                r = requests.get(
+                r = http_client_registry.sync_session().get(
                     "https://api.search.brave.com/res/v1/web/search",
                     headers=headers,
                     params=params,
@@ -602,7 +631,7 @@ class RetrievalOrchestrator:
                     "api_key": serpapi_key,
                     "num": min(top_k, 3),  # Limit to 3 results for speed
                 }
-                r = requests.get(
+                r = http_client_registry.sync_session().get(
                     "https://serpapi.com/search.json", 
                     params=params, 
                     timeout=2  # Very short timeout for strict latency
@@ -649,10 +678,15 @@ class RetrievalOrchestrator:
             logger.warning(f"Web provider {provider_name} failed: {e}")
             return []
     
+    async def _provider_get(self, site: str, url: str, **kwargs):
+        """GET through the shared sync session on the io executor, so providers fan out in parallel."""
+        from shared.core.http_client_registry import http_client_registry
+        
+        return await get_executor_registry().run_io(http_client_registry.sync_session().get, url, site=site, **kwargs)
+    
     async def _call_brave_search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Call Brave Search API"""
         import os
-        import requests
         
         brave_key = os.getenv("BRAVE_SEARCH_API_KEY")
         if not brave_key:
@@ -661,7 +695,8 @@ class RetrievalOrchestrator:
         try:
             headers = {"X-Subscription-Token": brave_key}
             params = {"q": query, "count": min(top_k, 3)}
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.brave_search",
                 "https://api.search.brave.com/res/v1/web/search",
                 headers=headers,
                 params=params,
@@ -693,7 +728,6 @@ class RetrievalOrchestrator:
     async def _call_serpapi(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Call SerpAPI"""
         import os
-        import requests
         
         serpapi_key = os.getenv("SERPAPI_KEY")
         if not serpapi_key:
@@ -706,7 +740,8 @@ class RetrievalOrchestrator:
                 "api_key": serpapi_key,
                 "num": min(top_k, 3),
             }
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.serpapi",
                 "https://serpapi.com/search.json", 
                 params=params, 
                 timeout=2
@@ -738,10 +773,9 @@ class RetrievalOrchestrator:
         """Call DuckDuckGo Instant Answer API (keyless)"""
         try:
             # DuckDuckGo Instant Answer API is free and doesn't require API key
-            import requests
-            
             params = {"q": query, "format": "json", "no_html": "1", "skip_disambig": "1"}
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.duckduckgo",
                 "https://api.duckduckgo.com/",
                 params=params,
                 timeout=2
@@ -788,8 +822,6 @@ class RetrievalOrchestrator:
     async def _call_wikipedia(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Call Wikipedia API (keyless)"""
         try:
-            import requests
-            
             # Search for pages
             search_params = {
                 "action": "query",
@@ -799,7 +831,8 @@ class RetrievalOrchestrator:
                 "srlimit": min(top_k, 3)
             }
             
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.wikipedia",
                 "https://en.wikipedia.org/w/api.php",
                 params=search_params,
                 timeout=2
@@ -824,7 +857,8 @@ class RetrievalOrchestrator:
                             "explaintext": "1"
                         }
                         
-                        content_r = requests.get(
+                        content_r = await self._provider_get(
+                            "retrieval.wikipedia",
                             "https://en.wikipedia.org/w/api.php",
                             params=content_params,
                             timeout=2
@@ -856,8 +890,6 @@ class RetrievalOrchestrator:
     async def _call_stackexchange(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Call Stack Exchange API (keyless)"""
         try:
-            import requests
-            
             # Search Stack Overflow
             params = {
                 "order": "desc",
@@ -867,7 +899,8 @@ class RetrievalOrchestrator:
                 "pagesize": min(top_k, 3)
             }
             
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.stackexchange",
                 "https://api.stackexchange.com/2.3/search",
                 params=params,
                 timeout=2
@@ -903,8 +936,6 @@ class RetrievalOrchestrator:
     async def _call_mdn(self, query: str, top_k: int) -> List[Dict[str, Any]]:
         """Call MDN Web Docs API (keyless)"""
         try:
-            import requests
-            
             # Search MDN
             params = {
                 "q": query,
@@ -912,7 +943,8 @@ class RetrievalOrchestrator:
                 "size": min(top_k, 3)
             }
             
-            r = requests.get(
+            r = await self._provider_get(
+                "retrieval.mdn",
                 "https://developer.mozilla.org/api/v1/search",
                 params=params,
                 timeout=2
@@ -947,54 +979,61 @@ class RetrievalOrchestrator:
         return []
     
     async def _vector_search_lane(self, request: RetrievalSearchRequest) -> List[Dict[str, Any]]:
-        """Vector passage search lane using optimized singleton service."""
+        """Hybrid lexical + dense passage lane over the embedded full-text index."""
         try:
-            # Import singleton vector service (Phase I2 optimization)
+            from shared.core.fulltext import fuse_ranked, get_fulltext_index
             from shared.core.services.vector_singleton_service import get_vector_singleton_service
             
-            # Get singleton service (already initialized and warmed up)
-            vector_service = await get_vector_singleton_service()
+            vector_service = get_vector_singleton_service()
+            index = get_fulltext_index()
             
             # CRITICAL: Enforce strict top-k ≤ 5 requirement for performance
             top_k = min(5, request.max_results)  # Strict ≤ 5 passages for performance
             
-            # Complete pipeline with singleton service (embed + search)
-            # This uses the optimized singleton with caching and warmup
-            embeddings, search_results = await vector_service.embed_and_search(
-                query=request.query,
-                top_k=top_k
-            )
+            async def external_search() -> List[Dict[str, Any]]:
+                search_results = await vector_service.semantic_search(request.query, top_k)
+                for result in search_results:
+                    result.setdefault("metadata", {})
+                    result["metadata"]["lane"] = "vector_search"
+                    result["metadata"]["retrieval_method"] = "vector_similarity"
+                return search_results[:top_k]
             
-            # Format results
-            results = []
-            for result in search_results:
-                if isinstance(result, tuple):
-                    doc, score = result
+            async def local_search() -> List[Dict[str, Any]]:
+                # One fused lexical + dense top-k over the same documents
+                embedding = await vector_service.get_embedding(request.query)
+                hits = await get_executor_registry().run_cpu(
+                    index.hybrid_search, request.query, embedding, top_k, site="retrieval.hybrid_search"
+                )
+                results = []
+                for hit in hits:
+                    metadata = {k: v for k, v in hit.fields.items() if k not in ("id", "content")}
+                    metadata.update({
+                        "lane": "vector_search",
+                        "retrieval_method": "hybrid_lexical_dense" if embedding else "lexical",
+                        "bm25_score": hit.components.get("lexical", 0.0),
+                        "similarity_score": hit.components.get("dense"),
+                    })
                     results.append({
-                        "id": doc.id,
-                        "content": doc.text,
-                        "metadata": {
-                            **doc.metadata,
-                            "lane": "vector_search",
-                            "retrieval_method": "vector_similarity",
-                            "embedding_model": "sentence-transformers/all-MiniLM-L3-v2"
-                        },
-                        "score": score,
+                        "id": hit.doc_id,
+                        "content": hit.fields.get("content", ""),
+                        "metadata": metadata,
+                        "score": hit.score,
                     })
-                else:
-                    # Handle dict format
-                    if "metadata" not in result:
-                        result["metadata"] = {}
-                    result["metadata"]["lane"] = "vector_search"
-                    result["metadata"]["retrieval_method"] = "vector_similarity"
-                    results.append(result)
+                return results
             
-            # Validate we don't exceed the 5 passages limit
-            if len(results) > 5:
-                logger.warning(f"Vector lane exceeded 5 passages limit: {len(results)}, truncating")
-                results = results[:5]
+            if not index.vector_count:
+                # Without embeddings the local index would only repeat the keyword lane
+                return await external_search()
             
-            return results
+            # The external vector store stays a fusion input next to the local hybrid hits
+            local, external = await asyncio.gather(local_search(), external_search(), return_exceptions=True)
+            ranked = []
+            for source, outcome in (("Hybrid search", local), ("Vector store search", external)):
+                if isinstance(outcome, Exception):
+                    logger.warning(f"{source} failed in the vector lane: {outcome}")
+                else:
+                    ranked.append(outcome)
+            return fuse_ranked(ranked, top_k)
             
         except Exception as e:
             logger.warning(f"Vector search lane failed: {e}", exc_info=True)
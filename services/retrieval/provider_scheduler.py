@@ -0,0 +1,272 @@
+"""
+Latency-Aware Provider Scheduler for Zero-Budget Retrieval
+
+Decides, per query, which free-tier providers are worth calling instead of
+firing all of them on every uncached query.
+
+Inputs:
+- Query intent (SIMPLE / TECHNICAL / RESEARCH / MULTIMEDIA) gives each
+  provider a prior relevance
+- Rolling latency percentiles per provider drive the skip decision for
+  providers that cannot answer in the time left, and tighten their timeouts
+- Marginal contribution: how often a provider's results survive
+  deduplication into the final top-k for that intent
+
+Providers that rarely contribute are skipped once there is enough evidence,
+with a small exploration rate so a provider that improves can win its place
+back. Skip and contribution rates are exported for monitoring.
+"""
+
+import logging
+import os
+import random
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from shared.core.services.multi_lane_orchestrator import IntentClassifier, QueryIntent
+
+logger = logging.getLogger(__name__)
+
+# Prior relevance of each provider per intent, used until real stats accumulate
+PROVIDER_INTENT_PRIORS: Dict[QueryIntent, Dict[str, float]] = {
+    QueryIntent.SIMPLE: {
+        "wiki": 0.9, "web": 0.7, "duckduckgo": 0.7, "stackexchange": 0.3, "mdn": 0.2,
+        "github": 0.2, "openalex": 0.2, "arxiv": 0.1, "youtube": 0.2,
+    },
+    QueryIntent.TECHNICAL: {
+        "stackexchange": 0.9, "mdn": 0.8, "github": 0.8, "wiki": 0.6, "web": 0.7,
+        "duckduckgo": 0.5, "openalex": 0.2, "arxiv": 0.3, "youtube": 0.3,
+    },
+    QueryIntent.RESEARCH: {
+        "openalex": 0.9, "arxiv": 0.9, "wiki": 0.7, "web": 0.6, "duckduckgo": 0.4,
+        "stackexchange": 0.2, "mdn": 0.1, "github": 0.3, "youtube": 0.2,
+    },
+    QueryIntent.MULTIMEDIA: {
+        "youtube": 0.9, "wiki": 0.6, "web": 0.6, "duckduckgo": 0.4, "stackexchange": 0.3,
+        "mdn": 0.2, "github": 0.2, "openalex": 0.1, "arxiv": 0.1,
+    },
+}
+
+
+@dataclass
+class ProviderSchedulerConfig:
+    """Scheduler tuning."""
+    min_providers: int = 3
+    max_providers: int = 6
+    min_samples: int = 20
+    skip_threshold: float = 0.1
+    prior_weight: float = 5.0
+    exploration_rate: float = 0.05
+    latency_window: int = 200
+    latency_weight: float = 0.5
+    adaptive_timeout_multiplier: float = 1.5
+    min_timeout_s: float = 0.3
+
+    @classmethod
+    def from_environment(cls) -> "ProviderSchedulerConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            min_providers=int(os.getenv("PROVIDER_SCHEDULER_MIN_PROVIDERS", "3")),
+            max_providers=int(os.getenv("PROVIDER_SCHEDULER_MAX_PROVIDERS", "6")),
+            min_samples=int(os.getenv("PROVIDER_SCHEDULER_MIN_SAMPLES", "20")),
+            skip_threshold=float(os.getenv("PROVIDER_SCHEDULER_SKIP_THRESHOLD", "0.1")),
+            exploration_rate=float(os.getenv("PROVIDER_SCHEDULER_EXPLORATION_RATE", "0.05")),
+        )
+
+
+@dataclass
+class ProviderIntentStats:
+    """Call, contribution and latency history of one provider for one intent."""
+    calls: int = 0
+    returned: int = 0
+    contributed: int = 0
+    skipped: int = 0
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+    def contribution_rate(self, prior: float, prior_weight: float) -> float:
+        """Share of calls that put at least one result in the top-k, smoothed toward the prior."""
+        return (self.contributed + prior * prior_weight) / (self.calls + prior_weight)
+
+    def latency_percentile(self, percentile: int) -> Optional[float]:
+        if len(self.latencies_ms) < 2:
+            return self.latencies_ms[0] if self.latencies_ms else None
+        return statistics.quantiles(self.latencies_ms, n=100)[percentile - 1]
+
+
+@dataclass
+class ScheduleDecision:
+    """Providers chosen for one query and why the rest were skipped."""
+    intent: QueryIntent
+    selected: List[str]
+    skipped: Dict[str, str] = field(default_factory=dict)
+    explored: Optional[str] = None
+
+
+class ProviderScheduler:
+    """
+    Chooses providers per query from intent priors, rolling latency and
+    top-k contribution statistics.
+    """
+
+    def __init__(self, config: Optional[ProviderSchedulerConfig] = None, rng: Optional[random.Random] = None):
+        self.config = config or ProviderSchedulerConfig.from_environment()
+        self._rng = rng or random.Random()
+        self._stats: Dict[str, Dict[QueryIntent, ProviderIntentStats]] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, query: str) -> QueryIntent:
+        return IntentClassifier.classify_query(query)
+
+    def _get_stats(self, provider: str, intent: QueryIntent) -> ProviderIntentStats:
+        by_intent = self._stats.setdefault(provider, {})
+        stats = by_intent.get(intent)
+        if stats is None:
+            stats = by_intent[intent] = ProviderIntentStats(
+                latencies_ms=deque(maxlen=self.config.latency_window)
+            )
+        return stats
+
+    def _prior(self, provider: str, intent: QueryIntent) -> float:
+        return PROVIDER_INTENT_PRIORS.get(intent, {}).get(provider, 0.5)
+
+    def _score(self, provider: str, intent: QueryIntent, timeout_s: float) -> float:
+        stats = self._get_stats(provider, intent)
+        score = stats.contribution_rate(self._prior(provider, intent), self.config.prior_weight)
+        p95 = stats.latency_percentile(95)
+        if p95 is not None and timeout_s > 0:
+            # Slow providers are worth less: they hold the response up to their timeout
+            score *= 1 - self.config.latency_weight * min(1.0, p95 / (timeout_s * 1000))
+        return score
+
+    def select(
+        self,
+        query: str,
+        candidates: Sequence[str],
+        timeouts_s: Mapping[str, float],
+        intent: Optional[QueryIntent] = None
+    ) -> ScheduleDecision:
+        """
+        Pick the providers to call for ``query``.
+
+        Args:
+            query: Search query
+            candidates: Providers that are enabled and pass their circuit breaker
+            timeouts_s: Time each provider would be given (already deadline-clamped)
+            intent: Pre-computed intent, classified from ``query`` if omitted
+        """
+        intent = intent or self.classify(query)
+        decision = ScheduleDecision(intent=intent, selected=[])
+        with self._lock:
+            ranked = sorted(
+                candidates,
+                key=lambda p: self._score(p, intent, timeouts_s.get(p, 0.0)),
+                reverse=True
+            )
+            for provider in ranked:
+                stats = self._get_stats(provider, intent)
+                timeout_s = timeouts_s.get(provider, 0.0)
+                p50 = stats.latency_percentile(50)
+                mandatory = len(decision.selected) < self.config.min_providers
+
+                if timeout_s <= 0:
+                    reason = "no_time_left"
+                elif not mandatory and len(decision.selected) >= self.config.max_providers:
+                    reason = "max_providers"
+                elif (not mandatory and stats.calls >= self.config.min_samples
+                      and self._score(provider, intent, timeout_s) < self.config.skip_threshold):
+                    reason = "low_contribution"
+                elif (not mandatory and p50 is not None and stats.calls >= self.config.min_samples
+                      and p50 > timeout_s * 1000):
+                    reason = "too_slow"
+                else:
+                    decision.selected.append(provider)
+                    continue
+                decision.skipped[provider] = reason
+
+            # Occasionally try a skipped provider so its stats can recover
+            explorable = [p for p, r in decision.skipped.items() if r in ("low_contribution", "too_slow", "max_providers")]
+            if explorable and self._rng.random() < self.config.exploration_rate:
+                explored = self._rng.choice(explorable)
+                del decision.skipped[explored]
+                decision.selected.append(explored)
+                decision.explored = explored
+
+            for provider in decision.skipped:
+                self._get_stats(provider, intent).skipped += 1
+
+        if decision.skipped:
+            logger.info(
+                f"Provider scheduler ({intent.value}): calling {decision.selected}, skipping {decision.skipped}"
+            )
+        return decision
+
+    def timeout_for(self, provider: str, intent: QueryIntent, default_s: float) -> float:
+        """Tighten a provider's timeout to a multiple of its observed p99 once enough samples exist."""
+        with self._lock:
+            stats = self._get_stats(provider, intent)
+            if stats.calls < self.config.min_samples:
+                return default_s
+            p99 = stats.latency_percentile(99)
+        if p99 is None:
+            return default_s
+        adaptive = max(self.config.min_timeout_s, p99 / 1000 * self.config.adaptive_timeout_multiplier)
+        return min(default_s, adaptive)
+
+    def record_call(self, provider: str, intent: QueryIntent, latency_ms: float, result_count: int) -> None:
+        """Record one provider call; timeouts are recorded with their full wait and no results."""
+        with self._lock:
+            stats = self._get_stats(provider, intent)
+            stats.calls += 1
+            stats.latencies_ms.append(latency_ms)
+            if result_count > 0:
+                stats.returned += 1
+
+    def record_contribution(self, intent: QueryIntent, called: Iterable[str], top_k_providers: Iterable[str]) -> None:
+        """Record which of the called providers placed at least one result in the final top-k."""
+        contributors = set(top_k_providers)
+        with self._lock:
+            for provider in called:
+                if provider in contributors:
+                    self._get_stats(provider, intent).contributed += 1
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-provider skip rate, contribution rate and latency, overall and by intent."""
+        with self._lock:
+            report = {}
+            for provider, by_intent in self._stats.items():
+                calls = sum(s.calls for s in by_intent.values())
+                skipped = sum(s.skipped for s in by_intent.values())
+                contributed = sum(s.contributed for s in by_intent.values())
+                latencies = [l for s in by_intent.values() for l in s.latencies_ms]
+                report[provider] = {
+                    "calls": calls,
+                    "skipped": skipped,
+                    "skip_rate": round(skipped / (calls + skipped), 4) if calls + skipped else 0.0,
+                    "contribution_rate": round(contributed / calls, 4) if calls else 0.0,
+                    "latency_p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+                    "latency_p95_ms": round(statistics.quantiles(latencies, n=20)[18], 2)
+                    if len(latencies) >= 2 else None,
+                    "by_intent": {
+                        intent.value: {
+                            "calls": s.calls,
+                            "skipped": s.skipped,
+                            "contribution_rate": round(
+                                s.contribution_rate(self._prior(provider, intent), self.config.prior_weight), 4
+                            ),
+                        }
+                        for intent, s in by_intent.items()
+                    },
+                }
+            return report
+
+
+# Global scheduler instance
+provider_scheduler = ProviderScheduler()
+
+
+def get_provider_scheduler() -> ProviderScheduler:
+    """Get the global provider scheduler."""
+    return provider_scheduler
@@ -267,7 +267,8 @@ async def web_search_endpoint(
 @router.get("/combined", response_model=SearchResponseModel)
 async def combined_search_endpoint(
     query: str = Query(..., min_length=1, max_length=500),
-    k: int = Query(default=5, ge=1, le=20)
+    k: int = Query(default=5, ge=1, le=20),
+    providers: Optional[str] = Query(default=None, description="Comma-separated providers to run (default: all)")
 ):
     """Combined search endpoint with caching."""
     try:
@@ -279,7 +280,8 @@ async def combined_search_endpoint(
         })
         
         # Perform combined search
-        response, headers = await search_with_cache_headers(query, k)
+        selected = [p.strip() for p in providers.split(",") if p.strip()] if providers else None
+        response, headers = await search_with_cache_headers(query, k, providers=selected)
         
         # Convert to response format
         result_responses = []
@@ -170,7 +170,7 @@ class RetrievalWarmup:
         """Warmup web search APIs."""
         try:
             import os
-            import requests
+            from shared.core.http_client_registry import http_client_registry
             
             # Check API availability without making actual searches
             brave_key = os.getenv("BRAVE_SEARCH_API_KEY")
@@ -182,7 +182,7 @@ class RetrievalWarmup:
                 # Test Brave API connectivity
                 headers = {"X-Subscription-Token": brave_key}
                 params = {"q": "test", "count": 1}
-                response = requests.get(
+                response = http_client_registry.sync_session().get(
                     "https://api.search.brave.com/res/v1/web/search",
                     headers=headers,
                     params=params,
@@ -197,7 +197,7 @@ class RetrievalWarmup:
                     "api_key": serpapi_key,
                     "num": 1
                 }
-                response = requests.get(
+                response = http_client_registry.sync_session().get(
                     "https://serpapi.com/search.json",
                     params=params,
                     timeout=5
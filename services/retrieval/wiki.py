@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import Any, Dict, List
 
-import requests
+from shared.core.http_client_registry import http_client_registry
 
 
 WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
@@ -76,7 +76,7 @@ def search_wikipedia(query: str, top_k: int = 5, timeout_seconds: float = 8.0) -
     }
 
     try:
-        resp = requests.get(WIKIPEDIA_API_URL, params=params, timeout=timeout_seconds)
+        resp = http_client_registry.sync_session().get(WIKIPEDIA_API_URL, params=params, timeout=timeout_seconds)
         if not resp.ok:
             return []
         data = resp.json() or {}
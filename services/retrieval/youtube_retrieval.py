@@ -28,6 +28,8 @@ import aiohttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from shared.core.http_client_registry import http_client_registry
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -124,7 +126,7 @@ class YouTubeRetrieval:
         if self.session is not None:
             return
             
-        self.session = aiohttp.ClientSession(
+        self.session = http_client_registry.aiohttp_session(
             headers={"User-Agent": "SarvanOM/1.0 (YouTube Retrieval)"},
             timeout=aiohttp.ClientTimeout(total=5)
         )
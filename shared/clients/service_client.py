@@ -14,6 +14,8 @@ from pydantic import BaseModel
 
 from shared.models.crud_models import CRUDResponse, PaginationParams, FilterParams
 from shared.contracts.service_contracts import ServiceType, ServiceStatus, ServiceHealth
+from shared.core.http_client_registry import http_client_registry
+from shared.core.request_deadline import DeadlineExceededError, deadline_headers, effective_timeout
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +35,7 @@ class ServiceClient:
     
     def __init__(self, config: ServiceClientConfig):
         self.config = config
-        self.client = httpx.AsyncClient(
+        self.client = http_client_registry.client(
             base_url=config.base_url,
             timeout=config.timeout,
             headers={
@@ -65,12 +67,18 @@ class ServiceClient:
             retries = self.config.max_retries
         
         for attempt in range(retries + 1):
+            # Forward the remaining request deadline and never wait past it
+            timeout = effective_timeout(float(self.config.timeout))
+            if timeout <= 0:
+                raise DeadlineExceededError(f"{method} {url}", 0.0)
             try:
                 response = await self.client.request(
                     method=method,
                     url=url,
                     json=data,
-                    params=params
+                    params=params,
+                    headers=deadline_headers(),
+                    timeout=timeout
                 )
                 response.raise_for_status()
                 return response.json()
@@ -86,7 +94,10 @@ class ServiceClient:
                 logger.warning(f"Request error (attempt {attempt + 1}/{retries + 1}): {e}")
             
             if attempt < retries:
-                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+                delay = self.config.retry_delay * (2 ** attempt)
+                if effective_timeout(delay) < delay:
+                    raise DeadlineExceededError(f"retry of {method} {url}", effective_timeout(delay) * 1000)
+                await asyncio.sleep(delay)
         
         raise Exception(f"Failed to make request after {retries} retries")
     
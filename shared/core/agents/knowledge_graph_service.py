@@ -18,11 +18,26 @@ import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+from shared.core.kg_index import get_entity_index, get_neighbourhood_cache
 from shared.core.services.arangodb_service import arangodb_service, ArangoDBService
 from shared.core.unified_logging import get_logger
 
 logger = get_logger(__name__)
 
+# k-hop neighbourhoods of several seeds; depth and edge types are bind
+# parameters so the plan is reused across calls
+EXPAND_NEIGHBOURHOODS_QUERY = """
+FOR seed IN @seeds
+    LET rows = (
+        FOR v, e, p IN 1..@depth ANY CONCAT('entities/', seed) relationships
+            OPTIONS {bfs: true}
+            FILTER LENGTH(@edge_types) == 0 OR p.edges[*].type ALL IN @edge_types
+            LIMIT @limit
+            RETURN {vertex: v, edge: e}
+    )
+    RETURN {seed: seed, rows: rows}
+"""
+
 @dataclass
 class KnowledgeEntity:
     """Represents a knowledge graph entity."""
@@ -82,6 +97,44 @@ class KnowledgeGraphResult:
         }
 
 
+def _neighbourhood_from_rows(rows: List[Dict[str, Any]]) -> Tuple[List[KnowledgeEntity], List[KnowledgeRelationship]]:
+    """Distinct entities and relationships of traversal rows."""
+    entities = []
+    relationships = []
+    seen_entities = set()
+    seen_edges = set()
+    
+    for row in rows:
+        vertex = row.get("vertex") or {}
+        edge = row.get("edge") or {}
+        
+        # Add entity if not seen
+        entity_id = vertex.get("_key", vertex.get("id", ""))
+        if entity_id and entity_id not in seen_entities:
+            entities.append(KnowledgeEntity(
+                id=entity_id,
+                name=vertex.get("name", ""),
+                type=vertex.get("type", "unknown"),
+                properties={k: v for k, v in vertex.items() 
+                          if k not in ["_key", "_id", "_rev", "id", "name", "type"]}
+            ))
+            seen_entities.add(entity_id)
+        
+        # Add relationship if not seen
+        edge_id = edge.get("_id") or (edge.get("_from"), edge.get("_to"), edge.get("type"))
+        if edge and edge_id not in seen_edges:
+            relationships.append(KnowledgeRelationship(
+                from_entity=edge.get("_from", "").split("/")[-1],
+                to_entity=edge.get("_to", "").split("/")[-1],
+                relationship_type=edge.get("type", "unknown"),
+                properties={k: v for k, v in edge.items() 
+                          if k not in ["_key", "_id", "_rev", "_from", "_to", "type"]}
+            ))
+            seen_edges.add(edge_id)
+    
+    return entities, relationships
+
+
 class KnowledgeGraphService:
     """Production-ready knowledge graph service using ArangoDB."""
     
@@ -117,6 +170,31 @@ class KnowledgeGraphService:
         try:
             service = await self._get_service()
             
+            index = get_entity_index()
+            if index.ready:
+                # Resolve locally, then fetch only the matched documents by key
+                matches = index.lookup(query, limit, types=entity_types)
+                documents = await asyncio.wait_for(
+                    service.hydrate_entities([m.key for m in matches]), timeout=query_timeout
+                )
+                scores = {m.key: m.score for m in matches}
+                entities = [
+                    KnowledgeEntity(
+                        id=doc["id"],
+                        name=doc.get("name") or "",
+                        type=doc.get("type") or "unknown",
+                        properties={k: v for k, v in doc.items() if k not in ["id", "name", "type"]},
+                        confidence=scores[doc["id"]]
+                    )
+                    for doc in documents
+                ]
+                return KnowledgeGraphResult(
+                    entities=entities,
+                    relationships=[],
+                    query_time_ms=(time.time() - query_start) * 1000,
+                    total_results=len(entities)
+                )
+            
             # Build AQL query for entity search
             aql_query = """
             FOR e IN entities
@@ -133,7 +211,7 @@ class KnowledgeGraphService:
             aql_query += " LIMIT @limit RETURN e"
             
             # Execute with timeout
-            results = await service.execute_aql(aql_query, bind_vars, timeout=query_timeout)
+            results = await asyncio.wait_for(service.execute_aql(aql_query, bind_vars), timeout=query_timeout)
             
             # Convert results to entities
             entities = []
@@ -188,87 +266,104 @@ class KnowledgeGraphService:
         Returns:
             KnowledgeGraphResult with relationships and connected entities
         """
+        results = await self.expand_entities([entity_id], relationship_types, depth, limit, timeout)
+        return results[entity_id]
+    
+    async def expand_entities(self, entity_ids: List[str], relationship_types: Optional[List[str]] = None,
+                              depth: int = 2, limit: int = 10,
+                              timeout: Optional[float] = None) -> Dict[str, KnowledgeGraphResult]:
+        """
+        Expand the k-hop neighbourhoods of several entities in one query.
+        
+        Neighbourhoods come from the shared neighbourhood cache where possible;
+        the remaining seeds are traversed together in a single parameterized
+        AQL query, so its plan is cached by ArangoDB across calls.
+        
+        Args:
+            entity_ids: Seed entity IDs
+            relationship_types: Optional filter by relationship types along the path
+            depth: Maximum traversal depth
+            limit: Maximum number of results per entity
+            timeout: Query timeout (default 1.5s)
+            
+        Returns:
+            KnowledgeGraphResult per seed entity ID
+        """
         query_timeout = timeout or self.default_timeout
         query_start = time.time()
+        depth = max(int(depth), 1)
+        seeds = list(dict.fromkeys(entity_ids))
+        cache = get_neighbourhood_cache()
         
-        try:
-            service = await self._get_service()
-            
-            # Build AQL query for relationship traversal
-            aql_query = f"""
-            FOR v, e, p IN 1..{depth} ANY 'entities/{entity_id}' relationships
-            """
-            
-            bind_vars = {"limit": limit}
-            
-            # Add relationship type filter if specified
-            if relationship_types:
-                aql_query += " FILTER e.type IN @relationship_types"
-                bind_vars["relationship_types"] = relationship_types
-            
-            aql_query += " LIMIT @limit RETURN {vertex: v, edge: e, path: p}"
-            
-            # Execute with timeout
-            results = await service.execute_aql(aql_query, bind_vars, timeout=query_timeout)
-            
-            # Process results
-            entities = []
-            relationships = []
-            seen_entities = set()
-            
-            for result in results:
-                vertex = result.get("vertex", {})
-                edge = result.get("edge", {})
-                
-                # Add entity if not seen
-                entity_id = vertex.get("_key", vertex.get("id", ""))
-                if entity_id and entity_id not in seen_entities:
-                    entity = KnowledgeEntity(
-                        id=entity_id,
-                        name=vertex.get("name", ""),
-                        type=vertex.get("type", "unknown"),
-                        properties={k: v for k, v in vertex.items() 
-                                  if k not in ["_key", "_id", "_rev", "id", "name", "type"]}
-                    )
-                    entities.append(entity)
-                    seen_entities.add(entity_id)
-                
-                # Add relationship
-                if edge:
-                    relationship = KnowledgeRelationship(
-                        from_entity=edge.get("_from", "").split("/")[-1],
-                        to_entity=edge.get("_to", "").split("/")[-1],
-                        relationship_type=edge.get("type", "unknown"),
-                        properties={k: v for k, v in edge.items() 
-                                  if k not in ["_key", "_id", "_rev", "_from", "_to", "type"]}
-                    )
-                    relationships.append(relationship)
-            
-            query_time_ms = (time.time() - query_start) * 1000
-            
-            logger.debug(
-                "Relationship search completed",
-                entity_id=entity_id,
-                entity_count=len(entities),
-                relationship_count=len(relationships),
-                query_time_ms=round(query_time_ms, 2)
-            )
-            
-            return KnowledgeGraphResult(
+        rows_by_seed: Dict[str, List[Dict[str, Any]]] = {}
+        misses = []
+        for seed in seeds:
+            rows = cache.get(seed, depth, relationship_types, limit)
+            if rows is None:
+                misses.append(seed)
+            else:
+                rows_by_seed[seed] = rows
+        
+        if misses:
+            try:
+                service = await self._get_service()
+                bind_vars = {
+                    "seeds": misses,
+                    "depth": depth,
+                    "edge_types": list(relationship_types or []),
+                    "limit": limit,
+                }
+                results = await asyncio.wait_for(
+                    service.execute_aql(EXPAND_NEIGHBOURHOODS_QUERY, bind_vars), timeout=query_timeout
+                )
+                for result in results:
+                    rows_by_seed[result["seed"]] = result["rows"]
+                    cache.put(result["seed"], depth, relationship_types, result["rows"], limit)
+            except asyncio.TimeoutError:
+                logger.warning("Relationship search timed out", entity_ids=misses, timeout=query_timeout)
+            except Exception as e:
+                logger.error("Relationship search failed", entity_ids=misses, error=str(e))
+        
+        query_time_ms = (time.time() - query_start) * 1000
+        expanded = {}
+        for seed in seeds:
+            entities, relationships = _neighbourhood_from_rows(rows_by_seed.get(seed, []))
+            expanded[seed] = KnowledgeGraphResult(
                 entities=entities,
                 relationships=relationships,
                 query_time_ms=query_time_ms,
                 total_results=len(entities) + len(relationships)
             )
-            
-        except asyncio.TimeoutError:
-            logger.warning("Relationship search timed out", entity_id=entity_id, timeout=query_timeout)
-            return KnowledgeGraphResult(entities=[], relationships=[], 
-                                      query_time_ms=query_timeout * 1000, total_results=0)
-        except Exception as e:
-            logger.error("Relationship search failed", entity_id=entity_id, error=str(e))
-            return KnowledgeGraphResult(entities=[], relationships=[], 
-                                      query_time_ms=(time.time() - query_start) * 1000, total_results=0)
+        
+        logger.debug(
+            "Neighbourhood expansion completed",
+            seeds=len(seeds),
+            cache_misses=len(misses),
+            query_time_ms=round(query_time_ms, 2)
+        )
+        return expanded
+    
+    async def add_relationship(self, from_entity: str, to_entity: str, relationship_type: str,
+                               properties: Optional[Dict[str, Any]] = None) -> Optional[KnowledgeRelationship]:
+        """
+        Add a relationship between two entities.
+        
+        Cached neighbourhoods the new edge could change are invalidated.
+        
+        Returns:
+            The stored relationship, or None when the write failed
+        """
+        service = await self._get_service()
+        result = await service.create_relationship(from_entity, to_entity, relationship_type, properties or {})
+        if result is None:
+            return None
+        get_neighbourhood_cache().invalidate([from_entity, to_entity])
+        return KnowledgeRelationship(
+            from_entity=from_entity,
+            to_entity=to_entity,
+            relationship_type=relationship_type,
+            properties=properties or {}
+        )
     
     async def query_context_for_synthesis(self, query: str, max_results: int = 10,
                                          timeout: Optional[float] = None) -> Dict[str, Any]:
@@ -308,25 +403,18 @@ class KnowledgeGraphService:
                 remaining_timeout = query_timeout - ((time.time() - context_start))
                 if remaining_timeout > 0.1:  # At least 100ms left
                     
-                    # Get relationships for first few entities
-                    for entity in entity_result.entities[:3]:
-                        try:
-                            rel_result = await self.find_relationships(
-                                entity.id, limit=3, timeout=remaining_timeout / 3
-                            )
-                            
-                            for rel in rel_result.relationships:
-                                if len(context_items) < max_results:
-                                    context_items.append({
-                                        "type": "relationship",
-                                        "content": f"{rel.from_entity} --{rel.relationship_type}--> {rel.to_entity}",
-                                        "metadata": rel.properties,
-                                        "confidence": rel.confidence
-                                    })
-                                    
-                        except Exception as e:
-                            logger.debug("Failed to get relationships", entity_id=entity.id, error=str(e))
-                            continue
+                    # Expand the first few entities together
+                    seeds = [entity.id for entity in entity_result.entities[:3]]
+                    expanded = await self.expand_entities(seeds, limit=3, timeout=remaining_timeout)
+                    for seed in seeds:
+                        for rel in expanded[seed].relationships:
+                            if len(context_items) < max_results:
+                                context_items.append({
+                                    "type": "relationship",
+                                    "content": f"{rel.from_entity} --{rel.relationship_type}--> {rel.to_entity}",
+                                    "metadata": rel.properties,
+                                    "confidence": rel.confidence
+                                })
             
             context_time_ms = (time.time() - context_start) * 1000
             
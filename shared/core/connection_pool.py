@@ -42,6 +42,7 @@ POOL_TIMEOUT = float(os.getenv("CONNECTION_POOL_TIMEOUT", "30.0"))
 MAX_KEEPALIVE_TIME = int(os.getenv("MAX_KEEPALIVE_TIME", "300"))  # 5 minutes
 
 # Service URLs - All configurable via environment variables
+from shared.core.http_client_registry import http_client_registry
 from shared.core.config.central_config import (
     get_vector_db_url,
     get_redis_url,
@@ -202,21 +203,12 @@ class ConnectionPoolManager:
 
             logger.info("Initializing connection pools...")
 
-            # Initialize HTTP session with connection pooling
-            connector = aiohttp.TCPConnector(
-                limit=POOL_SIZE,
-                limit_per_host=POOL_SIZE,
-                ttl_dns_cache=300,
-                keepalive_timeout=MAX_KEEPALIVE_TIME,
-                enable_cleanup_closed=True,
-            )
-
+            # HTTP sessions share the process-wide pooled connector (per-host limits, DNS cache)
             timeout = aiohttp.ClientTimeout(
                 total=POOL_TIMEOUT, connect=5.0, sock_read=POOL_TIMEOUT
             )
 
-            self._http_session = aiohttp.ClientSession(
-                connector=connector,
+            self._http_session = http_client_registry.aiohttp_session(
                 timeout=timeout,
                 headers={"User-Agent": "UniversalKnowledgePlatform/1.0"},
             )
@@ -234,7 +226,7 @@ class ConnectionPoolManager:
                     if MEILI_MASTER_KEY:
                         headers["Authorization"] = f"Bearer {MEILI_MASTER_KEY}"
                     
-                    self._meilisearch_session = aiohttp.ClientSession(
+                    self._meilisearch_session = http_client_registry.aiohttp_session(
                         timeout=timeout,
                         headers=headers
                     )
@@ -272,11 +264,9 @@ class ConnectionPoolManager:
 
             logger.info("Shutting down connection pools...")
 
-            # Close HTTP session
+            # Close HTTP session (the shared connector is owned by the HTTP client registry)
             if self._http_session:
                 await self._http_session.close()
-                # Wait for connector cleanup
-                await asyncio.sleep(0.25)
 
             # Close Redis pool
             if self._redis_pool:
@@ -411,17 +401,8 @@ class ConnectionPoolManager:
         }
 
         # Add detailed pool information
-        if self._http_session and self._http_session.connector:
-            connector = self._http_session.connector
-            stats["pools"] = {
-                "http": {
-                    "limit": connector.limit,
-                    "limit_per_host": connector.limit_per_host,
-                    "connections": (
-                        len(connector._conns) if hasattr(connector, "_conns") else 0
-                    ),
-                }
-            }
+        if self._http_session:
+            stats["pools"] = {"http": http_client_registry.get_pool_stats()}
 
         if self._redis_pool:
             if "pools" not in stats:
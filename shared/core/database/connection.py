@@ -8,6 +8,7 @@ This module provides a robust database connection manager with:
 - Graceful shutdown handling
 - Support for read replicas
 - Transaction management
+- Lazily created async engines (asyncpg/aiosqlite) for async callers
 
 Authors:
     - Universal Knowledge Platform Engineering Team
@@ -28,6 +29,7 @@ from sqlalchemy import create_engine, text, event
 from sqlalchemy.engine import Engine, Connection
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import (
     OperationalError,
     DisconnectionError,
@@ -43,6 +45,19 @@ logger = structlog.get_logger(__name__)
 
 from shared.core.config.central_config import initialize_config
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to its async driver (postgresql -> asyncpg, sqlite -> aiosqlite)."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
 
 class DatabaseConnectionManager:
     """
@@ -62,6 +77,9 @@ class DatabaseConnectionManager:
         self.config = config or initialize_config()
         self._engines: Dict[str, Engine] = {}
         self._session_factories: Dict[str, sessionmaker] = {}
+        self._urls: Dict[str, str] = {}
+        self._async_engines: Dict[str, AsyncEngine] = {}
+        self._async_session_factories: Dict[str, async_sessionmaker] = {}
         self._health_check_interval = 300  # 5 minutes
         self._last_health_check = 0
         self._is_shutdown = False
@@ -147,6 +165,7 @@ class DatabaseConnectionManager:
             
             # Store engine and create session factory
             self._engines[name] = engine
+            self._urls[name] = url
             self._session_factories[name] = sessionmaker(
                 bind=engine,
                 autocommit=False,
@@ -215,6 +234,47 @@ class DatabaseConnectionManager:
         finally:
             session.close()
 
+    def get_async_engine(self, name: str = "primary") -> AsyncEngine:
+        """Get (creating on first use) the async engine for a database."""
+        if name not in self._async_engines:
+            if name not in self._urls:
+                raise ValueError(f"Database engine '{name}' not found")
+            url = async_database_url(self._urls[name])
+            engine_config: Dict[str, Any] = {"echo": self.config.debug}
+            if not url.startswith("sqlite"):
+                engine_config.update(
+                    pool_size=self.config.database_pool_size,
+                    max_overflow=self.config.database_max_overflow,
+                    pool_timeout=self.config.database_pool_timeout,
+                    pool_pre_ping=True,
+                    pool_recycle=3600,
+                )
+            self._async_engines[name] = create_async_engine(url, **engine_config)
+            logger.info(f"Async database engine '{name}' created successfully")
+        return self._async_engines[name]
+
+    def get_async_session_factory(self, name: str = "primary") -> async_sessionmaker:
+        """Get an async session factory by name."""
+        if name not in self._async_session_factories:
+            self._async_session_factories[name] = async_sessionmaker(
+                bind=self.get_async_engine(name),
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return self._async_session_factories[name]
+
+    @asynccontextmanager
+    async def get_async_session(self, name: str = "primary") -> AsyncGenerator[AsyncSession, None]:
+        """Get an async database session with automatic commit/rollback."""
+        async with self.get_async_session_factory(name)() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Async database session error: {e}")
+                raise
+
     @asynccontextmanager
     async def get_connection(self, name: str = "primary") -> AsyncGenerator[Connection, None]:
         """Get a database connection with automatic cleanup."""
@@ -304,6 +364,13 @@ class DatabaseConnectionManager:
             logger.info("Database health check task stopped")
 
         # Close all engines
+        for name, async_engine in self._async_engines.items():
+            try:
+                await async_engine.dispose()
+                logger.info(f"Async database engine '{name}' disposed")
+            except Exception as e:
+                logger.error(f"Error disposing async database engine '{name}': {e}")
+
         for name, engine in self._engines.items():
             try:
                 engine.dispose()
@@ -0,0 +1,58 @@
+"""
+Request Deadline Ingress Middleware for SarvanOM
+
+Creates the per-request deadline (``shared.core.request_deadline``) when a
+request enters a service, from the configured per-path budget, shortened
+by an upstream ``X-Request-Deadline-Ms`` header.
+"""
+
+import logging
+from typing import Mapping, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from shared.core.request_deadline import DEADLINE_HEADER, RequestDeadline, deadline_scope
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware(BaseHTTPMiddleware):
+    """
+    Creates the request deadline at ingress.
+
+    The per-path budget (or the default) applies; an upstream
+    ``X-Request-Deadline-Ms`` header can shorten it but never extend it.
+    Requests that arrive with no budget left are rejected with 504 before any
+    handler work starts.
+    """
+
+    def __init__(
+        self,
+        app,
+        default_budget_ms: float = 10000.0,
+        path_budgets_ms: Optional[Mapping[str, float]] = None,
+        max_budget_ms: float = 60000.0
+    ):
+        super().__init__(app)
+        self.default_budget_ms = default_budget_ms
+        self.path_budgets_ms = dict(path_budgets_ms or {})
+        self.max_budget_ms = max_budget_ms
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        budget_ms = min(self.path_budgets_ms.get(request.url.path, self.default_budget_ms), self.max_budget_ms)
+        deadline = RequestDeadline.from_header_value(request.headers.get(DEADLINE_HEADER), budget_ms)
+        if deadline is None:
+            deadline = RequestDeadline.after(budget_ms)
+
+        if deadline.expired:
+            logger.warning(f"Rejecting {request.method} {request.url.path}: deadline already exceeded on arrival")
+            return JSONResponse(
+                status_code=504,
+                content={"error": "Request deadline exceeded", "remaining_ms": 0}
+            )
+
+        with deadline_scope(deadline=deadline):
+            request.state.deadline = deadline
+            return await call_next(request)
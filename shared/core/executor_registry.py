@@ -0,0 +1,267 @@
+"""
+Shared Executor Registry for SarvanOM
+
+One process-wide home for the thread pools that blocking work is offloaded
+to from async code, instead of ad-hoc ``asyncio.to_thread`` /
+``run_in_executor(None, ...)`` calls that all shared the loop's unbounded
+default executor.
+
+Features:
+- Separate ``cpu`` and ``io`` pools: CPU-bound calls (embedding encodes,
+  index scoring) cannot starve blocking network or file I/O, and vice versa
+- Each pool is sized (EXECUTOR_CPU_WORKERS / EXECUTOR_IO_WORKERS) and
+  bounded: once ``max_pending`` calls are queued or running, further calls
+  fail fast with ExecutorSaturated instead of queueing without limit
+- Per-pool metrics: active workers, queued calls, queue wait and run time,
+  plus per-call-site counts
+- The io pool also serves the loop's default executor, so remaining
+  ``asyncio.to_thread`` / ``run_in_executor(None, ...)`` calls share its
+  workers and show up in its metrics. They are sized but not bounded:
+  asyncio itself (getaddrinfo) and libraries submit there and cannot
+  handle ExecutorSaturated
+- Context variables (trace context, request deadline) are carried into
+  the worker thread, as with ``asyncio.to_thread``
+
+Usage:
+    embeddings = await executor_registry.run_cpu(model.encode, texts, site="citations.similarity")
+    response = await executor_registry.run_io(session.get, url, timeout=2, site="retrieval.fast_web")
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_SITES = 64
+OTHER_SITE = "(other)"
+DEFAULT_EXECUTOR_SITE = "(default executor)"
+
+
+class ExecutorSaturated(RuntimeError):
+    """The pool already has ``max_pending`` calls queued or running."""
+
+
+@dataclass
+class ExecutorConfig:
+    """Executor registry configuration"""
+    cpu_workers: int = 0        # 0: one per available core
+    io_workers: int = 0         # 0: min(32, cores + 4), like ThreadPoolExecutor
+    cpu_max_pending: int = 0    # 0: 8 per worker
+    io_max_pending: int = 0     # 0: 8 per worker
+    install_default: bool = True
+
+    @classmethod
+    def from_environment(cls) -> "ExecutorConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            cpu_workers=int(os.getenv("EXECUTOR_CPU_WORKERS", "0")),
+            io_workers=int(os.getenv("EXECUTOR_IO_WORKERS", "0")),
+            cpu_max_pending=int(os.getenv("EXECUTOR_CPU_MAX_PENDING", "0")),
+            io_max_pending=int(os.getenv("EXECUTOR_IO_MAX_PENDING", "0")),
+            install_default=os.getenv("EXECUTOR_INSTALL_DEFAULT", "true").lower() == "true",
+        )
+
+
+class _PoolExecutor(ThreadPoolExecutor):
+    """Thread pool owned by the registry; a closing event loop does not shut it down"""
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        # asyncio.run() shuts down the loop's default executor on exit
+        pass
+
+    def close(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+class OffloadPool:
+    """A bounded, instrumented thread pool for one kind of blocking work"""
+
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor = _PoolExecutor(max_workers=workers, thread_name_prefix=f"offload-{name}")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.submitted_total = 0
+        self.completed_total = 0
+        self.failed_total = 0
+        self.rejected_total = 0
+        self.wait_s_total = 0.0
+        self.max_wait_s = 0.0
+        self.run_s_total = 0.0
+        self._sites: Dict[str, Dict[str, float]] = {}
+
+    async def run(self, fn: Callable[..., Any], *args, site: Optional[str] = None, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on this pool and await its result"""
+        return await asyncio.wrap_future(self.submit(fn, *args, site=site, **kwargs))
+
+    def submit(self, fn: Callable[..., Any], *args, site: Optional[str] = None, **kwargs) -> Future:
+        """Submit ``fn`` and return its concurrent future; raises ExecutorSaturated when full"""
+        return self._submit(functools.partial(fn, *args, **kwargs), site or _site_of(fn), bounded=True)
+
+    def _submit(self, call: Callable[[], Any], site: str, bounded: bool) -> Future:
+        with self._lock:
+            if bounded and self._pending >= self.max_pending:
+                self.rejected_total += 1
+                raise ExecutorSaturated(
+                    f"{self.name} executor saturated ({self._pending} calls pending, max {self.max_pending})"
+                )
+            self._pending += 1
+            self.submitted_total += 1
+        context = contextvars.copy_context()
+        try:
+            future = self.executor.submit(context.run, self._timed, call, site, time.perf_counter())
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        # Runs on completion and on cancellation before start, so the bound never leaks
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed(self, call: Callable[[], Any], site: str, submitted_at: float) -> Any:
+        started = time.perf_counter()
+        wait = started - submitted_at
+        with self._lock:
+            self._active += 1
+            self.wait_s_total += wait
+            self.max_wait_s = max(self.max_wait_s, wait)
+        failed = False
+        try:
+            return call()
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._active -= 1
+                self.completed_total += 1
+                self.failed_total += failed
+                self.run_s_total += elapsed
+                if site not in self._sites and len(self._sites) >= MAX_SITES:
+                    site = OTHER_SITE
+                stats = self._sites.setdefault(site, {"calls": 0, "run_s": 0.0})
+                stats["calls"] += 1
+                stats["run_s"] += elapsed
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed_total + self._active
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                # Everything waiting for a thread, including default-executor (to_thread) calls
+                "backlog": self.executor._work_queue.qsize(),
+                "submitted_total": self.submitted_total,
+                "completed_total": self.completed_total,
+                "failed_total": self.failed_total,
+                "rejected_total": self.rejected_total,
+                "avg_wait_ms": round(self.wait_s_total / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self.max_wait_s * 1000, 3),
+                "run_s_total": round(self.run_s_total, 6),
+                "sites": {site: dict(stats) for site, stats in self._sites.items()},
+            }
+
+
+class _DefaultExecutor(ThreadPoolExecutor):
+    """The loop's default executor: runs on a pool with its accounting, exempt from its bound
+
+    Subclasses ThreadPoolExecutor only because set_default_executor requires
+    one; it never starts threads of its own.
+    """
+
+    def __init__(self, pool: OffloadPool):
+        super().__init__(max_workers=1)
+        self.pool = pool
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        return self.pool._submit(functools.partial(fn, *args, **kwargs), DEFAULT_EXECUTOR_SITE, bounded=False)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        # asyncio.run() shuts down the loop's default executor on exit; the pool outlives the loop
+        pass
+
+
+def _site_of(fn: Callable[..., Any]) -> str:
+    fn = getattr(fn, "func", fn)
+    module = getattr(fn, "__module__", None) or ""
+    name = getattr(fn, "__qualname__", None) or type(fn).__name__
+    return f"{module}.{name}" if module else name
+
+
+class ExecutorRegistry:
+    """Process-wide cpu and io offload pools"""
+
+    def __init__(self, config: Optional[ExecutorConfig] = None):
+        self.config = config or ExecutorConfig.from_environment()
+        cores = _available_cores()
+        cpu_workers = self.config.cpu_workers or cores
+        io_workers = self.config.io_workers or min(32, cores + 4)
+        self.pools: Dict[str, OffloadPool] = {
+            "cpu": OffloadPool("cpu", cpu_workers, self.config.cpu_max_pending or 8 * cpu_workers),
+            "io": OffloadPool("io", io_workers, self.config.io_max_pending or 8 * io_workers),
+        }
+
+    @property
+    def cpu(self) -> OffloadPool:
+        return self.pools["cpu"]
+
+    @property
+    def io(self) -> OffloadPool:
+        return self.pools["io"]
+
+    async def run_cpu(self, fn: Callable[..., Any], *args, site: Optional[str] = None, **kwargs) -> Any:
+        """Run a CPU-bound call (model encode, scoring) off the event loop"""
+        return await self.cpu.run(fn, *args, site=site, **kwargs)
+
+    async def run_io(self, fn: Callable[..., Any], *args, site: Optional[str] = None, **kwargs) -> Any:
+        """Run a blocking I/O call (sync HTTP, files, sync DB drivers) off the event loop"""
+        return await self.io.run(fn, *args, site=site, **kwargs)
+
+    def install_default_executor(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Serve the loop's default executor (``asyncio.to_thread``) from the io pool, sized and counted but unbounded"""
+        if not self.config.install_default:
+            return
+        (loop or asyncio.get_running_loop()).set_default_executor(_DefaultExecutor(self.io))
+        logger.info(
+            f"Executor registry: cpu={self.cpu.workers} workers, io={self.io.workers} workers (default executor)"
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: pool.get_stats() for name, pool in self.pools.items()}
+
+    def shutdown(self, wait: bool = False) -> None:
+        for pool in self.pools.values():
+            pool.executor.close(wait=wait, cancel_futures=not wait)
+
+
+# Global executor registry
+executor_registry = ExecutorRegistry()
+
+
+def get_executor_registry() -> ExecutorRegistry:
+    """Get the global executor registry"""
+    return executor_registry
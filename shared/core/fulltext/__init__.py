@@ -0,0 +1,35 @@
+"""
+Embedded Full-Text Search
+
+In-process BM25F engine used by the retrieval keyword and vector lanes,
+fed by the ingester in shared.core.fulltext.ingest.
+"""
+
+from shared.core.fulltext.analysis import Analyzer, porter_stem
+from shared.core.fulltext.index import (
+    FullTextConfig,
+    FullTextHit,
+    FullTextIndex,
+    fuse_ranked,
+    get_fulltext_index,
+)
+from shared.core.fulltext.ingest import (
+    FullTextIngester,
+    IngestConfig,
+    get_fulltext_ingester,
+    web_result_document,
+)
+
+__all__ = [
+    "Analyzer",
+    "FullTextConfig",
+    "FullTextHit",
+    "FullTextIndex",
+    "FullTextIngester",
+    "IngestConfig",
+    "fuse_ranked",
+    "get_fulltext_index",
+    "get_fulltext_ingester",
+    "porter_stem",
+    "web_result_document",
+]
@@ -0,0 +1,160 @@
+"""
+Text Analysis for the Embedded Full-Text Engine
+
+Tokenizer and Porter stemmer shared by indexing and querying, so both sides
+reduce "indexing", "indexed" and "indexes" to the same term.
+"""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, Optional
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+STOPWORDS: FrozenSet[str] = frozenset("""
+a about an and are as at be but by for from has have how i if in into is it its
+of on or that the their there these this to was were what when where which who
+why will with you your
+""".split())
+
+
+def _is_consonant(word: str, i: int) -> bool:
+    char = word[i]
+    if char in "aeiou":
+        return False
+    if char == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(stem: str) -> int:
+    """Number of vowel-consonant sequences (Porter's m)."""
+    form = "".join("c" if _is_consonant(stem, i) else "v" for i in range(len(stem)))
+    return form.count("vc")
+
+
+def _has_vowel(stem: str) -> bool:
+    return any(not _is_consonant(stem, i) for i in range(len(stem)))
+
+
+def _ends_double_consonant(word: str) -> bool:
+    return len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+
+def _ends_cvc(word: str) -> bool:
+    return (
+        len(word) >= 3
+        and _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+# Suffix rules, longest first; only the longest matching suffix is considered
+_STEP2 = sorted([
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"), ("izer", "ize"),
+    ("abli", "able"), ("alli", "al"), ("entli", "ent"), ("eli", "e"), ("ousli", "ous"),
+    ("ization", "ize"), ("ation", "ate"), ("ator", "ate"), ("alism", "al"), ("iveness", "ive"),
+    ("fulness", "ful"), ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+], key=lambda rule: -len(rule[0]))
+
+_STEP3 = sorted([
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"), ("ical", "ic"),
+    ("ful", ""), ("ness", ""),
+], key=lambda rule: -len(rule[0]))
+
+_STEP4 = sorted([
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment", "ent",
+    "ion", "ou", "ism", "ate", "iti", "ous", "ive", "ize",
+], key=len, reverse=True)
+
+
+def _replace_suffix(word: str, rules, min_measure: int) -> str:
+    for suffix, replacement in rules:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            return stem + replacement if _measure(stem) > min_measure else word
+    return word
+
+
+@lru_cache(maxsize=200_000)
+def porter_stem(word: str) -> str:
+    """Stem an English word with the Porter (1980) algorithm."""
+    if len(word) <= 2 or not word.isascii() or not word.isalpha():
+        return word
+
+    # Step 1a: plurals
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _ends_double_consonant(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c: terminal y
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    word = _replace_suffix(word, _STEP2, 0)
+    word = _replace_suffix(word, _STEP3, 0)
+
+    # Step 4: strip suffixes from long stems
+    for suffix in _STEP4:
+        if word.endswith(suffix):
+            stem = word[:-len(suffix)]
+            if _measure(stem) > 1 and (suffix != "ion" or stem.endswith(("s", "t"))):
+                word = stem
+            break
+
+    # Step 5: tidy terminal e and ll
+    if word.endswith("e"):
+        stem = word[:-1]
+        measure = _measure(stem)
+        if measure > 1 or (measure == 1 and not _ends_cvc(stem)):
+            word = stem
+    if _measure(word) > 1 and _ends_double_consonant(word) and word.endswith("l"):
+        word = word[:-1]
+
+    return word
+
+
+class Analyzer:
+    """Lowercasing tokenizer with stopword removal and stemming."""
+
+    def __init__(
+        self,
+        stopwords: Optional[FrozenSet[str]] = STOPWORDS,
+        stem: bool = True,
+        max_token_length: int = 40
+    ):
+        self.stopwords = stopwords or frozenset()
+        self.stem = stem
+        self.max_token_length = max_token_length
+
+    def analyze(self, text: str) -> List[str]:
+        """Split text into index terms."""
+        if not text:
+            return []
+        terms = []
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            if token in self.stopwords or len(token) > self.max_token_length:
+                continue
+            terms.append(porter_stem(token) if self.stem else token)
+        return terms
@@ -0,0 +1,107 @@
+"""
+Dense Vector Search for Full-Text Segments
+
+Each segment can carry one L2-normalized embedding per document. Large
+segments get an IVF (inverted file) coarse quantizer built at write time:
+vectors are clustered with k-means and stored grouped by cluster, so a query
+only scans the ``nprobe`` clusters closest to it. Small segments are scanned
+exactly.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; all-zero rows (docs without a vector) stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def train_ivf(
+    vectors: np.ndarray,
+    nlist: int,
+    iterations: int = 10,
+    sample_size: int = 50000,
+    seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Cluster normalized vectors with spherical k-means.
+
+    Returns:
+        Centroids, row order grouped by cluster, and cluster start offsets
+        into that order (length nlist + 1)
+    """
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), size=min(sample_size, len(vectors)), replace=False)]
+    centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = np.bincount(assignment, minlength=nlist) == 0
+        # Re-seed empty clusters from random sample points
+        sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+        centroids = normalize_rows(sums)
+
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), 65536):
+        assignment[start:start + 65536] = np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+    order = np.argsort(assignment, kind="stable").astype(np.uint32)
+    offsets = np.zeros(nlist + 1, dtype=np.uint64)
+    offsets[1:] = np.cumsum(np.bincount(assignment, minlength=nlist))
+    return centroids.astype(np.float32), order, offsets
+
+
+def dense_top_k(
+    vectors: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    allowed: Optional[np.ndarray] = None,
+    ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    nprobe: int = 8
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-k rows by cosine similarity to a normalized query.
+
+    Args:
+        vectors: Normalized vectors of one segment
+        query: Normalized query vector
+        k: Number of rows to return
+        allowed: Boolean mask of rows that pass filters and are not deleted
+        ivf: (centroids, order, offsets) from train_ivf, or None for an exact scan
+        nprobe: Clusters to scan when ``ivf`` is given
+
+    Returns:
+        Row indices and similarities, best first
+    """
+    if ivf is not None:
+        centroids, order, offsets = ivf
+        probe = np.argsort(-(centroids @ query))[:nprobe]
+        starts = offsets[probe].astype(np.int64)
+        counts = offsets[probe + 1].astype(np.int64) - starts
+        probed = int(counts.sum())
+        if allowed is not None and int(np.count_nonzero(allowed)) <= probed:
+            # Selective filter: scanning every allowed row is cheaper and exact
+            rows = np.flatnonzero(allowed)
+        else:
+            rows = order[np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(probed)].astype(np.int64)
+            if allowed is not None:
+                rows = rows[allowed[rows]]
+        scores = vectors[rows] @ query
+    elif allowed is not None and int(np.count_nonzero(allowed)) < len(vectors) // 4:
+        rows = np.flatnonzero(allowed)
+        scores = vectors[rows] @ query
+    else:
+        scores = vectors @ query
+        rows = np.arange(len(vectors))
+        if allowed is not None:
+            rows, scores = rows[allowed], scores[allowed]
+
+    if len(rows) > k:
+        top = np.argpartition(scores, -k)[-k:]
+        rows, scores = rows[top], scores[top]
+    best = np.argsort(-scores, kind="stable")
+    return rows[best], scores[best]
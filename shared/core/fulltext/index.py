@@ -0,0 +1,940 @@
+"""
+Embedded Full-Text Index
+
+In-process BM25F search over title and body with:
+- Buffered writes flushed into immutable, memory-mapped segments
+- Deletes/updates tracked as per-segment masks in an atomic manifest
+- Background tiered merging that drops deleted docs
+- MaxScore top-k pruning with block-max bounds, so low-idf terms only
+  probe the blocks that hold live candidates
+- Optional per-document embeddings with IVF dense search, and hybrid
+  search that fuses BM25F and dense scores over the same documents
+- Exact-match filter fields pushed down into both scoring paths
+
+Following MAANG/OpenAI/Perplexity standards for retrieval performance.
+"""
+
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from shared.core.fulltext.analysis import Analyzer
+from shared.core.fulltext.dense import dense_top_k, normalize_rows
+from shared.core.fulltext.postings import decode_blocks
+from shared.core.fulltext.segment import SegmentReader, write_segment
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+# Prefix of the unscored terms that index filter field values; the analyzer never emits it
+FILTER_TERM_PREFIX = "\x00"
+
+Filters = Dict[str, Union[str, Sequence[str]]]
+
+
+def filter_term(field_name: str, value: Any) -> str:
+    return f"{FILTER_TERM_PREFIX}{field_name}={str(value).strip().lower()}"
+
+
+@dataclass
+class FullTextConfig:
+    """Full-text index configuration."""
+    index_dir: str = "data/fulltext_index"
+    k1: float = 1.2
+    b_title: float = 0.75
+    b_body: float = 0.75
+    title_weight: float = 2.0
+    body_weight: float = 1.0
+    flush_docs: int = 20000
+    max_segments: int = 8
+    merge_factor: int = 4
+    background_merge: bool = True
+    filter_fields: Tuple[str, ...] = ("domain", "category", "source")
+    ivf_min_docs: int = 5000
+    ivf_nprobe: int = 16
+    hybrid_fusion: str = "rrf"
+    hybrid_alpha: float = 0.5
+    hybrid_candidates: int = 100
+    rrf_k: int = 60
+
+    @classmethod
+    def from_environment(cls) -> "FullTextConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            index_dir=os.getenv("FULLTEXT_INDEX_DIR", "data/fulltext_index"),
+            k1=float(os.getenv("FULLTEXT_BM25_K1", "1.2")),
+            title_weight=float(os.getenv("FULLTEXT_TITLE_WEIGHT", "2.0")),
+            flush_docs=int(os.getenv("FULLTEXT_FLUSH_DOCS", "20000")),
+            max_segments=int(os.getenv("FULLTEXT_MAX_SEGMENTS", "8")),
+            background_merge=os.getenv("FULLTEXT_BACKGROUND_MERGE", "true").lower() == "true",
+            filter_fields=tuple(
+                f.strip() for f in os.getenv("FULLTEXT_FILTER_FIELDS", "domain,category,source").split(",") if f.strip()
+            ),
+            ivf_min_docs=int(os.getenv("FULLTEXT_IVF_MIN_DOCS", "5000")),
+            ivf_nprobe=int(os.getenv("FULLTEXT_IVF_NPROBE", "16")),
+            hybrid_fusion=os.getenv("FULLTEXT_HYBRID_FUSION", "rrf"),
+            hybrid_alpha=float(os.getenv("FULLTEXT_HYBRID_ALPHA", "0.5")),
+            hybrid_candidates=int(os.getenv("FULLTEXT_HYBRID_CANDIDATES", "100")),
+        )
+
+
+@dataclass
+class FullTextHit:
+    """A scored search hit."""
+    doc_id: str
+    score: float
+    fields: Dict[str, Any] = field(default_factory=dict)
+    # Per-side scores of hybrid hits: "lexical" (BM25F) and "dense" (cosine)
+    components: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class _Segment:
+    """A segment reader plus the index-owned state that changes over its life."""
+    reader: SegmentReader
+    deleted: np.ndarray
+    refs: int = 0
+    retired: bool = False
+
+    @property
+    def live_count(self) -> int:
+        return self.reader.doc_count - int(self.deleted.sum())
+
+
+class _WriteBuffer:
+    """Documents added since the last flush."""
+
+    def __init__(self):
+        self.doc_ids: List[Optional[str]] = []
+        self.stored: List[bytes] = []
+        self.len_title: List[int] = []
+        self.len_body: List[int] = []
+        self.term_ids: Dict[str, int] = {}
+        # Flat (term id, local doc, title tf, body tf) quadruples
+        self.postings: List[int] = []
+        self.positions: Dict[str, int] = {}
+        self.vectors: List[Optional[np.ndarray]] = []
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def add(
+        self,
+        doc_id: str,
+        title_terms: List[str],
+        body_terms: List[str],
+        stored: bytes,
+        filter_terms: Sequence[str] = (),
+        vector: Optional[np.ndarray] = None
+    ) -> None:
+        local = len(self.doc_ids)
+        if doc_id in self.positions:
+            # Superseded within the same buffer: drop the old copy at flush time
+            self.doc_ids[self.positions[doc_id]] = None
+        self.positions[doc_id] = local
+        self.doc_ids.append(doc_id)
+        self.stored.append(stored)
+        self.len_title.append(len(title_terms))
+        self.len_body.append(len(body_terms))
+        self.vectors.append(vector)
+        title_counts = Counter(title_terms)
+        body_counts = Counter(body_terms)
+        term_ids = self.term_ids
+        for term in title_counts.keys() | body_counts.keys():
+            term_id = term_ids.setdefault(term, len(term_ids))
+            self.postings.extend((term_id, local, title_counts[term], body_counts[term]))
+        for term in filter_terms:
+            # Zero frequencies: filter terms match but never score
+            self.postings.extend((term_ids.setdefault(term, len(term_ids)), local, 0, 0))
+
+    def remove(self, doc_id: str) -> bool:
+        local = self.positions.pop(doc_id, None)
+        if local is None:
+            return False
+        self.doc_ids[local] = None
+        return True
+
+    def to_segment_arrays(self):
+        """Compact out superseded docs and group postings by term."""
+        live = np.array([d is not None for d in self.doc_ids], dtype=bool)
+        remap = np.cumsum(live) - 1
+        quads = np.array(self.postings, dtype=np.int64).reshape(-1, 4)
+        quads = quads[live[quads[:, 1]]]
+
+        terms = sorted(self.term_ids)
+        rank = np.empty(len(terms), dtype=np.int64)
+        rank[[self.term_ids[t] for t in terms]] = np.arange(len(terms))
+        term_rank = rank[quads[:, 0]]
+        # Docs were appended in order, so a stable sort keeps them sorted per term
+        order = np.argsort(term_rank, kind="stable")
+        term_counts = np.bincount(term_rank, minlength=len(terms))
+        present = term_counts > 0
+        return (
+            [d for d in self.doc_ids if d is not None],
+            [s for s, keep in zip(self.stored, live) if keep],
+            np.array(self.len_title, dtype=np.uint32)[live],
+            np.array(self.len_body, dtype=np.uint32)[live],
+            [t for t, keep in zip(terms, present) if keep],
+            term_counts[present],
+            remap[quads[order, 1]],
+            quads[order, 2],
+            quads[order, 3],
+        )
+
+    def to_vector_arrays(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Normalized embeddings and has-vector flags of the live docs, or (None, None)."""
+        live = [v for d, v in zip(self.doc_ids, self.vectors) if d is not None]
+        dims = {len(v) for v in live if v is not None}
+        if not dims:
+            return None, None
+        matrix = np.zeros((len(live), dims.pop()), dtype=np.float32)
+        has_vector = np.array([v is not None for v in live], dtype=bool)
+        if has_vector.any():
+            matrix[has_vector] = normalize_rows(np.stack([v for v in live if v is not None]))
+        return matrix, has_vector
+
+
+def _blocks_holding(meta: np.ndarray, docs: np.ndarray) -> np.ndarray:
+    """Indices of the blocks whose doc range could contain any of ``docs``."""
+    blocks = np.unique(np.searchsorted(meta["last_doc"], docs))
+    return blocks[blocks < len(meta)]
+
+
+class FullTextIndex:
+    """
+    Segmented BM25F full-text index.
+
+    Writes are buffered and become searchable on commit(). Searches run on a
+    snapshot of segments, so they never block on flushes or merges.
+    """
+
+    def __init__(self, config: Optional[FullTextConfig] = None, analyzer: Optional[Analyzer] = None):
+        self.config = config or FullTextConfig.from_environment()
+        self.analyzer = analyzer or Analyzer()
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = []
+        self._retired: List[_Segment] = []
+        self._buffer = _WriteBuffer()
+        self._generation = 0
+        self._merge_thread: Optional[threading.Thread] = None
+        self._merge_lock = threading.Lock()
+        self._pending_files: set = set()
+        self._closed = False
+        self._dense_dim = 0
+        self.stats = {
+            "searches": 0, "postings_scored": 0, "blocks_skipped": 0, "merges": 0,
+            "dense_searches": 0, "hybrid_searches": 0,
+        }
+
+        os.makedirs(self.config.index_dir, exist_ok=True)
+        self._load_manifest()
+
+    # Persistence -----------------------------------------------------------
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.config.index_dir, MANIFEST_FILE)
+
+    def _load_manifest(self) -> None:
+        path = self._manifest_path()
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self._generation = manifest["generation"]
+        for entry in manifest["segments"]:
+            reader = SegmentReader(os.path.join(self.config.index_dir, entry["name"]))
+            deleted = np.zeros(reader.doc_count, dtype=bool)
+            deleted[entry.get("deleted", [])] = True
+            self._segments.append(_Segment(reader, deleted))
+            self._dense_dim = self._dense_dim or reader.dim
+        logger.info(f"Opened full-text index with {len(self._segments)} segments, {self.doc_count} docs")
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "generation": self._generation,
+            "segments": [
+                {"name": s.reader.name, "deleted": np.flatnonzero(s.deleted).tolist()}
+                for s in self._segments
+            ],
+        }
+        tmp_path = f"{self._manifest_path()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._manifest_path())
+        self._remove_orphan_files()
+
+    def _remove_orphan_files(self) -> None:
+        referenced = {s.reader.name for s in self._segments} | {s.reader.name for s in self._retired}
+        referenced |= self._pending_files
+        for name in os.listdir(self.config.index_dir):
+            if name.endswith(".seg") and name not in referenced:
+                try:
+                    os.remove(os.path.join(self.config.index_dir, name))
+                except OSError:
+                    pass
+
+    def _next_segment_path(self) -> str:
+        self._generation += 1
+        return os.path.join(self.config.index_dir, f"seg_{self._generation:08d}.seg")
+
+    # Writes ----------------------------------------------------------------
+
+    @property
+    def doc_count(self) -> int:
+        """Live documents in committed segments."""
+        return sum(s.live_count for s in self._segments)
+
+    @property
+    def vector_count(self) -> int:
+        """Live documents in committed segments that carry an embedding."""
+        return sum(
+            int((s.reader.has_vector & ~s.deleted).sum())
+            for s in self._segments if s.reader.has_vector is not None
+        )
+
+    def add_document(
+        self,
+        doc_id: str,
+        title: str = "",
+        body: str = "",
+        stored: Optional[Dict[str, Any]] = None,
+        vector: Optional[Sequence[float]] = None
+    ) -> None:
+        """
+        Add or replace a document; searchable after the next commit().
+
+        Stored fields named in ``config.filter_fields`` are also indexed for
+        exact-match filtering. ``vector`` is the document embedding used by
+        dense and hybrid search.
+        """
+        fields = {"id": doc_id, "title": title}
+        fields.update(stored or {})
+        encoded = json.dumps(fields, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        title_terms = self.analyzer.analyze(title)
+        body_terms = self.analyzer.analyze(body)
+        filter_terms = []
+        for name in self.config.filter_fields:
+            value = fields.get(name)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            filter_terms.extend({filter_term(name, v) for v in values if v not in (None, "")})
+        if vector is not None:
+            vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            if vector is not None:
+                if self._dense_dim and len(vector) != self._dense_dim:
+                    raise ValueError(f"Vector has {len(vector)} dimensions, index uses {self._dense_dim}")
+                self._dense_dim = len(vector)
+            self._delete_committed(doc_id)
+            self._buffer.add(doc_id, title_terms, body_terms, encoded, filter_terms, vector)
+            if len(self._buffer) >= self.config.flush_docs:
+                self._flush()
+
+    def add_documents(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Add documents shaped like {"id", "title", "content"/"body", "vector"?, ...}."""
+        count = 0
+        for doc in documents:
+            stored = {k: v for k, v in doc.items() if k not in ("id", "title", "body", "vector")}
+            self.add_document(
+                str(doc["id"]), doc.get("title", ""), doc.get("body") or doc.get("content", ""),
+                stored, doc.get("vector")
+            )
+            count += 1
+        return count
+
+    def delete_document(self, doc_id: str) -> bool:
+        """Delete a document; takes effect for searches after the next commit()."""
+        with self._lock:
+            removed = self._buffer.remove(doc_id)
+            return self._delete_committed(doc_id) or removed
+
+    def _delete_committed(self, doc_id: str) -> bool:
+        for segment in self._segments:
+            local = segment.reader.local_id(doc_id)
+            if local is not None and not segment.deleted[local]:
+                # Copy-on-write so in-flight searches keep a consistent mask
+                deleted = segment.deleted.copy()
+                deleted[local] = True
+                segment.deleted = deleted
+                return True
+        return False
+
+    def commit(self) -> None:
+        """Flush buffered documents and persist deletes."""
+        with self._lock:
+            if len(self._buffer):
+                self._flush()
+            else:
+                self._write_manifest()
+
+    def _ivf_lists(self, doc_count: int) -> int:
+        return int(math.sqrt(doc_count)) if doc_count >= self.config.ivf_min_docs else 0
+
+    def _flush(self) -> None:
+        arrays = self._buffer.to_segment_arrays()
+        vectors, has_vector = self._buffer.to_vector_arrays()
+        doc_ids = arrays[0]
+        self._buffer = _WriteBuffer()
+        if doc_ids:
+            path = self._next_segment_path()
+            start = time.time()
+            write_segment(
+                path, *arrays, vectors=vectors, has_vector=has_vector, ivf_nlist=self._ivf_lists(len(doc_ids))
+            )
+            self._segments.append(_Segment(SegmentReader(path), np.zeros(len(doc_ids), dtype=bool)))
+            logger.debug(f"Flushed {len(doc_ids)} docs to {os.path.basename(path)} in {(time.time() - start) * 1000:.0f}ms")
+        self._write_manifest()
+        self._maybe_merge()
+
+    # Merging ---------------------------------------------------------------
+
+    def _maybe_merge(self) -> None:
+        if len(self._segments) <= self.config.max_segments:
+            return
+        if not self.config.background_merge:
+            self.merge()
+        elif self._merge_thread is None or not self._merge_thread.is_alive():
+            self._merge_thread = threading.Thread(target=self.merge, name="fulltext-merge", daemon=True)
+            self._merge_thread.start()
+
+    def merge(self, force: bool = False) -> bool:
+        """
+        Merge the smallest segments (all of them when ``force``) into one.
+
+        Postings are rewritten without deleted docs. Docs deleted while the
+        merge runs are carried over to the merged segment.
+        """
+        with self._merge_lock:
+            return self._merge(force)
+
+    def _merge(self, force: bool) -> bool:
+        with self._lock:
+            if len(self._segments) < 2 or (not force and len(self._segments) <= self.config.max_segments):
+                return False
+            sources = self._segments if force else sorted(
+                self._segments, key=lambda s: s.live_count
+            )[:self.config.merge_factor]
+            sources = [s for s in self._segments if any(s is src for src in sources)]
+            snapshot_masks = [s.deleted for s in sources]
+            path = self._next_segment_path()
+            self._pending_files.add(os.path.basename(path))
+
+        start = time.time()
+        doc_ids: List[str] = []
+        stored: List[bytes] = []
+        len_title, len_body, remaps = [], [], []
+        dim = max(source.reader.dim for source in sources)
+        vector_parts, flag_parts = [], []
+        for source, deleted in zip(sources, snapshot_masks):
+            live = ~deleted
+            remaps.append(np.where(live, np.cumsum(live) - 1 + len(doc_ids), -1))
+            reader = source.reader
+            doc_ids.extend(d for d, keep in zip(reader.doc_ids, live) if keep)
+            stored.extend(reader.stored_raw(i) for i in np.flatnonzero(live))
+            len_title.append(reader.len_title[live])
+            len_body.append(reader.len_body[live])
+            if dim and reader.dim:
+                vector_parts.append(reader.vectors[live])
+                flag_parts.append(reader.has_vector[live])
+            elif dim:
+                vector_parts.append(np.zeros((int(live.sum()), dim), dtype=np.float32))
+                flag_parts.append(np.zeros(int(live.sum()), dtype=bool))
+
+        # Concatenate every source's postings, then regroup by merged term order
+        terms = sorted(set().union(*(source.reader.terms for source in sources)))
+        term_rank = {term: i for i, term in enumerate(terms)}
+        rank_parts, doc_parts, title_parts, body_parts = [], [], [], []
+        for source, remap in zip(sources, remaps):
+            term_counts, docs, tf_title, tf_body = source.reader.all_postings()
+            ranks = np.array([term_rank[t] for t in source.reader.terms], dtype=np.int64)
+            new_docs = remap[docs]
+            keep = new_docs >= 0
+            rank_parts.append(np.repeat(ranks, term_counts)[keep])
+            doc_parts.append(new_docs[keep])
+            title_parts.append(tf_title[keep])
+            body_parts.append(tf_body[keep])
+        if doc_ids:
+            ranks = np.concatenate(rank_parts)
+            # Sources are concatenated in doc order, so a stable sort keeps docs sorted per term
+            order = np.argsort(ranks, kind="stable")
+            term_counts = np.bincount(ranks, minlength=len(terms))
+            present = term_counts > 0
+            write_segment(
+                path, doc_ids, stored, np.concatenate(len_title), np.concatenate(len_body),
+                [t for t, keep in zip(terms, present) if keep], term_counts[present],
+                np.concatenate(doc_parts)[order], np.concatenate(title_parts)[order],
+                np.concatenate(body_parts)[order],
+                vectors=np.concatenate(vector_parts) if dim else None,
+                has_vector=np.concatenate(flag_parts) if dim else None,
+                ivf_nlist=self._ivf_lists(len(doc_ids))
+            )
+
+        with self._lock:
+            if self._closed:
+                return False
+            new_segments = []
+            if doc_ids:
+                segment = _Segment(SegmentReader(path), np.zeros(len(doc_ids), dtype=bool))
+                # Carry over deletes that landed during the merge
+                for source, before, remap in zip(sources, snapshot_masks, remaps):
+                    late = np.flatnonzero(source.deleted & ~before)
+                    segment.deleted[remap[late]] = True
+                new_segments.append(segment)
+            first = self._segments.index(sources[0])
+            remaining = [s for s in self._segments if not any(s is src for src in sources)]
+            self._segments = remaining[:first] + new_segments + remaining[first:]
+            for source in sources:
+                source.retired = True
+                self._retired.append(source)
+            self._release_retired()
+            self._pending_files.discard(os.path.basename(path))
+            self._write_manifest()
+            self.stats["merges"] += 1
+        logger.info(
+            f"Merged {len(sources)} segments into {len(doc_ids)} docs in {(time.time() - start) * 1000:.0f}ms"
+        )
+        return True
+
+    def wait_for_merges(self) -> None:
+        thread = self._merge_thread
+        if thread is not None:
+            thread.join()
+
+    def _release_retired(self) -> None:
+        still_open = []
+        for segment in self._retired:
+            if segment.refs == 0:
+                segment.reader.close()
+            else:
+                still_open.append(segment)
+        self._retired = still_open
+
+    # Search ----------------------------------------------------------------
+
+    def _acquire(self) -> List[_Segment]:
+        with self._lock:
+            segments = list(self._segments)
+            for segment in segments:
+                segment.refs += 1
+            return segments
+
+    def _release(self, segments: List[_Segment]) -> None:
+        with self._lock:
+            for segment in segments:
+                segment.refs -= 1
+            if self._retired:
+                self._release_retired()
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        exhaustive: bool = False,
+        filters: Optional[Filters] = None
+    ) -> List[FullTextHit]:
+        """
+        Top-k BM25F search.
+
+        Args:
+            query: Free-text query
+            k: Number of hits
+            exhaustive: Score every matching posting instead of pruning (for verification)
+            filters: Exact-match values per filter field, e.g. {"domain": ["a.org", "b.org"]}
+        """
+        terms = list(dict.fromkeys(self.analyzer.analyze(query)))
+        if not terms or k <= 0:
+            return []
+        segments = self._acquire()
+        try:
+            blocked = self._blocked_masks(segments, filters)
+            top = self._search_segments(segments, terms, k, exhaustive, blocked)
+            return [self._hit(segments, seg_index, doc, score) for score, seg_index, doc in top]
+        finally:
+            self._release(segments)
+
+    def dense_search(
+        self,
+        query_vector: Sequence[float],
+        k: int = 10,
+        filters: Optional[Filters] = None
+    ) -> List[FullTextHit]:
+        """Top-k cosine similarity search over document embeddings."""
+        if k <= 0:
+            return []
+        query = self._normalize_query(query_vector)
+        segments = self._acquire()
+        try:
+            blocked = self._blocked_masks(segments, filters)
+            top = self._dense_segments(segments, query, k, blocked)
+            return [self._hit(segments, seg_index, doc, score) for score, seg_index, doc in top]
+        finally:
+            self._release(segments)
+
+    def hybrid_search(
+        self,
+        query: str,
+        query_vector: Optional[Sequence[float]],
+        k: int = 10,
+        filters: Optional[Filters] = None,
+        fusion: Optional[str] = None,
+        alpha: Optional[float] = None,
+        candidates: Optional[int] = None
+    ) -> List[FullTextHit]:
+        """
+        Lexical and dense retrieval over one segment snapshot, fused into one top-k.
+
+        Both sides see the same documents and the same filters. The union of
+        their top candidates is scored exactly on both sides before fusing, so
+        a document found by only one side still gets its real score from the
+        other.
+
+        Args:
+            query: Free-text query for BM25F
+            query_vector: Query embedding; None degrades to lexical-only
+            k: Number of hits
+            filters: Exact-match values per filter field
+            fusion: "rrf" (reciprocal rank fusion) or "convex" (weighted normalized scores)
+            alpha: Dense weight for convex fusion
+            candidates: Candidates taken from each side before fusion
+        """
+        cfg = self.config
+        fusion = fusion or cfg.hybrid_fusion
+        if fusion not in ("rrf", "convex"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        alpha = cfg.hybrid_alpha if alpha is None else alpha
+        depth = max(candidates or cfg.hybrid_candidates, k)
+        terms = list(dict.fromkeys(self.analyzer.analyze(query)))
+        query_unit = self._normalize_query(query_vector) if query_vector is not None else None
+        if k <= 0 or (not terms and query_unit is None):
+            return []
+
+        segments = self._acquire()
+        try:
+            blocked = self._blocked_masks(segments, filters)
+            found = set()
+            if terms:
+                found.update((seg_index, doc) for _, seg_index, doc in
+                             self._search_segments(segments, terms, depth, False, blocked))
+            if query_unit is not None:
+                found.update((seg_index, doc) for _, seg_index, doc in
+                             self._dense_segments(segments, query_unit, depth, blocked))
+            if not found:
+                return []
+            self.stats["hybrid_searches"] += 1
+
+            # Exact scores for every candidate on both sides
+            keys = sorted(found)
+            lexical = np.zeros(len(keys))
+            dense = np.full(len(keys), np.nan)
+            idf, avg_title, avg_body = self._term_stats(segments, terms)
+            position = 0
+            for seg_index in sorted({s for s, _ in keys}):
+                docs = np.array([d for s, d in keys if s == seg_index], dtype=np.int64)
+                span = slice(position, position + len(docs))
+                reader = segments[seg_index].reader
+                if idf:
+                    lexical[span] = self._score_docs(reader, docs, idf, avg_title, avg_body)
+                if query_unit is not None and reader.dim:
+                    dense[span] = np.where(reader.has_vector[docs], reader.vectors[docs] @ query_unit, np.nan)
+                position += len(docs)
+
+            fused = self._fuse(lexical, dense, fusion, alpha)
+            # Ties go to the later document, as in search()
+            best = np.lexsort((-np.arange(len(keys)), -fused))[:k]
+            hits = []
+            for i in best.tolist():
+                seg_index, doc = keys[i]
+                hit = self._hit(segments, seg_index, doc, float(fused[i]))
+                hit.components = {"lexical": float(lexical[i])}
+                if not np.isnan(dense[i]):
+                    hit.components["dense"] = float(dense[i])
+                hits.append(hit)
+            return hits
+        finally:
+            self._release(segments)
+
+    def _fuse(self, lexical: np.ndarray, dense: np.ndarray, fusion: str, alpha: float) -> np.ndarray:
+        matched = lexical > 0
+        embedded = ~np.isnan(dense)
+        if fusion == "rrf":
+            fused = np.zeros(len(lexical))
+            for scores, present in ((lexical, matched), (dense, embedded)):
+                # Rank 1 is the best score on that side, ties share a rank; absent docs get no contribution
+                ranked = np.sort(scores[present])
+                ranks = 1 + len(ranked) - np.searchsorted(ranked, scores, side="right")
+                fused += np.where(present, 1.0 / (self.config.rrf_k + ranks), 0.0)
+            return fused
+
+        lexical_norm = lexical / lexical.max() if matched.any() else lexical
+        dense_norm = np.zeros(len(dense))
+        if embedded.any():
+            low, high = np.nanmin(dense), np.nanmax(dense)
+            dense_norm[embedded] = (dense[embedded] - low) / (high - low) if high > low else 1.0
+        return alpha * dense_norm + (1 - alpha) * lexical_norm
+
+    def _hit(self, segments: List[_Segment], seg_index: int, doc: int, score: float) -> FullTextHit:
+        fields = segments[seg_index].reader.stored_fields(doc)
+        return FullTextHit(doc_id=fields.get("id", ""), score=score, fields=fields)
+
+    def _normalize_query(self, query_vector: Sequence[float]) -> np.ndarray:
+        query = np.asarray(query_vector, dtype=np.float32)
+        if self._dense_dim and len(query) != self._dense_dim:
+            raise ValueError(f"Query vector has {len(query)} dimensions, index uses {self._dense_dim}")
+        return normalize_rows(query[None, :])[0]
+
+    def _blocked_masks(self, segments: List[_Segment], filters: Optional[Filters]) -> List[np.ndarray]:
+        """Per segment, docs excluded by deletes or by the filters."""
+        if not filters:
+            return [s.deleted for s in segments]
+        unknown = set(filters) - set(self.config.filter_fields)
+        if unknown:
+            raise ValueError(f"Not indexed filter fields: {sorted(unknown)}")
+        masks = []
+        for segment in segments:
+            blocked = segment.deleted.copy()
+            for name, value in filters.items():
+                values = [value] if isinstance(value, str) else list(value)
+                allowed = np.zeros(segment.reader.doc_count, dtype=bool)
+                for v in values:
+                    term = filter_term(name, v)
+                    if segment.reader.doc_frequency(term):
+                        allowed[segment.reader.postings(term)[0]] = True
+                blocked |= ~allowed
+            masks.append(blocked)
+        return masks
+
+    def _term_stats(self, segments: List[_Segment], terms: List[str]) -> Tuple[Dict[str, float], float, float]:
+        """Collection-wide idf of the query terms and average field lengths."""
+        total_docs = sum(s.reader.doc_count for s in segments)
+        if total_docs == 0:
+            return {}, 1.0, 1.0
+        avg_title = max(sum(s.reader.total_len_title for s in segments) / total_docs, 1e-9)
+        avg_body = max(sum(s.reader.total_len_body for s in segments) / total_docs, 1e-9)
+        live_docs = sum(s.live_count for s in segments)
+        idf = {}
+        for term in terms:
+            df = sum(s.reader.doc_frequency(term) for s in segments)
+            if df:
+                idf[term] = math.log(1 + (live_docs - df + 0.5) / (df + 0.5))
+        return idf, avg_title, avg_body
+
+    def _bm25(self, reader: SegmentReader, docs, tf_title, tf_body, weight, avg_title, avg_body) -> np.ndarray:
+        cfg = self.config
+        tf_norm = (
+            cfg.title_weight * tf_title / (1 - cfg.b_title + cfg.b_title * reader.len_title[docs] / avg_title)
+            + cfg.body_weight * tf_body / (1 - cfg.b_body + cfg.b_body * reader.len_body[docs] / avg_body)
+        )
+        return weight * tf_norm * (cfg.k1 + 1) / (cfg.k1 + tf_norm)
+
+    def _score_docs(
+        self,
+        reader: SegmentReader,
+        docs: np.ndarray,
+        idf: Dict[str, float],
+        avg_title: float,
+        avg_body: float
+    ) -> np.ndarray:
+        """Full BM25F scores of specific sorted local docs, decoding only the blocks that hold them."""
+        scores = np.zeros(len(docs))
+        for term, weight in idf.items():
+            found = reader.lookup(term)
+            if found is None:
+                continue
+            meta, data, _ = found
+            posting_docs, tf_title, tf_body = decode_blocks(meta, data, _blocks_holding(meta, docs))
+            positions = np.searchsorted(posting_docs, docs)
+            hit = positions < len(posting_docs)
+            hit[hit] = posting_docs[positions[hit]] == docs[hit]
+            matched = positions[hit]
+            scores[hit] += self._bm25(
+                reader, docs[hit], tf_title[matched], tf_body[matched], weight, avg_title, avg_body
+            )
+        return scores
+
+    def _dense_segments(
+        self,
+        segments: List[_Segment],
+        query: np.ndarray,
+        k: int,
+        blocked: List[np.ndarray]
+    ) -> List[Tuple[float, int, int]]:
+        heap: List[Tuple[float, int, int]] = []
+        for seg_index, segment in enumerate(segments):
+            reader = segment.reader
+            if not reader.dim:
+                continue
+            allowed = reader.has_vector & ~blocked[seg_index]
+            rows, scores = dense_top_k(reader.vectors, query, k, allowed, reader.ivf, self.config.ivf_nprobe)
+            for doc, score in zip(rows.tolist(), scores.tolist()):
+                item = (score, seg_index, doc)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        self.stats["dense_searches"] += 1
+        return sorted(heap, reverse=True)
+
+    def _search_segments(
+        self,
+        segments: List[_Segment],
+        terms: List[str],
+        k: int,
+        exhaustive: bool,
+        blocked: List[np.ndarray]
+    ) -> List[Tuple[float, int, int]]:
+        """Top-k (score, segment index, local doc) by BM25F, best first."""
+        cfg = self.config
+        idf, avg_title, avg_body = self._term_stats(segments, terms)
+        if not idf:
+            return []
+
+        def saturate(tf_norm):
+            return tf_norm * (cfg.k1 + 1) / (cfg.k1 + tf_norm)
+
+        def block_bounds(meta: np.ndarray, weight: float) -> np.ndarray:
+            norm_t = 1 - cfg.b_title + cfg.b_title * meta["min_len_title"] / avg_title
+            norm_b = 1 - cfg.b_body + cfg.b_body * meta["min_len_body"] / avg_body
+            tf_norm = cfg.title_weight * meta["max_tf_title"] / norm_t + cfg.body_weight * meta["max_tf_body"] / norm_b
+            return weight * saturate(tf_norm)
+
+        heap: List[Tuple[float, int, int]] = []  # (score, segment index, local doc)
+        # Largest segments first so the threshold rises early
+        order = sorted(range(len(segments)), key=lambda i: -segments[i].reader.doc_count)
+        for seg_index in order:
+            segment = segments[seg_index]
+            reader = segment.reader
+            lists = []
+            for term, weight in idf.items():
+                found = reader.lookup(term)
+                if found is not None:
+                    meta, data, _ = found
+                    bounds = block_bounds(meta, weight)
+                    lists.append((float(bounds.max()), bounds, meta, data, weight))
+            if not lists:
+                continue
+            # MaxScore: highest-bound lists first; a suffix of low-bound lists can't admit new docs
+            lists.sort(key=lambda item: -item[0])
+            suffix_bounds = np.cumsum([item[0] for item in lists][::-1])[::-1].tolist() + [0.0]
+            excluded = blocked[seg_index]
+
+            cand_docs = np.empty(0, dtype=np.int64)
+            cand_scores = np.empty(0, dtype=np.float64)
+            threshold = heap[0][0] if len(heap) >= k and not exhaustive else -math.inf
+
+            for i, (upper, bounds, meta, data, weight) in enumerate(lists):
+                rest = suffix_bounds[i + 1]
+                if exhaustive or upper + rest > threshold:
+                    # Essential list: new docs may still enter the top-k
+                    candidate_blocks = np.zeros(len(meta), dtype=bool)
+                    candidate_blocks[_blocks_holding(meta, cand_docs)] = True
+                    selected = np.flatnonzero(candidate_blocks | (bounds + rest > threshold))
+                else:
+                    # Non-essential list: only score docs already in contention
+                    if not len(cand_docs):
+                        break
+                    selected = _blocks_holding(meta, cand_docs)
+                self.stats["blocks_skipped"] += len(meta) - len(selected)
+
+                docs, tf_title, tf_body = decode_blocks(meta, data, selected)
+                live = ~excluded[docs]
+                docs, tf_title, tf_body = docs[live], tf_title[live], tf_body[live]
+                self.stats["postings_scored"] += len(docs)
+                scores = self._bm25(reader, docs, tf_title, tf_body, weight, avg_title, avg_body)
+
+                if exhaustive or upper + rest > threshold:
+                    all_docs = np.concatenate([cand_docs, docs])
+                    all_scores = np.concatenate([cand_scores, scores])
+                    cand_docs, inverse = np.unique(all_docs, return_inverse=True)
+                    cand_scores = np.bincount(inverse, weights=all_scores)
+                else:
+                    positions = np.searchsorted(cand_docs, docs)
+                    hit = positions < len(cand_docs)
+                    hit[hit] = cand_docs[positions[hit]] == docs[hit]
+                    cand_scores = cand_scores.copy()
+                    cand_scores[positions[hit]] += scores[hit]
+
+                if not exhaustive and len(cand_scores):
+                    # Partial scores only grow, so the k-th best is a valid lower bound
+                    if len(cand_scores) >= k:
+                        threshold = max(threshold, float(np.partition(cand_scores, -k)[-k]))
+                    contending = cand_scores + rest > threshold
+                    if len(cand_scores) >= k:
+                        # Never drop the current top-k themselves
+                        contending |= cand_scores >= threshold
+                    cand_docs, cand_scores = cand_docs[contending], cand_scores[contending]
+
+            if len(cand_scores) > k:
+                top = np.argpartition(cand_scores, -k)[-k:]
+                cand_docs, cand_scores = cand_docs[top], cand_scores[top]
+            for doc, score in zip(cand_docs.tolist(), cand_scores.tolist()):
+                item = (score, seg_index, doc)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        self.stats["searches"] += 1
+        return sorted(heap, reverse=True)
+
+    # Lifecycle -------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": self.doc_count,
+                "buffered_documents": len(self._buffer),
+                "segments": len(self._segments),
+                "segment_sizes": [s.live_count for s in self._segments],
+                **self.stats,
+            }
+
+    def close(self) -> None:
+        """Commit pending writes, wait for merges and unmap all segments."""
+        self.commit()
+        self.wait_for_merges()
+        with self._lock:
+            self._closed = True
+            for segment in self._segments + self._retired:
+                segment.reader.close()
+            self._segments = []
+            self._retired = []
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return result.get("url") or result.get("metadata", {}).get("url") or str(result.get("id"))
+
+
+def fuse_ranked(ranked_lists: Iterable[Sequence[Dict[str, Any]]], limit: int, rrf_k: int = 60) -> List[Dict[str, Any]]:
+    """Reciprocal rank fusion of result lists from different sources, deduplicated by URL (or id)."""
+    scores: Dict[str, float] = {}
+    first: Dict[str, Dict[str, Any]] = {}
+    for ranked in ranked_lists:
+        for rank, result in enumerate(ranked):
+            key = _result_key(result)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank + 1)
+            first.setdefault(key, result)
+    return [first[key] for key in sorted(scores, key=scores.__getitem__, reverse=True)[:limit]]
+
+
+# Global index instance - lazy initialization
+_fulltext_index: Optional[FullTextIndex] = None
+_fulltext_index_lock = threading.Lock()
+
+
+def get_fulltext_index() -> FullTextIndex:
+    """Get the global full-text index, opened from FULLTEXT_INDEX_DIR on first use."""
+    global _fulltext_index
+    if _fulltext_index is None:
+        with _fulltext_index_lock:
+            if _fulltext_index is None:
+                _fulltext_index = FullTextIndex(FullTextConfig.from_environment())
+    return _fulltext_index
@@ -0,0 +1,182 @@
+"""
+Full-Text Index Ingestion
+
+Feeds documents into the shared full-text index off the request path.
+Lanes hand over what they fetched (web provider results today) with
+``submit()``, which only queues; a debounced background flush embeds the
+batch, then adds and commits it on the cpu pool, so each flush writes one
+segment instead of one per request. Tiered merges keep the segment count
+bounded. The embeddings are what let the vector lane search these
+documents densely; without them the index is lexical only.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from shared.core.fulltext.index import FullTextIndex, get_fulltext_index
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[str], Awaitable[Optional[List[float]]]]
+
+
+@dataclass
+class IngestConfig:
+    """Full-text ingestion configuration."""
+    enabled: bool = True
+    flush_interval_s: float = 5.0
+    max_pending: int = 5000
+    embed: bool = True
+
+    @classmethod
+    def from_environment(cls) -> "IngestConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("FULLTEXT_INGEST_ENABLED", "true").lower() == "true",
+            flush_interval_s=float(os.getenv("FULLTEXT_INGEST_INTERVAL_S", "5")),
+            max_pending=int(os.getenv("FULLTEXT_INGEST_MAX_PENDING", "5000")),
+            embed=os.getenv("FULLTEXT_INGEST_EMBED", "true").lower() == "true",
+        )
+
+
+def web_result_document(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Index document for a web provider result; None when it has no URL or text."""
+    url = result.get("url") or ""
+    content = result.get("content") or result.get("snippet") or ""
+    if not url or not content:
+        return None
+    return {
+        "id": hashlib.md5(url.encode()).hexdigest(),
+        "title": result.get("title") or "",
+        "content": content,
+        "url": url,
+        "domain": result.get("domain") or urlsplit(url).hostname or "",
+        "source": result.get("provider") or result.get("source") or "web",
+        "category": "web",
+        "published_at": result.get("published_at") or "",
+    }
+
+
+class FullTextIngester:
+    """Queues documents and commits them to the full-text index in batches."""
+
+    def __init__(
+        self,
+        index: Optional[FullTextIndex] = None,
+        config: Optional[IngestConfig] = None,
+        embedder: Optional[Embedder] = None
+    ):
+        self._index = index
+        self._embedder = embedder
+        self.config = config or IngestConfig.from_environment()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.ingested_total = 0
+        self.dropped_total = 0
+        self.failed_flushes = 0
+        self.embedded_total = 0
+
+    @property
+    def index(self) -> FullTextIndex:
+        if self._index is None:
+            self._index = get_fulltext_index()
+        return self._index
+
+    def submit(self, documents: Iterable[Optional[Dict[str, Any]]]) -> int:
+        """Queue documents for the next flush; returns how many were queued."""
+        if not self.config.enabled:
+            return 0
+        queued = 0
+        for doc in documents:
+            if doc is None:
+                continue
+            if doc["id"] not in self._pending and len(self._pending) >= self.config.max_pending:
+                self.dropped_total += 1
+                continue
+            self._pending[doc["id"]] = doc
+            queued += 1
+        if queued and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+        return queued
+
+    async def _flush_later(self) -> None:
+        # Keep going while documents are queued: ones submitted during a flush, or a deferred batch
+        while self._pending:
+            await asyncio.sleep(self.config.flush_interval_s)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Add and commit everything queued so far."""
+        if not self._pending:
+            return 0
+        batch: List[Dict[str, Any]] = list(self._pending.values())
+        self._pending.clear()
+        if self.config.embed:
+            await self._embed(batch)
+        from shared.core.executor_registry import ExecutorSaturated, get_executor_registry
+
+        def write() -> int:
+            count = self.index.add_documents(batch)
+            self.index.commit()
+            return count
+
+        try:
+            count = await get_executor_registry().run_cpu(write, site="fulltext.ingest")
+        except ExecutorSaturated:
+            # Nothing was written; keep the batch (newer submissions win) for the next interval
+            self._pending = {**{doc["id"]: doc for doc in batch}, **self._pending}
+            return 0
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.warning(f"Full-text ingestion of {len(batch)} documents failed: {e}")
+            return 0
+        self.ingested_total += count
+        return count
+
+    async def _embed(self, batch: List[Dict[str, Any]]) -> None:
+        """Attach document embeddings; documents left without one are indexed lexically only."""
+        for doc in batch:
+            if doc.get("vector") is not None:
+                continue
+            try:
+                if self._embedder is None:
+                    from shared.core.services.vector_singleton_service import get_vector_singleton_service
+                    self._embedder = get_vector_singleton_service().get_embedding
+                vector = await self._embedder(f"{doc.get('title', '')}\n{doc.get('content', '')}")
+            except Exception as e:
+                logger.debug(f"Document embedding failed, ingesting lexically: {e}")
+                vector = None
+            if vector is None:
+                # The model is unavailable; don't retry it for every document in the batch
+                return
+            doc["vector"] = vector
+            self.embedded_total += 1
+
+    async def close(self) -> None:
+        """Cancel the pending timer and flush what is queued."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "ingested_total": self.ingested_total,
+            "embedded_total": self.embedded_total,
+            "dropped_total": self.dropped_total,
+            "failed_flushes": self.failed_flushes,
+        }
+
+
+# Global ingester instance
+fulltext_ingester = FullTextIngester()
+
+
+def get_fulltext_ingester() -> FullTextIngester:
+    """Get the global full-text ingester."""
+    return fulltext_ingester
@@ -0,0 +1,197 @@
+"""
+Compressed Postings Codec
+
+Postings for a term are split into fixed-size blocks. Each block stores its
+doc-id deltas, title term frequencies and body term frequencies as LEB128
+varints, laid out field by field so blocks decode with a handful of
+vectorized numpy operations. A per-block metadata row records the last doc
+id (for skipping) and the statistics needed for a block-max score bound.
+
+A whole segment is encoded in one pass: the postings of all terms are
+concatenated in term order and blocked together, so the cost does not grow
+with the number of distinct terms.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+BLOCK_SIZE = 128
+
+# Per-block metadata, stored raw in the segment file
+BLOCK_META_DTYPE = np.dtype([
+    ("last_doc", "<u4"),
+    ("count", "<u4"),
+    ("offset", "<u8"),
+    ("length", "<u4"),
+    ("max_tf_title", "<u4"),
+    ("max_tf_body", "<u4"),
+    ("min_len_title", "<u4"),
+    ("min_len_body", "<u4"),
+])
+
+
+def encode_varints(values: np.ndarray) -> Tuple[bytes, np.ndarray]:
+    """
+    Encode non-negative integers as LEB128 varints.
+
+    Returns:
+        Encoded bytes and the encoded length of each value
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    if len(values) == 0:
+        return b"", np.empty(0, dtype=np.int64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    for shift in range(7, 64, 7):
+        nbytes += values >= np.uint64(1 << shift)
+    ends = np.cumsum(nbytes)
+    starts = ends - nbytes
+    out = np.empty(int(ends[-1]), dtype=np.uint8)
+    for j in range(int(nbytes.max())):
+        mask = nbytes > j
+        byte = (values[mask] >> np.uint64(7 * j)) & np.uint64(0x7F)
+        byte |= np.where(nbytes[mask] > j + 1, np.uint64(0x80), np.uint64(0))
+        out[starts[mask] + j] = byte.astype(np.uint8)
+    return out.tobytes(), nbytes
+
+
+def decode_varints(buf: np.ndarray) -> np.ndarray:
+    """Decode a uint8 array of LEB128 varints into int64 values."""
+    if len(buf) == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = np.flatnonzero((buf & 0x80) == 0)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    group = np.repeat(np.arange(len(ends)), ends - starts + 1)
+    shift = (np.arange(len(buf)) - starts[group]) * 7
+    return np.add.reduceat((buf & 0x7F).astype(np.int64) << shift, starts)
+
+
+def encode_postings(
+    term_counts: np.ndarray,
+    docs: np.ndarray,
+    tf_title: np.ndarray,
+    tf_body: np.ndarray,
+    len_title: np.ndarray,
+    len_body: np.ndarray
+) -> Tuple[np.ndarray, bytes, np.ndarray]:
+    """
+    Encode the postings of every term in a segment.
+
+    Args:
+        term_counts: Number of postings per term, in term order
+        docs: Local doc ids, grouped by term and sorted within each term
+        tf_title: Title frequency per posting
+        tf_body: Body frequency per posting
+        len_title: Title length of every doc in the segment
+        len_body: Body length of every doc in the segment
+
+    Returns:
+        Block metadata for all blocks, the block data, and the index of each
+        term's first block
+    """
+    term_counts = np.asarray(term_counts, dtype=np.int64)
+    n = int(term_counts.sum())
+    term_starts = np.cumsum(term_counts) - term_counts
+    term_blocks = -(-term_counts // BLOCK_SIZE)
+    term_first_block = np.cumsum(term_blocks) - term_blocks
+
+    # Block of each posting, and where each block starts
+    position = np.arange(n) - np.repeat(term_starts, term_counts)
+    block_of = np.repeat(term_first_block, term_counts) + position // BLOCK_SIZE
+    block_starts = np.flatnonzero(np.diff(block_of, prepend=-1))
+    block_counts = np.diff(np.append(block_starts, n))
+
+    # Deltas restart at every term
+    deltas = np.diff(docs, prepend=-1)
+    deltas[term_starts[term_counts > 0]] = docs[term_starts[term_counts > 0]] + 1
+
+    # Lay each block out as [deltas..., title tfs..., body tfs...]
+    within = np.arange(n) - np.repeat(block_starts, block_counts)
+    block_base = np.repeat(3 * block_starts, block_counts)
+    block_size = np.repeat(block_counts, block_counts)
+    values = np.empty(3 * n, dtype=np.int64)
+    values[block_base + within] = deltas
+    values[block_base + block_size + within] = tf_title
+    values[block_base + 2 * block_size + within] = tf_body
+    data, nbytes = encode_varints(values)
+    block_lengths = np.add.reduceat(nbytes, 3 * block_starts) if n else np.empty(0, dtype=np.int64)
+
+    meta = np.zeros(len(block_starts), dtype=BLOCK_META_DTYPE)
+    if n:
+        meta["last_doc"] = docs[block_starts + block_counts - 1]
+        meta["count"] = block_counts
+        meta["length"] = block_lengths
+        meta["offset"] = np.cumsum(block_lengths) - block_lengths
+        meta["max_tf_title"] = np.maximum.reduceat(tf_title, block_starts)
+        meta["max_tf_body"] = np.maximum.reduceat(tf_body, block_starts)
+        meta["min_len_title"] = np.minimum.reduceat(len_title[docs], block_starts)
+        meta["min_len_body"] = np.minimum.reduceat(len_body[docs], block_starts)
+    return meta, data, term_first_block
+
+
+def _decode(selected: np.ndarray, data: np.ndarray, bases: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    offsets = selected["offset"].astype(np.int64)
+    lengths = selected["length"].astype(np.int64)
+    counts = selected["count"].astype(np.int64)
+
+    if np.all(offsets[1:] == offsets[:-1] + lengths[:-1]):
+        raw = data[offsets[0]:offsets[-1] + lengths[-1]]
+    else:
+        byte_starts = np.cumsum(lengths) - lengths
+        raw = data[np.repeat(offsets - byte_starts, lengths) + np.arange(int(lengths.sum()))]
+    values = decode_varints(raw)
+
+    # Split the decoded values back into their per-block fields
+    value_counts = counts * 3
+    relative = np.arange(len(values)) - np.repeat(np.cumsum(value_counts) - value_counts, value_counts)
+    field = relative // np.repeat(counts, value_counts)
+    deltas = values[field == 0]
+    tf_title = values[field == 1]
+    tf_body = values[field == 2]
+
+    # Doc ids are deltas from the previous block's last doc
+    running = np.cumsum(deltas)
+    block_first = np.cumsum(counts) - counts
+    before = np.where(block_first > 0, running[np.maximum(block_first - 1, 0)], 0)
+    docs = running - np.repeat(before, counts) + np.repeat(bases, counts)
+    return docs, tf_title, tf_body
+
+
+def decode_blocks(
+    meta: np.ndarray,
+    data: np.ndarray,
+    blocks: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode a subset of one term's blocks in one pass.
+
+    Args:
+        meta: The term's block metadata
+        data: The segment's block data as a uint8 array
+        blocks: Sorted indices (into ``meta``) of the blocks to decode
+
+    Returns:
+        Doc ids, title frequencies and body frequencies of those blocks
+    """
+    if len(blocks) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    bases = np.where(blocks > 0, meta["last_doc"][np.maximum(blocks - 1, 0)].astype(np.int64), -1)
+    return _decode(meta[blocks], data, bases)
+
+
+def decode_all(
+    meta: np.ndarray,
+    data: np.ndarray,
+    term_first_block: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Decode every posting of a segment, grouped by term like encode_postings' input."""
+    if len(meta) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    first = np.zeros(len(meta), dtype=bool)
+    first[term_first_block] = True
+    previous_last = np.concatenate([[-1], meta["last_doc"][:-1].astype(np.int64)])
+    return _decode(meta, data, np.where(first, -1, previous_last))
@@ -0,0 +1,251 @@
+"""
+Immutable On-Disk Index Segments
+
+A segment is written once and then only read through a memory map. Layout:
+
+    magic (8 bytes) | section table (7 x offset, length as uint64)
+    field lengths   | uint32 title lengths, uint32 body lengths
+    stored fields   | uint64 offsets (n + 1), JSON blobs
+    doc ids         | JSON list of external ids
+    term dictionary | JSON list of sorted terms
+    term entries    | uint64 rows (first block, block count, df)
+    block metadata  | BLOCK_META_DTYPE rows for all terms
+    block data      | varint-encoded postings for all terms
+    vectors         | uint64 dim, uint8 has-vector flags, float32 rows (n x dim)
+    ivf             | uint64 nlist, uint64 list offsets, uint32 row order, float32 centroids
+
+The last two sections are empty for segments without embeddings; the IVF
+section is only written for segments large enough to benefit from it.
+Deletes never touch the file; they are tracked as a mask owned by the index.
+"""
+
+import json
+import mmap
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.core.fulltext.dense import train_ivf
+from shared.core.fulltext.postings import BLOCK_META_DTYPE, decode_all, decode_blocks, encode_postings
+
+MAGIC = b"SVFTSEG3"
+# Segments written before embeddings were supported; readable, without vectors
+LEGACY_MAGIC = b"SVFTSEG2"
+_SECTIONS = 9
+_LEGACY_SECTIONS = 7
+
+
+def _vector_payload(vectors: Optional[np.ndarray], has_vector: Optional[np.ndarray]) -> bytes:
+    if vectors is None:
+        return b""
+    flags = np.asarray(has_vector, dtype=np.uint8).tobytes()
+    head = np.array([vectors.shape[1]], dtype=np.uint64).tobytes() + flags
+    return head + b"\0" * (-len(head) % 4) + np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+
+
+def _ivf_payload(vectors: np.ndarray, has_vector: np.ndarray, nlist: int) -> bytes:
+    rows = np.flatnonzero(has_vector)
+    nlist = min(nlist, len(rows))
+    if nlist < 2:
+        return b""
+    centroids, order, offsets = train_ivf(vectors[rows], nlist)
+    order = rows[order].astype(np.uint32)
+    head = np.array([nlist], dtype=np.uint64).tobytes() + offsets.tobytes() + order.tobytes()
+    return head + centroids.tobytes()
+
+
+def write_segment(
+    path: str,
+    doc_ids: List[str],
+    stored: List[bytes],
+    len_title: np.ndarray,
+    len_body: np.ndarray,
+    terms: Sequence[str],
+    term_counts: np.ndarray,
+    docs: np.ndarray,
+    tf_title: np.ndarray,
+    tf_body: np.ndarray,
+    vectors: Optional[np.ndarray] = None,
+    has_vector: Optional[np.ndarray] = None,
+    ivf_nlist: int = 0
+) -> None:
+    """
+    Write a segment file atomically.
+
+    Args:
+        path: Destination file
+        doc_ids: External id of each local doc
+        stored: JSON-encoded stored fields of each local doc
+        len_title: Title length in terms of each local doc
+        len_body: Body length in terms of each local doc
+        terms: Sorted terms with at least one posting
+        term_counts: Postings per term
+        docs, tf_title, tf_body: Postings grouped by term, docs sorted within each term
+        vectors: Optional L2-normalized embedding of each local doc (zero rows for none)
+        has_vector: Which local docs have an embedding
+        ivf_nlist: Build an IVF quantizer with this many lists (0 for exact scans)
+    """
+    len_title = np.asarray(len_title, dtype=np.uint32)
+    len_body = np.asarray(len_body, dtype=np.uint32)
+    meta, data, term_first_block = encode_postings(term_counts, docs, tf_title, tf_body, len_title, len_body)
+    term_counts = np.asarray(term_counts, dtype=np.int64)
+    entries = np.stack([
+        term_first_block,
+        np.diff(np.append(term_first_block, len(meta))),
+        term_counts,
+    ], axis=1).astype(np.uint64)
+
+    stored_offsets = np.zeros(len(stored) + 1, dtype=np.uint64)
+    if stored:
+        stored_offsets[1:] = np.cumsum([len(s) for s in stored])
+
+    payloads = [
+        len_title.tobytes() + len_body.tobytes(),
+        stored_offsets.tobytes() + b"".join(stored),
+        json.dumps(doc_ids, separators=(",", ":")).encode("utf-8"),
+        json.dumps(list(terms), separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+        entries.tobytes(),
+        meta.tobytes(),
+        data,
+        _vector_payload(vectors, has_vector),
+        _ivf_payload(vectors, has_vector, ivf_nlist) if vectors is not None and ivf_nlist else b"",
+    ]
+
+    header = bytearray(MAGIC)
+    offset = len(MAGIC) + _SECTIONS * 16
+    for payload in payloads:
+        offset += -offset % 8
+        header.extend(np.array([offset, len(payload)], dtype=np.uint64).tobytes())
+        offset += len(payload)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        position = len(header)
+        for payload in payloads:
+            padding = -position % 8
+            f.write(b"\0" * padding)
+            f.write(payload)
+            position += padding + len(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SegmentReader:
+    """Read-only, memory-mapped view of one segment."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._bytes = np.frombuffer(self._mmap, dtype=np.uint8)
+
+        magic = bytes(self._mmap[:len(MAGIC)])
+        if magic not in (MAGIC, LEGACY_MAGIC):
+            raise ValueError(f"{path} is not a full-text segment")
+        count = _SECTIONS if magic == MAGIC else _LEGACY_SECTIONS
+        table = np.frombuffer(self._mmap, dtype=np.uint64, count=count * 2, offset=len(MAGIC))
+        sections = [(int(table[2 * i]), int(table[2 * i + 1])) for i in range(count)]
+        sections += [(0, 0)] * (_SECTIONS - count)
+        (lengths_off, lengths_len), (stored_off, _), (ids_off, ids_len), (terms_off, terms_len), \
+            (entries_off, entries_len), (meta_off, meta_len), (data_off, data_len), \
+            (vectors_off, vectors_len), (ivf_off, ivf_len) = sections
+
+        self.doc_count = lengths_len // 8
+        self.len_title = np.frombuffer(self._mmap, dtype=np.uint32, count=self.doc_count, offset=lengths_off)
+        self.len_body = np.frombuffer(
+            self._mmap, dtype=np.uint32, count=self.doc_count, offset=lengths_off + 4 * self.doc_count
+        )
+        self.total_len_title = int(self.len_title.sum(dtype=np.int64))
+        self.total_len_body = int(self.len_body.sum(dtype=np.int64))
+
+        self._stored_offsets = np.frombuffer(
+            self._mmap, dtype=np.uint64, count=self.doc_count + 1, offset=stored_off
+        )
+        self._stored_base = stored_off + 8 * (self.doc_count + 1)
+
+        self.doc_ids: List[str] = json.loads(self._mmap[ids_off:ids_off + ids_len])
+        self.terms: List[str] = json.loads(self._mmap[terms_off:terms_off + terms_len])
+        self._term_index = {term: i for i, term in enumerate(self.terms)}
+        self._entries = np.frombuffer(
+            self._mmap, dtype=np.uint64, count=entries_len // 8, offset=entries_off
+        ).reshape(-1, 3).astype(np.int64)
+        self._meta = np.frombuffer(
+            self._mmap, dtype=BLOCK_META_DTYPE, count=meta_len // BLOCK_META_DTYPE.itemsize, offset=meta_off
+        )
+        self._data = self._bytes[data_off:data_off + data_len]
+        self._id_index: Optional[Dict[str, int]] = None
+
+        self.dim = 0
+        self.vectors: Optional[np.ndarray] = None
+        self.has_vector: Optional[np.ndarray] = None
+        self.ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        if vectors_len:
+            self.dim = int(np.frombuffer(self._mmap, dtype=np.uint64, count=1, offset=vectors_off)[0])
+            flags_off = vectors_off + 8
+            self.has_vector = self._bytes[flags_off:flags_off + self.doc_count].view(bool)
+            rows_off = flags_off + self.doc_count + (-(8 + self.doc_count) % 4)
+            self.vectors = np.frombuffer(
+                self._mmap, dtype=np.float32, count=self.doc_count * self.dim, offset=rows_off
+            ).reshape(self.doc_count, self.dim)
+        if ivf_len:
+            nlist = int(np.frombuffer(self._mmap, dtype=np.uint64, count=1, offset=ivf_off)[0])
+            offsets = np.frombuffer(self._mmap, dtype=np.uint64, count=nlist + 1, offset=ivf_off + 8)
+            order_off = ivf_off + 8 * (nlist + 2)
+            n_rows = int(offsets[-1])
+            order = np.frombuffer(self._mmap, dtype=np.uint32, count=n_rows, offset=order_off)
+            centroids = np.frombuffer(
+                self._mmap, dtype=np.float32, count=nlist * self.dim, offset=order_off + 4 * n_rows
+            ).reshape(nlist, self.dim)
+            self.ivf = (centroids, order, offsets)
+
+    def lookup(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray, int]]:
+        """Block metadata, segment block data and document frequency of a term."""
+        i = self._term_index.get(term)
+        if i is None:
+            return None
+        first_block, n_blocks, df = self._entries[i]
+        return self._meta[first_block:first_block + n_blocks], self._data, int(df)
+
+    def doc_frequency(self, term: str) -> int:
+        i = self._term_index.get(term)
+        return 0 if i is None else int(self._entries[i][2])
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fully decoded postings of a term."""
+        meta, data, _ = self.lookup(term)
+        return decode_blocks(meta, data, np.arange(len(meta)))
+
+    def all_postings(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Every posting in the segment plus the postings count of each term (in term order)."""
+        docs, tf_title, tf_body = decode_all(self._meta, self._data, self._entries[:, 0])
+        return self._entries[:, 2], docs, tf_title, tf_body
+
+    def stored_raw(self, local_doc: int) -> bytes:
+        start = self._stored_base + int(self._stored_offsets[local_doc])
+        end = self._stored_base + int(self._stored_offsets[local_doc + 1])
+        return self._mmap[start:end]
+
+    def stored_fields(self, local_doc: int) -> Dict[str, Any]:
+        return json.loads(self.stored_raw(local_doc))
+
+    def local_id(self, doc_id: str) -> Optional[int]:
+        """Local doc number of an external id; the lookup table is built on first use."""
+        if self._id_index is None:
+            self._id_index = {d: i for i, d in enumerate(self.doc_ids)}
+        return self._id_index.get(doc_id)
+
+    def close(self) -> None:
+        # numpy views keep the map exported; drop them before closing
+        self.len_title = self.len_body = self._stored_offsets = None
+        self._entries = self._meta = self._data = self._bytes = None
+        self.vectors = self.has_vector = self.ivf = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view; the map is released when it is collected
+            pass
+        self._file.close()
@@ -0,0 +1,681 @@
+"""
+Shared HTTP Client Registry for SarvanOM
+
+One process-wide home for outbound HTTP connection pools, used by every
+provider, lane and feed instead of ad-hoc ``httpx.AsyncClient()`` /
+``aiohttp.ClientSession()`` / ``requests.get`` calls that each paid a fresh
+DNS lookup, TCP connect and TLS handshake.
+
+Features:
+- httpx clients that are cheap views over shared per-host connection pools
+  (per-host and total connection limits, keep-alive, HTTP/2 when ``h2`` is
+  installed)
+- A TTL DNS cache in front of every httpx connect
+- aiohttp sessions sharing one pooled connector with its own DNS cache
+- A pooled ``requests.Session`` for the remaining synchronous call sites
+- Pool warmup at startup for the cold provider hosts
+- Pool metrics: connections in use, requests waiting, connect/TLS latency
+- Upstream overrides (HTTP_UPSTREAM_OVERRIDES) that send a provider host's
+  traffic to another base URL, e.g. the local stubs in
+  load_testing/stub_server.py for offline benchmarks
+"""
+
+import asyncio
+import importlib.util
+import ipaddress
+import logging
+import os
+import socket
+import statistics
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import aiohttp
+import httpcore
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+USER_AGENT = "SarvanOM/1.0"
+
+# Keyless providers on the cold retrieval/feed paths
+DEFAULT_WARMUP_URLS = (
+    "https://en.wikipedia.org",
+    "https://api.duckduckgo.com",
+    "https://api.stackexchange.com",
+    "https://hn.algolia.com",
+    "https://api.gdeltproject.org",
+)
+
+
+@dataclass
+class HTTPPoolConfig:
+    """Connection pool configuration shared by all outbound HTTP clients."""
+    max_connections: int = 200
+    max_connections_per_host: int = 20
+    keepalive_expiry: float = 60.0
+    max_host_pools: int = 256
+    dns_cache_ttl: float = 300.0
+    connect_timeout: float = 5.0
+    default_timeout: float = 5.0
+    http2: bool = True
+    warmup_urls: Tuple[str, ...] = DEFAULT_WARMUP_URLS
+    warmup_timeout: float = 3.0
+    upstream_overrides: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_environment(cls) -> "HTTPPoolConfig":
+        """Create configuration from environment variables."""
+        warmup_urls = os.getenv("HTTP_WARMUP_URLS")
+        return cls(
+            max_connections=int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "200")),
+            max_connections_per_host=int(os.getenv("HTTP_POOL_MAX_PER_HOST", "20")),
+            keepalive_expiry=float(os.getenv("HTTP_POOL_KEEPALIVE_S", "60")),
+            max_host_pools=int(os.getenv("HTTP_POOL_MAX_HOSTS", "256")),
+            dns_cache_ttl=float(os.getenv("HTTP_DNS_CACHE_TTL_S", "300")),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT_S", "5")),
+            default_timeout=float(os.getenv("HTTP_DEFAULT_TIMEOUT_S", "5")),
+            http2=os.getenv("HTTP_POOL_HTTP2", "true").lower() == "true",
+            warmup_urls=tuple(u.strip() for u in warmup_urls.split(",") if u.strip())
+            if warmup_urls is not None else DEFAULT_WARMUP_URLS,
+            warmup_timeout=float(os.getenv("HTTP_WARMUP_TIMEOUT_S", "3")),
+            upstream_overrides=parse_upstream_overrides(os.getenv("HTTP_UPSTREAM_OVERRIDES", "")),
+        )
+
+
+def parse_upstream_overrides(value: str) -> Dict[str, str]:
+    """Parse ``host=base_url,host=base_url`` into a host -> base URL map"""
+    overrides = {}
+    for item in value.split(","):
+        host, sep, base_url = item.partition("=")
+        if sep and host.strip() and base_url.strip():
+            overrides[host.strip().lower()] = base_url.strip().rstrip("/")
+    return overrides
+
+
+class DNSCache:
+    """TTL cache of resolved addresses, with concurrent lookups for a host coalesced."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Resolve ``host`` to a list of IP addresses, served from cache while fresh."""
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            infos = await loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            future.set_result(addresses)
+            return addresses
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a lookup nobody else awaited does not warn
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "ttl_s": self.ttl,
+        }
+
+
+class _CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves hostnames through the shared DNS cache."""
+
+    def __init__(self, inner: httpcore.AsyncNetworkBackend, dns_cache: DNSCache):
+        self._inner = inner
+        self._dns_cache = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+            return await self._inner.connect_tcp(host, port, timeout, local_address, socket_options)
+        except ValueError:
+            pass
+
+        try:
+            addresses = await self._dns_cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._inner.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout, OSError) as e:
+                last_error = e
+        # Every cached address failed - the record may be stale
+        self._dns_cache.invalidate(host, port)
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+@dataclass
+class HostPoolMetrics:
+    """Connection metrics for one upstream host."""
+    host: str
+    requests_total: int = 0
+    connections_opened: int = 0
+    connect_failures: int = 0
+    connect_latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+    tls_latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def summary(self) -> Dict[str, Any]:
+        def p95(samples: Deque[float]) -> float:
+            if len(samples) < 2:
+                return round(samples[0], 2) if samples else 0.0
+            return round(statistics.quantiles(samples, n=20)[18], 2)
+
+        return {
+            "requests_total": self.requests_total,
+            "connections_opened": self.connections_opened,
+            "connect_failures": self.connect_failures,
+            "connection_reuse_ratio": round(
+                1 - self.connections_opened / self.requests_total, 4
+            ) if self.requests_total else 0.0,
+            "connect_latency_avg_ms": round(statistics.mean(self.connect_latency_ms), 2)
+            if self.connect_latency_ms else 0.0,
+            "connect_latency_p95_ms": p95(self.connect_latency_ms),
+            "tls_latency_avg_ms": round(statistics.mean(self.tls_latency_ms), 2)
+            if self.tls_latency_ms else 0.0,
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives back its connection slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """
+    Routes each request to a dedicated keep-alive pool for its host.
+
+    One pool per (scheme, host, port) gives a per-host connection limit on
+    top of httpx's per-pool limits; ``max_connections`` caps requests in
+    flight across all hosts until their response is closed. Closing a
+    client built on this transport is a no-op; pools are owned by the
+    registry.
+    """
+
+    def __init__(self, config: HTTPPoolConfig, dns_cache: DNSCache, metrics: Dict[str, HostPoolMetrics]):
+        self._config = config
+        self._dns_cache = dns_cache
+        self._metrics = metrics
+        self._overrides = {host: httpx.URL(base_url) for host, base_url in config.upstream_overrides.items()}
+        self._pools: "OrderedDict[Tuple[bytes, bytes, int], httpx.AsyncHTTPTransport]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0
+
+    def _create_pool(self) -> httpx.AsyncHTTPTransport:
+        transport = httpx.AsyncHTTPTransport(
+            http2=self._config.http2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=self._config.max_connections_per_host,
+                max_keepalive_connections=self._config.max_connections_per_host,
+                keepalive_expiry=self._config.keepalive_expiry,
+            ),
+        )
+        pool = getattr(transport, "_pool", None)
+        if pool is not None and hasattr(pool, "_network_backend"):
+            pool._network_backend = _CachedDNSBackend(pool._network_backend, self._dns_cache)
+        return transport
+
+    def _pool_for(self, url: httpx.URL) -> httpx.AsyncHTTPTransport:
+        key = (url.raw_scheme, url.raw_host, url.port or (443 if url.raw_scheme == b"https" else 80))
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._create_pool()
+            self._pools[key] = pool
+            while len(self._pools) > self._config.max_host_pools:
+                _, evicted = self._pools.popitem(last=False)
+                asyncio.ensure_future(evicted.aclose())
+        else:
+            self._pools.move_to_end(key)
+        return pool
+
+    def _trace_for(self, host: str, upstream_trace):
+        metrics = self._metrics.get(host)
+        if metrics is None:
+            metrics = self._metrics[host] = HostPoolMetrics(host=host)
+        metrics.requests_total += 1
+        started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name.endswith(".started"):
+                started[event_name[:-8]] = time.perf_counter()
+            elif event_name == "connection.connect_tcp.complete":
+                metrics.connections_opened += 1
+                metrics.connect_latency_ms.append((time.perf_counter() - started.get("connection.connect_tcp", time.perf_counter())) * 1000)
+            elif event_name == "connection.start_tls.complete":
+                metrics.tls_latency_ms.append((time.perf_counter() - started.get("connection.start_tls", time.perf_counter())) * 1000)
+            elif event_name in ("connection.connect_tcp.failed", "connection.start_tls.failed"):
+                metrics.connect_failures += 1
+            if upstream_trace is not None:
+                await upstream_trace(event_name, info)
+
+        return trace
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.extensions["trace"] = self._trace_for(request.url.host, request.extensions.get("trace"))
+        target = self._overrides.get(request.url.host)
+        if target is not None:
+            # Host header keeps the original upstream; only the connection moves
+            request.url = request.url.copy_with(scheme=target.scheme, host=target.host, port=target.port)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._config.max_connections)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            response = await self._pool_for(request.url).handle_async_request(request)
+        except BaseException:
+            self._slots.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self._slots.release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        """Clients share this transport; the registry closes the pools."""
+
+    async def close_pools(self) -> None:
+        pools = list(self._pools.values())
+        self._pools.clear()
+        await asyncio.gather(*(pool.aclose() for pool in pools), return_exceptions=True)
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {}
+        for (_, host, port), transport in self._pools.items():
+            pool = getattr(transport, "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+            waiting = [r for r in getattr(pool, "_requests", []) if r.is_queued()]
+            stats[f"{host.decode('ascii')}:{port}"] = {
+                "connections": len(connections),
+                "in_use": sum(1 for c in connections if not c.is_idle()),
+                "waiting": len(waiting),
+            }
+        return stats
+
+
+class _OverrideAdapter(HTTPAdapter):
+    """requests adapter that sends overridden hosts to their replacement base URL"""
+
+    def __init__(self, overrides: Dict[str, str], **kwargs: Any):
+        super().__init__(**kwargs)
+        self._overrides = {host: urlsplit(base_url) for host, base_url in overrides.items()}
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if self._overrides:
+            url = urlsplit(request.url)
+            target = self._overrides.get(url.hostname or "")
+            if target is not None:
+                request.headers.setdefault("Host", url.netloc)
+                request.url = urlunsplit((target.scheme, target.netloc, url.path, url.query, url.fragment))
+        return super().send(request, **kwargs)
+
+
+class HTTPClientRegistry:
+    """
+    Process-wide registry of pooled outbound HTTP clients.
+
+    ``client()`` and ``aiohttp_session()`` are cheap: they return clients with
+    caller-specific timeouts and headers layered over the shared pools, so
+    call sites keep their ``async with`` / ``aclose()`` patterns without
+    throwing connections away.
+    """
+
+    def __init__(self, config: Optional[HTTPPoolConfig] = None):
+        self.config = config or HTTPPoolConfig.from_environment()
+        self.dns_cache = DNSCache(ttl=self.config.dns_cache_ttl)
+        self._host_metrics: Dict[str, HostPoolMetrics] = {}
+        self._transport: Optional[_SharedTransport] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: set = set()
+        self._sync_session: Optional[requests.Session] = None
+        self._aiohttp_in_flight = 0
+        self._aiohttp_waiting = 0
+        self._warmup_results: Dict[str, bool] = {}
+
+    def _bind_loop(self) -> None:
+        """
+        Pools are bound to an event loop; start fresh ones if the loop changed.
+
+        Calls made outside a running loop (worker threads, constructors) use
+        the current pools. Pools created before any loop ran are adopted by
+        the first loop; pools of a previous loop are closed, not orphaned.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if loop is self._loop:
+            return
+        previous, self._loop = self._loop, loop
+        if previous is None:
+            return
+        transport, connector = self._transport, self._connector
+        self._transport = None
+        self._connector = None
+        if transport is None and connector is None:
+            return
+        closing = self._close_pools(transport, connector)
+        if previous.is_running() and not previous.is_closed():
+            # The old loop lives on in another thread; its pools must close there
+            asyncio.run_coroutine_threadsafe(closing, previous)
+        else:
+            task = loop.create_task(closing)
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_pools(transport: Optional["_SharedTransport"], connector: Optional[aiohttp.TCPConnector]) -> None:
+        try:
+            if transport is not None:
+                await transport.close_pools()
+            if connector is not None and not connector.closed:
+                await connector.close()
+        except Exception as e:  # pools of a closed loop cannot always close cleanly
+            logger.debug(f"Closing retired HTTP pools failed: {e}")
+
+    # -- httpx ------------------------------------------------------------
+
+    def _get_transport(self) -> _SharedTransport:
+        self._bind_loop()
+        if self._transport is None:
+            self._transport = _SharedTransport(self.config, self.dns_cache, self._host_metrics)
+        return self._transport
+
+    def client(
+        self,
+        timeout: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        base_url: str = "",
+        **kwargs: Any
+    ) -> httpx.AsyncClient:
+        """
+        Get an ``httpx.AsyncClient`` backed by the shared connection pools.
+
+        Args:
+            timeout: Request timeout (seconds or ``httpx.Timeout``); defaults to the pool default
+            headers: Default headers for this client
+            base_url: Optional base URL
+            **kwargs: Other ``httpx.AsyncClient`` options (e.g. ``follow_redirects``)
+        """
+        if timeout is None:
+            timeout = httpx.Timeout(self.config.default_timeout, connect=self.config.connect_timeout)
+        client_headers = {"User-Agent": USER_AGENT}
+        client_headers.update(headers or {})
+        return httpx.AsyncClient(
+            transport=self._get_transport(),
+            timeout=timeout,
+            headers=client_headers,
+            base_url=base_url,
+            **kwargs
+        )
+
+    # -- aiohttp ----------------------------------------------------------
+
+    def _get_connector(self) -> aiohttp.TCPConnector:
+        self._bind_loop()
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.config.max_connections,
+                limit_per_host=self.config.max_connections_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=int(self.config.dns_cache_ttl),
+                keepalive_timeout=self.config.keepalive_expiry,
+            )
+        return self._connector
+
+    def _aiohttp_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx: SimpleNamespace, params) -> None:
+            self._aiohttp_in_flight += 1
+            ctx.host = params.url.host or ""
+            metrics = self._host_metrics.get(ctx.host)
+            if metrics is None:
+                metrics = self._host_metrics[ctx.host] = HostPoolMetrics(host=ctx.host)
+            metrics.requests_total += 1
+
+        async def on_request_done(session, ctx: SimpleNamespace, params) -> None:
+            self._aiohttp_in_flight -= 1
+
+        async def on_queued_start(session, ctx, params) -> None:
+            self._aiohttp_waiting += 1
+
+        async def on_queued_end(session, ctx, params) -> None:
+            self._aiohttp_waiting -= 1
+
+        async def on_create_start(session, ctx: SimpleNamespace, params) -> None:
+            ctx.connect_started = time.perf_counter()
+
+        async def on_create_end(session, ctx: SimpleNamespace, params) -> None:
+            metrics = self._host_metrics.get(getattr(ctx, "host", ""))
+            if metrics is not None:
+                metrics.connections_opened += 1
+                metrics.connect_latency_ms.append((time.perf_counter() - ctx.connect_started) * 1000)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_done)
+        trace_config.on_request_exception.append(on_request_done)
+        trace_config.on_connection_queued_start.append(on_queued_start)
+        trace_config.on_connection_queued_end.append(on_queued_end)
+        trace_config.on_connection_create_start.append(on_create_start)
+        trace_config.on_connection_create_end.append(on_create_end)
+        return trace_config
+
+    def aiohttp_session(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        **kwargs: Any
+    ) -> aiohttp.ClientSession:
+        """
+        Get an ``aiohttp.ClientSession`` on the shared pooled connector.
+
+        Closing the session leaves the connector and its connections open.
+        """
+        session_headers = {"User-Agent": USER_AGENT}
+        session_headers.update(headers or {})
+        if self.config.upstream_overrides:
+            kwargs.setdefault("middlewares", (self._aiohttp_override_middleware,))
+        return aiohttp.ClientSession(
+            connector=self._get_connector(),
+            connector_owner=False,
+            headers=session_headers,
+            timeout=timeout or aiohttp.ClientTimeout(
+                total=self.config.default_timeout, connect=self.config.connect_timeout
+            ),
+            trace_configs=[self._aiohttp_trace_config()],
+            **kwargs
+        )
+
+    async def _aiohttp_override_middleware(self, request: aiohttp.ClientRequest, handler) -> aiohttp.ClientResponse:
+        base_url = self.config.upstream_overrides.get(request.url.host or "")
+        if base_url is not None:
+            target = urlsplit(base_url)
+            request.url = request.url.with_scheme(target.scheme).with_host(target.hostname).with_port(target.port)
+        return await handler(request)
+
+    # -- requests ---------------------------------------------------------
+
+    def sync_session(self) -> requests.Session:
+        """Get the pooled ``requests.Session`` for synchronous call sites."""
+        if self._sync_session is None:
+            session = requests.Session()
+            adapter = _OverrideAdapter(
+                self.config.upstream_overrides,
+                pool_connections=self.config.max_host_pools,
+                pool_maxsize=self.config.max_connections_per_host,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            self._sync_session = session
+        return self._sync_session
+
+    # -- lifecycle --------------------------------------------------------
+
+    async def warmup(self, urls: Optional[Sequence[str]] = None, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Pre-resolve DNS and open keep-alive connections to provider hosts.
+
+        Failures are logged and reported, never raised; warmup must not block
+        startup for longer than ``timeout``.
+        """
+        urls = list(urls if urls is not None else self.config.warmup_urls)
+        timeout = timeout if timeout is not None else self.config.warmup_timeout
+        if not urls:
+            return {}
+
+        start = time.perf_counter()
+        client = self.client(timeout=timeout)
+        session = self.aiohttp_session(timeout=aiohttp.ClientTimeout(total=timeout))
+
+        async def warm(url: str) -> bool:
+            try:
+                results = await asyncio.gather(
+                    client.head(url),
+                    session.head(url),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, aiohttp.ClientResponse):
+                        result.release()
+                return any(not isinstance(r, BaseException) for r in results)
+            except Exception as e:
+                logger.debug(f"HTTP pool warmup failed for {url}: {e}")
+                return False
+
+        try:
+            outcomes = await asyncio.wait_for(asyncio.gather(*(warm(u) for u in urls)), timeout=timeout + 1)
+            self._warmup_results = dict(zip(urls, outcomes))
+        except asyncio.TimeoutError:
+            self._warmup_results = {url: False for url in urls}
+        finally:
+            await session.close()
+
+        logger.info(
+            f"HTTP pool warmup: {sum(self._warmup_results.values())}/{len(urls)} hosts ready "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return dict(self._warmup_results)
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._transport is not None:
+            await self._transport.close_pools()
+            self._transport = None
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Pool occupancy, DNS cache and per-host connect latency."""
+        httpx_pools = self._transport.get_pool_stats() if self._transport is not None else {}
+        aiohttp_connections = 0
+        if self._connector is not None and not self._connector.closed:
+            aiohttp_connections = sum(len(c) for c in getattr(self._connector, "_conns", {}).values())
+
+        return {
+            "config": {
+                "max_connections": self.config.max_connections,
+                "max_connections_per_host": self.config.max_connections_per_host,
+                "keepalive_expiry_s": self.config.keepalive_expiry,
+                "http2": self.config.http2 and HTTP2_AVAILABLE,
+            },
+            "in_use": sum(p["in_use"] for p in httpx_pools.values()) + self._aiohttp_in_flight,
+            "waiting": sum(p["waiting"] for p in httpx_pools.values()) + self._aiohttp_waiting
+            + (self._transport.waiting if self._transport is not None else 0),
+            "httpx_pools": httpx_pools,
+            "aiohttp": {
+                "in_flight": self._aiohttp_in_flight,
+                "waiting": self._aiohttp_waiting,
+                "idle_connections": aiohttp_connections,
+            },
+            "dns_cache": self.dns_cache.get_stats(),
+            "hosts": {host: m.summary() for host, m in self._host_metrics.items()},
+            "warmup": dict(self._warmup_results),
+        }
+
+
+# Global registry instance
+http_client_registry = HTTPClientRegistry()
+
+
+def get_http_client_registry() -> HTTPClientRegistry:
+    """Get the global HTTP client registry."""
+    return http_client_registry
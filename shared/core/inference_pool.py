@@ -0,0 +1,658 @@
+"""
+Local Inference Worker Pool - CPU Model Serving for SarvanOM
+============================================================
+
+Runs local HuggingFace model inference in dedicated worker processes so no
+torch code ever executes on a service's event loop:
+- Worker processes pinned to disjoint core sets, with OMP/MKL and
+  ``torch.set_num_threads`` matched to each worker's cores
+- One request queue per model with dynamic batching: a batch closes at
+  ``max_batch_size`` requests or ``max_wait_ms`` after its first request,
+  and grows on its own while the model's workers are busy
+- Each model is loaded only in the worker(s) assigned to it
+- Futures-based async submission; a reader thread resolves results on the
+  submitting event loop
+- Crashed workers are restarted and their in-flight requests failed fast
+- Per-model queue depth, batch size and latency metrics
+
+Task kinds are resolved by import path inside the workers, so handlers must
+live in importable modules. Built-in handlers cover transformers pipelines
+and causal-LM text generation; ``register_task`` adds others.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import statistics
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TASKS: Dict[str, str] = {
+    "text-generation": "shared.core.inference_pool:TextGenerationTask",
+    "summarization": "shared.core.inference_pool:PipelineTask",
+    "translation": "shared.core.inference_pool:PipelineTask",
+    "sentiment-analysis": "shared.core.inference_pool:PipelineTask",
+    "zero-shot-classification": "shared.core.inference_pool:PipelineTask",
+    "token-classification": "shared.core.inference_pool:PipelineTask",
+    "question-answering": "shared.core.inference_pool:PipelineTask",
+}
+
+
+class InferenceError(RuntimeError):
+    """Inference failed in a worker, or the worker exited mid-batch."""
+
+
+class InferenceQueueFull(InferenceError):
+    """The model's request queue is at capacity."""
+
+
+@dataclass
+class InferencePoolConfig:
+    """Inference pool configuration."""
+    enabled: bool = True
+    num_workers: int = 0          # 0: one worker per threads_per_worker cores
+    threads_per_worker: int = 0   # 0: min(4, available cores)
+    workers_per_model: int = 1
+    max_batch_size: int = 8
+    max_wait_ms: float = 10.0
+    max_queue_size: int = 256
+    request_timeout_s: float = 60.0
+    pin_cores: bool = True
+
+    @classmethod
+    def from_environment(cls) -> "InferencePoolConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("HF_INFERENCE_POOL_ENABLED", "true").lower() == "true",
+            num_workers=int(os.getenv("HF_INFERENCE_WORKERS", "0")),
+            threads_per_worker=int(os.getenv("HF_INFERENCE_THREADS_PER_WORKER", "0")),
+            workers_per_model=int(os.getenv("HF_INFERENCE_WORKERS_PER_MODEL", "1")),
+            max_batch_size=int(os.getenv("HF_INFERENCE_MAX_BATCH_SIZE", "8")),
+            max_wait_ms=float(os.getenv("HF_INFERENCE_MAX_WAIT_MS", "10")),
+            max_queue_size=int(os.getenv("HF_INFERENCE_MAX_QUEUE", "256")),
+            request_timeout_s=float(os.getenv("HF_INFERENCE_TIMEOUT_S", "60")),
+            pin_cores=os.getenv("HF_INFERENCE_PIN_CORES", "true").lower() == "true",
+        )
+
+
+def plan_workers(config: InferencePoolConfig, cores: Optional[List[int]] = None) -> List[List[int]]:
+    """Core set of each worker: consecutive, disjoint slices of the available cores."""
+    if cores is None:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    threads = config.threads_per_worker or min(4, len(cores))
+    workers = config.num_workers or max(1, len(cores) // threads)
+    return [[cores[(w * threads + t) % len(cores)] for t in range(threads)] for w in range(workers)]
+
+
+# Worker side ---------------------------------------------------------------
+
+class InferenceTask(ABC):
+    """Loads models and runs batches for one task kind; executes inside workers."""
+
+    # Single-input calls of this task return a list (e.g. [{"summary_text": ...}])
+    wraps_single = False
+
+    def __init__(self, task: str):
+        self.task = task
+
+    @abstractmethod
+    def load(self, model_name: str, options: Dict[str, Any]) -> Any:
+        """Load the model (and anything it needs, such as a tokenizer)."""
+
+    @abstractmethod
+    def run(self, model: Any, inputs: List[Any], params: Dict[str, Any]) -> List[Any]:
+        """One output per input, shaped like the output of a single-input call."""
+
+
+class PipelineTask(InferenceTask):
+    """Any transformers pipeline, batched through the pipeline's own batch_size."""
+
+    def __init__(self, task: str):
+        super().__init__(task)
+        self.wraps_single = task in ("summarization", "translation", "sentiment-analysis")
+
+    def load(self, model_name: str, options: Dict[str, Any]) -> Any:
+        from transformers import pipeline
+        return pipeline(task=self.task, model=model_name, **options)
+
+    def run(self, model: Any, inputs: List[Any], params: Dict[str, Any]) -> List[Any]:
+        if len(inputs) == 1:
+            item = inputs[0]
+            return [model(**item, **params) if isinstance(item, dict) else model(item, **params)]
+        outputs = list(model(inputs, batch_size=len(inputs), **params))
+        return [[out] if self.wraps_single and isinstance(out, dict) else out for out in outputs]
+
+
+class TextGenerationTask(InferenceTask):
+    """Causal-LM sampling with left-padded batches."""
+
+    def load(self, model_name: str, options: Dict[str, Any]) -> Any:
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+        model_options = dict(options)
+        if "torch_dtype" in model_options:
+            model_options["torch_dtype"] = getattr(torch, model_options["torch_dtype"])
+        token = model_options.get("token")
+        model = AutoModelForCausalLM.from_pretrained(model_name, **model_options)
+        model.eval()
+        tokenizer = AutoTokenizer.from_pretrained(model_name, **({"token": token} if token else {}))
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token is None:
+            tokenizer.pad_token = tokenizer.eos_token
+        return model, tokenizer
+
+    def run(self, model: Any, inputs: List[Any], params: Dict[str, Any]) -> List[Any]:
+        import torch
+        lm, tokenizer = model
+        encoded = tokenizer(inputs, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        with torch.inference_mode():
+            outputs = lm.generate(
+                **encoded,
+                max_length=params.get("max_length", 100),
+                temperature=params.get("temperature", 0.7),
+                do_sample=True,
+                pad_token_id=tokenizer.eos_token_id,
+                eos_token_id=tokenizer.eos_token_id
+            )
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+
+def _resolve(path: str):
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class _Runtime:
+    """Model cache and batch execution; lives in a worker (or in-process when the pool is off)."""
+
+    def __init__(self, task_paths: Dict[str, str]):
+        self.task_paths = task_paths
+        self.handlers: Dict[str, InferenceTask] = {}
+        self.models: Dict[Tuple[str, str], Any] = {}
+
+    def handler(self, task: str) -> InferenceTask:
+        if task not in self.handlers:
+            if task not in self.task_paths:
+                raise InferenceError(f"Unknown inference task: {task}")
+            self.handlers[task] = _resolve(self.task_paths[task])(task)
+        return self.handlers[task]
+
+    def model(self, task: str, model_name: str, options: Dict[str, Any]) -> Any:
+        key = (task, model_name)
+        if key not in self.models:
+            self.models[key] = self.handler(task).load(model_name, options)
+        return self.models[key]
+
+    def run(self, task: str, model_name: str, options: Dict[str, Any], items: List[Tuple[Any, Dict[str, Any]]]) -> List[Tuple[bool, Any]]:
+        """(ok, output or error message) per item; items sharing params run as one batch."""
+        handler = self.handler(task)
+        model = self.model(task, model_name, options)
+        results: List[Optional[Tuple[bool, Any]]] = [None] * len(items)
+        groups: Dict[str, List[int]] = {}
+        for i, (_, params) in enumerate(items):
+            groups.setdefault(json.dumps(params, sort_keys=True, default=str), []).append(i)
+        for indices in groups.values():
+            params = items[indices[0]][1]
+            try:
+                outputs = handler.run(model, [items[i][0] for i in indices], params)
+                for i, output in zip(indices, outputs):
+                    results[i] = (True, output)
+            except Exception as e:
+                if len(indices) == 1:
+                    results[indices[0]] = (False, f"{type(e).__name__}: {e}")
+                    continue
+                # Isolate the failing input instead of failing the whole batch
+                for i in indices:
+                    try:
+                        results[i] = (True, handler.run(model, [items[i][0]], params)[0])
+                    except Exception as item_error:
+                        results[i] = (False, f"{type(item_error).__name__}: {item_error}")
+        return results
+
+
+def _configure_worker(cores: List[int], pin: bool) -> None:
+    threads = str(len(cores))
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = threads
+    # Tokenizers' own thread pool would compete with torch for the pinned cores
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    if pin and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, set(cores))
+        except OSError as e:
+            logger.warning(f"Could not pin inference worker to cores {cores}: {e}")
+    try:
+        import torch
+        torch.set_num_threads(len(cores))
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+
+
+def _worker_main(worker_id: int, cores: List[int], pin: bool, task_paths: Dict[str, str], requests, results) -> None:
+    _configure_worker(cores, pin)
+    runtime = _Runtime(task_paths)
+    while True:
+        message = requests.get()
+        if message is None:
+            return
+        batch_id, task, model_name, options, items = message
+        started = time.perf_counter()
+        try:
+            outputs = runtime.run(task, model_name, options, items)
+            results.put((worker_id, batch_id, True, outputs, (time.perf_counter() - started) * 1000))
+        except Exception as e:
+            results.put((worker_id, batch_id, False, f"{type(e).__name__}: {e}", (time.perf_counter() - started) * 1000))
+
+
+# Parent side ---------------------------------------------------------------
+
+@dataclass
+class _Request:
+    inputs: Any
+    params: Dict[str, Any]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class _Batch:
+    batch_id: int
+    model: "_ModelQueue"
+    worker_id: int
+    requests: List[_Request]
+    dispatched_at: float
+    warmup: bool = False
+
+
+@dataclass
+class _Worker:
+    worker_id: int
+    cores: List[int]
+    process: Any = None
+    requests: Any = None
+    in_flight: int = 0
+
+
+@dataclass
+class _ModelQueue:
+    task: str
+    model_name: str
+    options: Dict[str, Any]
+    workers: List[int]
+    queue: asyncio.Queue
+    slots: asyncio.Semaphore
+    batcher: Optional[asyncio.Task] = None
+    requests: int = 0
+    batches: int = 0
+    batched_requests: int = 0
+    errors: int = 0
+    rejected: int = 0
+    queue_wait_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    inference_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+    latency_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    @property
+    def name(self) -> str:
+        return f"{self.task}:{self.model_name}"
+
+
+def _percentile(values: Deque[float], q: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return round(values[0], 2)
+    return round(statistics.quantiles(values, n=100)[int(q) - 1], 2)
+
+
+class InferencePool:
+    """Process pool serving local models behind per-model batching queues."""
+
+    def __init__(self, config: Optional[InferencePoolConfig] = None, tasks: Optional[Dict[str, str]] = None):
+        self.config = config or InferencePoolConfig.from_environment()
+        self.task_paths = dict(DEFAULT_TASKS, **(tasks or {}))
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, _Worker] = {}
+        self._models: Dict[Tuple[str, str], _ModelQueue] = {}
+        self._batches: Dict[int, _Batch] = {}
+        self._next_batch_id = 0
+        self._results = None
+        self._reader: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._local: Optional[_Runtime] = None
+        self.restarts = 0
+
+    @property
+    def started(self) -> bool:
+        return self._loop is not None
+
+    def register_task(self, task: str, handler_path: str) -> None:
+        """Add a task kind, as ``"module:Class"``; must be called before start()."""
+        if self.started:
+            raise RuntimeError("Register tasks before the inference pool starts")
+        self.task_paths[task] = handler_path
+
+    async def start(self) -> None:
+        """Spawn the worker processes (no-op when disabled or already started)."""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            self._loop = asyncio.get_running_loop()
+            if not self.config.enabled:
+                self._local = _Runtime(self.task_paths)
+                return
+            self._results = self._context.Queue()
+            plan = plan_workers(self.config)
+            self._workers = {i: _Worker(worker_id=i, cores=cores) for i, cores in enumerate(plan)}
+            await asyncio.to_thread(lambda: [self._spawn(w) for w in self._workers.values()])
+            self._stopping.clear()
+            self._reader = threading.Thread(target=self._read_results, args=(self._loop,), name="inference-pool-results", daemon=True)
+            self._reader.start()
+            logger.info(f"Inference pool started with {len(plan)} workers, cores {plan}")
+
+    def _spawn(self, worker: _Worker) -> None:
+        worker.requests = self._context.Queue()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(worker.worker_id, worker.cores, self.config.pin_cores, self.task_paths, worker.requests, self._results),
+            name=f"inference-worker-{worker.worker_id}",
+            daemon=True
+        )
+        worker.process.start()
+        worker.in_flight = 0
+
+    async def stop(self) -> None:
+        if not self.started:
+            return
+        for model in self._models.values():
+            if model.batcher is not None:
+                model.batcher.cancel()
+        self._stopping.set()
+        for worker in self._workers.values():
+            worker.requests.put(None)
+        await asyncio.to_thread(self._join_workers)
+        for batch in list(self._batches.values()):
+            self._fail_batch(batch, "Inference pool stopped")
+        self._models.clear()
+        self._workers.clear()
+        self._loop = None
+
+    def _join_workers(self) -> None:
+        for worker in self._workers.values():
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        if self._reader is not None:
+            self._reader.join(timeout=2)
+
+    # Submission ----------------------------------------------------------
+
+    async def submit(
+        self,
+        task: str,
+        model_name: str,
+        inputs: Any,
+        params: Optional[Dict[str, Any]] = None,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run one input through a model and return its output.
+
+        Args:
+            task: Task kind (e.g. "summarization")
+            model_name: Model id
+            inputs: One input (text, or a dict of pipeline arguments)
+            params: Call parameters; requests batch together only with equal params
+            options: Model load options, used when the model is first loaded
+            timeout: Seconds to wait (default request_timeout_s)
+
+        Raises:
+            InferenceError: Inference failed
+            InferenceQueueFull: Too many requests already queued for this model
+        """
+        await self.start()
+        params = params or {}
+        if self._local is not None:
+            results = await asyncio.to_thread(self._local.run, task, model_name, options or {}, [(inputs, params)])
+            return self._unwrap(results[0])
+        model = self._model_queue(task, model_name, options or {})
+        if model.queue.qsize() >= self.config.max_queue_size:
+            model.rejected += 1
+            raise InferenceQueueFull(f"Inference queue for {model.name} is full")
+        future = self._loop.create_future()
+        model.queue.put_nowait(_Request(inputs, params, future, time.perf_counter()))
+        model.requests += 1
+        return await asyncio.wait_for(future, timeout or self.config.request_timeout_s)
+
+    async def load(self, task: str, model_name: str, options: Optional[Dict[str, Any]] = None) -> None:
+        """Load a model in its assigned workers ahead of the first request."""
+        await self.start()
+        if self._local is not None:
+            await asyncio.to_thread(self._local.model, task, model_name, options or {})
+            return
+        model = self._model_queue(task, model_name, options or {})
+        futures = []
+        for worker_id in model.workers:
+            future = self._loop.create_future()
+            futures.append(future)
+            self._dispatch(model, worker_id, [_Request(None, {}, future, time.perf_counter())], warmup=True)
+        await asyncio.gather(*futures)
+
+    @staticmethod
+    def _unwrap(result: Tuple[bool, Any]) -> Any:
+        ok, value = result
+        if not ok:
+            raise InferenceError(value)
+        return value
+
+    def _model_queue(self, task: str, model_name: str, options: Dict[str, Any]) -> _ModelQueue:
+        key = (task, model_name)
+        model = self._models.get(key)
+        if model is None:
+            if task not in self.task_paths:
+                raise InferenceError(f"Unknown inference task: {task}")
+            # Assign the least-loaded workers, so models spread across the pool
+            load = {w: 0 for w in self._workers}
+            for other in self._models.values():
+                for w in other.workers:
+                    load[w] += 1
+            count = max(1, min(self.config.workers_per_model, len(self._workers)))
+            workers = sorted(load, key=lambda w: (load[w], w))[:count]
+            model = _ModelQueue(
+                task=task,
+                model_name=model_name,
+                options=options,
+                workers=workers,
+                queue=asyncio.Queue(),
+                slots=asyncio.Semaphore(len(workers))
+            )
+            model.batcher = asyncio.create_task(self._batch_loop(model), name=f"inference-batcher-{model.name}")
+            self._models[key] = model
+        return model
+
+    async def _batch_loop(self, model: _ModelQueue) -> None:
+        max_wait = self.config.max_wait_ms / 1000
+        while True:
+            first = await model.queue.get()
+            # A free worker first: while all are busy, the queue keeps filling and the next batch grows
+            await model.slots.acquire()
+            batch = [first]
+            deadline = first.enqueued_at + max_wait
+            while len(batch) < self.config.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining > 0:
+                        batch.append(await asyncio.wait_for(model.queue.get(), remaining))
+                    else:
+                        batch.append(model.queue.get_nowait())
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+            live = [r for r in batch if not r.future.done()]
+            if not live:
+                model.slots.release()
+                continue
+            worker_id = min(model.workers, key=lambda w: self._workers[w].in_flight)
+            self._dispatch(model, worker_id, live)
+
+    def _dispatch(self, model: _ModelQueue, worker_id: int, requests: List[_Request], warmup: bool = False) -> None:
+        """Send a batch to a worker; a warmup batch only loads the model and holds no batching slot."""
+        batch_id = self._next_batch_id
+        self._next_batch_id += 1
+        now = time.perf_counter()
+        self._batches[batch_id] = _Batch(batch_id, model, worker_id, requests, now, warmup)
+        worker = self._workers[worker_id]
+        worker.in_flight += 1
+        if warmup:
+            items = []
+        else:
+            items = [(r.inputs, r.params) for r in requests]
+            model.batches += 1
+            model.batched_requests += len(requests)
+            for request in requests:
+                model.queue_wait_ms.append((now - request.enqueued_at) * 1000)
+        worker.requests.put((batch_id, model.task, model.model_name, model.options, items))
+
+    # Completion ----------------------------------------------------------
+
+    def _read_results(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Takes the loop as an argument: stop() clears self._loop while this thread may still run
+        while not self._stopping.is_set():
+            try:
+                message = self._results.get(timeout=0.5)
+            except queue.Empty:
+                dead = [w.worker_id for w in list(self._workers.values()) if w.process is not None and not w.process.is_alive()]
+                if dead and not self._stopping.is_set() and not self._post(loop, self._restart_workers, dead):
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            if not self._post(loop, self._complete, message):
+                return
+
+    @staticmethod
+    def _post(loop: Optional[asyncio.AbstractEventLoop], callback, *args) -> bool:
+        """Schedule a callback on the submitting loop; False once that loop is gone."""
+        if loop is None or loop.is_closed():
+            return False
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Closed between the check and the call
+            return False
+        return True
+
+    def _complete(self, message: Tuple[int, int, bool, Any, float]) -> None:
+        worker_id, batch_id, ok, payload, inference_ms = message
+        batch = self._batches.pop(batch_id, None)
+        if batch is None:
+            return
+        self._release(batch)
+        model = batch.model
+        if batch.warmup:
+            for request in batch.requests:
+                if not request.future.done():
+                    if ok:
+                        request.future.set_result(None)
+                    else:
+                        request.future.set_exception(InferenceError(payload))
+            return
+        model.inference_ms.append(inference_ms)
+        now = time.perf_counter()
+        for i, request in enumerate(batch.requests):
+            result = payload[i] if ok else (False, payload)
+            if not result[0]:
+                model.errors += 1
+            model.latency_ms.append((now - request.enqueued_at) * 1000)
+            if request.future.done():
+                continue
+            if result[0]:
+                request.future.set_result(result[1])
+            else:
+                request.future.set_exception(InferenceError(result[1]))
+
+    def _release(self, batch: _Batch) -> None:
+        worker = self._workers.get(batch.worker_id)
+        if worker is not None:
+            worker.in_flight = max(worker.in_flight - 1, 0)
+        if not batch.warmup:
+            batch.model.slots.release()
+
+    def _fail_batch(self, batch: _Batch, reason: str) -> None:
+        self._batches.pop(batch.batch_id, None)
+        self._release(batch)
+        if not batch.warmup:
+            batch.model.errors += len(batch.requests)
+        for request in batch.requests:
+            if not request.future.done():
+                request.future.set_exception(InferenceError(reason))
+
+    def _restart_workers(self, worker_ids: List[int]) -> None:
+        for worker_id in worker_ids:
+            worker = self._workers.get(worker_id)
+            if worker is None or worker.process.is_alive() or self._stopping.is_set():
+                continue
+            exit_code = worker.process.exitcode
+            logger.error(f"Inference worker {worker_id} exited with code {exit_code}; restarting")
+            for batch in [b for b in self._batches.values() if b.worker_id == worker_id]:
+                self._fail_batch(batch, f"Inference worker exited with code {exit_code}")
+            self._spawn(worker)
+            self.restarts += 1
+
+    # Introspection -------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        models = {}
+        for model in self._models.values():
+            models[model.name] = {
+                "queue_depth": model.queue.qsize(),
+                "requests": model.requests,
+                "batches": model.batches,
+                "avg_batch_size": round(model.batched_requests / model.batches, 2) if model.batches else 0.0,
+                "errors": model.errors,
+                "rejected": model.rejected,
+                "workers": model.workers,
+                "queue_wait_p95_ms": _percentile(model.queue_wait_ms, 95),
+                "inference_p50_ms": _percentile(model.inference_ms, 50),
+                "inference_p95_ms": _percentile(model.inference_ms, 95),
+                "latency_p50_ms": _percentile(model.latency_ms, 50),
+                "latency_p95_ms": _percentile(model.latency_ms, 95),
+            }
+        return {
+            "enabled": self.config.enabled,
+            "started": self.started,
+            "workers": len(self._workers),
+            "workers_alive": sum(1 for w in self._workers.values() if w.process is not None and w.process.is_alive()),
+            "worker_cores": {w.worker_id: w.cores for w in self._workers.values()},
+            "restarts": self.restarts,
+            "models": models,
+        }
+
+
+# Global pool instance - lazy initialization
+_inference_pool: Optional[InferencePool] = None
+_inference_pool_lock = threading.Lock()
+
+
+def get_inference_pool() -> InferencePool:
+    """Get the process-wide inference pool; workers spawn on first use."""
+    global _inference_pool
+    if _inference_pool is None:
+        with _inference_pool_lock:
+            if _inference_pool is None:
+                _inference_pool = InferencePool()
+    return _inference_pool
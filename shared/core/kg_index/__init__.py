@@ -0,0 +1,25 @@
+"""
+KG Entity Index - in-process entity lookup for the knowledge graph lane.
+
+Resolves entity names, aliases, partial and misspelled mentions locally;
+the graph store is only queried to hydrate the top matches. Entity
+neighbourhoods from graph traversals are cached until an edge changes them.
+"""
+
+from shared.core.kg_index.index import EntityIndex, EntityIndexConfig, EntityMatch, get_entity_index
+from shared.core.kg_index.neighbourhood import NeighbourhoodCache, NeighbourhoodCacheConfig, get_neighbourhood_cache
+from shared.core.kg_index.ngrams import normalize
+from shared.core.kg_index.sync import EntityIndexSync, get_entity_index_sync
+
+__all__ = [
+    "EntityIndex",
+    "EntityIndexConfig",
+    "EntityIndexSync",
+    "EntityMatch",
+    "NeighbourhoodCache",
+    "NeighbourhoodCacheConfig",
+    "get_entity_index",
+    "get_entity_index_sync",
+    "get_neighbourhood_cache",
+    "normalize",
+]
@@ -0,0 +1,91 @@
+"""
+Sorted Surface-Form Dictionary
+
+Maps normalized entity names and aliases to entity ids with exact and prefix
+lookup. Surfaces live in a sorted array (binary-searched like the term
+dictionary of a search engine) plus a small sorted delta of recent
+additions, which is folded into the main array once it grows past a fraction
+of it. Removed surfaces are dropped from the id map right away and from the
+arrays at the next rebuild.
+"""
+
+import bisect
+import heapq
+from typing import Dict, List, Tuple, Union
+
+# Most surfaces name a single entity; store a bare id for those
+_Ids = Union[int, Tuple[int, ...]]
+
+
+class SurfaceDictionary:
+    """Normalized surface form -> entity ids."""
+
+    def __init__(self, rebuild_ratio: float = 0.02):
+        self.rebuild_ratio = rebuild_ratio
+        self._ids: Dict[str, _Ids] = {}
+        self._sorted: List[str] = []
+        self._delta: List[str] = []
+        self._stale = 0
+        self._unsorted = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, surface: str) -> Tuple[int, ...]:
+        ids = self._ids.get(surface)
+        if ids is None:
+            return ()
+        return (ids,) if isinstance(ids, int) else ids
+
+    def add(self, surface: str, entity_id: int, bulk: bool = False) -> None:
+        """Map a surface to an entity; with ``bulk``, ordering is deferred to the next rebuild()."""
+        ids = self._ids.get(surface)
+        if ids is None:
+            self._ids[surface] = entity_id
+            if bulk:
+                self._unsorted = True
+            else:
+                bisect.insort(self._delta, surface)
+                if len(self._delta) > 64 + self.rebuild_ratio * len(self._sorted):
+                    self.rebuild()
+        elif isinstance(ids, int):
+            if ids != entity_id:
+                self._ids[surface] = (ids, entity_id)
+        elif entity_id not in ids:
+            self._ids[surface] = ids + (entity_id,)
+
+    def remove(self, surface: str, entity_id: int) -> None:
+        remaining = tuple(i for i in self.get(surface) if i != entity_id)
+        if not remaining:
+            if self._ids.pop(surface, None) is not None:
+                self._stale += 1
+        else:
+            self._ids[surface] = remaining[0] if len(remaining) == 1 else remaining
+
+    def prefix(self, prefix: str, limit: int = 50) -> List[str]:
+        """Live surfaces starting with ``prefix``, in sorted order."""
+        if self._unsorted:
+            self.rebuild()
+        ranges = []
+        for surfaces in (self._sorted, self._delta):
+            start = bisect.bisect_left(surfaces, prefix)
+            end = bisect.bisect_left(surfaces, prefix + "\uffff", lo=start)
+            # At most ``_stale`` dead surfaces sit in a range, so this slice holds enough live ones
+            ranges.append(surfaces[start:min(end, start + limit + self._stale)])
+        found = []
+        for surface in heapq.merge(*ranges):
+            if surface in self._ids and (not found or found[-1] != surface):
+                found.append(surface)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def rebuild(self) -> None:
+        """Fold the delta and bulk additions into the sorted array and drop removed surfaces."""
+        if self._stale or self._unsorted:
+            self._sorted = sorted(self._ids)
+        else:
+            self._sorted = list(heapq.merge(self._sorted, self._delta))
+        self._delta = []
+        self._stale = 0
+        self._unsorted = False
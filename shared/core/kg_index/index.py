@@ -0,0 +1,358 @@
+"""
+In-Process KG Entity Index
+
+Resolves entity mentions in free text without scanning the graph store:
+- Exact and alias matches: every span of up to ``max_span_tokens`` query
+  words is looked up in the sorted surface dictionary
+- Partial matches: entities sharing rare words with the query, ranked by the
+  idf-weighted share of their name the query covers
+- Fuzzy matches: unknown query words are mapped to the closest name words
+  through the trigram index before partial matching
+- Prefix matches: short queries complete to the names they start
+
+Entity keys are kept in a compact id -> key array so the graph store is only
+touched to hydrate the top matches by primary key.
+
+Following MAANG/OpenAI/Perplexity standards for retrieval performance.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from shared.core.kg_index.dictionary import SurfaceDictionary
+from shared.core.kg_index.ngrams import TrigramIndex, normalize
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EntityIndexConfig:
+    """Entity index configuration."""
+    enabled: bool = True
+    max_span_tokens: int = 6
+    max_token_df: int = 5000
+    max_candidates: int = 64
+    fuzzy_threshold: float = 0.55
+    fuzzy_min_length: int = 4
+    prefix_limit: int = 50
+    poll_interval_s: float = 2.0
+    resync_interval_s: float = 300.0
+    snapshot_batch_size: int = 10000
+
+    @classmethod
+    def from_environment(cls) -> "EntityIndexConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("KG_ENTITY_INDEX_ENABLED", "true").lower() == "true",
+            max_span_tokens=int(os.getenv("KG_ENTITY_INDEX_MAX_SPAN_TOKENS", "6")),
+            max_token_df=int(os.getenv("KG_ENTITY_INDEX_MAX_TOKEN_DF", "5000")),
+            fuzzy_threshold=float(os.getenv("KG_ENTITY_INDEX_FUZZY_THRESHOLD", "0.55")),
+            poll_interval_s=float(os.getenv("KG_ENTITY_INDEX_POLL_INTERVAL_S", "2.0")),
+            resync_interval_s=float(os.getenv("KG_ENTITY_INDEX_RESYNC_INTERVAL_S", "300")),
+        )
+
+
+@dataclass
+class EntityMatch:
+    """An entity resolved from query text."""
+    key: str
+    name: str
+    type: str
+    score: float
+    match_type: str  # exact, alias, partial, fuzzy or prefix
+    matched_text: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "name": self.name,
+            "type": self.type,
+            "score": round(self.score, 4),
+            "match_type": self.match_type,
+            "matched_text": self.matched_text,
+        }
+
+
+# Score bands keep match kinds ordered: exact > alias > partial/fuzzy > prefix
+_EXACT_BASE = 0.9
+_ALIAS_PENALTY = 0.02
+_PARTIAL_MAX = 0.85
+_PREFIX_MAX = 0.7
+
+
+class EntityIndex:
+    """
+    Entity lookup over names and aliases.
+
+    Mutations and lookups are serialized by a lock; lookups take well under
+    a millisecond, so callers run them inline on the event loop.
+    """
+
+    def __init__(self, config: Optional[EntityIndexConfig] = None):
+        self.config = config or EntityIndexConfig.from_environment()
+        self._lock = threading.RLock()
+        self._reset()
+        self.ready = False
+        self.stats = {"lookups": 0, "lookup_ms_total": 0.0, "upserts": 0, "removals": 0}
+
+    def _reset(self) -> None:
+        # Compact id -> key map; ids of removed entities hold None until reused
+        self._keys: List[Optional[str]] = []
+        self._key_ids: Dict[str, int] = {}
+        self._free_ids: List[int] = []
+        self._names: List[str] = []
+        self._types: List[str] = []
+        # Normalized surfaces per id, the primary name first
+        self._surfaces: List[Tuple[str, ...]] = []
+        # Word count of each entity's shortest surface, for candidate preselection
+        self._lengths = array("B")
+        self._dictionary = SurfaceDictionary()
+        # Word -> ids, append-only; stale ids are filtered when candidates are scored
+        self._token_postings: Dict[str, array] = {}
+        self._stale_postings = 0
+        self._total_postings = 0
+        self._vocabulary = TrigramIndex()
+
+    def __len__(self) -> int:
+        return len(self._key_ids)
+
+    # Writes ----------------------------------------------------------------
+
+    def upsert(
+        self,
+        key: str,
+        name: str,
+        entity_type: str = "",
+        aliases: Iterable[str] = (),
+        bulk: bool = False
+    ) -> None:
+        """Add or replace an entity."""
+        surfaces = tuple(dict.fromkeys(s for s in (normalize(n) for n in [name or "", *aliases]) if s))
+        with self._lock:
+            entity_id = self._key_ids.get(key)
+            if entity_id is not None:
+                self._unlink(entity_id)
+            elif self._free_ids:
+                entity_id = self._free_ids.pop()
+                self._keys[entity_id] = key
+            else:
+                entity_id = len(self._keys)
+                self._keys.append(key)
+                self._names.append("")
+                self._types.append("")
+                self._surfaces.append(())
+                self._lengths.append(0)
+            self._key_ids[key] = entity_id
+            self._names[entity_id] = name or ""
+            self._types[entity_id] = entity_type or ""
+            self._surfaces[entity_id] = surfaces
+            self._lengths[entity_id] = min(min((len(s.split()) for s in surfaces), default=0), 255)
+            for surface in surfaces:
+                self._dictionary.add(surface, entity_id, bulk)
+            for token in {t for s in surfaces for t in s.split()}:
+                postings = self._token_postings.get(token)
+                if postings is None:
+                    postings = self._token_postings[token] = array("I")
+                    self._vocabulary.add(token)
+                postings.append(entity_id)
+                self._total_postings += 1
+            self.stats["upserts"] += 1
+            self._maybe_compact()
+
+    def remove(self, key: str) -> bool:
+        """Remove an entity; returns False when the key is unknown."""
+        with self._lock:
+            entity_id = self._key_ids.pop(key, None)
+            if entity_id is None:
+                return False
+            self._unlink(entity_id)
+            self._keys[entity_id] = None
+            self._surfaces[entity_id] = ()
+            self._free_ids.append(entity_id)
+            self.stats["removals"] += 1
+            self._maybe_compact()
+            return True
+
+    def replace_all(self, entities: Iterable[Dict[str, Any]]) -> int:
+        """Rebuild from a full snapshot of entity documents and mark the index ready."""
+        fresh = EntityIndex(self.config)
+        count = 0
+        for doc in entities:
+            fresh.upsert(*_entity_fields(doc), bulk=True)
+            count += 1
+        fresh._dictionary.rebuild()
+        with self._lock:
+            # Adopt the new state in one step so lookups never see a partial load
+            for name in ("_keys", "_key_ids", "_free_ids", "_names", "_types", "_surfaces", "_lengths", "_dictionary",
+                         "_token_postings", "_stale_postings", "_total_postings", "_vocabulary"):
+                setattr(self, name, getattr(fresh, name))
+            self.ready = True
+        logger.info(f"Entity index loaded {count} entities")
+        return count
+
+    def apply(self, doc: Dict[str, Any], removed: bool = False) -> None:
+        """Apply one change from the graph store's change feed."""
+        if removed:
+            self.remove(str(doc.get("_key", "")))
+        else:
+            self.upsert(*_entity_fields(doc))
+
+    def _unlink(self, entity_id: int) -> None:
+        surfaces = self._surfaces[entity_id]
+        for surface in surfaces:
+            self._dictionary.remove(surface, entity_id)
+        self._stale_postings += len({t for s in surfaces for t in s.split()})
+
+    def _maybe_compact(self) -> None:
+        if self._stale_postings > 1000 and self._stale_postings > self._total_postings // 4:
+            postings: Dict[str, array] = {}
+            for entity_id, surfaces in enumerate(self._surfaces):
+                for token in {t for s in surfaces for t in s.split()}:
+                    postings.setdefault(token, array("I")).append(entity_id)
+            self._token_postings = postings
+            self._total_postings = sum(len(p) for p in postings.values())
+            self._stale_postings = 0
+
+    # Lookup ----------------------------------------------------------------
+
+    def lookup(self, text: str, limit: int = 10, types: Optional[Sequence[str]] = None) -> List[EntityMatch]:
+        """
+        Entities mentioned in or matching ``text``.
+
+        Args:
+            text: Free-text query
+            limit: Maximum matches
+            types: Only return entities of these types
+        """
+        start = time.perf_counter()
+        tokens = normalize(text).split()
+        if not tokens or limit <= 0:
+            return []
+        with self._lock:
+            best: Dict[int, Tuple[float, str, str]] = {}
+
+            def offer(entity_id: int, score: float, match_type: str, matched: str) -> None:
+                if score > best.get(entity_id, (0.0,))[0]:
+                    best[entity_id] = (score, match_type, matched)
+
+            self._match_spans(tokens, offer)
+            # Typo correction only when no name or alias matched verbatim
+            self._match_partial(tokens, offer, fuzzy=not best)
+            if len(tokens) <= 3:
+                self._match_prefix(" ".join(tokens), offer)
+
+            allowed = set(types) if types else None
+            ranked = sorted(
+                (item for item in best.items() if allowed is None or self._types[item[0]] in allowed),
+                key=lambda item: (-item[1][0], self._names[item[0]])
+            )[:limit]
+            matches = [
+                EntityMatch(self._keys[i], self._names[i], self._types[i], score, match_type, matched)
+                for i, (score, match_type, matched) in ranked
+            ]
+            self.stats["lookups"] += 1
+            self.stats["lookup_ms_total"] += (time.perf_counter() - start) * 1000
+            return matches
+
+    def _match_spans(self, tokens: List[str], offer) -> None:
+        for i in range(len(tokens)):
+            for j in range(i + 1, min(len(tokens), i + self.config.max_span_tokens) + 1):
+                span = " ".join(tokens[i:j])
+                for entity_id in self._dictionary.get(span):
+                    score = _EXACT_BASE + (1 - _EXACT_BASE) * (j - i) / len(tokens)
+                    if self._surfaces[entity_id][0] == span:
+                        offer(entity_id, score, "exact", span)
+                    else:
+                        offer(entity_id, score - _ALIAS_PENALTY, "alias", span)
+
+    def _match_partial(self, tokens: List[str], offer, fuzzy: bool) -> None:
+        cfg = self.config
+        # Query words with their weight; misspelled words map to known words at reduced weight
+        weights: Dict[str, float] = {}
+        corrected = set()
+        for token in tokens:
+            if token in self._token_postings:
+                weights[token] = 1.0
+            elif fuzzy and len(token) >= cfg.fuzzy_min_length:
+                for word, similarity in self._vocabulary.similar(token, cfg.fuzzy_threshold, limit=2):
+                    if similarity > weights.get(word, 0.0):
+                        weights[word] = similarity
+                        corrected.add(word)
+        lists = [
+            np.frombuffer(self._token_postings[t], dtype=np.uint32)
+            for t in weights if len(self._token_postings[t]) <= cfg.max_token_df
+        ]
+        if not lists:
+            return
+        candidates, shared = np.unique(np.concatenate(lists), return_counts=True)
+        if len(candidates) > cfg.max_candidates:
+            # Most shared words first, then the shortest names: the likeliest high coverage
+            lengths = np.frombuffer(self._lengths, dtype=np.uint8)[candidates]
+            candidates = candidates[np.lexsort((lengths, -shared))[:cfg.max_candidates]]
+
+        n = max(len(self._key_ids), 1)
+        for entity_id in candidates.tolist():
+            for surface in self._surfaces[entity_id]:
+                words = surface.split()
+                total = covered = 0.0
+                for word in words:
+                    idf = math.log(1 + n / max(len(self._token_postings.get(word, ())), 1))
+                    total += idf
+                    covered += idf * weights.get(word, 0.0)
+                if covered:
+                    match_type = "fuzzy" if corrected.intersection(words) else "partial"
+                    offer(entity_id, _PARTIAL_MAX * covered / total, match_type, surface)
+
+    def _match_prefix(self, text: str, offer) -> None:
+        for surface in self._dictionary.prefix(text, self.config.prefix_limit):
+            if surface == text:
+                continue
+            for entity_id in self._dictionary.get(surface):
+                offer(entity_id, _PREFIX_MAX * len(text) / len(surface), "prefix", surface)
+
+    # Introspection ---------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["lookups"]
+            return {
+                "ready": self.ready,
+                "entities": len(self._key_ids),
+                "surfaces": len(self._dictionary),
+                "vocabulary": len(self._vocabulary),
+                "lookups": lookups,
+                "avg_lookup_ms": round(self.stats["lookup_ms_total"] / lookups, 4) if lookups else 0.0,
+                "upserts": self.stats["upserts"],
+                "removals": self.stats["removals"],
+            }
+
+
+def _entity_fields(doc: Dict[str, Any]) -> Tuple[str, str, str, List[str]]:
+    """(key, name, type, aliases) of an entity document."""
+    aliases = doc.get("aliases") or (doc.get("properties") or {}).get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = [aliases]
+    return str(doc.get("_key", "")), str(doc.get("name") or ""), str(doc.get("type") or ""), list(aliases)
+
+
+# Global index instance - lazy initialization
+_entity_index: Optional[EntityIndex] = None
+_entity_index_lock = threading.Lock()
+
+
+def get_entity_index() -> EntityIndex:
+    """Get the global entity index; empty and not ready until the first sync."""
+    global _entity_index
+    if _entity_index is None:
+        with _entity_index_lock:
+            if _entity_index is None:
+                _entity_index = EntityIndex(EntityIndexConfig.from_environment())
+    return _entity_index
@@ -0,0 +1,181 @@
+"""
+Graph Neighbourhood Cache
+
+LRU cache of k-hop traversal results keyed by (entity, depth, edge types).
+Each entry records which entities its neighbourhood contains, so adding an
+edge drops exactly the cached neighbourhoods that touch either endpoint.
+Neighbourhoods cut off by the traversal limit cannot prove an edge is out of
+reach and are dropped on every write. A TTL bounds staleness from writes
+made by other processes.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+NeighbourhoodKey = Tuple[str, int, Tuple[str, ...]]
+
+
+@dataclass
+class NeighbourhoodCacheConfig:
+    """Neighbourhood cache configuration."""
+    enabled: bool = True
+    max_entries: int = 10000
+    ttl_s: float = 300.0
+
+    @classmethod
+    def from_environment(cls) -> "NeighbourhoodCacheConfig":
+        """Create configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("KG_NEIGHBOURHOOD_CACHE_ENABLED", "true").lower() == "true",
+            max_entries=int(os.getenv("KG_NEIGHBOURHOOD_CACHE_MAX_ENTRIES", "10000")),
+            ttl_s=float(os.getenv("KG_NEIGHBOURHOOD_CACHE_TTL_S", "300")),
+        )
+
+
+@dataclass
+class Neighbourhood:
+    """Traversal rows ({vertex, edge}) around one seed entity, in traversal order."""
+    rows: List[Dict[str, Any]]
+    limit: int
+    created_at: float = field(default_factory=time.time)
+    members: Set[str] = field(default_factory=set)
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.rows) >= self.limit
+
+
+class NeighbourhoodCache:
+    """Thread-safe LRU of entity neighbourhoods."""
+
+    def __init__(self, config: Optional[NeighbourhoodCacheConfig] = None):
+        self.config = config or NeighbourhoodCacheConfig.from_environment()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[NeighbourhoodKey, Neighbourhood]" = OrderedDict()
+        # Entity key -> cached neighbourhoods containing it
+        self._members: Dict[str, Set[NeighbourhoodKey]] = {}
+        self._truncated: Set[NeighbourhoodKey] = set()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(entity_id: str, depth: int, edge_types: Optional[Sequence[str]] = None) -> NeighbourhoodKey:
+        return (entity_id, depth, tuple(sorted(set(edge_types or ()))))
+
+    def get(
+        self,
+        entity_id: str,
+        depth: int,
+        edge_types: Optional[Sequence[str]] = None,
+        limit: int = 10
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Cached rows for a seed, or None when absent, expired or fetched with a smaller limit."""
+        if not self.config.enabled:
+            return None
+        key = self.key(entity_id, depth, edge_types)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry.created_at > self.config.ttl_s:
+                self._drop(key)
+                entry = None
+            if entry is None or (entry.truncated and entry.limit < limit):
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry.rows[:limit]
+
+    def put(
+        self,
+        entity_id: str,
+        depth: int,
+        edge_types: Optional[Sequence[str]],
+        rows: List[Dict[str, Any]],
+        limit: int
+    ) -> None:
+        if not self.config.enabled:
+            return
+        key = self.key(entity_id, depth, edge_types)
+        entry = Neighbourhood(rows=rows, limit=limit, members=_row_members(entity_id, rows))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            for member in entry.members:
+                self._members.setdefault(member, set()).add(key)
+            if entry.truncated:
+                self._truncated.add(key)
+            while len(self._entries) > self.config.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def invalidate(self, entity_ids: Iterable[str]) -> int:
+        """Drop neighbourhoods an edge between ``entity_ids`` could change; returns how many."""
+        with self._lock:
+            keys = set(self._truncated)
+            for entity_id in entity_ids:
+                keys.update(self._members.get(entity_id, ()))
+            for key in keys:
+                self._drop(key)
+            self.stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._members.clear()
+            self._truncated.clear()
+
+    def _drop(self, key: NeighbourhoodKey) -> None:
+        entry = self._entries.pop(key)
+        self._truncated.discard(key)
+        for member in entry.members:
+            keys = self._members.get(member)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._members[member]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                **self.stats,
+            }
+
+
+def _row_members(seed: str, rows: List[Dict[str, Any]]) -> Set[str]:
+    """The seed plus every entity on a returned edge or vertex."""
+    members = {seed}
+    for row in rows:
+        vertex = row.get("vertex") or {}
+        if vertex.get("_key"):
+            members.add(vertex["_key"])
+        edge = row.get("edge") or {}
+        for end in ("_from", "_to"):
+            if edge.get(end):
+                members.add(edge[end].split("/")[-1])
+    return members
+
+
+# Global cache instance - lazy initialization
+_neighbourhood_cache: Optional[NeighbourhoodCache] = None
+_neighbourhood_cache_lock = threading.Lock()
+
+
+def get_neighbourhood_cache() -> NeighbourhoodCache:
+    """Get the global neighbourhood cache shared by all knowledge graph clients."""
+    global _neighbourhood_cache
+    if _neighbourhood_cache is None:
+        with _neighbourhood_cache_lock:
+            if _neighbourhood_cache is None:
+                _neighbourhood_cache = NeighbourhoodCache()
+    return _neighbourhood_cache
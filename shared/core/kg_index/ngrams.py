@@ -0,0 +1,83 @@
+"""
+Entity Name Normalization and Trigram Fuzzy Matching
+
+Names and queries are normalized the same way (case-folded, accents and
+punctuation stripped). The trigram index covers the vocabulary of words used
+in entity names, so a misspelled query word can be mapped to the closest
+known name words before the entity lookup runs.
+"""
+
+import re
+import unicodedata
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """Case-fold, strip accents and punctuation, collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", stripped).strip()
+
+
+def trigrams(word: str) -> List[str]:
+    """Padded character trigrams, so word starts and ends weigh in."""
+    padded = f"  {word} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class TrigramIndex:
+    """Trigram postings over a growing word vocabulary."""
+
+    def __init__(self):
+        self._words: List[str] = []
+        self._word_ids: Dict[str, int] = {}
+        self._gram_counts = array("H")
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._word_ids
+
+    def add(self, word: str) -> None:
+        if word in self._word_ids:
+            return
+        word_id = len(self._words)
+        self._word_ids[word] = word_id
+        self._words.append(word)
+        grams = trigrams(word)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array("I")
+            postings.append(word_id)
+
+    def similar(self, word: str, threshold: float = 0.5, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Known words closest to ``word`` by trigram Dice similarity.
+
+        Returns:
+            Up to ``limit`` (word, similarity) pairs with similarity >= threshold, best first
+        """
+        grams = trigrams(word)
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return []
+        candidates, shared = np.unique(
+            np.concatenate([np.frombuffer(p, dtype=np.uint32) for p in lists]), return_counts=True
+        )
+        sizes = np.frombuffer(self._gram_counts, dtype=np.uint16)[candidates]
+        dice = 2.0 * shared / (len(grams) + sizes)
+        keep = dice >= threshold
+        candidates, dice = candidates[keep], dice[keep]
+        best = np.argsort(-dice, kind="stable")[:limit]
+        return [(self._words[int(candidates[i])], float(dice[i])) for i in best]
@@ -0,0 +1,167 @@
+"""
+Entity Index Synchronization from ArangoDB
+
+Keeps the in-process entity index in step with the ``entities`` collection:
+1. Record the server's last WAL tick, then stream a projection of every
+   entity (key, name, aliases, type) into a fresh index
+2. Tail the write-ahead log from that tick and apply inserts, updates and
+   removals of entity documents as they happen
+3. Where WAL tailing is not permitted, fall back to a periodic full resync
+
+Changes are idempotent upserts/removals, so replaying entries that overlap
+the snapshot is harmless. The driver is synchronous; all calls run in a
+worker thread.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from shared.core.kg_index.index import EntityIndex, get_entity_index
+
+logger = logging.getLogger(__name__)
+
+ENTITY_COLLECTION = "entities"
+
+# ArangoDB replication log markers
+WAL_DOCUMENT_UPSERT = 2300
+WAL_DOCUMENT_REMOVE = 2302
+
+SNAPSHOT_QUERY = """
+FOR e IN entities
+    RETURN {_key: e._key, name: e.name, type: e.type, aliases: e.aliases}
+"""
+
+
+class EntityIndexSync:
+    """Snapshot + change-feed synchronization of an EntityIndex."""
+
+    def __init__(self, index: Optional[EntityIndex] = None):
+        self.index = index if index is not None else get_entity_index()
+        self.config = self.index.config
+        self._tick: Optional[str] = None
+        self._collection_id: Optional[str] = None
+        self._wal_available = True
+        self._task: Optional[asyncio.Task] = None
+        self._last_resync = 0.0
+        self.stats = {"resyncs": 0, "changes_applied": 0, "last_sync_time": 0.0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, database: Any) -> bool:
+        """Start background synchronization; returns False if disabled or already running."""
+        if not self.config.enabled or self.running:
+            return False
+        self._task = asyncio.create_task(self._run(database), name="kg-entity-index-sync")
+        return True
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, database: Any) -> None:
+        backoff = self.config.poll_interval_s
+        while True:
+            try:
+                if not self.index.ready or (
+                    not self._wal_available
+                    and time.time() - self._last_resync >= self.config.resync_interval_s
+                ):
+                    await self.resync(database)
+                elif self._wal_available:
+                    await self.poll(database)
+                backoff = self.config.poll_interval_s
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                backoff = min(backoff * 2, 60.0)
+                logger.warning(f"Entity index sync failed, retrying in {backoff:.0f}s: {e}")
+            await asyncio.sleep(backoff)
+
+    async def resync(self, database: Any) -> int:
+        """Reload the whole index from a fresh snapshot."""
+        documents, tick, collection_id = await asyncio.to_thread(self._snapshot, database)
+        count = self.index.replace_all(documents)
+        self._tick = tick
+        self._collection_id = collection_id
+        self._wal_available = tick is not None
+        self._last_resync = self.stats["last_sync_time"] = time.time()
+        self.stats["resyncs"] += 1
+        return count
+
+    async def poll(self, database: Any) -> int:
+        """Apply entity changes logged since the last poll."""
+        applied = await asyncio.to_thread(self._tail, database)
+        self.stats["changes_applied"] += applied
+        self.stats["last_sync_time"] = time.time()
+        return applied
+
+    def _snapshot(self, database: Any) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        tick = collection_id = None
+        try:
+            # Taken before the snapshot, so tailing from it cannot miss a change
+            tick = str(database.wal.last_tick()["tick"])
+            collection_id = database.collection(ENTITY_COLLECTION).properties().get("global_id")
+        except Exception as e:
+            logger.info(f"WAL tailing unavailable, entity index will resync periodically: {e}")
+        cursor = database.aql.execute(SNAPSHOT_QUERY, batch_size=self.config.snapshot_batch_size, stream=True)
+        return list(cursor), tick, collection_id
+
+    def _tail(self, database: Any) -> int:
+        applied = 0
+        while True:
+            try:
+                batch = database.wal.tail(lower=self._tick, deserialize=True)
+            except Exception as e:
+                self._wal_available = False
+                logger.info(f"WAL tailing stopped, falling back to periodic resync: {e}")
+                return applied
+            for entry in batch.get("content") or []:
+                if entry.get("type") not in (WAL_DOCUMENT_UPSERT, WAL_DOCUMENT_REMOVE):
+                    continue
+                if entry.get("cname", entry.get("cuid")) not in (ENTITY_COLLECTION, self._collection_id):
+                    continue
+                self.index.apply(entry.get("data") or {}, removed=entry["type"] == WAL_DOCUMENT_REMOVE)
+                applied += 1
+            last = batch.get("last_included") or batch.get("last_tick")
+            if last and str(last) != "0":
+                self._tick = str(last)
+            if not batch.get("check_more"):
+                return applied
+
+    def get_stats(self) -> Dict[str, Any]:
+        last = self.stats["last_sync_time"]
+        return {
+            **self.index.get_stats(),
+            "running": self.running,
+            "wal_tailing": self._wal_available,
+            "resyncs": self.stats["resyncs"],
+            "changes_applied": self.stats["changes_applied"],
+            "sync_errors": self.stats["errors"],
+            "sync_lag_seconds": round(time.time() - last, 1) if last else None,
+        }
+
+
+# Global sync instance - lazy initialization
+_entity_index_sync: Optional[EntityIndexSync] = None
+_entity_index_sync_lock = threading.Lock()
+
+
+def get_entity_index_sync() -> EntityIndexSync:
+    """Get the global synchronizer for the global entity index."""
+    global _entity_index_sync
+    if _entity_index_sync is None:
+        with _entity_index_sync_lock:
+            if _entity_index_sync is None:
+                _entity_index_sync = EntityIndexSync()
+    return _entity_index_sync
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Lazy Imports for Heavy Optional Dependencies
+
+torch, transformers and sentence_transformers take seconds to import and
+pull in hundreds of modules; importing them at module level puts that cost
+on every process start even when no model is ever loaded. This module
+provides:
+- module_available(): check whether a package is installed without
+  importing it (importlib.util.find_spec)
+- lazy_module(): a module proxy that imports on first attribute access
+- get_import_timings(): how long each lazily imported module took, for the
+  cold-start report
+
+Following MAANG/OpenAI/Perplexity standards for service startup.
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_import_timings: Dict[str, float] = {}
+_import_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """True if ``name`` can be imported; does not import it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """Import the module now (raises ImportError if it is not installed)"""
+        if self._module is None:
+            with _import_lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    _import_timings[self._name] = time.perf_counter() - start
+                    logger.info(f"Lazily imported {self._name} in {_import_timings[self._name] * 1000:.0f}ms")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Proxy for ``name`` that defers ``import name`` until it is used"""
+    return LazyModule(name)
+
+
+def get_import_timings() -> Dict[str, float]:
+    """Seconds spent importing each lazily loaded module so far"""
+    return {name: round(seconds, 4) for name, seconds in _import_timings.items()}
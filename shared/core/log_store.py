@@ -0,0 +1,771 @@
+"""
+Log-Structured Key-Value Store - Universal Knowledge Platform
+
+Embedded append-only store backing MediumTermMemory:
+- Records are appended to size-bounded segment files; an in-memory hash
+  index maps each key to its latest record (segment, offset, length, expiry)
+- Concurrent writes are drained as one batch per write syscall; fsync runs
+  per batch in durable mode, otherwise on a short background interval
+- Access statistics live only in memory, so reads never write
+- Expiry is tracked in a heap: cleanup pops expired keys without touching
+  disk, and replay skips expired records
+- Sealed segments are merged in the background once enough of them is
+  garbage; the merged segment starts with a marker so a crash mid-compaction
+  is finished on the next open
+- All file I/O runs on a dedicated single-thread executor (compaction on the
+  shared io executor), never on the event loop
+- Several processes (e.g. gateway workers) share one directory: appends
+  hold an exclusive flock on its LOCK file, which also records the log's
+  end; reads first catch up with whatever other processes appended (under a
+  shared lock, one pread when nothing changed); a compaction bumps the
+  log's epoch so the other processes replay it from scratch
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from shared.core.executor_registry import ExecutorSaturated, get_executor_registry
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# crc32, key length, value length, expires_at (unix seconds), flags
+HEADER = struct.Struct("<IIIdB")
+FLAG_PUT = 0
+FLAG_DELETE = 1
+FLAG_MERGED = 2
+# Log end shared through the LOCK file: epoch (bumped per compaction), active segment base, generation, size
+STATE = struct.Struct("<QQQQ")
+
+SegmentId = Tuple[int, int]  # (base, generation); replay order
+
+
+@dataclass
+class LogStoreConfig:
+    """Log-structured store configuration"""
+    directory: str = "session_storage"
+    segment_max_bytes: int = 16 * 1024 * 1024
+    durable_writes: bool = False
+    fsync_interval_ms: float = 50.0
+    maintenance_interval_s: float = 30.0
+    compaction_garbage_ratio: float = 0.5
+    compaction_min_bytes: int = 4 * 1024 * 1024
+
+    @classmethod
+    def from_environment(cls) -> "LogStoreConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            directory=os.getenv("MEDIUM_TERM_STORAGE_DIR", "session_storage"),
+            segment_max_bytes=int(os.getenv("MEDIUM_TERM_SEGMENT_MAX_BYTES", str(16 * 1024 * 1024))),
+            durable_writes=os.getenv("MEDIUM_TERM_DURABLE_WRITES", "false").lower() == "true",
+            fsync_interval_ms=float(os.getenv("MEDIUM_TERM_FSYNC_INTERVAL_MS", "50")),
+            maintenance_interval_s=float(os.getenv("MEDIUM_TERM_MAINTENANCE_INTERVAL_S", "30")),
+            compaction_garbage_ratio=float(os.getenv("MEDIUM_TERM_COMPACTION_GARBAGE_RATIO", "0.5")),
+            compaction_min_bytes=int(os.getenv("MEDIUM_TERM_COMPACTION_MIN_BYTES", str(4 * 1024 * 1024))),
+        )
+
+
+class Location(NamedTuple):
+    """Where the latest record for a key lives"""
+    segment: SegmentId
+    offset: int
+    length: int
+    expires_at: float
+
+
+Recovered = Tuple[Dict[str, Location], Dict[SegmentId, int], Dict[SegmentId, int]]
+
+
+class Catchup(NamedTuple):
+    """What other processes changed since this one last looked at the log"""
+    recovered: Optional[Recovered]  # full replay after another process compacted
+    records: List[Tuple[str, int, Location]]  # (key, flags, location) appended since, in log order
+    sizes: Dict[SegmentId, int]  # new end of every segment the records span
+
+
+NO_CHANGES = Catchup(None, [], {})
+
+
+def encode_record(key: bytes, value: bytes, expires_at: float, flags: int = FLAG_PUT) -> bytes:
+    body = HEADER.pack(0, len(key), len(value), expires_at, flags)[4:] + key + value
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def iter_records(data: bytes) -> Iterator[Tuple[int, int, int, bytes, bytes, float]]:
+    """Yield (offset, length, flags, key, value, expires_at) up to the first torn or corrupt record"""
+    offset, size = 0, len(data)
+    while offset + HEADER.size <= size:
+        crc, key_len, value_len, expires_at, flags = HEADER.unpack_from(data, offset)
+        end = offset + HEADER.size + key_len + value_len
+        if end > size or zlib.crc32(data[offset + 4:end]) != crc:
+            return
+        key_start = offset + HEADER.size
+        yield offset, end - offset, flags, data[key_start:key_start + key_len], data[key_start + key_len:end], expires_at
+        offset = end
+
+
+def segment_name(segment: SegmentId) -> str:
+    return f"{segment[0]:08d}-{segment[1]:04d}.seg"
+
+
+def parse_segment_name(name: str) -> Optional[SegmentId]:
+    try:
+        base, generation = name[:-len(".seg")].split("-")
+        return int(base), int(generation)
+    except ValueError:
+        return None
+
+
+class SegmentFiles:
+    """Blocking segment file operations; only ever called from the store's I/O thread"""
+
+    def __init__(self, directory: Path, segment_max_bytes: int):
+        self.directory = directory
+        self.lock_fd: Optional[int] = None
+        self.compaction_fd: Optional[int] = None
+        self.compaction_locked = False
+        self.epoch = 0
+        self.segment_max_bytes = segment_max_bytes
+        self.fds: Dict[SegmentId, int] = {}
+        self.retired: Dict[SegmentId, int] = {}
+        self.active: SegmentId = (0, 0)
+        self.active_size = 0
+        self.dirty = False
+
+    def path(self, segment: SegmentId) -> Path:
+        return self.directory / segment_name(segment)
+
+    def _open(self, segment: SegmentId) -> int:
+        fd = os.open(self.path(segment), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self.fds[segment] = fd
+        return fd
+
+    def lock(self) -> None:
+        """Open the directory's LOCK (appends, log end) and COMPACT files, shared by every process using it"""
+        if self.lock_fd is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.lock_fd = os.open(self.directory / "LOCK", os.O_RDWR | os.O_CREAT, 0o644)
+            self.compaction_fd = os.open(self.directory / "COMPACT", os.O_RDWR | os.O_CREAT, 0o644)
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self.lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+
+    def _read_state(self) -> Tuple[int, int, int, int]:
+        data = os.pread(self.lock_fd, STATE.size, 0)
+        return STATE.unpack(data) if len(data) == STATE.size else (0, 0, 0, 0)
+
+    def _write_state(self, epoch: int) -> None:
+        os.pwrite(self.lock_fd, STATE.pack(epoch, *self.active, self.active_size), 0)
+
+    def lock_compaction(self) -> bool:
+        """Claim the directory's compaction; False while another process runs one"""
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.flock(self.compaction_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+        self.compaction_locked = True
+        return True
+
+    def unlock_compaction(self) -> None:
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self.compaction_fd, fcntl.LOCK_UN)
+        self.compaction_locked = False
+
+    def recover(self, now: float) -> Recovered:
+        """Replay all segments; returns (index, segment sizes, live bytes per segment)"""
+        self.lock()
+        with self._locked(exclusive=True):
+            return self._replay(now)
+
+    def refresh(self, now: float) -> Catchup:
+        """Records other processes appended since the last refresh or append"""
+        with self._locked(exclusive=False):
+            state = self._read_state()
+            if state[0] == self.epoch:
+                return self._catch_up(state)
+        # Another process compacted; the segments this one indexed may be gone
+        with self._locked(exclusive=True):
+            return Catchup(self._replay(now), [], {})
+
+    def _catch_up(self, state: Tuple[int, int, int, int]) -> Catchup:
+        """Read from this process's end of the log to the shared one (segments only ever grow or rotate)"""
+        _, base, generation, size = state
+        target = (base, generation)
+        if (target, size) == (self.active, self.active_size):
+            return NO_CHANGES
+        records: List[Tuple[str, int, Location]] = []
+        sizes: Dict[SegmentId, int] = {}
+        segment, start = self.active, self.active_size
+        while True:
+            fd = self.fds[segment] if segment in self.fds else self._open(segment)
+            end = size if segment == target else os.fstat(fd).st_size
+            valid_end = start
+            for offset, length, flags, key, _, expires_at in iter_records(os.pread(fd, end - start, start)):
+                valid_end = start + offset + length
+                records.append((key.decode(), flags, Location(segment, start + offset, length, expires_at)))
+            sizes[segment] = valid_end
+            if segment == target:
+                break
+            segment, start = (segment[0] + 1, 0), 0
+        self.active, self.active_size = target, size
+        return Catchup(None, records, sizes)
+
+    def _replay(self, now: float) -> Recovered:
+        """Rebuild the index from every segment; called with the directory locked exclusively"""
+        self.sync()
+        self.close_retired()
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+        self.epoch = self._read_state()[0]
+
+        if not self.compaction_locked and self.lock_compaction():
+            # Temp files of a compaction that died; a running one (another process) keeps its own
+            try:
+                for stray in self.directory.glob("*.tmp"):
+                    stray.unlink()
+            finally:
+                self.unlock_compaction()
+        segments = sorted(s for s in (parse_segment_name(p.name) for p in self.directory.glob("*.seg")) if s)
+
+        # A merged segment supersedes every segment before it
+        for position in range(len(segments) - 1, 0, -1):
+            with open(self.path(segments[position]), "rb") as f:
+                first = next(iter_records(f.read(HEADER.size + 64)), None)
+            if first is not None and first[2] == FLAG_MERGED:
+                for covered in segments[:position]:
+                    self.path(covered).unlink()
+                segments = segments[position:]
+                break
+
+        index: Dict[str, Location] = {}
+        sizes: Dict[SegmentId, int] = {}
+        live: Dict[SegmentId, int] = {}
+        for position, segment in enumerate(segments):
+            data = self.path(segment).read_bytes()
+            valid_end = 0
+            for offset, length, flags, key, _, expires_at in iter_records(data):
+                valid_end = offset + length
+                if flags == FLAG_MERGED:
+                    live[segment] = live.get(segment, 0) + length
+                    continue
+                name = key.decode()
+                previous = index.pop(name, None)
+                if previous is not None:
+                    live[previous.segment] -= previous.length
+                if flags == FLAG_PUT and expires_at > now:
+                    index[name] = Location(segment, offset, length, expires_at)
+                    live[segment] = live.get(segment, 0) + length
+            if valid_end < len(data):
+                logger.warning(f"Truncating {len(data) - valid_end} corrupt bytes from segment {segment_name(segment)}")
+                os.truncate(self.path(segment), valid_end)
+            sizes[segment] = valid_end
+            live.setdefault(segment, 0)
+            self._open(segment)
+
+        if segments:
+            self.active, self.active_size = segments[-1], sizes[segments[-1]]
+        else:
+            self.active, self.active_size = (0, 0), 0
+            self._open(self.active)
+            sizes[self.active], live[self.active] = 0, 0
+        self._write_state(self.epoch)
+        return index, sizes, live
+
+    def append(self, records: List[bytes], sync: bool, now: float) -> Tuple[Catchup, List[Tuple[SegmentId, int]]]:
+        """Append records (rotating segments as needed) after catching up with other processes
+
+        Returns what the catch-up found and each record's (segment, offset).
+        """
+        with self._locked(exclusive=True):
+            state = self._read_state()
+            changes = self._catch_up(state) if state[0] == self.epoch else Catchup(self._replay(now), [], {})
+            if os.fstat(self.fds[self.active]).st_size > self.active_size:
+                # A process died mid-append; drop its torn tail so offsets stay exact
+                os.ftruncate(self.fds[self.active], self.active_size)
+            locations = []
+            chunk: List[bytes] = []
+            chunk_size = 0
+            for record in records:
+                if self.active_size + chunk_size and self.active_size + chunk_size + len(record) > self.segment_max_bytes:
+                    self._write(chunk, chunk_size)
+                    chunk, chunk_size = [], 0
+                    self._rotate()
+                locations.append((self.active, self.active_size + chunk_size))
+                chunk.append(record)
+                chunk_size += len(record)
+            try:
+                self._write(chunk, chunk_size)
+            finally:
+                self._write_state(self.epoch)
+        if sync:
+            self.sync()
+        return changes, locations
+
+    def _write(self, chunk: List[bytes], size: int) -> None:
+        if not chunk:
+            return
+        fd = self.fds[self.active]
+        view = memoryview(b"".join(chunk))
+        try:
+            while view:
+                view = view[os.write(fd, view):]
+        except OSError:
+            os.ftruncate(fd, self.active_size)
+            raise
+        self.active_size += size
+        self.dirty = True
+
+    def _rotate(self) -> None:
+        os.fsync(self.fds[self.active])
+        self.active = (self.active[0] + 1, 0)
+        self.active_size = 0
+        self._open(self.active)
+
+    def sync(self) -> None:
+        if self.dirty:
+            self.dirty = False
+            os.fsync(self.fds[self.active])
+
+    def read(self, location: Location) -> Tuple[bytes, bytes]:
+        """Raises KeyError when the segment was retired by a compaction since ``location`` was looked up"""
+        fd = self.fds[location.segment] if location.segment in self.fds else self.retired[location.segment]
+        data = os.pread(fd, location.length, location.offset)
+        (_, _, _, key, value, _), = iter_records(data)
+        return key, value
+
+    def read_many(self, locations: List[Location]) -> List[Any]:
+        """Values for ``locations``; a failed read yields its exception in place"""
+        values: List[Any] = []
+        for location in locations:
+            try:
+                values.append(self.read(location)[1])
+            except Exception as e:
+                values.append(e)
+        return values
+
+    def install_merged(self, merged: SegmentId, tmp_path: Path, covered: List[SegmentId]) -> int:
+        """Publish a merged segment and unlink the ones it covers (their fds stay readable until close_retired)
+
+        Bumps the epoch so other processes replay; the log end is left as
+        the last append wrote it.
+        """
+        with self._locked(exclusive=True):
+            os.rename(tmp_path, self.path(merged))
+            self._open(merged)
+            for segment in covered:
+                self.retired[segment] = self.fds.pop(segment)
+                self.path(segment).unlink()
+            epoch, *end = self._read_state()
+            self.epoch = epoch + 1
+            os.pwrite(self.lock_fd, STATE.pack(self.epoch, *end), 0)
+        return os.fstat(self.fds[merged]).st_size
+
+    def close_retired(self) -> None:
+        for fd in self.retired.values():
+            os.close(fd)
+        self.retired.clear()
+
+    def close(self) -> None:
+        self.sync()
+        self.close_retired()
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            os.close(self.compaction_fd)
+            self.lock_fd = self.compaction_fd = None
+
+
+def write_merged(
+    directory: Path,
+    merged: SegmentId,
+    covered: List[SegmentId],
+    is_live: Callable[[str, SegmentId, int], bool],
+) -> Tuple[Path, List[Tuple[str, Location, Location]]]:
+    """Copy live records of ``covered`` into a temp segment; returns (temp path, [(key, old, new)])"""
+    tmp_path = directory / (segment_name(merged) + ".tmp")
+    moves = []
+    with open(tmp_path, "wb") as out:
+        offset = out.write(encode_record(b"", b"", 0.0, FLAG_MERGED))
+        for segment in covered:
+            data = (directory / segment_name(segment)).read_bytes()
+            for old_offset, length, flags, key, _, expires_at in iter_records(data):
+                name = key.decode()
+                if flags != FLAG_PUT or not is_live(name, segment, old_offset):
+                    continue
+                out.write(data[old_offset:old_offset + length])
+                moves.append((name, Location(segment, old_offset, length, expires_at), Location(merged, offset, length, expires_at)))
+                offset += length
+        out.flush()
+        os.fsync(out.fileno())
+    return tmp_path, moves
+
+
+class LogStore:
+    """Async key-value store over an append-only segment log"""
+
+    def __init__(self, config: Optional[LogStoreConfig] = None):
+        self.config = config or LogStoreConfig.from_environment()
+        self.files = SegmentFiles(Path(self.config.directory), self.config.segment_max_bytes)
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-store")
+        self._index: Dict[str, Location] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._sizes: Dict[SegmentId, int] = {}
+        self._live: Dict[SegmentId, int] = {}
+        self._access: Dict[str, List[float]] = {}
+        self._pending: List[Tuple[str, bytes, float, int, asyncio.Future]] = []
+        self._draining = False
+        self._pending_reads: List[Tuple[Location, asyncio.Future]] = []
+        self._reading = False
+        self._pending_refresh: List[asyncio.Future] = []
+        self._refreshing = False
+        self._opening: Optional[asyncio.Future] = None
+        self._opened = False
+        self._compacting = False
+        self._maintenance: Optional[asyncio.Task] = None
+        self.reads = 0
+        self.writes = 0
+        self.expired_removed = 0
+        self.compactions = 0
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._io, fn, *args)
+
+    async def open(self) -> None:
+        """Replay the log (once) and start background maintenance"""
+        if not self._opened:
+            if self._opening is None:
+                self._opening = asyncio.ensure_future(self._recover())
+            await asyncio.shield(self._opening)
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.get_running_loop().create_task(self._maintenance_loop())
+
+    async def _recover(self) -> None:
+        started = time.perf_counter()
+        self._load(await self._run(self.files.recover, time.time()))
+        self._opened = True
+        logger.info(
+            f"Log store opened at {self.config.directory}: {len(self._index)} keys, "
+            f"{len(self._sizes)} segments in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def _load(self, recovered: Recovered) -> None:
+        self._index, self._sizes, self._live = recovered
+        self._expiry = [(location.expires_at, key) for key, location in self._index.items()]
+        heapq.heapify(self._expiry)
+        self._access = {key: access for key, access in self._access.items() if key in self._index}
+
+    def _apply(self, key: str, flags: int, location: Location) -> None:
+        self._drop(key)
+        if flags == FLAG_PUT:
+            self._index[key] = location
+            self._live[location.segment] += location.length
+            heapq.heappush(self._expiry, (location.expires_at, key))
+
+    def _catch_up(self, changes: Catchup) -> None:
+        """Apply what other processes appended (or the replay after their compaction) to the index"""
+        if changes.recovered is not None:
+            self._load(changes.recovered)
+            return
+        for segment, size in changes.sizes.items():
+            self._sizes[segment] = size
+            self._live.setdefault(segment, 0)
+        for key, flags, location in changes.records:
+            self._apply(key, flags, location)
+
+    async def _refresh(self) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._pending_refresh.append(future)
+        if not self._refreshing:
+            self._refreshing = True
+            asyncio.get_running_loop().create_task(self._drain_refresh())
+        await future
+
+    async def _drain_refresh(self) -> None:
+        """Catch up with other processes once per batch of waiting lookups"""
+        try:
+            while self._pending_refresh:
+                batch, self._pending_refresh = self._pending_refresh, []
+                try:
+                    self._catch_up(await self._run(self.files.refresh, time.time()))
+                except Exception as e:
+                    for future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for future in batch:
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._refreshing = False
+
+    # Reads and writes ---------------------------------------------------
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await self.open()
+        await self._refresh()
+        location = self._index.get(key)
+        if location is None:
+            return None
+        if location.expires_at <= time.time():
+            self._drop(key)
+            return None
+        while True:
+            try:
+                value = await self._read(location)
+                break
+            except KeyError:
+                # A compaction retired the segment after the lookup; the index points at the merged copy now
+                if self._index.get(key) in (None, location):
+                    return None
+                location = self._index[key]
+        self.reads += 1
+        access = self._access.get(key)
+        if access is None:
+            self._access[key] = [1, time.time()]
+        else:
+            access[0] += 1
+            access[1] = time.time()
+        return value
+
+    async def _read(self, location: Location) -> bytes:
+        future = asyncio.get_running_loop().create_future()
+        self._pending_reads.append((location, future))
+        if not self._reading:
+            self._reading = True
+            asyncio.get_running_loop().create_task(self._drain_reads())
+        return await future
+
+    async def _drain_reads(self) -> None:
+        """Serve every queued read in one executor call per batch"""
+        try:
+            while self._pending_reads:
+                batch, self._pending_reads = self._pending_reads, []
+                try:
+                    values = await self._run(self.files.read_many, [location for location, _ in batch])
+                except Exception as e:
+                    values = [e] * len(batch)
+                for (_, future), value in zip(batch, values):
+                    if future.done():
+                        continue
+                    if isinstance(value, Exception):
+                        future.set_exception(value)
+                    else:
+                        future.set_result(value)
+        finally:
+            self._reading = False
+
+    async def put(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        await self.open()
+        expires_at = time.time() + ttl_seconds
+        await self._append(key, encode_record(key.encode(), value, expires_at), expires_at, FLAG_PUT)
+
+    async def delete(self, key: str) -> bool:
+        await self.open()
+        await self._refresh()
+        if key not in self._index:
+            return False
+        await self._append(key, encode_record(key.encode(), b"", 0.0, FLAG_DELETE), 0.0, FLAG_DELETE)
+        return True
+
+    async def _append(self, key: str, record: bytes, expires_at: float, flags: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((key, record, expires_at, flags, future))
+        if not self._draining:
+            self._draining = True
+            asyncio.get_running_loop().create_task(self._drain())
+        await future
+
+    async def _drain(self) -> None:
+        """Write every queued record in one executor call per batch, then apply them to the index in order"""
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    changes, locations = await self._run(
+                        self.files.append, [record for _, record, _, _, _ in batch], self.config.durable_writes, time.time()
+                    )
+                except Exception as e:
+                    for *_, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                self._catch_up(changes)
+                for (key, record, expires_at, flags, future), (segment, offset) in zip(batch, locations):
+                    self._sizes[segment] = offset + len(record)
+                    self._live.setdefault(segment, 0)
+                    self._apply(key, flags, Location(segment, offset, len(record), expires_at))
+                    self.writes += 1
+                    if not future.done():
+                        future.set_result(None)
+        finally:
+            self._draining = False
+
+    def _drop(self, key: str) -> None:
+        location = self._index.pop(key, None)
+        if location is not None:
+            self._live[location.segment] -= location.length
+        self._access.pop(key, None)
+
+    def access_info(self, key: str) -> Optional[Dict[str, Any]]:
+        """In-memory access statistics for ``key`` (not persisted)"""
+        access = self._access.get(key)
+        if access is None:
+            return None
+        return {"access_count": int(access[0]), "accessed_at": access[1]}
+
+    # Maintenance ----------------------------------------------------------
+
+    def cleanup_expired(self, now: Optional[float] = None) -> int:
+        """Drop expired keys from the index; their records become compaction garbage"""
+        now = time.time() if now is None else now
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            location = self._index.get(key)
+            if location is not None and location.expires_at == expires_at:
+                self._drop(key)
+                removed += 1
+        if len(self._expiry) > 2 * len(self._index) + 1024:
+            self._expiry = [(location.expires_at, key) for key, location in self._index.items()]
+            heapq.heapify(self._expiry)
+        self.expired_removed += removed
+        return removed
+
+    def _sealed(self) -> List[SegmentId]:
+        return sorted(s for s in self._sizes if s < self.files.active)
+
+    def garbage_ratio(self) -> float:
+        sealed = self._sealed()
+        total = sum(self._sizes[s] for s in sealed)
+        return 1 - sum(self._live[s] for s in sealed) / total if total else 0.0
+
+    async def compact(self, force: bool = False) -> bool:
+        """Merge all sealed segments into one if enough of them is garbage"""
+        sealed = self._sealed()
+        total = sum(self._sizes[s] for s in sealed)
+        if self._compacting or not sealed:
+            return False
+        if not force and (total < self.config.compaction_min_bytes or self.garbage_ratio() < self.config.compaction_garbage_ratio):
+            return False
+
+        self._compacting = True
+        started = time.perf_counter()
+        try:
+            if not await self._run(self.files.lock_compaction):
+                # Another process is compacting this directory
+                return False
+            try:
+                return await self._compact(started)
+            finally:
+                await self._run(self.files.unlock_compaction)
+        finally:
+            self._compacting = False
+
+    async def _compact(self, started: float) -> bool:
+        """Merge the sealed segments; the caller holds the directory's compaction lock"""
+        # Another process may have rotated or compacted since this one last looked
+        await self._refresh()
+        sealed = self._sealed()
+        if not sealed:
+            return False
+        total = sum(self._sizes[s] for s in sealed)
+        merged = (sealed[-1][0], sealed[-1][1] + 1)
+        index = self._index
+
+        def is_live(key: str, segment: SegmentId, offset: int) -> bool:
+            location = index.get(key)
+            return location is not None and location.segment == segment and location.offset == offset
+
+        try:
+            tmp_path, moves = await get_executor_registry().run_io(
+                write_merged, self.files.directory, merged, sealed, is_live, site="medium_term_memory.compact"
+            )
+        except ExecutorSaturated:
+            # Compaction can wait for the next maintenance round
+            logger.info("Log store compaction deferred: io executor saturated")
+            return False
+        size = await self._run(self.files.install_merged, merged, tmp_path, sealed)
+
+        live = HEADER.size  # merge marker
+        for key, old, new in moves:
+            if self._index.get(key) == old:
+                self._index[key] = new
+                live += new.length
+        for segment in sealed:
+            del self._sizes[segment], self._live[segment]
+        self._sizes[merged], self._live[merged] = size, live
+        await self._run(self.files.close_retired)
+
+        self.compactions += 1
+        logger.info(
+            f"Compacted {len(sealed)} segments ({total} bytes) into {size} bytes "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return True
+
+    async def _maintenance_loop(self) -> None:
+        interval = self.config.fsync_interval_ms / 1000
+        next_cleanup = time.monotonic() + self.config.maintenance_interval_s
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if self.files.dirty:
+                    await self._run(self.files.sync)
+                if time.monotonic() >= next_cleanup:
+                    next_cleanup = time.monotonic() + self.config.maintenance_interval_s
+                    self.cleanup_expired()
+                    await self.compact()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Log store maintenance failed: {e}")
+
+    async def close(self) -> None:
+        """Stop maintenance, fsync and close all segment files"""
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+            self._maintenance = None
+        if self._opened:
+            await self._run(self.files.close)
+            self._opened = False
+            self._opening = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "items": len(self._index),
+            "size_bytes": sum(self._sizes.values()),
+            "live_bytes": sum(self._live.values()),
+            "segments": len(self._sizes),
+            "garbage_ratio": round(self.garbage_ratio(), 3),
+            "reads": self.reads,
+            "writes": self.writes,
+            "expired_removed": self.expired_removed,
+            "compactions": self.compactions,
+        }
+
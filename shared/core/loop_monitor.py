@@ -0,0 +1,242 @@
+"""
+Event-Loop Blocking Detector for SarvanOM
+
+Always-on detection of synchronous code stalling a service's event loop
+(sync HTTP clients, model encodes, file or DB I/O called from async paths):
+- A heartbeat callback re-arms itself on the loop every ``heartbeat_ms``;
+  a watchdog thread notices when it is late by more than ``threshold_ms``
+- On the first late check the watchdog grabs the loop thread's stack once
+  and attributes the block to the innermost frame in this repository (the
+  offending call site) and the innermost frame overall (the blocking call)
+- Per-call-site counts, total and worst block time, plus recent events;
+  exported through the Prometheus endpoint
+- Costs one timer callback per heartbeat on the loop and one wakeup per
+  check in the watchdog; stacks are only read while the loop is blocked
+
+For full stacks and per-request flamegraphs use the sampling profiler
+(shared.core.sampling_profiler); blocking calls belong on the executor
+registry (shared.core.executor_registry).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from shared.core.sampling_profiler import short_path
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = str(Path(__file__).resolve().parents[2]) + os.sep
+OTHER_SITE = "(other)"
+UNKNOWN_SITE = "(unknown)"
+
+
+@dataclass
+class LoopMonitorConfig:
+    """Event-loop blocking detector configuration"""
+    enabled: bool = True
+    threshold_ms: float = 100.0
+    heartbeat_ms: float = 20.0
+    max_sites: int = 200
+    max_events: int = 100
+    log_interval_s: float = 10.0
+
+    @classmethod
+    def from_environment(cls) -> "LoopMonitorConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            enabled=os.getenv("LOOP_BLOCK_DETECTOR_ENABLED", "true").lower() == "true",
+            threshold_ms=float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100")),
+            heartbeat_ms=float(os.getenv("LOOP_BLOCK_HEARTBEAT_MS", "20")),
+            max_sites=int(os.getenv("LOOP_BLOCK_MAX_SITES", "200")),
+            log_interval_s=float(os.getenv("LOOP_BLOCK_LOG_INTERVAL_S", "10")),
+        )
+
+
+class BlockingSite:
+    """Aggregated blocks attributed to one call site"""
+
+    __slots__ = ("site", "blocking_call", "count", "total_s", "max_s", "last_at", "last_logged")
+
+    def __init__(self, site: str, blocking_call: str):
+        self.site = site
+        self.blocking_call = blocking_call
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.last_at = 0.0
+        self.last_logged = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "site": self.site,
+            "blocking_call": self.blocking_call,
+            "count": self.count,
+            "total_ms": round(self.total_s * 1000, 1),
+            "max_ms": round(self.max_s * 1000, 1),
+            "last_at": self.last_at,
+        }
+
+
+def attribute(frame) -> Tuple[str, str]:
+    """(call site, blocking call) for the stack ending at ``frame``
+
+    The call site is the innermost frame in this repository outside the
+    monitor itself; the blocking call is the innermost frame overall.
+    """
+    if frame is None:
+        return UNKNOWN_SITE, UNKNOWN_SITE
+    blocking_call = _describe(frame)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(REPO_ROOT) and "site-packages" not in filename and filename != __file__:
+            return _describe(frame), blocking_call
+        frame = frame.f_back
+    return blocking_call, blocking_call
+
+
+def _describe(frame) -> str:
+    code = frame.f_code
+    return f"{short_path(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+
+
+class LoopBlockingDetector:
+    """Heartbeat + watchdog thread that attributes event-loop blocks to call sites"""
+
+    def __init__(self, config: Optional[LoopMonitorConfig] = None):
+        self.config = config or LoopMonitorConfig.from_environment()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+
+        self._current: Optional[BlockingSite] = None
+        self._current_beat = 0.0
+        self._sites: Dict[str, BlockingSite] = {}
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=self.config.max_events)
+        self.blocks_total = 0
+        self.blocked_s_total = 0.0
+        self.max_block_s = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start watching the running loop; call from the loop thread"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self._thread.start()
+        logger.info(f"Loop blocking detector started (threshold {self.config.threshold_ms:g}ms)")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+
+    def _heartbeat(self) -> None:
+        self._last_beat = time.monotonic()
+        self._heartbeat_handle = self._loop.call_later(self.config.heartbeat_ms / 1000, self._heartbeat)
+
+    def _watch(self) -> None:
+        heartbeat_s = self.config.heartbeat_ms / 1000
+        threshold_s = self.config.threshold_ms / 1000
+        interval = min(heartbeat_s, threshold_s / 2)
+        while not self._stop.wait(interval):
+            if not self._loop.is_running():
+                continue
+            try:
+                self.check(time.monotonic(), heartbeat_s, threshold_s)
+            except Exception as e:  # never let the watchdog die silently
+                logger.debug(f"Loop blocking check failed: {e}")
+
+    def check(self, now: float, heartbeat_s: float, threshold_s: float) -> None:
+        """One watchdog check: start attributing a block, or close the current one"""
+        last_beat = self._last_beat
+        if self._current is None:
+            if now - last_beat - heartbeat_s < threshold_s:
+                return
+            frame = sys._current_frames().get(self._loop_thread_id)
+            site, blocking_call = attribute(frame)
+            del frame
+            self._current = BlockingSite(site, blocking_call)
+            self._current_beat = last_beat
+        elif last_beat != self._current_beat:
+            # The heartbeat ran again: the block ended when it was due to fire
+            self._record(self._current, last_beat - self._current_beat - heartbeat_s)
+            self._current = None
+
+    def _record(self, block: BlockingSite, duration_s: float) -> None:
+        with self._lock:
+            site = self._sites.get(block.site)
+            if site is None:
+                if len(self._sites) >= self.config.max_sites:
+                    block = BlockingSite(OTHER_SITE, OTHER_SITE)
+                site = self._sites.setdefault(block.site, block)
+            site.count += 1
+            site.total_s += duration_s
+            site.max_s = max(site.max_s, duration_s)
+            site.last_at = time.time()
+            self.blocks_total += 1
+            self.blocked_s_total += duration_s
+            self.max_block_s = max(self.max_block_s, duration_s)
+            self._events.append({
+                "at": site.last_at,
+                "duration_ms": round(duration_s * 1000, 1),
+                "site": block.site,
+                "blocking_call": block.blocking_call,
+            })
+            should_log = site.last_at - site.last_logged >= self.config.log_interval_s
+            if should_log:
+                site.last_logged = site.last_at
+        if should_log:
+            logger.warning(
+                f"Event loop blocked for {duration_s * 1000:.0f}ms at {block.site} "
+                f"(in {block.blocking_call}); offload it with the executor registry"
+            )
+
+    def get_sites(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Call sites by total blocked time"""
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda s: s.total_s, reverse=True)
+            return [s.to_dict() for s in sites[:limit]]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "threshold_ms": self.config.threshold_ms,
+                "blocks_total": self.blocks_total,
+                "blocked_seconds_total": round(self.blocked_s_total, 6),
+                "max_block_ms": round(self.max_block_s * 1000, 1),
+                "recent": list(self._events)[-10:],
+            }
+
+
+# Global loop blocking detector
+loop_blocking_detector = LoopBlockingDetector()
+
+
+def get_loop_blocking_detector() -> LoopBlockingDetector:
+    """Get the global loop blocking detector"""
+    return loop_blocking_detector
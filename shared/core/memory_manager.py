@@ -12,10 +12,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, List, Optional, Any, Tuple
-from pathlib import Path
 
 from pydantic import BaseModel, Field
 
+from shared.core.executor_registry import get_executor_registry
+from shared.core.log_store import LogStore, LogStoreConfig
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -87,115 +89,121 @@ class ShortTermMemory:
             return False
 
         try:
-            with self.db_service.get_session() as session:
-                # Create or update session memory
-                session_memory = self.SessionMemory(
-                    session_id=key,
-                    data=value,
-                    created_at=datetime.now(),
-                    expires_at=datetime.now() + timedelta(seconds=ttl_seconds),
-                )
-                session.merge(session_memory)
-                session.commit()
-                logger.debug(f"Stored in short-term memory: {key}")
-                return True
+            await get_executor_registry().run_io(self._store, key, value, ttl_seconds, site="short_term_memory.store")
+            logger.debug(f"Stored in short-term memory: {key}")
+            return True
         except Exception as e:
             logger.error(f"Failed to store in short-term memory: {e}")
             return False
 
+    def _store(self, key: str, value: Any, ttl_seconds: int) -> None:
+        with self.db_service.get_session() as session:
+            # Create or update session memory
+            session_memory = self.SessionMemory(
+                session_id=key,
+                data=value,
+                created_at=datetime.now(),
+                expires_at=datetime.now() + timedelta(seconds=ttl_seconds),
+            )
+            session.merge(session_memory)
+            session.commit()
+
     async def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve item from short-term memory."""
         if not self.db_service:
             return None
 
         try:
-            with self.db_service.get_session() as session:
-                session_memory = (
-                    session.query(self.SessionMemory)
-                    .filter(
-                        self.SessionMemory.session_id == key,
-                        self.SessionMemory.expires_at > datetime.now(),
-                    )
-                    .first()
-                )
-
-                if session_memory:
-                    session_memory.accessed_at = datetime.now()
-                    session_memory.access_count += 1
-                    session.commit()
-                    logger.debug(f"Retrieved from short-term memory: {key}")
-                    return session_memory.data
-                return None
+            data = await get_executor_registry().run_io(self._retrieve, key, site="short_term_memory.retrieve")
+            if data is not None:
+                logger.debug(f"Retrieved from short-term memory: {key}")
+            return data
         except Exception as e:
             logger.error(f"Failed to retrieve from short-term memory: {e}")
             return None
 
+    def _retrieve(self, key: str) -> Optional[Any]:
+        with self.db_service.get_session() as session:
+            session_memory = (
+                session.query(self.SessionMemory)
+                .filter(
+                    self.SessionMemory.session_id == key,
+                    self.SessionMemory.expires_at > datetime.now(),
+                )
+                .first()
+            )
+
+            if session_memory:
+                session_memory.accessed_at = datetime.now()
+                session_memory.access_count += 1
+                session.commit()
+                return session_memory.data
+            return None
+
     async def delete(self, key: str) -> bool:
         """Delete item from short-term memory."""
         if not self.db_service:
             return False
 
         try:
-            with self.db_service.get_session() as session:
-                result = (
-                    session.query(self.SessionMemory)
-                    .filter(self.SessionMemory.session_id == key)
-                    .delete()
-                )
-                session.commit()
-                logger.debug(f"Deleted from short-term memory: {key}")
-                return result > 0
+            deleted = await get_executor_registry().run_io(self._delete, key, site="short_term_memory.delete")
+            logger.debug(f"Deleted from short-term memory: {key}")
+            return deleted > 0
         except Exception as e:
             logger.error(f"Failed to delete from short-term memory: {e}")
             return False
 
+    def _delete(self, key: str) -> int:
+        with self.db_service.get_session() as session:
+            result = (
+                session.query(self.SessionMemory)
+                .filter(self.SessionMemory.session_id == key)
+                .delete()
+            )
+            session.commit()
+            return result
+
     async def get_stats(self) -> Dict[str, Any]:
         """Get short-term memory statistics."""
         if not self.db_service:
             return {"items": 0, "size_bytes": 0}
 
         try:
-            with self.db_service.get_session() as session:
-                total_items = session.query(self.SessionMemory).count()
-                active_items = (
-                    session.query(self.SessionMemory)
-                    .filter(self.SessionMemory.expires_at > datetime.now())
-                    .count()
-                )
-
-                return {
-                    "items": total_items,
-                    "active_items": active_items,
-                    "size_bytes": total_items * 1024,  # Approximate
-                }
+            return await get_executor_registry().run_io(self._stats, site="short_term_memory.stats")
         except Exception as e:
             logger.error(f"Failed to get short-term memory stats: {e}")
             return {"items": 0, "size_bytes": 0}
 
+    def _stats(self) -> Dict[str, Any]:
+        with self.db_service.get_session() as session:
+            total_items = session.query(self.SessionMemory).count()
+            active_items = (
+                session.query(self.SessionMemory)
+                .filter(self.SessionMemory.expires_at > datetime.now())
+                .count()
+            )
+
+            return {
+                "items": total_items,
+                "active_items": active_items,
+                "size_bytes": total_items * 1024,  # Approximate
+            }
+
 
 class MediumTermMemory:
-    """File-based medium-term memory."""
+    """Log-structured medium-term memory (append-only segments, see shared.core.log_store)."""
 
-    def __init__(self, storage_dir: str = "session_storage"):
-        self.storage_dir = Path(storage_dir)
-        self.storage_dir.mkdir(exist_ok=True)
-        logger.info(f"MediumTermMemory initialized with storage dir: {storage_dir}")
+    def __init__(self, storage_dir: Optional[str] = None, config: Optional[LogStoreConfig] = None):
+        config = config or LogStoreConfig.from_environment()
+        if storage_dir is not None:
+            config.directory = storage_dir
+        self.log = LogStore(config)
+        logger.info(f"MediumTermMemory initialized with storage dir: {config.directory}")
 
     async def store(self, key: str, value: Any, ttl_seconds: int = 86400) -> bool:
         """Store item in medium-term memory."""
         try:
-            file_path = self.storage_dir / f"{key}.json"
-            data = {
-                "value": value,
-                "created_at": datetime.now().isoformat(),
-                "accessed_at": datetime.now().isoformat(),
-                "access_count": 0,
-                "ttl_seconds": ttl_seconds,
-            }
-
-            with open(file_path, "w") as f:
-                json.dump(data, f)
-
+            await self.log.put(key, json.dumps(value).encode(), ttl_seconds)
             logger.debug(f"Stored in medium-term memory: {key}")
             return True
         except Exception as e:
@@ -205,63 +213,36 @@ class MediumTermMemory:
     async def retrieve(self, key: str) -> Optional[Any]:
         """Retrieve item from medium-term memory."""
         try:
-            file_path = self.storage_dir / f"{key}.json"
-            if not file_path.exists():
-                return None
-
-            with open(file_path, "r") as f:
-                data = json.load(f)
-
-            # Check TTL
-            created_at = datetime.fromisoformat(data["created_at"])
-            if datetime.now() - created_at > timedelta(seconds=data["ttl_seconds"]):
-                await self.delete(key)
+            raw = await self.log.get(key)
+            if raw is None:
                 return None
-
-            # Update access info
-            data["accessed_at"] = datetime.now().isoformat()
-            data["access_count"] += 1
-
-            with open(file_path, "w") as f:
-                json.dump(data, f)
-
             logger.debug(f"Retrieved from medium-term memory: {key}")
-            return data["value"]
+            return json.loads(raw)
         except Exception as e:
             logger.error(f"Failed to retrieve from medium-term memory: {e}")
             return None
 
+    def get_access_info(self, key: str) -> Optional[Dict[str, Any]]:
+        """Access count and last access time for a key (kept in memory only)."""
+        return self.log.access_info(key)
+
     async def delete(self, key: str) -> bool:
         """Delete item from medium-term memory."""
         try:
-            file_path = self.storage_dir / f"{key}.json"
-            if file_path.exists():
-                file_path.unlink()
+            deleted = await self.log.delete(key)
+            if deleted:
                 logger.debug(f"Deleted from medium-term memory: {key}")
-                return True
-            return False
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete from medium-term memory: {e}")
             return False
 
     async def cleanup_expired(self) -> int:
-        """Clean up expired items."""
-        cleaned_count = 0
+        """Clean up expired items and compact the log if enough of it is garbage."""
         try:
-            for file_path in self.storage_dir.glob("*.json"):
-                try:
-                    with open(file_path, "r") as f:
-                        data = json.load(f)
-
-                    created_at = datetime.fromisoformat(data["created_at"])
-                    if datetime.now() - created_at > timedelta(
-                        seconds=data["ttl_seconds"]
-                    ):
-                        file_path.unlink()
-                        cleaned_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to process file {file_path}: {e}")
-
+            await self.log.open()
+            cleaned_count = self.log.cleanup_expired()
+            await self.log.compact()
             logger.info(
                 f"Cleaned up {cleaned_count} expired items from medium-term memory"
             )
@@ -273,13 +254,16 @@ class MediumTermMemory:
     async def get_stats(self) -> Dict[str, Any]:
         """Get medium-term memory statistics."""
         try:
-            files = list(self.storage_dir.glob("*.json"))
-            total_size = sum(f.stat().st_size for f in files)
-            return {"items": len(files), "size_bytes": total_size}
+            await self.log.open()
+            return self.log.get_stats()
         except Exception as e:
             logger.error(f"Failed to get medium-term memory stats: {e}")
             return {"items": 0, "size_bytes": 0}
 
+    async def close(self) -> None:
+        """Flush and close the segment log."""
+        await self.log.close()
+
 
 class LongTermMemory:
     """Knowledge graph-based long-term memory."""
@@ -1,57 +1,107 @@
 """
 Memory Manager PostgreSQL - Universal Knowledge Platform
-PostgreSQL-based session memory management using JSONB fields.
+PostgreSQL-based session memory management, one row per interaction.
 
-This module implements a memory manager that uses PostgreSQL JSONB
-fields to store session memory, replacing Redis for zero-budget persistence.
+This module implements a memory manager that stores session memory in
+PostgreSQL, replacing Redis for zero-budget persistence.
 
 Features:
-- PostgreSQL JSONB storage for session memory
-- Automatic TTL-like behavior with manual cleanup
-- Efficient querying with GIN indexes
+- One row per interaction, indexed by (session_id, ts), so per-turn cost
+  doesn't grow with conversation length
+- Async SQLAlchemy sessions (asyncpg) from the shared connection manager
+- Recent-N context as a LIMIT query
+- Concurrent writes batched into one multi-row INSERT per flush window
+- Expiry as a background job of bounded bulk DELETEs
 - Session context management for orchestrator integration
-- Zero-budget alternative to Redis
 
 Authors:
     - Universal Knowledge Platform Engineering Team
 
 Version:
-    1.0.0 (2024-12-28)
+    2.0.0
 """
 
 import asyncio
 import logging
+import os
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional
 
-from sqlalchemy import select, update, delete, func, and_
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
-from shared.core.database import DatabaseService, get_database_service
-from shared.models.session_memory import SessionMemory
+from shared.models.session_memory import SessionInteraction
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SessionMemoryConfig:
+    """Session memory configuration"""
+    ttl_hours: int = 24
+    flush_window_ms: float = 5.0
+    max_batch: int = 500
+    cleanup_interval_s: float = 300.0
+    cleanup_batch_size: int = 10000
+
+    @classmethod
+    def from_environment(cls) -> "SessionMemoryConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            ttl_hours=int(os.getenv("SESSION_MEMORY_TTL_HOURS", "24")),
+            flush_window_ms=float(os.getenv("SESSION_MEMORY_FLUSH_WINDOW_MS", "5")),
+            max_batch=int(os.getenv("SESSION_MEMORY_MAX_BATCH", "500")),
+            cleanup_interval_s=float(os.getenv("SESSION_MEMORY_CLEANUP_INTERVAL_S", "300")),
+            cleanup_batch_size=int(os.getenv("SESSION_MEMORY_CLEANUP_BATCH_SIZE", "10000")),
+        )
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Drivers without timezone support return naive UTC datetimes"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class MemoryManagerPostgres:
     """
     PostgreSQL-based memory manager for session memory.
 
-    Manages session memory using PostgreSQL JSONB fields with
-    automatic TTL-like behavior and efficient querying.
+    Stores each query/answer interaction as its own row; reads are indexed
+    LIMIT queries and expiry is a periodic bulk DELETE.
     """
 
-    def __init__(self, database_service: Optional[DatabaseService] = None):
+    def __init__(
+        self,
+        database_service=None,
+        session_factory: Optional[async_sessionmaker] = None,
+        config: Optional[SessionMemoryConfig] = None,
+    ):
         """
         Initialize the PostgreSQL memory manager.
 
         Args:
-            database_service: Database service instance (auto-initialized if None)
+            database_service: Database connection manager (auto-initialized if None)
+            session_factory: Async session factory (defaults to the manager's primary database)
+            config: Session memory configuration (defaults to environment)
         """
-        self.db_service = database_service or get_database_service()
-        self.default_ttl_hours = 24  # 1 day default TTL
+        if session_factory is None:
+            if database_service is None:
+                from shared.core.database import get_database_service
+
+                database_service = get_database_service()
+            session_factory = database_service.get_async_session_factory()
+        self.session_factory = session_factory
+        self.config = config or SessionMemoryConfig.from_environment()
+        self.default_ttl_hours = self.config.ttl_hours
+        self._pending: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self.rows_inserted = 0
+        self.insert_batches = 0
+        self.rows_expired = 0
         logger.info("MemoryManagerPostgres initialized")
 
     async def add_to_memory(
@@ -64,6 +114,9 @@ class MemoryManagerPostgres:
         """
         Add a query-answer interaction to session memory.
 
+        Concurrent calls within the flush window share one INSERT; the call
+        returns once its row is committed.
+
         Args:
             session_id: Unique session identifier
             query: User's query
@@ -73,26 +126,59 @@ class MemoryManagerPostgres:
         Returns:
             True if successfully added, False otherwise
         """
-        try:
-            with self.db_service.get_session() as session:
-                # Get or create session memory
-                session_memory = await self._get_or_create_session_memory(
-                    session, session_id
-                )
-
-                # Add the interaction
-                session_memory.add_interaction(query, answer, timestamp)
-
-                # Save to database
-                session.commit()
-
-                logger.debug(f"Added interaction to session {session_id}")
-                return True
+        row = {
+            "session_id": session_id,
+            "ts": timestamp or datetime.now(timezone.utc),
+            "query": query,
+            "answer": answer,
+        }
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.config.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.config.flush_window_ms / 1000, self._flush)
 
+        try:
+            await asyncio.shield(future)
+            logger.debug(f"Added interaction to session {session_id}")
+            return True
         except Exception as e:
             logger.error(f"Failed to add interaction to session {session_id}: {e}")
             return False
 
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._insert_batch(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _insert_batch(self, batch: List[tuple]) -> None:
+        try:
+            async with self.session_factory() as session:
+                await session.execute(insert(SessionInteraction), [row for row, _ in batch])
+                await session.commit()
+            self.rows_inserted += len(batch)
+            self.insert_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def flush(self) -> None:
+        """Write any buffered interactions now."""
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
     async def get_context(
         self, session_id: str, limit: int = 5
     ) -> List[Dict[str, Any]]:
@@ -107,31 +193,24 @@ class MemoryManagerPostgres:
             List of recent interactions sorted by timestamp (newest first)
         """
         try:
-            with self.db_service.get_session() as session:
-                # Get session memory
-                session_memory = await self._get_session_memory(session, session_id)
-
-                if not session_memory:
-                    return []
-
-                # Remove expired interactions (TTL-like behavior)
-                expired_count = session_memory.remove_expired_interactions(
-                    self.default_ttl_hours
-                )
-
-                if expired_count > 0:
-                    session.commit()
-                    logger.debug(
-                        f"Removed {expired_count} expired interactions from session {session_id}"
-                    )
-
-                # Get recent interactions
-                recent_interactions = session_memory.get_recent_interactions(limit)
-
-                logger.debug(
-                    f"Retrieved {len(recent_interactions)} interactions for session {session_id}"
-                )
-                return recent_interactions
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=self.default_ttl_hours)
+            query = (
+                select(SessionInteraction.query, SessionInteraction.answer, SessionInteraction.ts)
+                .where(SessionInteraction.session_id == session_id, SessionInteraction.ts >= cutoff_time)
+                .order_by(SessionInteraction.ts.desc(), SessionInteraction.id.desc())
+                .limit(limit)
+            )
+            async with self.session_factory() as session:
+                result = await session.execute(query)
+                recent_interactions = [
+                    {"query": row.query, "answer": row.answer, "timestamp": _as_utc(row.ts).isoformat()}
+                    for row in result
+                ]
+
+            logger.debug(
+                f"Retrieved {len(recent_interactions)} interactions for session {session_id}"
+            )
+            return recent_interactions
 
         except Exception as e:
             logger.error(f"Failed to get context for session {session_id}: {e}")
@@ -139,7 +218,7 @@ class MemoryManagerPostgres:
 
     async def clear_memory(self, session_id: str) -> bool:
         """
-        Delete the session record from the table.
+        Delete all interactions of a session.
 
         Args:
             session_id: Unique session identifier
@@ -148,20 +227,17 @@ class MemoryManagerPostgres:
             True if successfully deleted, False otherwise
         """
         try:
-            with self.db_service.get_session() as session:
-                # Delete session memory
-                result = session.execute(
-                    delete(SessionMemory).where(SessionMemory.session_id == session_id)
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    delete(SessionInteraction).where(SessionInteraction.session_id == session_id)
                 )
-                session.commit()
+                await session.commit()
 
-                deleted_count = result.rowcount
-                if deleted_count > 0:
-                    logger.info(f"Cleared memory for session {session_id}")
-                    return True
-                else:
-                    logger.debug(f"No session memory found for {session_id}")
-                    return False
+            if result.rowcount > 0:
+                logger.info(f"Cleared memory for session {session_id}")
+                return True
+            logger.debug(f"No session memory found for {session_id}")
+            return False
 
         except Exception as e:
             logger.error(f"Failed to clear memory for session {session_id}: {e}")
@@ -178,27 +254,20 @@ class MemoryManagerPostgres:
             Dictionary with session statistics
         """
         try:
-            with self.db_service.get_session() as session:
-                session_memory = await self._get_session_memory(session, session_id)
-
-                if not session_memory:
-                    return {
-                        "session_id": session_id,
-                        "exists": False,
-                        "history_length": 0,
-                        "last_updated": None,
-                    }
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(func.count(SessionInteraction.id), func.max(SessionInteraction.ts)).where(
+                        SessionInteraction.session_id == session_id
+                    )
+                )
+                history_length, last_updated = result.one()
 
-                return {
-                    "session_id": session_id,
-                    "exists": True,
-                    "history_length": len(session_memory.history),
-                    "last_updated": (
-                        session_memory.updated_at.isoformat()
-                        if session_memory.updated_at
-                        else None
-                    ),
-                }
+            return {
+                "session_id": session_id,
+                "exists": history_length > 0,
+                "history_length": history_length,
+                "last_updated": _as_utc(last_updated).isoformat() if last_updated else None,
+            }
 
         except Exception as e:
             logger.error(f"Failed to get stats for session {session_id}: {e}")
@@ -214,36 +283,62 @@ class MemoryManagerPostgres:
         self, max_age_hours: Optional[int] = None
     ) -> int:
         """
-        Clean up sessions that haven't been updated for the specified time.
+        Delete interactions older than the specified age.
+
+        Runs as bounded bulk DELETEs on the ts index so no single
+        transaction holds locks on a large range.
 
         Args:
             max_age_hours: Maximum age in hours (defaults to default_ttl_hours)
 
         Returns:
-            Number of sessions cleaned up
+            Number of interactions deleted
         """
         if max_age_hours is None:
             max_age_hours = self.default_ttl_hours
 
+        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+        expired_ids = (
+            select(SessionInteraction.id)
+            .where(SessionInteraction.ts < cutoff_time)
+            .limit(self.config.cleanup_batch_size)
+            .scalar_subquery()
+        )
+        deleted_count = 0
         try:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
+            while True:
+                async with self.session_factory() as session:
+                    result = await session.execute(
+                        delete(SessionInteraction).where(SessionInteraction.id.in_(expired_ids))
+                    )
+                    await session.commit()
+                deleted_count += result.rowcount
+                if result.rowcount < self.config.cleanup_batch_size:
+                    break
+        except Exception as e:
+            logger.error(f"Failed to cleanup expired sessions: {e}")
 
-            with self.db_service.get_session() as session:
-                # Delete sessions older than cutoff time
-                result = session.execute(
-                    delete(SessionMemory).where(SessionMemory.updated_at < cutoff_time)
-                )
-                session.commit()
+        self.rows_expired += deleted_count
+        if deleted_count > 0:
+            logger.info(f"Cleaned up {deleted_count} expired interactions")
+        return deleted_count
 
-                deleted_count = result.rowcount
-                if deleted_count > 0:
-                    logger.info(f"Cleaned up {deleted_count} expired sessions")
+    def start(self) -> None:
+        """Start the background expiry job."""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.get_running_loop().create_task(self._cleanup_loop())
 
-                return deleted_count
+    async def stop(self) -> None:
+        """Stop the expiry job and write any buffered interactions."""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+        await self.flush()
 
-        except Exception as e:
-            logger.error(f"Failed to cleanup expired sessions: {e}")
-            return 0
+    async def _cleanup_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.cleanup_interval_s)
+            await self.cleanup_expired_sessions()
 
     async def get_all_sessions(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -256,35 +351,27 @@ class MemoryManagerPostgres:
             List of session statistics
         """
         try:
-            with self.db_service.get_session() as session:
-                # Query all sessions with basic stats
-                query = (
-                    select(
-                        SessionMemory.session_id,
-                        SessionMemory.updated_at,
-                        func.jsonb_array_length(SessionMemory.history).label(
-                            "history_length"
-                        ),
-                    )
-                    .order_by(SessionMemory.updated_at.desc())
-                    .limit(limit)
+            updated_at = func.max(SessionInteraction.ts).label("updated_at")
+            query = (
+                select(
+                    SessionInteraction.session_id,
+                    updated_at,
+                    func.count(SessionInteraction.id).label("history_length"),
                 )
-
-                result = session.execute(query)
-                sessions = []
-
-                for row in result:
-                    sessions.append(
-                        {
-                            "session_id": row.session_id,
-                            "updated_at": (
-                                row.updated_at.isoformat() if row.updated_at else None
-                            ),
-                            "history_length": row.history_length or 0,
-                        }
-                    )
-
-                return sessions
+                .group_by(SessionInteraction.session_id)
+                .order_by(updated_at.desc())
+                .limit(limit)
+            )
+            async with self.session_factory() as session:
+                result = await session.execute(query)
+                return [
+                    {
+                        "session_id": row.session_id,
+                        "updated_at": _as_utc(row.updated_at).isoformat() if row.updated_at else None,
+                        "history_length": row.history_length or 0,
+                    }
+                    for row in result
+                ]
 
         except Exception as e:
             logger.error(f"Failed to get all sessions: {e}")
@@ -298,26 +385,29 @@ class MemoryManagerPostgres:
             Dictionary with health status and statistics
         """
         try:
-            with self.db_service.get_session() as session:
-                # Check if we can query the table
-                result = session.execute(select(func.count(SessionMemory.session_id)))
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=1)
+            async with self.session_factory() as session:
+                result = await session.execute(
+                    select(func.count(func.distinct(SessionInteraction.session_id)))
+                )
                 total_sessions = result.scalar() or 0
 
-                # Get recent sessions count
-                cutoff_time = datetime.now(timezone.utc) - timedelta(hours=1)
-                result = session.execute(
-                    select(func.count(SessionMemory.session_id)).where(
-                        SessionMemory.updated_at >= cutoff_time
+                result = await session.execute(
+                    select(func.count(func.distinct(SessionInteraction.session_id))).where(
+                        SessionInteraction.ts >= cutoff_time
                     )
                 )
                 recent_sessions = result.scalar() or 0
 
-                return {
-                    "status": "healthy",
-                    "total_sessions": total_sessions,
-                    "recent_sessions": recent_sessions,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
+            return {
+                "status": "healthy",
+                "total_sessions": total_sessions,
+                "recent_sessions": recent_sessions,
+                "rows_inserted": self.rows_inserted,
+                "insert_batches": self.insert_batches,
+                "rows_expired": self.rows_expired,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
 
         except Exception as e:
             logger.error(f"Health check failed: {e}")
@@ -327,53 +417,11 @@ class MemoryManagerPostgres:
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
-    async def _get_or_create_session_memory(
-        self, session: Session, session_id: str
-    ) -> SessionMemory:
-        """
-        Get existing session memory or create a new one.
-
-        Args:
-            session: Database session
-            session_id: Unique session identifier
-
-        Returns:
-            SessionMemory instance
-        """
-        # Try to get existing session memory
-        session_memory = await self._get_session_memory(session, session_id)
-
-        if not session_memory:
-            # Create new session memory
-            session_memory = SessionMemory(session_id=session_id)
-            session.add(session_memory)
-            logger.debug(f"Created new session memory for {session_id}")
-
-        return session_memory
-
-    async def _get_session_memory(
-        self, session: Session, session_id: str
-    ) -> Optional[SessionMemory]:
-        """
-        Get session memory by session ID.
-
-        Args:
-            session: Database session
-            session_id: Unique session identifier
-
-        Returns:
-            SessionMemory instance or None if not found
-        """
-        result = session.execute(
-            select(SessionMemory).where(SessionMemory.session_id == session_id)
-        )
-        return result.scalar_one_or_none()
-
     async def __aenter__(self):
         """Async context manager entry."""
+        self.start()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        # No cleanup needed for database connections
-        pass
+        await self.stop()
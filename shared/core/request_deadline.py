@@ -0,0 +1,208 @@
+"""
+Request Deadline Propagation for SarvanOM
+
+A single per-request deadline that is created at ingress, carried in a
+contextvar inside the process and in the ``X-Request-Deadline-Ms`` header
+between services, and consumed by every lane, provider call and retry loop.
+
+Layers no longer re-derive their own budgets from scratch: each one asks for
+``effective_timeout(its_budget)`` which is the smaller of its own budget and
+what is left of the request deadline, and work that cannot finish before the
+deadline is never started (``check_deadline`` / ``run_with_deadline``).
+The ingress middleware lives in ``shared.core.deadline_middleware`` so this
+module stays free of web-framework imports.
+
+The header carries the *remaining* budget in milliseconds rather than an
+absolute timestamp, so clock skew between services does not matter.
+"""
+
+import asyncio
+import contextvars
+import time
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """Raised when work is refused or cut short because the request deadline has passed."""
+
+    def __init__(self, operation: str, remaining_ms: float):
+        super().__init__(f"Request deadline exceeded before {operation} (remaining {remaining_ms:.0f}ms)")
+        self.operation = operation
+        self.remaining_ms = remaining_ms
+
+
+@dataclass(frozen=True)
+class RequestDeadline:
+    """Absolute deadline for a request, tracked on the monotonic clock."""
+    expires_at: float
+    budget_ms: float
+
+    @classmethod
+    def after(cls, budget_ms: float) -> "RequestDeadline":
+        """Create a deadline ``budget_ms`` from now."""
+        budget_ms = max(0.0, float(budget_ms))
+        return cls(expires_at=time.monotonic() + budget_ms / 1000, budget_ms=budget_ms)
+
+    @classmethod
+    def from_header_value(cls, value: Optional[str], max_budget_ms: Optional[float] = None) -> Optional["RequestDeadline"]:
+        """Parse a remaining-milliseconds header value; ``None`` if absent or malformed."""
+        if not value:
+            return None
+        try:
+            remaining_ms = float(value)
+        except ValueError:
+            logger.warning(f"Ignoring malformed {DEADLINE_HEADER} header: {value!r}")
+            return None
+        if max_budget_ms is not None:
+            remaining_ms = min(remaining_ms, max_budget_ms)
+        return cls.after(remaining_ms)
+
+    @property
+    def remaining_seconds(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def remaining_ms(self) -> float:
+        return self.remaining_seconds * 1000
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def narrow(self, budget_ms: float) -> "RequestDeadline":
+        """Return a deadline that is no later than ``budget_ms`` from now."""
+        candidate = RequestDeadline.after(budget_ms)
+        return candidate if candidate.expires_at < self.expires_at else self
+
+    def timeout_for(self, budget_s: float, reserve_s: float = 0.0) -> float:
+        """Timeout for a step with its own budget, keeping ``reserve_s`` back for the caller."""
+        return max(0.0, min(budget_s, self.remaining_seconds - reserve_s))
+
+    def can_start(self, min_required_s: float = 0.0) -> bool:
+        """Whether a step that needs at least ``min_required_s`` can still finish in time."""
+        return self.remaining_seconds > min_required_s
+
+    def to_header_value(self) -> str:
+        return str(int(self.remaining_ms))
+
+
+_current_deadline: contextvars.ContextVar[Optional[RequestDeadline]] = contextvars.ContextVar(
+    "sarvanom_request_deadline", default=None
+)
+
+
+def get_current_deadline() -> Optional[RequestDeadline]:
+    """Get the deadline of the request being processed, if any."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(
+    budget_ms: Optional[float] = None,
+    deadline: Optional[RequestDeadline] = None
+) -> Iterator[RequestDeadline]:
+    """
+    Run a block under a (possibly narrower) request deadline.
+
+    Nested scopes can only shorten the deadline, never extend it. Do not
+    ``yield`` from an async generator inside this block; the contextvar token
+    must be reset in the same context it was set in.
+    """
+    current = _current_deadline.get()
+    if deadline is None:
+        if budget_ms is None:
+            raise ValueError("deadline_scope requires budget_ms or deadline")
+        deadline = RequestDeadline.after(budget_ms)
+    if current is not None and current.expires_at < deadline.expires_at:
+        deadline = current
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def remaining_seconds(default: Optional[float] = None) -> Optional[float]:
+    """Remaining request budget in seconds, or ``default`` if no deadline is active."""
+    deadline = _current_deadline.get()
+    return deadline.remaining_seconds if deadline is not None else default
+
+
+def effective_timeout(budget_s: float, reserve_s: float = 0.0) -> float:
+    """
+    Clamp a step's own timeout to the remaining request deadline.
+
+    Returns ``budget_s`` unchanged when no deadline is active.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return budget_s
+    return deadline.timeout_for(budget_s, reserve_s)
+
+
+def check_deadline(operation: str, min_required_s: float = 0.0) -> None:
+    """
+    Refuse to start ``operation`` if it cannot finish before the deadline.
+
+    Raises:
+        DeadlineExceededError: If the remaining budget is ``<= min_required_s``
+    """
+    deadline = _current_deadline.get()
+    if deadline is not None and not deadline.can_start(min_required_s):
+        raise DeadlineExceededError(operation, deadline.remaining_ms)
+
+
+async def run_with_deadline(
+    factory: Callable[[], Awaitable[T]],
+    budget_s: float,
+    operation: str,
+    min_required_s: float = 0.0,
+    reserve_s: float = 0.0
+) -> T:
+    """
+    Await ``factory()`` with its timeout clamped to the request deadline.
+
+    The coroutine is only created once the deadline check has passed, so
+    skipped work never starts.
+
+    Raises:
+        DeadlineExceededError: If there is no time left to start the operation
+        asyncio.TimeoutError: If the operation overruns its effective timeout
+    """
+    check_deadline(operation, min_required_s)
+    timeout = effective_timeout(budget_s, reserve_s)
+    if timeout <= 0:
+        raise DeadlineExceededError(operation, 0.0)
+    return await asyncio.wait_for(factory(), timeout=timeout)
+
+
+def deadline_headers(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Return ``headers`` with the remaining deadline added for an outbound call."""
+    headers = dict(headers or {})
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        headers[DEADLINE_HEADER] = deadline.to_header_value()
+    return headers
+
+
+def get_request_deadline_status() -> Dict[str, Any]:
+    """Describe the active deadline for logging and debug endpoints."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return {"active": False}
+    return {
+        "active": True,
+        "budget_ms": deadline.budget_ms,
+        "remaining_ms": round(deadline.remaining_ms, 2),
+        "expired": deadline.expired,
+    }
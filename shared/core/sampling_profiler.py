@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Sampling Profiler
+
+Opt-in, always-on statistical CPU profiler for the gateway and retrieval
+services:
+- A daemon thread samples every thread's Python stack about 100 times a
+  second (sys._current_frames); threads parked in select/lock waits are
+  skipped unless idle samples are requested
+- Samples on the event-loop thread are attributed to the request whose
+  task was running (endpoint + trace_id, registered by the middleware)
+- Stacks are aggregated as folded stacks ("root;frame;frame count"), the
+  input format of flamegraph.pl, speedscope and inferno; the number of
+  distinct stacks is bounded
+- /_debug/profile?seconds=N captures a window and returns it folded;
+  seconds=0 returns everything since the profiler started. The endpoints
+  are only mounted with PROFILER_ENABLED=true and a PROFILER_DEBUG_TOKEN,
+  and every call must present that token
+- A loop heartbeat lets the sampler notice when the event loop has been
+  blocked for longer than the stall threshold and keep the blocking stack
+
+The sampler measures its own cost (time spent sampling / wall time) so
+the <2% overhead target can be checked in production.
+
+Following MAANG/OpenAI/Perplexity standards for production profiling.
+"""
+
+import asyncio
+import hmac
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames that mean "waiting, not working": (filename suffix, function)
+IDLE_FRAMES = (
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("concurrent/futures/thread.py", "_worker"),
+    ("socket.py", "accept"),
+)
+
+UNATTRIBUTED = "(unattributed)"
+STACK_TABLE_FULL = "(stack table full)"
+TRACE_IDS_PER_ENDPOINT = 256
+
+
+@dataclass
+class ProfilerConfig:
+    """Sampling profiler configuration"""
+    enabled: bool = False
+    hz: float = 100.0
+    max_depth: int = 64
+    max_stacks: int = 20000
+    include_idle: bool = False
+    stall_threshold_ms: float = 100.0
+    heartbeat_ms: float = 10.0
+    max_stalls: int = 100
+    max_window_s: float = 60.0
+    debug_token: Optional[str] = None
+
+    @classmethod
+    def from_environment(cls) -> "ProfilerConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            enabled=os.getenv("PROFILER_ENABLED", "false").lower() == "true",
+            hz=float(os.getenv("PROFILER_HZ", "100")),
+            max_depth=int(os.getenv("PROFILER_MAX_DEPTH", "64")),
+            max_stacks=int(os.getenv("PROFILER_MAX_STACKS", "20000")),
+            include_idle=os.getenv("PROFILER_INCLUDE_IDLE", "false").lower() == "true",
+            stall_threshold_ms=float(os.getenv("PROFILER_STALL_THRESHOLD_MS", "100")),
+            max_window_s=float(os.getenv("PROFILER_MAX_WINDOW_S", "60")),
+            debug_token=os.getenv("PROFILER_DEBUG_TOKEN") or None,
+        )
+
+
+class RequestTag:
+    """Endpoint and trace_id of the request a task is serving"""
+
+    __slots__ = ("endpoint", "trace_id")
+
+    def __init__(self, endpoint: str, trace_id: Optional[str]):
+        self.endpoint = endpoint
+        self.trace_id = trace_id
+
+
+class ProfileWindow:
+    """Samples collected for one /_debug/profile?seconds=N request"""
+
+    def __init__(self, group: str, trace_id: Optional[str]):
+        self.group = group
+        self.trace_id = trace_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def add(self, tag: Optional[RequestTag], root: str, folded: str) -> None:
+        if self.trace_id is not None and (tag is None or tag.trace_id != self.trace_id):
+            return
+        if self.group == "trace" and tag is not None and tag.trace_id:
+            endpoint, _, rest = root.partition(";")
+            root = f"{endpoint};trace={tag.trace_id};{rest}" if rest else f"{endpoint};trace={tag.trace_id}"
+        elif self.group == "none":
+            root = root.split(";", 1)[-1]
+        self.stacks[f"{root};{folded}" if folded else root] += 1
+        self.samples += 1
+
+
+class LoopStall:
+    """An interval in which the event loop did not run its heartbeat"""
+
+    __slots__ = ("started_at", "duration_ms", "endpoint", "trace_id", "stacks", "ongoing")
+
+    def __init__(self, started_at: float, tag: Optional[RequestTag]):
+        self.started_at = started_at
+        self.duration_ms = 0.0
+        self.endpoint = tag.endpoint if tag else UNATTRIBUTED
+        self.trace_id = tag.trace_id if tag else None
+        self.stacks: Counter = Counter()
+        self.ongoing = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 1),
+            "endpoint": self.endpoint,
+            "trace_id": self.trace_id,
+            "ongoing": self.ongoing,
+            "stacks": [{"stack": stack, "samples": count} for stack, count in self.stacks.most_common(5)],
+        }
+
+
+class SamplingProfiler:
+    """Thread-based stack sampler with per-request attribution and loop-stall capture"""
+
+    def __init__(self, config: Optional[ProfilerConfig] = None):
+        self.config = config or ProfilerConfig.from_environment()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._last_beat = 0.0
+
+        self._task_tags: Dict[asyncio.Task, RequestTag] = {}
+        self._labels: Dict[Tuple[Any, int], str] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._thread_names_at = 0.0
+
+        self._stacks: Counter = Counter()
+        self._trace_samples: Dict[str, "OrderedDict[str, int]"] = {}
+        self._windows: List[ProfileWindow] = []
+        self._stalls: Deque[LoopStall] = deque(maxlen=self.config.max_stalls)
+        self._current_stall: Optional[LoopStall] = None
+
+        self.samples_total = 0
+        self.stalls_total = 0
+        self.dropped_stacks = 0
+        self._sampling_s = 0.0
+        self._started_at: Optional[float] = None
+        self._started_on_demand = False
+
+    # -- lifecycle --------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start sampling; call from the event loop thread so stalls can be detected"""
+        if self.running:
+            return
+        try:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._last_beat = time.monotonic()
+            self._heartbeat()
+        except RuntimeError:
+            self._loop = self._loop_thread_id = None
+        self._stop.clear()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        logger.info(f"Sampling profiler started at {self.config.hz:g} Hz")
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+        logger.info("Sampling profiler stopped")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self._trace_samples.clear()
+            self._stalls.clear()
+            self.samples_total = self.stalls_total = self.dropped_stacks = 0
+            self._sampling_s = 0.0
+            self._started_at = time.monotonic() if self.running else None
+
+    def _heartbeat(self) -> None:
+        self._last_beat = time.monotonic()
+        self._heartbeat_handle = self._loop.call_later(self.config.heartbeat_ms / 1000, self._heartbeat)
+
+    # -- request attribution ------------------------------------------------
+
+    def tag_request(self, endpoint: str, trace_id: Optional[str] = None) -> Optional[asyncio.Task]:
+        """Attribute the current task's samples to ``endpoint``/``trace_id`` until untag()"""
+        if not self.running:
+            return None
+        task = asyncio.current_task()
+        if task is not None:
+            self._task_tags[task] = RequestTag(endpoint, trace_id)
+        return task
+
+    def untag(self, task: Optional[asyncio.Task]) -> None:
+        if task is not None:
+            self._task_tags.pop(task, None)
+
+    def _loop_tag(self) -> Optional[RequestTag]:
+        if self._loop is None:
+            return None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        return self._task_tags.get(task) if task is not None else None
+
+    # -- sampling -------------------------------------------------------------
+
+    def _run(self) -> None:
+        period = 1.0 / self.config.hz
+        sampler_id = threading.get_ident()
+        while not self._stop.wait(period):
+            start = time.perf_counter()
+            try:
+                self.sample(exclude=sampler_id)
+            except Exception as e:  # never let the sampler die silently
+                logger.debug(f"Profiler sample failed: {e}")
+            self._sampling_s += time.perf_counter() - start
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Take one sample of every thread (the sampler thread calls this at ``hz``)"""
+        frames = sys._current_frames()
+        now = time.monotonic()
+        if now - self._thread_names_at > 1.0:
+            self._thread_names = {t.ident: t.name for t in threading.enumerate()}
+            self._thread_names_at = now
+
+        loop_folded = None
+        with self._lock:
+            self.samples_total += 1
+            for thread_id, frame in frames.items():
+                if thread_id == exclude:
+                    continue
+                folded = self._fold(frame)
+                if thread_id == self._loop_thread_id:
+                    loop_folded = folded
+                if folded is None:
+                    continue
+                tag = self._loop_tag() if thread_id == self._loop_thread_id else None
+                if thread_id == self._loop_thread_id:
+                    root = f"{tag.endpoint if tag else UNATTRIBUTED};loop"
+                else:
+                    root = f"thread:{self._thread_names.get(thread_id, thread_id)}"
+                self._record(root, folded, tag)
+            if self._loop is not None and self._loop.is_running():
+                self._check_stall(now, loop_folded)
+
+    def _fold(self, frame) -> Optional[str]:
+        """Frame chain -> "root;...;leaf", or None when the thread is idle"""
+        if not self.config.include_idle:
+            code = frame.f_code
+            for suffix, name in IDLE_FRAMES:
+                if code.co_name == name and code.co_filename.endswith(suffix):
+                    return None
+        labels = []
+        depth = 0
+        while frame is not None and depth < self.config.max_depth:
+            key = (frame.f_code, frame.f_lineno)
+            label = self._labels.get(key)
+            if label is None:
+                if len(self._labels) > 100_000:
+                    self._labels.clear()
+                code = frame.f_code
+                label = f"{code.co_name} ({short_path(code.co_filename)}:{frame.f_lineno})".replace(";", ":")
+                self._labels[key] = label
+            labels.append(label)
+            frame = frame.f_back
+            depth += 1
+        labels.reverse()
+        return ";".join(labels)
+
+    def _record(self, root: str, folded: str, tag: Optional[RequestTag]) -> None:
+        key = f"{root};{folded}"
+        if key in self._stacks or len(self._stacks) < self.config.max_stacks:
+            self._stacks[key] += 1
+        else:
+            self.dropped_stacks += 1
+            self._stacks[STACK_TABLE_FULL] += 1
+        if tag is not None and tag.trace_id:
+            traces = self._trace_samples.setdefault(tag.endpoint, OrderedDict())
+            traces[tag.trace_id] = traces.pop(tag.trace_id, 0) + 1
+            if len(traces) > TRACE_IDS_PER_ENDPOINT:
+                traces.popitem(last=False)
+        for window in self._windows:
+            window.add(tag, root, folded)
+
+    def _check_stall(self, now: float, loop_folded: Optional[str]) -> None:
+        blocked_ms = (now - self._last_beat) * 1000 - self.config.heartbeat_ms
+        stall = self._current_stall
+        if blocked_ms >= self.config.stall_threshold_ms:
+            if stall is None:
+                stall = self._current_stall = LoopStall(time.time() - blocked_ms / 1000, self._loop_tag())
+                self._stalls.append(stall)
+                self.stalls_total += 1
+            stall.duration_ms = blocked_ms
+            if loop_folded:
+                stall.stacks[loop_folded] += 1
+        elif stall is not None:
+            stall.ongoing = False
+            self._current_stall = None
+            logger.warning(
+                f"Event loop blocked for {stall.duration_ms:.0f}ms "
+                f"(endpoint={stall.endpoint}, trace_id={stall.trace_id})"
+            )
+
+    # -- output ---------------------------------------------------------------
+
+    async def capture(self, seconds: float, group: str = "endpoint", trace_id: Optional[str] = None) -> ProfileWindow:
+        """Collect samples for ``seconds``; starts the sampler for the window if it is not running"""
+        if not self.config.enabled:
+            raise RuntimeError("Sampling profiler is disabled (PROFILER_ENABLED=false)")
+        seconds = max(0.0, min(seconds, self.config.max_window_s))
+        window = ProfileWindow(group, trace_id)
+        if not self.running:
+            self.start()
+            self._started_on_demand = True
+        with self._lock:
+            self._windows.append(window)
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            with self._lock:
+                self._windows.remove(window)
+                last_window = not self._windows
+            if last_window and self._started_on_demand:
+                self._started_on_demand = False
+                self.stop()
+        return window
+
+    def folded(self, stacks: Optional[Counter] = None) -> str:
+        """Folded-stack text, one "stack count" line per distinct stack"""
+        with self._lock:
+            items = sorted((stacks if stacks is not None else self._stacks).items())
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def top_traces(self, limit: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+        """Trace ids with the most samples, per endpoint"""
+        with self._lock:
+            return {
+                endpoint: sorted(traces.items(), key=lambda item: -item[1])[:limit]
+                for endpoint, traces in self._trace_samples.items()
+            }
+
+    def get_stalls(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [stall.to_dict() for stall in reversed(self._stalls)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        with self._lock:
+            max_stall = max((s.duration_ms for s in self._stalls), default=0.0)
+            return {
+                "running": self.running,
+                "hz": self.config.hz,
+                "samples_total": self.samples_total,
+                "distinct_stacks": len(self._stacks),
+                "dropped_stacks": self.dropped_stacks,
+                "stalls_total": self.stalls_total,
+                "max_stall_ms": round(max_stall, 1),
+                "overhead_ratio": round(self._sampling_s / elapsed, 5) if elapsed else 0.0,
+                "uptime_s": round(elapsed, 1),
+            }
+
+
+def _path_prefixes() -> Tuple[str, ...]:
+    prefixes = {sysconfig.get_paths()["stdlib"], os.getcwd()}
+    return tuple(sorted((p.rstrip(os.sep) + os.sep for p in prefixes if p), key=len, reverse=True))
+
+
+_PATH_PREFIXES = _path_prefixes()
+
+
+def short_path(filename: str) -> str:
+    """Path relative to site-packages, the stdlib or the working directory, for readable frames"""
+    marker = "site-packages" + os.sep
+    index = filename.rfind(marker)
+    if index != -1:
+        return filename[index + len(marker):]
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+class ProfilerMiddleware:
+    """Pure-ASGI middleware attributing samples to the request's route and X-Trace-ID"""
+
+    def __init__(self, app, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send) -> None:
+        profiler = self.profiler or get_sampling_profiler()
+        if scope["type"] != "http" or not profiler.running:
+            await self.app(scope, receive, send)
+            return
+        trace_id = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-trace-id":
+                trace_id = value.decode("latin-1")
+                break
+        task = profiler.tag_request(f"{scope['method']} {scope['path']}", trace_id)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.untag(task)
+
+
+# Global sampling profiler
+sampling_profiler = SamplingProfiler()
+
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """Get the global sampling profiler."""
+    return sampling_profiler
+
+
+def profile_endpoints_enabled(profiler: Optional[SamplingProfiler] = None) -> bool:
+    """Whether services should mount the profile router: profiling enabled and a debug token set"""
+    config = (profiler or get_sampling_profiler()).config
+    return config.enabled and bool(config.debug_token)
+
+
+def create_profile_router(profiler: Optional[SamplingProfiler] = None):
+    """APIRouter with /_debug/profile (folded stacks) and /_debug/profile/stalls"""
+    from fastapi import APIRouter, HTTPException, Request
+    from fastapi.responses import PlainTextResponse
+
+    router = APIRouter(prefix="/_debug", tags=["debug"])
+
+    def authorize(request: Request) -> SamplingProfiler:
+        active = profiler or get_sampling_profiler()
+        token = active.config.debug_token
+        # No configured token means nobody may read stacks, not everybody
+        if not token:
+            raise HTTPException(status_code=403, detail="Profile endpoints need PROFILER_DEBUG_TOKEN to be set")
+        if not hmac.compare_digest(request.headers.get("X-Debug-Token", "").encode(), token.encode()):
+            raise HTTPException(status_code=403, detail="Invalid or missing X-Debug-Token")
+        if not active.config.enabled:
+            raise HTTPException(status_code=409, detail="Profiler is disabled; set PROFILER_ENABLED=true")
+        return active
+
+    @router.get("/profile")
+    async def profile(
+        request: Request,
+        seconds: float = 10.0,
+        format: str = "folded",
+        group: str = "endpoint",
+        trace_id: Optional[str] = None,
+    ):
+        """Folded stacks for the next ``seconds`` (0 = everything since start)"""
+        active = authorize(request)
+        if group not in ("endpoint", "trace", "none") or format not in ("folded", "json"):
+            raise HTTPException(status_code=400, detail="group must be endpoint|trace|none, format folded|json")
+        if seconds > 0:
+            window = await active.capture(seconds, group=group, trace_id=trace_id)
+            stacks, samples = window.stacks, window.samples
+        elif not active.running:
+            raise HTTPException(status_code=409, detail="Profiler is not running; set PROFILER_ENABLED=true or pass seconds>0")
+        else:
+            stacks, samples = None, active.samples_total
+        if format == "folded":
+            return PlainTextResponse(active.folded(stacks))
+        text = active.folded(stacks)
+        return {
+            "samples": samples,
+            "stats": active.get_stats(),
+            "top_traces": active.top_traces(),
+            "stacks": [
+                {"stack": line.rsplit(" ", 1)[0], "count": int(line.rsplit(" ", 1)[1])}
+                for line in text.splitlines()
+            ],
+        }
+
+    @router.get("/profile/stalls")
+    async def stalls(request: Request):
+        """Recent event-loop stalls with the stacks that blocked the loop"""
+        active = authorize(request)
+        return {"stats": active.get_stats(), "stalls": active.get_stalls()}
+
+    return router
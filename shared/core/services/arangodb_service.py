@@ -10,6 +10,7 @@ Provides authenticated ArangoDB connection with:
 - Background warmup (index creation + cache priming)
 - Structured logging with secret redaction
 - Health check integration
+- Entity search through the in-process KG entity index (no collection scans)
 
 Maps to Phase I1 requirements for production-grade KG operations.
 """
@@ -23,6 +24,8 @@ from contextlib import asynccontextmanager
 import structlog
 from datetime import datetime
 
+from shared.core.kg_index import get_entity_index, get_entity_index_sync
+
 try:
     from arango import ArangoClient
     from arango.database import StandardDatabase
@@ -264,6 +267,10 @@ class ArangoDBService:
             # Prime query cache
             await self._prime_query_cache(warmup_results)
             
+            # Load the entity index and follow entity changes from here on
+            if get_entity_index_sync().start(self._database):
+                warmup_results['tasks'].append("Started KG entity index sync")
+            
             self._warmup_completed = True
             warmup_duration = (datetime.now() - start_time).total_seconds()
             
@@ -438,11 +445,29 @@ class ArangoDBService:
             async with self.get_database() as db:
                 collection = db.collection('entities')
                 result = collection.insert(entity_data)
+                # Write-through so the entity is searchable before the change feed catches up
+                get_entity_index().apply({**entity_data, '_key': result['_key']})
                 return result
         except Exception as e:
             logger.error(f"Failed to create entity: {e}")
             return None
     
+    async def create_relationship(self, from_key: str, to_key: str, relationship_type: str,
+                                  properties: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Create an edge between two entities in knowledge graph."""
+        try:
+            async with self.get_database() as db:
+                collection = db.collection('relationships')
+                return collection.insert({
+                    **(properties or {}),
+                    '_from': f'entities/{from_key}',
+                    '_to': f'entities/{to_key}',
+                    'type': relationship_type
+                })
+        except Exception as e:
+            logger.error(f"Failed to create relationship: {e}")
+            return None
+    
     async def query_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
         """Query relationships for an entity."""
         try:
@@ -461,20 +486,33 @@ class ArangoDBService:
         """
         Search for entities in the knowledge graph based on a text query.
         
+        Matching runs on the in-process entity index; ArangoDB is only asked
+        for the matched documents by key. Until the index has loaded, falls
+        back to a substring scan.
+        
         Args:
             query: Text query to search for
             max_results: Maximum number of results to return
             
         Returns:
-            List of matching entities
+            List of matching entities, best first
         """
         try:
             if not self.is_available:
                 logger.warning("ArangoDB not available for entity search")
                 return []
             
-            # Simple text search across entities
-            # In a real implementation, this could use full-text search or more sophisticated matching
+            index = get_entity_index()
+            if index.ready:
+                matches = index.lookup(query, max_results)
+                documents = {doc['id']: doc for doc in await self.hydrate_entities([m.key for m in matches])}
+                results = [
+                    {**documents[m.key], 'score': round(m.score, 4), 'match_type': m.match_type}
+                    for m in matches if m.key in documents
+                ]
+                logger.debug(f"Found {len(results)} entities for query: {query[:100]}")
+                return results
+            
             aql_query = """
             FOR doc IN entities
             FILTER CONTAINS(LOWER(doc.name), LOWER(@search_term)) 
@@ -496,12 +534,30 @@ class ArangoDBService:
                 'max_results': max_results
             })
             
-            logger.debug(f"Found {len(results)} entities for query: {query[:100]}")
+            logger.debug(f"Found {len(results)} entities for query (scan): {query[:100]}")
             return results
             
         except Exception as e:
             logger.error(f"Failed to search entities: {e}")
             return []
+    
+    async def hydrate_entities(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """Fetch entity documents by primary key, in the order of ``keys``."""
+        if not keys:
+            return []
+        aql_query = """
+        FOR doc IN DOCUMENT('entities', @keys)
+        RETURN {
+            id: doc._key,
+            name: doc.name,
+            type: doc.type,
+            description: doc.description,
+            properties: doc.properties,
+            metadata: doc.metadata
+        }
+        """
+        documents = {doc['id']: doc for doc in await self.execute_aql(aql_query, {'keys': keys})}
+        return [documents[key] for key in keys if key in documents]
 
 
 # Global service instance
@@ -25,12 +25,14 @@ import logging
 
 from pydantic import BaseModel, Field
 
+from shared.core.services.audit_store import AuditEventWriter, AuditStoreConfig, AuditTrailStore
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Environment variables
 AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
-AUDIT_MAX_ENTRIES = int(os.getenv("AUDIT_MAX_ENTRIES", "10000"))
+AUDIT_MAX_ENTRIES = int(os.getenv("AUDIT_MAX_ENTRIES", "100000"))
 AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() == "true"
 
 
@@ -97,8 +99,10 @@ class AuditTrail:
 class AuditService:
     """Comprehensive audit service for request tracking and provenance."""
     
-    def __init__(self):
-        self.audit_trails: Dict[str, AuditTrail] = {}
+    def __init__(self, config: Optional[AuditStoreConfig] = None):
+        self.config = config or AuditStoreConfig.from_environment()
+        self.store = AuditTrailStore(self.config.max_trails, self.config.bucket_seconds)
+        self.writer = AuditEventWriter(self.config) if self.config.persist_enabled else None
         self.cleanup_task: Optional[asyncio.Task] = None
         self._shutdown = False
         
@@ -110,7 +114,9 @@ class AuditService:
             
         logger.info("Initializing audit service")
         
-        # Start cleanup task
+        # Start event writer and cleanup task
+        if self.writer:
+            self.writer.start()
         self.cleanup_task = asyncio.create_task(self._cleanup_old_trails())
         
         logger.info("✅ Audit service initialized")
@@ -128,6 +134,10 @@ class AuditService:
             except asyncio.CancelledError:
                 pass
         
+        # Persist queued events
+        if self.writer:
+            await self.writer.stop()
+        
         logger.info("✅ Audit service shutdown complete")
     
     def start_audit_trail(
@@ -153,7 +163,7 @@ class AuditService:
             metadata=metadata or {}
         )
         
-        self.audit_trails[trace_id] = audit_trail
+        self.store.add(audit_trail)
         
         # Log request start
         self._add_event(
@@ -182,11 +192,11 @@ class AuditService:
         if not AUDIT_ENABLED:
             return None
             
-        if trace_id not in self.audit_trails:
+        audit_trail = self.store.get(trace_id)
+        if audit_trail is None:
             logger.warning(f"Audit trail not found: {trace_id}")
             return None
         
-        audit_trail = self.audit_trails[trace_id]
         end_time = datetime.now(timezone.utc)
         
         audit_trail.end_time = end_time
@@ -230,7 +240,7 @@ class AuditService:
             
         call_id = f"call_{uuid.uuid4().hex[:8]}"
         
-        self._add_event(
+        event = self._add_event(
             trace_id=trace_id,
             event_type=AuditEventType.SERVICE_CALL,
             service_name=service_name,
@@ -245,12 +255,8 @@ class AuditService:
         )
         
         # Track in service calls
-        if trace_id in self.audit_trails:
-            if service_name not in self.audit_trails[trace_id].service_calls:
-                self.audit_trails[trace_id].service_calls[service_name] = []
-            self.audit_trails[trace_id].service_calls[service_name].append(
-                self.audit_trails[trace_id].events[-1]
-            )
+        if event is not None:
+            self.store.get(trace_id).service_calls.setdefault(service_name, []).append(event)
         
         return call_id
     
@@ -303,8 +309,8 @@ class AuditService:
         )
         
         # Track in errors
-        if trace_id in self.audit_trails:
-            self.audit_trails[trace_id].errors.append(event)
+        if event is not None:
+            self.store.get(trace_id).errors.append(event)
     
     def log_performance_metric(
         self,
@@ -333,8 +339,9 @@ class AuditService:
         )
         
         # Track in performance metrics
-        if trace_id in self.audit_trails:
-            self.audit_trails[trace_id].performance_metrics[metric_name] = {
+        audit_trail = self.store.get(trace_id)
+        if audit_trail is not None:
+            audit_trail.performance_metrics[metric_name] = {
                 "value": value,
                 "unit": unit,
                 "timestamp": datetime.now(timezone.utc).isoformat()
@@ -363,8 +370,8 @@ class AuditService:
         )
         
         # Track in security events
-        if trace_id in self.audit_trails:
-            self.audit_trails[trace_id].security_events.append(event)
+        if event is not None:
+            self.store.get(trace_id).security_events.append(event)
     
     def _add_event(
         self,
@@ -379,8 +386,9 @@ class AuditService:
         error_message: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> AuditEvent:
-        """Add an event to the audit trail."""
-        if trace_id not in self.audit_trails:
+        """Add an event to the audit trail and queue it for persistence."""
+        audit_trail = self.store.get(trace_id)
+        if audit_trail is None:
             logger.warning(f"Audit trail not found for event: {trace_id}")
             return None
         
@@ -391,8 +399,8 @@ class AuditService:
             timestamp=datetime.now(timezone.utc),
             service_name=service_name,
             operation=operation,
-            user_id=self.audit_trails[trace_id].user_id,
-            session_id=self.audit_trails[trace_id].session_id,
+            user_id=audit_trail.user_id,
+            session_id=audit_trail.session_id,
             severity=severity,
             message=message,
             duration_ms=duration_ms,
@@ -401,12 +409,14 @@ class AuditService:
             metadata=metadata or {}
         )
         
-        self.audit_trails[trace_id].events.append(event)
+        audit_trail.events.append(event)
+        if self.writer:
+            self.writer.submit(event)
         return event
     
     def get_audit_trail(self, trace_id: str) -> Optional[AuditTrail]:
         """Get an audit trail by trace ID."""
-        return self.audit_trails.get(trace_id)
+        return self.store.get(trace_id)
     
     def get_audit_trails(
         self,
@@ -414,58 +424,56 @@ class AuditService:
         service_name: Optional[str] = None,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        offset: int = 0
     ) -> List[AuditTrail]:
-        """Get audit trails with filtering."""
-        trails = list(self.audit_trails.values())
-        
-        # Apply filters
-        if user_id:
-            trails = [t for t in trails if t.user_id == user_id]
-        
-        if start_time:
-            trails = [t for t in trails if t.start_time >= start_time]
-        
-        if end_time:
-            trails = [t for t in trails if t.start_time <= end_time]
-        
-        # Sort by start time (newest first)
-        trails.sort(key=lambda t: t.start_time, reverse=True)
-        
-        return trails[:limit]
+        """Get audit trails with filtering, newest first, served from the store indexes."""
+        return self.store.query(
+            user_id=user_id,
+            service_name=service_name,
+            start_time=start_time,
+            end_time=end_time,
+            limit=limit,
+            offset=offset
+        )
+    
+    def count_audit_trails(
+        self,
+        user_id: Optional[str] = None,
+        service_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> int:
+        """Count audit trails matching the same filters as get_audit_trails."""
+        return self.store.count(
+            user_id=user_id,
+            service_name=service_name,
+            start_time=start_time,
+            end_time=end_time
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get audit storage statistics."""
+        return {
+            "store": self.store.get_stats(),
+            "writer": self.writer.get_stats() if self.writer else None
+        }
     
     async def _cleanup_old_trails(self):
-        """Cleanup old audit trails."""
+        """Expire trails and persisted files past the retention window."""
         while not self._shutdown:
             try:
-                current_time = datetime.now(timezone.utc)
-                cutoff_time = current_time - timedelta(days=AUDIT_RETENTION_DAYS)
-                
-                # Remove old trails
-                trails_to_remove = []
-                for trace_id, trail in self.audit_trails.items():
-                    if trail.start_time < cutoff_time:
-                        trails_to_remove.append(trace_id)
-                
-                for trace_id in trails_to_remove:
-                    del self.audit_trails[trace_id]
+                cutoff_time = datetime.now(timezone.utc) - timedelta(days=self.config.retention_days)
                 
-                if trails_to_remove:
-                    logger.info(f"Cleaned up {len(trails_to_remove)} old audit trails")
+                # Ring order is start-time order, so expiry only touches expired trails
+                removed = self.store.expire(cutoff_time)
+                if removed:
+                    logger.info(f"Cleaned up {removed} old audit trails")
                 
-                # Limit total number of trails
-                if len(self.audit_trails) > AUDIT_MAX_ENTRIES:
-                    # Remove oldest trails
-                    sorted_trails = sorted(
-                        self.audit_trails.items(),
-                        key=lambda x: x[1].start_time
-                    )
-                    
-                    excess_count = len(self.audit_trails) - AUDIT_MAX_ENTRIES
-                    for trace_id, _ in sorted_trails[:excess_count]:
-                        del self.audit_trails[trace_id]
-                    
-                    logger.info(f"Removed {excess_count} excess audit trails")
+                if self.writer:
+                    removed_files = await asyncio.to_thread(self.writer.prune_files)
+                    if removed_files:
+                        logger.info(f"Removed {removed_files} expired audit log files")
                 
                 # Wait 1 hour before next cleanup
                 await asyncio.sleep(3600)
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Audit Trail Storage
+
+Storage subsystem behind AuditService:
+- A bounded ring of audit trails in insertion (start time) order; the oldest
+  trail is evicted in O(1) when the ring is full
+- Secondary indexes by user_id and by start-time bucket, maintained on
+  insert and eviction, so filtered and time-range queries walk only
+  matching trails, newest first
+- A background writer that batch-appends audit events as JSON lines to
+  daily append-only files, off the event loop, so trails outlive the ring
+
+Following MAANG/OpenAI/Perplexity standards for enterprise audit systems.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AuditStoreConfig:
+    """Audit storage configuration"""
+    max_trails: int = 100000
+    bucket_seconds: int = 60
+    retention_days: int = 90
+    persist_enabled: bool = True
+    log_dir: str = "logs/audit"
+    flush_interval_s: float = 1.0
+    flush_batch_size: int = 1000
+    max_pending_events: int = 100000
+
+    @classmethod
+    def from_environment(cls) -> "AuditStoreConfig":
+        """Load configuration from environment variables"""
+        return cls(
+            max_trails=int(os.getenv("AUDIT_MAX_ENTRIES", "100000")),
+            bucket_seconds=int(os.getenv("AUDIT_TIME_BUCKET_S", "60")),
+            retention_days=int(os.getenv("AUDIT_RETENTION_DAYS", "90")),
+            persist_enabled=os.getenv("AUDIT_PERSIST_ENABLED", "true").lower() == "true",
+            log_dir=os.getenv("AUDIT_LOG_DIR", "logs/audit"),
+            flush_interval_s=float(os.getenv("AUDIT_FLUSH_INTERVAL_S", "1.0")),
+            flush_batch_size=int(os.getenv("AUDIT_FLUSH_BATCH_SIZE", "1000")),
+            max_pending_events=int(os.getenv("AUDIT_MAX_PENDING_EVENTS", "100000")),
+        )
+
+
+class AuditTrailStore:
+    """
+    Bounded ring of audit trails with user and time-bucket indexes.
+
+    Trails occupy consecutive sequence numbers [head, next); each index
+    holds sequence numbers in insertion order, so eviction always removes
+    from the left of exactly one user deque and one bucket deque. Start
+    times may arrive out of order, so neither index is sorted by start time;
+    each bucket records the earliest start bucket it holds.
+    """
+
+    def __init__(self, max_trails: int = 100000, bucket_seconds: int = 60):
+        self.capacity = max_trails
+        self.bucket_seconds = bucket_seconds
+        self._slots: List[Any] = [None] * max_trails
+        self._head = 0
+        self._next = 0
+        self._by_trace: Dict[str, int] = {}
+        self._by_user: Dict[Optional[str], Deque[int]] = {}
+        self._buckets: Deque[List[Any]] = deque()  # [bucket, seqs, earliest start bucket]
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return self._next - self._head
+
+    def _bucket(self, when: datetime) -> int:
+        return int(when.timestamp()) // self.bucket_seconds
+
+    def _trail(self, seq: int):
+        return self._slots[seq % self.capacity]
+
+    def add(self, trail) -> None:
+        """Insert a trail (replacing any trail with the same trace_id in the lookup)"""
+        if len(self) >= self.capacity:
+            self._evict_oldest()
+        seq = self._next
+        self._next += 1
+        self._slots[seq % self.capacity] = trail
+        self._by_trace[trail.trace_id] = seq
+        self._by_user.setdefault(trail.user_id, deque()).append(seq)
+
+        bucket = self._bucket(trail.start_time)
+        if not self._buckets or bucket > self._buckets[-1][0]:
+            self._buckets.append([bucket, deque(), bucket])
+        # Out-of-order start times join the newest bucket so eviction stays ordered
+        newest = self._buckets[-1]
+        newest[1].append(seq)
+        newest[2] = min(newest[2], bucket)
+
+    def _evict_oldest(self) -> None:
+        seq = self._head
+        trail = self._trail(seq)
+        self._slots[seq % self.capacity] = None
+        self._head += 1
+        if self._by_trace.get(trail.trace_id) == seq:
+            del self._by_trace[trail.trace_id]
+        user_seqs = self._by_user[trail.user_id]
+        user_seqs.popleft()
+        if not user_seqs:
+            del self._by_user[trail.user_id]
+        bucket_seqs = self._buckets[0][1]
+        bucket_seqs.popleft()
+        if not bucket_seqs:
+            self._buckets.popleft()
+        self.evicted += 1
+
+    def expire(self, cutoff: datetime) -> int:
+        """Evict trails that started before ``cutoff``; O(evicted)"""
+        removed = 0
+        while len(self) and self._trail(self._head).start_time < cutoff:
+            self._evict_oldest()
+            removed += 1
+        return removed
+
+    def get(self, trace_id: str):
+        seq = self._by_trace.get(trace_id)
+        return None if seq is None else self._trail(seq)
+
+    def _candidates(self, user_id: Optional[str], start_time: Optional[datetime], end_time: Optional[datetime]) -> Iterator[int]:
+        """Sequence numbers that may match, newest first, from the narrowest index"""
+        if user_id is not None:
+            yield from reversed(self._by_user.get(user_id, ()))
+        elif start_time is not None or end_time is not None:
+            first = self._bucket(start_time) if start_time else None
+            last = self._bucket(end_time) if end_time else None
+            for bucket, seqs, earliest in reversed(self._buckets):
+                if last is not None and earliest > last:
+                    continue
+                # A bucket only holds trails that started in it or earlier
+                if first is not None and bucket < first:
+                    return
+                yield from reversed(seqs)
+        else:
+            yield from range(self._next - 1, self._head - 1, -1)
+
+    def _matches(
+        self,
+        user_id: Optional[str],
+        service_name: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> Iterator[Any]:
+        for seq in self._candidates(user_id, start_time, end_time):
+            trail = self._trail(seq)
+            if end_time is not None and trail.start_time > end_time:
+                continue
+            if start_time is not None and trail.start_time < start_time:
+                continue
+            if service_name is not None and service_name not in trail.service_calls:
+                continue
+            yield trail
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        service_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> List[Any]:
+        """Trails matching every given filter, newest first"""
+        matches = self._matches(user_id, service_name, start_time, end_time)
+        return list(islice(matches, offset, offset + limit))
+
+    def count(
+        self,
+        user_id: Optional[str] = None,
+        service_name: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+    ) -> int:
+        """Number of trails matching every given filter"""
+        if service_name is None and start_time is None and end_time is None:
+            return len(self) if user_id is None else len(self._by_user.get(user_id, ()))
+        return sum(1 for _ in self._matches(user_id, service_name, start_time, end_time))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "trails": len(self),
+            "capacity": self.capacity,
+            "users_indexed": len(self._by_user),
+            "time_buckets": len(self._buckets),
+            "evicted": self.evicted,
+        }
+
+
+def event_record(event) -> Dict[str, Any]:
+    """JSON-serializable form of an AuditEvent"""
+    return {
+        "event_id": event.event_id,
+        "trace_id": event.trace_id,
+        "event_type": event.event_type.value,
+        "timestamp": event.timestamp.isoformat(),
+        "service_name": event.service_name,
+        "operation": event.operation,
+        "user_id": event.user_id,
+        "session_id": event.session_id,
+        "severity": event.severity.value,
+        "message": event.message,
+        "duration_ms": event.duration_ms,
+        "status_code": event.status_code,
+        "error_message": event.error_message,
+        "metadata": event.metadata,
+    }
+
+
+class AuditEventWriter:
+    """Batches audit events and appends them to daily JSON-lines files in a worker thread"""
+
+    def __init__(self, config: AuditStoreConfig):
+        self.config = config
+        self.directory = Path(config.log_dir)
+        self._pending: Deque[Any] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.write_errors = 0
+
+    def submit(self, event) -> None:
+        """Queue an event for the next batch; O(1), never blocks"""
+        if len(self._pending) >= self.config.max_pending_events:
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append(event)
+        if self._wakeup is not None and len(self._pending) >= self.config.flush_batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer and flush whatever is queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Append all queued events; returns the number written"""
+        if not self._pending:
+            return 0
+        batch = list(self._pending)
+        self._pending.clear()
+        lock = self._lock or asyncio.Lock()
+        async with lock:
+            try:
+                await asyncio.to_thread(self._append, batch)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Failed to persist {len(batch)} audit events: {e}")
+                return 0
+        self.written += len(batch)
+        self.flushes += 1
+        return len(batch)
+
+    def _path(self, day: str) -> Path:
+        return self.directory / f"audit-{day}.jsonl"
+
+    def _append(self, events: List[Any]) -> None:
+        by_day: Dict[str, List[str]] = {}
+        for event in events:
+            by_day.setdefault(event.timestamp.strftime("%Y%m%d"), []).append(
+                json.dumps(event_record(event), default=str)
+            )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for day, lines in by_day.items():
+            with open(self._path(day), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    def prune_files(self, now: Optional[datetime] = None) -> int:
+        """Delete daily files older than the retention window"""
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(days=self.config.retention_days)).strftime("%Y%m%d")
+        removed = 0
+        for path in self.directory.glob("audit-*.jsonl"):
+            if path.stem[len("audit-"):] < cutoff:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "write_errors": self.write_errors,
+        }
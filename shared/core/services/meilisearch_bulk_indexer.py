@@ -0,0 +1,385 @@
+"""
+Meilisearch Bulk Indexer - Pipelined Document Ingestion
+======================================================
+
+Streams documents from any (async) iterable into a Meilisearch index without
+waiting for each batch to be indexed before sending the next:
+- Documents are encoded to NDJSON as they are pulled from the source, so
+  only the batches in flight are ever held in memory
+- Up to ``max_in_flight`` batches are enqueued at once; Meilisearch indexes
+  them back to back (and auto-batches consecutive additions) while the next
+  batches are being encoded and uploaded
+- One poller tracks every pending task with a single ``GET /tasks`` call
+- Batch size adapts to the measured per-document indexing cost so each task
+  takes roughly ``target_task_seconds``
+- Progress is checkpointed as the count of source documents indexed in
+  order, so an interrupted run resumes where it stopped
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Deque, Dict, Iterable, List, Optional, Union
+
+import httpx
+import structlog
+
+# Optional dependency with graceful fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = structlog.get_logger(__name__)
+
+DocumentSource = Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]]
+
+_DURATION = re.compile(r"PT(?:(\d+(?:\.\d+)?)H)?(?:(\d+(?:\.\d+)?)M)?(?:(\d+(?:\.\d+)?)S)?")
+_FINISHED = ("succeeded", "failed", "canceled")
+
+
+@dataclass
+class BulkIndexerConfig:
+    """Configuration for pipelined bulk indexing."""
+    max_in_flight: int = 4
+    initial_batch_size: int = 1000
+    min_batch_size: int = 100
+    max_batch_size: int = 50000
+    max_batch_bytes: int = 32 * 1024 * 1024
+    target_task_seconds: float = 1.0
+    poll_interval_s: float = 0.05
+    max_poll_interval_s: float = 1.0
+    request_timeout_s: float = 30.0
+
+    @classmethod
+    def from_environment(cls) -> 'BulkIndexerConfig':
+        """Load configuration from environment variables."""
+        return cls(
+            max_in_flight=int(os.getenv('MEILISEARCH_BULK_MAX_IN_FLIGHT', '4')),
+            initial_batch_size=int(os.getenv('MEILISEARCH_BATCH_SIZE', '1000')),
+            min_batch_size=int(os.getenv('MEILISEARCH_BULK_MIN_BATCH_SIZE', '100')),
+            max_batch_size=int(os.getenv('MEILISEARCH_BULK_MAX_BATCH_SIZE', '50000')),
+            max_batch_bytes=int(os.getenv('MEILISEARCH_BULK_MAX_BATCH_BYTES', str(32 * 1024 * 1024))),
+            target_task_seconds=float(os.getenv('MEILISEARCH_BULK_TARGET_TASK_SECONDS', '1.0')),
+            request_timeout_s=float(os.getenv('MEILISEARCH_TIMEOUT', '30.0'))
+        )
+
+
+@dataclass
+class BulkIndexResult:
+    """Outcome of a bulk indexing run."""
+    index_uid: str
+    documents_processed: int = 0
+    documents_skipped: int = 0
+    batches: int = 0
+    elapsed_s: float = 0.0
+    final_batch_size: int = 0
+    per_document_ms: Optional[float] = None
+    task_uids: List[int] = field(default_factory=list)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.documents_processed / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'index_uid': self.index_uid,
+            'documents_processed': self.documents_processed,
+            'documents_skipped': self.documents_skipped,
+            'batches': self.batches,
+            'elapsed_s': round(self.elapsed_s, 3),
+            'docs_per_second': round(self.docs_per_second, 1),
+            'final_batch_size': self.final_batch_size,
+            'per_document_ms': round(self.per_document_ms, 4) if self.per_document_ms is not None else None,
+            'task_uids': self.task_uids
+        }
+
+
+class BulkIndexError(RuntimeError):
+    """A batch failed to index; ``result`` holds the progress made before it."""
+
+    def __init__(self, message: str, result: BulkIndexResult):
+        super().__init__(message)
+        self.result = result
+
+
+@dataclass
+class _Batch:
+    seq: int
+    start: int
+    count: int
+    body: bytes
+    task_uid: Optional[int] = None
+    status: Optional[str] = None
+
+
+class IndexCheckpoint:
+    """Per-index count of source documents indexed in order, kept in a JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def load(self, index_uid: str) -> int:
+        return int(self._read().get(index_uid, {}).get('offset', 0))
+
+    def save(self, index_uid: str, offset: int) -> None:
+        state = self._read()
+        state[index_uid] = {'offset': offset, 'updated_at': time.time()}
+        self._write(state)
+
+    def clear(self, index_uid: str) -> None:
+        state = self._read()
+        if state.pop(index_uid, None) is not None:
+            self._write(state)
+
+    def _write(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename so a crash never leaves a torn checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+class MeilisearchBulkIndexer:
+    """
+    Pipelined NDJSON bulk indexer for one Meilisearch instance.
+
+    Talks to the HTTP API directly: the Python client has no streaming or
+    async task API, and its ``wait_for_task`` blocks a thread per batch.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        config: Optional[BulkIndexerConfig] = None
+    ):
+        """
+        Args:
+            client: Client with the Meilisearch base URL and auth headers set
+            config: Indexer configuration (defaults from environment)
+        """
+        self.client = client
+        self.config = config or BulkIndexerConfig.from_environment()
+        self.batch_size = self.config.initial_batch_size
+        self.per_document_s: Optional[float] = None
+
+    async def index_documents(
+        self,
+        source: DocumentSource,
+        index_uid: str,
+        primary_key: Optional[str] = None,
+        checkpoint_path: Optional[str] = None
+    ) -> BulkIndexResult:
+        """
+        Index every document from ``source``.
+
+        Args:
+            source: Documents in a stable order (required for resuming)
+            index_uid: Target index
+            primary_key: Primary key field, if the index does not have one yet
+            checkpoint_path: File recording progress; an interrupted run with
+                the same path skips the documents already indexed. The entry
+                is removed once the whole source is indexed.
+
+        Raises:
+            BulkIndexError: A batch was rejected or failed to index
+        """
+        start_time = time.time()
+        checkpoint = IndexCheckpoint(checkpoint_path) if checkpoint_path else None
+        committed = checkpoint.load(index_uid) if checkpoint else 0
+        result = BulkIndexResult(index_uid=index_uid, documents_skipped=committed)
+
+        slots = asyncio.Semaphore(self.config.max_in_flight)
+        in_order: Deque[_Batch] = deque()
+        pending: Dict[int, _Batch] = {}
+        wake = asyncio.Event()
+        state = {'committed': committed, 'producing': True, 'error': None}
+        params = {'primaryKey': primary_key} if primary_key else None
+
+        async def produce() -> None:
+            try:
+                async for batch in self._batches(source, committed):
+                    await slots.acquire()
+                    if state['error']:
+                        return
+                    batch.task_uid = await self._enqueue(index_uid, batch.body, params)
+                    batch.body = b''
+                    in_order.append(batch)
+                    pending[batch.task_uid] = batch
+                    result.task_uids.append(batch.task_uid)
+                    result.batches += 1
+                    wake.set()
+            finally:
+                state['producing'] = False
+                wake.set()
+
+        async def poll() -> None:
+            interval = self.config.poll_interval_s
+            while state['producing'] or pending:
+                if not pending:
+                    await wake.wait()
+                    wake.clear()
+                    continue
+                tasks = await self._get_tasks(list(pending))
+                finished = [t for t in tasks if t.get('status') in _FINISHED and t.get('uid') in pending]
+                for task in finished:
+                    batch = pending.pop(task['uid'])
+                    batch.status = task['status']
+                    slots.release()
+                    if batch.status != 'succeeded':
+                        state['error'] = (batch, task.get('error') or {})
+                self._observe_costs(finished)
+                while in_order and in_order[0].status == 'succeeded':
+                    batch = in_order.popleft()
+                    state['committed'] = batch.start + batch.count
+                    result.documents_processed += batch.count
+                    if checkpoint:
+                        checkpoint.save(index_uid, state['committed'])
+                if state['error']:
+                    return
+                # Poll quickly while tasks are finishing, back off while one is long-running
+                interval = self.config.poll_interval_s if finished else min(interval * 2, self.config.max_poll_interval_s)
+                await asyncio.sleep(interval)
+
+        producer = asyncio.create_task(produce())
+        try:
+            await poll()
+        finally:
+            if state['error'] or not producer.done():
+                producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+
+        result.elapsed_s = time.time() - start_time
+        result.final_batch_size = self.batch_size
+        result.per_document_ms = self.per_document_s * 1000 if self.per_document_s is not None else None
+
+        if state['error']:
+            batch, error = state['error']
+            raise BulkIndexError(
+                f"Batch {batch.seq} (documents {batch.start}-{batch.start + batch.count - 1}) "
+                f"failed: {error.get('message', batch.status)}",
+                result
+            )
+        if checkpoint:
+            checkpoint.clear(index_uid)
+
+        logger.info("Bulk indexing completed",
+                   index=index_uid,
+                   documents_processed=result.documents_processed,
+                   documents_skipped=result.documents_skipped,
+                   batches=result.batches,
+                   docs_per_second=round(result.docs_per_second, 1),
+                   final_batch_size=result.final_batch_size)
+        return result
+
+    async def _batches(self, source: DocumentSource, skip: int) -> AsyncIterator[_Batch]:
+        """Encode source documents into NDJSON batches sized by the current target."""
+        lines: List[bytes] = []
+        size = 0
+        position = 0
+        seq = 0
+        start = skip
+        async for document in _aiter(source):
+            position += 1
+            if position <= skip:
+                continue
+            line = _dumps(document)
+            lines.append(line)
+            size += len(line) + 1
+            if len(lines) >= self.batch_size or size >= self.config.max_batch_bytes:
+                yield _Batch(seq=seq, start=start, count=len(lines), body=b'\n'.join(lines))
+                seq += 1
+                start += len(lines)
+                lines, size = [], 0
+        if lines:
+            yield _Batch(seq=seq, start=start, count=len(lines), body=b'\n'.join(lines))
+
+    async def _enqueue(self, index_uid: str, body: bytes, params: Optional[Dict[str, str]]) -> int:
+        response = await self.client.post(
+            f"/indexes/{index_uid}/documents",
+            content=body,
+            params=params,
+            headers={'Content-Type': 'application/x-ndjson'},
+            timeout=self.config.request_timeout_s
+        )
+        response.raise_for_status()
+        return int(response.json()['taskUid'])
+
+    async def _get_tasks(self, uids: List[int]) -> List[Dict[str, Any]]:
+        response = await self.client.get(
+            "/tasks",
+            params={'uids': ','.join(map(str, uids)), 'limit': len(uids)},
+            timeout=self.config.request_timeout_s
+        )
+        response.raise_for_status()
+        return response.json().get('results', [])
+
+    def _observe_costs(self, tasks: List[Dict[str, Any]]) -> None:
+        """Update the per-document cost estimate and the batch size from finished tasks."""
+        # Auto-batched tasks report the duration of their whole batch; count it once
+        groups: Dict[Any, List[float]] = {}
+        for task in tasks:
+            if task.get('status') != 'succeeded':
+                continue
+            documents = (task.get('details') or {}).get('receivedDocuments') or 0
+            duration = _parse_duration(task.get('duration'))
+            if not documents or duration is None:
+                continue
+            key = task.get('batchUid', (task.get('startedAt'), task.get('finishedAt')))
+            group = groups.setdefault(key, [duration, 0])
+            group[1] += documents
+        for duration, documents in groups.values():
+            cost = duration / documents
+            self.per_document_s = cost if self.per_document_s is None else 0.7 * self.per_document_s + 0.3 * cost
+        if self.per_document_s:
+            target = int(self.config.target_task_seconds / self.per_document_s)
+            self.batch_size = max(self.config.min_batch_size, min(self.config.max_batch_size, target))
+
+
+async def _aiter(source: DocumentSource) -> AsyncIterator[Dict[str, Any]]:
+    if hasattr(source, '__aiter__'):
+        async for document in source:
+            yield document
+    else:
+        for document in source:
+            yield document
+
+
+def _dumps(document: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(document)
+    return json.dumps(document, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in an ISO 8601 duration such as ``PT1M2.5S``."""
+    if not value:
+        return None
+    match = _DURATION.fullmatch(value)
+    if not match:
+        return None
+    hours, minutes, seconds = (float(g) if g else 0.0 for g in match.groups())
+    return hours * 3600 + minutes * 60 + seconds
+
+
+__all__ = [
+    'BulkIndexerConfig',
+    'BulkIndexError',
+    'BulkIndexResult',
+    'IndexCheckpoint',
+    'MeilisearchBulkIndexer'
+]
@@ -4,8 +4,7 @@ Meilisearch Service - Production-Optimized Search (Phase J1)
 
 Production-grade Meilisearch integration with domain-specific optimizations:
 - Tuned index settings for docs/code/QA domains
-- Batch updates with optimal chunk sizes
-- Auto-refresh configuration for bulk operations
+- Pipelined NDJSON bulk indexing with adaptive batch sizes and checkpoints
 - Status endpoint for monitoring
 - Performance metrics collection
 
@@ -20,6 +19,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import structlog
 
+from shared.core.http_client_registry import get_http_client_registry
+from shared.core.services.meilisearch_bulk_indexer import DocumentSource, MeilisearchBulkIndexer
+
 # Optional dependency with graceful fallback
 try:
     import meilisearch
@@ -115,8 +117,7 @@ class MeilisearchService:
     
     Features:
     - Domain-specific index optimization (docs, code, QA)
-    - Batch operations with optimal performance
-    - Auto-refresh configuration
+    - Pipelined bulk indexing
     - Comprehensive monitoring and metrics
     - Production-grade error handling
     """
@@ -128,6 +129,7 @@ class MeilisearchService:
         self.metrics = SearchMetrics()
         self._indexes = {}
         self._connected = False
+        self._bulk_indexer: Optional[MeilisearchBulkIndexer] = None
         
         logger.info("MeilisearchService initialized",
                    config=self.config.get_redacted_config())
@@ -411,8 +413,24 @@ class MeilisearchService:
                         time_ms=round(search_time_ms, 2))
             raise
     
-    async def bulk_index_documents(self, documents: List[Dict[str, Any]], index_name: str) -> Dict[str, Any]:
-        """Perform optimized bulk indexing with batch processing."""
+    async def bulk_index_documents(
+        self,
+        documents: DocumentSource,
+        index_name: str,
+        checkpoint_path: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Perform pipelined bulk indexing.
+        
+        Documents are streamed from ``documents`` (a list, generator or async
+        generator) as NDJSON with several batches in flight; see
+        ``MeilisearchBulkIndexer``.
+        
+        Args:
+            documents: Documents to index, in a stable order when resuming
+            index_name: Target index
+            checkpoint_path: Optional progress file for resuming an interrupted run
+        """
         if not self._connected:
             await self.connect()
         
@@ -424,47 +442,9 @@ class MeilisearchService:
         try:
             index = self._indexes[index_name]
             
-            # Process in batches for optimal performance
-            total_processed = 0
-            batch_results = []
-            
-            for i in range(0, len(documents), self.config.batch_size):
-                batch = documents[i:i + self.config.batch_size]
-                
-                # Disable auto-refresh for bulk operations
-                if self.config.auto_refresh_enabled and i == 0:
-                    await asyncio.to_thread(
-                        index.update_settings,
-                        {'autoRefresh': False}
-                    )
-                
-                # Add batch
-                task_info = await asyncio.to_thread(
-                    index.add_documents,
-                    batch
-                )
-                
-                # Wait for task completion if it's a task object
-                if hasattr(task_info, 'task_uid'):
-                    await asyncio.to_thread(
-                        self.client.wait_for_task,
-                        task_info.task_uid
-                    )
-                
-                batch_results.append(task_info)
-                total_processed += len(batch)
-                
-                logger.debug("Processed batch",
-                           batch_size=len(batch),
-                           total_processed=total_processed,
-                           total_documents=len(documents))
-            
-            # Re-enable auto-refresh
-            if self.config.auto_refresh_enabled:
-                await asyncio.to_thread(
-                    index.update_settings,
-                    {'autoRefresh': True}
-                )
+            result = await self._get_bulk_indexer().index_documents(
+                documents, index_name, checkpoint_path=checkpoint_path
+            )
             
             # Record performance metrics
             indexing_time_ms = (time.time() - start_time) * 1000
@@ -474,16 +454,13 @@ class MeilisearchService:
             stats = await asyncio.to_thread(index.get_stats)
             self.metrics.index_sizes[index_name] = stats.get('numberOfDocuments', 0)
             
-            logger.info("Bulk indexing completed",
-                       index=index_name,
-                       documents_processed=total_processed,
-                       time_ms=round(indexing_time_ms, 2),
-                       total_documents_in_index=self.metrics.index_sizes[index_name])
-            
             return {
-                'documents_processed': total_processed,
+                'documents_processed': result.documents_processed,
+                'documents_skipped': result.documents_skipped,
                 'indexing_time_ms': indexing_time_ms,
-                'batch_results': batch_results,
+                'docs_per_second': round(result.docs_per_second, 1),
+                'batches': result.batches,
+                'batch_results': result.task_uids,
                 'total_documents_in_index': self.metrics.index_sizes[index_name]
             }
             
@@ -491,11 +468,21 @@ class MeilisearchService:
             indexing_time_ms = (time.time() - start_time) * 1000
             logger.error("Bulk indexing failed",
                         index=index_name,
-                        documents_count=len(documents),
                         error=str(e),
                         time_ms=round(indexing_time_ms, 2))
             raise
     
+    def _get_bulk_indexer(self) -> MeilisearchBulkIndexer:
+        """Bulk indexer over the shared HTTP connection pools; keeps its learned batch size."""
+        if self._bulk_indexer is None:
+            api_key = self.config.master_key or self.config.api_key
+            client = get_http_client_registry().client(
+                base_url=self.config.url,
+                headers={'Authorization': f'Bearer {api_key}'} if api_key else None
+            )
+            self._bulk_indexer = MeilisearchBulkIndexer(client)
+        return self._bulk_indexer
+    
     async def get_status(self) -> Dict[str, Any]:
         """Get comprehensive search service status."""
         try:
@@ -23,6 +23,8 @@ from datetime import datetime
 from enum import Enum
 import structlog
 
+from shared.core.request_deadline import RequestDeadline, deadline_scope
+
 logger = structlog.get_logger(__name__)
 
 # Environment-driven SLA configuration - Updated for better performance
@@ -601,11 +603,9 @@ class MultiLaneOrchestrator:
             # Import ArangoDB service
             from shared.core.services.arangodb_service import arangodb_service
             
-            # Simple knowledge graph query (replace with actual KG logic)
-            kg_query = f"FOR e IN entities FILTER CONTAINS(e.name, '{query}') LIMIT 5 RETURN e"
-            
             try:
-                results = await arangodb_service.execute_aql(kg_query)
+                # Entity index lookup; ArangoDB only hydrates the matches
+                results = await arangodb_service.search_entities(query, 5)
             except Exception:
                 # Graceful degradation if ArangoDB unavailable
                 results = []
@@ -998,6 +998,10 @@ class MultiLaneOrchestrator:
         """
         Orchestrate parallel query processing across all lanes with deadline enforcement.
         
+        The global deadline is the SLA budget capped by the propagated request
+        deadline, and is installed as the request deadline so lanes, provider
+        calls and retries downstream all see the same cut-off.
+        
         Args:
             query: User query to process
             **kwargs: Additional context for processing
@@ -1005,12 +1009,17 @@ class MultiLaneOrchestrator:
         Returns:
             Orchestrated response with results from all lanes
         """
+        with deadline_scope(budget_ms=self.config.sla_global_ms) as request_deadline:
+            return await self._orchestrate_query(query, request_deadline, **kwargs)
+    
+    async def _orchestrate_query(self, query: str, request_deadline: RequestDeadline, **kwargs) -> Dict[str, Any]:
+        """Run the orchestration under an already-established request deadline."""
         start_time = time.time()
         
         # Initialize deadline management
         deadline = OrchestrationDeadline(
             query_start_time=start_time,
-            global_deadline_ms=self.config.sla_global_ms,
+            global_deadline_ms=int(request_deadline.remaining_ms),
             orchestrator_reserve_ms=self.config.sla_orchestrator_reserve_ms,
             ttft_target_ms=self.config.sla_ttft_max_ms
         )
@@ -1148,10 +1157,10 @@ class MultiLaneOrchestrator:
             'intent': intent.value,
             'mode': self.config.mode,
             'sla_compliance': {
-                'deadline_ms': self.config.sla_global_ms,
+                'deadline_ms': deadline.global_deadline_ms,
                 'ttft_ms': total_time_ms,
                 'finalize_ms': total_time_ms,
-                'answered_under_sla': total_time_ms <= self.config.sla_global_ms,
+                'answered_under_sla': total_time_ms <= deadline.global_deadline_ms,
                 'deadline_remaining_ms': deadline.remaining_ms,
                 'slack_pool_ms': deadline.get_slack_pool()
             },
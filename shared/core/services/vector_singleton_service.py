@@ -23,13 +23,12 @@ from functools import lru_cache
 import structlog
 import hashlib
 
-# Optional dependencies with graceful fallback
-try:
-    import sentence_transformers
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    sentence_transformers = None
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from shared.embeddings.shared_weights import get_shared_sentence_transformer
+from shared.core.lazy_imports import module_available
+
+# Optional dependencies with graceful fallback; sentence-transformers is only
+# checked here and imported by the shared weight loader when the model loads
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
 
 try:
     import chromadb
@@ -242,8 +241,9 @@ class EmbeddingSingleton:
         
         try:
             # Load model with timeout
+            # Weights are memory-mapped from the shared store, one copy per host
             load_task = asyncio.to_thread(
-                sentence_transformers.SentenceTransformer,
+                get_shared_sentence_transformer,
                 self.config.embedding_model
             )
             
@@ -13,6 +13,8 @@ from enum import Enum
 import asyncio
 from contextlib import asynccontextmanager
 
+from shared.core.request_deadline import remaining_seconds
+
 logger = logging.getLogger(__name__)
 
 class ComplexityTier(Enum):
@@ -179,6 +181,9 @@ class SLABudgetEnforcer:
         # Get lane budget
         lane_budget = budget_config.lane_budgets.get(lane_name, 0.0)
         
+        # Never hand out more than is left of the propagated request deadline
+        global_remaining = min(global_remaining, remaining_seconds(default=global_remaining))
+        
         # Calculate effective timeout using min(lane_budget, global_remaining)
         effective_timeout = min(lane_budget, global_remaining)
         
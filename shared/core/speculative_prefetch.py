@@ -0,0 +1,459 @@
+"""
+Speculative Retrieval Prefetch for SarvanOM
+
+Runs the cheap, keyless zero-budget search providers for a draft query
+while the guided-prompt service is still refining it, so the final search
+can skip them:
+- The guided-prompt service schedules a prefetch per session as the draft
+  changes; a newer draft cancels the session's prefetch still in flight
+- Only the providers in SPECULATIVE_PREFETCH_LANES run (Wikipedia, Stack
+  Exchange, MDN by default), through the retrieval service's
+  /retrieval/free/combined, with a short timeout; that is the same
+  zero-budget search the gateway runs for /search and /stream/search
+- Results live in a short-lived per-session cache (Redis when configured,
+  in-memory otherwise) under SPECULATIVE_PREFETCH_TTL_S
+- /search and /stream/search claim the session's entry when the final
+  query is within the edit-distance threshold of a prefetched draft;
+  claiming consumes every entry of the session, and entries with too few
+  usable results are treated as a miss
+- On a hit the final search skips the providers the entry covers and runs
+  only the rest; the claimed results are merged into theirs
+- Shared counters track the waste ratio (prefetches that never served a
+  search) and the retrieval time saved before the first token; only hits
+  whose results made it into the merged response count
+
+Drafts containing PII are never prefetched, so no raw PII leaves the
+guided-prompt service or lands in the cache.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "prefetch:stats"
+STAT_FIELDS = ("started", "cancelled", "failed", "stored", "hits", "misses", "unused", "ttft_saved_ms")
+
+Fetcher = Callable[[str, Sequence[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+@dataclass
+class PrefetchConfig:
+    """Speculative prefetch configuration"""
+    enabled: bool = False
+    ttl_s: float = 30.0
+    max_edit_distance: int = 3
+    max_edit_ratio: float = 0.15
+    min_query_chars: int = 8
+    min_suggestion_confidence: float = 0.8
+    min_results: int = 1
+    min_result_chars: int = 40
+    max_entries_per_session: int = 4
+    max_sessions: int = 10000
+    lanes: Tuple[str, ...] = ("wiki", "stackexchange", "mdn")
+    fetch_timeout_s: float = 1.5
+    retrieval_url: str = "http://localhost:8002"
+    redis_url: Optional[str] = None
+
+    @classmethod
+    def from_environment(cls) -> "PrefetchConfig":
+        """Load configuration from environment variables"""
+        lanes = os.getenv("SPECULATIVE_PREFETCH_LANES", "wiki,stackexchange,mdn")
+        return cls(
+            enabled=os.getenv("SPECULATIVE_PREFETCH_ENABLED", "false").lower() == "true",
+            ttl_s=float(os.getenv("SPECULATIVE_PREFETCH_TTL_S", "30")),
+            max_edit_distance=int(os.getenv("SPECULATIVE_PREFETCH_MAX_EDIT_DISTANCE", "3")),
+            max_edit_ratio=float(os.getenv("SPECULATIVE_PREFETCH_MAX_EDIT_RATIO", "0.15")),
+            min_query_chars=int(os.getenv("SPECULATIVE_PREFETCH_MIN_CHARS", "8")),
+            min_suggestion_confidence=float(os.getenv("SPECULATIVE_PREFETCH_MIN_CONFIDENCE", "0.8")),
+            min_results=int(os.getenv("SPECULATIVE_PREFETCH_MIN_RESULTS", "1")),
+            min_result_chars=int(os.getenv("SPECULATIVE_PREFETCH_MIN_RESULT_CHARS", "40")),
+            max_entries_per_session=int(os.getenv("SPECULATIVE_PREFETCH_MAX_ENTRIES", "4")),
+            lanes=tuple(lane.strip() for lane in lanes.split(",") if lane.strip()),
+            fetch_timeout_s=float(os.getenv("SPECULATIVE_PREFETCH_TIMEOUT_S", "1.5")),
+            retrieval_url=os.getenv("RETRIEVAL_SERVICE_URL", "http://localhost:8002"),
+            redis_url=os.getenv("REDIS_URL") or None,
+        )
+
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s?.!,;:]+$")
+
+
+def normalize_query(query: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a query"""
+    return _TRAILING.sub("", _WHITESPACE.sub(" ", query.strip().lower()))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, or ``limit + 1`` once it exceeds ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, char_b in enumerate(b, 1):
+        current = [i]
+        for j, char_a in enumerate(a, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+@dataclass
+class PrefetchEntry:
+    """Results prefetched for one draft query"""
+    query: str
+    normalized: str
+    results: List[Dict[str, Any]]
+    lanes: List[str]
+    fetch_ms: float
+    created_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PrefetchEntry":
+        return cls(**data)
+
+
+@dataclass
+class PrefetchHit:
+    """A prefetched entry claimed by the final query"""
+    entry: PrefetchEntry
+    distance: int
+
+    @property
+    def saved_ms(self) -> float:
+        """Time the prefetched lanes took, which the final request does not wait for"""
+        return self.entry.fetch_ms
+
+
+def _result_text(item: Dict[str, Any]) -> str:
+    return item.get("snippet") or item.get("content") or ""
+
+
+class SpeculativePrefetchCache:
+    """Short-lived per-session prefetch cache: Redis when configured, in-memory fallback"""
+
+    def __init__(self, config: Optional[PrefetchConfig] = None):
+        self.config = config or PrefetchConfig.from_environment()
+        self.redis_client: Optional[aioredis.Redis] = None
+        self._sessions: "OrderedDict[str, Dict[str, PrefetchEntry]]" = OrderedDict()
+        self._stats: Dict[str, float] = {name: 0 for name in STAT_FIELDS}
+
+    async def initialize(self) -> None:
+        """Connect to Redis so the guided-prompt service and the gateway share entries"""
+        if not self.config.redis_url or self.redis_client is not None:
+            return
+        try:
+            self.redis_client = aioredis.from_url(
+                self.config.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            await self.redis_client.ping()
+            logger.info("Speculative prefetch cache using Redis")
+        except Exception as e:
+            logger.warning(f"Prefetch cache Redis unavailable, using in-memory cache: {e}")
+            self.redis_client = None
+
+    async def close(self) -> None:
+        if self.redis_client is not None:
+            await self.redis_client.close()
+            self.redis_client = None
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"prefetch:session:{session_id}"
+
+    async def put(self, session_id: str, entry: PrefetchEntry) -> None:
+        """Store ``entry`` for the session, keeping its newest ``max_entries_per_session``"""
+        limit = self.config.max_entries_per_session
+        if self.redis_client is not None:
+            key = self._key(session_id)
+            pipe = self.redis_client.pipeline()
+            pipe.hset(key, entry.normalized, json.dumps(asdict(entry)))
+            pipe.expire(key, int(self.config.ttl_s) or 1)
+            pipe.hgetall(key)
+            stored = (await pipe.execute())[-1]
+            if len(stored) > limit:
+                oldest = sorted(stored, key=lambda k: json.loads(stored[k])["created_at"])[:len(stored) - limit]
+                await self.redis_client.hdel(key, *oldest)
+        else:
+            entries = self._sessions.pop(session_id, {})
+            entries.pop(entry.normalized, None)
+            entries[entry.normalized] = entry
+            while len(entries) > limit:
+                entries.pop(next(iter(entries)))
+            self._sessions[session_id] = entries
+            while len(self._sessions) > self.config.max_sessions:
+                self._sessions.popitem(last=False)
+        await self.record(stored=1)
+
+    async def _take(self, session_id: str) -> List[PrefetchEntry]:
+        if self.redis_client is not None:
+            key = self._key(session_id)
+            pipe = self.redis_client.pipeline()
+            pipe.hgetall(key)
+            pipe.delete(key)
+            stored, _ = await pipe.execute()
+            entries = [PrefetchEntry.from_dict(json.loads(value)) for value in stored.values()]
+        else:
+            entries = list(self._sessions.pop(session_id, {}).values())
+        cutoff = time.time() - self.config.ttl_s
+        return [entry for entry in entries if entry.created_at >= cutoff]
+
+    async def claim(self, session_id: Optional[str], query: str) -> Optional[PrefetchHit]:
+        """The session's prefetched entry closest to ``query``, within the edit-distance threshold
+
+        Claiming consumes all of the session's entries: the query was submitted,
+        so the other drafts can no longer be used.
+        """
+        if not self.config.enabled or not session_id:
+            return None
+        try:
+            entries = await self._take(session_id)
+        except Exception as e:
+            logger.warning(f"Prefetch claim failed: {e}")
+            return None
+        if not entries:
+            return None
+        normalized = normalize_query(query)
+        limit = min(self.config.max_edit_distance, int(len(normalized) * self.config.max_edit_ratio))
+        best: Optional[PrefetchHit] = None
+        for entry in entries:
+            distance = edit_distance(entry.normalized, normalized, limit)
+            if distance <= limit and (best is None or distance < best.distance):
+                best = PrefetchHit(entry, distance)
+        if best is None or self.usable_results(best.entry) < self.config.min_results:
+            await self.record(misses=1)
+            return None
+        return best
+
+    def usable_results(self, entry: PrefetchEntry) -> int:
+        """Results of ``entry`` with a URL and at least ``min_result_chars`` of text"""
+        return sum(
+            1 for item in entry.results
+            if (item.get("url") or item.get("metadata", {}).get("url"))
+            and len(_result_text(item).strip()) >= self.config.min_result_chars
+        )
+
+    async def record_use(self, hit: PrefetchHit, used: int, waited_ms: float) -> None:
+        """Count a claimed hit once the final response is merged
+
+        Only a hit that contributed ``used`` results counts towards the hit
+        rate. The final request skipped the prefetched providers and waited
+        ``waited_ms`` for the rest; without the prefetch both would have run
+        in parallel, so the latency it avoided is how much longer the
+        prefetched providers took than that.
+        """
+        if used:
+            await self.record(hits=1, ttft_saved_ms=max(0.0, hit.saved_ms - waited_ms))
+        else:
+            await self.record(unused=1)
+
+    async def record(self, **counts: float) -> None:
+        """Add to the shared counters (see STAT_FIELDS)"""
+        if self.redis_client is not None:
+            try:
+                pipe = self.redis_client.pipeline()
+                for name, amount in counts.items():
+                    pipe.hincrbyfloat(STATS_KEY, name, amount)
+                await pipe.execute()
+                return
+            except Exception as e:
+                logger.debug(f"Prefetch stats update failed: {e}")
+        for name, amount in counts.items():
+            self._stats[name] += amount
+
+    async def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        if self.redis_client is not None:
+            try:
+                stored = await self.redis_client.hgetall(STATS_KEY)
+                stats.update({name: float(value) for name, value in stored.items() if name in stats})
+            except Exception as e:
+                logger.debug(f"Prefetch stats read failed: {e}")
+        started = stats["started"]
+        return {
+            **{name: int(value) for name, value in stats.items() if name != "ttft_saved_ms"},
+            # Prefetches that never served a search (cancelled, failed, expired, unmatched or unused)
+            "waste_ratio": round(1 - stats["hits"] / started, 4) if started else 0.0,
+            "ttft_saved_ms_total": round(stats["ttft_saved_ms"], 1),
+            "avg_ttft_saved_ms": round(stats["ttft_saved_ms"] / stats["hits"], 1) if stats["hits"] else 0.0,
+        }
+
+
+class SpeculativePrefetcher:
+    """Schedules one in-flight prefetch per session and slot for the latest query
+
+    Slots keep independent predictions apart: the typed draft and the
+    top refinement suggestion each supersede only their own earlier prefetch.
+    """
+
+    def __init__(self, cache: SpeculativePrefetchCache, fetch: Optional[Fetcher] = None):
+        self.cache = cache
+        self.config = cache.config
+        self.fetch = fetch or retrieval_service_fetcher(self.config)
+        self._inflight: Dict[Tuple[str, str], Tuple[str, asyncio.Task]] = {}
+
+    def schedule(self, session_id: Optional[str], query: str, slot: str = "draft") -> Optional[asyncio.Task]:
+        """Start prefetching ``query`` for the session; returns the task (None when skipped)"""
+        if not self.config.enabled or not session_id:
+            return None
+        normalized = normalize_query(query)
+        if len(normalized) < self.config.min_query_chars:
+            return None
+        key = (session_id, slot)
+        current = self._inflight.get(key)
+        if current is not None:
+            current_query, task = current
+            if current_query == normalized:
+                return task
+            # The user kept typing: the older draft's prefetch is no longer useful
+            task.cancel()
+        task = asyncio.create_task(self._prefetch(key, query, normalized))
+        self._inflight[key] = (normalized, task)
+        return task
+
+    async def _prefetch(self, key: Tuple[str, str], query: str, normalized: str) -> None:
+        session_id = key[0]
+        await self.cache.record(started=1)
+        start = time.perf_counter()
+        try:
+            results = await asyncio.wait_for(self.fetch(query, self.config.lanes), timeout=self.config.fetch_timeout_s)
+            fetch_ms = (time.perf_counter() - start) * 1000
+            await self.cache.put(session_id, PrefetchEntry(query, normalized, results, list(self.config.lanes), fetch_ms))
+        except asyncio.CancelledError:
+            await self.cache.record(cancelled=1)
+            raise
+        except Exception as e:
+            logger.debug(f"Speculative prefetch failed for session {session_id}: {e}")
+            await self.cache.record(failed=1)
+        finally:
+            current = self._inflight.get(key)
+            if current is not None and current[1] is asyncio.current_task():
+                del self._inflight[key]
+
+    async def close(self) -> None:
+        tasks = [task for _, task in self._inflight.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+
+def retrieval_service_fetcher(config: PrefetchConfig) -> Fetcher:
+    """Fetch through the retrieval service's zero-budget search, restricted to the prefetch providers"""
+
+    async def fetch(query: str, lanes: Sequence[str]) -> List[Dict[str, Any]]:
+        from shared.core.http_client_registry import http_client_registry
+
+        client = http_client_registry.client(timeout=config.fetch_timeout_s)
+        response = await client.get(
+            f"{config.retrieval_url.rstrip('/')}/retrieval/free/combined",
+            params={"query": query, "k": 10, "providers": ",".join(lanes)},
+        )
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+    return fetch
+
+
+def to_search_response(hit: PrefetchHit, k: int = 10, min_chars: int = 1):
+    """Prefetched results as a zero-budget ``SearchResponse``
+
+    Results without a URL or with less than ``min_chars`` of text are left out.
+    """
+    from services.retrieval.free_tier import SearchProvider, SearchResponse, SearchResult
+
+    results = []
+    for item in hit.entry.results:
+        url = item.get("url") or item.get("metadata", {}).get("url", "")
+        if not url or len(_result_text(item).strip()) < min_chars:
+            continue
+        if len(results) == k:
+            break
+        try:
+            provider = SearchProvider(item.get("provider"))
+        except ValueError:
+            provider = SearchProvider.CACHE
+        results.append(SearchResult(
+            title=item.get("title") or item.get("metadata", {}).get("title", url),
+            url=url,
+            snippet=_result_text(item)[:500],
+            domain=item.get("domain", ""),
+            provider=provider,
+            relevance_score=float(item.get("relevance_score", item.get("score", 0.0)) or 0.0),
+            metadata={**(item.get("metadata") or {}), "prefetched": True},
+        ))
+    return SearchResponse(
+        query=hit.entry.query,
+        results=results,
+        total_results=len(results),
+        cache_hit=True,
+        providers_used=list(dict.fromkeys(result.provider for result in results)),
+        processing_time_ms=0.0,
+    )
+
+
+def merge_prefetched(live, prefetched, k: int = 10):
+    """``live`` with the ``prefetched`` results added: deduplicated by URL, best first, cut to ``k``"""
+    seen = {result.url for result in live.results}
+    extra = [result for result in prefetched.results if result.url not in seen]
+    results = sorted(live.results + extra, key=lambda result: result.relevance_score, reverse=True)[:k]
+    providers = list(live.providers_used)
+    if any(result.metadata.get("prefetched") for result in results):
+        providers += [provider for provider in prefetched.providers_used if provider not in providers]
+    return replace(live, results=results, total_results=len(results), providers_used=providers)
+
+
+async def search_with_prefetch(
+    hit: Optional[PrefetchHit],
+    search: Callable[[Sequence[str]], Awaitable[Any]],
+    k: int = 10,
+    cache: Optional[SpeculativePrefetchCache] = None,
+):
+    """Search without the providers the claimed hit covers and merge its results in
+
+    ``search(skip_providers)`` runs the zero-budget search minus
+    ``skip_providers``. Without a hit nothing is skipped. With one, a failed
+    search still answers from the prefetched results alone.
+    """
+    if hit is None:
+        return await search(())
+    cache = cache or get_speculative_prefetch_cache()
+    prefetched = to_search_response(hit, k=k, min_chars=cache.config.min_result_chars)
+    start = time.perf_counter()
+    try:
+        merged = merge_prefetched(await search(hit.entry.lanes), prefetched, k)
+    except Exception as e:
+        logger.warning(f"Search failed, answering from the prefetched results: {e}")
+        merged = prefetched
+    used = sum(1 for result in merged.results if result.metadata.get("prefetched"))
+    await cache.record_use(hit, used, (time.perf_counter() - start) * 1000)
+    return merged
+
+
+# Global speculative prefetch cache
+speculative_prefetch_cache = SpeculativePrefetchCache()
+
+
+def get_speculative_prefetch_cache() -> SpeculativePrefetchCache:
+    """Get the global speculative prefetch cache"""
+    return speculative_prefetch_cache
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Startup Orchestrator
+
+Runs service warmup as a dependency graph instead of a fixed sequence:
+- Warmup tasks are declared with the tasks they depend on and the
+  capabilities they provide; every task starts as soon as its dependencies
+  are ready, so independent warmups (database, vector model, HTTP pools,
+  caches) overlap. ``after`` orders a task behind others without needing
+  them to succeed
+- Readiness is tracked per capability: /ready can report partial
+  readiness while slow warmups continue, and routes that need a capability
+  answer 503 with Retry-After (require_capability) instead of failing
+- A failed task is retried in the background with exponential backoff, so
+  a dependency that was down at boot (e.g. Qdrant) becomes ready once it
+  recovers; tasks it blocked run then. A task that raises
+  CapabilityDisabled (turned off by configuration) provides nothing and
+  does not hold readiness back
+- A cold-start report records process boot/import time, each task's
+  start/end offsets, the critical path, and lazily imported modules
+
+Following MAANG/OpenAI/Perplexity standards for service startup.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared.core.lazy_imports import get_import_timings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+SKIPPED = "skipped"
+DISABLED = "disabled"
+
+
+class CapabilityDisabled(Exception):
+    """Raised by a warmup task whose capability is turned off by configuration"""
+
+
+@dataclass
+class StartupConfig:
+    """Startup orchestration configuration"""
+    task_timeout_s: float = 120.0
+    wait_for: Tuple[str, ...] = ()
+    wait_timeout_s: float = 30.0
+    retry_after_s: int = 5
+    max_retries: int = 20
+    retry_base_s: float = 5.0
+    retry_max_s: float = 300.0
+
+    @classmethod
+    def from_environment(cls) -> "StartupConfig":
+        """Load configuration from environment variables"""
+        wait_for = os.getenv("STARTUP_WAIT_FOR", "")
+        return cls(
+            task_timeout_s=float(os.getenv("STARTUP_TASK_TIMEOUT_S", "120")),
+            wait_for=tuple(c.strip() for c in wait_for.split(",") if c.strip()),
+            wait_timeout_s=float(os.getenv("STARTUP_WAIT_TIMEOUT_S", "30")),
+            retry_after_s=int(os.getenv("STARTUP_RETRY_AFTER_S", "5")),
+            max_retries=int(os.getenv("STARTUP_MAX_RETRIES", "20")),
+            retry_base_s=float(os.getenv("STARTUP_RETRY_BASE_S", "5")),
+            retry_max_s=float(os.getenv("STARTUP_RETRY_MAX_S", "300")),
+        )
+
+
+@dataclass
+class WarmupTask:
+    """One node of the startup graph"""
+    name: str
+    run: Callable[[], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    provides: Tuple[str, ...] = ()
+    timeout_s: Optional[float] = None
+    after: Tuple[str, ...] = ()
+    status: str = PENDING
+    start_s: Optional[float] = None
+    end_s: Optional[float] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def duration_s(self) -> Optional[float]:
+        if self.start_s is None or self.end_s is None:
+            return None
+        return self.end_s - self.start_s
+
+
+class StartupOrchestrator:
+    """Runs warmup tasks concurrently in dependency order and tracks capability readiness"""
+
+    def __init__(self, config: Optional[StartupConfig] = None):
+        self.config = config or StartupConfig.from_environment()
+        self.tasks: Dict[str, WarmupTask] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+        self._started_wall: Optional[datetime] = None
+        self._finished_at: Optional[float] = None
+        self._capability_events: Dict[str, asyncio.Event] = {}
+        self._retries: Dict[str, asyncio.Task] = {}
+
+    def add_task(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        depends_on: Iterable[str] = (),
+        provides: Iterable[str] = (),
+        timeout_s: Optional[float] = None,
+        after: Iterable[str] = (),
+    ) -> None:
+        """Declare a warmup task; ``run`` is awaited once its dependencies are ready
+        and the ``after`` tasks have finished, whatever their outcome"""
+        if self._runner is not None:
+            raise RuntimeError("Cannot add warmup tasks after startup has begun")
+        if name in self.tasks:
+            raise ValueError(f"Duplicate warmup task: {name}")
+        self.tasks[name] = WarmupTask(name, run, tuple(depends_on), tuple(provides), timeout_s, tuple(after))
+
+    def _validate(self) -> None:
+        for task in self.tasks.values():
+            unknown = [dep for dep in task.depends_on + task.after if dep not in self.tasks]
+            if unknown:
+                raise ValueError(f"Warmup task {task.name} depends on unknown tasks: {unknown}")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Warmup dependency cycle through {name}")
+            visiting.add(name)
+            for dep in self.tasks[name].depends_on + self.tasks[name].after:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.tasks:
+            visit(name)
+
+    def start(self) -> asyncio.Task:
+        """Schedule every warmup task on the running loop; returns the task awaiting them all"""
+        if self._runner is None:
+            self._validate()
+            self._started_at = time.monotonic()
+            self._started_wall = datetime.now(timezone.utc)
+            loop = asyncio.get_running_loop()
+            runs = [loop.create_task(self._run_task(task), name=f"warmup:{task.name}") for task in self.tasks.values()]
+            self._runner = loop.create_task(self._run_all(runs), name="warmup")
+        return self._runner
+
+    async def run(self) -> Dict[str, Any]:
+        """Run startup to completion and return the cold-start report"""
+        await self.start()
+        return self.get_report()
+
+    async def _run_all(self, runs: List[asyncio.Task]) -> None:
+        try:
+            await asyncio.gather(*runs)
+        except asyncio.CancelledError:
+            for run in runs:
+                run.cancel()
+            raise
+        self._finished_at = time.monotonic()
+        report = self.get_report()
+        logger.info(
+            f"Startup warmup finished in {report['warmup_s']}s "
+            f"(sequential would be {report['sequential_s']}s; critical path: {' -> '.join(report['critical_path'])})"
+        )
+
+    async def _run_task(self, task: WarmupTask) -> None:
+        try:
+            for dep in task.depends_on + task.after:
+                await self.tasks[dep].done.wait()
+            unavailable = [dep for dep in task.depends_on if self.tasks[dep].status != READY]
+            if unavailable and all(self.tasks[dep].status == DISABLED for dep in unavailable):
+                task.status = DISABLED
+                task.error = f"dependencies disabled: {', '.join(unavailable)}"
+                logger.info(f"Warmup task {task.name} disabled: {task.error}")
+                return
+            if unavailable:
+                task.status = SKIPPED
+                task.error = f"dependencies not ready: {', '.join(unavailable)}"
+                logger.warning(f"Warmup task {task.name} skipped: {task.error}")
+                return
+
+            task.start_s = time.monotonic() - self._started_at
+            await self._attempt(task)
+            task.end_s = time.monotonic() - self._started_at
+            if task.status == READY:
+                logger.info(f"✅ Warmup task {task.name} ready in {task.duration_s:.3f}s")
+        finally:
+            task.done.set()
+            self._settle(task)
+        if task.status == FAILED:
+            self._schedule_retry(task, self.config.retry_base_s)
+
+    async def _attempt(self, task: WarmupTask) -> None:
+        task.status = RUNNING
+        task.attempts += 1
+        try:
+            await asyncio.wait_for(task.run(), timeout=task.timeout_s or self.config.task_timeout_s)
+            task.status, task.error = READY, None
+        except CapabilityDisabled as e:
+            task.status = DISABLED
+            task.error = str(e) or "disabled by configuration"
+            logger.info(f"Warmup task {task.name} disabled: {task.error}")
+        except asyncio.TimeoutError:
+            task.status = FAILED
+            task.error = f"timed out after {task.timeout_s or self.config.task_timeout_s}s"
+        except Exception as e:
+            task.status = FAILED
+            task.error = f"{type(e).__name__}: {e}"
+        if task.status == FAILED:
+            logger.error(f"❌ Warmup task {task.name} failed (attempt {task.attempts}): {task.error}")
+
+    def _settle(self, task: WarmupTask) -> None:
+        for capability in task.provides:
+            if self.capability_status(capability) != PENDING:
+                self._capability_event(capability).set()
+
+    def _schedule_retry(self, task: WarmupTask, delay: float) -> None:
+        if self.config.max_retries > 0 and task.name not in self._retries:
+            self._retries[task.name] = asyncio.get_running_loop().create_task(
+                self._retry(task, delay), name=f"warmup-retry:{task.name}"
+            )
+
+    async def _retry(self, task: WarmupTask, delay: float) -> None:
+        """Re-run a failed (or newly unblocked) task with exponential backoff until it is ready"""
+        try:
+            for _ in range(self.config.max_retries):
+                await asyncio.sleep(delay)
+                await self._attempt(task)
+                self._settle(task)
+                if task.status != FAILED:
+                    break
+                delay = min(max(delay * 2, self.config.retry_base_s), self.config.retry_max_s)
+        finally:
+            self._retries.pop(task.name, None)
+        if task.status == READY:
+            logger.info(f"✅ Warmup task {task.name} ready after {task.attempts} attempts")
+            # Tasks skipped because this one failed can run now
+            for dependent in self.tasks.values():
+                if (
+                    dependent.status == SKIPPED
+                    and task.name in dependent.depends_on
+                    and all(self.tasks[dep].status == READY for dep in dependent.depends_on)
+                ):
+                    dependent.status = PENDING
+                    self._schedule_retry(dependent, 0.0)
+
+    async def stop(self) -> None:
+        """Cancel any warmup or retry still running (shutdown before startup finished)"""
+        retries = list(self._retries.values())
+        for retry in retries:
+            retry.cancel()
+        await asyncio.gather(*retries, return_exceptions=True)
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+
+    def _capability_event(self, capability: str) -> asyncio.Event:
+        if capability not in self._capability_events:
+            self._capability_events[capability] = asyncio.Event()
+        return self._capability_events[capability]
+
+    def capabilities(self) -> List[str]:
+        return sorted({c for task in self.tasks.values() for c in task.provides})
+
+    def capability_status(self, capability: str) -> str:
+        """ready when every providing task is ready (or disabled), failed while any has failed or been
+        skipped, disabled when all are"""
+        statuses = [task.status for task in self.tasks.values() if capability in task.provides]
+        if not statuses:
+            return "unknown"
+        if any(status in (FAILED, SKIPPED) for status in statuses):
+            return FAILED
+        if all(status == DISABLED for status in statuses):
+            return DISABLED
+        if all(status in (READY, DISABLED) for status in statuses):
+            return READY
+        return PENDING
+
+    def is_ready(self, capability: str) -> bool:
+        return self.capability_status(capability) == READY
+
+    async def wait_for(self, capabilities: Iterable[str], timeout: Optional[float] = None) -> bool:
+        """Wait until each capability is ready or has failed; True if all are ready (or disabled)"""
+        capabilities = [c for c in capabilities if self.capability_status(c) != "unknown"]
+        waits = [self._capability_event(c).wait() for c in capabilities if self.capability_status(c) == PENDING]
+        if waits:
+            try:
+                await asyncio.wait_for(asyncio.gather(*waits), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return all(self.capability_status(c) in (READY, DISABLED) for c in capabilities)
+
+    def readiness(self) -> Dict[str, Any]:
+        """Per-capability readiness: ready, partial (some capabilities still warming or failed) or starting
+
+        Disabled capabilities are listed but do not hold readiness back.
+        """
+        capabilities = {c: self.capability_status(c) for c in self.capabilities()}
+        ready = sum(1 for status in capabilities.values() if status in (READY, DISABLED))
+        if ready == len(capabilities):
+            status = "ready"
+        elif ready or any(s == FAILED for s in capabilities.values()):
+            status = "partial"
+        else:
+            status = "starting"
+        return {"status": status, "capabilities": capabilities}
+
+    def _critical_path(self) -> Tuple[List[str], float]:
+        """Longest chain of dependent task durations"""
+        memo: Dict[str, Tuple[float, List[str]]] = {}
+
+        def longest(name: str) -> Tuple[float, List[str]]:
+            if name not in memo:
+                task = self.tasks[name]
+                best = max((longest(dep) for dep in task.depends_on + task.after), default=(0.0, []), key=lambda x: x[0])
+                memo[name] = (best[0] + (task.duration_s or 0.0), best[1] + [name])
+            return memo[name]
+
+        if not self.tasks:
+            return [], 0.0
+        duration, path = max((longest(name) for name in self.tasks), key=lambda x: x[0])
+        return path, duration
+
+    def get_report(self) -> Dict[str, Any]:
+        """Cold-start timing report"""
+        path, path_s = self._critical_path()
+        ends = [task.end_s for task in self.tasks.values() if task.end_s is not None]
+        boot_s = None
+        if PSUTIL_AVAILABLE and self._started_wall is not None:
+            boot_s = round(self._started_wall.timestamp() - psutil.Process().create_time(), 3)
+        return {
+            "started_at": self._started_wall.isoformat() if self._started_wall else None,
+            "complete": self._finished_at is not None,
+            "boot_s": boot_s,
+            "warmup_s": round(max(ends), 3) if ends else 0.0,
+            "sequential_s": round(sum(task.duration_s or 0.0 for task in self.tasks.values()), 3),
+            "critical_path": path,
+            "critical_path_s": round(path_s, 3),
+            "tasks": {
+                task.name: {
+                    "status": task.status,
+                    "depends_on": list(task.depends_on),
+                    "after": list(task.after),
+                    "provides": list(task.provides),
+                    "start_s": None if task.start_s is None else round(task.start_s, 3),
+                    "end_s": None if task.end_s is None else round(task.end_s, 3),
+                    "duration_s": None if task.duration_s is None else round(task.duration_s, 3),
+                    "error": task.error,
+                    "attempts": task.attempts,
+                }
+                for task in self.tasks.values()
+            },
+            "readiness": self.readiness(),
+            "lazy_imports_s": get_import_timings(),
+        }
+
+
+# Global startup orchestrator
+startup_orchestrator = StartupOrchestrator()
+
+
+def get_startup_orchestrator() -> StartupOrchestrator:
+    """Get the global startup orchestrator."""
+    return startup_orchestrator
+
+
+def require_capability(capability: str, orchestrator: Optional[StartupOrchestrator] = None):
+    """FastAPI dependency answering 503 + Retry-After until ``capability`` is ready
+
+    A disabled (or undeclared) capability is not gated: the route handles its absence itself.
+    """
+    from fastapi import HTTPException
+
+    async def dependency() -> None:
+        startup = orchestrator or get_startup_orchestrator()
+        status = startup.capability_status(capability)
+        if status in (READY, DISABLED, "unknown"):
+            return
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": f"{capability} is not available yet" if status == PENDING else f"{capability} is unavailable",
+                "capability": capability,
+                "status": status,
+            },
+            headers={"Retry-After": str(startup.config.retry_after_s)},
+        )
+
+    return dependency
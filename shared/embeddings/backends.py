@@ -0,0 +1,362 @@
+"""
+Embedding Backends for MAANG Standards
+
+Provides interchangeable CPU inference backends for sentence-transformers
+models and a startup micro-benchmark that picks between them:
+- torch-fp32: the model as loaded (the accuracy reference)
+- torch-int8: dynamic int8 quantization of the Linear layers
+- onnx-fp32 / onnx-int8: ONNX Runtime sessions over an exported graph,
+  optionally dynamically quantized; only when onnxruntime is installed
+
+Exported ONNX artifacts are cached on disk next to the model cache so the
+export cost is paid once per model. The selector encodes a fixed sample with
+every candidate and keeps the fastest backend whose cosine agreement with
+fp32 stays above a threshold on every sample.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from shared.core.lazy_imports import lazy_module, module_available
+
+# torch is only needed once a model is quantized or exported
+torch = lazy_module("torch")
+TORCH_AVAILABLE = module_available("torch")
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_BACKEND = "torch-fp32"
+
+BENCHMARK_TEXTS = [
+    "What is the capital of France?",
+    "Explain how transformers use self-attention to model long-range dependencies in text.",
+    "Vector databases index embeddings for approximate nearest neighbour search.",
+    "The quarterly report shows revenue growth of twelve percent year over year.",
+    "How do I configure connection pooling for PostgreSQL in a Python web service?",
+    "Photosynthesis converts light energy into chemical energy stored in glucose.",
+    "Compare the trade-offs between eventual and strong consistency in distributed systems.",
+    "Best hiking trails near Munich for a weekend trip",
+    "SarvanOM combines web search, vector retrieval and a knowledge graph to answer questions.",
+    "The mitochondria is the powerhouse of the cell.",
+    "Quantization reduces model size by storing weights with fewer bits.",
+    "Recipe for a quick vegetarian curry with chickpeas and spinach",
+    "Kubernetes schedules pods onto nodes based on resource requests and affinity rules.",
+    "Who wrote the novel One Hundred Years of Solitude?",
+    "Climate models project changes in precipitation patterns over the next century.",
+    "A short sentence.",
+]
+
+
+@dataclass
+class EmbeddingBackendConfig:
+    """Embedding backend selection configuration."""
+    backend: str = "auto"
+    candidates: List[str] = field(default_factory=lambda: ["torch-fp32", "torch-int8", "onnx-fp32", "onnx-int8"])
+    min_agreement: float = 0.99
+    benchmark_rounds: int = 3
+    batch_size: int = 16
+
+    @classmethod
+    def from_environment(cls) -> "EmbeddingBackendConfig":
+        """Load configuration from environment variables."""
+        candidates = os.getenv("EMBEDDING_BACKEND_CANDIDATES")
+        return cls(
+            backend=os.getenv("EMBEDDING_BACKEND", "auto"),
+            candidates=[c.strip() for c in candidates.split(",") if c.strip()] if candidates else cls().candidates,
+            min_agreement=float(os.getenv("EMBEDDING_BACKEND_MIN_AGREEMENT", "0.99")),
+            benchmark_rounds=int(os.getenv("EMBEDDING_BACKEND_BENCHMARK_ROUNDS", "3")),
+            batch_size=int(os.getenv("EMBEDDING_BACKEND_BATCH_SIZE", "16")),
+        )
+
+
+class EmbeddingBackend:
+    """
+    A loaded embedding model behind a SentenceTransformer-compatible encode().
+
+    Subclasses implement ``_embed`` for one tokenized-and-pooled batch.
+    """
+
+    name = "base"
+
+    def encode(
+        self,
+        sentences: Any,
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_numpy: bool = True,
+        **kwargs: Any
+    ) -> np.ndarray:
+        """Encode one text or a list of texts into float32 embeddings."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        batches = [self._embed(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        embeddings = np.vstack(batches).astype(np.float32, copy=False)
+        if normalize_embeddings:
+            embeddings = normalize(embeddings)
+        return embeddings[0] if single else embeddings
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class TorchBackend(EmbeddingBackend):
+    """A SentenceTransformer model run through PyTorch."""
+
+    def __init__(self, model: Any, name: str = REFERENCE_BACKEND):
+        self.model = model
+        self.name = name
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """An exported transformer run through ONNX Runtime, pooled like the source model."""
+
+    def __init__(self, session: Any, tokenizer: Any, pooling: str, max_length: int, name: str):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.pooling = pooling
+        self.max_length = max_length
+        self.name = name
+        self._inputs = {i.name for i in session.get_inputs()}
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+        )
+        feeds = {k: v.astype(np.int64) for k, v in encoded.items() if k in self._inputs}
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+        if self.pooling == "cls":
+            return hidden[:, 0]
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.clip(norms, 1e-12, None)
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity between two embedding matrices."""
+    return np.sum(normalize(reference) * normalize(candidate), axis=1)
+
+
+# Backend construction -------------------------------------------------------
+
+def quantize_torch_model(model: Any) -> TorchBackend:
+    """Dynamic int8 quantization of a SentenceTransformer's Linear layers (CPU only)."""
+    import copy
+    quantized = torch.quantization.quantize_dynamic(copy.deepcopy(model).cpu(), {torch.nn.Linear}, dtype=torch.qint8)
+    return TorchBackend(quantized, name="torch-int8")
+
+
+def _pooling_mode(model: Any) -> str:
+    for module in model:
+        if hasattr(module, "get_pooling_mode_str"):
+            mode = module.get_pooling_mode_str()
+            return "cls" if mode == "cls" else "mean"
+    return "mean"
+
+
+def export_onnx(model: Any, artifact_dir: Path) -> Path:
+    """Export a SentenceTransformer's transformer to ONNX, reusing a cached export."""
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    onnx_path = artifact_dir / "model.onnx"
+    meta_path = artifact_dir / "export.json"
+    if onnx_path.exists() and meta_path.exists():
+        return onnx_path
+
+    transformer = model[0]
+    auto_model = transformer.auto_model.cpu().eval()
+    dummy = transformer.tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    tmp_path = onnx_path.with_suffix(".onnx.tmp")
+    with torch.inference_mode():
+        torch.onnx.export(
+            auto_model,
+            tuple(dummy[name] for name in input_names),
+            str(tmp_path),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    os.replace(tmp_path, onnx_path)
+    transformer.tokenizer.save_pretrained(str(artifact_dir / "tokenizer"))
+    meta_path.write_text(json.dumps({
+        "pooling": _pooling_mode(model),
+        "max_length": transformer.max_seq_length,
+        "exported_at": time.time(),
+    }))
+    logger.info(f"Exported ONNX embedding model to: {onnx_path}")
+    return onnx_path
+
+
+def quantize_onnx(onnx_path: Path) -> Path:
+    """Dynamically quantize an exported ONNX model to int8, reusing a cached file."""
+    int8_path = onnx_path.with_name("model_int8.onnx")
+    if not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        tmp_path = int8_path.with_suffix(".onnx.tmp")
+        quantize_dynamic(str(onnx_path), str(tmp_path), weight_type=QuantType.QInt8)
+        os.replace(tmp_path, int8_path)
+        logger.info(f"Quantized ONNX embedding model to: {int8_path}")
+    return int8_path
+
+
+def load_onnx_backend(model: Any, artifact_dir: Path, quantized: bool) -> OnnxBackend:
+    """Build an ONNX Runtime backend from cached (or freshly exported) artifacts."""
+    from transformers import AutoTokenizer
+    onnx_path = export_onnx(model, artifact_dir)
+    if quantized:
+        onnx_path = quantize_onnx(onnx_path)
+    meta = json.loads((artifact_dir / "export.json").read_text())
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    session = onnxruntime.InferenceSession(str(onnx_path), options, providers=["CPUExecutionProvider"])
+    tokenizer = AutoTokenizer.from_pretrained(str(artifact_dir / "tokenizer"))
+    return OnnxBackend(
+        session, tokenizer, meta["pooling"], meta["max_length"], name="onnx-int8" if quantized else "onnx-fp32"
+    )
+
+
+def backend_factories(model: Any, artifact_dir: Path) -> Dict[str, Callable[[], EmbeddingBackend]]:
+    """Constructors for every backend this environment supports, keyed by name."""
+    factories: Dict[str, Callable[[], EmbeddingBackend]] = {REFERENCE_BACKEND: lambda: TorchBackend(model)}
+    if TORCH_AVAILABLE:
+        factories["torch-int8"] = lambda: quantize_torch_model(model)
+        if ONNXRUNTIME_AVAILABLE:
+            factories["onnx-fp32"] = lambda: load_onnx_backend(model, artifact_dir, quantized=False)
+            factories["onnx-int8"] = lambda: load_onnx_backend(model, artifact_dir, quantized=True)
+    return factories
+
+
+# Selection ------------------------------------------------------------------
+
+@dataclass
+class BackendBenchmark:
+    """Micro-benchmark result for one backend."""
+    name: str
+    texts_per_second: float = 0.0
+    mean_agreement: float = 0.0
+    min_agreement: float = 0.0
+    speedup: float = 0.0
+    eligible: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "texts_per_second": round(self.texts_per_second, 1),
+            "mean_agreement": round(self.mean_agreement, 5),
+            "min_agreement": round(self.min_agreement, 5),
+            "speedup": round(self.speedup, 2),
+            "eligible": self.eligible,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BackendSelection:
+    """The chosen backend plus every candidate's benchmark."""
+    backend: EmbeddingBackend
+    results: List[BackendBenchmark]
+
+    def report(self) -> Dict[str, Any]:
+        return {"selected": self.backend.name, "backends": [r.to_dict() for r in self.results]}
+
+
+def _throughput(backend: EmbeddingBackend, texts: List[str], rounds: int, batch_size: int) -> float:
+    backend.encode(texts[:batch_size], batch_size=batch_size)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        backend.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+    return len(texts) * rounds / elapsed if elapsed > 0 else float("inf")
+
+
+def select_backend(
+    factories: Dict[str, Callable[[], EmbeddingBackend]],
+    config: Optional[EmbeddingBackendConfig] = None,
+    texts: Optional[List[str]] = None
+) -> BackendSelection:
+    """
+    Benchmark candidate backends and pick the fastest accurate one.
+
+    Args:
+        factories: Backend constructors by name; must include torch-fp32
+        config: Candidates, agreement threshold and benchmark size
+        texts: Sample texts (default BENCHMARK_TEXTS)
+
+    Returns:
+        The selected backend and per-backend throughput and agreement.
+        A fixed ``config.backend`` skips the benchmark.
+    """
+    config = config or EmbeddingBackendConfig.from_environment()
+    texts = texts or BENCHMARK_TEXTS
+    reference = factories[REFERENCE_BACKEND]()
+
+    if config.backend != "auto":
+        if config.backend in factories:
+            try:
+                return BackendSelection(factories[config.backend](), [BackendBenchmark(config.backend, eligible=True)])
+            except Exception as e:
+                logger.warning(f"Embedding backend {config.backend} failed to load, using {REFERENCE_BACKEND}: {e}")
+        else:
+            logger.warning(f"Embedding backend {config.backend} unavailable, using {REFERENCE_BACKEND}")
+        return BackendSelection(reference, [BackendBenchmark(REFERENCE_BACKEND, eligible=True)])
+
+    expected = reference.encode(texts, batch_size=config.batch_size)
+    baseline = BackendBenchmark(REFERENCE_BACKEND, mean_agreement=1.0, min_agreement=1.0, speedup=1.0, eligible=True)
+    baseline.texts_per_second = _throughput(reference, texts, config.benchmark_rounds, config.batch_size)
+    results = [baseline]
+    backends = {REFERENCE_BACKEND: reference}
+
+    for name in config.candidates:
+        if name == REFERENCE_BACKEND or name not in factories:
+            continue
+        result = BackendBenchmark(name)
+        results.append(result)
+        try:
+            backend = factories[name]()
+            agreement = cosine_agreement(expected, backend.encode(texts, batch_size=config.batch_size))
+            result.mean_agreement = float(agreement.mean())
+            result.min_agreement = float(agreement.min())
+            result.texts_per_second = _throughput(backend, texts, config.benchmark_rounds, config.batch_size)
+            result.speedup = result.texts_per_second / baseline.texts_per_second
+            result.eligible = result.min_agreement >= config.min_agreement
+            if result.eligible:
+                backends[name] = backend
+        except Exception as e:
+            result.error = str(e)
+            logger.warning(f"Embedding backend {name} failed benchmark: {e}")
+
+    best = max((r for r in results if r.eligible), key=lambda r: r.texts_per_second)
+    selection = BackendSelection(backends[best.name], results)
+    for r in results:
+        logger.info(
+            f"Embedding backend {r.name}: {r.texts_per_second:.1f} texts/s ({r.speedup:.2f}x), "
+            f"min cosine {r.min_agreement:.4f}" + (f", error: {r.error}" if r.error else "")
+        )
+    logger.info(f"Selected embedding backend: {best.name}")
+    return selection
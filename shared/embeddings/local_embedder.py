@@ -2,9 +2,13 @@ from __future__ import annotations
 
 import logging
 import hashlib
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 
-from sentence_transformers import SentenceTransformer
+from shared.embeddings.shared_weights import get_shared_sentence_transformer
+
+if TYPE_CHECKING:
+    # Only for annotations; the model itself loads in get_embedder()
+    from sentence_transformers import SentenceTransformer
 
 
 logger = logging.getLogger(__name__)
@@ -30,7 +34,8 @@ def get_embedder(
     global _model
     if _model is None:
         logger.info(f"Loading local embedding model: {model_name}")
-        _model = SentenceTransformer(model_name)
+        # Weights are memory-mapped from the shared store, one copy per host
+        _model = get_shared_sentence_transformer(model_name)
         # Preload the model with a dummy inference to warm up
         logger.info("Preloading model with dummy inference for faster subsequent calls")
         try:
@@ -2,7 +2,9 @@
 Model Caching Implementation for MAANG Standards
 
 Provides intelligent model caching to reduce cold start times
-and improve system performance.
+and improve system performance. Sentence-transformer models loaded for
+CPU are served by the fastest accurate backend (fp32, int8 or ONNX
+Runtime) picked by a startup micro-benchmark.
 """
 
 import os
@@ -14,17 +16,18 @@ from dataclasses import dataclass
 import threading
 import asyncio
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from shared.core.lazy_imports import lazy_module, module_available
 
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# Heavy model libraries are imported on first model load, not at import time
+sentence_transformers = lazy_module("sentence_transformers")
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+TORCH_AVAILABLE = module_available("torch")
+
+from shared.embeddings.backends import (
+    EmbeddingBackendConfig,
+    backend_factories,
+    select_backend,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +56,8 @@ class ModelCache:
         cache_dir: str = "./models_cache",
         max_cache_size: int = 3,
         max_memory_mb: int = 2048,
-        warmup_enabled: bool = True
+        warmup_enabled: bool = True,
+        backend_config: Optional[EmbeddingBackendConfig] = None
     ):
         """
         Initialize model cache.
@@ -63,6 +67,7 @@ class ModelCache:
             max_cache_size: Maximum number of models to cache
             max_memory_mb: Maximum memory usage in MB
             warmup_enabled: Enable automatic model warmup
+            backend_config: Embedding backend selection settings
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
@@ -70,6 +75,8 @@ class ModelCache:
         self.max_cache_size = max_cache_size
         self.max_memory_mb = max_memory_mb
         self.warmup_enabled = warmup_enabled
+        self.backend_config = backend_config or EmbeddingBackendConfig.from_environment()
+        self._backend_reports: Dict[str, Dict[str, Any]] = {}
         
         self._cache: Dict[str, ModelCacheEntry] = {}
         self._lock = threading.RLock()
@@ -164,7 +171,18 @@ class ModelCache:
                 return None
     
     def _load_sentence_transformer(self, model_name: str, device: str) -> Any:
-        """Load sentence transformer model."""
+        """Load sentence transformer model, on CPU behind the fastest accurate backend."""
+        model = self._load_sentence_transformer_fp32(model_name)
+        if device != "cpu":
+            return model
+        
+        artifact_dir = self.cache_dir / "backends" / model_name.replace("/", "_")
+        selection = select_backend(backend_factories(model, artifact_dir), self.backend_config)
+        self._backend_reports[model_name] = selection.report()
+        return selection.backend
+    
+    def _load_sentence_transformer_fp32(self, model_name: str) -> Any:
+        """Load full-precision sentence transformer model."""
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError("sentence-transformers not available")
         
@@ -172,11 +190,11 @@ class ModelCache:
         local_path = self.cache_dir / model_name.replace("/", "_")
         if local_path.exists():
             logger.info(f"Loading cached model from: {local_path}")
-            return SentenceTransformer(str(local_path))
+            return sentence_transformers.SentenceTransformer(str(local_path))
         else:
             # Download and cache model
             logger.info(f"Downloading model: {model_name}")
-            model = SentenceTransformer(model_name)
+            model = sentence_transformers.SentenceTransformer(model_name)
             
             # Save to local cache
             try:
@@ -297,6 +315,7 @@ class ModelCache:
                 "total_memory_mb": total_memory,
                 "max_memory_mb": self.max_memory_mb,
                 "total_accesses": total_accesses,
+                "embedding_backends": dict(self._backend_reports),
                 "models": [
                     {
                         "name": entry.model_name,
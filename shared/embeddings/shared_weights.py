@@ -0,0 +1,178 @@
+"""
+Shared Memory-Mapped Model Weights for MAANG Standards
+
+Loads sentence-transformers models so every worker process on a host maps
+one physical copy of the weights instead of holding a private copy each:
+- The first process to need a model exports its state dict once into a
+  shared weight store, under an exclusive file lock, and publishes it with
+  an atomic ready marker
+- Every process then builds the model from the store's local config (no
+  hub round trip) and swaps each parameter for a tensor memory-mapped from
+  the exported file (``torch.load(mmap=True)`` plus
+  ``load_state_dict(assign=True)``); inference never writes weights, so the
+  copy-on-write pages stay shared in the page cache
+- Within a process, callers asking for the same model (local embedder,
+  vector singleton, citations) share a single instance
+
+Falls back to a plain private load if anything in that path fails.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS_FILE = "weights.pt"
+READY_FILE = "READY"
+
+
+@dataclass
+class SharedWeightsConfig:
+    """Shared weight store configuration."""
+    enabled: bool = True
+    store_dir: str = "./models_cache/shared"
+
+    @classmethod
+    def from_environment(cls) -> "SharedWeightsConfig":
+        """Load configuration from environment variables."""
+        return cls(
+            enabled=os.getenv("EMBEDDING_SHARED_WEIGHTS", "true").lower() == "true",
+            store_dir=os.getenv("EMBEDDING_SHARED_WEIGHTS_DIR", "./models_cache/shared"),
+        )
+
+
+def canonical_model_name(model_name: str) -> str:
+    """Map short sentence-transformers names ("all-MiniLM-L6-v2") to their hub id."""
+    if "/" in model_name or os.path.isdir(model_name):
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+class SharedWeightStore:
+    """On-disk store of exported model directories, published once per host."""
+
+    def __init__(self, store_dir: str):
+        self.root = Path(store_dir)
+
+    def model_dir(self, model_name: str) -> Path:
+        return self.root / model_name.replace("/", "_")
+
+    def is_ready(self, model_name: str) -> bool:
+        return (self.model_dir(model_name) / READY_FILE).exists()
+
+    @contextmanager
+    def _locked(self, model_name: str) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f"{model_name.replace('/', '_')}.lock", "w") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def ensure(self, model_name: str, export: Callable[[Path], None]) -> Path:
+        """
+        Return the model's store directory, exporting it first if needed.
+
+        Concurrent callers across processes block on a file lock so exactly
+        one of them runs ``export(directory)``; the others find it ready.
+        """
+        directory = self.model_dir(model_name)
+        if self.is_ready(model_name):
+            return directory
+        with self._locked(model_name):
+            if not self.is_ready(model_name):
+                directory.mkdir(parents=True, exist_ok=True)
+                export(directory)
+                ready = directory / f"{READY_FILE}.tmp"
+                ready.write_text(str(time.time()))
+                os.replace(ready, directory / READY_FILE)
+                logger.info(f"Published shared weights for {model_name} to: {directory}")
+        return directory
+
+
+def _export_sentence_transformer(model_name: str) -> Callable[[Path], None]:
+    def export(directory: Path) -> None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device="cpu")
+        model.save(str(directory / "model"))
+        state = {k: v.detach().contiguous() for k, v in model.state_dict().items()}
+        tmp = directory / f"{WEIGHTS_FILE}.tmp"
+        torch.save(state, str(tmp))
+        os.replace(tmp, directory / WEIGHTS_FILE)
+    return export
+
+
+def _load_mapped(directory: Path) -> Any:
+    import torch
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer(str(directory / "model"), device="cpu")
+    state = torch.load(str(directory / WEIGHTS_FILE), mmap=True, weights_only=True, map_location="cpu")
+    # assign=True keeps the mapped tensors instead of copying into private ones;
+    # the private copy made while constructing the model is freed here
+    model.load_state_dict(state, assign=True)
+    model.eval()
+    return model
+
+
+# Process-wide model instances
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+
+def get_shared_sentence_transformer(
+    model_name: str,
+    device: str = "cpu",
+    config: Optional[SharedWeightsConfig] = None
+) -> Any:
+    """
+    Get a SentenceTransformer whose weights are shared across processes.
+
+    Args:
+        model_name: Hub id or short sentence-transformers name
+        device: Target device; only CPU models are memory-mapped
+        config: Store settings (default from environment)
+
+    Returns:
+        One instance per (model, device) in this process
+    """
+    model_name = canonical_model_name(model_name)
+    key = f"{model_name}_{device}"
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        if key in _models:
+            return _models[key]
+        config = config or SharedWeightsConfig.from_environment()
+        start_time = time.time()
+        model = None
+        if config.enabled and device == "cpu":
+            try:
+                store = SharedWeightStore(config.store_dir)
+                model = _load_mapped(store.ensure(model_name, _export_sentence_transformer(model_name)))
+                logger.info(f"Loaded {model_name} with shared weights in {time.time() - start_time:.2f}s")
+            except Exception as e:
+                logger.warning(f"Shared weight load failed for {model_name}, loading a private copy: {e}")
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name, device=device)
+            logger.info(f"Loaded {model_name} in {time.time() - start_time:.2f}s")
+        _models[key] = model
+        return model
@@ -1,11 +1,14 @@
 """
 Session Memory Model - Universal Knowledge Platform
-PostgreSQL-based session memory storage using JSONB fields.
+PostgreSQL-based session memory storage.
 
-This module defines the database model for storing session memory
-using PostgreSQL JSONB fields for efficient querying and storage.
+This module defines the database models for storing session memory:
+SessionInteraction stores one row per query/answer turn, indexed by
+(session_id, ts), and is what MemoryManagerPostgres reads and writes.
+SessionMemory is the earlier one-row-per-session JSONB layout.
 
 Features:
+- Row-per-interaction storage with a (session_id, ts) index
 - JSONB storage for flexible session data
 - Automatic timestamp management
 - Indexed queries for performance
@@ -22,7 +25,7 @@ import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Any, Optional
 
-from sqlalchemy import Column, String, DateTime, Index, text
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.ext.declarative import declarative_base
 
@@ -33,6 +36,65 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class SessionInteraction(Base):
+    """
+    One query/answer interaction of a session.
+
+    Recent-N context is a LIMIT query on (session_id, ts); expiry is a bulk
+    DELETE on ts.
+    """
+
+    __tablename__ = "session_interactions"
+    __table_args__ = (
+        Index("idx_session_interactions_session_ts", "session_id", "ts"),
+        Index("idx_session_interactions_ts", "ts"),
+        {"comment": "Session memory, one row per interaction"},
+    )
+
+    id = Column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    session_id = Column(
+        String(255),
+        nullable=False,
+        comment="Session identifier",
+    )
+
+    ts = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        comment="Interaction timestamp",
+    )
+
+    query = Column(Text, nullable=False, comment="User query")
+
+    answer = Column(Text, nullable=False, comment="System response")
+
+    # Narrow rows: the audit/soft-delete columns of the base model don't apply
+    created_at = None
+    updated_at = None
+    deleted_at = None
+    status = None
+    version = None
+    metadata_json = None
+
+    def __repr__(self) -> str:
+        """String representation of the interaction."""
+        return f"<SessionInteraction(session_id='{self.session_id}', ts='{self.ts}')>"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the interaction to the context dictionary format."""
+        return {
+            "query": self.query,
+            "answer": self.answer,
+            "timestamp": self.ts.isoformat() if self.ts else None,
+        }
+
+
 class SessionMemory(Base):
     """
     Session memory storage using PostgreSQL JSONB.
@@ -385,6 +385,24 @@ def mock_error_scenarios():
     }
 
 
+@pytest.fixture
+def open_fulltext_index(tmp_path):
+    """Open FullTextIndex instances (by default in tmp_path, merging inline) and close them after the test."""
+    from shared.core.fulltext import FullTextConfig, FullTextIndex
+
+    indexes = []
+
+    def open_index(config=None):
+        config = config or FullTextConfig(index_dir=str(tmp_path), flush_docs=1000, background_merge=False)
+        indexes.append(FullTextIndex(config))
+        return indexes[-1]
+
+    yield open_index
+    for index in indexes:
+        if not index._closed:
+            index.close()
+
+
 # Utility functions for testing
 def create_mock_response(status_code: int = 200, data: Any = None, headers: Dict = None):
     """Create a mock HTTP response."""
@@ -0,0 +1,189 @@
+"""
+Test Adaptive Concurrency Limiting
+Tests AIMD limit adaptation, priority queueing and load shedding
+"""
+
+import pytest
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from shared.core.sla_budget_enforcer import ComplexityTier
+from services.gateway.resilience.adaptive_concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyLimiter,
+    AdaptiveConcurrencyManager,
+    AdaptiveConcurrencyMiddleware,
+    LoadShedError,
+    RequestPriority,
+)
+
+
+def make_limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    config = dict(
+        complexity_tier=ComplexityTier.SIMPLE,
+        initial_limit=2,
+        min_limit=1,
+        max_limit=10,
+        max_queue_size=2,
+        max_queue_wait=0.2,
+        name="test",
+    )
+    config.update(overrides)
+    return AdaptiveConcurrencyLimiter(AdaptiveConcurrencyConfig(**config))
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test the AIMD limiter"""
+
+    def test_latency_target_from_sla_budget(self):
+        limiter = make_limiter()
+        assert limiter.latency_target == pytest.approx(5.0 + 0.1)
+
+        stream_limiter = make_limiter(complexity_tier=ComplexityTier.TECHNICAL, use_ttfb_budget=True)
+        assert stream_limiter.latency_target == pytest.approx(1.2 + 0.1)
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_when_within_budget(self):
+        limiter = make_limiter()
+        for _ in range(20):
+            await limiter.acquire()
+            await limiter.acquire()
+            limiter.release(0.1)
+            limiter.release(0.1)
+        assert limiter.limit > 2
+        assert limiter.limit_increases > 0
+
+    @pytest.mark.asyncio
+    async def test_limit_backs_off_when_budget_overrun(self):
+        limiter = make_limiter(initial_limit=8)
+        await limiter.acquire()
+        limiter.release(limiter.latency_target * 2)
+        assert limiter.limit == 6
+        assert limiter.limit_decreases == 1
+
+        # Only one decrease per latency-target window
+        await limiter.acquire()
+        limiter.release(limiter.latency_target * 2, success=False)
+        assert limiter.limit == 6
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_sheds(self):
+        limiter = make_limiter(initial_limit=1)
+        await limiter.acquire()
+        with pytest.raises(LoadShedError) as exc_info:
+            await limiter.acquire()
+        assert exc_info.value.reason == "queue_timeout"
+        assert exc_info.value.retry_after >= 1
+
+    @pytest.mark.asyncio
+    async def test_queued_request_admitted_on_release(self):
+        limiter = make_limiter(initial_limit=1, max_queue_wait=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+
+        limiter.release(0.1)
+        await waiter
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_lowest_priority_shed_first(self):
+        limiter = make_limiter(initial_limit=1, max_queue_size=1, max_queue_wait=1.0)
+        await limiter.acquire()
+
+        low = asyncio.create_task(limiter.acquire(RequestPriority.LOW))
+        await asyncio.sleep(0)
+        high = asyncio.create_task(limiter.acquire(RequestPriority.HIGH))
+        await asyncio.sleep(0)
+
+        with pytest.raises(LoadShedError) as exc_info:
+            await low
+        assert exc_info.value.reason == "evicted"
+
+        # A lower priority request cannot displace the queued high priority one
+        with pytest.raises(LoadShedError) as exc_info:
+            await limiter.acquire(RequestPriority.NORMAL)
+        assert exc_info.value.reason == "queue_full"
+
+        limiter.release(0.1)
+        await high
+        assert limiter.get_status()["shed_total"] == {"queue_full": 1, "queue_timeout": 0, "evicted": 1}
+
+
+class TestAdaptiveConcurrencyMiddleware:
+    """Test shedding through the middleware"""
+
+    def test_overload_returns_503_with_retry_after(self):
+        manager = AdaptiveConcurrencyManager()
+        limiter = manager.register("GET", "/search", AdaptiveConcurrencyConfig(
+            initial_limit=1, min_limit=1, max_queue_size=0, name="search"))
+
+        app = FastAPI()
+        app.add_middleware(AdaptiveConcurrencyMiddleware, manager=manager)
+
+        @app.get("/search")
+        async def search():
+            return {"status": "ok"}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "ok"}
+
+        client = TestClient(app)
+        assert client.get("/search").status_code == 200
+        assert limiter.in_flight == 0
+
+        # Occupy the only slot so the next request is shed
+        limiter._in_flight = limiter.limit
+        response = client.get("/search")
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.json()["reason"] == "queue_full"
+
+        # Unprotected endpoints are untouched
+        assert client.get("/health").status_code == 200
+
+    def test_priority_header_needs_token_to_raise_priority(self):
+        manager = AdaptiveConcurrencyManager()
+        limiter = manager.register("GET", "/search", AdaptiveConcurrencyConfig(name="search"))
+        middleware = AdaptiveConcurrencyMiddleware(FastAPI(), manager=manager, priority_token="internal")
+
+        def priority(headers):
+            scope = {"type": "http", "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()]}
+            return middleware._get_priority(Request(scope), limiter)
+
+        assert priority({"X-Request-Priority": "high"}) == RequestPriority.NORMAL
+        assert priority({"X-Request-Priority": "high", "X-Priority-Token": "wrong"}) == RequestPriority.NORMAL
+        assert priority({"X-Request-Priority": "high", "X-Priority-Token": "internal"}) == RequestPriority.HIGH
+        # Lowering your own priority needs no token
+        assert priority({"X-Request-Priority": "low"}) == RequestPriority.LOW
+
+    @pytest.mark.asyncio
+    async def test_stream_slot_released_when_client_disconnects_early(self):
+        manager = AdaptiveConcurrencyManager()
+        limiter = manager.register("GET", "/stream", AdaptiveConcurrencyConfig(name="stream"))
+
+        async def body():
+            yield b"data: 1\n\n"
+
+        app = FastAPI()
+        app.add_middleware(AdaptiveConcurrencyMiddleware, manager=manager)
+
+        @app.get("/stream")
+        async def stream():
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        scope = {"type": "http", "method": "GET", "path": "/stream", "headers": [], "query_string": b""}
+        with pytest.raises(Exception):
+            await app(scope, receive, send)
+        assert limiter.in_flight == 0
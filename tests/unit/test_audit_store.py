@@ -0,0 +1,111 @@
+"""
+Test Audit Trail Storage
+Tests the bounded trail ring and its user/time-bucket indexes, retention
+expiry, and the batched JSON-lines event writer behind AuditService
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+from shared.core.services.audit_service import AuditService, AuditTrail
+from shared.core.services.audit_store import AuditStoreConfig, AuditTrailStore
+
+BASE = datetime(2025, 10, 7, 12, 0, tzinfo=timezone.utc)
+
+
+def trail(i, user=None, minutes=0):
+    return AuditTrail(
+        trace_id=f"t{i}", request_id=f"r{i}", user_id=user, session_id=None,
+        start_time=BASE + timedelta(minutes=minutes),
+    )
+
+
+def fill(store, count, users=("alice", "bob", "carol")):
+    for i in range(count):
+        store.add(trail(i, users[i % len(users)], minutes=i))
+
+
+class TestTrailStore:
+    """Test the ring buffer and its indexes"""
+
+    def test_queries_newest_first_by_index(self):
+        store = AuditTrailStore(max_trails=100, bucket_seconds=300)
+        fill(store, 30)
+        assert [t.trace_id for t in store.query(limit=3)] == ["t29", "t28", "t27"]
+        assert [t.trace_id for t in store.query(user_id="bob", limit=3)] == ["t28", "t25", "t22"]
+        window = store.query(start_time=BASE + timedelta(minutes=10), end_time=BASE + timedelta(minutes=13))
+        assert [t.trace_id for t in window] == ["t13", "t12", "t11", "t10"]
+        both = store.query(user_id="alice", start_time=BASE + timedelta(minutes=20))
+        assert [t.trace_id for t in both] == ["t27", "t24", "t21"]
+        assert [t.trace_id for t in store.query(limit=2, offset=2)] == ["t27", "t26"]
+
+    def test_eviction_keeps_indexes_consistent(self):
+        store = AuditTrailStore(max_trails=10, bucket_seconds=120)
+        fill(store, 25)
+        assert len(store) == 10 and store.evicted == 15
+        assert store.get("t14") is None and store.get("t15").trace_id == "t15"
+        assert [t.trace_id for t in store.query(user_id="alice")] == ["t24", "t21", "t18", "t15"]
+        assert store.query(end_time=BASE + timedelta(minutes=14)) == []
+        stats = store.get_stats()
+        assert stats["time_buckets"] == 6 and stats["users_indexed"] == 3
+
+    def test_out_of_order_start_times_are_found(self):
+        store = AuditTrailStore(max_trails=100, bucket_seconds=60)
+        fill(store, 10)
+        # A late trail that started before everything else, and one in the middle
+        store.add(trail(10, "alice", minutes=-30))
+        store.add(trail(11, "bob", minutes=4))
+        assert [t.trace_id for t in store.query(user_id="alice", start_time=BASE - timedelta(minutes=40))] == ["t10", "t9", "t6", "t3", "t0"]
+        window = store.query(start_time=BASE + timedelta(minutes=3), end_time=BASE + timedelta(minutes=4))
+        assert [t.trace_id for t in window] == ["t11", "t4", "t3"]
+        assert [t.trace_id for t in store.query(end_time=BASE - timedelta(minutes=1))] == ["t10"]
+
+    def test_count_ignores_pagination(self):
+        store = AuditTrailStore(max_trails=100, bucket_seconds=300)
+        fill(store, 30)
+        assert store.count() == 30 and store.count(user_id="bob") == 10
+        assert store.count(user_id="alice", start_time=BASE + timedelta(minutes=20)) == 3
+        assert store.count(start_time=BASE + timedelta(minutes=10), end_time=BASE + timedelta(minutes=13)) == 4
+
+    def test_expire_is_start_time_ordered(self):
+        store = AuditTrailStore(max_trails=100)
+        fill(store, 20)
+        assert store.expire(BASE + timedelta(minutes=5)) == 5
+        assert store.query(limit=100)[-1].trace_id == "t5"
+
+
+class TestAuditService:
+    """Test event persistence through AuditService"""
+
+    def test_events_are_batched_to_jsonl(self, tmp_path):
+        config = AuditStoreConfig(log_dir=str(tmp_path), flush_interval_s=60, flush_batch_size=1000)
+
+        async def scenario():
+            service = AuditService(config)
+            await service.initialize()
+            for i in range(5):
+                service.start_audit_trail(f"trace{i}", f"req{i}", user_id="u1")
+                service.log_service_call(f"trace{i}", "retrieval", "search")
+                service.end_audit_trail(f"trace{i}", 200)
+            pending = service.get_stats()["writer"]["pending"]
+            await service.close()
+            return service, pending
+
+        service, pending = asyncio.run(scenario())
+        assert pending == 15
+        (log_file,) = tmp_path.glob("audit-*.jsonl")
+        records = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert len(records) == 15
+        assert {r["event_type"] for r in records} == {"request_start", "service_call", "request_end"}
+        assert service.get_stats()["writer"]["flushes"] == 1
+        trails = service.get_audit_trails(user_id="u1", service_name="retrieval", limit=2)
+        assert [t.trace_id for t in trails] == ["trace4", "trace3"]
+
+    def test_prune_files_past_retention(self, tmp_path):
+        service = AuditService(AuditStoreConfig(log_dir=str(tmp_path), retention_days=30))
+        (tmp_path / "audit-20200101.jsonl").write_text("{}\n")
+        today = datetime.now(timezone.utc).strftime("%Y%m%d")
+        (tmp_path / f"audit-{today}.jsonl").write_text("{}\n")
+        assert service.writer.prune_files() == 1
+        assert [p.name for p in tmp_path.glob("*.jsonl")] == [f"audit-{today}.jsonl"]
@@ -0,0 +1,136 @@
+"""
+Test Micro-Benchmark Harness
+Tests timing, unavailable benchmarks, baseline comparison and re-measuring
+apparent regressions, plus the synthetic corpora
+"""
+
+import sys
+
+import pytest
+
+from benchmarks import corpora
+from benchmarks.harness import (
+    BENCHMARKS, benchmark, compare, measure, median_run, remeasure, run_suite, select, stub_modules,
+)
+
+
+@pytest.fixture
+def registry():
+    """Register throwaway benchmarks and remove them afterwards"""
+    before = set(BENCHMARKS)
+    yield
+    for name in set(BENCHMARKS) - before:
+        del BENCHMARKS[name]
+
+
+def results(**timings):
+    return {"results": {key.replace("_", ".") + "[10]": {"min_s": value} for key, value in timings.items()}}
+
+
+class TestHarness:
+    """Test running benchmarks"""
+
+    def test_measure_auto_sizes_loops(self):
+        calls = []
+        timing = measure(lambda: calls.append(1), rounds=3, min_round_s=0.001)
+        assert timing["loops"] > 1 and timing["rounds"] == 3
+        assert 0 < timing["min_s"] <= timing["median_s"]
+        assert len(calls) >= timing["loops"] * 3
+
+    def test_run_suite_sizes_and_unavailable(self, registry):
+        @benchmark("test.sum", sizes=(10, 100))
+        def bench_sum(size):
+            data = list(range(size))
+            return lambda: sum(data)
+
+        @benchmark("test.broken", sizes=(10,))
+        def bench_broken(size):
+            import module_that_does_not_exist  # noqa: F401
+
+        run = run_suite(select(["test.*"]), sizes=[10], rounds=2, min_round_s=0.001)
+        assert set(run["results"]) == {"test.sum[10]"}
+        assert run["unavailable"]["test.broken"].startswith("ModuleNotFoundError")
+        assert run["environment"]["python"]
+
+        with pytest.raises(ValueError):
+            benchmark("test.sum", sizes=(1,))(bench_sum)
+
+
+class TestCompare:
+    """Test the regression gate"""
+
+    def test_statuses_and_threshold_overrides(self):
+        baseline = results(a_fast=1.0, b_slow=1.0, c_noisy=1.0, d_gone=1.0)
+        current = results(a_fast=0.5, b_slow=1.3, c_noisy=1.3, e_new=1.0)
+        rows = {row["benchmark"]: row for row in compare(baseline, current, 20, {"c.noisy": 50})}
+        assert rows["a.fast[10]"]["status"] == "improved" and rows["a.fast[10]"]["change_pct"] == -50.0
+        assert rows["b.slow[10]"]["status"] == "regressed"
+        assert rows["c.noisy[10]"]["status"] == "ok" and rows["c.noisy[10]"]["threshold_pct"] == 50
+        assert rows["d.gone[10]"]["status"] == "missing"
+        assert rows["e.new[10]"]["status"] == "new"
+
+    def test_calibrated_timings_compare_across_hosts(self):
+        timing = measure(lambda: sum(range(100)), rounds=3, min_round_s=0.001, calibrated=True)
+        assert timing["relative"] == pytest.approx(timing["min_s"] / timing["calibration_s"])
+        # The current host is twice as slow in absolute terms but not relative to its calibration loop
+        baseline = {
+            "environment": {"machine": "x86_64"},
+            "results": {"a[10]": {"min_s": 1.0, "relative": 4.0}, "b[10]": {"min_s": 1.0}},
+        }
+        current = {
+            "environment": {"machine": "arm64"},
+            "results": {"a[10]": {"min_s": 2.0, "relative": 4.2}, "b[10]": {"min_s": 2.0, "relative": 8.0}},
+        }
+        rows = {row["benchmark"]: row for row in compare(baseline, current, 20)}
+        assert rows["a[10]"]["status"] == "ok" and rows["a[10]"]["relative"] and rows["a[10]"]["change_pct"] == 5.0
+        assert rows["b[10]"]["status"] == "regressed" and not rows["b[10]"]["relative"]
+
+    def test_same_environment_compares_absolute_minimum(self):
+        environment = {"machine": "x86_64", "cpu_count": 1}
+        baseline = {"environment": environment, "results": {"a[10]": {"min_s": 1.0, "relative": 4.0}}}
+        current = {"environment": environment, "results": {"a[10]": {"min_s": 1.03, "relative": 5.4}}}
+        row = compare(baseline, current, 20)[0]
+        assert row["status"] == "ok" and not row["relative"] and row["change_pct"] == 3.0
+
+    def test_median_run_keeps_middle_measurement(self):
+        runs = [results(a_fast=3.0, b_slow=1.0), results(a_fast=1.0), results(a_fast=2.0, b_slow=5.0)]
+        runs[1]["unavailable"] = {"b.slow": "ImportError: gone"}
+        combined = median_run(runs)
+        assert combined["results"]["a.fast[10]"]["min_s"] == 2.0
+        assert combined["results"]["b.slow[10]"]["min_s"] == 1.0
+        assert combined["unavailable"] == {"b.slow": "ImportError: gone"}
+
+    def test_stub_modules_only_replaces_failing_imports(self):
+        with stub_modules({"json": {"loads": None}, "module_that_does_not_exist": {"answer": 42}}):
+            import module_that_does_not_exist
+            assert module_that_does_not_exist.answer == 42
+            assert sys.modules["json"].loads is not None
+        assert "module_that_does_not_exist" not in sys.modules
+
+    def test_remeasure_keeps_best_time(self, registry):
+        @benchmark("test.sleepless", sizes=(10,))
+        def bench(size):
+            return lambda: None
+
+        run = {"results": {"test.sleepless[10]": {"min_s": 10.0}}}
+        remeasure(run, ["test.sleepless[10]"], rounds=2, min_round_s=0.001)
+        assert run["results"]["test.sleepless[10]"]["min_s"] < 10.0
+        assert run["results"]["test.sleepless[10]"]["attempts"] == 2
+
+        # A better calibration-relative time is kept even when the per-call minimum is not
+        run = {"results": {"test.sleepless[10]": {"min_s": 0.0, "relative": 1e9}}}
+        remeasure(run, ["test.sleepless[10]"], rounds=2, min_round_s=0.001)
+        assert run["results"]["test.sleepless[10]"]["min_s"] == 0.0
+        assert run["results"]["test.sleepless[10]"]["relative"] < 1e9
+
+
+class TestCorpora:
+    """Test synthetic inputs"""
+
+    def test_deterministic_with_duplicates(self):
+        first, second = corpora.search_results(200), corpora.search_results(200)
+        assert first == second and len(first) == 200
+        assert len({r["domain"] + r["title"].lower() for r in first}) < 200
+        assert len(corpora.lane_rankings(50, lanes=3)) == 3
+        assert len(corpora.vectors(5, dim=8)[0]) == 8
+        assert corpora.answer_text(20).count(" ") > 100
@@ -0,0 +1,113 @@
+"""
+Test Embedding Backend Selection
+Tests the encode() contract, cosine agreement and the startup selector with
+numpy backends standing in for fp32, quantized and ONNX models
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from shared.embeddings.backends import (
+    EmbeddingBackend,
+    EmbeddingBackendConfig,
+    cosine_agreement,
+    select_backend,
+)
+
+
+class FakeBackend(EmbeddingBackend):
+    """Deterministic per-text vectors with optional noise and per-call delay."""
+
+    def __init__(self, name, noise=0.0, delay=0.0):
+        self.name = name
+        self.noise = noise
+        self.delay = delay
+
+    def _embed(self, texts):
+        time.sleep(self.delay)
+        vectors = []
+        for text in texts:
+            rng = np.random.default_rng(sum(map(ord, text)))
+            vector = rng.normal(size=32)
+            if self.noise:
+                vector = vector + np.random.default_rng(len(text)).normal(scale=self.noise, size=32)
+            vectors.append(vector)
+        return np.array(vectors)
+
+
+def config(**overrides):
+    base = EmbeddingBackendConfig(candidates=["torch-fp32", "torch-int8", "onnx-fp32"], benchmark_rounds=1, batch_size=8)
+    for key, value in overrides.items():
+        setattr(base, key, value)
+    return base
+
+
+class TestEncode:
+    """Test the SentenceTransformer-compatible encode()"""
+
+    def test_batches_and_normalizes(self):
+        backend = FakeBackend("torch-fp32")
+        embeddings = backend.encode([f"text {i}" for i in range(5)], batch_size=2, normalize_embeddings=True)
+        assert embeddings.shape == (5, 32)
+        assert embeddings.dtype == np.float32
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1.0, atol=1e-5)
+
+    def test_single_text(self):
+        assert FakeBackend("torch-fp32").encode("one").shape == (32,)
+
+    def test_cosine_agreement(self):
+        a = np.array([[1.0, 0.0], [0.0, 2.0]])
+        assert np.allclose(cosine_agreement(a, np.array([[3.0, 0.0], [2.0, 0.0]])), [1.0, 0.0])
+
+
+class TestSelection:
+    """Test the startup benchmark selector"""
+
+    def test_picks_fastest_accurate_backend(self):
+        factories = {
+            "torch-fp32": lambda: FakeBackend("torch-fp32", delay=0.004),
+            "torch-int8": lambda: FakeBackend("torch-int8", noise=0.05, delay=0.002),
+            "onnx-fp32": lambda: FakeBackend("onnx-fp32", delay=0.001),
+        }
+        selection = select_backend(factories, config())
+        assert selection.backend.name == "onnx-fp32"
+        report = {r["name"]: r for r in selection.report()["backends"]}
+        assert report["onnx-fp32"]["speedup"] > 1
+        assert report["torch-int8"]["min_agreement"] < 1.0
+
+    def test_rejects_backend_below_agreement(self):
+        factories = {
+            "torch-fp32": lambda: FakeBackend("torch-fp32", delay=0.003),
+            "torch-int8": lambda: FakeBackend("torch-int8", noise=2.0),
+        }
+        selection = select_backend(factories, config())
+        assert selection.backend.name == "torch-fp32"
+        report = {r["name"]: r for r in selection.report()["backends"]}
+        assert report["torch-int8"]["eligible"] is False
+
+    def test_failing_backend_is_skipped(self):
+        def broken():
+            raise RuntimeError("export failed")
+
+        selection = select_backend({"torch-fp32": lambda: FakeBackend("torch-fp32"), "onnx-fp32": broken}, config())
+        assert selection.backend.name == "torch-fp32"
+        assert selection.report()["backends"][1]["error"] == "export failed"
+
+    @pytest.mark.parametrize("backend,expected", [("torch-int8", "torch-int8"), ("onnx-int8", "torch-fp32")])
+    def test_fixed_backend_skips_benchmark(self, backend, expected):
+        factories = {
+            "torch-fp32": lambda: FakeBackend("torch-fp32"),
+            "torch-int8": lambda: FakeBackend("torch-int8"),
+        }
+        selection = select_backend(factories, config(backend=backend))
+        assert selection.backend.name == expected
+        assert len(selection.results) == 1
+
+    def test_config_from_environment(self, monkeypatch):
+        monkeypatch.setenv("EMBEDDING_BACKEND_CANDIDATES", "torch-fp32, onnx-int8")
+        monkeypatch.setenv("EMBEDDING_BACKEND_MIN_AGREEMENT", "0.995")
+        loaded = EmbeddingBackendConfig.from_environment()
+        assert loaded.candidates == ["torch-fp32", "onnx-int8"]
+        assert loaded.min_agreement == 0.995
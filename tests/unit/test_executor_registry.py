@@ -0,0 +1,135 @@
+"""
+Test Executor Registry and Loop Blocking Detector
+Tests the bounded cpu/io offload pools, their metrics and context
+propagation, and attribution of event-loop blocks to call sites
+"""
+
+import asyncio
+import contextvars
+import string
+import sys
+import threading
+import time
+
+import pytest
+
+from shared.core.executor_registry import DEFAULT_EXECUTOR_SITE, ExecutorConfig, ExecutorRegistry, ExecutorSaturated
+from shared.core.loop_monitor import BlockingSite, LoopBlockingDetector, LoopMonitorConfig, attribute
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+class TestExecutorRegistry:
+    """Test the offload pools"""
+
+    def test_pools_are_separate_and_carry_context(self):
+        registry = ExecutorRegistry(ExecutorConfig(cpu_workers=1, io_workers=2))
+
+        async def run():
+            request_id.set("req-1")
+            cpu = await registry.run_cpu(lambda: (threading.current_thread().name, request_id.get()), site="test.cpu")
+            io = await registry.run_io(threading.current_thread)
+            return cpu, io.name
+
+        (cpu_thread, seen_id), io_thread = asyncio.run(run())
+        assert cpu_thread.startswith("offload-cpu") and io_thread.startswith("offload-io")
+        assert seen_id == "req-1"
+        stats = registry.get_stats()
+        assert stats["cpu"]["workers"] == 1 and stats["io"]["workers"] == 2
+        assert stats["cpu"]["sites"]["test.cpu"]["calls"] == 1
+        assert stats["io"]["completed_total"] == 1
+
+    def test_bounded_pool_rejects_and_recovers(self):
+        registry = ExecutorRegistry(ExecutorConfig(cpu_workers=1, cpu_max_pending=2))
+
+        async def run():
+            busy = [asyncio.ensure_future(registry.run_cpu(time.sleep, 0.05)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturated):
+                await registry.run_cpu(time.sleep, 0)
+            await asyncio.gather(*busy)
+            with pytest.raises(ZeroDivisionError):
+                await registry.run_cpu(lambda: 1 / 0)
+            return await registry.run_cpu(sum, [1, 2])
+
+        assert asyncio.run(run()) == 3
+        stats = registry.get_stats()["cpu"]
+        assert stats["rejected_total"] == 1 and stats["failed_total"] == 1
+        assert stats["active"] == 0 and stats["queued"] == 0
+        assert stats["max_wait_ms"] > 0
+
+    def test_default_executor_survives_loop_shutdown(self):
+        registry = ExecutorRegistry(ExecutorConfig(io_workers=1))
+
+        async def run():
+            registry.install_default_executor()
+            return await asyncio.to_thread(lambda: threading.current_thread().name)
+
+        # asyncio.run() shuts down the default executor on exit; the pool must stay usable
+        assert asyncio.run(run()).startswith("offload-io")
+        assert asyncio.run(run()).startswith("offload-io")
+        assert registry.get_stats()["io"]["sites"][DEFAULT_EXECUTOR_SITE]["calls"] == 2
+        registry.shutdown()
+
+    def test_default_executor_is_counted_but_not_rejected(self):
+        registry = ExecutorRegistry(ExecutorConfig(io_workers=1, io_max_pending=1))
+
+        async def run():
+            registry.install_default_executor()
+            names = await asyncio.gather(*(asyncio.to_thread(time.sleep, 0.01) for _ in range(3)))
+            return names, registry.get_stats()["io"]
+
+        names, stats = asyncio.run(run())
+        assert len(names) == 3
+        assert stats["submitted_total"] == 3 and stats["rejected_total"] == 0 and stats["queued"] == 0
+        registry.shutdown()
+
+
+class TestLoopBlockingDetector:
+    """Test event-loop block detection"""
+
+    def test_block_attributed_to_call_site(self):
+        detector = LoopBlockingDetector(LoopMonitorConfig(threshold_ms=50, heartbeat_ms=10))
+
+        def blocking_handler():
+            time.sleep(0.2)
+
+        async def run():
+            detector.start()
+            await asyncio.sleep(0.05)
+            blocking_handler()
+            await asyncio.sleep(0.05)
+            await asyncio.sleep(0.02)
+            detector.stop()
+
+        asyncio.run(run())
+        stats = detector.get_stats()
+        assert stats["blocks_total"] == 1 and not stats["running"]
+        assert 120 <= stats["max_block_ms"] < 1000
+        site = detector.get_sites()[0]
+        assert "test_executor_registry.py" in site["site"] and site["site"].endswith("blocking_handler")
+        assert site["count"] == 1
+
+    def test_attribute_skips_library_frames(self):
+        class CaptureFrame(dict):
+            def __getitem__(self, key):
+                self.frame = sys._getframe(1)  # string.Template's own frame
+                return ""
+
+        def repo_caller():
+            mapping = CaptureFrame()
+            string.Template("$name").substitute(mapping)
+            return attribute(mapping.frame)
+
+        site, blocking_call = repo_caller()
+        assert site.endswith("repo_caller")
+        assert "string" in blocking_call and blocking_call.endswith("convert")
+        assert attribute(None) == ("(unknown)", "(unknown)")
+
+    def test_sites_are_bounded(self):
+        detector = LoopBlockingDetector(LoopMonitorConfig(max_sites=1, log_interval_s=3600))
+
+        detector._record(BlockingSite("a.py:1 f", "a.py:1 f"), 0.2)
+        detector._record(BlockingSite("b.py:2 g", "b.py:2 g"), 0.3)
+        assert [s["site"] for s in detector.get_sites()] == ["(other)", "a.py:1 f"]
+        assert detector.get_stats()["max_block_ms"] == 300.0
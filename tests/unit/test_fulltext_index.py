@@ -0,0 +1,263 @@
+"""
+Test Embedded Full-Text Index
+Tests analysis, the postings codec, BM25F ranking, MaxScore pruning,
+persistence, deletes, merging and the keyword lane
+"""
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from shared.core.fulltext import (
+    Analyzer,
+    FullTextConfig,
+    FullTextIndex,
+    FullTextIngester,
+    IngestConfig,
+    porter_stem,
+    web_result_document,
+)
+from shared.core.fulltext.postings import decode_all, decode_blocks, encode_postings, encode_varints, decode_varints
+
+
+def random_corpus(n, seed=1):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(2000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    return [
+        {
+            "id": str(i),
+            "title": " ".join(rng.choices(vocab, weights, k=6)),
+            "content": " ".join(rng.choices(vocab, weights, k=50)),
+        }
+        for i in range(n)
+    ], vocab, weights
+
+
+class TestAnalysis:
+    """Test tokenizer and stemmer"""
+
+    @pytest.mark.parametrize("word,stem", [
+        ("caresses", "caress"), ("ponies", "poni"), ("motoring", "motor"), ("hopping", "hop"),
+        ("relational", "relat"), ("generalizations", "gener"), ("adjustment", "adjust"),
+    ])
+    def test_porter_stem(self, word, stem):
+        assert porter_stem(word) == stem
+
+    def test_inflections_share_a_term(self):
+        analyzer = Analyzer()
+        assert analyzer.analyze("Indexing") == analyzer.analyze("indexed") == analyzer.analyze("indexes")
+
+    def test_stopwords_and_punctuation_dropped(self):
+        assert Analyzer().analyze("What is the BM25_score of C++?") == ["bm25", "score", "c"]
+
+
+class TestPostingsCodec:
+    """Test varint and block encoding"""
+
+    def test_varint_round_trip(self):
+        values = np.array([0, 1, 127, 128, 16383, 16384, 2 ** 32 + 5])
+        data, nbytes = encode_varints(values)
+        assert nbytes.tolist() == [1, 1, 1, 2, 2, 3, 5]
+        assert decode_varints(np.frombuffer(data, dtype=np.uint8)).tolist() == values.tolist()
+
+    def test_blocks_decode_individually_and_together(self):
+        rng = np.random.default_rng(0)
+        counts = np.array([700, 3, 260])
+        docs = np.concatenate([np.sort(rng.choice(50000, c, replace=False)) for c in counts])
+        tf_title = rng.integers(0, 5, len(docs))
+        tf_body = rng.integers(0, 500, len(docs))
+        lengths = rng.integers(1, 100, 50000)
+
+        meta, data, first_block = encode_postings(counts, docs, tf_title, tf_body, lengths, lengths)
+        data = np.frombuffer(data, dtype=np.uint8)
+        all_docs, all_title, all_body = decode_all(meta, data, first_block)
+        assert all_docs.tolist() == docs.tolist()
+        assert all_title.tolist() == tf_title.tolist()
+        assert all_body.tolist() == tf_body.tolist()
+
+        term_meta = meta[first_block[0]:first_block[1]]
+        some_docs, _, _ = decode_blocks(term_meta, data, np.array([1, 4]))
+        assert some_docs.tolist() == docs[128:256].tolist() + docs[512:640].tolist()
+        assert term_meta["max_tf_body"][0] == tf_body[:128].max()
+
+
+class TestSearch:
+    """Test ranking and pruning"""
+
+    def test_title_matches_outrank_body_matches(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("body", "Cooking notes", "a long note that mentions python once among other words")
+        index.add_document("title", "Python packaging", "how to publish wheels")
+        index.add_document("none", "Gardening", "tomatoes and basil")
+        index.commit()
+
+        hits = index.search("python")
+        assert [h.doc_id for h in hits] == ["title", "body"]
+        assert hits[0].fields["title"] == "Python packaging"
+
+    def test_uncommitted_documents_not_visible(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("1", "draft", "")
+        assert index.search("draft") == []
+        index.commit()
+        assert len(index.search("draft")) == 1
+
+    def test_maxscore_matches_exhaustive(self, open_fulltext_index):
+        index = open_fulltext_index()
+        docs, vocab, weights = random_corpus(5000)
+        index.add_documents(docs)
+        index.commit()
+
+        rng = random.Random(2)
+        for _ in range(60):
+            query = " ".join(rng.choices(vocab[:500], k=rng.randint(1, 4)))
+            pruned = [(h.doc_id, round(h.score, 9)) for h in index.search(query, 10)]
+            exhaustive = [(h.doc_id, round(h.score, 9)) for h in index.search(query, 10, exhaustive=True)]
+            assert [s for _, s in pruned] == [s for _, s in exhaustive]
+        assert index.stats["blocks_skipped"] > 0
+
+
+class TestLifecycle:
+    """Test deletes, persistence and merging"""
+
+    def test_update_and_delete(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("1", "alpha", "")
+        index.add_document("2", "alpha beta", "")
+        index.commit()
+        index.add_document("1", "gamma", "")
+        index.delete_document("2")
+        index.commit()
+
+        assert index.search("alpha") == []
+        assert [h.doc_id for h in index.search("gamma")] == ["1"]
+        assert index.doc_count == 1
+
+    def test_reopen_from_disk(self, tmp_path, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_documents([{"id": "a", "title": "persisted title", "content": "body", "url": "https://x.org"}])
+        index.delete_document("missing")
+        index.close()
+
+        reopened = open_fulltext_index()
+        hits = reopened.search("persisted")
+        assert hits[0].doc_id == "a"
+        assert hits[0].fields["url"] == "https://x.org"
+
+    def test_merge_matches_fresh_index_without_deletes(self, tmp_path, open_fulltext_index):
+        docs, _, _ = random_corpus(3000)
+        index = open_fulltext_index(
+            FullTextConfig(index_dir=str(tmp_path), flush_docs=500, max_segments=100, background_merge=False)
+        )
+        index.add_documents(docs)
+        index.commit()
+        index.delete_document("7")
+        index.commit()
+        assert index.get_stats()["segments"] == 6
+
+        assert index.merge(force=True)
+        assert index.get_stats()["segments"] == 1
+        assert index.doc_count == 2999
+
+        reference = FullTextIndex(FullTextConfig(index_dir=str(tmp_path / "reference"), flush_docs=10000))
+        reference.add_documents(d for d in docs if d["id"] != "7")
+        reference.commit()
+        query = "w3 w40 w400"
+        expected = [(h.doc_id, round(h.score, 9)) for h in reference.search(query, 20)]
+        assert [(h.doc_id, round(h.score, 9)) for h in index.search(query, 20)] == expected
+        reference.close()
+
+    def test_background_merge_keeps_segment_count_bounded(self, tmp_path, open_fulltext_index):
+        index = open_fulltext_index(FullTextConfig(index_dir=str(tmp_path), flush_docs=200, max_segments=3))
+        docs, _, _ = random_corpus(2000)
+        index.add_documents(docs)
+        index.commit()
+        index.wait_for_merges()
+        assert index.doc_count == 2000
+        assert index.get_stats()["merges"] >= 1
+
+
+class TestKeywordLane:
+    """Test the retrieval lane on the index"""
+
+    @pytest.mark.asyncio
+    async def test_lane_returns_ranked_hits(self, open_fulltext_index):
+        from services.retrieval.lanes.keyword_lane import KeywordLane
+
+        index = open_fulltext_index()
+        index.add_documents([
+            {"id": "1", "title": "Reciprocal rank fusion", "content": "Combining ranked lists", "url": "https://a.org/rrf", "domain": "a.org"},
+            {"id": "2", "title": "BM25 explained", "content": "Ranking functions for search", "url": "https://b.org/bm25", "domain": "b.org"},
+        ])
+        index.commit()
+
+        result = await KeywordLane(index=index).retrieve("ranking fusion", "simple")
+        assert result.status == "success"
+        assert [r["id"] for r in result.results] == ["1", "2"]
+        assert result.results[0]["relevance_score"] == 1.0
+        assert result.results[0]["domain"] == "a.org"
+        assert result.results[0]["keyword_matches"] == ["fusion", "rank"]
+
+    @pytest.mark.asyncio
+    async def test_web_results_are_ingested_for_the_lane(self, open_fulltext_index):
+        from services.retrieval.lanes.keyword_lane import KeywordLane
+
+        embedded = []
+
+        async def embedder(text):
+            embedded.append(text)
+            return [1.0, 0.0]
+
+        index = open_fulltext_index()
+        ingester = FullTextIngester(index, IngestConfig(flush_interval_s=0.01), embedder=embedder)
+        web_results = [
+            {"title": "Rust ownership", "content": "Ownership and borrowing in Rust", "url": "https://doc.rust-lang.org/book/ch04", "provider": "wikipedia"},
+            {"title": "No url", "content": "Dropped"},
+        ]
+        assert ingester.submit(web_result_document(r) for r in web_results) == 1
+        await asyncio.sleep(0.1)
+
+        result = await KeywordLane(index=index).retrieve("rust borrowing", "simple")
+        assert [r["url"] for r in result.results] == ["https://doc.rust-lang.org/book/ch04"]
+        assert result.results[0]["domain"] == "doc.rust-lang.org" and result.results[0]["source"] == "wikipedia"
+        assert ingester.get_stats()["ingested_total"] == 1
+        # Embedded at ingest, so the vector lane can search them densely
+        assert embedded == ["Rust ownership\nOwnership and borrowing in Rust"] and index.vector_count == 1
+
+    @pytest.mark.asyncio
+    async def test_saturated_executor_defers_the_batch(self, open_fulltext_index, monkeypatch):
+        from shared.core import executor_registry
+
+        registry = executor_registry.get_executor_registry()
+        calls = []
+
+        async def run_cpu(fn, *args, site=None, **kwargs):
+            calls.append(site)
+            if len(calls) == 1:
+                raise executor_registry.ExecutorSaturated("cpu executor saturated")
+            return fn(*args, **kwargs)
+
+        monkeypatch.setattr(registry, "run_cpu", run_cpu)
+        index = open_fulltext_index()
+        ingester = FullTextIngester(index, IngestConfig(flush_interval_s=0.01, embed=False))
+        ingester.submit([web_result_document({"title": "Rust", "content": "Ownership", "url": "https://a.org/r"})])
+        await asyncio.sleep(0.1)
+
+        assert calls == ["fulltext.ingest", "fulltext.ingest"]
+        assert index.doc_count == 1 and ingester.get_stats()["failed_flushes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_empty_index_falls_back_to_meilisearch(self, open_fulltext_index, monkeypatch):
+        from services.retrieval.lanes.keyword_lane import KeywordLane
+
+        lane = KeywordLane(index=open_fulltext_index())
+
+        async def meilisearch(query):
+            return [{"id": "m1", "title": query, "category": "keyword", "backend": "meilisearch"}]
+
+        monkeypatch.setattr(lane, "_search_meilisearch", meilisearch)
+        result = await lane.retrieve("rust", "simple")
+        assert result.status == "success" and result.results[0]["backend"] == "meilisearch"
@@ -0,0 +1,129 @@
+"""
+Test Gateway Middleware Pipeline
+Tests the single-layer ASGI pipeline: one body parse shared through scope
+state, validation rejections, security and trace headers, rate limiting,
+and untouched pass-through of streaming responses
+"""
+
+import asyncio
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from services.gateway.middleware.pipeline import GatewayPipelineMiddleware, ParsedBodyRoute
+from services.gateway.middleware.security import RateLimitConfig, SecurityConfig, sanitize_string
+
+
+class QueryBody(BaseModel):
+    query: str
+
+
+def build_app(config=None):
+    app = FastAPI()
+    app.router.route_class = ParsedBodyRoute
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.json()
+        return {"shared": body is request.state.json_body, "sanitized": request.state.sanitized_query}
+
+    @app.post("/model")
+    async def model(body: QueryBody):
+        return {"query": body.query}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(GatewayPipelineMiddleware, config=config)
+    return app
+
+
+class TestBodyHandling:
+    """Test the single body parse and its validation"""
+
+    def test_route_reuses_parsed_body(self):
+        client = TestClient(build_app())
+        response = client.post("/echo", json={"query": "<b>hi</b>"})
+        assert response.status_code == 200
+        assert response.json() == {"shared": True, "sanitized": "&lt;b&gt;hi&lt;/b&gt;"}
+        assert client.post("/model", json={"query": "what's new"}).json() == {"query": "what's new"}
+
+    def test_invalid_bodies_rejected(self):
+        client = TestClient(build_app())
+        bad_json = client.post("/echo", content=b"{nope", headers={"content-type": "application/json"})
+        assert (bad_json.status_code, bad_json.json()["detail"]) == (400, "Invalid JSON in request body")
+        assert client.post("/echo", json=[1, 2]).status_code == 400
+        assert client.post("/echo", json={"query": "x" * 1001}).status_code == 400
+        assert client.post("/echo", json={"query": 5}).json()["detail"] == "Query must be a string"
+        assert client.get("/stream?onload=1").status_code == 400
+
+    def test_oversized_body_rejected_without_content_length(self):
+        client = TestClient(build_app(SecurityConfig(max_request_size=64)))
+
+        def chunks():
+            yield b'{"query": "'
+            yield b"x" * 100
+            yield b'"}'
+
+        response = client.post("/echo", content=chunks(), headers={"content-type": "application/json"})
+        assert response.status_code == 413
+
+
+class TestResponses:
+    """Test response headers, rejections and streaming pass-through"""
+
+    def test_headers_added_to_success_and_rejection(self):
+        client = TestClient(build_app())
+        ok = client.post("/model", json={"query": "q"}, headers={"X-Trace-ID": "trace_abc"})
+        assert ok.headers["x-trace-id"] == "trace_abc"
+        assert ok.headers["x-frame-options"] == "DENY"
+        rejected = client.post("/echo", json=[1])
+        assert rejected.headers["x-frame-options"] == "DENY" and "x-trace-id" in rejected.headers
+
+    def test_rate_limit_returns_429(self):
+        config = SecurityConfig(rate_limit=RateLimitConfig(requests_per_minute=2))
+        client = TestClient(build_app(config))
+        statuses = [client.post("/model", json={"query": "q"}).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+
+    def test_streaming_chunks_pass_through(self):
+        app = build_app()
+        messages = []
+
+        async def scenario():
+            scope = {
+                "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream",
+                "query_string": b"", "headers": [(b"host", b"testserver")], "http_version": "1.1",
+                "scheme": "http", "server": ("testserver", 80), "client": ("127.0.0.1", 1234), "root_path": "",
+            }
+
+            async def receive():
+                await asyncio.sleep(1)
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                messages.append(message)
+
+            await app(scope, receive, send)
+
+        asyncio.run(scenario())
+        bodies = [m["body"] for m in messages if m["type"] == "http.response.body" and m.get("body")]
+        assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+        headers = dict(messages[0]["headers"])
+        assert headers[b"content-type"].startswith(b"text/event-stream")
+        assert b"x-trace-id" in headers and b"content-security-policy" in headers
+
+
+class TestSanitizer:
+    """Test the precompiled sanitizer"""
+
+    def test_sanitize_string(self):
+        assert sanitize_string("javascript:alert(1)\x00") == "alert(1)"
+        assert sanitize_string("a OR 1=1", strip_sql=True) == "a"
+        assert sanitize_string("a OR 1=1") == "a OR 1=1"
@@ -0,0 +1,211 @@
+"""
+Test Shared HTTP Client Registry
+Tests connection reuse across clients, per-host limits, DNS caching, warmup
+and pool metrics against a local server
+"""
+
+import pytest
+import asyncio
+from aiohttp import web
+
+from shared.core.http_client_registry import (
+    DNSCache,
+    HTTPClientRegistry,
+    HTTPPoolConfig,
+    parse_upstream_overrides,
+)
+
+
+@pytest.fixture
+async def local_server():
+    """Local HTTP server; ``/slow`` holds the connection for 200ms."""
+    app = web.Application()
+
+    async def ok(request):
+        return web.json_response({"ok": True})
+
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        return web.json_response({"ok": True})
+
+    app.router.add_get("/", ok)
+    app.router.add_get("/slow", slow)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "localhost", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://localhost:{port}"
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def registry():
+    registry = HTTPClientRegistry(HTTPPoolConfig(max_connections_per_host=2, warmup_urls=()))
+    yield registry
+    await registry.close()
+
+
+class TestHTTPClientRegistry:
+    """Test pooled clients"""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_connections(self, local_server, registry):
+        for _ in range(5):
+            async with registry.client(timeout=2.0) as client:
+                response = await client.get(f"{local_server}/")
+                assert response.json() == {"ok": True}
+
+        host = registry.get_pool_stats()["hosts"]["localhost"]
+        assert host["requests_total"] == 5
+        assert host["connections_opened"] == 1
+        assert host["connect_latency_avg_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit_queues_requests(self, local_server, registry):
+        client = registry.client(timeout=5.0)
+
+        async def sample_waiting():
+            await asyncio.sleep(0.1)
+            return registry.get_pool_stats()
+
+        results = await asyncio.gather(
+            *(client.get(f"{local_server}/slow") for _ in range(5)),
+            sample_waiting()
+        )
+        stats = results[-1]
+        assert all(r.status_code == 200 for r in results[:-1])
+        assert stats["in_use"] == 2
+        assert stats["waiting"] == 3
+        assert registry.get_pool_stats()["hosts"]["localhost"]["connections_opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_aiohttp_sessions_share_connector(self, local_server, registry):
+        for _ in range(3):
+            session = registry.aiohttp_session()
+            async with session.get(f"{local_server}/") as response:
+                assert (await response.json()) == {"ok": True}
+            await session.close()
+
+        stats = registry.get_pool_stats()
+        assert stats["hosts"]["localhost"]["connections_opened"] == 1
+        assert stats["aiohttp"]["idle_connections"] == 1
+        assert stats["aiohttp"]["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_warmup_reports_reachable_hosts(self, local_server, registry):
+        results = await registry.warmup([local_server, "http://127.0.0.1:9"], timeout=1.0)
+        assert results == {local_server: True, "http://127.0.0.1:9": False}
+        assert registry.get_pool_stats()["httpx_pools"]
+
+    def test_sync_session_is_shared(self, registry):
+        assert registry.sync_session() is registry.sync_session()
+
+    @pytest.mark.asyncio
+    async def test_total_connection_limit_applies_across_hosts(self, local_server):
+        registry = HTTPClientRegistry(HTTPPoolConfig(max_connections=2, max_connections_per_host=5, warmup_urls=()))
+        client = registry.client(timeout=5.0)
+        other_host = local_server.replace("localhost", "127.0.0.1")
+
+        async def sample_waiting():
+            await asyncio.sleep(0.1)
+            return registry.get_pool_stats()["waiting"]
+
+        results = await asyncio.gather(
+            *(client.get(f"{base}/slow") for base in (local_server, other_host, local_server, other_host)),
+            sample_waiting()
+        )
+        assert all(r.status_code == 200 for r in results[:-1])
+        assert results[-1] == 2
+        await registry.close()
+
+
+class TestLoopBinding:
+    """Test pool ownership across event loops and threads"""
+
+    @pytest.mark.asyncio
+    async def test_calls_outside_the_loop_reuse_pools(self, registry):
+        registry.client()
+        transport = registry._transport
+        # Worker threads and sync constructors have no running loop
+        await asyncio.to_thread(registry.client)
+        assert registry._transport is transport
+        registry.client()
+        assert registry._transport is transport
+
+    def test_pools_created_before_a_loop_are_adopted(self):
+        registry = HTTPClientRegistry(HTTPPoolConfig(warmup_urls=()))
+        registry.client()
+        transport = registry._transport
+
+        async def use():
+            registry.client()
+            return registry._transport
+
+        assert asyncio.run(use()) is transport
+
+    def test_previous_loop_pools_closed_on_rebind(self):
+        registry = HTTPClientRegistry(HTTPPoolConfig(warmup_urls=()))
+        closed = []
+
+        async def use():
+            registry.client()
+            transport = registry._transport
+            transport.close_pools = lambda: closed.append(transport) or asyncio.sleep(0)
+            return transport
+
+        first = asyncio.run(use())
+
+        async def rebind():
+            second = await use()
+            await registry.close()
+            return second
+
+        second = asyncio.run(rebind())
+        assert second is not first
+        assert closed[0] is first
+
+
+class TestDNSCache:
+    """Test DNS caching"""
+
+    @pytest.mark.asyncio
+    async def test_lookups_cached_and_coalesced(self):
+        cache = DNSCache(ttl=60)
+        first, second = await asyncio.gather(cache.resolve("localhost", 80), cache.resolve("localhost", 80))
+        assert first == second
+        await cache.resolve("localhost", 80)
+        assert cache.get_stats()["misses"] == 1
+        assert cache.get_stats()["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_resolved_again(self):
+        cache = DNSCache(ttl=0)
+        await cache.resolve("localhost", 80)
+        await cache.resolve("localhost", 80)
+        assert cache.get_stats()["misses"] == 2
+
+
+class TestUpstreamOverrides:
+    """Test redirecting provider hosts to local stubs"""
+
+    def test_parse_overrides(self):
+        assert parse_upstream_overrides("api.search.brave.com=http://127.0.0.1:8999/, bad, =x") == {
+            "api.search.brave.com": "http://127.0.0.1:8999"
+        }
+
+    @pytest.mark.asyncio
+    async def test_all_clients_follow_override(self, local_server):
+        registry = HTTPClientRegistry(HTTPPoolConfig(warmup_urls=(), upstream_overrides={"provider.invalid": local_server}))
+        try:
+            async with registry.client(timeout=2.0) as client:
+                assert (await client.get("https://provider.invalid/")).json() == {"ok": True}
+            session = registry.aiohttp_session()
+            async with session.get("https://provider.invalid/") as response:
+                assert (await response.json()) == {"ok": True}
+            await session.close()
+            response = await asyncio.to_thread(registry.sync_session().get, "https://provider.invalid/", timeout=2)
+            assert response.json() == {"ok": True}
+            assert "provider.invalid" in registry.get_pool_stats()["hosts"]
+        finally:
+            await registry.close()
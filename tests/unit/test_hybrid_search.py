@@ -0,0 +1,230 @@
+"""
+Test Hybrid Lexical + Dense Search
+Tests embeddings in segments, IVF search, filter pushdown, score fusion
+and the vector lane
+"""
+
+import numpy as np
+import pytest
+
+from shared.core.fulltext import FullTextConfig
+from shared.core.fulltext.dense import dense_top_k, normalize_rows, train_ivf
+
+
+def clustered_docs(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    cluster = rng.integers(0, 20, n)
+    vectors = centers[cluster] + rng.normal(size=(n, dim)) * 0.3
+    return [
+        {
+            "id": str(i),
+            "title": f"cluster{cluster[i]} item",
+            "content": f"body w{i % 50}",
+            "domain": f"d{i % 3}.org",
+            "vector": vectors[i],
+        }
+        for i in range(n)
+    ], centers
+
+
+class TestDenseSearch:
+    """Test vector storage and ANN search"""
+
+    def test_ivf_with_all_lists_probed_is_exact(self):
+        rng = np.random.default_rng(1)
+        vectors = normalize_rows(rng.normal(size=(3000, 8)))
+        query = normalize_rows(rng.normal(size=(1, 8)))[0]
+        ivf = train_ivf(vectors, 40)
+        assert int(ivf[2][-1]) == 3000
+
+        exact_rows, exact_scores = dense_top_k(vectors, query, 10)
+        ivf_rows, ivf_scores = dense_top_k(vectors, query, 10, ivf=ivf, nprobe=40)
+        assert ivf_rows.tolist() == exact_rows.tolist()
+        assert np.allclose(ivf_scores, exact_scores)
+
+    def test_vectors_survive_flush_reopen_and_merge(self, tmp_path, open_fulltext_index):
+        docs, centers = clustered_docs(3000)
+        index = open_fulltext_index(FullTextConfig(
+            index_dir=str(tmp_path), flush_docs=1000, background_merge=False,
+            ivf_min_docs=500, ivf_nprobe=64, max_segments=100,
+        ))
+        index.add_documents(docs)
+        index.commit()
+        assert index._segments[0].reader.ivf is not None
+        before = [h.doc_id for h in index.dense_search(centers[3], 10)]
+        assert all(h.fields["title"].startswith("cluster3 ") for h in index.dense_search(centers[3], 10))
+
+        index.merge(force=True)
+        assert [h.doc_id for h in index.dense_search(centers[3], 10)] == before
+        index.close()
+        assert [h.doc_id for h in open_fulltext_index().dense_search(centers[3], 10)] == before
+
+    def test_dimension_mismatch_rejected(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("1", "a", vector=[1.0, 0.0])
+        with pytest.raises(ValueError):
+            index.add_document("2", "b", vector=[1.0, 0.0, 0.0])
+        with pytest.raises(ValueError):
+            index.dense_search([1.0, 0.0, 0.0])
+
+
+class TestFilters:
+    """Test filter pushdown into both scoring paths"""
+
+    def test_filters_restrict_lexical_and_dense(self, open_fulltext_index):
+        docs, centers = clustered_docs(600)
+        index = open_fulltext_index()
+        index.add_documents(docs)
+        index.commit()
+
+        lexical = index.search("item", 50, filters={"domain": "d1.org"})
+        assert len(lexical) == 50 and {h.fields["domain"] for h in lexical} == {"d1.org"}
+        dense = index.dense_search(centers[0], 20, filters={"domain": ["d0.org", "d2.org"]})
+        assert len(dense) == 20 and {h.fields["domain"] for h in dense} <= {"d0.org", "d2.org"}
+        assert index.search("item", 10, filters={"domain": "nowhere.org"}) == []
+
+    def test_unknown_filter_field_rejected(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("1", "alpha")
+        index.commit()
+        with pytest.raises(ValueError):
+            index.search("alpha", filters={"author": "x"})
+
+
+class TestHybridSearch:
+    """Test fused lexical + dense ranking"""
+
+    @pytest.fixture
+    def index(self, open_fulltext_index):
+        index = open_fulltext_index()
+        index.add_document("lexical", "quantum annealing", "", vector=[0.0, 1.0])
+        index.add_document("dense", "unrelated words", "", vector=[1.0, 0.0])
+        index.add_document("both", "quantum computing", "", vector=[0.7, 0.7])
+        index.add_document("neither", "gardening", "", vector=[0.0, -1.0])
+        index.commit()
+        return index
+
+    def test_candidates_from_either_side_get_exact_scores(self, index):
+        hits = index.hybrid_search("quantum", [1.0, 0.0], k=3)
+        assert [h.doc_id for h in hits][0] == "both"
+        assert {h.doc_id for h in hits} == {"both", "lexical", "dense"}
+
+        by_id = {h.doc_id: h for h in hits}
+        lexical_scores = {h.doc_id: h.score for h in index.search("quantum")}
+        assert by_id["lexical"].components["lexical"] == pytest.approx(lexical_scores["lexical"])
+        assert by_id["dense"].components["lexical"] == 0.0
+        assert by_id["lexical"].components["dense"] == pytest.approx(0.0, abs=1e-6)
+        assert by_id["dense"].components["dense"] == pytest.approx(1.0)
+
+    def test_convex_fusion_weights_sides(self, index):
+        lexical_heavy = index.hybrid_search("quantum annealing", [1.0, 0.0], k=1, fusion="convex", alpha=0.1)
+        dense_heavy = index.hybrid_search("quantum annealing", [1.0, 0.0], k=1, fusion="convex", alpha=0.9)
+        assert lexical_heavy[0].doc_id == "lexical"
+        assert dense_heavy[0].doc_id == "dense"
+
+    def test_without_query_vector_matches_lexical(self, index):
+        assert [h.doc_id for h in index.hybrid_search("quantum", None)] == [h.doc_id for h in index.search("quantum")]
+        with pytest.raises(ValueError):
+            index.hybrid_search("quantum", None, fusion="max")
+
+
+class VectorStore:
+    """External vector store returning fixed results"""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def semantic_search(self, query, top_k):
+        return [dict(result) for result in self.results]
+
+
+class TestVectorLane:
+    """Test the retrieval lane on the hybrid index"""
+
+    @pytest.mark.asyncio
+    async def test_lane_fuses_and_applies_source_constraints(self, open_fulltext_index):
+        from services.retrieval.lanes.vector_lane import VectorLane
+
+        index = open_fulltext_index()
+        index.add_documents([
+            {"id": "1", "title": "Transformers survey", "content": "attention", "domain": "arxiv.org", "vector": [1.0, 0.0]},
+            {"id": "2", "title": "Transformers in the news", "content": "", "domain": "bbc.com", "vector": [0.8, 0.2]},
+        ])
+        index.commit()
+
+        async def embedder(query):
+            return [1.0, 0.0]
+
+        lane = VectorLane(index=index, embedder=embedder, vector_store=VectorStore([]))
+        result = await lane.retrieve("transformers", "simple")
+        assert result.status == "success"
+        assert [r["id"] for r in result.results] == ["1", "2"]
+        assert result.results[0]["similarity_score"] == pytest.approx(1.0)
+
+        academic = [{"id": "sources", "selected": "Academic", "domains": ["arxiv.org", "pubmed.ncbi.nlm.nih.gov"]}]
+        result = await lane.retrieve("transformers", "simple", academic)
+        assert [r["domain"] for r in result.results] == ["arxiv.org"]
+
+    @pytest.mark.asyncio
+    async def test_lane_falls_back_to_lexical_without_query_embedding(self, open_fulltext_index):
+        from services.retrieval.lanes.vector_lane import VectorLane
+
+        index = open_fulltext_index()
+        index.add_document("1", "hybrid retrieval", "", vector=[1.0, 0.0])
+        index.commit()
+
+        async def failing_embedder(query):
+            raise RuntimeError("model not loaded")
+
+        lane = VectorLane(index=index, embedder=failing_embedder, vector_store=VectorStore([]))
+        result = await lane.retrieve("retrieval", "simple")
+        assert [r["id"] for r in result.results] == ["1"]
+        assert result.results[0]["similarity_score"] is None
+
+    @pytest.mark.asyncio
+    async def test_vector_store_is_fused_with_local_hits(self, open_fulltext_index):
+        from services.retrieval.lanes.vector_lane import VectorLane
+
+        index = open_fulltext_index()
+        index.add_documents([
+            {"id": "1", "title": "Transformers survey", "content": "attention", "url": "https://arxiv.org/1", "vector": [1.0, 0.0]},
+        ])
+        index.commit()
+
+        async def embedder(query):
+            return [1.0, 0.0]
+
+        store = VectorStore([
+            {"id": "q1", "content": "Attention is all you need", "metadata": {"url": "https://arxiv.org/1"}, "score": 0.9},
+            {"id": "q2", "content": "Curated transformer notes", "metadata": {"url": "https://kb.org/2"}, "score": 0.8},
+        ])
+        result = await VectorLane(index=index, embedder=embedder, vector_store=store).retrieve("transformers", "simple")
+        # The shared URL ranks first on both sides and appears once
+        assert [r["id"] for r in result.results] == ["1", "q2"]
+
+    @pytest.mark.asyncio
+    async def test_index_without_vectors_uses_the_vector_store(self, open_fulltext_index):
+        from services.retrieval.lanes.vector_lane import VectorLane
+
+        index = open_fulltext_index()
+        index.add_document("1", "transformers", "lexical only")
+        index.commit()
+
+        store = VectorStore([{"id": "q1", "content": "transformers", "score": 0.9}])
+        result = await VectorLane(index=index, vector_store=store).retrieve("transformers", "simple")
+        assert [r["id"] for r in result.results] == ["q1"]
+
+    @pytest.mark.asyncio
+    async def test_empty_index_falls_back_to_vector_store(self, open_fulltext_index, monkeypatch):
+        from services.retrieval.lanes.vector_lane import VectorLane
+        from shared.core.services import vector_singleton_service
+
+        class VectorStore:
+            async def semantic_search(self, query, top_k):
+                return [{"id": "q1", "content": query, "score": 0.9}]
+
+        monkeypatch.setattr(vector_singleton_service, "get_vector_singleton_service", VectorStore)
+        result = await VectorLane(index=open_fulltext_index()).retrieve("transformers", "simple")
+        assert result.status == "success"
+        assert result.results[0]["id"] == "q1" and result.results[0]["metadata"]["retrieval_method"] == "vector_similarity"
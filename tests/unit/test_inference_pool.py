@@ -0,0 +1,156 @@
+"""
+Test Local Inference Worker Pool
+Tests core planning, dynamic batching, per-input error isolation, worker
+restarts and event-loop responsiveness with a pure-Python task handler
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from shared.core.inference_pool import (
+    InferenceError,
+    InferencePool,
+    InferencePoolConfig,
+    InferenceTask,
+    plan_workers,
+)
+
+
+class EchoTask(InferenceTask):
+    """Echoes inputs with the batch size and worker pid; "boom" fails, "exit" kills the worker."""
+
+    def load(self, model_name, options):
+        return {"model": model_name, "pid": os.getpid()}
+
+    def run(self, model, inputs, params):
+        if "exit" in inputs:
+            os._exit(3)
+        if "boom" in inputs:
+            raise ValueError("bad input")
+        time.sleep(params.get("sleep", 0))
+        return [{"text": params.get("prefix", "") + text, "batch": len(inputs), "pid": model["pid"]} for text in inputs]
+
+
+CONFIG = InferencePoolConfig(num_workers=1, threads_per_worker=1, max_batch_size=8, max_wait_ms=50, pin_cores=False)
+TASKS = {"echo": f"{__name__}:EchoTask"}
+
+
+async def with_pool(pool: InferencePool, scenario):
+    try:
+        return await scenario(pool)
+    finally:
+        await pool.stop()
+
+
+class TestPlanning:
+    """Test core assignment"""
+
+    def test_disjoint_core_sets(self):
+        plan = plan_workers(InferencePoolConfig(threads_per_worker=2), cores=list(range(8)))
+        assert plan == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+    def test_defaults_and_oversubscription(self):
+        assert plan_workers(InferencePoolConfig(), cores=list(range(16))) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]]
+        assert plan_workers(InferencePoolConfig(num_workers=2, threads_per_worker=1), cores=[5]) == [[5], [5]]
+
+
+class TestBatching:
+    """Test dynamic batching and submission"""
+
+    def test_concurrent_requests_share_a_batch(self):
+        async def scenario(pool):
+            results = await asyncio.gather(*(pool.submit("echo", "m", f"t{i}") for i in range(8)))
+            return results, pool.get_stats()
+
+        results, stats = asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario))
+        assert [r["text"] for r in results] == [f"t{i}" for i in range(8)]
+        assert max(r["batch"] for r in results) > 1
+        assert results[0]["pid"] != os.getpid()
+        model_stats = stats["models"]["echo:m"]
+        assert model_stats["requests"] == 8
+        assert model_stats["avg_batch_size"] > 1
+
+    def test_params_group_within_a_batch(self):
+        async def scenario(pool):
+            return await asyncio.gather(
+                pool.submit("echo", "m", "a", params={"prefix": "x-"}),
+                pool.submit("echo", "m", "b", params={"prefix": "y-"}),
+                pool.submit("echo", "m", "c", params={"prefix": "x-"}),
+            )
+
+        results = asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario))
+        assert [r["text"] for r in results] == ["x-a", "y-b", "x-c"]
+
+    def test_failing_input_is_isolated(self):
+        async def scenario(pool):
+            return await asyncio.gather(
+                pool.submit("echo", "m", "ok"), pool.submit("echo", "m", "boom"), return_exceptions=True
+            )
+
+        ok, failed = asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario))
+        assert ok["text"] == "ok"
+        assert isinstance(failed, InferenceError) and "bad input" in str(failed)
+
+    def test_unknown_task(self):
+        async def scenario(pool):
+            with pytest.raises(InferenceError):
+                await pool.submit("nope", "m", "x")
+
+        asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario))
+
+    def test_disabled_pool_runs_in_process(self):
+        async def scenario(pool):
+            return await pool.submit("echo", "m", "x")
+
+        disabled = InferencePoolConfig(enabled=False, num_workers=1, threads_per_worker=1, pin_cores=False)
+        result = asyncio.run(with_pool(InferencePool(disabled, tasks=TASKS), scenario))
+        assert result["pid"] == os.getpid()
+
+
+class TestIsolation:
+    """Test that inference stays off the event loop and survives worker crashes"""
+
+    def test_event_loop_stays_responsive(self):
+        async def scenario(pool):
+            await pool.load("echo", "m")
+            lags = []
+
+            async def ticker():
+                for _ in range(20):
+                    start = time.perf_counter()
+                    await asyncio.sleep(0.01)
+                    lags.append(time.perf_counter() - start - 0.01)
+
+            await asyncio.gather(pool.submit("echo", "m", "slow", params={"sleep": 0.3}), ticker())
+            return max(lags)
+
+        assert asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario)) < 0.1
+
+    def test_crashed_worker_is_restarted(self):
+        async def scenario(pool):
+            with pytest.raises(InferenceError, match="exited"):
+                await pool.submit("echo", "m", "exit")
+            result = await pool.submit("echo", "m", "after")
+            return result, pool.get_stats()
+
+        result, stats = asyncio.run(with_pool(InferencePool(CONFIG, tasks=TASKS), scenario))
+        assert result["text"] == "after"
+        assert stats["restarts"] == 1
+        assert stats["workers_alive"] == 1
+
+    def test_reader_stops_once_its_loop_is_closed(self):
+        loop = asyncio.new_event_loop()
+        loop.close()
+        assert InferencePool._post(loop, print) is False
+        assert InferencePool._post(None, print) is False
+
+    def test_task_handlers_must_implement_load_and_run(self):
+        class Partial(InferenceTask):
+            def load(self, model_name, options):
+                return None
+
+        with pytest.raises(TypeError):
+            Partial("partial")
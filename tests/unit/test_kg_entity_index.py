@@ -0,0 +1,232 @@
+"""
+Test KG Entity Index
+Tests exact, alias, partial, fuzzy and prefix entity lookup, incremental
+updates, the sorted surface dictionary and snapshot + WAL synchronization
+"""
+
+import asyncio
+
+from shared.core.kg_index import EntityIndex, EntityIndexConfig, EntityIndexSync, normalize
+from shared.core.kg_index.dictionary import SurfaceDictionary
+from shared.core.kg_index.sync import WAL_DOCUMENT_REMOVE, WAL_DOCUMENT_UPSERT
+
+ENTITIES = [
+    {"_key": "e1", "name": "Albert Einstein", "type": "person", "aliases": ["Einstein"]},
+    {"_key": "e2", "name": "Theory of Relativity", "type": "concept", "aliases": ["Relativity"]},
+    {"_key": "e3", "name": "Princeton University", "type": "organization"},
+    {"_key": "e4", "name": "Machine Learning", "type": "concept", "aliases": ["ML"]},
+    {"_key": "e5", "name": "Machine Translation", "type": "concept"},
+    {"_key": "e6", "name": "Müller Café", "type": "place"},
+]
+
+
+def make_index(entities=ENTITIES) -> EntityIndex:
+    index = EntityIndex(EntityIndexConfig())
+    index.replace_all(entities)
+    return index
+
+
+class TestLookup:
+    """Test entity resolution from query text"""
+
+    def test_exact_name_in_sentence(self):
+        matches = make_index().lookup("what did albert einstein work on")
+        assert matches[0].key == "e1"
+        assert matches[0].match_type == "exact"
+        assert matches[0].matched_text == "albert einstein"
+
+    def test_alias_match(self):
+        matches = make_index().lookup("ML")
+        assert matches[0].key == "e4"
+        assert matches[0].match_type == "alias"
+
+    def test_exact_outranks_alias_and_partial(self):
+        matches = make_index().lookup("machine learning")
+        assert matches[0].key == "e4"
+        assert matches[0].match_type == "exact"
+        assert {m.key for m in matches} >= {"e4", "e5"}
+        assert matches[0].score > matches[1].score
+
+    def test_partial_match(self):
+        matches = make_index().lookup("princeton")
+        assert matches[0].key == "e3"
+        assert matches[0].match_type in ("partial", "prefix")
+
+    def test_fuzzy_match_corrects_typo(self):
+        matches = make_index().lookup("einstien")
+        assert matches[0].key == "e1"
+        assert matches[0].match_type == "fuzzy"
+
+    def test_prefix_match(self):
+        matches = make_index().lookup("machine tr")
+        assert matches[0].key == "e5"
+
+    def test_accents_and_case_are_normalized(self):
+        assert normalize("  Müller-Café! ") == "muller cafe"
+        assert make_index().lookup("MULLER CAFE")[0].key == "e6"
+
+    def test_type_filter_and_limit(self):
+        index = make_index()
+        assert all(m.type == "concept" for m in index.lookup("machine", types=["concept"]))
+        assert index.lookup("machine", types=["person"]) == []
+        assert len(index.lookup("machine", limit=1)) == 1
+
+    def test_no_match(self):
+        assert make_index().lookup("zzzz qqqq") == []
+        assert make_index().lookup("") == []
+
+
+class TestUpdates:
+    """Test incremental index maintenance"""
+
+    def test_upsert_replaces_surfaces(self):
+        index = make_index()
+        index.upsert("e3", "Institute for Advanced Study", "organization")
+        assert index.lookup("princeton university") == [] or index.lookup("princeton university")[0].key != "e3"
+        assert index.lookup("institute for advanced study")[0].key == "e3"
+        assert len(index) == len(ENTITIES)
+
+    def test_remove_and_reuse(self):
+        index = make_index()
+        assert index.remove("e1")
+        assert not index.remove("e1")
+        assert all(m.key != "e1" for m in index.lookup("albert einstein"))
+        index.upsert("e7", "Niels Bohr", "person")
+        assert index.lookup("niels bohr")[0].key == "e7"
+        assert len(index) == len(ENTITIES)
+
+    def test_apply_change_feed_documents(self):
+        index = make_index()
+        index.apply({"_key": "e8", "name": "Quantum Mechanics", "properties": {"aliases": ["QM"]}})
+        assert index.lookup("qm")[0].key == "e8"
+        index.apply({"_key": "e8"}, removed=True)
+        assert index.lookup("qm") == []
+
+    def test_stats(self):
+        index = make_index()
+        index.lookup("einstein")
+        stats = index.get_stats()
+        assert stats["ready"] is True
+        assert stats["entities"] == len(ENTITIES)
+        assert stats["lookups"] == 1
+
+
+class TestSurfaceDictionary:
+    """Test the sorted dictionary with delta"""
+
+    def test_prefix_across_sorted_and_delta(self):
+        dictionary = SurfaceDictionary()
+        for i, surface in enumerate(["apple", "apricot", "banana"]):
+            dictionary.add(surface, i, bulk=True)
+        dictionary.rebuild()
+        dictionary.add("application", 3)
+        assert dictionary.prefix("ap") == ["apple", "application", "apricot"]
+        assert dictionary.prefix("ap", limit=2) == ["apple", "application"]
+
+    def test_removed_surfaces_are_skipped(self):
+        dictionary = SurfaceDictionary()
+        for i, surface in enumerate(["alpha", "alpine", "alps"]):
+            dictionary.add(surface, i)
+        dictionary.remove("alpine", 1)
+        assert dictionary.prefix("alp", limit=2) == ["alpha", "alps"]
+        dictionary.rebuild()
+        assert dictionary.prefix("alp") == ["alpha", "alps"]
+
+    def test_shared_surface_ids(self):
+        dictionary = SurfaceDictionary()
+        dictionary.add("mercury", 1)
+        dictionary.add("mercury", 2)
+        assert dictionary.get("mercury") == (1, 2)
+        dictionary.remove("mercury", 1)
+        assert dictionary.get("mercury") == (2,)
+
+
+class _FakeCollection:
+    def properties(self):
+        return {"global_id": "h123"}
+
+
+class _FakeAQL:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def execute(self, query, **kwargs):
+        return iter(self.docs)
+
+
+class _FakeWAL:
+    def __init__(self, batches, fail=False):
+        self.batches = list(batches)
+        self.fail = fail
+        self.lowers = []
+
+    def last_tick(self):
+        if self.fail:
+            raise PermissionError("replication not permitted")
+        return {"tick": "100"}
+
+    def tail(self, lower=None, deserialize=True):
+        self.lowers.append(lower)
+        return self.batches.pop(0) if self.batches else {"content": [], "check_more": False}
+
+
+class _FakeDatabase:
+    def __init__(self, docs, batches=(), fail=False):
+        self.aql = _FakeAQL(docs)
+        self.wal = _FakeWAL(batches, fail)
+
+    def collection(self, name):
+        return _FakeCollection()
+
+
+class TestSync:
+    """Test snapshot + WAL synchronization"""
+
+    def test_snapshot_then_tail(self):
+        batches = [
+            {
+                "content": [
+                    {"type": WAL_DOCUMENT_UPSERT, "cuid": "h123", "data": {"_key": "e9", "name": "Marie Curie"}},
+                    {"type": WAL_DOCUMENT_UPSERT, "cuid": "other", "data": {"_key": "x", "name": "Not An Entity"}},
+                    {"type": 2001, "data": {}},
+                ],
+                "last_included": "120",
+                "check_more": True,
+            },
+            {
+                "content": [{"type": WAL_DOCUMENT_REMOVE, "cname": "entities", "data": {"_key": "e1"}}],
+                "last_included": "130",
+                "check_more": False,
+            },
+        ]
+        database = _FakeDatabase(ENTITIES, batches)
+        sync = EntityIndexSync(EntityIndex(EntityIndexConfig()))
+
+        async def run():
+            assert await sync.resync(database) == len(ENTITIES)
+            return await sync.poll(database)
+
+        assert asyncio.run(run()) == 2
+        assert database.wal.lowers == ["100", "120"]
+        assert sync.index.lookup("marie curie")[0].key == "e9"
+        assert sync.index.lookup("not an entity") == []
+        assert all(m.key != "e1" for m in sync.index.lookup("albert einstein"))
+        stats = sync.get_stats()
+        assert stats["wal_tailing"] is True
+        assert stats["changes_applied"] == 2
+
+    def test_falls_back_to_periodic_resync_without_wal(self):
+        database = _FakeDatabase(ENTITIES, fail=True)
+        sync = EntityIndexSync(EntityIndex(EntityIndexConfig()))
+        asyncio.run(sync.resync(database))
+        assert sync.index.ready
+        assert sync.get_stats()["wal_tailing"] is False
+
+    def test_start_respects_disabled_config(self):
+        sync = EntityIndexSync(EntityIndex(EntityIndexConfig(enabled=False)))
+
+        async def run():
+            return sync.start(_FakeDatabase(ENTITIES))
+
+        assert asyncio.run(run()) is False
+        assert not sync.running
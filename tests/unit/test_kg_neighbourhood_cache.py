@@ -0,0 +1,156 @@
+"""
+Test KG Neighbourhood Expansion and Cache
+Tests bulk k-hop expansion in one parameterized query, LRU caching keyed by
+(entity, depth, edge types) and invalidation when relationships are added
+"""
+
+import asyncio
+
+import pytest
+
+from shared.core.agents.knowledge_graph_service import EXPAND_NEIGHBOURHOODS_QUERY, KnowledgeGraphService
+from shared.core.kg_index import NeighbourhoodCache, NeighbourhoodCacheConfig
+from shared.core.kg_index import neighbourhood as neighbourhood_module
+
+EDGES = [
+    ("a", "b", "works_at"),
+    ("b", "c", "located_in"),
+    ("d", "e", "works_at"),
+]
+
+
+def row(src: str, dst: str, edge_type: str, vertex: str):
+    return {
+        "vertex": {"_key": vertex, "name": vertex.upper(), "type": "thing"},
+        "edge": {"_id": f"relationships/{src}-{dst}", "_from": f"entities/{src}", "_to": f"entities/{dst}", "type": edge_type},
+    }
+
+
+class FakeGraphStore:
+    """Answers the expansion query by walking EDGES breadth-first."""
+
+    def __init__(self):
+        self.edges = list(EDGES)
+        self.queries = []
+
+    async def execute_aql(self, query, bind_vars=None):
+        self.queries.append((query, bind_vars))
+        results = []
+        for seed in bind_vars["seeds"]:
+            rows, frontier, seen = [], [seed], {seed}
+            for _ in range(bind_vars["depth"]):
+                following = []
+                for node in frontier:
+                    for src, dst, edge_type in self.edges:
+                        if node not in (src, dst):
+                            continue
+                        if bind_vars["edge_types"] and edge_type not in bind_vars["edge_types"]:
+                            continue
+                        other = dst if node == src else src
+                        if other not in seen:
+                            seen.add(other)
+                            following.append(other)
+                            rows.append(row(src, dst, edge_type, other))
+                frontier = following
+            results.append({"seed": seed, "rows": rows[:bind_vars["limit"]]})
+        return results
+
+    async def create_relationship(self, from_key, to_key, relationship_type, properties=None):
+        self.edges.append((from_key, to_key, relationship_type))
+        return {"_key": f"{from_key}-{to_key}"}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    cache = NeighbourhoodCache(NeighbourhoodCacheConfig())
+    monkeypatch.setattr(neighbourhood_module, "_neighbourhood_cache", cache)
+    kg = KnowledgeGraphService()
+    kg.arangodb_service = FakeGraphStore()
+    return kg
+
+
+class TestExpansion:
+    """Test bulk neighbourhood expansion"""
+
+    def test_one_query_for_many_seeds(self, service):
+        expanded = asyncio.run(service.expand_entities(["a", "d"], depth=2))
+        assert len(service.arangodb_service.queries) == 1
+        query, bind_vars = service.arangodb_service.queries[0]
+        assert query == EXPAND_NEIGHBOURHOODS_QUERY
+        assert bind_vars["seeds"] == ["a", "d"] and bind_vars["depth"] == 2
+        assert [e.id for e in expanded["a"].entities] == ["b", "c"]
+        assert [e.id for e in expanded["d"].entities] == ["e"]
+        assert expanded["a"].relationships[0].relationship_type == "works_at"
+
+    def test_find_relationships_uses_bulk_path(self, service):
+        result = asyncio.run(service.find_relationships("b", depth=1))
+        assert {e.id for e in result.entities} == {"a", "c"}
+        assert result.total_results == 4
+
+    def test_cached_seeds_are_not_queried_again(self, service):
+        asyncio.run(service.expand_entities(["a"], depth=2))
+        asyncio.run(service.expand_entities(["a", "d"], depth=2))
+        assert [q[1]["seeds"] for q in service.arangodb_service.queries] == [["a"], ["d"]]
+
+    def test_depth_and_edge_types_are_part_of_the_key(self, service):
+        asyncio.run(service.expand_entities(["a"], depth=2))
+        asyncio.run(service.expand_entities(["a"], depth=1))
+        filtered = asyncio.run(service.expand_entities(["a"], ["works_at"], depth=2))
+        assert len(service.arangodb_service.queries) == 3
+        assert [e.id for e in filtered["a"].entities] == ["b"]
+
+    def test_query_failure_returns_empty_results(self, service):
+        async def fail(query, bind_vars=None):
+            raise RuntimeError("connection refused")
+
+        service.arangodb_service.execute_aql = fail
+        expanded = asyncio.run(service.expand_entities(["a"]))
+        assert expanded["a"].entities == []
+
+
+class TestInvalidation:
+    """Test cache invalidation on relationship writes"""
+
+    def test_add_relationship_invalidates_touched_neighbourhoods(self, service):
+        asyncio.run(service.expand_entities(["a", "d"], depth=2))
+        asyncio.run(service.add_relationship("c", "f", "part_of"))
+        expanded = asyncio.run(service.expand_entities(["a", "d"], depth=2))
+        # "a" reaches "c", so it is refetched; "d" is untouched and stays cached
+        assert service.arangodb_service.queries[-1][1]["seeds"] == ["a"]
+        assert [e.id for e in expanded["a"].entities] == ["b", "c"]
+        assert asyncio.run(service.expand_entities(["a"], depth=3))["a"].entities[-1].id == "f"
+
+    def test_truncated_neighbourhoods_are_always_invalidated(self):
+        cache = NeighbourhoodCache(NeighbourhoodCacheConfig())
+        cache.put("a", 2, None, [row("a", "b", "x", "b")], limit=1)
+        cache.put("d", 2, None, [row("d", "e", "x", "e")], limit=5)
+        assert cache.invalidate(["zzz"]) == 1
+        assert cache.get("a", 2) is None
+        assert cache.get("d", 2) is not None
+
+    def test_smaller_limit_is_served_from_cache(self):
+        cache = NeighbourhoodCache(NeighbourhoodCacheConfig())
+        rows = [row("a", "b", "x", "b"), row("a", "c", "x", "c")]
+        cache.put("a", 2, None, rows, limit=2)
+        assert cache.get("a", 2, limit=1) == rows[:1]
+        assert cache.get("a", 2, limit=5) is None
+
+
+class TestCacheBounds:
+    """Test LRU eviction and TTL"""
+
+    def test_lru_eviction(self):
+        cache = NeighbourhoodCache(NeighbourhoodCacheConfig(max_entries=2))
+        for seed in ("a", "b", "c"):
+            cache.put(seed, 1, None, [], limit=10)
+            if seed == "b":
+                cache.get("a", 1)
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == [] and cache.get("c", 1) == []
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = NeighbourhoodCache(NeighbourhoodCacheConfig(ttl_s=-1.0))
+        cache.put("a", 1, None, [], limit=10)
+        assert cache.get("a", 1) is None
+        assert len(cache) == 0
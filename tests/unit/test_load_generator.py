@@ -0,0 +1,199 @@
+"""
+Test Open-Loop Load Generator
+Tests the HDR histogram, arrival schedules, trace replay, latency measured
+from the intended send time under a stalled service, and the local
+provider stubs
+"""
+
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from load_testing.hdr_histogram import HdrHistogram
+from load_testing.open_loop import (
+    RequestSpec,
+    constant_schedule,
+    httpx_sender,
+    load_trace,
+    poisson_schedule,
+    run_open_loop,
+)
+from load_testing.stub_server import LatencyDistribution, StubConfig, create_stub_app
+
+
+class TestHdrHistogram:
+    """Test histogram precision and merging"""
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(10, 1)) + 1 for _ in range(20000))
+        histogram = HdrHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            exact = values[int(percentile / 100 * len(values) + 0.5) - 1]
+            assert abs(histogram.value_at_percentile(percentile) - exact) <= exact * 0.001
+        assert histogram.min == values[0] and histogram.max == values[-1]
+        assert histogram.value_at_percentile(100) == values[-1]
+        assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_and_clamp(self):
+        a, b = HdrHistogram(highest=10_000), HdrHistogram(highest=10_000)
+        a.record(100, count=3)
+        b.record(50_000)
+        a.merge(b)
+        assert a.total_count == 4 and a.clamped_count == 1
+        assert a.max == 10_000 and a.value_at_percentile(50) == 100
+        with pytest.raises(ValueError):
+            a.merge(HdrHistogram(significant_figures=2))
+
+
+class TestSchedules:
+    """Test arrival schedules and trace replay"""
+
+    def test_constant_rate_and_ramp(self):
+        request = RequestSpec(path="/health")
+        steady = list(constant_schedule(request, rate=100, duration_s=1))
+        assert len(steady) == 100 and steady[1].offset_s == pytest.approx(0.01)
+
+        ramped = [a.offset_s for a in constant_schedule(request, rate=100, duration_s=2, ramp_up_s=1)]
+        assert len(ramped) == 150
+        assert sum(1 for t in ramped if t < 0.5) < sum(1 for t in ramped if 0.5 <= t < 1)
+
+    def test_poisson_is_seeded_and_near_rate(self):
+        requests = [RequestSpec(path="/a"), RequestSpec(path="/b")]
+        first = [(a.offset_s, a.request.path) for a in poisson_schedule(requests, 200, 5, seed=3)]
+        second = [(a.offset_s, a.request.path) for a in poisson_schedule(requests, 200, 5, seed=3)]
+        assert first == second
+        assert 900 < len(first) < 1100
+        assert [path for _, path in first[:4]] == ["/a", "/b", "/a", "/b"]
+
+    def test_load_trace(self, tmp_path):
+        trace = tmp_path / "trace.jsonl"
+        trace.write_text("\n".join([
+            json.dumps({"ts": 1000.5, "method": "POST", "path": "/search", "body": {"query": "b"}}),
+            "# comment",
+            json.dumps({"ts": 1000.0, "path": "/health"}),
+        ]))
+        arrivals = load_trace(trace, speed=2)
+        assert [a.offset_s for a in arrivals] == [0.0, 0.25]
+        assert arrivals[1].request.label == "POST /search" and arrivals[1].request.body == {"query": "b"}
+
+        trace.write_text('{"path": "/x"}\n')
+        with pytest.raises(ValueError, match="invalid trace entry"):
+            load_trace(trace)
+
+
+class TestOpenLoop:
+    """Test latency measurement from the intended send time"""
+
+    def test_stall_is_counted_against_queued_requests(self):
+        async def scenario():
+            lock = asyncio.Lock()
+            stalled = False
+
+            async def send(request):
+                nonlocal stalled
+                async with lock:  # one request at a time, like a saturated worker
+                    if not stalled and asyncio.get_running_loop().time() - start > 0.2:
+                        stalled = True
+                        await asyncio.sleep(0.3)
+                    await asyncio.sleep(0.001)
+                return 200
+
+            start = asyncio.get_running_loop().time()
+            return await run_open_loop(constant_schedule(RequestSpec(), rate=100, duration_s=1), send)
+
+        result = asyncio.run(scenario())
+        summary = result.summary()
+        assert summary["completed"] == 100 and summary["status_counts"] == {"200": 100}
+        # A closed-loop client would see one slow request; here every request queued behind the stall is slow
+        assert result.latency.value_at_percentile(50) < 20_000
+        assert result.latency.value_at_percentile(90) > 100_000
+        assert result.service_time.value_at_percentile(50) < result.latency.value_at_percentile(90)
+
+    def test_errors_timeouts_and_dropped(self):
+        async def send(request):
+            if request.path == "/slow":
+                await asyncio.sleep(1)
+            if request.path == "/boom":
+                raise ConnectionError("refused")
+            return 503
+
+        requests = [RequestSpec(path="/ok"), RequestSpec(path="/slow"), RequestSpec(path="/boom")]
+        result = asyncio.run(run_open_loop(constant_schedule(requests, rate=60, duration_s=0.1), send, max_in_flight=4, timeout_s=0.05))
+        summary = result.summary()
+        assert summary["scheduled"] == 6
+        assert summary["errors"] == {"timeout": 2, "ConnectionError": 2}
+        assert summary["status_counts"] == {"503": 2} and summary["successful"] == 0
+        assert set(summary["endpoints"]) == {"GET /ok", "GET /slow", "GET /boom"}
+
+        async def hang(request):
+            await asyncio.sleep(0.2)
+            return 200
+
+        result = asyncio.run(run_open_loop(constant_schedule(RequestSpec(), rate=100, duration_s=0.05), hang, max_in_flight=2))
+        assert (result.completed, result.dropped) == (2, 3)
+
+
+class TestProviderStubs:
+    """Test the local Brave/Wikipedia/Ollama/Qdrant stubs"""
+
+    @pytest.fixture
+    def client(self):
+        latency = {p: LatencyDistribution.parse("fixed:0") for p in ("brave", "wikipedia", "ollama", "qdrant")}
+        return TestClient(create_stub_app(StubConfig(latency=latency, token_delay_ms=0, seed=1)))
+
+    def test_latency_specs(self):
+        rng = random.Random(1)
+        assert LatencyDistribution.parse("fixed:50").sample(rng) == 0.05
+        assert 0.02 <= LatencyDistribution.parse("uniform:20,80").sample(rng) <= 0.08
+        assert LatencyDistribution.parse("lognormal:100,0.5").sample(rng) > 0
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("gamma:1")
+        with pytest.raises(ValueError):
+            LatencyDistribution.parse("normal:1")
+
+    def test_provider_response_shapes(self, client):
+        brave = client.get("/res/v1/web/search", params={"q": "rag", "count": 3}).json()
+        assert len(brave["web"]["results"]) == 3 and brave["web"]["results"][0]["url"].startswith("https://")
+
+        wiki = client.get("/w/api.php", params={"action": "query", "list": "search", "srsearch": "rag", "srlimit": 2}).json()
+        assert len(wiki["query"]["search"]) == 2
+        assert client.get("/api/rest_v1/page/summary/Vector_database").json()["title"] == "Vector database"
+
+        qdrant = client.post("/collections/docs/points/search", json={"vector": [0.1], "limit": 4}).json()
+        assert qdrant["status"] == "ok" and len(qdrant["result"]) == 4
+        assert len(client.post("/collections/docs/points/query", json={"limit": 2}).json()["result"]["points"]) == 2
+
+    def test_ollama_streaming_and_blocking(self, client):
+        blocking = client.post("/api/generate", json={"model": "m", "prompt": "hello world", "stream": False}).json()
+        assert blocking["done"] and "hello" in blocking["response"]
+
+        lines = [json.loads(line) for line in client.post("/api/chat", json={"messages": [{"role": "user", "content": "hi"}]}).text.splitlines()]
+        assert lines[-1]["done"] and not lines[0]["done"]
+        assert "".join(line["message"]["content"] for line in lines).strip().endswith("hi")
+
+    def test_error_injection_and_stats(self):
+        config = StubConfig(error_rate={"brave": 1.0}, seed=1)
+        config.latency = {"brave": LatencyDistribution.parse("fixed:0")}
+        client = TestClient(create_stub_app(config))
+        assert client.get("/res/v1/web/search", params={"q": "x"}).status_code == 503
+        assert client.get("/_stub/stats").json()["providers"]["brave"] == {"requests": 1, "errors": 1, "mean_latency_ms": 0.0}
+
+    def test_open_loop_against_stub_latency(self):
+        async def scenario():
+            config = StubConfig(latency={"brave": LatencyDistribution.parse("fixed:20")})
+            transport = httpx.ASGITransport(app=create_stub_app(config))
+            async with httpx.AsyncClient(transport=transport, base_url="http://stub") as client:
+                schedule = constant_schedule(RequestSpec(path="/res/v1/web/search?q=rag"), rate=100, duration_s=0.2)
+                return await run_open_loop(schedule, httpx_sender(client))
+
+        summary = asyncio.run(scenario()).summary()
+        assert summary["status_counts"] == {"200": 20}
+        assert summary["latency_ms"]["p50"] >= 20
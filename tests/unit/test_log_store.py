@@ -0,0 +1,235 @@
+"""
+Test Log-Structured Store
+Tests the segment log behind MediumTermMemory: put/get/delete, replay,
+torn-tail recovery, expiry cleanup, compaction and in-memory access stats
+"""
+
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from shared.core.log_store import LogStore, LogStoreConfig, segment_name
+from shared.core.memory_manager import MediumTermMemory
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Store in tmp_path; maintenance only when a test asks for it"""
+    return LogStoreConfig(directory=str(tmp_path), maintenance_interval_s=3600, compaction_min_bytes=0)
+
+
+def segment_files(tmp_path):
+    return sorted(p.name for p in tmp_path.glob("*.seg"))
+
+
+class TestLogStore:
+    """Test reads, writes and replay"""
+
+    def test_put_get_delete_and_replay(self, config):
+        async def write():
+            store = LogStore(config)
+            await asyncio.gather(*(store.put(f"k{i}", f"v{i}".encode(), 60) for i in range(100)))
+            await store.put("k1", b"updated", 60)
+            assert await store.delete("k2") is True
+            assert await store.delete("missing") is False
+            assert await store.get("k1") == b"updated"
+            await store.close()
+
+        async def reopen():
+            store = LogStore(config)
+            values = (await store.get("k1"), await store.get("k2"), await store.get("k99"))
+            stats = store.get_stats()
+            await store.close()
+            return values, stats
+
+        asyncio.run(write())
+        values, stats = asyncio.run(reopen())
+        assert values == (b"updated", None, b"v99")
+        assert stats["items"] == 99
+
+    def test_torn_tail_is_truncated(self, config, tmp_path):
+        async def write():
+            store = LogStore(config)
+            await store.put("a", b"1", 60)
+            await store.put("b", b"2", 60)
+            await store.close()
+
+        asyncio.run(write())
+        path = tmp_path / segment_files(tmp_path)[-1]
+        intact = path.stat().st_size
+        with open(path, "ab") as f:
+            f.write(b"\x00garbage")
+
+        async def reopen():
+            store = LogStore(config)
+            values = await store.get("a"), await store.get("b")
+            await store.put("c", b"3", 60)
+            value = await store.get("c")
+            await store.close()
+            return values, value
+
+        values, value = asyncio.run(reopen())
+        assert values == (b"1", b"2") and value == b"3"
+        assert path.stat().st_size > intact
+
+    def test_segments_rotate(self, config, tmp_path):
+        async def scenario():
+            store = LogStore(replace(config, segment_max_bytes=256))
+            for i in range(20):
+                await store.put(f"key{i}", b"x" * 40, 60)
+            values = [await store.get(f"key{i}") for i in range(20)]
+            await store.close()
+            return values
+
+        assert asyncio.run(scenario()) == [b"x" * 40] * 20
+        assert len(segment_files(tmp_path)) > 1
+
+
+class TestMaintenance:
+    """Test expiry cleanup and compaction"""
+
+    def test_cleanup_expired_without_io(self, config):
+        async def scenario():
+            store = LogStore(config)
+            await store.put("short", b"1", 0.01)
+            await store.put("long", b"2", 60)
+            await asyncio.sleep(0.02)
+            removed = store.cleanup_expired()
+            values = await store.get("short"), await store.get("long")
+            await store.close()
+            return removed, values
+
+        assert asyncio.run(scenario()) == (1, (None, b"2"))
+
+    def test_compaction_keeps_live_data_and_survives_reopen(self, config):
+        async def compact():
+            store = LogStore(replace(config, segment_max_bytes=512))
+            for round_ in range(5):
+                await asyncio.gather(*(store.put(f"k{i}", f"{round_}-{i}".encode(), 60) for i in range(20)))
+            await store.delete("k0")
+            before = store.get_stats()
+            assert await store.compact() is True
+            after = store.get_stats()
+            values = [await store.get(f"k{i}") for i in range(20)]
+            await store.close()
+            return before, after, values
+
+        before, after, values = asyncio.run(compact())
+        assert after["size_bytes"] < before["size_bytes"]
+        assert after["garbage_ratio"] == 0
+        assert values == [None] + [f"4-{i}".encode() for i in range(1, 20)]
+
+        async def reopen():
+            store = LogStore(config)
+            values = [await store.get(f"k{i}") for i in range(20)]
+            await store.close()
+            return values
+
+        assert asyncio.run(reopen()) == values
+
+    def test_interrupted_compaction_is_finished_on_open(self, config, tmp_path):
+        async def scenario():
+            store = LogStore(replace(config, segment_max_bytes=128))
+            await store.put("gone", b"old", 60)
+            for i in range(10):
+                await store.put("k", str(i).encode(), 60)
+            await store.delete("gone")
+            await store.put("other", b"x", 60)
+            sealed = store._sealed()
+            first = (tmp_path / segment_name(sealed[0])).read_bytes()
+            await store.compact()
+            await store.close()
+            return sealed, first
+
+        sealed, first = asyncio.run(scenario())
+        # Simulate a crash after the merged segment was published but before old ones were unlinked
+        (tmp_path / segment_name(sealed[0])).write_bytes(first)
+
+        async def reopen():
+            store = LogStore(config)
+            values = await store.get("k"), await store.get("other"), await store.get("gone")
+            await store.close()
+            return values
+
+        assert asyncio.run(reopen()) == (b"9", b"x", None)
+        assert segment_name(sealed[0]) not in segment_files(tmp_path)
+
+
+    def test_read_racing_compaction_follows_merged_segment(self, config):
+        async def scenario():
+            store = LogStore(replace(config, segment_max_bytes=128))
+            await store.put("k", b"live", 60)
+            for i in range(10):
+                await store.put("filler", str(i).encode(), 60)
+            read = store._read
+
+            async def compact_then_read(location):
+                # The key was looked up before this compaction retired its segment
+                await store.compact()
+                return await read(location)
+
+            store._read = compact_then_read
+            value = await store.get("k")
+            await store.close()
+            return value, store.compactions
+
+        assert asyncio.run(scenario()) == (b"live", 1)
+
+    def test_processes_share_one_directory(self, config, tmp_path):
+        async def scenario():
+            # Two stores stand in for two gateway workers; flock treats their fds like separate processes
+            first, second = LogStore(replace(config, segment_max_bytes=256)), LogStore(replace(config, segment_max_bytes=256))
+            await first.put("k", b"first", 60)
+            seen = [await second.get("k")]
+            await second.put("k", b"second", 60)
+            for i in range(20):
+                await second.put(f"filler{i}", b"x" * 16, 60)
+            seen.append(await first.get("k"))
+            await first.delete("filler0")
+            seen.append(await second.get("filler0"))
+            seen.append(await first.get("filler19"))
+            await first.close()
+            await second.close()
+            return seen
+
+        assert asyncio.run(scenario()) == [b"first", b"second", None, b"x" * 16]
+        assert not list(tmp_path.glob("worker-*"))
+
+    def test_compaction_by_another_process_is_replayed(self, config):
+        async def scenario():
+            first, second = LogStore(replace(config, segment_max_bytes=128)), LogStore(replace(config, segment_max_bytes=128))
+            await first.put("k", b"live", 60)
+            for i in range(10):
+                await first.put("filler", str(i).encode(), 60)
+            assert await second.get("k") == b"live"
+            assert await first.compact(force=True)
+            values = await second.get("k"), await second.get("filler")
+            await second.put("k", b"after", 60)
+            values += (await first.get("k"),)
+            await first.close()
+            await second.close()
+            return values, first.compactions
+
+        assert asyncio.run(scenario()) == ((b"live", b"9", b"after"), 1)
+
+
+class TestMediumTermMemory:
+    """Test the MediumTermMemory facade"""
+
+    def test_json_values_and_access_stats(self, tmp_path):
+        async def scenario():
+            memory = MediumTermMemory(config=LogStoreConfig(directory=str(tmp_path)))
+            assert await memory.store("session", {"turns": [1, 2]}) is True
+            first = await memory.retrieve("session")
+            await memory.retrieve("session")
+            info = memory.get_access_info("session")
+            stats = await memory.get_stats()
+            await memory.close()
+            return first, info, stats
+
+        first, info, stats = asyncio.run(scenario())
+        assert first == {"turns": [1, 2]}
+        assert info["access_count"] == 2
+        assert stats["items"] == 1
+        assert not list(tmp_path.glob("*.json"))
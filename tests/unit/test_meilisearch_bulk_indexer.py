@@ -0,0 +1,152 @@
+"""
+Test Pipelined Meilisearch Bulk Indexer
+Tests NDJSON streaming, bounded in-flight batches, adaptive batch sizing,
+task failure handling and resumable checkpoints against a stub Meilisearch
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from shared.core.services.meilisearch_bulk_indexer import (
+    BulkIndexerConfig,
+    BulkIndexError,
+    IndexCheckpoint,
+    MeilisearchBulkIndexer,
+    _parse_duration,
+)
+
+
+class StubMeilisearch:
+    """Enqueues document tasks and finishes them on the next task poll."""
+
+    def __init__(self, seconds_per_document: float = 0.001):
+        self.seconds_per_document = seconds_per_document
+        self.tasks = {}
+        self.documents = []
+        self.batch_sizes = []
+        self.content_types = set()
+        self.max_in_flight = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            self.content_types.add(request.headers["content-type"])
+            lines = [json.loads(line) for line in request.content.split(b"\n") if line]
+            uid = len(self.tasks)
+            self.tasks[uid] = {"uid": uid, "status": "enqueued", "docs": lines}
+            self.batch_sizes.append(len(lines))
+            in_flight = sum(1 for t in self.tasks.values() if t["status"] == "enqueued")
+            self.max_in_flight = max(self.max_in_flight, in_flight)
+            return httpx.Response(202, json={"taskUid": uid, "status": "enqueued"})
+        uids = [int(u) for u in request.url.params["uids"].split(",")]
+        results = []
+        for uid in uids:
+            task = self.tasks[uid]
+            if task["status"] == "enqueued":
+                failed = any(d.get("bad") for d in task["docs"])
+                task["status"] = "failed" if failed else "succeeded"
+                if not failed:
+                    self.documents.extend(task["docs"])
+            results.append({
+                "uid": uid,
+                "batchUid": uid,
+                "status": task["status"],
+                "duration": f"PT{len(task['docs']) * self.seconds_per_document:.6f}S",
+                "details": {"receivedDocuments": len(task["docs"])},
+                "error": {"message": "invalid document"} if task["status"] == "failed" else None,
+            })
+        return httpx.Response(200, json={"results": results})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler), base_url="http://meili")
+
+
+CONFIG = BulkIndexerConfig(max_in_flight=3, initial_batch_size=50, min_batch_size=10, poll_interval_s=0.0)
+
+
+def documents(count: int, bad_at=None):
+    for i in range(count):
+        yield {"id": i, "title": f"doc {i}", "bad": i == bad_at}
+
+
+class TestPipelinedIndexing:
+    """Test streaming and pipelining"""
+
+    def test_indexes_generator_source_in_order(self):
+        stub = StubMeilisearch()
+        result = asyncio.run(MeilisearchBulkIndexer(stub.client(), CONFIG).index_documents(documents(500), "docs"))
+        assert result.documents_processed == 500
+        assert [d["id"] for d in stub.documents] == list(range(500))
+        assert stub.content_types == {"application/x-ndjson"}
+        assert 1 < stub.max_in_flight <= 3
+
+    def test_async_source(self):
+        async def source():
+            for doc in documents(120):
+                yield doc
+
+        stub = StubMeilisearch()
+        result = asyncio.run(MeilisearchBulkIndexer(stub.client(), CONFIG).index_documents(source(), "docs"))
+        assert result.documents_processed == 120
+
+    def test_batch_size_adapts_to_per_document_cost(self):
+        stub = StubMeilisearch(seconds_per_document=0.02)
+        config = BulkIndexerConfig(
+            max_in_flight=3, initial_batch_size=50, min_batch_size=10, poll_interval_s=0.0, target_task_seconds=0.5
+        )
+        indexer = MeilisearchBulkIndexer(stub.client(), config)
+        result = asyncio.run(indexer.index_documents(documents(1000), "docs"))
+        assert stub.batch_sizes[0] == 50
+        assert stub.batch_sizes[-2] == 25
+        assert result.final_batch_size == 25
+        assert result.per_document_ms == pytest.approx(20.0)
+
+    def test_byte_limit_splits_batches(self):
+        stub = StubMeilisearch()
+        config = BulkIndexerConfig(
+            max_in_flight=3, initial_batch_size=50, min_batch_size=10, poll_interval_s=0.0, max_batch_bytes=200
+        )
+        asyncio.run(MeilisearchBulkIndexer(stub.client(), config).index_documents(documents(20), "docs"))
+        assert max(stub.batch_sizes) < 20
+        assert sum(stub.batch_sizes) == 20
+
+
+class TestCheckpoints:
+    """Test failure handling and resuming"""
+
+    def test_failed_batch_stops_and_resume_continues(self, tmp_path):
+        checkpoint = str(tmp_path / "checkpoint.json")
+        stub = StubMeilisearch()
+        config = BulkIndexerConfig(
+            max_in_flight=1, initial_batch_size=50, min_batch_size=10, poll_interval_s=0.0, target_task_seconds=0.05
+        )
+        indexer = MeilisearchBulkIndexer(stub.client(), config)
+        with pytest.raises(BulkIndexError) as error:
+            asyncio.run(indexer.index_documents(documents(300, bad_at=175), "docs", checkpoint_path=checkpoint))
+        assert "invalid document" in str(error.value)
+        assert error.value.result.documents_processed == 150
+        assert IndexCheckpoint(checkpoint).load("docs") == 150
+
+        resumed = asyncio.run(indexer.index_documents(documents(300), "docs", checkpoint_path=checkpoint))
+        assert resumed.documents_skipped == 150
+        assert resumed.documents_processed == 150
+        assert sorted(d["id"] for d in stub.documents) == list(range(300))
+        assert IndexCheckpoint(checkpoint).load("docs") == 0
+
+    def test_checkpoints_are_per_index(self, tmp_path):
+        checkpoint = IndexCheckpoint(str(tmp_path / "checkpoint.json"))
+        checkpoint.save("docs", 10)
+        checkpoint.save("code", 20)
+        checkpoint.clear("docs")
+        assert checkpoint.load("docs") == 0
+        assert checkpoint.load("code") == 20
+
+
+def test_parse_duration():
+    assert _parse_duration("PT0.5S") == 0.5
+    assert _parse_duration("PT1M2.5S") == 62.5
+    assert _parse_duration("PT1H") == 3600
+    assert _parse_duration(None) is None
+    assert _parse_duration("bogus") is None
@@ -0,0 +1,100 @@
+"""
+Test Row-Per-Interaction Session Memory
+Tests batched inserts, recent-N context reads, session stats and bulk
+expiry of MemoryManagerPostgres against an aiosqlite database
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from shared.core.memory_manager_postgres import MemoryManagerPostgres, SessionMemoryConfig
+from shared.models.session_memory import SessionInteraction
+
+
+@pytest.fixture
+def run_with_memory(tmp_path):
+    """Run ``scenario(memory)`` against a fresh database"""
+
+    def run(scenario, **config):
+        async def main():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'memory.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(SessionInteraction.__table__.create)
+            memory = MemoryManagerPostgres(
+                session_factory=async_sessionmaker(engine, expire_on_commit=False),
+                config=SessionMemoryConfig(**config),
+            )
+            try:
+                return await scenario(memory)
+            finally:
+                await memory.stop()
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def ago(**delta):
+    return datetime.now(timezone.utc) - timedelta(**delta)
+
+
+class TestSessionMemory:
+    """Test reads and writes"""
+
+    def test_recent_context_newest_first(self, run_with_memory):
+        async def scenario(memory):
+            for i in range(8):
+                assert await memory.add_to_memory("s1", f"q{i}", f"a{i}", ago(minutes=10 - i))
+            await memory.add_to_memory("s2", "other", "other")
+            return await memory.get_context("s1", limit=3), await memory.get_session_stats("s1")
+
+        context, stats = run_with_memory(scenario)
+        assert [item["query"] for item in context] == ["q7", "q6", "q5"]
+        assert context[0]["timestamp"].endswith("+00:00")
+        assert stats["history_length"] == 8 and stats["exists"] is True
+
+    def test_concurrent_adds_share_one_insert(self, run_with_memory):
+        async def scenario(memory):
+            results = await asyncio.gather(*(memory.add_to_memory(f"s{i % 4}", f"q{i}", "a") for i in range(40)))
+            return results, memory.insert_batches, await memory.get_all_sessions()
+
+        results, batches, sessions = run_with_memory(scenario, flush_window_ms=20)
+        assert all(results)
+        assert batches == 1
+        assert sorted(s["history_length"] for s in sessions) == [10, 10, 10, 10]
+
+    def test_max_batch_flushes_early(self, run_with_memory):
+        async def scenario(memory):
+            await asyncio.gather(*(memory.add_to_memory("s", f"q{i}", "a") for i in range(25)))
+            return memory.insert_batches
+
+        assert run_with_memory(scenario, flush_window_ms=1000, max_batch=10) == 3
+
+    def test_clear_memory(self, run_with_memory):
+        async def scenario(memory):
+            await memory.add_to_memory("s", "q", "a")
+            cleared = await memory.clear_memory("s")
+            return cleared, await memory.clear_memory("s"), await memory.get_context("s")
+
+        assert run_with_memory(scenario) == (True, False, [])
+
+
+class TestExpiry:
+    """Test TTL filtering and the bulk delete job"""
+
+    def test_expired_rows_hidden_and_deleted_in_batches(self, run_with_memory):
+        async def scenario(memory):
+            await asyncio.gather(*(memory.add_to_memory("s", f"old{i}", "a", ago(hours=30)) for i in range(25)))
+            await memory.add_to_memory("s", "fresh", "a")
+            context = await memory.get_context("s", limit=10)
+            deleted = await memory.cleanup_expired_sessions()
+            return context, deleted, await memory.get_session_stats("s")
+
+        context, deleted, stats = run_with_memory(scenario, cleanup_batch_size=10)
+        assert [item["query"] for item in context] == ["fresh"]
+        assert deleted == 25
+        assert stats["history_length"] == 1
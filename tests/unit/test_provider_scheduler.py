@@ -0,0 +1,112 @@
+"""
+Test Latency-Aware Provider Scheduler
+Tests intent-driven provider selection, contribution-based skipping,
+latency-aware skipping, adaptive timeouts and exploration
+"""
+
+import random
+
+import pytest
+
+from services.retrieval.provider_scheduler import (
+    ProviderScheduler,
+    ProviderSchedulerConfig,
+)
+from shared.core.services.multi_lane_orchestrator import QueryIntent
+
+PROVIDERS = ["wiki", "stackexchange", "mdn", "github", "openalex", "arxiv", "youtube", "web", "duckduckgo"]
+TIMEOUTS = {p: 1.0 for p in PROVIDERS}
+
+
+CONFIG = ProviderSchedulerConfig(min_providers=3, max_providers=6, min_samples=10, exploration_rate=0.0)
+# Room for every provider, so only skipping (not the cap) narrows the selection
+UNCAPPED = ProviderSchedulerConfig(min_providers=3, max_providers=9, min_samples=10, exploration_rate=0.0)
+
+
+def simulate(scheduler: ProviderScheduler, contributors, queries: int = 30, latency_ms: float = 100.0) -> None:
+    """Call every provider ``queries`` times; only ``contributors`` reach the top-k."""
+    for _ in range(queries):
+        for provider in PROVIDERS:
+            scheduler.record_call(provider, QueryIntent.TECHNICAL, latency_ms, 1)
+        scheduler.record_contribution(QueryIntent.TECHNICAL, PROVIDERS, contributors)
+
+
+class TestProviderSelection:
+    """Test per-query provider choice"""
+
+    def test_cold_start_uses_intent_priors(self):
+        scheduler = ProviderScheduler(CONFIG, rng=random.Random(7))
+        decision = scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+        assert len(decision.selected) == 6
+        assert set(decision.selected[:3]) == {"stackexchange", "mdn", "github"}
+        assert set(decision.skipped.values()) == {"max_providers"}
+
+    def test_non_contributing_providers_skipped(self):
+        scheduler = ProviderScheduler(UNCAPPED, rng=random.Random(7))
+        simulate(scheduler, contributors=["stackexchange", "mdn", "github", "web"])
+        decision = scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+        assert set(decision.selected) == {"stackexchange", "mdn", "github", "web"}
+        assert all(reason == "low_contribution" for reason in decision.skipped.values())
+
+    def test_min_providers_always_called(self):
+        scheduler = ProviderScheduler(CONFIG, rng=random.Random(7))
+        simulate(scheduler, contributors=[])
+        decision = scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+        assert len(decision.selected) == 3
+
+    def test_slow_provider_skipped_when_budget_too_small(self):
+        scheduler = ProviderScheduler(UNCAPPED, rng=random.Random(7))
+        simulate(scheduler, contributors=PROVIDERS)
+        for _ in range(30):
+            scheduler.record_call("arxiv", QueryIntent.TECHNICAL, 2000.0, 1)
+        decision = scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+        assert decision.skipped == {"arxiv": "too_slow"}
+
+    def test_providers_without_time_left_skipped(self):
+        scheduler = ProviderScheduler(CONFIG, rng=random.Random(7))
+        timeouts = dict(TIMEOUTS, youtube=0.0)
+        decision = scheduler.select("cat videos", PROVIDERS, timeouts, intent=QueryIntent.MULTIMEDIA)
+        assert decision.skipped["youtube"] == "no_time_left"
+
+    def test_exploration_retries_skipped_provider(self):
+        scheduler = ProviderScheduler(
+            ProviderSchedulerConfig(min_providers=3, max_providers=9, min_samples=10, exploration_rate=1.0),
+            rng=random.Random(7),
+        )
+        simulate(scheduler, contributors=["stackexchange", "mdn", "github"])
+        decision = scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+        assert decision.explored in decision.selected
+        assert len(decision.selected) == 4
+
+
+class TestAdaptiveTimeout:
+    """Test latency-driven timeouts"""
+
+    def test_default_until_enough_samples(self):
+        scheduler = ProviderScheduler(CONFIG, rng=random.Random(7))
+        scheduler.record_call("wiki", QueryIntent.SIMPLE, 100.0, 1)
+        assert scheduler.timeout_for("wiki", QueryIntent.SIMPLE, 2.0) == 2.0
+
+    def test_tightened_to_observed_tail(self):
+        scheduler = ProviderScheduler(CONFIG, rng=random.Random(7))
+        for _ in range(20):
+            scheduler.record_call("wiki", QueryIntent.SIMPLE, 400.0, 1)
+        assert scheduler.timeout_for("wiki", QueryIntent.SIMPLE, 2.0) == pytest.approx(0.6)
+        assert scheduler.timeout_for("wiki", QueryIntent.SIMPLE, 0.5) == 0.5
+
+
+class TestSchedulerStats:
+    """Test exported skip and contribution rates"""
+
+    def test_skip_and_contribution_rates(self):
+        scheduler = ProviderScheduler(UNCAPPED, rng=random.Random(7))
+        simulate(scheduler, contributors=["stackexchange"], queries=10)
+        scheduler.select("python async error", PROVIDERS, TIMEOUTS, intent=QueryIntent.TECHNICAL)
+
+        stats = scheduler.get_stats()
+        assert stats["stackexchange"]["contribution_rate"] == 1.0
+        assert stats["stackexchange"]["skip_rate"] == 0.0
+        assert stats["youtube"]["contribution_rate"] == 0.0
+        assert stats["youtube"]["skip_rate"] == round(1 / 11, 4)
+        assert stats["wiki"]["latency_p50_ms"] == 100.0
+        assert stats["wiki"]["by_intent"]["technical"]["calls"] == 10
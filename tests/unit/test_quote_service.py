@@ -0,0 +1,201 @@
+"""
+Test Coalesced Quote Service
+Tests request coalescing, batching, the in-process and Redis quote caches,
+and the Yahoo/CoinGecko multi-symbol fetches
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.feeds.quote_service import FETCH_FAILED, QuoteBatcher, QuoteServiceConfig
+
+
+class FakeUpstream:
+    """Batch quote source recording each call"""
+
+    def __init__(self, known=("AAPL", "MSFT", "NVDA", "TSLA"), delay=0.01, fail=False):
+        self.known = set(known)
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    async def fetch(self, symbols):
+        self.calls.append(list(symbols))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {s: {"symbol": s, "price": len(s)} for s in symbols if s in self.known}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.mget_calls = 0
+
+    def mget(self, keys):
+        self.mget_calls += 1
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipeline:
+            def setex(self, key, ttl, value):
+                redis.data[key] = value
+
+            def execute(self):
+                pass
+
+        return Pipeline()
+
+
+CONFIG = QuoteServiceConfig(window_ms=5, ttl_s=60)
+
+
+class TestCoalescing:
+    """Test coalescing and batching"""
+
+    def test_concurrent_queries_share_one_call(self):
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher("test", upstream.fetch, None, max_batch=50, config=CONFIG)
+
+        async def scenario():
+            return await asyncio.gather(
+                batcher.get(["AAPL", "MSFT"]), batcher.get(["MSFT", "NVDA"]), batcher.get(["AAPL"])
+            )
+
+        first, second, third = asyncio.run(scenario())
+        assert first["AAPL"]["price"] == 4 and second["NVDA"]["symbol"] == "NVDA"
+        assert third == {"AAPL": first["AAPL"]}
+        assert len(upstream.calls) == 1
+        assert sorted(upstream.calls[0]) == ["AAPL", "MSFT", "NVDA"]
+        assert batcher.get_stats()["coalesced"] == 2
+
+    def test_cache_and_unknown_symbols(self):
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher("test", upstream.fetch, None, max_batch=50, config=CONFIG)
+
+        async def scenario():
+            first = await batcher.get(["AAPL", "ZZZZ"])
+            second = await batcher.get(["AAPL", "ZZZZ"])
+            return first, second
+
+        first, second = asyncio.run(scenario())
+        assert first == second
+        assert first["ZZZZ"] is None
+        assert len(upstream.calls) == 1
+        assert batcher.get_stats()["local_hits"] == 2
+
+    def test_max_batch_splits_calls(self):
+        upstream = FakeUpstream(known=[f"S{i}" for i in range(120)])
+        batcher = QuoteBatcher("test", upstream.fetch, None, max_batch=50, config=CONFIG)
+        quotes = asyncio.run(batcher.get([f"S{i}" for i in range(120)]))
+        assert len(quotes) == 120 and all(quotes.values())
+        assert sorted(len(call) for call in upstream.calls) == [20, 50, 50]
+
+    def test_failure_returns_none_and_is_not_cached(self):
+        upstream = FakeUpstream(fail=True)
+        batcher = QuoteBatcher("test", upstream.fetch, None, max_batch=50, config=CONFIG)
+        assert asyncio.run(batcher.get(["AAPL"])) == {"AAPL": None}
+        upstream.fail = False
+        assert asyncio.run(batcher.get(["AAPL"]))["AAPL"]["symbol"] == "AAPL"
+
+    def test_failed_symbols_are_not_cached(self):
+        redis = FakeRedis()
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher("test", upstream.fetch, redis, max_batch=50, config=CONFIG)
+        fetch = upstream.fetch
+
+        async def partly_failing(symbols):
+            quotes = await fetch(symbols)
+            return {**quotes, "MSFT": FETCH_FAILED}
+
+        upstream.fetch = batcher.fetch_batch = partly_failing
+        assert asyncio.run(batcher.get(["AAPL", "MSFT"]))["MSFT"] is None
+        assert "quote:test:MSFT" not in redis.data and "quote:test:AAPL" in redis.data
+        batcher.fetch_batch = fetch
+        assert asyncio.run(batcher.get(["MSFT"]))["MSFT"]["symbol"] == "MSFT"
+
+    def test_disabled_fetches_per_symbol(self):
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher(
+            "test", upstream.fetch, None, max_batch=50, config=QuoteServiceConfig(window_ms=5, ttl_s=60, enabled=False)
+        )
+        asyncio.run(batcher.get(["AAPL", "MSFT"]))
+        assert sorted(upstream.calls) == [["AAPL"], ["MSFT"]]
+
+
+class TestRedisTier:
+    """Test the shared Redis tier behind the in-process cache"""
+
+    def test_redis_hit_skips_upstream(self):
+        redis = FakeRedis()
+        redis.data["quote:test:AAPL"] = json.dumps({"symbol": "AAPL", "price": 1})
+        upstream = FakeUpstream()
+        batcher = QuoteBatcher("test", upstream.fetch, redis, max_batch=50, config=CONFIG)
+        quotes = asyncio.run(batcher.get(["AAPL", "MSFT"]))
+        assert quotes["AAPL"]["price"] == 1
+        assert upstream.calls == [["MSFT"]]
+        assert redis.mget_calls == 1
+        assert json.loads(redis.data["quote:test:MSFT"])["symbol"] == "MSFT"
+
+
+class TestProviders:
+    """Test multi-symbol provider fetches"""
+
+    def test_yahoo_multi_quote(self):
+        from services.feeds.providers.markets_providers import YahooFinanceProvider
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            symbols = request.url.params["symbols"].split(",")
+            return httpx.Response(200, json={"quoteResponse": {"result": [
+                {"symbol": s, "regularMarketPrice": 100.0} for s in symbols
+            ]}})
+
+        provider = YahooFinanceProvider(None)
+        provider.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = asyncio.run(provider.fetch_markets("AAPL vs MSFT"))
+        assert sorted(item.metadata["symbol"] for item in result.items) == ["AAPL", "MSFT"]
+        assert len(requests) == 1
+
+    def test_alphavantage_failures_are_marked(self):
+        from services.feeds.providers.markets_providers import AlphaVantageProvider
+
+        def handler(request):
+            symbol = request.url.params["symbol"]
+            if symbol == "AAPL":
+                return httpx.Response(200, json={"Global Quote": {"05. price": "1.0"}})
+            if symbol == "ZZZZ":
+                return httpx.Response(200, json={"Global Quote": {}})
+            if symbol == "MSFT":
+                return httpx.Response(200, json={"Note": "API call frequency exceeded"})
+            return httpx.Response(503)
+
+        provider = AlphaVantageProvider("key", None)
+        provider.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        quotes = asyncio.run(provider._fetch_quotes(["AAPL", "ZZZZ", "MSFT", "NVDA"]))
+        assert quotes == {"AAPL": {"05. price": "1.0"}, "MSFT": FETCH_FAILED, "NVDA": FETCH_FAILED}
+        with pytest.raises(RuntimeError, match="frequency"):
+            asyncio.run(provider._fetch_quotes(["MSFT"]))
+
+    def test_coingecko_ids_are_batched_and_aliased(self):
+        from services.feeds.providers.markets_providers import CoinGeckoProvider
+
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            ids = request.url.params["ids"].split(",")
+            return httpx.Response(200, json={i: {"usd": 1.0, "usd_24h_change": 0.5} for i in ids})
+
+        provider = CoinGeckoProvider(None, None)
+        provider.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        result = asyncio.run(provider.fetch_markets("btc and eth"))
+        assert sorted(item.metadata["symbol"] for item in result.items) == ["bitcoin", "ethereum"]
+        assert len(requests) == 1
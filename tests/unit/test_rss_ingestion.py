@@ -0,0 +1,169 @@
+"""
+Test RSS Ingestion
+Tests date parsing, streaming RSS/Atom parsing, the time-ordered item index,
+conditional-GET polling and the network-free RSS provider query path
+"""
+
+import asyncio
+import calendar
+
+import httpx
+import pytest
+
+from services.feeds.rss_ingestion import (
+    FeedItemIndex,
+    RSSFeedPoller,
+    RSSIngestionConfig,
+    parse_feed,
+    parse_feed_date,
+    url_hash,
+)
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel><title>Example</title>
+<item><title>Older story</title><link>https://example.com/a</link><description>Markets rally</description>
+<pubDate>Mon, 06 Oct 2025 10:00:00 GMT</pubDate></item>
+<item><title>Newer story</title><link>https://example.com/b</link><description>Elections update</description>
+<pubDate>Tue, 07 Oct 2025 09:30:00 +0200</pubDate><dc:creator>Jane Doe</dc:creator></item>
+<item><title>No link</title></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>
+<entry><title>Atom entry</title><link rel="alternate" href="https://example.org/x"/>
+<summary>Short</summary><content>Long content</content><updated>2025-10-07T08:00:00Z</updated>
+<author><name>Alex</name></author></entry>
+</feed>"""
+
+
+def ts(*args):
+    return float(calendar.timegm(args + (0, 0, 0)))
+
+
+class TestDates:
+    """Test RFC-822 and ISO-8601 parsing"""
+
+    @pytest.mark.parametrize("value,expected", [
+        ("Mon, 06 Oct 2025 10:00:00 GMT", ts(2025, 10, 6, 10, 0, 0)),
+        ("Tue, 07 Oct 2025 09:30:00 +0200", ts(2025, 10, 7, 7, 30, 0)),
+        ("7 Oct 25 09:30 EST", ts(2025, 10, 7, 14, 30, 0)),
+        ("2025-10-07T08:00:00Z", ts(2025, 10, 7, 8, 0, 0)),
+        ("2025-10-07T10:00:00+02:00", ts(2025, 10, 7, 8, 0, 0)),
+    ])
+    def test_parses(self, value, expected):
+        assert parse_feed_date(value) == expected
+
+    @pytest.mark.parametrize("value", [None, "", "yesterday", "Mon, 99 Foo 2025 10:00:00 GMT"])
+    def test_unparseable(self, value):
+        assert parse_feed_date(value) is None
+
+
+class TestParsing:
+    """Test streaming feed parsing"""
+
+    def test_rss_in_small_chunks(self):
+        chunks = [RSS[i:i + 17] for i in range(0, len(RSS), 17)]
+        entries = parse_feed(chunks, "example")
+        assert [e.title for e in entries] == ["Older story", "Newer story"]
+        assert entries[1].author == "Jane Doe"
+        assert entries[1].id == url_hash("https://example.com/b")
+
+    def test_atom(self):
+        (entry,) = parse_feed([ATOM], "atom")
+        assert entry.url == "https://example.org/x"
+        assert entry.summary == "Short"
+        assert entry.author == "Alex"
+        assert entry.published_ts == ts(2025, 10, 7, 8, 0, 0)
+
+
+class TestIndex:
+    """Test the time-ordered item index"""
+
+    def test_newest_first_dedupe_and_bound(self):
+        index = FeedItemIndex(max_items=2)
+        entries = parse_feed([RSS], "example") + parse_feed([ATOM], "atom")
+        assert index.add(entries) == 3
+        assert index.add(parse_feed([RSS], "example")) == 0
+        assert [e.title for e in index.search()] == ["Atom entry", "Newer story"]
+        assert len(index) == 2
+
+    def test_search_and_prune(self):
+        index = FeedItemIndex()
+        index.add(parse_feed([RSS], "example"))
+        assert [e.title for e in index.search("ELECTIONS")] == ["Newer story"]
+        assert index.prune(ts(2025, 10, 7, 0, 0, 0)) == 1
+        assert [e.title for e in index.search()] == ["Newer story"]
+
+
+class StubFeedServer:
+    """Serves one feed, honouring If-None-Match"""
+
+    def __init__(self):
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"', "Last-Modified": "Tue, 07 Oct 2025 10:00:00 GMT"})
+
+
+def make_poller(server: StubFeedServer) -> RSSFeedPoller:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server.handler))
+    config = RSSIngestionConfig(max_item_age_s=float("inf"))
+    return RSSFeedPoller({"example": "https://example.com/feed"}, config, client)
+
+
+class TestPoller:
+    """Test conditional-GET polling"""
+
+    def test_conditional_get(self):
+        server = StubFeedServer()
+        poller = make_poller(server)
+        asyncio.run(poller.poll_feed("example"))
+        asyncio.run(poller.poll_feed("example"))
+        assert "if-none-match" not in server.requests[0].headers
+        assert server.requests[1].headers["if-modified-since"] == "Tue, 07 Oct 2025 10:00:00 GMT"
+        stats = poller.get_stats()["feeds"]["example"]
+        assert stats["not_modified"] == 1
+        assert stats["items_added"] == 2
+
+    def test_errors_back_off(self):
+        poller = RSSFeedPoller(
+            {"down": "https://down.example"},
+            RSSIngestionConfig(poll_interval_s=10),
+            httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(503))),
+        )
+        asyncio.run(poller.poll_feed("down"))
+        state = poller.states["down"]
+        assert state.consecutive_errors == 1
+        assert state.last_error == "HTTP 503"
+
+    def test_provider_reads_index_without_network(self):
+        from services.feeds.providers.news_providers import RSSProvider
+
+        server = StubFeedServer()
+        poller = make_poller(server)
+        poller.config.enabled = False
+        asyncio.run(poller.poll_feed("example"))
+        requests_before = len(server.requests)
+
+        result = asyncio.run(RSSProvider(None, poller).fetch_news("story"))
+        assert [item.title for item in result.items] == ["Newer story", "Older story"]
+        assert result.items[0].published_at.isoformat() == "2025-10-07T07:30:00+00:00"
+        assert result.items[0].attribution["article"]["author"] == "Jane Doe"
+        assert len(server.requests) == requests_before
+        assert result.cache_hit is False
+
+    def test_provider_filters_by_query_and_caps_results(self):
+        from services.feeds.providers.news_providers import RSSProvider
+
+        poller = make_poller(StubFeedServer())
+        poller.config.enabled = False
+        poller.config.max_results = 1
+        asyncio.run(poller.poll_feed("example"))
+        provider = RSSProvider(None, poller)
+
+        assert [item.title for item in asyncio.run(provider.fetch_news("")).items] == ["Newer story"]
+        assert asyncio.run(provider.fetch_news("unrelated topic")).items == []
+        assert [item.title for item in asyncio.run(provider.fetch_news("elections story", {"max_items": 5})).items] == ["Newer story"]
@@ -0,0 +1,138 @@
+"""
+Test Sampling Profiler
+Tests per-request attribution of samples, event-loop stall capture,
+on-demand profile windows, the bounded stack table and the debug endpoints
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from shared.core.sampling_profiler import (
+    STACK_TABLE_FULL,
+    ProfilerConfig,
+    SamplingProfiler,
+    create_profile_router,
+    profile_endpoints_enabled,
+)
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def busy_request(profiler, endpoint, trace_id, seconds):
+    task = profiler.tag_request(endpoint, trace_id)
+    try:
+        spin(seconds)
+        await asyncio.sleep(0)
+    finally:
+        profiler.untag(task)
+
+
+class TestSampling:
+    """Test stack sampling and attribution"""
+
+    def test_samples_attributed_to_endpoint_and_trace(self):
+        profiler = SamplingProfiler(ProfilerConfig(hz=200))
+
+        async def run():
+            profiler.start()
+            await busy_request(profiler, "GET /search", "trace-1", 0.15)
+            await busy_request(profiler, "POST /answer", "trace-2", 0.15)
+            profiler.stop()
+
+        asyncio.run(run())
+        folded = profiler.folded()
+        assert "GET /search;loop;" in folded and "POST /answer;loop;" in folded
+        assert "spin (" in folded
+        assert profiler.top_traces()["GET /search"][0][0] == "trace-1"
+        assert not profiler.running
+
+    def test_loop_stall_captures_blocking_stack(self):
+        profiler = SamplingProfiler(ProfilerConfig(hz=200, stall_threshold_ms=50))
+
+        async def run():
+            profiler.start()
+            await asyncio.sleep(0.05)
+            task = profiler.tag_request("GET /slow", "trace-s")
+            time.sleep(0.2)
+            profiler.untag(task)
+            await asyncio.sleep(0.05)
+            profiler.stop()
+
+        asyncio.run(run())
+        stalls = profiler.get_stalls()
+        assert profiler.stalls_total == 1 and len(stalls) == 1
+        stall = stalls[0]
+        assert stall["endpoint"] == "GET /slow" and stall["trace_id"] == "trace-s"
+        assert 150 <= stall["duration_ms"] < 1000 and not stall["ongoing"]
+        assert any("run (" in s["stack"] for s in stall["stacks"])
+
+    def test_window_filters_trace_and_stack_table_is_bounded(self):
+        profiler = SamplingProfiler(ProfilerConfig(enabled=True, hz=200, max_stacks=1))
+
+        async def run():
+            capture = asyncio.ensure_future(profiler.capture(0.4, group="trace", trace_id="wanted"))
+            await asyncio.sleep(0.01)
+            await busy_request(profiler, "GET /a", "other", 0.1)
+            await busy_request(profiler, "GET /a", "wanted", 0.1)
+            return await capture
+
+        window = asyncio.run(run())
+        assert window.samples > 0
+        assert all(line.startswith("GET /a;trace=wanted;loop") for line in window.stacks)
+        # Started on demand for the window and stopped again afterwards
+        assert not profiler.running
+        assert len(profiler._stacks) == 2 and profiler.dropped_stacks > 0
+        assert profiler.folded().count(STACK_TABLE_FULL) == 1
+
+    def test_disabled_profiler_never_samples_on_demand(self):
+        profiler = SamplingProfiler(ProfilerConfig(enabled=False))
+        with pytest.raises(RuntimeError, match="disabled"):
+            asyncio.run(profiler.capture(0.01))
+        assert not profiler.running
+
+
+HEADERS = {"X-Debug-Token": "secret"}
+
+
+class TestProfileRouter:
+    """Test the /_debug/profile endpoints"""
+
+    def make_client(self, **config):
+        config = {"enabled": True, "debug_token": "secret", **config}
+        app = FastAPI()
+        app.include_router(create_profile_router(SamplingProfiler(ProfilerConfig(**config))))
+        return TestClient(app)
+
+    def test_folded_window_and_json(self):
+        client = self.make_client(hz=200)
+        response = client.get("/_debug/profile", params={"seconds": 0.1}, headers=HEADERS)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+
+        data = client.get("/_debug/profile", params={"seconds": 0.1, "format": "json", "group": "none"}, headers=HEADERS).json()
+        assert "stats" in data and isinstance(data["stacks"], list)
+        assert client.get("/_debug/profile/stalls", headers=HEADERS).json()["stalls"] == []
+
+    def test_token_and_not_running(self):
+        client = self.make_client()
+        assert client.get("/_debug/profile", params={"seconds": 0}).status_code == 403
+        assert client.get("/_debug/profile", params={"seconds": 0}, headers={"X-Debug-Token": "wrong"}).status_code == 403
+        assert client.get("/_debug/profile", params={"seconds": 0}, headers=HEADERS).status_code == 409
+        assert client.get("/_debug/profile", params={"group": "bogus"}, headers=HEADERS).status_code == 400
+
+    def test_no_token_or_disabled_denies_access(self):
+        no_token = self.make_client(debug_token=None)
+        assert no_token.get("/_debug/profile/stalls").status_code == 403
+        assert no_token.get("/_debug/profile", params={"seconds": 0.1}).status_code == 403
+        disabled = self.make_client(enabled=False)
+        assert disabled.get("/_debug/profile", params={"seconds": 0.1}, headers=HEADERS).status_code == 409
+        assert not profile_endpoints_enabled(SamplingProfiler(ProfilerConfig(enabled=True)))
+        assert profile_endpoints_enabled(SamplingProfiler(ProfilerConfig(enabled=True, debug_token="secret")))
@@ -0,0 +1,157 @@
+"""
+Test Gateway Serialization Layer
+Tests fast JSON encoding, SSE frame encoding and compact prompt context
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from services.gateway import serialization
+from services.gateway.serialization import (
+    FastJSONResponse,
+    dumps,
+    dumps_bytes,
+    encode_sse_event,
+    format_prompt_context,
+    loads,
+)
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Item(BaseModel):
+    name: str
+
+
+PAYLOAD = {
+    "query": "naïve café",
+    "when": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "color": Color.RED,
+    "point": Point(1, 2),
+    "item": Item(name="x"),
+    "tags": {"a"},
+    "price": Decimal("1.5"),
+    "nested": {"scores": [0.5, 1, None, True]},
+}
+
+
+class TestJSONEncoding:
+    """Test the encoder and its stdlib fallback agree"""
+
+    def test_round_trip(self):
+        decoded = loads(dumps_bytes(PAYLOAD))
+        assert decoded["query"] == "naïve café"
+        assert decoded["when"].startswith("2025-01-02T03:04:05")
+        assert decoded["color"] == "red"
+        assert decoded["point"] == {"x": 1, "y": 2}
+        assert decoded["item"] == {"name": "x"}
+        assert decoded["tags"] == ["a"]
+        assert decoded["price"] == 1.5
+        assert decoded["nested"] == {"scores": [0.5, 1, None, True]}
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        fast = loads(dumps_bytes(PAYLOAD))
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+        fallback = json.loads(dumps_bytes(PAYLOAD))
+        fast["when"] = fast["when"][:19]
+        fallback["when"] = fallback["when"][:19]
+        assert fast == fallback
+
+    def test_non_finite_floats_encode_as_null_on_both_paths(self, monkeypatch):
+        payload = {"scores": [float("nan"), float("inf"), 1.5], "point": Point(float("-inf"), 2)}
+        fast = dumps_bytes(payload)
+        monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+        fallback = dumps_bytes(payload)
+        assert fast == fallback
+        assert json.loads(fallback) == {"scores": [None, None, 1.5], "point": {"x": None, "y": 2}}
+
+    def test_output_is_compact_and_utf8(self):
+        assert dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert "é".encode("utf-8") in dumps_bytes({"q": "é"})
+
+    def test_oversized_int_falls_back_to_stdlib(self):
+        assert loads(dumps_bytes({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+    def test_unserializable_raises_type_error(self):
+        with pytest.raises(TypeError):
+            dumps_bytes({"obj": object()})
+
+
+class TestFastJSONResponse:
+    """Test the response class on a FastAPI app"""
+
+    def test_default_response_class(self):
+        app = FastAPI(default_response_class=FastJSONResponse)
+
+        @app.get("/search")
+        async def search():
+            return {"query": "q", "results": [{"title": "t", "score": 0.9}]}
+
+        @app.get("/explicit")
+        async def explicit():
+            return FastJSONResponse(content={"when": PAYLOAD["when"]}, status_code=202)
+
+        client = TestClient(app)
+        response = client.get("/search")
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"query": "q", "results": [{"title": "t", "score": 0.9}]}
+
+        explicit_response = client.get("/explicit")
+        assert explicit_response.status_code == 202
+        assert explicit_response.json()["when"].startswith("2025-01-02T03:04:05")
+
+
+class TestSSEEncoding:
+    """Test SSE frames"""
+
+    def test_frame_layout(self):
+        frame = encode_sse_event("content_chunk", {"text": "hi"}, event_id="trace-1", timestamp="t0")
+        assert frame == b'event: content_chunk\ndata: {"text":"hi"}\nid: trace-1\ntimestamp: t0\n\n'
+
+    def test_frame_without_optional_fields(self):
+        assert encode_sse_event("heartbeat", {}) == b"event: heartbeat\ndata: {}\n\n"
+
+    def test_streaming_manager_uses_encoded_frames(self):
+        from services.gateway.streaming_manager import StreamEvent, StreamEventType, StreamingManager
+
+        event = StreamEvent(event_type=StreamEventType.COMPLETE, data={"done": True}, trace_id="abc")
+        frame = StreamingManager()._format_sse_event(event)
+        assert isinstance(frame, bytes)
+        assert frame.startswith(b'event: complete\ndata: {"done":true}\nid: abc\n')
+        assert frame.endswith(b"\n\n")
+
+
+class TestPromptContext:
+    """Test compact prompt context"""
+
+    SOURCES = [
+        {"title": "RAG", "url": "https://a.org/rag", "domain": "a.org", "snippet": "Grounded   answers\nfrom sources."},
+        {"title": "Untitled", "url": "https://b.org", "domain": "", "snippet": ""},
+    ]
+
+    def test_numbered_compact_blocks(self):
+        text = format_prompt_context(self.SOURCES)
+        assert text == "[1] RAG | a.org | https://a.org/rag\nGrounded answers from sources.\n\n[2] Untitled | https://b.org"
+
+    def test_smaller_than_indented_json(self):
+        assert len(format_prompt_context(self.SOURCES)) < len(json.dumps(self.SOURCES, indent=2)) / 2
+
+    def test_snippet_truncated(self):
+        text = format_prompt_context([{"title": "t", "snippet": "x" * 50}], max_snippet_chars=10)
+        assert text.endswith("x" * 10 + "...")
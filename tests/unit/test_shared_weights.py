@@ -0,0 +1,74 @@
+"""
+Test Shared Model Weight Store
+Tests one-time cross-process publishing of exported weights and the
+per-process model instance cache
+"""
+
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from shared.embeddings import shared_weights
+from shared.embeddings.shared_weights import (
+    SharedWeightsConfig,
+    SharedWeightStore,
+    canonical_model_name,
+    get_shared_sentence_transformer,
+)
+
+
+def _slow_export(directory: Path) -> None:
+    time.sleep(0.2)
+    with open(directory.parent / "exports.log", "a") as log:
+        log.write("export\n")
+    (directory / "weights.pt").write_text("weights")
+
+
+def _publish(store_dir: str) -> None:
+    SharedWeightStore(store_dir).ensure("org/model", _slow_export)
+
+
+class TestSharedWeightStore:
+    """Test export publishing"""
+
+    def test_concurrent_processes_export_once(self, tmp_path):
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_publish, args=(str(tmp_path),)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+        assert all(p.exitcode == 0 for p in processes)
+        assert (tmp_path / "exports.log").read_text().count("export") == 1
+        assert SharedWeightStore(str(tmp_path)).is_ready("org/model")
+
+    def test_failed_export_is_not_published(self, tmp_path):
+        def broken(directory):
+            raise RuntimeError("disk full")
+
+        store = SharedWeightStore(str(tmp_path))
+        with pytest.raises(RuntimeError):
+            store.ensure("org/model", broken)
+        assert not store.is_ready("org/model")
+
+
+class TestProcessCache:
+    """Test per-process model sharing"""
+
+    def test_callers_share_one_instance(self, tmp_path, monkeypatch):
+        loads = []
+        monkeypatch.setattr(shared_weights, "_models", {})
+        monkeypatch.setattr(shared_weights, "_export_sentence_transformer", lambda name: lambda d: None)
+        monkeypatch.setattr(shared_weights, "_load_mapped", lambda d: loads.append(d) or object())
+        config = SharedWeightsConfig(store_dir=str(tmp_path))
+
+        first = get_shared_sentence_transformer("all-MiniLM-L6-v2", config=config)
+        second = get_shared_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2", config=config)
+        assert first is second
+        assert loads == [tmp_path / "sentence-transformers_all-MiniLM-L6-v2"]
+
+    def test_canonical_model_name(self):
+        assert canonical_model_name("all-MiniLM-L6-v2") == "sentence-transformers/all-MiniLM-L6-v2"
+        assert canonical_model_name("BAAI/bge-small-en") == "BAAI/bge-small-en"
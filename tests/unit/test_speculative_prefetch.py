@@ -0,0 +1,243 @@
+"""
+Test Speculative Retrieval Prefetch
+Tests draft matching by edit distance, claim semantics, superseding of
+in-flight prefetches, merging into the live search and the waste /
+TTFT-saved accounting
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from shared.core import speculative_prefetch
+from shared.core.speculative_prefetch import (
+    PrefetchConfig,
+    PrefetchEntry,
+    SpeculativePrefetchCache,
+    SpeculativePrefetcher,
+    edit_distance,
+    merge_prefetched,
+    normalize_query,
+    search_with_prefetch,
+)
+
+RESULTS = [{
+    "title": "Rust ownership",
+    "url": "https://doc.rust-lang.org/book/",
+    "content": "Each value in Rust has an owner, and there can only be one owner at a time.",
+    "relevance_score": 0.9,
+}]
+
+
+def make_cache(**overrides):
+    return SpeculativePrefetchCache(PrefetchConfig(enabled=True, **overrides))
+
+
+class TestMatching:
+    """Test query normalization and edit distance"""
+
+    def test_normalize_and_bounded_distance(self):
+        assert normalize_query("  What is  Rust ownership?? ") == "what is rust ownership"
+        assert edit_distance("rust ownership", "rust ownreship", 3) == 2
+        assert edit_distance("kitten", "sitting", 5) == 3
+        # Beyond the limit the exact distance is not computed
+        assert edit_distance("rust", "python generators", 3) == 4
+
+
+class TestPrefetchCache:
+    """Test storing and claiming prefetched entries"""
+
+    def test_claim_closest_entry_and_consume_session(self):
+        cache = make_cache()
+
+        async def run():
+            await cache.put("s1", PrefetchEntry("rust ownersh", normalize_query("rust ownersh"), [], ["vector"], 40.0))
+            await cache.put("s1", PrefetchEntry("rust ownership", normalize_query("rust ownership"), RESULTS, ["vector"], 120.0))
+            hit = await cache.claim("s1", "Rust ownership?")
+            again = await cache.claim("s1", "Rust ownership?")
+            return hit, again
+
+        hit, again = asyncio.run(run())
+        assert hit.distance == 0 and hit.entry.results == RESULTS and hit.saved_ms == 120.0
+        assert again is None
+
+    def test_empty_or_short_entry_is_a_miss(self):
+        cache = make_cache()
+        short = [{"title": "Rust", "url": "https://a.org/rust", "content": "Rust", "relevance_score": 0.9}]
+
+        async def run():
+            claims = []
+            for session_id, results in (("s1", []), ("s2", short)):
+                await cache.put(session_id, PrefetchEntry("rust ownership", "rust ownership", results, ["vector"], 50.0))
+                claims.append(await cache.claim(session_id, "rust ownership"))
+            return claims, await cache.get_stats()
+
+        claims, stats = asyncio.run(run())
+        assert claims == [None, None]
+        assert stats["misses"] == 2 and stats["hits"] == 0
+
+    def test_far_query_misses_and_disabled_never_claims(self):
+        cache = make_cache()
+        disabled = SpeculativePrefetchCache(PrefetchConfig(enabled=False))
+
+        async def run():
+            entry = PrefetchEntry("rust ownership", "rust ownership", RESULTS, ["vector"], 50.0)
+            await cache.put("s1", entry)
+            await disabled.put("s1", entry)
+            misses = await cache.claim("s1", "rust lifetimes"), await disabled.claim("s1", "rust ownership")
+            return misses, await cache.get_stats()
+
+        misses, stats = asyncio.run(run())
+        assert misses == (None, None)
+        assert stats["misses"] == 1 and stats["hits"] == 0
+
+
+class TestPrefetcher:
+    """Test scheduling, superseding and accounting"""
+
+    def test_newer_draft_cancels_older_prefetch(self):
+        cache = make_cache(min_query_chars=4)
+        fetched = []
+
+        async def fetch(query, lanes):
+            fetched.append(query)
+            await asyncio.sleep(0.05)
+            return RESULTS
+
+        prefetcher = SpeculativePrefetcher(cache, fetch)
+
+        async def run():
+            first = prefetcher.schedule("s1", "rust owner")
+            assert prefetcher.schedule("s1", "Rust owner ") is first
+            await asyncio.sleep(0)
+            second = prefetcher.schedule("s1", "rust ownership")
+            assert prefetcher.schedule("s1", "ru") is None and prefetcher.schedule(None, "rust ownership") is None
+            await asyncio.gather(first, second, return_exceptions=True)
+            hit = await cache.claim("s1", "rust ownership")
+            await cache.record_use(hit, used=1, waited_ms=0.0)
+            return first, hit, await cache.get_stats()
+
+        first, hit, stats = asyncio.run(run())
+        assert first.cancelled() and fetched == ["rust owner", "rust ownership"]
+        assert hit is not None and hit.saved_ms >= 40
+        assert stats["started"] == 2 and stats["cancelled"] == 1 and stats["stored"] == 1
+        assert stats["hits"] == 1 and stats["waste_ratio"] == 0.5
+        assert stats["ttft_saved_ms_total"] >= 40
+
+    def test_failed_fetch_is_counted_as_waste(self):
+        cache = make_cache(fetch_timeout_s=0.01)
+
+        async def slow_fetch(query, lanes):
+            await asyncio.sleep(1)
+
+        async def run():
+            await SpeculativePrefetcher(cache, slow_fetch).schedule("s1", "rust ownership")
+            return await cache.claim("s1", "rust ownership"), await cache.get_stats()
+
+        hit, stats = asyncio.run(run())
+        assert hit is None
+        assert stats["failed"] == 1 and stats["waste_ratio"] == 1.0 and stats["misses"] == 0
+
+
+
+@dataclass
+class Result:
+    url: str
+    relevance_score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Response:
+    results: List[Result]
+    total_results: int = 0
+    providers_used: List[str] = field(default_factory=list)
+
+
+def prefetched_response(hit, k=10, min_chars=1):
+    """Stand-in for to_search_response, which needs the provider config to import"""
+    results = [
+        Result(item["url"], item["relevance_score"], {"prefetched": True})
+        for item in hit.entry.results
+        if len(item["content"]) >= min_chars
+    ][:k]
+    return Response(results, len(results), ["cache"])
+
+
+class TestSearchWithPrefetch:
+    """Test merging a claimed hit into the live search"""
+
+    def claimed(self, cache, fetch_ms=200.0):
+        async def run():
+            entry = PrefetchEntry("rust ownership", "rust ownership", RESULTS, list(cache.config.lanes), fetch_ms)
+            await cache.put("s1", entry)
+            return await cache.claim("s1", "rust ownership")
+
+        return asyncio.run(run())
+
+    def test_merge_dedupes_by_url_and_keeps_the_best(self):
+        live = Response([Result("https://a.org/1", 0.95), Result("https://doc.rust-lang.org/book/", 0.5)], 2, ["wikipedia"])
+        prefetched = Response([Result("https://doc.rust-lang.org/book/", 0.9, {"prefetched": True}), Result("https://b.org/2", 0.7, {"prefetched": True})], 2, ["cache"])
+
+        merged = merge_prefetched(live, prefetched, k=2)
+        assert [r.url for r in merged.results] == ["https://a.org/1", "https://b.org/2"]
+        assert merged.providers_used == ["wikipedia", "cache"] and merged.total_results == 2
+        assert merge_prefetched(live, Response([]), k=5).providers_used == ["wikipedia"]
+
+    def test_live_lanes_still_run_and_unused_hits_are_not_counted(self, monkeypatch):
+        monkeypatch.setattr(speculative_prefetch, "to_search_response", prefetched_response)
+        cache = make_cache()
+        hit = self.claimed(cache)
+        searched = []
+
+        async def search(skip_providers):
+            searched.append(skip_providers)
+            return Response([Result("https://a.org/1", 0.95), Result("https://doc.rust-lang.org/book/", 0.99)])
+
+        async def run():
+            return await search_with_prefetch(hit, search, k=10, cache=cache), await cache.get_stats()
+
+        merged, stats = asyncio.run(run())
+        # The live search skips the providers the prefetch covered
+        assert searched == [["wiki", "stackexchange", "mdn"]]
+        # The live copy of the shared URL wins, so the prefetch contributed nothing
+        assert [r.url for r in merged.results] == ["https://doc.rust-lang.org/book/", "https://a.org/1"]
+        assert stats["hits"] == 0 and stats["unused"] == 1 and stats["ttft_saved_ms_total"] == 0
+
+    def test_used_hit_counts_time_beyond_the_live_wait(self, monkeypatch):
+        monkeypatch.setattr(speculative_prefetch, "to_search_response", prefetched_response)
+        cache = make_cache()
+        hit = self.claimed(cache, fetch_ms=200.0)
+
+        async def search(skip_providers):
+            await asyncio.sleep(0.05)
+            return Response([Result("https://a.org/1", 0.5)])
+
+        async def run():
+            return await search_with_prefetch(hit, search, k=1, cache=cache), await cache.get_stats()
+
+        merged, stats = asyncio.run(run())
+        assert [r.url for r in merged.results] == ["https://doc.rust-lang.org/book/"]
+        assert stats["hits"] == 1 and stats["unused"] == 0
+        assert 0 < stats["ttft_saved_ms_total"] <= 150
+
+    def test_failed_search_answers_from_the_prefetch(self, monkeypatch):
+        monkeypatch.setattr(speculative_prefetch, "to_search_response", prefetched_response)
+        cache = make_cache()
+        hit = self.claimed(cache)
+
+        async def search(skip_providers):
+            raise RuntimeError("providers down")
+
+        merged = asyncio.run(search_with_prefetch(hit, search, cache=cache))
+        assert [r.url for r in merged.results] == ["https://doc.rust-lang.org/book/"]
+
+    def test_without_a_hit_nothing_is_skipped(self):
+        searched = []
+
+        async def search(skip_providers):
+            searched.append(skip_providers)
+            return Response([])
+
+        asyncio.run(search_with_prefetch(None, search, cache=make_cache()))
+        assert searched == [()]
@@ -0,0 +1,202 @@
+"""
+Test Startup Orchestration
+Tests concurrent dependency-ordered warmup, per-capability readiness,
+the 503 capability gate, the cold-start report and lazy module imports
+"""
+
+import asyncio
+import sys
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from shared.core.lazy_imports import get_import_timings, lazy_module, module_available
+from shared.core.startup_orchestrator import CapabilityDisabled, StartupConfig, StartupOrchestrator, require_capability
+
+
+def sleeper(delay, log=None, name=None, fail=False):
+    async def run():
+        if log is not None:
+            log.append(f"start:{name}")
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(f"{name} broke")
+        if log is not None:
+            log.append(f"end:{name}")
+    return run
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+class TestOrchestrator:
+    """Test the warmup graph"""
+
+    def test_independent_tasks_overlap_and_dependencies_wait(self):
+        log = []
+        startup = StartupOrchestrator(StartupConfig())
+        startup.add_task("db", sleeper(0.05, log, "db"), provides=("graph",))
+        startup.add_task("model", sleeper(0.05, log, "model"), provides=("vector",))
+        startup.add_task("hf", sleeper(0.02, log, "hf"), depends_on=("model",), provides=("hf",))
+
+        report = asyncio.run(startup.run())
+        assert log[:2] == ["start:db", "start:model"]
+        assert log.index("start:hf") > log.index("end:model")
+        assert report["warmup_s"] < report["sequential_s"]
+        assert report["critical_path"] == ["model", "hf"]
+        assert report["readiness"] == {"status": "ready", "capabilities": {"graph": "ready", "hf": "ready", "vector": "ready"}}
+
+    def test_failure_skips_dependents_and_reports_partial(self):
+        startup = StartupOrchestrator(StartupConfig(task_timeout_s=0.05))
+        startup.add_task("model", sleeper(0, name="model", fail=True), provides=("vector",))
+        startup.add_task("hf", sleeper(0), depends_on=("model",), provides=("hf",))
+        startup.add_task("slow", sleeper(1), provides=("cache",))
+        startup.add_task("db", sleeper(0), provides=("graph",))
+
+        report = asyncio.run(startup.run())
+        tasks = report["tasks"]
+        assert tasks["model"]["status"] == "failed" and "broke" in tasks["model"]["error"]
+        assert tasks["hf"]["status"] == "skipped"
+        assert tasks["slow"]["error"].startswith("timed out")
+        assert report["readiness"]["status"] == "partial"
+        assert report["readiness"]["capabilities"]["graph"] == "ready"
+
+    def test_after_orders_without_requiring_success(self):
+        log = []
+        startup = StartupOrchestrator(StartupConfig(task_timeout_s=0.05))
+        startup.add_task("model", sleeper(1, log, "model"), provides=("vector",))
+        startup.add_task("hf", sleeper(0, log, "hf"), after=("model",), provides=("hf",))
+
+        report = asyncio.run(startup.run())
+        assert log == ["start:model", "start:hf", "end:hf"]
+        assert report["tasks"]["model"]["status"] == "failed"
+        assert report["tasks"]["hf"]["status"] == "ready" and report["tasks"]["hf"]["after"] == ["model"]
+        assert report["critical_path"] == ["model", "hf"]
+
+    def test_wait_for_returns_when_capability_settles(self):
+        async def scenario():
+            startup = StartupOrchestrator(StartupConfig())
+            startup.add_task("fast", sleeper(0.01), provides=("cache",))
+            startup.add_task("slow", sleeper(0.5), provides=("vector",))
+            startup.start()
+            ready = await startup.wait_for(["cache"], timeout=1)
+            readiness = startup.readiness()
+            await startup.stop()
+            return ready, readiness
+
+        ready, readiness = asyncio.run(scenario())
+        assert ready is True
+        assert readiness == {"status": "partial", "capabilities": {"cache": "ready", "vector": "pending"}}
+
+    def test_disabled_task_does_not_hold_readiness_back(self):
+        async def disabled():
+            raise CapabilityDisabled("turned off")
+
+        startup = StartupOrchestrator(StartupConfig())
+        startup.add_task("db", disabled, provides=("graph",))
+        startup.add_task("sync", sleeper(0), depends_on=("db",), provides=("graph_sync",))
+        startup.add_task("model", sleeper(0), provides=("vector",))
+
+        report = asyncio.run(startup.run())
+        assert report["tasks"]["db"]["status"] == "disabled" and report["tasks"]["sync"]["status"] == "disabled"
+        assert report["readiness"] == {
+            "status": "ready", "capabilities": {"graph": "disabled", "graph_sync": "disabled", "vector": "ready"},
+        }
+
+    def test_failed_task_is_retried_and_unblocks_dependents(self):
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("qdrant down")
+
+        async def scenario():
+            startup = StartupOrchestrator(StartupConfig(retry_base_s=0.01, retry_max_s=0.02))
+            startup.add_task("vector", flaky, provides=("vector_search",))
+            startup.add_task("index", sleeper(0), depends_on=("vector",), provides=("index",))
+            await startup.start()
+            before = startup.readiness()["status"]
+            ready = await wait_until(lambda: startup.readiness()["status"] == "ready")
+            report = startup.get_report()
+            await startup.stop()
+            return before, ready, report
+
+        before, ready, report = asyncio.run(scenario())
+        assert before == "partial" and ready
+        assert report["tasks"]["vector"]["attempts"] == 3
+        assert report["tasks"]["index"]["status"] == "ready"
+
+    def test_graph_validation(self):
+        startup = StartupOrchestrator(StartupConfig())
+        startup.add_task("a", sleeper(0), depends_on=("b",))
+        startup.add_task("b", sleeper(0), depends_on=("a",))
+        with pytest.raises(ValueError, match="cycle"):
+            asyncio.run(startup.run())
+        unknown = StartupOrchestrator(StartupConfig())
+        unknown.add_task("a", sleeper(0), depends_on=("missing",))
+        with pytest.raises(ValueError, match="unknown"):
+            asyncio.run(unknown.run())
+
+
+class TestCapabilityGate:
+    """Test routes degrading while a capability warms up"""
+
+    def test_route_returns_503_until_ready(self):
+        startup = StartupOrchestrator(StartupConfig(retry_after_s=3))
+        startup.add_task("model", sleeper(0), provides=("vector_search",))
+        app = FastAPI()
+
+        @app.get("/search", dependencies=[Depends(require_capability("vector_search", startup))])
+        async def search():
+            return {"ok": True}
+
+        @app.get("/other", dependencies=[Depends(require_capability("not_declared", startup))])
+        async def other():
+            return {"ok": True}
+
+        client = TestClient(app)
+        pending = client.get("/search")
+        assert pending.status_code == 503 and pending.headers["retry-after"] == "3"
+        assert pending.json()["detail"]["status"] == "pending"
+        assert client.get("/other").status_code == 200
+
+        asyncio.run(startup.run())
+        assert client.get("/search").json() == {"ok": True}
+
+    def test_disabled_capability_is_not_gated(self):
+        async def disabled():
+            raise CapabilityDisabled()
+
+        startup = StartupOrchestrator(StartupConfig())
+        startup.add_task("db", disabled, provides=("knowledge_graph",))
+        app = FastAPI()
+
+        @app.get("/graph", dependencies=[Depends(require_capability("knowledge_graph", startup))])
+        async def graph():
+            return {"ok": True}
+
+        asyncio.run(startup.run())
+        assert TestClient(app).get("/graph").status_code == 200
+
+
+class TestLazyImports:
+    """Test deferred module import"""
+
+    def test_lazy_module_imports_on_first_use(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_module("colorsys")
+        assert not colorsys.loaded and "colorsys" not in sys.modules
+        assert colorsys.rgb_to_hsv(1, 0, 0)[0] == 0
+        assert colorsys.loaded and "colorsys" in get_import_timings()
+
+    def test_module_available_does_not_import(self):
+        assert module_available("json") is True
+        assert module_available("definitely_not_a_module_xyz") is False